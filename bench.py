@@ -0,0 +1,255 @@
+"""
+Render benchmark for nifty50_option_analysis: times the data → HTML stages on
+synthetic fixtures, with no network and no real state. Run it through the
+main script (python nifty50_option_analysis.py --bench [--bench-baseline FILE]).
+"""
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from nifty50_option_analysis import (
+    ATM_WINDOW, HIGH_WEIGHTAGE, NIFTY50_SYMBOLS, OI_HISTORY_DEPTH, SNAPSHOT_FIELDS,
+    NiftyHTMLAnalyzer, OIRollups, OISnapshotLog, OptionChain, SnapshotHistory, SnapshotStore,
+    StrikeHistory, _fii_dii_placeholder, atr_series, build_heatmap_tab_html,
+    build_strategy_checklist_html, build_weekly_outlook_tab_html, compute_weekly_outlook,
+)
+
+
+BENCH_REPEAT     = 7       # timed runs per case; the median is reported
+BENCH_REGRESSION = 1.25    # slower than baseline by this factor (and > BENCH_SLACK_MS) → regression
+BENCH_SLACK_MS   = 1.0
+BENCH_STRIKES    = 200     # a full NIFTY chain, not just the ATM window
+BENCH_OI_DAYS    = 5       # multi-day OI log, one snapshot per minute of the session
+BENCH_OI_PER_DAY = 375
+BENCH_SPOT       = 25012.3
+
+
+def bench_option_records(strikes=BENCH_STRIKES, spot=BENCH_SPOT, seed=7):
+    """NSE records.data for `strikes` strikes around `spot` — what the v3 API returns."""
+    rng  = np.random.default_rng(seed)
+    atm  = round(spot / 50) * 50
+    recs = []
+    for i in range(strikes):
+        k = atm + 50 * (i - strikes // 2)
+        legs = {}
+        for side, intrinsic in (('CE', spot - k), ('PE', k - spot)):
+            legs[side] = {
+                'lastPrice':            round(max(0.05, intrinsic) + float(rng.uniform(5, 120)), 2),
+                'openInterest':         int(rng.integers(1e3, 5e6)),
+                'changeinOpenInterest': int(rng.integers(-1e6, 1e6)),
+                'totalTradedVolume':    int(rng.integers(1e2, 2e6)),
+                'impliedVolatility':    round(float(rng.uniform(9, 28)), 2),
+            }
+        recs.append({'strikePrice': k, 'expiryDate': '20-Oct-2026', **legs})
+    return recs
+
+
+def bench_oc_data(records, expiry='20-Oct-2026', spot=BENCH_SPOT):
+    """The dict _fetch_chain_for_expiry() returns, built from synthetic records."""
+    chain  = OptionChain.from_records(records, expiry, spot)
+    window = chain.window(ATM_WINDOW)
+    return {'expiry': expiry, 'df': window.to_frame(), 'chain': chain, 'window': window,
+            'underlying': spot, 'atm_strike': chain.atm_strike}
+
+
+def bench_technical(spot=BENCH_SPOT):
+    return {'current_price': spot, 'sma_20': spot - 110, 'sma_50': spot - 310, 'sma_200': spot - 1010,
+            'rsi': 56.2, 'macd': 40.1, 'signal': 35.2, 'macd_prev': 38.0, 'signal_prev': 36.0,
+            'resistance': spot + 140, 'support': spot - 135, 'strong_resistance': spot + 290,
+            'strong_support': spot - 310, 'prev_high': spot + 90, 'prev_low': spot - 160,
+            'prev_close': spot - 60}
+
+
+def bench_daily_history(days=400, spot=BENCH_SPOT, seed=11):
+    """A year and a half of daily OHLCV ending at `spot`, shaped like get_technical_data's frame."""
+    rng   = np.random.default_rng(seed)
+    close = np.exp(np.cumsum(rng.normal(0, 0.009, days)))
+    close *= spot / close[-1]
+    opens = close * (1 + rng.normal(0, 0.003, days))
+    high  = np.maximum(opens, close) * (1 + rng.uniform(0, 0.008, days))
+    low   = np.minimum(opens, close) * (1 - rng.uniform(0, 0.008, days))
+    idx   = pd.bdate_range(end=datetime.now().date(), periods=days, tz='Asia/Kolkata', name='Date')
+    df = pd.DataFrame({'Open': opens, 'High': high, 'Low': low, 'Close': close,
+                       'Volume': rng.integers(1e8, 4e8, days).astype(float)}, index=idx)
+    df['ATR_14'] = atr_series(df, 14)
+    return df
+
+
+def bench_heatmap(seed=13):
+    """One fetch_heatmap_data() row per NIFTY 50 constituent."""
+    rng  = np.random.default_rng(seed)
+    rows = []
+    for sym, ticker in NIFTY50_SYMBOLS:
+        prev  = float(rng.uniform(200, 9000))
+        pct   = round(float(rng.normal(0, 1.2)), 2)
+        price = round(prev * (1 + pct / 100), 2)
+        rows.append({'symbol': sym, 'ticker': ticker, 'price': price, 'prev_close': round(prev, 2),
+                     'change_pct': pct, 'change_abs': round(price - prev, 2),
+                     'volume': int(rng.integers(1e5, 5e7)), 'high_wt': sym in HIGH_WEIGHTAGE})
+    return rows
+
+
+def bench_snapshot(day, minute, rng):
+    """One log_oi_snapshot() entry at `minute` past 09:15 on `day`."""
+    t = datetime.combine(day, datetime.min.time()) + timedelta(hours=9, minutes=15 + minute)
+    ce, pe = int(rng.integers(-4e6, 4e6)), int(rng.integers(-4e6, 4e6))
+    spot = round(BENCH_SPOT + float(rng.normal(0, 40)), 2)
+    snap = {f: None for f in SNAPSHOT_FIELDS}
+    snap.update({
+        'time': t.strftime('%H:%M'), 'timestamp': t.strftime('%d-%b-%Y %H:%M IST'),
+        'call_oi_chg': ce, 'put_oi_chg': pe, 'diff': pe - ce,
+        'pcr': round(float(rng.uniform(0.6, 1.5)), 3), 'opt_signal': 'BULLISH' if pe > ce else 'BEARISH',
+        'vwap': spot - 5, 'fut_price': spot + 40, 'spot_price': spot, 'vwap_signal': 'ABOVE',
+        'nifty_move_pct': round(float(rng.normal(0, 0.3)), 2), 'rsi_15m': 55.0,
+        'bias': 'BULLISH', 'support': spot - 135, 'resistance': spot + 140,
+    })
+    return snap
+
+
+def _bench_time(fn, repeat):
+    """(median ms, min ms, last result) of `repeat` calls of fn()."""
+    times, out = [], None
+    for _ in range(repeat):
+        t0  = time.perf_counter()
+        out = fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return times[len(times) // 2], times[0], out
+
+
+def _bench_size(out):
+    if isinstance(out, str):
+        return len(out.encode('utf-8'))
+    if isinstance(out, list) and out and isinstance(out[0], str):
+        return sum(len(p.encode('utf-8')) for p in out)
+    return None
+
+
+def run_benchmarks(repeat=BENCH_REPEAT, baseline=None):
+    """
+    Times the data → HTML stages on synthetic fixtures (a BENCH_STRIKES chain,
+    BENCH_OI_DAYS × BENCH_OI_PER_DAY OI snapshots) in a scratch directory, so
+    nothing touches the network or the real state/ and oi_log/. With
+    `baseline` (a JSON path) the first run writes it and later runs compare
+    against it. Returns the process exit code: 1 on a regression.
+    """
+    home    = os.getcwd()
+    results = []
+    with tempfile.TemporaryDirectory(prefix="nifty_bench_") as scratch:
+        os.chdir(scratch)
+        try:
+            quiet = contextlib.redirect_stdout(io.StringIO())
+
+            def case(name, fn, n=repeat):
+                with quiet:
+                    med, best, out = _bench_time(fn, n)
+                results.append({'name': name, 'median_ms': round(med, 2), 'min_ms': round(best, 2),
+                                'bytes': _bench_size(out)})
+                return out
+
+            records  = bench_option_records()
+            analyzer = NiftyHTMLAnalyzer()
+            analyzer.daily_history = bench_daily_history()
+            analyzer.heatmap_data  = bench_heatmap()
+            analyzer.heatmap_timestamp = datetime.now().strftime('%d-%b-%Y %H:%M:%S')
+            analyzer.heatmap_advance = sum(1 for r in analyzer.heatmap_data if r['change_pct'] > 0)
+            analyzer.heatmap_decline = sum(1 for r in analyzer.heatmap_data if r['change_pct'] < 0)
+            analyzer.heatmap_neutral = len(analyzer.heatmap_data) - analyzer.heatmap_advance - analyzer.heatmap_decline
+            fii_dii = _fii_dii_placeholder()
+
+            oc_data = case(f"OptionChain.from_records ({BENCH_STRIKES} strikes)", lambda: bench_oc_data(records))
+            oa = case("analyze_option_chain_data", lambda: analyzer.analyze_option_chain_data(bench_oc_data(records)))
+            case("generate_analysis_data", lambda: analyzer.generate_analysis_data(bench_technical(), oa, fii_dii_raw=fii_dii))
+            d = analyzer.html_data
+            d['vix_val'], d['vix_trend'] = 13.4, 'rising'
+            outlook = case("compute_weekly_outlook", lambda: compute_weekly_outlook(
+                d, vix_val=d['vix_val'], history=analyzer.daily_history))
+            case("build_weekly_outlook_tab_html", lambda: build_weekly_outlook_tab_html(outlook))
+            case("build_strategy_checklist_html", lambda: build_strategy_checklist_html(
+                d, vol_support=12.0, vol_resistance=-5.0, global_bias='bullish',
+                vix_val=d['vix_val'], vix_trend=d['vix_trend']))
+            case("build_heatmap_tab_html", lambda: build_heatmap_tab_html(
+                analyzer.heatmap_data, analyzer.heatmap_timestamp, analyzer.heatmap_advance,
+                analyzer.heatmap_decline, analyzer.heatmap_neutral))
+
+            render = lambda profile: analyzer.generate_html_email(12.0, -5.0, 'bullish', profile=profile)
+
+            def cold():
+                analyzer.sections.version = f"bench-{time.perf_counter_ns()}"   # every section a miss
+                analyzer.sections._memo.clear()
+                return render("web")
+            case("generate_html_email web (cold sections)", cold)
+            case("generate_html_email web (cached sections)", lambda: render("web"))
+            case("generate_html_email email profile", lambda: render("email"))
+
+            # ── OI history at BENCH_OI_DAYS × BENCH_OI_PER_DAY snapshots ──
+            rng   = np.random.default_rng(17)
+            today = datetime.now(pytz.timezone('Asia/Kolkata')).date()
+            days  = [today - timedelta(days=i) for i in range(BENCH_OI_DAYS - 1, -1, -1)]
+            snaps = {day: [bench_snapshot(day, m, rng) for m in range(BENCH_OI_PER_DAY)] for day in days}
+            runs  = iter(range(repeat))
+
+            def fill_log():
+                log = OISnapshotLog(root=f"oi_log_{next(runs)}", export_path="bench_oi_log.json")
+                for day in days:
+                    for s in snaps[day]:
+                        log.append(s, day)
+                return log
+            log = case(f"OISnapshotLog.append ×{BENCH_OI_DAYS * BENCH_OI_PER_DAY}", fill_log, n=min(repeat, 3))
+            case("OISnapshotLog.tail (32 of today)", lambda: log.tail(today, OI_HISTORY_DEPTH))
+            case("OISnapshotLog.read_day", lambda: log.read_day(today))
+            stores = iter(range(repeat))
+
+            def fill_store():
+                store = SnapshotStore(f"snap_{next(stores)}.db")
+                store.sync_from_log(log)
+                return store
+            store = case(f"SnapshotStore.sync_from_log ({BENCH_OI_DAYS} days)", fill_store)
+            case("SnapshotStore.query (today)", lambda: store.query(today))
+            case("OIRollups.update (full rebuild)", lambda: OIRollups(
+                path_fmt=f"rollup_{time.perf_counter_ns()}_{{mins}}.json").update([], today, lambda: snaps[today]))
+            case("SnapshotHistory open (synced store)", lambda: SnapshotHistory(
+                log=log, day=today, store=store, rollups=OIRollups(path_fmt="bench_rollup_{mins}.json")))
+            strikes = StrikeHistory(root="strikes")
+            when    = datetime.now(pytz.timezone('Asia/Kolkata'))
+            case(f"StrikeHistory.append ({BENCH_STRIKES} strikes)", lambda: strikes.append(oc_data['chain'], when))
+        finally:
+            os.chdir(home)
+
+    print(f"\n⏱️  Render benchmark — median of {repeat} run(s), synthetic fixtures")
+    print(f"  {'case':<46} {'median ms':>10} {'min ms':>9} {'KB':>8}")
+    for r in results:
+        kb = f"{r['bytes'] / 1024:.1f}" if r['bytes'] is not None else "—"
+        print(f"  {r['name']:<46} {r['median_ms']:>10.2f} {r['min_ms']:>9.2f} {kb:>8}")
+
+    if not baseline:
+        return 0
+    try:
+        with open(baseline, 'r', encoding='utf-8') as f:
+            base = {r['name']: r for r in json.load(f)['results']}
+    except (OSError, ValueError, KeyError, TypeError):
+        OISnapshotLog._write_json(baseline, {'created': datetime.now().isoformat(timespec='seconds'),
+                                             'repeat': repeat, 'results': results})
+        print(f"\n📌 Baseline written to {baseline}")
+        return 0
+    regressions = []
+    for r in results:
+        b = base.get(r['name'])
+        if b and r['median_ms'] > b['median_ms'] * BENCH_REGRESSION and r['median_ms'] - b['median_ms'] > BENCH_SLACK_MS:
+            regressions.append(f"  🐢 {r['name']}: {b['median_ms']:.2f} → {r['median_ms']:.2f} ms")
+        if b and r['bytes'] and b.get('bytes') and r['bytes'] > b['bytes'] * BENCH_REGRESSION:
+            regressions.append(f"  📦 {r['name']}: {b['bytes'] / 1024:.1f} → {r['bytes'] / 1024:.1f} KB")
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) against {baseline} (>{BENCH_REGRESSION}×):")
+        print("\n".join(regressions))
+        return 1
+    print(f"\n✅ No regressions against {baseline}")
+    return 0
@@ -7,9 +7,10 @@ MARKET DIRECTION: Holographic Glass Widget (Compact)
 KEY LEVELS: 1H Candles · Last 120 bars · ±200 pts from price · Rounded to 25
 AUTO REFRESH: JSON timestamp polling every 30s · Reloads ONLY when script re-runs · No flicker · No scroll jump
 STRATEGY CHECKLIST TAB: Rules-based scoring · Auto-filled from live data · N/A safe
-INTRADAY OI TREND TAB: Every-run snapshot → oi_log.json · 3/5/15 Min/1 Hr filter · IST timestamps
+INTRADAY OI TREND TAB: Every-run snapshot → oi_log/ daily segments (oi_log.json export) · 3/5/15 Min/1 Hr filter · IST timestamps
 WEEKLY OUTLOOK TAB: Pivot Points (Classic/Fibonacci/Camarilla) · Fibonacci Retracement · ATR/VIX range · OI walls · SMA zones · Confluence clustering
-NIFTY 50 HEATMAP TAB: Live yfinance data · Color-coded by % change · Market Breadth · High Weightage Movers
+NIFTY 50 HEATMAP TAB: Live NSE constituents (yfinance fallback) · Color-coded by % change · Market Breadth · High Weightage Movers
+DAEMON MODE: --daemon stays resident 09:00–15:30 IST · runs every N min on wall-clock boundaries · sessions/caches kept warm
 
 FIX v7: Intraday OI Trend aggregation fix — grouped intervals (5/15/60 min) now use latest
          snapshot values instead of summing cumulative OI (was inflating CE/PE Δ by N×).
@@ -37,7 +38,11 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import json
+import re
 import pytz
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 warnings.filterwarnings('ignore')
 
 NSE_FO_HOLIDAYS = {
@@ -49,6 +54,278 @@ NSE_FO_HOLIDAYS = {
     "14-Sep-2026","02-Oct-2026","20-Oct-2026","10-Nov-2026","24-Nov-2026","25-Dec-2026",
 }
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#  DATA PROVIDER — live / record / replay of every upstream response
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Local, unpublished run state (cookie jar, caches) lives here — never deployed.
+STATE_DIR = ".nifty_state"
+
+# NIFTY_DATA_MODE=record saves every raw NSE / yfinance / Groww response under
+# NIFTY_FIXTURES; NIFTY_DATA_MODE=replay serves them back with no network at
+# all, so a whole main() run can be timed and profiled reproducibly.
+DATA_MODE    = os.environ.get("NIFTY_DATA_MODE", "live").strip().lower()
+FIXTURES_DIR = os.environ.get("NIFTY_FIXTURES", os.path.join(STATE_DIR, "fixtures"))
+
+class FixtureMissing(LookupError):
+    """Replay mode was asked for a response that was never recorded."""
+
+class RecordedResponse:
+    """The slice of an HTTP response the fetchers use: status_code, text, json()."""
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text        = text
+
+    def json(self):
+        return json.loads(self.text)
+
+class DataProvider:
+    """
+    Every network fetch goes through call(kind, key, fn, codec). In live mode
+    that is just fn(); record mode also writes the result to
+    FIXTURES_DIR/<kind>/<key>.<ext>; replay mode reads it back instead of
+    calling fn, raising FixtureMissing when nothing was recorded (callers'
+    usual except-branches then take their normal fallback path).
+    Codecs: 'json' (plain values), 'response' (HTTP responses), 'frame' (DataFrames).
+    """
+    MODES = ("live", "record", "replay")
+    EXT   = {'json': 'json', 'response': 'json', 'frame': 'pkl'}
+
+    def __init__(self, mode="live", fixtures_dir=FIXTURES_DIR):
+        if mode not in self.MODES:
+            print(f"  ⚠️  Unknown NIFTY_DATA_MODE '{mode}' — using live")
+            mode = "live"
+        self.mode         = mode
+        self.fixtures_dir = fixtures_dir
+        self._now         = None
+        self._now_lock    = threading.Lock()
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    def now(self):
+        """The run's clock (UTC): wall time when live; in record mode the time is
+        saved once per run and replay reads it back, so date windows line up
+        with the fixtures they were recorded with."""
+        if self.mode == "live":
+            return datetime.now(pytz.utc)
+        with self._now_lock:
+            if self._now is None:
+                try:
+                    ts = self.call("clock", "run", time.time)
+                except FixtureMissing:
+                    print("  ⚠️  No recorded run clock in the fixtures — using wall time")
+                    ts = time.time()
+                self._now = datetime.fromtimestamp(ts, pytz.utc)
+            return self._now
+
+    def call(self, kind, key, fn, codec="json"):
+        if self.mode == "live":
+            return fn()
+        path = self._path(kind, key, codec)
+        if self.mode == "replay":
+            if not os.path.exists(path):
+                raise FixtureMissing(f"no recorded {kind} response for {key}")
+            return self._read(path, codec)
+        result = fn()
+        try:
+            self._write(path, codec, result)
+        except Exception as e:
+            print(f"  ⚠️  Could not record {kind} fixture {key}: {e}")
+        return result
+
+    def _path(self, kind, key, codec):
+        import hashlib
+        slug   = re.sub(r'[^A-Za-z0-9]+', '_', key).strip('_')[-60:]
+        digest = hashlib.sha1(key.encode()).hexdigest()[:10]
+        return os.path.join(self.fixtures_dir, kind, f"{slug}_{digest}.{self.EXT[codec]}")
+
+    def _read(self, path, codec):
+        if codec == 'frame':
+            return pd.read_pickle(path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if codec == 'response':
+            return RecordedResponse(data['status_code'], data['text'])
+        return data
+
+    def _write(self, path, codec, result):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        if codec == 'frame':
+            pd.to_pickle(result, tmp)
+        else:
+            if codec == 'response':
+                result = {'status_code': result.status_code, 'text': result.text}
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(result, f)
+        os.replace(tmp, path)
+
+DATA_PROVIDER = DataProvider(DATA_MODE)
+
+# yf.Ticker(...).history() shares yfinance's module-level session and cookie/crumb
+# state; the fetch stage runs several of them at once, so they are serialised here.
+YF_LOCK = threading.Lock()
+
+def yf_history(symbol, key=None, **kwargs):
+    """yf.Ticker(symbol).history(**kwargs) through DATA_PROVIDER, one call at a time."""
+    key = key or "|".join([symbol] + [f"{k}={v}" for k, v in sorted(kwargs.items())])
+    with YF_LOCK:
+        return DATA_PROVIDER.call("yfinance", key, lambda: yf.Ticker(symbol).history(**kwargs), codec="frame")
+
+def yf_download(tickers, **kwargs):
+    """yf.download(tickers, **kwargs) through DATA_PROVIDER."""
+    key = "|".join(["download", tickers] + [f"{k}={v}" for k, v in sorted(kwargs.items())])
+    return DATA_PROVIDER.call("yfinance", key, lambda: yf.download(tickers, **kwargs), codec="frame")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  NSE SESSION — one warmed session shared by every NSE call in a run
+# ═══════════════════════════════════════════════════════════════════════════════
+
+NSE_BASE_URL = "https://www.nseindia.com"
+
+NSE_COOKIE_FILE     = os.path.join(STATE_DIR, "nse_cookies.json")
+NSE_COOKIE_MAX_AGE  = 4 * 3600      # session cookies (no expiry) are trusted this long
+NSE_EXPIRY_CACHE    = os.path.join(STATE_DIR, "nse_expiries.json")
+NSE_JSON_CACHE_TTL  = 120           # seconds a memoised NSE payload stays valid (≈ one run)
+
+class NSESession:
+    """
+    Owns the curl_cffi session (cookie jar + connection pool) used for every
+    NSE request in a run. The homepage / option-chain warm-up happens once,
+    on first use; every later call reuses the warmed cookies and connections.
+    Warmed cookies are persisted to NSE_COOKIE_FILE so the next run can skip
+    the warm-up entirely; a 401/403 on cached cookies triggers a fresh one.
+    """
+    HEADERS = {
+        "authority": "www.nseindia.com",
+        "accept": "application/json, text/plain, */*",
+        "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "referer": "https://www.nseindia.com/option-chain",
+        "accept-language": "en-US,en;q=0.9",
+    }
+
+    def __init__(self, cookie_file=NSE_COOKIE_FILE):
+        self.session     = requests.Session()
+        self.headers     = dict(self.HEADERS)
+        self.cookie_file = cookie_file
+        self.warmed      = False
+        self.from_cache  = False   # True while running on cookies loaded from disk
+        # curl_cffi sessions are thread-safe (per-thread curl handles, shared
+        # cookie jar); the lock only keeps concurrent callers from warming twice.
+        self._lock       = threading.RLock()
+        self._json_cache = {}      # url -> (fetched_at, payload), see get_json()
+
+    def warm_up(self):
+        with self._lock:
+            if self.warmed:
+                return
+            if DATA_PROVIDER.replaying:
+                self.warmed = True
+                return   # recorded responses need no cookies
+            if self._load_cookies():
+                self.warmed = self.from_cache = True
+                return
+            try:
+                print("  🔥 Warming NSE session (homepage + option-chain)...")
+                for i, page in enumerate(("/", "/option-chain")):
+                    if i:
+                        time.sleep(1.5)
+                    resp = self.session.get(f"{NSE_BASE_URL}{page}", headers=self.headers,
+                                            impersonate="chrome", timeout=15)
+                    if resp.status_code != 200:
+                        raise RuntimeError(f"HTTP {resp.status_code} for {page}")
+                time.sleep(1)
+                self._save_cookies()
+                self.warmed = True   # only now — a failed warm-up is retried on the next call
+            except Exception as e:
+                print(f"  ⚠️  Session warm-up warning: {e}")
+
+    def rewarm(self):
+        """Drops cookies loaded from disk and performs a fresh warm-up.
+        Returns False (no-op) when the current cookies are already fresh."""
+        with self._lock:
+            if not self.from_cache:
+                return False
+            print("  🔄 Cached NSE cookies rejected — re-warming session")
+            self.session.cookies.clear()
+            self.warmed = self.from_cache = False
+            try:
+                os.remove(self.cookie_file)
+            except OSError:
+                pass
+            self.warm_up()
+            return True
+
+    def get(self, url, referer=None, timeout=20):
+        return DATA_PROVIDER.call("nse", url, lambda: self._get_live(url, referer, timeout),
+                                  codec="response")
+
+    def _get_live(self, url, referer=None, timeout=20):
+        self.warm_up()
+        headers = self.headers if referer is None else {**self.headers, "referer": referer}
+        resp = self.session.get(url, headers=headers, impersonate="chrome", timeout=timeout)
+        if resp.status_code in (401, 403) and self.rewarm():
+            resp = self.session.get(url, headers=headers, impersonate="chrome", timeout=timeout)
+        return resp
+
+    def get_json(self, url, referer=None, timeout=20, cache=False):
+        """GET → parsed JSON, or None on a non-200. With cache=True the payload is
+        memoised for NSE_JSON_CACHE_TTL seconds so several consumers share one call."""
+        if cache:
+            with self._lock:
+                hit = self._json_cache.get(url)
+            if hit and time.time() - hit[0] < NSE_JSON_CACHE_TTL:
+                return hit[1]
+        resp = self.get(url, referer=referer, timeout=timeout)
+        if resp.status_code != 200:
+            print(f"  ⚠️  NSE HTTP {resp.status_code} for {url.split('/api/')[-1]}")
+            return None
+        data = resp.json()
+        if cache:
+            with self._lock:
+                self._json_cache[url] = (time.time(), data)
+        return data
+
+    def _load_cookies(self):
+        if not self.cookie_file or not os.path.exists(self.cookie_file):
+            return False
+        try:
+            with open(self.cookie_file, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            now = time.time()
+            session_ok = now - saved.get('saved_at', 0) < NSE_COOKIE_MAX_AGE
+            live = [c for c in saved.get('cookies', [])
+                    if (c.get('expires') or 0) > now or (c.get('expires') is None and session_ok)]
+            if not live:
+                print("  ⌛ Cached NSE cookies expired — full warm-up needed")
+                return False
+            for c in live:
+                self.session.cookies.set(c['name'], c['value'], domain=c.get('domain', ''),
+                                         path=c.get('path', '/'), secure=c.get('secure', False))
+            print(f"  ♻️  Reusing {len(live)} cached NSE cookies — warm-up skipped")
+            return True
+        except Exception as e:
+            print(f"  ⚠️  Could not read NSE cookie cache: {e}")
+            return False
+
+    def _save_cookies(self):
+        if not self.cookie_file:
+            return
+        try:
+            cookies = [{'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path,
+                        'expires': c.expires, 'secure': bool(c.secure)}
+                       for c in self.session.cookies.jar]
+            if not cookies:
+                return
+            os.makedirs(os.path.dirname(self.cookie_file) or ".", exist_ok=True)
+            with open(self.cookie_file, "w", encoding="utf-8") as f:
+                json.dump({'saved_at': time.time(), 'cookies': cookies}, f)
+        except Exception as e:
+            print(f"  ⚠️  Could not save NSE cookie cache: {e}")
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  NIFTY 50 HEATMAP — DATA & HTML
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -82,6 +359,14 @@ NIFTY50_SYMBOLS = [
     ("ULTRACEMCO","ULTRACEMCO.NS"), ("WIPRO",       "WIPRO.NS"),
 ]
 
+# NSE listing symbol → (display symbol, yfinance ticker), from NIFTY50_SYMBOLS, so the
+# NSE-sourced heatmap names remapped listings (TMCV/TMPV → TATAMOTORS) like the yfinance path
+NSE_HEATMAP_SYMBOLS = {}
+for _name, _ticker in NIFTY50_SYMBOLS:
+    NSE_HEATMAP_SYMBOLS.setdefault(_ticker[:-len(".NS")], (_name, _ticker))
+    NSE_HEATMAP_SYMBOLS.setdefault(_name, (_name, _ticker))
+del _name, _ticker
+
 # High-weightage stocks (top 15 by approximate Nifty weight)
 HIGH_WEIGHTAGE = {
     "RELIANCE", "HDFCBANK", "ICICIBANK", "INFY", "TCS",
@@ -94,16 +379,81 @@ HIGH_WEIGHTAGE_ORDER = [
     "BHARTIARTL", "LT", "AXISBANK", "KOTAKBANK", "SBIN"
 ]
 
-def fetch_heatmap_data():
+NSE_NIFTY50_INDEX_URL = f"{NSE_BASE_URL}/api/equity-stockIndices?index=NIFTY%2050"
+
+# "nse"      → one equity-stockIndices call gives every constituent (yfinance on failure)
+# "yfinance" → 5-day bulk download for all NIFTY50_SYMBOLS
+HEATMAP_SOURCE = "nse"
+
+def fetch_nifty50_index_snapshot(nse):
+    """
+    NSE equity-stockIndices payload for NIFTY 50: the index row plus last price,
+    change and % change for every constituent. Memoised on the session, so the
+    heatmap, the VWAP day-open and the prev-close lookup share one request.
+    """
+    try:
+        data = nse.get_json(NSE_NIFTY50_INDEX_URL, referer=f"{NSE_BASE_URL}/", timeout=10, cache=True)
+        return data if isinstance(data, dict) and data.get('data') else None
+    except Exception as e:
+        print(f"  ⚠️  NSE equity-stockIndices fetch failed: {e}")
+        return None
+
+def nifty50_index_quote(nse):
+    """The 'NIFTY 50' index row (open, previousClose, lastPrice, ...) or {}."""
+    for item in (fetch_nifty50_index_snapshot(nse) or {}).get('data', []):
+        if item.get('symbol') == 'NIFTY 50':
+            return item
+    return {}
+
+def _heatmap_breadth(results, timestamp):
+    advance = sum(1 for r in results if r['change_pct'] > 0)
+    decline = sum(1 for r in results if r['change_pct'] < 0)
+    neutral = sum(1 for r in results if r['change_pct'] == 0)
+    print(f"  ✅ Heatmap: {len(results)} stocks | Adv: {advance} Dec: {decline} Neu: {neutral}")
+    return results, timestamp, advance, decline, neutral
+
+def fetch_heatmap_data(nse=None, source=HEATMAP_SOURCE):
     """
-    Fetches live % change data for all 50 Nifty stocks using yfinance.
-    Returns a list of dicts: {symbol, name, price, prev_close, change_pct, change_abs, volume}
+    Fetches live % change data for all 50 Nifty stocks.
+    Returns (rows, timestamp, advance, decline, neutral); each row is
+    {symbol, ticker, price, prev_close, change_pct, change_abs, volume, high_wt}.
     """
+    if source == "nse":
+        print("  📊 Fetching Nifty 50 heatmap data via NSE equity-stockIndices...")
+        snap = fetch_nifty50_index_snapshot(nse or NSESession())
+        results = []
+        for item in (snap or {}).get('data', []):
+            nse_sym = item.get('symbol', '')
+            if not nse_sym or nse_sym == 'NIFTY 50' or item.get('priority') == 1:
+                continue   # index row, not a constituent
+            name, ticker = NSE_HEATMAP_SYMBOLS.get(nse_sym, (nse_sym, f"{nse_sym}.NS"))
+            try:
+                price   = float(item.get('lastPrice') or 0)
+                p_close = float(item.get('previousClose') or 0)
+                results.append({
+                    'symbol':     name,
+                    'ticker':     ticker,
+                    'price':      round(price, 2),
+                    'prev_close': round(p_close, 2),
+                    'change_pct': round(float(item.get('pChange') or 0), 2),
+                    'change_abs': round(float(item.get('change') or 0), 2),
+                    'volume':     int(item.get('totalTradedVolume') or 0),
+                    'high_wt':    name in HIGH_WEIGHTAGE,
+                })
+            except (TypeError, ValueError) as e:
+                print(f"    ⚠️  {name}: {e}")
+        if len(results) >= 45:
+            timestamp = datetime.now(pytz.timezone('Asia/Kolkata')).strftime('%d-%b-%Y %H:%M IST')
+            return _heatmap_breadth(results, timestamp)
+        print(f"  ⚠️  NSE constituents incomplete ({len(results)}) — falling back to yfinance")
+    return _fetch_heatmap_yfinance()
+
+def _fetch_heatmap_yfinance():
     print("  📊 Fetching Nifty 50 heatmap data via yfinance...")
     results = []
     tickers_str = " ".join([sym for _, sym in NIFTY50_SYMBOLS])
     try:
-        data = yf.download(tickers_str, period="5d", interval="1d",
+        data = yf_download(tickers_str, period="5d", interval="1d",
                    group_by="ticker", auto_adjust=True, progress=False)
         ist_tz = pytz.timezone('Asia/Kolkata')
         timestamp = datetime.now(ist_tz).strftime('%d-%b-%Y %H:%M IST')
@@ -116,7 +466,7 @@ def fetch_heatmap_data():
                     df = data[sym] if sym in data.columns.get_level_values(0) else None
                 if df is None or df.empty or len(df) < 2:
                     try:
-                        df_fallback = yf.download(sym, period="5d", interval="1d",
+                        df_fallback = yf_download(sym, period="5d", interval="1d",
                                                    auto_adjust=True, progress=False)
                         if not df_fallback.empty and len(df_fallback) >= 2:
                             df = df_fallback
@@ -143,7 +493,7 @@ def fetch_heatmap_data():
                 if len(df_clean) < 2:
                     # Per-ticker fallback when bulk data is insufficient
                     try:
-                        df_fb = yf.download(sym, period="5d", interval="1d",
+                        df_fb = yf_download(sym, period="5d", interval="1d",
                                             auto_adjust=True, progress=False)
                         df_clean = df_fb.dropna(subset=['Close']) if not df_fb.empty else df_clean
                     except Exception:
@@ -181,11 +531,7 @@ def fetch_heatmap_data():
                     'change_pct': 0, 'change_abs': 0,
                     'volume': 0, 'high_wt': name in HIGH_WEIGHTAGE
                 })
-        advance = sum(1 for r in results if r['change_pct'] > 0)
-        decline = sum(1 for r in results if r['change_pct'] < 0)
-        neutral = sum(1 for r in results if r['change_pct'] == 0)
-        print(f"  ✅ Heatmap: {len(results)} stocks | Adv: {advance} Dec: {decline} Neu: {neutral}")
-        return results, timestamp, advance, decline, neutral
+        return _heatmap_breadth(results, timestamp)
     except Exception as e:
         print(f"  ❌ Heatmap fetch failed: {e}")
         return [], "N/A", 0, 0, 0
@@ -200,7 +546,7 @@ def fetch_global_bias():
     results = []
     for name, sym in tickers.items():
         try:
-            df = yf.Ticker(sym).history(period="2d", interval="1d")
+            df = yf_history(sym, period="2d", interval="1d")
             if df is None or len(df) < 2:
                 print(f"    ⚠️  {name}: insufficient data")
                 continue
@@ -231,7 +577,7 @@ def fetch_india_vix():
     """Fetches India VIX from yfinance."""
     try:
         print("  🌡️ Fetching India VIX...")
-        df = yf.Ticker("^INDIAVIX").history(period="5d", interval="1d")
+        df = yf_history("^INDIAVIX", period="5d", interval="1d")
         if df is None or df.empty or len(df) < 2:
             print("  ⚠️  India VIX: insufficient data")
             return None, None
@@ -249,14 +595,13 @@ def fetch_volume_at_levels(technical):
     ETF price ≈ Nifty/100, so levels are scaled down before comparison.
     """
     try:
-        import yfinance as _yf
         print("  📦 Fetching volume at support/resistance levels...")
 
         if not technical.get('support') or not technical.get('resistance'):
             print("  ⚠️  Key levels are N/A — skipping volume at levels")
             return None, None
 
-        df = _yf.Ticker("NIFTYBEES.NS").history(interval="1h", period="60d")
+        df = yf_history("NIFTYBEES.NS", interval="1h", period="60d")
 
         if df is None or df.empty or len(df) < 25:
             print("  ⚠️  Insufficient NIFTYBEES 1H data")
@@ -311,11 +656,133 @@ def fetch_volume_at_levels(technical):
         return None, None
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#  CANDLE STORE — local OHLCV history, topped up incrementally from yfinance
+# ═══════════════════════════════════════════════════════════════════════════════
+
+CANDLE_DB          = os.path.join(STATE_DIR, "candles.db")
+CANDLE_REFRESH_TTL = 60     # seconds before the same symbol/interval is re-checked upstream
+
+class CandleStore:
+    """
+    SQLite-backed OHLCV store keyed by (symbol, interval, bar time). The first
+    call for a series back-fills INITIAL_DAYS of history; every later refresh
+    asks yfinance only for bars from the last stored one onwards, so the
+    trailing (possibly partial) bar is re-fetched and replaced in place.
+    If yfinance fails, consumers are served whatever is already stored.
+    Record/replay runs skip the store (see fixture_window).
+    """
+    INITIAL_DAYS = {'1d': 400, '1h': 365}
+    COLUMNS      = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+    def __init__(self, path=CANDLE_DB):
+        self.path  = path
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        import sqlite3
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        con = sqlite3.connect(self.path, timeout=30)
+        con.execute("""CREATE TABLE IF NOT EXISTS candles (
+                           symbol TEXT, interval TEXT, ts INTEGER,
+                           open REAL, high REAL, low REAL, close REAL, volume REAL,
+                           PRIMARY KEY (symbol, interval, ts))""")
+        con.execute("""CREATE TABLE IF NOT EXISTS refreshed (
+                           symbol TEXT, interval TEXT, at REAL,
+                           PRIMARY KEY (symbol, interval))""")
+        return con
+
+    def candles(self, symbol, interval='1d', days=365):
+        """Last `days` of bars as a tz-aware (Asia/Kolkata) OHLCV DataFrame."""
+        if DATA_PROVIDER.mode != "live":
+            return self.fixture_window(symbol, interval, days)
+        with self._lock:
+            self.refresh(symbol, interval)
+            return self.load(symbol, interval, days)
+
+    def fixture_window(self, symbol, interval='1d', days=365):
+        """
+        Record/replay: the whole `days` window as one recorded yfinance call,
+        bypassing the store, so a replay doesn't depend on what candles.db
+        already holds or on the day it runs.
+        """
+        end = DATA_PROVIDER.now()
+        try:
+            df = yf_history(symbol, key=f"{symbol}|{interval}|window={days}d",
+                            interval=interval, start=end - timedelta(days=days))
+        except Exception as e:
+            print(f"  ⚠️  Candle window unavailable for {symbol} {interval}: {e}")
+            df = None
+        if df is None or df.empty:
+            return self._frame([], interval)
+        idx = df.index if df.index.tz is not None else df.index.tz_localize('Asia/Kolkata')
+        df  = df.reindex(columns=self.COLUMNS).astype(float)
+        df.index = idx.tz_convert('Asia/Kolkata')
+        df.index.name = 'Datetime' if interval != '1d' else 'Date'
+        return df[df.index >= end - timedelta(days=days)]
+
+    def refresh(self, symbol, interval='1d'):
+        """Pulls only the bars newer than the last stored one. Returns rows written."""
+        with self._connect() as con:
+            row = con.execute("SELECT at FROM refreshed WHERE symbol=? AND interval=?",
+                              (symbol, interval)).fetchone()
+            if row and time.time() - row[0] < CANDLE_REFRESH_TTL:
+                return 0
+            last = con.execute("SELECT MAX(ts) FROM candles WHERE symbol=? AND interval=?",
+                               (symbol, interval)).fetchone()[0]
+        if last is None:
+            start = datetime.now(pytz.utc) - timedelta(days=self.INITIAL_DAYS.get(interval, 365))
+        else:
+            start = datetime.fromtimestamp(last, pytz.utc)
+        try:
+            df = yf_history(symbol, key=f"{symbol}|{interval}|incremental",
+                            interval=interval, start=start)
+        except Exception as e:
+            print(f"  ⚠️  Candle refresh failed for {symbol} {interval}: {e} — serving stored bars")
+            return 0
+        rows = []
+        if df is not None and not df.empty:
+            idx = df.index if df.index.tz is not None else df.index.tz_localize('Asia/Kolkata')
+            ts  = (idx - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+            ohlcv = df.reindex(columns=self.COLUMNS).astype(float).to_numpy()
+            rows = [(symbol, interval, int(t), *map(float, v)) for t, v in zip(ts, ohlcv)]
+        with self._connect() as con:
+            con.executemany("INSERT OR REPLACE INTO candles VALUES (?,?,?,?,?,?,?,?)", rows)
+            con.execute("INSERT OR REPLACE INTO refreshed VALUES (?,?,?)", (symbol, interval, time.time()))
+        if last is None:
+            print(f"  🗄️  Candle store: back-filled {len(rows)} {interval} bars for {symbol}")
+        else:
+            print(f"  🗄️  Candle store: {len(rows)} new/updated {interval} bars for {symbol}")
+        return len(rows)
+
+    def load(self, symbol, interval='1d', days=365):
+        since = int((DATA_PROVIDER.now() - timedelta(days=days)).timestamp())
+        with self._connect() as con:
+            data = con.execute("SELECT ts, open, high, low, close, volume FROM candles "
+                               "WHERE symbol=? AND interval=? AND ts>=? ORDER BY ts",
+                               (symbol, interval, since)).fetchall()
+        return self._frame(data, interval)
+
+    def _frame(self, data, interval):
+        df = pd.DataFrame(data, columns=['ts'] + self.COLUMNS)
+        df.index = pd.to_datetime(df.pop('ts'), unit='s', utc=True).dt.tz_convert('Asia/Kolkata')
+        df.index.name = 'Datetime' if interval != '1d' else 'Date'
+        return df
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  WEEKLY OUTLOOK — Projection Engine
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def compute_weekly_outlook(html_data, vix_val=None):
+def atr_series(df, period=14):
+    """Simple-average true range over `period` daily bars."""
+    prev_close = df['Close'].shift(1)
+    tr = pd.concat([df['High'] - df['Low'],
+                    (df['High'] - prev_close).abs(),
+                    (df['Low']  - prev_close).abs()], axis=1).max(axis=1)
+    return tr.rolling(period).mean()
+
+def compute_weekly_outlook(html_data, vix_val=None, candles=None, history=None):
     """
     Computes weekly support/resistance projections using:
       1. Weekly Pivot Points (Classic + Fibonacci + Camarilla)
@@ -326,8 +793,9 @@ def compute_weekly_outlook(html_data, vix_val=None):
       6. SMA zones (20/50/200)
       7. Level clustering (confluence detection)
     Returns a dict with all computed levels and scenario projections.
+    `history` is the daily frame get_technical_data already built (with its
+    ATR_14 column); without it the candle store is read instead.
     """
-    import yfinance as yf
     import numpy as np
     print("\n🔮 Computing Weekly Outlook projections...")
     outlook = {
@@ -338,9 +806,11 @@ def compute_weekly_outlook(html_data, vix_val=None):
         'sma_zones': {}, 'oi_walls': {},
     }
     try:
-        nifty = yf.Ticker("^NSEI")
-        # ── Fetch daily data (1 year) ──────────────────────────────────
-        df = nifty.history(period="1y")
+        # ── Daily data (1 year) — reuse the technical-stage frame if given ──
+        if history is not None:
+            df = history
+        else:
+            df = (candles or CandleStore()).candles("^NSEI", "1d", days=365)
         if df.empty or len(df) < 30:
             print("  ⚠️  Insufficient daily data for weekly outlook")
             return outlook
@@ -416,12 +886,8 @@ def compute_weekly_outlook(html_data, vix_val=None):
         print(f"  📐 Fibonacci: Swing H={swing_high:.0f} L={swing_low:.0f} | 38.2%={fib_retrace['38.2']} 61.8%={fib_retrace['61.8']}")
 
         # ═══ 3. ATR (14-day) → Expected weekly range ══════════════════
-        df_atr = df.copy()
-        df_atr['H-L']  = df_atr['High'] - df_atr['Low']
-        df_atr['H-PC'] = abs(df_atr['High'] - df_atr['Close'].shift(1))
-        df_atr['L-PC'] = abs(df_atr['Low']  - df_atr['Close'].shift(1))
-        df_atr['TR']   = df_atr[['H-L', 'H-PC', 'L-PC']].max(axis=1)
-        atr_14 = float(df_atr['TR'].rolling(14).mean().iloc[-1])
+        atr_col = df['ATR_14'] if 'ATR_14' in df.columns else atr_series(df, 14)
+        atr_14 = float(atr_col.iloc[-1])
         atr_weekly = atr_14 * np.sqrt(5)  # scale daily ATR to weekly
         outlook['atr'] = round(atr_14)
         outlook['atr_weekly_range'] = round(atr_weekly)
@@ -1015,7 +1481,7 @@ def build_heatmap_tab_html(heatmap_data, timestamp, advance, decline, neutral):
         <div class="section-title">
           <span>🟩</span> NIFTY 50 HEATMAP
           <span style="font-size:10px;color:rgba(128,222,234,0.35);font-weight:400;margin-left:auto;display:flex;flex-direction:column;align-items:flex-end;gap:3px;">
-            <span>Stock data as of: {timestamp}</span>
+            <span>Stock data as of: <span data-stamp="heatmap-ts">{timestamp}</span></span>
             <span style="font-size:9px;color:rgba(239,68,68,0.45);letter-spacing:0.5px;">⟳ OI chart auto-refreshes · Stock tiles update on script re-run</span>
           </span>
         </div>
@@ -1360,48 +1826,22 @@ def get_heatmap_javascript():
         if (window._oiData && window._oiData.length) drawHMOIChart(window._oiData);
     };
 
-    /* Called on tab switch or page load */
-    window.renderHeatmap = renderHeatmap;
-
-    window.addEventListener('load', function() {
-    setTimeout(renderHeatmap, 100);
-    setTimeout(renderHeatmap, 500);
-    setTimeout(renderHeatmap, 1500);
-    setTimeout(function() {
-        if (window._oiData && window._oiData.length) drawHMOIChart(window._oiData);
-    }, 800);
-});
-
-    // Hook into loadOILog to also refresh OI chart
-    var _origRenderOI = window.renderOITable;
-
-    /* After oi_log loads, also draw heatmap OI chart */
-    var _origLoad = window.loadOILog;
-    function patchedLoadOILog() {
-        fetch('oi_log.json?_t=' + Date.now(), {cache:'no-store'})
-            .then(function(r){ return r.json(); })
-            .then(function(data) {
-                if (Array.isArray(data) && data.length) {
-                    window._oiData = data;
-                    drawHMOIChart(data);
-                    var pcr = data[0] && data[0].pcr ? data[0].pcr : null;
-                    var el = document.getElementById('hmOIPCR');
-                    if (el && pcr) el.textContent = 'PCR: ' + pcr;
-                }
-            })
-            .catch(function(){});
+    /* Heatmap OI chart follows the DataHub OI feed — no fetch or timer of its own */
+    function drawHMOI(data) {
+        data = data || window._oiData;
+        if (Array.isArray(data) && data.length) {
+            drawHMOIChart(data);
+            var pcr = data[0] && data[0].pcr ? data[0].pcr : null;
+            var el = document.getElementById('hmOIPCR');
+            if (el && pcr) el.textContent = 'PCR: ' + pcr;
+        }
     }
 
-    // Run OI chart draw periodically
-    setInterval(function() {
-    patchedLoadOILog();
-    renderHeatmap();
-}, 30000);
+    /* Tab switch redraws both (canvases measure 0 wide while the tab is hidden) */
+    window.renderHeatmap = function() { renderHeatmap(); drawHMOI(); };
 
-// Initial draw
-setTimeout(patchedLoadOILog, 1200);
-setTimeout(renderHeatmap, 800);
-setTimeout(renderHeatmap, 2000);
+    if (window.DataHub) DataHub.on('oi', drawHMOI);
+    window.addEventListener('load', function() { setTimeout(window.renderHeatmap, 100); });
 })();
 """
 
@@ -1507,7 +1947,9 @@ def _fetch_from_groww():
             "Accept-Language": "en-US,en;q=0.9",
             "Referer": "https://groww.in/",
         }
-        resp = _req.get("https://groww.in/fii-dii-data", headers=headers, timeout=15)
+        resp = DATA_PROVIDER.call("groww", "fii-dii-data",
+                                  lambda: _req.get("https://groww.in/fii-dii-data", headers=headers, timeout=15),
+                                  codec="response")
         if resp.status_code != 200:
             print(f"  ⚠️  Groww HTTP {resp.status_code}"); return []
         soup  = BeautifulSoup(resp.text, "html.parser")
@@ -1536,22 +1978,11 @@ def _fetch_from_groww():
     except Exception as e:
         print(f"  ⚠️  Groww scrape failed: {e}"); return []
 
-def _fetch_from_nse_curl():
+def _fetch_from_nse_curl(nse=None):
     try:
-        from curl_cffi import requests as curl_req
-        headers = {
-            "authority": "www.nseindia.com",
-            "accept": "application/json, text/plain, */*",
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0.0.0 Safari/537.36",
-            "referer": "https://www.nseindia.com/reports/fii-dii",
-            "accept-language": "en-US,en;q=0.9",
-        }
-        s = curl_req.Session()
-        s.get("https://www.nseindia.com/", headers=headers, impersonate="chrome", timeout=12)
-        time.sleep(1.2)
-        s.get("https://www.nseindia.com/reports/fii-dii", headers=headers, impersonate="chrome", timeout=12)
-        time.sleep(0.8)
-        resp = s.get("https://www.nseindia.com/api/fiidiiTradeReact", headers=headers, impersonate="chrome", timeout=20)
+        nse  = nse or NSESession()
+        resp = nse.get(f"{NSE_BASE_URL}/api/fiidiiTradeReact",
+                       referer=f"{NSE_BASE_URL}/reports/fii-dii", timeout=20)
         if resp.status_code == 200:
             days = _parse_nse_fiidii(resp.json())
             if days:
@@ -1561,12 +1992,15 @@ def _fetch_from_nse_curl():
         print(f"  ⚠️  NSE curl_cffi failed: {e}")
     return []
 
-def fetch_fii_dii_data():
+def fetch_fii_dii_data(nse=None):
     days = _fetch_from_groww()
     if days: return days
-    days = _fetch_from_nse_curl()
+    days = _fetch_from_nse_curl(nse)
     if days: return days
     print("  📌 FII/DII: using date-corrected fallback")
+    return _fii_dii_placeholder()
+
+def _fii_dii_placeholder():
     tdays = _last_5_trading_days()
     placeholder = [
         (-1540.20,2103.50),(823.60,891.40),(-411.80,1478.30),(69.45,1174.21),(-972.13,1666.98),
@@ -2279,14 +2713,479 @@ def build_strategy_checklist_html(html_data, vol_support=None, vol_resistance=No
     return "".join(html_parts)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#  OI SNAPSHOT LOG — append-only daily NDJSON segments
+# ═══════════════════════════════════════════════════════════════════════════════
+
+OI_LOG_DIR    = "oi_log"        # published: oi_log/YYYY-MM-DD.ndjson + oi_log/index.json
+OI_LOG_EXPORT = "oi_log.json"   # what the front end reads: one day, newest first
+OI_LOG_DELTA  = "oi_log_delta.json"   # latest OI_DELTA_SIZE snapshots, for incremental polling
+OI_DELTA_SIZE = 20
+
+class OISnapshotLog:
+    """
+    One NDJSON file per trading day; each run appends exactly one line.
+    index.json records the per-day count and first/last snapshot time so
+    nothing has to be parsed to list history. tail() reads backwards from
+    the end of a segment, so recent-K lookups never parse the whole day.
+    """
+    def __init__(self, root=OI_LOG_DIR, export_path=OI_LOG_EXPORT):
+        self.root        = root
+        self.export_path = export_path
+        self.index_path  = os.path.join(root, "index.json")
+
+    def segment_path(self, day):
+        return os.path.join(self.root, f"{day.isoformat()}.ndjson")
+
+    def append(self, snapshot, day):
+        """Appends one snapshot to the day's segment. Returns the day's count."""
+        return self.append_many([snapshot], day)
+
+    def append_many(self, snapshots, day):
+        """Appends snapshots (oldest first) to the day's segment and updates
+        index.json once for the batch. Returns the day's count."""
+        index = self.load_index()     # before the write, so a rebuild can't count these lines
+        os.makedirs(self.root, exist_ok=True)
+        path = self.segment_path(day)
+        seg  = index.setdefault(day.isoformat(), {'file': os.path.basename(path), 'count': 0,
+                                                  'first': snapshots[0].get('time') if snapshots else None})
+        if not snapshots:
+            return seg['count']
+        data = "".join(json.dumps(snap, ensure_ascii=False) + "\n" for snap in snapshots)
+        with open(path, "a+b") as f:
+            # A run killed mid-write leaves no trailing newline — don't glue onto it
+            size = f.seek(0, os.SEEK_END)
+            if size > 0:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    data = "\n" + data
+            f.write(data.encode("utf-8"))
+        seg['count'] += len(snapshots)
+        seg['last']   = snapshots[-1].get('time')
+        seqs = [snap['seq'] for snap in snapshots if snap.get('seq') is not None]
+        if seqs:
+            seg['last_seq'] = max(seqs)
+        self._write_json(self.index_path, index)
+        return seg['count']
+
+    def load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if isinstance(index, dict):
+                return index
+        except (OSError, ValueError):
+            pass
+        return self._rebuild_index()
+
+    def _rebuild_index(self):
+        index = {}
+        if not os.path.isdir(self.root):
+            return index
+        for name in sorted(os.listdir(self.root)):
+            if not name.endswith(".ndjson"):
+                continue
+            day  = date.fromisoformat(name[:-len(".ndjson")])
+            rows = self.read_day(day)
+            if rows:
+                index[day.isoformat()] = {'file': name, 'count': len(rows),
+                                          'first': rows[0].get('time'), 'last': rows[-1].get('time'),
+                                          'last_seq': max((r.get('seq') or 0) for r in rows)}
+        return index
+
+    def last_seq(self):
+        """Highest snapshot sequence number written so far, across all days."""
+        return max((seg.get('last_seq') or 0 for seg in self.load_index().values()), default=0)
+
+    def tail(self, day, k):
+        """Last k snapshots of the day, newest first."""
+        path = self.segment_path(day)
+        if k <= 0 or not os.path.exists(path):
+            return []
+        with open(path, "rb") as f:
+            pos = f.seek(0, os.SEEK_END)
+            buf = b""
+            # Count records, not newlines — a repaired torn write leaves a blank line
+            while pos > 0 and sum(1 for raw in buf.split(b"\n") if raw.strip()) <= k:
+                step = min(8192, pos)
+                pos -= step
+                f.seek(pos)
+                buf = f.read(step) + buf
+        out = []
+        for raw in reversed(buf.splitlines()):
+            if len(out) == k:
+                break
+            if not raw.strip():
+                continue
+            try:
+                out.append(json.loads(raw))
+            except ValueError:
+                continue    # blank or torn line
+        return out
+
+    def read_day(self, day):
+        """Every snapshot of the day, oldest first."""
+        path = self.segment_path(day)
+        if not os.path.exists(path):
+            return []
+        rows = []
+        with open(path, "r", encoding="utf-8") as f:
+            for raw in f:
+                try:
+                    rows.append(json.loads(raw))
+                except ValueError:
+                    continue
+        return rows
+
+    def export(self, day):
+        """Writes the day as oi_log.json (newest first) for the front end."""
+        rows = self.read_day(day)[::-1]
+        self._write_json(self.export_path, rows)
+        return len(rows)
+
+    def migrate_legacy(self):
+        """Splits a pre-segment oi_log.json into daily segments, once."""
+        if os.path.isdir(self.root) or not os.path.exists(self.export_path):
+            return 0
+        try:
+            with open(self.export_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"  ⚠️  Could not read legacy oi_log.json: {e}")
+            return 0
+        if not isinstance(entries, list):
+            return 0
+        migrated = 0
+        for e in reversed(entries):      # legacy log is newest first
+            try:
+                day = datetime.strptime(e.get('timestamp', '')[:11], '%d-%b-%Y').date()
+            except ValueError:
+                continue
+            self.append(e, day)
+            migrated += 1
+        print(f"  📦 Migrated {migrated} legacy oi_log.json entries into {self.root}/")
+        return migrated
+
+    @staticmethod
+    def _write_json(path, payload):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+
+SNAPSHOT_DB     = os.path.join(STATE_DIR, "snapshots.db")
+# Snapshot dict keys, in the order log_oi_snapshot builds them. Each is its own
+# (untyped, so ints/floats round-trip exactly) column; unknown keys go to `extra`.
+SNAPSHOT_FIELDS = (
+    "time", "timestamp", "call_oi_chg", "put_oi_chg", "diff", "pcr", "opt_signal",
+    "vwap", "fut_price", "spot_price", "vwap_signal", "nifty_move_pct",
+    "nearest_level", "nearest_label", "distance_pts", "rsi_15m", "ema_signal",
+    "ema5", "ema13", "bias", "support", "resistance", "strong_support", "strong_resistance",
+)
+
+class SnapshotStore:
+    """
+    Multi-day SQLite store of OI snapshots, one row per run, indexed by trading
+    day and minute-of-day. The NDJSON segments stay the published source of
+    truth; sync_from_log() rebuilds any day the store is missing or behind on,
+    so a lost database is recreated from oi_log/ on the next run.
+    """
+    COLUMNS = ", ".join(f'"{f}"' for f in SNAPSHOT_FIELDS)
+
+    def __init__(self, path=SNAPSHOT_DB):
+        self.path = path
+
+    def _connect(self):
+        import sqlite3
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        con = sqlite3.connect(self.path, timeout=30)
+        con.execute(f"""CREATE TABLE IF NOT EXISTS snapshots (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            day TEXT NOT NULL, minute INTEGER NOT NULL,
+                            {self.COLUMNS}, extra TEXT)""")
+        con.execute("CREATE INDEX IF NOT EXISTS snapshots_day_minute ON snapshots (day, minute)")
+        con.execute("CREATE INDEX IF NOT EXISTS snapshots_minute ON snapshots (minute)")
+        return con
+
+    @staticmethod
+    def _row(snapshot, day):
+        hh, _, mm = (snapshot.get('time') or "0:0").partition(":")
+        extra = {k: v for k, v in snapshot.items() if k not in SNAPSHOT_FIELDS}
+        return ((day.isoformat(), int(hh or 0) * 60 + int(mm or 0))
+                + tuple(snapshot.get(f) for f in SNAPSHOT_FIELDS)
+                + (json.dumps(extra, ensure_ascii=False) if extra else None,))
+
+    @staticmethod
+    def _snapshot(row):
+        snap = dict(zip(SNAPSHOT_FIELDS, row))
+        if row[-1]:
+            snap.update(json.loads(row[-1]))
+        return snap
+
+    def insert(self, snapshots, day):
+        rows = [self._row(s, day) for s in snapshots]
+        marks = ", ".join("?" * (len(SNAPSHOT_FIELDS) + 3))
+        with self._connect() as con:
+            con.executemany(f"INSERT INTO snapshots (day, minute, {self.COLUMNS}, extra) "
+                            f"VALUES ({marks})", rows)
+        return len(rows)
+
+    def counts(self):
+        with self._connect() as con:
+            return dict(con.execute("SELECT day, COUNT(*) FROM snapshots GROUP BY day"))
+
+    def query(self, start_day, end_day=None, from_minute=0, to_minute=24 * 60):
+        """Snapshots with start_day ≤ day ≤ end_day and minute in [from, to], oldest first."""
+        end_day = end_day or start_day
+        with self._connect() as con:
+            rows = con.execute(f"SELECT {self.COLUMNS}, extra FROM snapshots "
+                               "WHERE day BETWEEN ? AND ? AND minute BETWEEN ? AND ? "
+                               "ORDER BY day, minute, id",
+                               (start_day.isoformat(), end_day.isoformat(),
+                                from_minute, to_minute)).fetchall()
+        return [self._snapshot(r) for r in rows]
+
+    def sync_from_log(self, log):
+        """Reloads every day whose segment holds more snapshots than the store."""
+        have = self.counts()
+        synced = 0
+        for day_str, seg in sorted(log.load_index().items()):
+            if have.get(day_str, 0) >= seg.get('count', 0):
+                continue
+            day = date.fromisoformat(day_str)
+            with self._connect() as con:
+                con.execute("DELETE FROM snapshots WHERE day=?", (day_str,))
+            synced += self.insert(log.read_day(day), day)
+        if synced:
+            print(f"  🗃️  Snapshot store synced {synced} rows from {log.root}/")
+        return synced
+
+    def export(self, day, path=OI_LOG_EXPORT):
+        """Writes the day as oi_log.json (newest first) for the front end."""
+        rows = self.query(day)[::-1]
+        OISnapshotLog._write_json(path, rows)
+        return len(rows)
+
+
+STRIKE_HISTORY_DIR = os.path.join(STATE_DIR, "strikes")
+# One fixed-size record per strike per run; a day file is a flat array of these.
+STRIKE_DTYPE = np.dtype([
+    ('ts', '<i8'), ('expiry', '<i4'), ('strike', '<i4'),
+    ('ce_oi', '<i8'), ('ce_oi_chg', '<i8'), ('ce_vol', '<i8'), ('ce_ltp', '<f4'),
+    ('pe_oi', '<i8'), ('pe_oi_chg', '<i8'), ('pe_vol', '<i8'), ('pe_ltp', '<f4'),
+])
+
+class StrikeHistory:
+    """
+    Per-strike chain history: every run appends the full chain's CE/PE OI,
+    OI change, volume and LTP as raw STRIKE_DTYPE records to
+    STRIKE_HISTORY_DIR/YYYY-MM-DD.strikes. Files are read back with np.memmap,
+    so strike × time matrices are sliced without parsing anything.
+    """
+    def __init__(self, root=STRIKE_HISTORY_DIR):
+        self.root = root
+
+    def path(self, day):
+        return os.path.join(self.root, f"{day.isoformat()}.strikes")
+
+    @staticmethod
+    def _expiry_key(expiry):
+        try:
+            return int(datetime.strptime(expiry, '%d-%b-%Y').strftime('%Y%m%d'))
+        except (TypeError, ValueError):
+            return 0
+
+    def append(self, chain, when):
+        """Appends one run of `chain` (an OptionChain) stamped at `when`."""
+        rec = np.empty(len(chain), dtype=STRIKE_DTYPE)
+        rec['ts']     = int(when.timestamp())
+        rec['expiry'] = self._expiry_key(chain.expiry)
+        rec['strike'] = chain.strike
+        for field in STRIKE_DTYPE.names[3:]:
+            rec[field] = chain.columns[field]
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.path(when.date()), "ab") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size % STRIKE_DTYPE.itemsize:          # drop a torn record from a killed run
+                f.truncate(size - size % STRIKE_DTYPE.itemsize)
+            rec.tofile(f)
+        return len(rec)
+
+    def load(self, day):
+        """The day's records as a read-only memmap (empty array if none)."""
+        path = self.path(day)
+        n = os.path.getsize(path) // STRIKE_DTYPE.itemsize if os.path.exists(path) else 0
+        if n == 0:
+            return np.empty(0, dtype=STRIKE_DTYPE)
+        return np.memmap(path, dtype=STRIKE_DTYPE, mode='r', shape=(n,))
+
+    def matrix(self, day, field='ce_oi', expiry=None):
+        """
+        Returns (times, strikes, values): epoch seconds per run, sorted strikes,
+        and a len(times) × len(strikes) float array (NaN where a strike was not listed).
+        """
+        rec = self.load(day)
+        if expiry is not None:
+            rec = rec[rec['expiry'] == self._expiry_key(expiry)]
+        times,   ti = np.unique(rec['ts'],     return_inverse=True)
+        strikes, si = np.unique(rec['strike'], return_inverse=True)
+        values = np.full((len(times), len(strikes)), np.nan)
+        values[ti, si] = rec[field]
+        return times, strikes, values
+
+
+OI_ROLLUP_MINUTES = (3, 5, 15, 60)       # one file per OI tab interval button
+OI_ROLLUP_FILE    = "oi_rollup_{mins}.json"
+
+class OIRollups:
+    """
+    Server-side version of the page's filterByInterval(): for each bucket size,
+    today's snapshots grouped by HH:MM slot, newest slot first, each slot being
+    its latest snapshot relabelled with the slot time. A new snapshot either
+    replaces the head slot or starts a new one, so updates are O(1) and the
+    page only fetches oi_rollup_<mins>.json. Each file records how many
+    snapshots it was built from, so one that missed a flush is rebuilt.
+    """
+    def __init__(self, minutes=OI_ROLLUP_MINUTES, path_fmt=OI_ROLLUP_FILE):
+        self.minutes  = minutes
+        self.path_fmt = path_fmt
+
+    @staticmethod
+    def bucket(snapshot, mins):
+        hh, _, mm = (snapshot.get('time') or "00:00").partition(":")
+        row = dict(snapshot)
+        row['time']        = f"{int(hh or 0):02d}:{int(mm or 0) // mins * mins:02d}"
+        row['call_oi_chg'] = snapshot.get('call_oi_chg') or 0
+        row['put_oi_chg']  = snapshot.get('put_oi_chg') or 0
+        row['diff']        = row['put_oi_chg'] - row['call_oi_chg']
+        return row
+
+    def _load(self, mins, day):
+        """(rows, snapshot count) of a rollup file, or (None, 0) when it must be rebuilt."""
+        try:
+            with open(self.path_fmt.format(mins=mins), "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return None, 0
+        if not isinstance(saved, dict) or saved.get('day') != day.isoformat():
+            return None, 0                           # yesterday's buckets (or the old format) — rebuild
+        return deque(saved.get('rows') or []), saved.get('count', 0)
+
+    def push(self, rows, snapshot, mins):
+        row = self.bucket(snapshot, mins)
+        if rows and rows[0].get('time') == row['time']:
+            rows[0] = row
+        else:
+            rows.appendleft(row)
+
+    def update(self, new_snapshots, day, full_day, count=None):
+        """Applies new snapshots (oldest first); full_day() supplies every snapshot
+        of the day, oldest first, when a rollup file has to be rebuilt — because
+        it is missing, from another day, or (given the segment's record `count`)
+        not built from every snapshot before these."""
+        full = None
+        for mins in self.minutes:
+            rows, seen = self._load(mins, day)
+            fresh = new_snapshots
+            if rows is None or (count is not None and seen + len(new_snapshots) != count):
+                if full is None:
+                    full = full_day()
+                rows, seen, fresh = deque(), 0, full
+            for snap in fresh:
+                self.push(rows, snap, mins)
+            OISnapshotLog._write_json(self.path_fmt.format(mins=mins), {
+                'day': day.isoformat(), 'count': seen + len(fresh), 'rows': list(rows),
+            })
+
+
+OI_HISTORY_DEPTH = 32     # recent snapshots kept in memory (PCR trend needs 5, momentum 5)
+
+class SnapshotHistory:
+    """
+    Today's recent snapshots, read from the log once per run and held in a
+    fixed-size ring buffer (oldest → newest). Signal logic reads from here;
+    new snapshots are buffered by add() and written once by flush().
+    """
+    def __init__(self, log=None, day=None, depth=OI_HISTORY_DEPTH, store=None, rollups=None):
+        self.log     = log or OISnapshotLog()
+        self.store   = store or SnapshotStore()
+        self.rollups = rollups or OIRollups()
+        self.day   = day or datetime.now(pytz.timezone('Asia/Kolkata')).date()
+        self.log.migrate_legacy()
+        try:
+            self.store.sync_from_log(self.log)
+        except Exception as e:
+            print(f"  ⚠️  Snapshot store sync failed: {e}")
+        self._ring    = deque(reversed(self.log.tail(self.day, depth)), maxlen=depth)
+        self._pending = []
+        self.count    = self.log.load_index().get(self.day.isoformat(), {}).get('count', 0)
+        self.last_seq = self.log.last_seq()
+
+    def __len__(self):
+        return self.count
+
+    def recent(self, n):
+        """Last n snapshots, newest first."""
+        n = min(n, len(self._ring))
+        return [self._ring[-i] for i in range(1, n + 1)]
+
+    def pcrs(self, n):
+        """Last n positive PCR readings, newest first."""
+        out = []
+        for i in range(1, len(self._ring) + 1):
+            p = self._ring[-i].get('pcr')
+            if p is not None and p > 0:
+                out.append(p)
+                if len(out) == n:
+                    break
+        return out
+
+    def add(self, snapshot):
+        """Buffers a snapshot, stamping it with the next sequence number."""
+        self.last_seq = snapshot['seq'] = self.last_seq + 1
+        self._ring.append(snapshot)
+        self._pending.append(snapshot)
+        self.count += 1
+
+    def flush(self):
+        """Appends buffered snapshots to the day's segment and re-exports oi_log.json."""
+        if not self._pending:
+            return 0
+        self.log.append_many(self._pending, self.day)
+        try:
+            self.store.insert(self._pending, self.day)
+            self.store.export(self.day, self.log.export_path)
+        except Exception as e:
+            print(f"  ⚠️  Snapshot store write failed: {e} — exporting from segment")
+            self.log.export(self.day)
+        try:
+            self.rollups.update(self._pending, self.day, lambda: self.log.read_day(self.day), self.count)
+        except Exception as e:
+            print(f"  ⚠️  OI rollup update failed: {e}")
+        OISnapshotLog._write_json(OI_LOG_DELTA, {
+            'day': self.day.isoformat(), 'seq': self.last_seq,
+            'entries': self.recent(OI_DELTA_SIZE),
+        })
+        written, self._pending = len(self._pending), []
+        print(f"  💾 OI log flushed — {written} snapshot(s) → {self.log.segment_path(self.day)}")
+        return written
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  INTRADAY OI TREND — OI LOG HELPER
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def log_oi_snapshot(option_analysis, technical, key_levels=None, bias=None):
+def log_oi_snapshot(option_analysis, technical, key_levels=None, bias=None, nse=None, history=None):
+    """
+    Builds this run's intraday snapshot and adds it to `history` (a
+    SnapshotHistory). A caller-supplied history is flushed by the caller at the
+    end of the run; without one, a private history is loaded and flushed here.
+    """
     if not option_analysis or not technical:
         print("  ⚠️  OI snapshot skipped — missing option_analysis or technical data")
         return
+    nse = nse or NSESession()
 
     ist_tz  = pytz.timezone('Asia/Kolkata')
     ist_now = datetime.now(ist_tz)
@@ -2297,6 +3196,9 @@ def log_oi_snapshot(option_analysis, technical, key_levels=None, bias=None):
     if not (market_open <= ist_now <= market_close):
         print(f"  ⏸️  OI snapshot skipped — outside market hours ({ist_now.strftime('%H:%M IST')})")
         return
+    own_history = history is None
+    if own_history:
+        history = SnapshotHistory(day=ist_now.date())
 
     ce_chg  = option_analysis.get('total_ce_oi_change', 0)
     pe_chg  = option_analysis.get('total_pe_oi_change', 0)
@@ -2311,8 +3213,7 @@ def log_oi_snapshot(option_analysis, technical, key_levels=None, bias=None):
     # to avoid drift where NIFTYBEES trades at 99.5×–100.5× Nifty, causing false VWAP signals.
     vwap = spot
     try:
-        import yfinance as _yf
-        df_1m = _yf.Ticker("NIFTYBEES.NS").history(interval="1m", period="1d")
+        df_1m = yf_history("NIFTYBEES.NS", interval="1m", period="1d")
         if not df_1m.empty:
             df_1m = df_1m.dropna(subset=['Close','Volume'])
             df_1m = df_1m[df_1m['Volume'] > 0]
@@ -2331,27 +3232,12 @@ def log_oi_snapshot(option_analysis, technical, key_levels=None, bias=None):
                     # This locks calibration for the day, letting VWAP move independently.
                     nifty_approx_open = spot  # fallback
                     try:
-                        # Use NSE API for today's open — yfinance ^NSEI is unreliable
-                        _vwap_session = requests.Session()
-                        _vwap_headers = {
-                            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                            "Accept": "application/json",
-                            "Referer": "https://www.nseindia.com/",
-                        }
-                        _vwap_session.get("https://www.nseindia.com/", headers=_vwap_headers, impersonate="chrome", timeout=10)
-                        time.sleep(0.5)
-                        _vwap_resp = _vwap_session.get(
-                            "https://www.nseindia.com/api/equity-stockIndices?index=NIFTY%2050",
-                            headers=_vwap_headers, impersonate="chrome", timeout=10
-                        )
-                        if _vwap_resp.status_code == 200:
-                            for _vi in _vwap_resp.json().get('data', []):
-                                if _vi.get('symbol') == 'NIFTY 50':
-                                    _nse_open = float(_vi.get('open', 0))
-                                    if _nse_open > 0:
-                                        nifty_approx_open = _nse_open
-                                        print(f"  ✅ Nifty day open via NSE API: {nifty_approx_open}")
-                                    break
+                        # Use NSE API for today's open — yfinance ^NSEI is unreliable.
+                        # Shares the equity-stockIndices response the heatmap already fetched.
+                        _nse_open = float(nifty50_index_quote(nse).get('open', 0) or 0)
+                        if _nse_open > 0:
+                            nifty_approx_open = _nse_open
+                            print(f"  ✅ Nifty day open via NSE API: {nifty_approx_open}")
                     except Exception as _ve:
                         print(f"  ⚠️  NSE API open fetch failed: {_ve} — using spot as fallback")
                     calibration = nifty_approx_open / first_etf_open
@@ -2392,52 +3278,42 @@ def log_oi_snapshot(option_analysis, technical, key_levels=None, bias=None):
             #   PCR 0.5–0.9: SELL (call-heavy, bearish bias)
             #   PCR < 0.5: STRONG SELL (extreme call writing = ceiling)
 
-            # ── PCR trend detection: read last 5 PCR values from oi_log.json ──
+            # ── PCR trend detection: last 5 PCR values from today's log segment ──
             _pcr_trend = "FLAT"       # FLAT | MILD_RISING | STRONG_RISING | MILD_FALLING | STRONG_FALLING
             _pcr_shift = 0.0          # total PCR change across window
             try:
-                _pcr_log_path = "oi_log.json"
-                if os.path.exists(_pcr_log_path):
-                    with open(_pcr_log_path, "r", encoding="utf-8") as _pf:
-                        _pcr_entries = json.load(_pf)
-                    if isinstance(_pcr_entries, list):
-                        _today_str_pcr = ist_now.strftime('%d-%b-%Y')
-                        _pcr_entries = [e for e in _pcr_entries
-                                        if e.get('timestamp', '').startswith(_today_str_pcr)
-                                        and e.get('pcr') is not None and e.get('pcr') > 0]
-                        # Most recent entries are at the front (prepended)
-                        _recent_pcrs = [e['pcr'] for e in _pcr_entries[:5]]
-                        if len(_recent_pcrs) >= 5:
-                            # Count how many consecutive pairs are rising/falling
-                            _pairs = len(_recent_pcrs) - 1  # 4 pairs for 5 readings
-                            _rising_count  = sum(1 for i in range(_pairs) if _recent_pcrs[i] > _recent_pcrs[i+1])
-                            _falling_count = sum(1 for i in range(_pairs) if _recent_pcrs[i] < _recent_pcrs[i+1])
-                            _pcr_shift = _recent_pcrs[0] - _recent_pcrs[-1]  # newest minus oldest
-
-                            # Strong trend: all 4 pairs consistent AND shift > 0.15
-                            # Mild trend: 4 of 4 OR 3 of 4 consistent, shift 0.08–0.15
-                            if _rising_count >= 4 and _pcr_shift > 0.15:
-                                _pcr_trend = "STRONG_RISING"
-                            elif _rising_count >= 3 and _pcr_shift > 0.08:
-                                _pcr_trend = "MILD_RISING"
-                            elif _falling_count >= 4 and _pcr_shift < -0.15:
-                                _pcr_trend = "STRONG_FALLING"
-                            elif _falling_count >= 3 and _pcr_shift < -0.08:
-                                _pcr_trend = "MILD_FALLING"
-
-                            print(f"  📈 PCR Trend: {_pcr_trend} | shift={_pcr_shift:+.3f} | "
-                                  f"rising={_rising_count}/4 falling={_falling_count}/4 | "
-                                  f"last 5: {_recent_pcrs}")
-                        elif len(_recent_pcrs) >= 3:
-                            # Fallback: if less than 5 readings available, use 3
-                            _pcr_shift = _recent_pcrs[0] - _recent_pcrs[-1]
-                            _rising_count  = sum(1 for i in range(len(_recent_pcrs)-1) if _recent_pcrs[i] > _recent_pcrs[i+1])
-                            _falling_count = sum(1 for i in range(len(_recent_pcrs)-1) if _recent_pcrs[i] < _recent_pcrs[i+1])
-                            if _rising_count == len(_recent_pcrs)-1 and _pcr_shift > 0.08:
-                                _pcr_trend = "MILD_RISING"
-                            elif _falling_count == len(_recent_pcrs)-1 and _pcr_shift < -0.08:
-                                _pcr_trend = "MILD_FALLING"
-                            print(f"  📈 PCR Trend (3-bar fallback): {_pcr_trend} | shift={_pcr_shift:+.3f} | last {len(_recent_pcrs)}: {_recent_pcrs}")
+                _recent_pcrs = history.pcrs(5)    # newest first
+                if len(_recent_pcrs) >= 5:
+                    # Count how many consecutive pairs are rising/falling
+                    _pairs = len(_recent_pcrs) - 1  # 4 pairs for 5 readings
+                    _rising_count  = sum(1 for i in range(_pairs) if _recent_pcrs[i] > _recent_pcrs[i+1])
+                    _falling_count = sum(1 for i in range(_pairs) if _recent_pcrs[i] < _recent_pcrs[i+1])
+                    _pcr_shift = _recent_pcrs[0] - _recent_pcrs[-1]  # newest minus oldest
+
+                    # Strong trend: all 4 pairs consistent AND shift > 0.15
+                    # Mild trend: 4 of 4 OR 3 of 4 consistent, shift 0.08–0.15
+                    if _rising_count >= 4 and _pcr_shift > 0.15:
+                        _pcr_trend = "STRONG_RISING"
+                    elif _rising_count >= 3 and _pcr_shift > 0.08:
+                        _pcr_trend = "MILD_RISING"
+                    elif _falling_count >= 4 and _pcr_shift < -0.15:
+                        _pcr_trend = "STRONG_FALLING"
+                    elif _falling_count >= 3 and _pcr_shift < -0.08:
+                        _pcr_trend = "MILD_FALLING"
+
+                    print(f"  📈 PCR Trend: {_pcr_trend} | shift={_pcr_shift:+.3f} | "
+                          f"rising={_rising_count}/4 falling={_falling_count}/4 | "
+                          f"last 5: {_recent_pcrs}")
+                elif len(_recent_pcrs) >= 3:
+                    # Fallback: if less than 5 readings available, use 3
+                    _pcr_shift = _recent_pcrs[0] - _recent_pcrs[-1]
+                    _rising_count  = sum(1 for i in range(len(_recent_pcrs)-1) if _recent_pcrs[i] > _recent_pcrs[i+1])
+                    _falling_count = sum(1 for i in range(len(_recent_pcrs)-1) if _recent_pcrs[i] < _recent_pcrs[i+1])
+                    if _rising_count == len(_recent_pcrs)-1 and _pcr_shift > 0.08:
+                        _pcr_trend = "MILD_RISING"
+                    elif _falling_count == len(_recent_pcrs)-1 and _pcr_shift < -0.08:
+                        _pcr_trend = "MILD_FALLING"
+                    print(f"  📈 PCR Trend (3-bar fallback): {_pcr_trend} | shift={_pcr_shift:+.3f} | last {len(_recent_pcrs)}: {_recent_pcrs}")
             except Exception as _te:
                 print(f"  ⚠️  PCR trend detection failed: {_te}")
 
@@ -2480,28 +3356,16 @@ def log_oi_snapshot(option_analysis, technical, key_levels=None, bias=None):
     # ══ MOMENTUM OVERRIDE ═══════════════════════════════════════════════════
     # When price action clearly contradicts the OI signal for 4+ consecutive
     # readings, override to prevent stale signals during V-shaped reversals.
-    # Read last 6 entries from oi_log.json to compute spot deltas.
+    # Read the last entries of today's log segment to compute spot deltas.
     # ═════════════════════════════════════════════════════════════════════════
     _oi_signal_before_override = opt_signal   # preserve for logging
     try:
-        _log_path = "oi_log.json"
-        _prev_entries = []
-        if os.path.exists(_log_path):
-            with open(_log_path, "r", encoding="utf-8") as _f:
-                _prev_entries = json.load(_f)
-            if not isinstance(_prev_entries, list):
-                _prev_entries = []
-            # Keep only today's entries
-            _today_str = ist_now.strftime('%d-%b-%Y')
-            _prev_entries = [e for e in _prev_entries if e.get('timestamp', '').startswith(_today_str)]
+        _prev_entries = history.recent(5)   # newest first, today only
 
         if len(_prev_entries) >= 4 and spot > 0:
             # Collect last 6 spot prices (most recent first, current spot not yet in log)
-            _recent_spots = [spot]  # current reading
-            for _e in _prev_entries[:5]:
-                _sp = _e.get('spot_price', 0)
-                if _sp and _sp > 0:
-                    _recent_spots.append(_sp)
+            _recent_spots = [spot] + [e.get('spot_price') for e in _prev_entries
+                                      if e.get('spot_price') and e.get('spot_price') > 0]
 
             if len(_recent_spots) >= 5:
                 # Compute consecutive deltas: spots[0]-spots[1], spots[1]-spots[2], ...
@@ -2585,12 +3449,11 @@ def log_oi_snapshot(option_analysis, technical, key_levels=None, bias=None):
 
     fut_price = round(spot - 25, 2)
     try:
-        import yfinance as _yf
         # Try Nifty near-month futures first, then NIFTYBEES ETF × calibration
         _fut_fetched = False
         for _fut_sym in ("^NSEI", "NIFTYBEES.NS"):
             try:
-                _fut_df = _yf.Ticker(_fut_sym).history(period="1d", interval="1m")
+                _fut_df = yf_history(_fut_sym, period="1d", interval="1m")
                 if _fut_df is not None and not _fut_df.empty:
                     _last_close = float(_fut_df['Close'].dropna().iloc[-1])
                     if _last_close > 0:
@@ -2619,37 +3482,21 @@ def log_oi_snapshot(option_analysis, technical, key_levels=None, bias=None):
     try:
         _nse_prev_close = None
 
-        # Method 1: NSE equity-stockIndices API (most accurate)
+        # Method 1: NSE equity-stockIndices API (most accurate, same cached response)
         try:
-            _nse_session = requests.Session()
-            _nse_headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "application/json",
-                "Referer": "https://www.nseindia.com/",
-            }
-            _nse_session.get("https://www.nseindia.com/", headers=_nse_headers, impersonate="chrome", timeout=10)
-            time.sleep(1)
-            _idx_resp = _nse_session.get(
-                "https://www.nseindia.com/api/equity-stockIndices?index=NIFTY%2050",
-                headers=_nse_headers, impersonate="chrome", timeout=10
-            )
-            if _idx_resp.status_code == 200:
-                _idx_data = _idx_resp.json()
-                for _item in _idx_data.get('data', []):
-                    if _item.get('symbol') == 'NIFTY 50':
-                        _nse_prev_close = float(_item.get('previousClose', 0))
-                        if _nse_prev_close > 0:
-                            print(f"  ✅ Prev close via NSE API: {_nse_prev_close}")
-                        break
+            _nse_prev_close = float(nifty50_index_quote(nse).get('previousClose', 0) or 0)
+            if _nse_prev_close > 0:
+                print(f"  ✅ Prev close via NSE API: {_nse_prev_close}")
         except Exception as _e:
             print(f"  ⚠️  NSE API prev close failed: {_e}")
 
         # Method 2: yfinance fallback
         if not _nse_prev_close or _nse_prev_close <= 0:
-            import yfinance as _yf
-            _nsei = _yf.Ticker("^NSEI")
             try:
-                _nse_prev_close = float(_nsei.fast_info.get('previous_close', 0) or 0)
+                with YF_LOCK:
+                    _nse_prev_close = float(DATA_PROVIDER.call(
+                        "yfinance", "^NSEI|fast_info.previous_close",
+                        lambda: yf.Ticker("^NSEI").fast_info.get('previous_close', 0)) or 0)
                 if _nse_prev_close > 0:
                     print(f"  ⚠️  Prev close via yfinance fallback: {_nse_prev_close}")
             except Exception:
@@ -2716,9 +3563,8 @@ def log_oi_snapshot(option_analysis, technical, key_levels=None, bias=None):
     ema5_val   = None
     ema13_val  = None
     try:
-        import yfinance as _yf
         # Use yf.download() — yf.Ticker("^NSEI").history() mangles the symbol
-        df_15 = _yf.download("^NSEI", period="5d", interval="15m", progress=False, auto_adjust=True)
+        df_15 = yf_download("^NSEI", period="5d", interval="15m", progress=False, auto_adjust=True)
         if df_15 is not None and len(df_15) >= 20:
             # yf.download may return MultiIndex columns — flatten if needed
             if isinstance(df_15.columns, pd.MultiIndex):
@@ -2771,22 +3617,7 @@ def log_oi_snapshot(option_analysis, technical, key_levels=None, bias=None):
         "strong_resistance": key_levels.get("strong_resistance") if key_levels else None,
     }
 
-    log_file = "oi_log.json"
-    entries  = []
-
-    if os.path.exists(log_file):
-        try:
-            with open(log_file, "r", encoding="utf-8") as f:
-                entries = json.load(f)
-            if not isinstance(entries, list):
-                entries = []
-        except Exception as e:
-            print(f"  ⚠️  Could not read existing oi_log.json: {e} — starting fresh")
-            entries = []
-    else:
-        print("  📭 oi_log.json not found — starting fresh log for today")
-
-    # ── Daily reset: clear previous day entries on every trading day run ──
+    # ── Trading-day gate: weekends / holidays keep the last session's export ──
     today_str  = ist_now.strftime('%d-%b-%Y')
     is_weekday = ist_now.weekday() < 5  # Mon=0 to Fri=4
     is_holiday = today_str in NSE_FO_HOLIDAYS
@@ -2797,34 +3628,29 @@ def log_oi_snapshot(option_analysis, technical, key_levels=None, bias=None):
         print(f"  ⏸️  Not a trading day ({today_str}) — preserving last session data, skipping snapshot")
         return
 
-    # It IS a trading day — always purge any non-today entries before appending
-    if entries:
-        before_count = len(entries)
-        entries = [
-            e for e in entries
-            if e.get('timestamp', '').startswith(today_str)
-        ]
-        removed = before_count - len(entries)
-        if removed > 0:
-            print(f"  🔄 Purged {removed} old entries — keeping only today: {today_str}")
-        else:
-            print(f"  ✅ Log already clean — all entries are from today: {today_str}")
-
-    entries.insert(0, snapshot)
-    entries = entries[:200]
-
-    with open(log_file, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2, ensure_ascii=False)
+    # One appended line per run (at flush); older days stay in their own
+    # segments, and oi_log.json is re-exported from today's segment only.
+    history.add(snapshot)
+    day_count = len(history)
+    chain = option_analysis.get('chain')
+    if chain is not None and len(chain):
+        try:
+            rows = StrikeHistory().append(chain, ist_now)
+            print(f"  🧱 Strike history: {rows} strikes appended")
+        except Exception as e:
+            print(f"  ⚠️  Strike history append failed: {e}")
+    if own_history:
+        history.flush()
 
     print(f"  📊 OI snapshot logged → {ist_now.strftime('%H:%M IST')} | "
           f"CE Δ={ce_chg:+,} | PE Δ={pe_chg:+,} | Diff={diff:+,} | "
           f"PCR={pcr:.2f} | Signal={opt_signal} | Spot={spot} | "
-          f"Move%={nifty_move_pct:+.2f}% | Total entries={len(entries)}"
+          f"Move%={nifty_move_pct:+.2f}% | Today's entries={day_count}"
           if nifty_move_pct is not None else
           f"  📊 OI snapshot logged → {ist_now.strftime('%H:%M IST')} | "
           f"CE Δ={ce_chg:+,} | PE Δ={pe_chg:+,} | Diff={diff:+,} | "
           f"PCR={pcr:.2f} | Signal={opt_signal} | Spot={spot} | "
-          f"Move%=N/A | Total entries={len(entries)}")
+          f"Move%=N/A | Today's entries={day_count}")
 
 
 def build_intraday_oi_tab_html():
@@ -3346,4603 +4172,5330 @@ def build_pretrade_checklist_tab_html():
 
 
 
-class NiftyHTMLAnalyzer:
-    def __init__(self):
-        self.yf_symbol  = "^NSEI"
-        self.nse_symbol = "NIFTY"
-        self.report_lines = []
-        self.html_data    = {}
-        self.heatmap_data = []
-        self.heatmap_timestamp = "N/A"
-        self.heatmap_advance = 0
-        self.heatmap_decline = 0
-        self.heatmap_neutral = 0
+# ═══════════════════════════════════════════════════════════════════════════════
+# SECTION CACHE — rendered HTML sections reused while their inputs are unchanged
+# ═══════════════════════════════════════════════════════════════════════════════
 
-    def log(self, message):
-        print(message)
-        self.report_lines.append(message)
+SECTION_DB = os.path.join(STATE_DIR, "sections.db")
+
+# html_data keys each cached section reads (anything else goes in as explicit extras)
+SECTION_INPUTS = {
+    'signal_bar':   ('bias', 'bullish_score', 'bearish_score', 'has_option_data', 'pcr', 'rsi',
+                     'macd_bullish', 'sma_20_above', 'sma_50_above', 'sma_200_above',
+                     'oi_class', 'oi_signal', 'fii_dii_summ', 'timestamp'),
+    'oi_navy':      ('net_oi_change', 'oi_class', 'oi_direction', 'oi_signal',
+                     'total_ce_oi_change', 'total_pe_oi_change'),
+    'oc_pivot':     ('has_option_data', 'current_price', 'df', 'pcr', 'max_pain', 'max_ce_oi', 'max_pe_oi',
+                     'oi_class', 'oi_direction', 'total_ce_oi_change', 'total_pe_oi_change',
+                     'prev_close', 'prev_high', 'prev_low'),
+    'fiidii':       ('fii_dii_data', 'fii_dii_summ'),
+    'direction':    ('bias', 'confidence', 'bullish_score', 'bearish_score', 'has_option_data',
+                     'current_price', 'atm_strike', 'support', 'resistance', 'max_pain', 'expiry',
+                     'pcr', 'rsi', 'macd_bullish', 'sma_20_above', 'sma_50_above', 'sma_200_above'),
+    'top10_oi':     ('df', 'current_price', 'atm_strike'),
+    'pretrade_tab': (),
+    'oi_trend_tab': (),
+    'weekly_tab':   (),
+    'heatmap_tab':  (),
+}
 
-    def _make_nse_session(self):
-        headers = {
-            "authority": "www.nseindia.com",
-            "accept": "application/json, text/plain, */*",
-            "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "referer": "https://www.nseindia.com/option-chain",
-            "accept-language": "en-US,en;q=0.9",
-        }
-        session = requests.Session()
-        try:
-            session.get("https://www.nseindia.com/", headers=headers, impersonate="chrome", timeout=15)
-            time.sleep(1.5)
-            session.get("https://www.nseindia.com/option-chain", headers=headers, impersonate="chrome", timeout=15)
-            time.sleep(1)
-        except Exception as e:
-            print(f"  ⚠️  Session warm-up warning: {e}")
-        return session, headers
 
-    def get_upcoming_expiry_tuesday(self):
-        ist_tz      = pytz.timezone('Asia/Kolkata')
-        now_ist     = datetime.now(ist_tz)
-        today_ist   = now_ist.date()
-        weekday     = today_ist.weekday()
-        past_cutoff = (now_ist.hour, now_ist.minute) >= (16, 0)
-        if weekday == 1 and not past_cutoff:
-            days_ahead = 0
-        elif weekday == 1 and past_cutoff:
-            days_ahead = 7
-        elif weekday < 1:
-            days_ahead = 1 - weekday
-        else:
-            days_ahead = 8 - weekday
-        raw_tuesday = today_ist + timedelta(days=days_ahead)
-        candidate = raw_tuesday
-        for _ in range(6):
-            cstr       = candidate.strftime('%d-%b-%Y')
-            is_weekend = candidate.weekday() >= 5
-            if cstr not in NSE_FO_HOLIDAYS and not is_weekend:
-                break
-            candidate -= timedelta(days=1)
-        expiry_str = candidate.strftime('%d-%b-%Y')
-        holiday_shifted = (candidate != raw_tuesday)
-        shift_note = f" ⚠️ HOLIDAY SHIFT from {raw_tuesday.strftime('%d-%b-%Y')}" if holiday_shifted else ""
-        print(f"  📅 Now (IST): {now_ist.strftime('%A %d-%b-%Y %H:%M')} | "
-              f"Raw Tue: {raw_tuesday.strftime('%d-%b-%Y')} | "
-              f"Adjusted expiry: {expiry_str}{shift_note} | "
-              f"Past 4PM: {past_cutoff}")
-        return expiry_str
+def _code_version():
+    """Digest of this script — any code edit invalidates every cached section."""
+    import hashlib
+    try:
+        with open(os.path.abspath(__file__), 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()[:12]
+    except OSError:
+        return str(time.time())   # unknown source → never trust old entries
 
-    def fetch_available_expiries(self, session, headers):
-        try:
-            url  = f"https://www.nseindia.com/api/option-chain-v3?type=Indices&symbol={self.nse_symbol}"
-            resp = session.get(url, headers=headers, impersonate="chrome", timeout=20)
-            if resp.status_code == 200:
-                data     = resp.json()
-                expiries = data.get('records', {}).get('expiryDates', [])
-                if expiries:
-                    print(f"  📅 NSE available expiries: {expiries[:5]}")
-                    return expiries[0]
-        except Exception as e:
-            print(f"  ⚠️  Could not fetch expiry list: {e}")
-        return None
 
-    def fetch_nse_option_chain_silent(self):
-        session, headers = self._make_nse_session()
-        real_expiry = self.fetch_available_expiries(session, headers)
-        if real_expiry:
-            print(f"  🗓️  Fetching option chain for NSE live expiry: {real_expiry}")
-            result = self._fetch_chain_for_expiry(session, headers, real_expiry)
-            if result:
-                return result
-            print(f"  ⚠️  Chain data empty for live expiry {real_expiry}. Trying fallback...")
-        computed_expiry = self.get_upcoming_expiry_tuesday()
-        if computed_expiry != real_expiry:
-            print(f"  🔄 Fallback computed expiry: {computed_expiry}")
-            result = self._fetch_chain_for_expiry(session, headers, computed_expiry)
-            if result:
-                return result
-        if real_expiry and real_expiry != computed_expiry:
-            print(f"  🔄 Last attempt with real_expiry: {real_expiry}")
-            result = self._fetch_chain_for_expiry(session, headers, real_expiry)
-            if result:
-                return result
-        print("  ❌ Option chain fetch failed after all attempts.")
-        return None
+class SectionCache:
+    """
+    One row per section name in SQLite: (name, input digest, html). render()
+    hashes the section's declared inputs together with the code version and
+    splices in the stored HTML on a match; otherwise it calls build() and
+    stores the result. Only the latest render per section is kept, and an
+    in-memory copy spares the disk read when the process stays up.
+    """
 
-    def _fetch_chain_for_expiry(self, session, headers, expiry):
-        api_url = (f"https://www.nseindia.com/api/option-chain-v3"
-                   f"?type=Indices&symbol={self.nse_symbol}&expiry={expiry}")
-        for attempt in range(1, 3):
+    def __init__(self, path=SECTION_DB):
+        self.path    = path
+        self.version = _code_version()
+        self._memo   = {}
+        self._lock   = threading.Lock()
+        self.hits    = []
+        self.misses  = []
+
+    def _connect(self):
+        import sqlite3
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        con = sqlite3.connect(self.path, timeout=30)
+        con.execute("""CREATE TABLE IF NOT EXISTS sections (
+                           name TEXT PRIMARY KEY, key TEXT, html TEXT, at REAL)""")
+        return con
+
+    def digest(self, name, inputs):
+        import hashlib, pickle
+        return hashlib.sha1(pickle.dumps((self.version, name, inputs),
+                                         protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+    def render(self, name, data, build, *extra):
+        """HTML of section `name`: cached if SECTION_INPUTS[name] of `data` and `extra` are unchanged."""
+        try:
+            key = self.digest(name, (tuple(data.get(k) for k in SECTION_INPUTS[name]), extra))
+        except Exception as e:
+            print(f"  ⚠️  Section '{name}' not cacheable ({e}) — rendering")
+            return build()
+        with self._lock:
+            memo = self._memo.get(name)
+            if memo is None:
+                try:
+                    with self._connect() as con:
+                        memo = con.execute("SELECT key, html FROM sections WHERE name=?", (name,)).fetchone()
+                except Exception as e:
+                    print(f"  ⚠️  Section cache read failed ({e})")
+            if memo and memo[0] == key:
+                self.hits.append(name)
+                return memo[1]
+        html = build()
+        with self._lock:
+            self._memo[name] = (key, html)
+            self.misses.append(name)
             try:
-                print(f"    Attempt {attempt}: expiry={expiry}")
-                resp = session.get(api_url, headers=headers, impersonate="chrome", timeout=30)
-                print(f"    HTTP {resp.status_code}")
-                if resp.status_code != 200:
-                    time.sleep(2); continue
-                json_data  = resp.json()
-                data       = json_data.get('records', {}).get('data', [])
-                if not data:
-                    print(f"    ⚠️  Empty data for expiry={expiry}"); return None
-                rows = []
-                for item in data:
-                    strike = item.get('strikePrice')
-                    ce = item.get('CE', {}); pe = item.get('PE', {})
-                    rows.append({
-                        'Expiry': expiry, 'Strike': strike,
-                        'CE_LTP': ce.get('lastPrice', 0), 'CE_OI': ce.get('openInterest', 0),
-                        'CE_Vol': ce.get('totalTradedVolume', 0),
-                        'PE_LTP': pe.get('lastPrice', 0), 'PE_OI': pe.get('openInterest', 0),
-                        'PE_Vol': pe.get('totalTradedVolume', 0),
-                        'CE_OI_Change': ce.get('changeinOpenInterest', 0),
-                        'PE_OI_Change': pe.get('changeinOpenInterest', 0),
-                    })
-                df_full    = pd.DataFrame(rows).sort_values('Strike').reset_index(drop=True)
-                underlying = json_data.get('records', {}).get('underlyingValue', 0)
-                atm_strike = round(underlying / 50) * 50
-                all_strikes = sorted(df_full['Strike'].unique())
-                if atm_strike in all_strikes:
-                    atm_idx = all_strikes.index(atm_strike)
-                else:
-                    atm_idx = min(range(len(all_strikes)), key=lambda i: abs(all_strikes[i] - underlying))
-                    atm_strike = all_strikes[atm_idx]
-                lower_idx = max(0, atm_idx - 10); upper_idx = min(len(all_strikes) - 1, atm_idx + 10)
-                selected_strikes = all_strikes[lower_idx: upper_idx + 1]
-                df = df_full[df_full['Strike'].isin(selected_strikes)].reset_index(drop=True)
-                print(f"    ✅ Strikes: {len(df_full)} → ATM±10 filtered: {len(df)}")
-                return {'expiry': expiry, 'df': df, 'raw_data': data,
-                        'underlying': underlying, 'atm_strike': atm_strike}
+                with self._connect() as con:
+                    con.execute("INSERT OR REPLACE INTO sections VALUES (?,?,?,?)", (name, key, html, time.time()))
             except Exception as e:
-                print(f"    ❌ Attempt {attempt} error: {e}"); time.sleep(2)
-        return None
+                print(f"  ⚠️  Section cache write failed ({e})")
+        return html
 
-    def analyze_option_chain_data(self, oc_data):
-        if not oc_data: return None
-        df = oc_data['df']
-        total_ce_oi  = df['CE_OI'].sum(); total_pe_oi  = df['PE_OI'].sum()
-        total_ce_vol = df['CE_Vol'].sum(); total_pe_vol = df['PE_Vol'].sum()
-        pcr_oi  = total_pe_oi  / total_ce_oi  if total_ce_oi  > 0 else 0
-        pcr_vol = total_pe_vol / total_ce_vol if total_ce_vol > 0 else 0
-        total_ce_oi_change = int(df['CE_OI_Change'].sum())
-        total_pe_oi_change = int(df['PE_OI_Change'].sum())
-        net_oi_change = total_ce_oi_change - total_pe_oi_change
-        if   total_ce_oi_change > 0 and total_pe_oi_change < 0:
-            oi_direction,oi_signal,oi_icon,oi_class="Strong Bearish","Call Build-up + Put Unwinding","🔴","bearish"
-        elif total_ce_oi_change < 0 and total_pe_oi_change > 0:
-            oi_direction,oi_signal,oi_icon,oi_class="Strong Bullish","Put Build-up + Call Unwinding","🟢","bullish"
-        elif total_ce_oi_change > 0 and total_pe_oi_change > 0:
-            if   total_pe_oi_change > total_ce_oi_change * 1.5:
-                oi_direction,oi_signal,oi_icon,oi_class="Bullish","Put Build-up Dominant","🟢","bullish"
-            elif total_ce_oi_change > total_pe_oi_change * 1.5:
-                oi_direction,oi_signal,oi_icon,oi_class="Bearish","Call Build-up Dominant","🔴","bearish"
-            else:
-                oi_direction,oi_signal,oi_icon,oi_class="Neutral (High Vol)","Both Calls & Puts Building","🟡","neutral"
-        elif total_ce_oi_change < 0 and total_pe_oi_change < 0:
-            oi_direction,oi_signal,oi_icon,oi_class="Neutral (Unwinding)","Both Calls & Puts Unwinding","🟡","neutral"
-        else:
-            if   net_oi_change > 0: oi_direction,oi_signal,oi_icon,oi_class="Moderately Bearish","Net Call Accumulation","🔴","bearish"
-            elif net_oi_change < 0: oi_direction,oi_signal,oi_icon,oi_class="Moderately Bullish","Net Put Accumulation","🟢","bullish"
-            else:                   oi_direction,oi_signal,oi_icon,oi_class="Neutral","Balanced OI Changes","🟡","neutral"
-        max_ce_oi_row = df.loc[df['CE_OI'].idxmax()]; max_pe_oi_row = df.loc[df['PE_OI'].idxmax()]
-
-        # ── Max Pain: correct industry formula ──────────────────────────────
-        # For each candidate expiry price K, calculate total intrinsic payout
-        # to option holders:
-        #   CE payout at K = Σ max(0, K - strike) × CE_OI   for all strikes
-        #   PE payout at K = Σ max(0, strike - K) × PE_OI   for all strikes
-        # Max pain = strike K where total payout is MINIMUM
-        # (i.e., option writers lose the least → max pain for buyers)
-        strikes   = df['Strike'].values
-        ce_oi_arr = df['CE_OI'].values
-        pe_oi_arr = df['PE_OI'].values
-        min_payout    = float('inf')
-        max_pain_strike = int(df['Strike'].iloc[len(df)//2])   # fallback: middle strike
-
-        for k in strikes:
-            ce_payout = sum(max(0, k - s) * oi for s, oi in zip(strikes, ce_oi_arr))
-            pe_payout = sum(max(0, s - k) * oi for s, oi in zip(strikes, pe_oi_arr))
-            total_payout = ce_payout + pe_payout
-            if total_payout < min_payout:
-                min_payout = total_payout
-                max_pain_strike = int(k)
+    def report(self):
+        """One-line hit/miss summary for the run log, then resets the counters."""
+        line = (f"  🧩 Sections: {len(self.hits)} cached, {len(self.misses)} rendered"
+                + (f" ({', '.join(self.misses)})" if self.misses else ""))
+        self.hits, self.misses = [], []
+        return line
 
-        df['Total_OI'] = df['CE_OI'] + df['PE_OI']
-        return {
-            'expiry': oc_data['expiry'], 'underlying_value': oc_data['underlying'],
-            'atm_strike': oc_data['atm_strike'],
-            'pcr_oi': round(pcr_oi,3), 'pcr_volume': round(pcr_vol,3),
-            'total_ce_oi': int(total_ce_oi), 'total_pe_oi': int(total_pe_oi),
-            'max_ce_oi_strike': int(max_ce_oi_row['Strike']), 'max_ce_oi_value': int(max_ce_oi_row['CE_OI']),
-            'max_pe_oi_strike': int(max_pe_oi_row['Strike']), 'max_pe_oi_value': int(max_pe_oi_row['PE_OI']),
-            'max_pain': max_pain_strike,
-            'total_ce_oi_change': total_ce_oi_change, 'total_pe_oi_change': total_pe_oi_change,
-            'net_oi_change': net_oi_change,
-            'oi_direction': oi_direction, 'oi_signal': oi_signal,
-            'oi_icon': oi_icon, 'oi_class': oi_class, 'df': df,
+
+REPORT_DATA_FILE = "report_data.json"   # per-run hydration payload, next to index.html
+REPORT_DIGESTS   = os.path.join(STATE_DIR, "report_digests.json")   # section digests of the last run
+
+# Per-run stamps kept out of every cache key and section digest: the report is
+# rendered with these marks and they are filled in on output (and by the page's
+# Hydrator, via data-stamp="<name>" elements), so an unchanged run reuses it all.
+RENDER_STAMPS = ('report-ts', 'heatmap-ts')
+
+
+def _stamp_mark(name):
+    return f"@@{name}@@"
+
+
+def _fill_stamps(html, stamps):
+    """Replaces each stamp mark in `html` with its value from {name: value}."""
+    for name, value in stamps.items():
+        html = html.replace(_stamp_mark(name), str(value))
+    return html
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# REPORT STATIC ASSETS (stylesheet + page script)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# "email" mails the static summary profile; "web" mails the full index.html as before
+EMAIL_PROFILE = os.environ.get("NIFTY_EMAIL_PROFILE", "email").strip().lower()
+ASSETS_DIR    = "assets"   # content-hashed CSS/JS, written next to index.html
+
+def _css_rules(css):
+    """Top-level (prelude, body) pairs of a stylesheet, comments dropped."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    rules, depth, start, head = [], 0, 0, ''
+    for i, ch in enumerate(css):
+        if ch == '{':
+            if depth == 0:
+                head, start = css[start:i].strip(), i + 1
+            depth += 1
+        elif ch == '}' and depth:
+            depth -= 1
+            if depth == 0:
+                rules.append((head, css[start:i]))
+                start = i + 1
+    return rules
+
+
+def get_email_css(markup):
+    """get_report_css() cut down to the rules that can match *markup* — the email profile's stylesheet."""
+    classes = {c for m in re.findall(r'class="([^"]*)"', markup) for c in m.split()}
+    ids     = set(re.findall(r'id="([^"]+)"', markup))
+    tags    = {t.lower() for t in re.findall(r'<([a-zA-Z][\w-]*)', markup)} | {'html', 'body'}
+
+    def matches(selectors):
+        for sel in selectors.split(','):
+            sel = re.sub(r'::?[\w-]+(\([^)]*\))?', '', sel)
+            if (all(c in classes for c in re.findall(r'\.([\w-]+)', sel))
+                    and all(i in ids for i in re.findall(r'#([\w-]+)', sel))
+                    and all(t.lower() in tags for t in re.findall(r'(?:^|[\s>+~])([a-zA-Z][\w-]*)', sel))):
+                return True
+        return False
+
+    def compact(body):
+        return re.sub(r'\s*\n\s*', '', body.strip())
+
+    kept, frames = [], {}
+    for head, body in _css_rules(get_report_css()):
+        if head.startswith('@keyframes'):
+            frames[head.split()[-1]] = f"{head}{{{compact(body)}}}"
+        elif head.startswith('@media'):
+            inner = ''.join(f"{h}{{{compact(b)}}}" for h, b in _css_rules(body) if matches(h))
+            if inner:
+                kept.append(f"{head}{{{inner}}}")
+        elif not head.startswith('@') and matches(head):
+            kept.append(f"{head}{{{compact(body)}}}")
+    css = '\n'.join(kept)
+    # Keep only the animations the surviving rules still name (some start from opacity:0)
+    used = [f for name, f in frames.items() if re.search(r'\b' + re.escape(name) + r'\b', css)]
+    return '\n'.join([css] + used)
+
+
+def get_report_css():
+    """Returns the full stylesheet for index.html (heatmap + pre-trade CSS included)."""
+    return ("""        *{margin:0;padding:0;box-sizing:border-box;}
+        html{scroll-behavior:smooth;background:#04080f;}
+        body{font-family:'Rajdhani',sans-serif;background:linear-gradient(135deg,#0f2027 0%,#203a43 50%,#2c5364 100%);min-height:100vh;padding:0;color:#c8d8e0;overflow-x:hidden;-webkit-text-size-adjust:100%;animation:pageIn 0.35s ease forwards;}
+        @keyframes pageIn{from{opacity:0;}to{opacity:1;}}
+
+        .tab-nav{display:flex;gap:0;border-bottom:2px solid rgba(79,195,247,0.2);overflow-x:auto;scrollbar-width:none;background:linear-gradient(135deg,#0f2027,#203a43);}
+        .tab-nav::-webkit-scrollbar{display:none;}
+        .tab-btn{display:flex;align-items:center;gap:8px;padding:13px clamp(14px,2.5vw,28px);font-family:'Oxanium',sans-serif;font-size:clamp(10px,1.4vw,13px);font-weight:700;letter-spacing:1.5px;text-transform:uppercase;color:rgba(176,190,197,0.5);cursor:pointer;border:none;background:transparent;border-bottom:3px solid transparent;white-space:nowrap;transition:all 0.25s ease;position:relative;bottom:-2px;}
+        .tab-btn:hover{color:#4fc3f7;background:rgba(79,195,247,0.05);}
+        .tab-btn.active{color:#4fc3f7;border-bottom-color:#4fc3f7;background:rgba(79,195,247,0.08);}
+        .tab-dot{width:7px;height:7px;border-radius:50%;background:rgba(79,195,247,0.3);flex-shrink:0;transition:all 0.25s ease;}
+        .tab-btn.active .tab-dot{background:#4fc3f7;box-shadow:0 0 8px #4fc3f7;}
+        .tab-badge{font-size:9px;padding:2px 7px;border-radius:10px;background:rgba(79,195,247,0.12);border:1px solid rgba(79,195,247,0.25);color:#4fc3f7;}
+        .new-badge .tab-badge{background:rgba(0,230,118,0.12);border-color:rgba(0,230,118,0.3);color:#00e676;}
+        .tab-panel{display:none;}
+        .tab-panel.active{display:block;}
+
+        .container{max-width:100%;width:100%;margin:0;background:rgba(15,32,39,0.85);backdrop-filter:blur(20px);border-radius:0;overflow:visible;box-shadow:0 20px 60px rgba(0,0,0,0.5);border:none;min-width:0;}
+
+        /* ══ OPTION B HEADER ══════════════════════════════════════════ */
+        .header{background:linear-gradient(180deg,#061828 0%,#04111f 100%);border-bottom:2px solid rgba(79,195,247,0.2);padding:0;position:sticky;top:0;z-index:150;overflow:hidden;}
+        .header::before{content:'';position:absolute;inset:0;background:radial-gradient(circle at 30% 50%,rgba(79,195,247,0.05) 0%,transparent 60%);pointer-events:none;}
+
+        /* Banner row */
+        .hb-banner{display:flex;align-items:center;justify-content:space-between;padding:14px 22px;border-bottom:1px solid rgba(79,195,247,0.12);flex-wrap:wrap;gap:12px;position:relative;z-index:1;}
+        .hb-left{display:flex;align-items:center;gap:14px;}
+        .hb-nse-badge{padding:5px 14px;border-radius:6px;font-family:'Oxanium',sans-serif;font-size:13px;font-weight:900;letter-spacing:2px;color:#000;background:linear-gradient(135deg,#4fc3f7,#00e5ff);flex-shrink:0;}
+        .hb-title-main{font-family:'Oxanium',sans-serif;font-size:clamp(18px,2.5vw,26px);font-weight:900;color:#ffffff;letter-spacing:0.5px;}
+        .hb-title-sub{font-size:11px;letter-spacing:2px;color:#4fc3f7;text-transform:uppercase;margin-top:4px;font-weight:700;}
+        .hb-chips{display:flex;gap:8px;flex-wrap:wrap;}
+        .hb-chip{text-align:center;padding:7px 16px;border-radius:9px;background:rgba(0,0,0,0.4);border:1px solid rgba(79,195,247,0.22);flex-shrink:0;}
+        .hb-chip-lbl{font-family:'JetBrains Mono',monospace;font-size:10px;letter-spacing:1.5px;color:#80deea;text-transform:uppercase;margin-bottom:4px;font-weight:700;}
+        .hb-chip-val{font-family:'Oxanium',sans-serif;font-size:17px;font-weight:800;line-height:1;}
+
+        /* Status row */
+        .hb-status{display:flex;align-items:center;justify-content:space-between;padding:9px 22px;background:rgba(0,0,0,0.3);flex-wrap:wrap;gap:8px;position:relative;z-index:1;border-bottom:1px solid rgba(79,195,247,0.08);}
+        .hb-s-item{display:flex;align-items:center;gap:6px;font-family:'JetBrains Mono',monospace;font-size:12px;color:#c8dde8;white-space:nowrap;font-weight:600;}
+        .hb-s-dot{width:8px;height:8px;border-radius:50%;flex-shrink:0;animation:sb-pulse 2s ease-in-out infinite;}
+        .hb-s-val{font-weight:700;color:#ffffff;margin-left:3px;font-size:13px;}
+
+        /* Tabs */
+        .tab-nav{display:flex;gap:0;border-bottom:none;overflow-x:auto;scrollbar-width:none;background:rgba(0,0,0,0.2);position:relative;z-index:1;}
+        .tab-nav::-webkit-scrollbar{display:none;}
+        .tab-btn{display:flex;align-items:center;gap:8px;padding:13px clamp(14px,2vw,24px);font-family:'Oxanium',sans-serif;font-size:clamp(11px,1.4vw,13px);font-weight:700;letter-spacing:1.5px;text-transform:uppercase;color:rgba(200,221,232,0.65);cursor:pointer;border:none;background:transparent;border-bottom:2px solid transparent;white-space:nowrap;transition:all 0.2s ease;position:relative;bottom:-1px;}
+        .tab-btn:hover{color:#4fc3f7;background:rgba(79,195,247,0.05);}
+        .tab-btn.active{color:#4fc3f7;border-bottom-color:#4fc3f7;background:rgba(79,195,247,0.07);}
+        .tab-dot{width:6px;height:6px;border-radius:50%;background:rgba(79,195,247,0.3);flex-shrink:0;transition:all 0.25s ease;}
+        .tab-btn.active .tab-dot{background:#4fc3f7;box-shadow:0 0 8px #4fc3f7;}
+        .tab-badge{font-size:8px;padding:2px 6px;border-radius:8px;background:rgba(79,195,247,0.12);border:1px solid rgba(79,195,247,0.25);color:#4fc3f7;}
+        .new-badge .tab-badge{background:rgba(192,132,252,0.12);border-color:rgba(192,132,252,0.3);color:#c084fc;}
+        .tab-panel{display:none;}
+        .tab-panel.active{display:block;}
+
+        /* Status bar dots kept for JS compatibility */
+        .sb-dot-gen{background:#00e676;box-shadow:0 0 8px #00e676;}
+        .sb-dot-clock{background:#4fc3f7;box-shadow:0 0 8px #4fc3f7;}
+        .sb-dot-cd{background:#b388ff;box-shadow:0 0 8px #b388ff;}
+        @keyframes sb-pulse{50%{opacity:0.25;}}
+
+        /* Responsive header */
+        @media(max-width:900px){
+            .hb-chips .hb-chip:nth-child(n+4){display:none;}
+        }
+        @media(max-width:600px){
+            .hb-banner{padding:10px 12px;gap:8px;}
+            .hb-chips{display:none;}
+            .hb-title-main{font-size:13px;}
+            .hb-status{padding:6px 12px;gap:4px;}
+            .hb-s-item{font-size:9px;}
+            .tab-btn{padding:9px 10px;font-size:9px;letter-spacing:0.8px;}
         }
 
-    def get_technical_data(self):
-        try:
-            print("Calculating technical indicators...")
-            nifty = yf.Ticker(self.yf_symbol)
-            df = nifty.history(period="1y")
-            if df.empty: print("Warning: Failed to fetch historical data"); return None
-            df['SMA_20']  = df['Close'].rolling(20).mean()
-            df['SMA_50']  = df['Close'].rolling(50).mean()
-            df['SMA_200'] = df['Close'].rolling(200).mean()
-            delta = df['Close'].diff()
-            gain  = delta.where(delta > 0, 0).rolling(14).mean()
-            loss  = (-delta.where(delta < 0, 0)).rolling(14).mean()
-            df['RSI']    = 100 - (100 / (1 + gain / loss))
-            df['EMA_12'] = df['Close'].ewm(span=12, adjust=False).mean()
-            df['EMA_26'] = df['Close'].ewm(span=26, adjust=False).mean()
-            df['MACD']   = df['EMA_12'] - df['EMA_26']
-            df['Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
+        .section{padding:clamp(14px,2.5vw,28px) clamp(12px,2.5vw,26px);border-bottom:1px solid rgba(79,195,247,0.08);}
+        .section:last-child{border-bottom:none;}
+        .section-title{font-family:'Oxanium',sans-serif;font-size:clamp(10px,1.5vw,13px);font-weight:700;letter-spacing:clamp(1px,0.3vw,2.5px);color:#4fc3f7;text-transform:uppercase;display:flex;align-items:center;gap:10px;margin-bottom:clamp(12px,2vw,20px);padding-bottom:12px;border-bottom:1px solid rgba(79,195,247,0.18);flex-wrap:wrap;}
+        .section-title span{font-size:clamp(14px,2vw,18px);}
 
-            # ── Use last non-NaN row for MACD/Signal (handles mid-session NaN) ──
-            df_clean = df.dropna(subset=['MACD', 'Signal'])
-            latest = df.iloc[-1]
-            macd_val   = float(df_clean['MACD'].iloc[-1])   if not df_clean.empty else float('nan')
-            signal_val = float(df_clean['Signal'].iloc[-1]) if not df_clean.empty else float('nan')
-            # Previous row for histogram slope (early crossover detection)
-            macd_prev_val   = float(df_clean['MACD'].iloc[-2])   if len(df_clean) >= 2 else macd_val
-            signal_prev_val = float(df_clean['Signal'].iloc[-2]) if len(df_clean) >= 2 else signal_val
-            current_price = latest['Close']
-            print("  Fetching 1H candles for Key Levels (tiered lookback: 6M → 1Y → wide window)...")
-            from datetime import datetime, timedelta
 
-            end_date  = datetime.today()
-            start_6m  = end_date - timedelta(days=180)
-            start_1yr = end_date - timedelta(days=365)
+        /* ── COMPACT STAT CARDS ─────────────────────────────────── */
+        .g-compact{background:#111827;border:1px solid #1e2a3a;border-radius:8px;padding:8px 10px;position:relative;overflow:hidden;transition:transform .2s,border-color .2s;}
+        .g-compact:hover{transform:translateY(-2px);border-color:rgba(79,195,247,0.4)!important;}
+        /* ── ENHANCED STAT CARDS ──────────────────────────────────── */
+        .g-compact{transition:transform .25s ease,border-color .25s ease,box-shadow .25s ease;}
+        .g-compact:hover{transform:translateY(-4px)!important;box-shadow:0 16px 40px rgba(0,0,0,0.45)!important;}
+        .cc-top{display:flex;align-items:center;gap:6px;margin-bottom:4px;}
+        .cc-ico{font-size:13px;line-height:1;flex-shrink:0;}
+        .cc-lbl{font-size:8px;letter-spacing:.1em;text-transform:uppercase;color:#8896b3;font-weight:600;flex:1;}
+        .cc-val{font-family:'JetBrains Mono',monospace;font-size:19px;font-weight:700;line-height:1;color:#e2e8f8;margin-bottom:4px;letter-spacing:-.02em;overflow:hidden;text-overflow:ellipsis;white-space:nowrap;}
+        .cc-sub{font-size:8px;color:#4a5578;margin-bottom:3px;font-family:'JetBrains Mono',monospace;}
+        .cc-bar{height:2px;background:#1e2a3a;border-radius:1px;overflow:hidden;}
+        .cc-bar-fill{height:100%;border-radius:1px;}
+        .cc-bar-fill.bar-teal{background:linear-gradient(90deg,#00bcd4,#4fc3f7);}
+        .cc-bar-fill.bar-red{background:linear-gradient(90deg,#f44336,#ff5722);}
+        .cc-bar-fill.bar-gold{background:linear-gradient(90deg,#ffb74d,#ffd54f);}
+        .g-compact .tag{font-size:8px;padding:1px 6px;border-radius:3px;white-space:nowrap;flex-shrink:0;}
+        .g{background:rgba(255,255,255,0.04);backdrop-filter:blur(20px);-webkit-backdrop-filter:blur(20px);border:1px solid rgba(79,195,247,0.18);border-radius:16px;position:relative;overflow:hidden;transition:all 0.35s cubic-bezier(0.4,0,0.2,1);min-width:0;}
+        .g::before{content:'';position:absolute;top:0;left:0;right:0;height:1px;background:linear-gradient(90deg,transparent,rgba(255,255,255,0.25),transparent);z-index:1;}
+        .g::after{content:'';position:absolute;top:-60%;left:-30%;width:50%;height:200%;background:linear-gradient(105deg,transparent,rgba(255,255,255,0.04),transparent);transform:skewX(-15deg);transition:left 0.6s ease;z-index:0;}
+        .g:hover::after{left:130%;}
+        .g:hover{background:rgba(79,195,247,0.09);border-color:rgba(79,195,247,0.45);box-shadow:0 12px 40px rgba(0,0,0,0.35),inset 0 1px 0 rgba(255,255,255,0.1);transform:translateY(-4px);}
+        .g-hi{background:rgba(79,195,247,0.09);border-color:rgba(79,195,247,0.35);}
+        .g-red{background:rgba(244,67,54,0.06);border-color:rgba(244,67,54,0.25);}
+        .g-red:hover{background:rgba(244,67,54,0.1);border-color:rgba(244,67,54,0.45);}
+        .card-grid{display:grid;gap:6px;}
+        .grid-5{grid-template-columns:repeat(5,minmax(0,1fr));}
+        .grid-4{grid-template-columns:repeat(4,minmax(0,1fr));}
+        .g .card-top-row{display:flex;align-items:center;gap:10px;margin-bottom:10px;position:relative;z-index:2;padding:14px 16px 0;}
+        .card-ico{font-size:clamp(16px,2vw,22px);line-height:1;flex-shrink:0;}
+        .lbl{font-size:clamp(8px,1vw,9px);letter-spacing:2.5px;color:rgba(128,222,234,0.65);text-transform:uppercase;font-weight:600;line-height:1.3;word-break:break-word;}
+        .val{font-family:'Oxanium',sans-serif;font-size:clamp(16px,2.5vw,24px);font-weight:700;color:#fff;display:block;margin-bottom:10px;position:relative;z-index:2;padding:0 16px;word-break:break-word;overflow:hidden;text-overflow:ellipsis;}
+        .bar-wrap{height:5px;background:rgba(0,0,0,0.35);border-radius:3px;margin:0 16px 12px;overflow:hidden;position:relative;z-index:2;}
+        .bar-fill{height:100%;border-radius:3px;transition:width 1.2s cubic-bezier(0.4,0,0.2,1);}
+        .bar-teal{background:linear-gradient(90deg,#00bcd4,#4fc3f7);box-shadow:0 0 8px rgba(79,195,247,0.6);}
+        .bar-red{background:linear-gradient(90deg,#f44336,#ff5722);box-shadow:0 0 8px rgba(244,67,54,0.5);}
+        .bar-gold{background:linear-gradient(90deg,#ffb74d,#ffd54f);box-shadow:0 0 8px rgba(255,183,77,0.5);}
+        .card-foot{display:flex;justify-content:space-between;align-items:center;padding:0 16px 14px;position:relative;z-index:2;flex-wrap:wrap;gap:4px;}
+        .sub{font-size:10px;color:#8fa8b8;font-family:'JetBrains Mono',monospace;}
+        .tag{display:inline-flex;align-items:center;padding:3px 11px;border-radius:20px;font-size:clamp(9px,1.2vw,11px);font-weight:700;letter-spacing:0.5px;font-family:'Rajdhani',sans-serif;white-space:nowrap;}
+        .tag-neu{background:rgba(255,183,77,0.15);color:#ffb74d;border:1px solid rgba(255,183,77,0.35);}
+        .tag-bull{background:rgba(0,229,255,0.12);color:#00e5ff;border:1px solid rgba(0,229,255,0.35);}
+        .tag-bear{background:rgba(255,82,82,0.12);color:#ff5252;border:1px solid rgba(255,82,82,0.35);}
+
+        .snap-grid{display:grid;grid-template-columns:repeat(3,minmax(0,1fr));gap:14px;}
+        .snap-card{padding:18px 16px;}
+        .snap-card .card-top-row{margin-bottom:8px;padding:0;}
+        .snap-card .val{font-size:clamp(18px,3vw,26px);padding:0;margin-bottom:0;}
+
+        .md-widget{position:relative;overflow:hidden;background:linear-gradient(135deg,rgba(255,255,255,0.07),rgba(255,255,255,0.02));border:1px solid rgba(255,255,255,0.1);border-radius:16px;padding:10px 16px;backdrop-filter:blur(20px);display:flex;flex-direction:column;gap:4px;}
+        .md-glow{position:absolute;top:-80%;left:-80%;width:260%;height:260%;background:conic-gradient(from 180deg,#ff6b35 0deg,#ffcd3c 120deg,#4ecdc4 240deg,#ff6b35 360deg);opacity:0.05;animation:md-rotate 8s linear infinite;border-radius:50%;pointer-events:none;}
+        @keyframes md-rotate{to{transform:rotate(360deg);}}
+        .md-row-top{display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:8px;position:relative;z-index:1;}
+        .md-label{display:flex;align-items:center;gap:7px;font-family:'Space Mono',monospace;font-size:clamp(7px,1vw,8px);letter-spacing:3px;color:rgba(255,255,255,0.3);text-transform:uppercase;}
+        .md-live-dot{width:6px;height:6px;border-radius:50%;background:#4ecdc4;box-shadow:0 0 8px #4ecdc4;animation:md-pulse 2s ease-in-out infinite;flex-shrink:0;}
+        @keyframes md-pulse{50%{opacity:0.25;}}
+        .md-pills-top{display:flex;gap:8px;flex-wrap:wrap;}
+        .md-pill{font-family:'Space Mono',monospace;font-size:clamp(8px,1.2vw,10px);font-weight:700;padding:4px clamp(8px,1.5vw,14px);border-radius:20px;letter-spacing:1px;white-space:nowrap;}
+        .md-pill-bull{background:rgba(78,205,196,0.12);border:1px solid rgba(78,205,196,0.4);color:#4ecdc4;}
+        .md-pill-bear{background:rgba(255,100,100,0.12);border:1px solid rgba(255,100,100,0.4);color:#ff6b6b;}
+        .md-pill-conf-high{background:rgba(78,205,196,0.12);border:1px solid rgba(78,205,196,0.35);color:#4ecdc4;}
+        .md-pill-conf-med{background:rgba(255,205,60,0.12);border:1px solid rgba(255,205,60,0.35);color:#ffcd3c;}
+        .md-pill-conf-low{background:rgba(255,107,107,0.12);border:1px solid rgba(255,107,107,0.35);color:#ff6b6b;}
+        .md-row-bottom{display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:8px;position:relative;z-index:1;}
+        .md-direction{font-family:'Orbitron',monospace;font-weight:900;font-size:clamp(16px,2.8vw,22px);letter-spacing:clamp(0.5px,0.2vw,1.5px);line-height:1;}
+
+        .logic-box{background:rgba(79,195,247,0.04);border:1px solid rgba(79,195,247,0.14);border-left:3px solid #4fc3f7;border-radius:10px;padding:10px 16px;margin-top:12px;}
+        .logic-box-head{font-family:'Oxanium',sans-serif;font-size:10px;font-weight:700;color:#4fc3f7;letter-spacing:2px;margin-bottom:7px;}
+        .logic-grid{display:grid;grid-template-columns:1fr 1fr;gap:5px 20px;}
+        .logic-item{display:flex;align-items:center;gap:7px;font-size:clamp(10px,1.3vw,11px);color:rgba(176,190,197,0.6);flex-wrap:wrap;}
+        .logic-item .lv{font-family:'JetBrains Mono',monospace;font-size:10px;color:rgba(176,190,197,0.4);}
+        .lc-bull{display:inline-flex;align-items:center;font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:600;padding:2px 8px;border-radius:4px;white-space:nowrap;background:rgba(0,230,118,0.1);color:#00e676;border:1px solid rgba(0,230,118,0.28);}
+        .lc-bear{display:inline-flex;align-items:center;font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:600;padding:2px 8px;border-radius:4px;white-space:nowrap;background:rgba(255,82,82,0.1);color:#ff5252;border:1px solid rgba(255,82,82,0.28);}
+        .lc-side{display:inline-flex;align-items:center;font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:600;padding:2px 8px;border-radius:4px;white-space:nowrap;background:rgba(255,183,77,0.1);color:#ffb74d;border:1px solid rgba(255,183,77,0.28);}
+        .lc-info{display:inline-flex;align-items:center;font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:600;padding:2px 8px;border-radius:4px;white-space:nowrap;background:rgba(79,195,247,0.08);color:#4fc3f7;border:1px solid rgba(79,195,247,0.22);}
+
+        .rl-node-a{position:absolute;bottom:0;transform:translateX(-50%);text-align:center;}
+        .rl-node-b{position:absolute;top:0;transform:translateX(-50%);text-align:center;}
+        .rl-dot{width:12px;height:12px;border-radius:50%;border:2px solid rgba(10,20,35,0.9);}
+        .rl-lbl{font-size:clamp(7px,1vw,10px);font-weight:700;text-transform:uppercase;letter-spacing:0.4px;line-height:1.3;white-space:nowrap;color:#c8d8e0;}
+        .rl-val{font-size:clamp(9px,1.3vw,13px);font-weight:700;color:#fff;white-space:nowrap;margin-top:2px;}
+        /* Mobile key levels: hide absolute labels, show compact table instead */
+        .kl-mobile-table{display:none;width:100%;border-collapse:collapse;font-family:'JetBrains Mono',monospace;font-size:11px;margin-top:10px;}
+        .kl-mobile-table td{padding:6px 10px;border-bottom:1px solid rgba(79,195,247,0.08);}
+        .kl-mobile-table td:last-child{text-align:right;font-weight:700;}
+        .kl-bar-section{display:block;}
+        @media(max-width:520px){
+            .kl-bar-section{display:none;}
+            .kl-mobile-table{display:table;}
+        }
 
-            s1 = s2 = r1 = r2 = None
+        .pf-live-badge{display:inline-block;padding:2px 10px;border-radius:10px;font-size:10px;font-weight:700;letter-spacing:1px;}
+        .pf-live{background:rgba(0,230,118,0.1);color:#00e676;border:1px solid rgba(0,230,118,0.3);}
+        .pf-estimated{background:rgba(255,138,101,0.1);color:#ff8a65;border:1px solid rgba(255,138,101,0.3);}
+        .pf-date-range{font-size:11px;color:#80deea;font-weight:400;letter-spacing:1px;}
 
-            def _find_levels(highs, lows, price, window):
-                res_c = [h for h in highs if price < h <= price + window]
-                sup_c = [l for l in lows  if price - window <= l < price]
-                return res_c, sup_c
+        /* ── Option 2: Horizontal Flow Meters ── */
+        .pf2-meter-row{margin-bottom:16px;}
+        .pf2-meter-head{display:flex;align-items:center;justify-content:space-between;margin-bottom:8px;flex-wrap:wrap;gap:6px;}
+        .pf2-meter-labels{display:flex;align-items:baseline;gap:10px;}
+        .pf2-lbl{font-family:'Oxanium',sans-serif;font-size:18px;font-weight:800;color:#e0f7fa;letter-spacing:1px;}
+        .pf2-sublbl{font-size:11px;letter-spacing:1.5px;color:rgba(128,222,234,0.6);text-transform:uppercase;font-weight:600;}
+        .pf2-val{font-family:'JetBrains Mono',monospace;font-size:clamp(16px,2.5vw,22px);font-weight:700;letter-spacing:-0.5px;}
+        .pf2-unit{font-size:10px;color:rgba(128,222,234,0.4);font-weight:400;letter-spacing:1px;}
+        .pf2-track{height:10px;background:rgba(0,0,0,0.4);border-radius:5px;overflow:hidden;}
+        .pf2-fill{height:100%;border-radius:5px;transition:width 1s ease;}
 
-            # Step 1: 6 months of 1H data
-            try:
-                df_6m = nifty.history(interval="1h", start=start_6m, end=end_date)
-                if not df_6m.empty:
-                    highs_6m = sorted(df_6m['High'].values)
-                    lows_6m  = sorted(df_6m['Low'].values)
-                    res_c, sup_c = _find_levels(highs_6m, lows_6m, current_price, 300)
-                    print(f"  6M 1H: {len(df_6m)} candles | res_c={len(res_c)} sup_c={len(sup_c)}")
-                else:
-                    res_c, sup_c = [], []
-            except Exception as e:
-                print(f"  ⚠️  6M 1H fetch failed: {e}")
-                res_c, sup_c = [], []
+        /* Daily net dot chips */
+        .pf2-dots-wrap{display:grid;grid-template-columns:repeat(10,minmax(0,1fr));gap:6px;margin:16px 0;}
+        .pf2-dot{border:1px solid;border-radius:8px;padding:6px 4px;text-align:center;}
+        .pf2-dot-date{font-size:9px;letter-spacing:0.5px;color:rgba(128,222,234,0.45);margin-bottom:4px;font-family:'JetBrains Mono',monospace;}
+        .pf2-dot-net{font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;}
+
+        .pf-avg-strip{display:grid;grid-template-columns:1fr auto 1fr auto 1fr;align-items:center;background:rgba(6,13,20,0.75);border:1px solid rgba(79,195,247,0.1);border-radius:14px;padding:18px 24px;margin-bottom:16px;}
+        .pf-avg-cell{text-align:center;min-width:0;}
+        .pf-avg-eyebrow{font-size:10px;letter-spacing:2px;color:rgba(79,195,247,0.7);text-transform:uppercase;margin-bottom:6px;font-weight:700;}
+        .pf-avg-val{font-family:'Oxanium',sans-serif;font-size:clamp(20px,3vw,28px);font-weight:800;line-height:1;letter-spacing:-0.5px;word-break:break-word;}
+        .pf-avg-unit{font-size:9px;color:#8899aa;margin-top:3px;letter-spacing:1px;}
+        .pf-avg-sep{width:1px;height:48px;background:rgba(79,195,247,0.2);margin:0 16px;flex-shrink:0;}
+        .pf-insight-box{border-radius:12px;padding:16px 18px;}
+        .pf-insight-header{display:flex;align-items:center;gap:10px;margin-bottom:10px;flex-wrap:wrap;}
+        .pf-insight-lbl{font-size:10px;letter-spacing:2px;font-weight:700;text-transform:uppercase;}
+        .pf-verdict-badge{display:inline-block;padding:3px 14px;border-radius:20px;font-size:clamp(10px,1.5vw,11px);font-weight:800;letter-spacing:1px;white-space:nowrap;}
+        .pf-insight-text{font-size:clamp(12px,1.5vw,13px);color:#cfd8dc;line-height:1.85;font-weight:500;}
+
+        @media(max-width:768px){
+            .pf2-dots-wrap{grid-template-columns:repeat(5,minmax(0,1fr));}
+            .pf2-lbl{font-size:16px;}
+            .pf2-val{font-size:15px;}
+            .pf-avg-strip{grid-template-columns:1fr;gap:0;padding:14px;}
+            .pf-avg-sep{display:none;}
+            .pf-avg-cell{display:flex;align-items:center;justify-content:space-between;padding:8px 0;border-bottom:1px solid rgba(79,195,247,0.07);}
+            .pf-avg-cell:last-child{border-bottom:none;}
+            .pf-avg-eyebrow{margin-bottom:0;}
+        }
+        @media(max-width:480px){
+            .pf2-dots-wrap{grid-template-columns:repeat(5,minmax(0,1fr));gap:4px;}
+            .pf2-dot{padding:5px 2px;}
+            .pf2-dot-net{font-size:10px;}
+        }
 
-            # Step 2: expand to 1 year if not enough
-            if len(res_c) < 2 or len(sup_c) < 2:
-                print("  🔄 6M insufficient — expanding to 1 year")
-                try:
-                    df_1yr = nifty.history(interval="1h", start=start_1yr, end=end_date)
-                    if not df_1yr.empty:
-                        highs_1yr = sorted(df_1yr['High'].values)
-                        lows_1yr  = sorted(df_1yr['Low'].values)
-                        res_c, sup_c = _find_levels(highs_1yr, lows_1yr, current_price, 300)
-                        print(f"  1Y 1H: {len(df_1yr)} candles | res_c={len(res_c)} sup_c={len(sup_c)}")
-                    else:
-                        res_c, sup_c = [], []
-                except Exception as e:
-                    print(f"  ⚠️  1Y 1H fetch failed: {e}")
-                    res_c, sup_c = [], []
+        .nc-section-header{display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:10px;margin-bottom:18px;padding-bottom:14px;border-bottom:1px solid rgba(79,195,247,0.14);}
+        .nc-header-left{display:flex;align-items:center;gap:14px;}
+        .nc-header-icon{width:44px;height:44px;border-radius:10px;background:linear-gradient(135deg,#1e3a5f,#1a3052);border:1px solid rgba(79,195,247,0.3);display:flex;align-items:center;justify-content:center;font-size:20px;flex-shrink:0;box-shadow:0 4px 14px rgba(79,195,247,0.15);}
+        .nc-header-title{font-family:'Outfit',sans-serif;font-size:clamp(15px,2vw,19px);font-weight:700;color:#e2eaf5;letter-spacing:0.3px;}
+        .nc-header-sub{font-family:'Outfit',sans-serif;font-size:13px;font-weight:500;color:#a8c4d8;margin-top:2px;letter-spacing:0.5px;}
+        .nc-atm-badge{background:#1f2a42;color:#60a5fa;font-family:'Outfit',sans-serif;font-size:12px;font-weight:700;padding:6px 16px;border-radius:20px;letter-spacing:1.5px;border:1px solid rgba(96,165,250,0.25);box-shadow:0 2px 10px rgba(96,165,250,0.1);white-space:nowrap;}
+        .nc-dir-box{border-radius:14px;padding:clamp(14px,2vw,20px) clamp(14px,2vw,22px);margin-bottom:18px;box-shadow:0 4px 24px rgba(0,0,0,0.3);}
+        .nc-dir-bar{width:4px;border-radius:2px;flex-shrink:0;min-height:60px;}
+        .nc-dir-tag{font-family:'Outfit',sans-serif;font-size:11px;font-weight:700;letter-spacing:2px;color:#a8c4d8;text-transform:uppercase;margin-bottom:6px;}
+        .nc-dir-name{font-family:'Outfit',sans-serif;font-size:clamp(18px,3vw,28px);font-weight:700;line-height:1;margin-bottom:6px;letter-spacing:-0.5px;}
+        .nc-dir-signal{font-family:'Outfit',sans-serif;font-size:clamp(10px,1.3vw,12px);font-weight:400;}
+        .nc-meters-panel{display:flex;flex-direction:column;gap:14px;min-width:180px;justify-content:center;}
+        .nc-meter-row{display:flex;flex-direction:column;gap:5px;}
+        .nc-meter-head-row{display:flex;justify-content:space-between;align-items:center;}
+        .nc-meter-label{font-family:'Outfit',sans-serif;font-size:9px;font-weight:700;letter-spacing:2px;color:rgba(148,163,184,0.45);text-transform:uppercase;}
+        .nc-meter-track{position:relative;height:8px;background:rgba(0,0,0,0.4);border-radius:4px;overflow:visible;width:clamp(120px,20vw,200px);}
+        .nc-meter-fill{height:100%;border-radius:4px;}
+        .nc-meter-head{position:absolute;top:50%;transform:translate(-50%,-50%);width:14px;height:14px;border-radius:50%;border:2px solid rgba(10,18,30,0.85);}
+        .nc-meter-pct{font-family:'Oxanium',sans-serif;font-size:clamp(12px,1.8vw,15px);font-weight:700;letter-spacing:0.5px;}
+        .nc-cards-grid{display:grid;grid-template-columns:repeat(3,minmax(0,1fr));gap:14px;}
+        .nc-card{background:rgba(20,28,45,0.85);border:1px solid rgba(79,195,247,0.12);border-radius:14px;padding:clamp(12px,2vw,18px) clamp(12px,2vw,18px) 14px;transition:all 0.3s ease;position:relative;overflow:hidden;min-width:0;}
+        .nc-card::before{content:'';position:absolute;top:0;left:0;right:0;height:1px;background:linear-gradient(90deg,transparent,rgba(255,255,255,0.1),transparent);}
+        .nc-card:hover{border-color:rgba(79,195,247,0.3);background:rgba(25,35,55,0.9);transform:translateY(-3px);box-shadow:0 10px 30px rgba(0,0,0,0.3);}
+        .nc-card-header{display:flex;align-items:center;justify-content:space-between;margin-bottom:12px;flex-wrap:wrap;gap:4px;}
+        .nc-card-label{font-family:'Outfit',sans-serif;font-size:clamp(8px,1.2vw,10px);font-weight:700;letter-spacing:2px;color:rgba(148,163,184,0.6);text-transform:uppercase;}
+        .nc-card-value{font-family:'Oxanium',sans-serif;font-size:clamp(20px,3.5vw,30px);font-weight:700;line-height:1;margin-bottom:6px;letter-spacing:-0.5px;word-break:break-word;}
+        .nc-card-sub{font-family:'JetBrains Mono',monospace;font-size:10px;color:rgba(100,116,139,0.7);margin-bottom:14px;}
+        .nc-card-btn{display:block;width:100%;padding:9px 14px;border-radius:7px;text-align:center;font-family:'Outfit',sans-serif;font-size:clamp(11px,1.5vw,13px);font-weight:700;letter-spacing:0.5px;cursor:default;}
+
+        .annot-badge{font-size:9px;padding:2px 10px;border-radius:8px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.25);color:#00e676;font-family:'JetBrains Mono',monospace;letter-spacing:1px;font-weight:700;white-space:nowrap;}
+        .na-inline{color:rgba(176,190,197,0.3);font-family:'JetBrains Mono',monospace;font-size:13px;}
+        .o5-wrap{border-radius:16px;overflow:hidden;border:1px solid rgba(239,68,68,0.2);background:rgba(6,10,18,0.97);margin-bottom:0;}
+        .o5-top-banner{background:linear-gradient(90deg,rgba(239,68,68,0.12),rgba(185,28,28,0.06),transparent);border-bottom:1px solid rgba(239,68,68,0.12);padding:16px 22px;display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:14px;}
+        .o5-banner-left{display:flex;align-items:center;gap:16px;flex-wrap:wrap;}
+        .o5-score-circle{width:62px;height:62px;border-radius:50%;background:rgba(239,68,68,0.08);border:2px solid;display:flex;flex-direction:column;align-items:center;justify-content:center;flex-shrink:0;}
+        .o5-score-num{font-family:'Orbitron',monospace;font-size:22px;font-weight:900;line-height:1;}
+        .o5-score-lbl{font-family:'JetBrains Mono',monospace;font-size:9px;letter-spacing:1.5px;text-transform:uppercase;opacity:0.75;margin-top:2px;}
+        .o5-verdict{font-family:'Orbitron',monospace;font-size:clamp(17px,2.4vw,24px);font-weight:900;letter-spacing:2px;}
+        .o5-sub{font-size:12px;color:rgba(148,163,184,0.75);margin-top:4px;line-height:1.5;max-width:520px;}
+        .o5-pills{display:flex;gap:8px;flex-wrap:wrap;}
+        .o5-grid{display:grid;grid-template-columns:repeat(4,minmax(0,1fr));gap:1px;background:rgba(255,255,255,0.04);}
+        .o5-tile{padding:16px 16px 18px;position:relative;overflow:hidden;transition:filter 0.2s;}
+        .o5-tile:hover{filter:brightness(1.2);}
+        .o5-bear{background:rgba(14,4,6,0.97);}
+        .o5-bull{background:rgba(4,14,10,0.97);}
+        .o5-neu{background:rgba(14,12,4,0.97);}
+        .o5-na{background:rgba(8,10,14,0.97);}
+        .o5-tile-bar{position:absolute;bottom:0;left:0;right:0;height:2px;}
+        .o5-tile-top{display:flex;align-items:flex-start;justify-content:space-between;gap:8px;margin-bottom:10px;}
+        .o5-tile-label{font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:700;letter-spacing:1.5px;text-transform:uppercase;line-height:1.5;flex:1;}
+        .o5-bear .o5-tile-label{color:rgba(248,113,113,0.85);}
+        .o5-bull .o5-tile-label{color:rgba(52,211,153,0.85);}
+        .o5-neu  .o5-tile-label{color:rgba(251,191,36,0.85);}
+        .o5-na   .o5-tile-label{color:rgba(148,163,184,0.65);}
+        .o5-chip{font-family:'Orbitron',monospace;font-size:12px;font-weight:900;min-width:30px;height:28px;border-radius:6px;display:flex;align-items:center;justify-content:center;flex-shrink:0;padding:0 8px;}
+        .o5-chip-bear{background:rgba(239,68,68,0.2);color:#f87171;border:1px solid rgba(239,68,68,0.5);}
+        .o5-chip-bull{background:rgba(16,185,129,0.2);color:#34d399;border:1px solid rgba(16,185,129,0.5);}
+        .o5-chip-neu{background:rgba(245,158,11,0.2);color:#fbbf24;border:1px solid rgba(245,158,11,0.5);}
+        .o5-chip-na{background:rgba(100,116,139,0.15);color:rgba(148,163,184,0.7);border:1px solid rgba(100,116,139,0.3);font-size:10px;}
+        .o5-val{font-family:'Oxanium',sans-serif;font-size:clamp(15px,2vw,20px);font-weight:700;line-height:1;margin-bottom:6px;}
+        .o5-msg{font-size:11px;color:rgba(148,163,184,0.75);line-height:1.4;font-family:'JetBrains Mono',monospace;}
+        .auto-badge{font-size:8px;padding:1px 6px;border-radius:4px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.25);color:#00e676;font-weight:700;letter-spacing:0.5px;}
+        .manual-badge{font-size:8px;padding:1px 6px;border-radius:4px;background:rgba(79,195,247,0.08);border:1px solid rgba(79,195,247,0.2);color:#4fc3f7;font-weight:700;letter-spacing:0.5px;}
+        .sc-pill{font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:700;padding:4px 12px;border-radius:20px;letter-spacing:1px;}
+        .sc-pill-bull{background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.3);color:#00e676;}
+        .sc-pill-bear{background:rgba(255,82,82,0.1);border:1px solid rgba(255,82,82,0.3);color:#ff5252;}
+        .sc-pill-neu{background:rgba(255,183,77,0.1);border:1px solid rgba(255,183,77,0.3);color:#ffb74d;}
+        .sc-pill-na{background:rgba(176,190,197,0.06);border:1px solid rgba(176,190,197,0.15);color:rgba(176,190,197,0.4);}
+        /* ══ COMPACT STRATEGY WIDGET ══════════════════════════════════════ */
+        .sc-summary-strip{display:flex;align-items:center;gap:12px;background:rgba(6,13,20,0.8);border:1px solid rgba(79,195,247,0.12);border-radius:10px;padding:10px 16px;margin-bottom:10px;flex-wrap:wrap;}
+        .sc-ss-item{display:flex;align-items:center;gap:6px;}
+        .sc-ss-dot{width:7px;height:7px;border-radius:50%;flex-shrink:0;}
+        .sc-ss-lbl{font-family:'JetBrains Mono',monospace;font-size:11px;letter-spacing:1px;color:rgba(128,222,234,0.7);}
+        .sc-ss-val{font-family:'JetBrains Mono',monospace;font-size:13px;font-weight:700;}
+        .sc-ss-sep{width:1px;height:18px;background:rgba(79,195,247,0.12);}
+        /* 2-column compact grid */
+        .sc-compact-grid{display:grid;grid-template-columns:1fr 1fr;gap:6px;}
+        /* row card */
+        .sc-row{display:grid;grid-template-columns:3px 26px 1fr auto 18px;align-items:center;gap:0;background:rgba(10,18,32,0.9);border:1px solid rgba(79,195,247,0.1);border-radius:10px;cursor:pointer;transition:all 0.18s ease;overflow:hidden;min-height:50px;}
+        .sc-row:hover{background:rgba(16,28,48,0.95);border-color:rgba(79,195,247,0.3);box-shadow:0 4px 18px rgba(0,0,0,0.4);}
+        .sc-row.sc-selected{border-color:#00e5ff;background:rgba(0,229,255,0.06);box-shadow:0 0 0 1px #00e5ff44,0 6px 20px rgba(0,229,255,0.12);}
+        .sc-row-bar{width:3px;height:100%;border-radius:10px 0 0 10px;align-self:stretch;min-height:50px;}
+        .sc-row-num{font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:700;color:rgba(176,190,197,0.45);text-align:center;padding:0 4px;}
+        .sc-row-body{padding:10px 10px 10px 6px;min-width:0;}
+        .sc-row-name{font-family:'Oxanium',sans-serif;font-size:14px;font-weight:700;color:#e0f7fa;line-height:1.2;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;margin-bottom:3px;}
+        .sc-row-strike{font-family:'JetBrains Mono',monospace;font-size:10px;color:rgba(128,222,234,0.75);white-space:nowrap;overflow:hidden;text-overflow:ellipsis;}
+        .sc-row-strike span{color:#4fc3f7;}
+        .sc-row-meta{display:flex;flex-direction:column;align-items:flex-end;gap:4px;padding:10px 8px 10px 6px;flex-shrink:0;}
+        .sc-row-tag{font-size:10px;font-weight:700;letter-spacing:0.5px;padding:3px 8px;border-radius:8px;white-space:nowrap;}
+        .sc-rb{font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;letter-spacing:0.5px;padding:2px 7px;border-radius:4px;white-space:nowrap;}
+        .sc-rb-primary{background:rgba(0,229,255,0.12);border:1px solid rgba(0,229,255,0.4);color:#00e5ff;}
+        .sc-rb-secondary{background:rgba(255,183,77,0.12);border:1px solid rgba(255,183,77,0.4);color:#ffb74d;}
+        .sc-rb-advanced{background:rgba(124,77,255,0.1);border:1px solid rgba(124,77,255,0.35);color:#b39dff;}
+        .sc-row-rr{font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;}
+        .sc-row-chevron{font-size:16px;color:rgba(79,195,247,0.3);padding-right:8px;transition:transform 0.2s ease;line-height:1;user-select:none;}
+        .sc-row.sc-selected .sc-row-chevron{transform:rotate(90deg);color:#00e5ff;}
+        /* expand detail panel — spans both columns */
+        .sc-dp{grid-column:1/-1;display:none;background:rgba(4,10,20,0.97);border:1px solid rgba(79,195,247,0.18);border-radius:12px;padding:14px 16px;position:relative;overflow:hidden;animation:scSlide 0.18s ease;}
+        .sc-dp::before{content:'';position:absolute;top:0;left:0;right:0;height:1px;background:linear-gradient(90deg,transparent,#4fc3f7,transparent);}
+        .sc-dp.sc-dp-open{display:block;}
+        @keyframes scSlide{from{opacity:0;transform:translateY(-5px);}to{opacity:1;transform:translateY(0);}}
+        .sc-dp-grid{display:grid;grid-template-columns:1fr 1fr 1fr;gap:10px;margin-bottom:10px;}
+        .sc-dp-box{background:rgba(255,255,255,0.025);border:1px solid rgba(79,195,247,0.1);border-radius:8px;padding:9px 11px;}
+        .sc-dp-lbl{font-family:'JetBrains Mono',monospace;font-size:7.5px;letter-spacing:2px;color:rgba(128,222,234,0.35);text-transform:uppercase;margin-bottom:3px;}
+        .sc-dp-val{font-family:'Oxanium',sans-serif;font-size:15px;font-weight:700;line-height:1.2;}
+        .sc-dp-sub{font-family:'JetBrains Mono',monospace;font-size:9px;color:rgba(176,190,197,0.35);margin-top:2px;}
+        .sc-dp-rr-track{height:3px;background:rgba(0,0,0,0.4);border-radius:2px;overflow:hidden;margin-top:5px;}
+        .sc-dp-rr-fill{height:100%;border-radius:2px;}
+        .sc-dp-strike-box{background:rgba(0,0,0,0.3);border-left:3px solid rgba(79,195,247,0.4);border-radius:0 7px 7px 0;padding:7px 11px;font-family:'JetBrains Mono',monospace;font-size:10px;color:rgba(176,190,197,0.75);line-height:1.65;margin-bottom:10px;word-break:break-word;}
+        .sc-dp-strike-lbl{color:#80deea;font-weight:700;}
+        .sc-dp-actions{display:flex;gap:8px;justify-content:flex-end;}
+        .sc-dp-btn{font-family:'Oxanium',sans-serif;font-size:10px;font-weight:700;letter-spacing:1px;padding:6px 14px;border-radius:6px;cursor:pointer;border:none;transition:all 0.15s ease;}
+        .sc-dp-btn-load{background:linear-gradient(135deg,#00bcd4,#006064);color:#fff;}
+        .sc-dp-btn-load:hover{filter:brightness(1.2);}
+        .sc-dp-btn-close{background:transparent;border:1px solid rgba(79,195,247,0.2);color:rgba(176,190,197,0.5);}
+        .sc-dp-btn-close:hover{border-color:rgba(79,195,247,0.4);color:#4fc3f7;}
+        /* tag colours (reused) */
+        .strat-tag-bull{background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.25);color:#00e676;}
+        .strat-tag-bear{background:rgba(255,82,82,0.1);border:1px solid rgba(255,82,82,0.25);color:#ff5252;}
+        .strat-tag-neu{background:rgba(255,183,77,0.1);border:1px solid rgba(255,183,77,0.25);color:#ffb74d;}
+        .strat-tag-vol{background:rgba(124,77,255,0.1);border:1px solid rgba(124,77,255,0.25);color:#b388ff;}
+        .strat-tag-misc{background:rgba(79,195,247,0.1);border:1px solid rgba(79,195,247,0.25);color:#4fc3f7;}
+        /* trade plan badges */
+        .tp-rank-badge{display:inline-block;font-family:'JetBrains Mono',monospace;font-size:8px;font-weight:700;letter-spacing:1.5px;padding:2px 8px;border-radius:20px;margin-left:8px;vertical-align:middle;}
+        .tp-rank-primary{background:rgba(0,230,118,0.15);border:1px solid rgba(0,230,118,0.4);color:#00e676;}
+        .tp-rank-secondary{background:rgba(255,183,77,0.15);border:1px solid rgba(255,183,77,0.4);color:#ffb74d;}
+        .tp-rank-advanced{background:rgba(179,136,255,0.15);border:1px solid rgba(179,136,255,0.4);color:#b388ff;}
+        @keyframes tpFlash{0%{box-shadow:0 0 0 0 rgba(0,229,255,0.6);}50%{box-shadow:0 0 0 8px rgba(0,229,255,0);}100%{box-shadow:none;}}
+        .tp-banner-flash{animation:tpFlash 0.6s ease-out;}
 
-            # Step 3: widen window to ±500 on same 1Y data
-            if len(res_c) < 2 or len(sup_c) < 2:
-                print("  🔄 Widening window to ±500 on 1Y data")
-                try:
-                    res_c, sup_c = _find_levels(highs_1yr, lows_1yr, current_price, 500)
-                    print(f"  Wide window | res_c={len(res_c)} sup_c={len(sup_c)}")
-                except Exception:
-                    res_c, sup_c = [], []
+        /* ── TRADE PLAN ─────────────────────────────────────────────── */
+        .tp-wrap{display:flex;flex-direction:column;gap:16px;}
+        .tp-banner{display:flex;justify-content:space-between;align-items:flex-start;background:rgba(79,195,247,0.06);border:1px solid rgba(79,195,247,0.2);border-radius:14px;padding:18px 22px;gap:16px;}
+        .tp-banner-left{flex:1;}
+        .tp-banner-label{font-family:'JetBrains Mono',monospace;font-size:9px;color:rgba(128,222,234,0.4);letter-spacing:2px;margin-bottom:6px;}
+        .tp-banner-strat{font-family:'Oxanium',sans-serif;font-size:clamp(15px,2vw,20px);font-weight:800;color:#80deea;margin-bottom:6px;}
+        .tp-banner-strike{font-family:'JetBrains Mono',monospace;font-size:11px;color:rgba(176,190,197,0.7);}
+        .tp-banner-right{text-align:right;}
+        .tp-banner-exp{font-family:'Oxanium',sans-serif;font-size:16px;font-weight:700;color:#ffb74d;margin-top:6px;}
+        .tp-exits{display:grid;grid-template-columns:repeat(3,1fr);gap:12px;}
+        .tp-exit{border-radius:14px;padding:18px;display:flex;flex-direction:column;gap:6px;position:relative;overflow:hidden;}
+        .tp-exit::before{content:'';position:absolute;top:0;left:0;right:0;height:3px;border-radius:14px 14px 0 0;}
+        .tp-exit-profit{background:rgba(0,230,118,0.05);border:1px solid rgba(0,230,118,0.2);}
+        .tp-exit-profit::before{background:linear-gradient(90deg,#00e676,#00bfa5);}
+        .tp-exit-loss{background:rgba(255,82,82,0.05);border:1px solid rgba(255,82,82,0.2);}
+        .tp-exit-loss::before{background:linear-gradient(90deg,#ff5252,#b71c1c);}
+        .tp-exit-time{background:rgba(255,183,77,0.05);border:1px solid rgba(255,183,77,0.2);}
+        .tp-exit-time::before{background:linear-gradient(90deg,#ffb74d,#f57c00);}
+        .tp-exit-icon{font-size:20px;}
+        .tp-exit-title{font-family:'JetBrains Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(176,190,197,0.4);margin-bottom:2px;}
+        .tp-exit-val{font-family:'Oxanium',sans-serif;font-size:clamp(14px,1.8vw,18px);font-weight:800;color:#e0f7fa;}
+        .tp-exit-val2{font-family:'Oxanium',sans-serif;font-size:13px;font-weight:700;color:rgba(224,247,250,0.6);margin-top:4px;}
+        .tp-exit-sub{font-family:'JetBrains Mono',monospace;font-size:9px;color:rgba(176,190,197,0.4);}
+        .tp-exit-rule{margin-top:8px;font-size:10px;color:rgba(176,190,197,0.55);line-height:1.5;border-top:1px solid rgba(255,255,255,0.05);padding-top:8px;}
+        .filter-btn{padding:6px 14px;border-radius:20px;font-size:10px;font-weight:700;letter-spacing:1px;cursor:pointer;border:1px solid rgba(79,195,247,0.2);background:transparent;color:rgba(176,190,197,0.5);transition:all 0.2s ease;font-family:'Oxanium',sans-serif;}
+        .filter-btn.active,.filter-btn:hover{background:rgba(79,195,247,0.1);border-color:rgba(79,195,247,0.4);color:#4fc3f7;}
+
+        .oi-controls{display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:12px;margin-bottom:20px;}
+        .oi-interval-btns{display:flex;gap:0;border:1px solid rgba(79,195,247,0.25);border-radius:10px;overflow:hidden;}
+        .oi-int-btn{padding:9px 24px;font-family:'Oxanium',sans-serif;font-size:12px;font-weight:700;letter-spacing:2px;color:rgba(176,190,197,0.5);background:transparent;border:none;cursor:pointer;transition:all 0.2s ease;border-right:1px solid rgba(79,195,247,0.15);}
+        .oi-int-btn:last-child{border-right:none;}
+        .oi-int-btn:hover{background:rgba(79,195,247,0.12);color:#4fc3f7;}
+        .oi-int-btn.active{background:rgba(79,195,247,0.22);color:#00e5ff;box-shadow:inset 0 0 12px rgba(79,195,247,0.1);}
+        .oi-live-badge{display:flex;align-items:center;gap:7px;font-family:'JetBrains Mono',monospace;font-size:10px;letter-spacing:2px;color:rgba(0,230,118,0.7);background:rgba(0,230,118,0.08);border:1px solid rgba(0,230,118,0.25);padding:6px 14px;border-radius:8px;}
+        .oi-live-dot{width:7px;height:7px;border-radius:50%;background:#00e676;box-shadow:0 0 8px #00e676;animation:sb-pulse 1.5s ease-in-out infinite;}
+        .oi-summary-strip{display:grid;grid-template-columns:repeat(4,minmax(0,1fr));gap:12px;margin-bottom:20px;}
+        .oi-sum-card{background:rgba(255,255,255,0.03);border:1px solid rgba(79,195,247,0.14);border-radius:12px;padding:14px 16px;text-align:center;}
+        .oi-sum-label{font-size:9px;letter-spacing:2px;color:rgba(128,222,234,0.9);text-transform:uppercase;font-weight:700;margin-bottom:6px;}
+        .oi-sum-val{font-family:'Oxanium',sans-serif;font-size:clamp(16px,2.5vw,22px);font-weight:700;line-height:1;}
+        .oi-chart-wrap{background:rgba(6,13,20,0.7);border:1px solid rgba(79,195,247,0.14);border-radius:14px;padding:16px;margin-bottom:20px;}
+        .oi-chart-label{font-size:9px;letter-spacing:2px;color:rgba(128,222,234,0.9);text-transform:uppercase;font-weight:700;}
+        /* ══ OPTION FLOW TABLE — POLISHED UI ════════════════════════════════ */
+        .oi-table-wrap{background:rgba(6,13,20,0.85);border:1px solid rgba(79,195,247,0.18);border-radius:16px;overflow-x:auto;overflow-y:hidden;-webkit-overflow-scrolling:touch;box-shadow:0 4px 40px rgba(0,0,0,0.5);overflow-anchor:none;}
+        .oi-table{width:100%;min-width:1260px;border-collapse:collapse;font-family:'JetBrains Mono',monospace;overflow-anchor:none;}
+        .oi-table-scroll-hint{display:none;align-items:center;gap:6px;font-family:'JetBrains Mono',monospace;font-size:9px;letter-spacing:1.5px;color:rgba(79,195,247,0.4);padding:6px 14px 0;text-transform:uppercase;}
 
-            # Calculate levels — no hardcoding, N/A if genuinely nothing found
-            if len(res_c) >= 2:
-                r1 = round(float(np.percentile(res_c, 25)) / 25) * 25
-                r2 = round(float(np.percentile(res_c, 65)) / 25) * 25
-                if r1 <= current_price:
-                    r1 = round(float(np.percentile(res_c, 50)) / 25) * 25
-                if r2 and r1 and r2 <= r1:
-                    r2 = round(float(np.percentile(res_c, 80)) / 25) * 25
-            else:
-                print("  ⚠️  No resistance levels found — will show N/A")
+        /* ── Header ── */
+        .oi-table thead tr{background:rgba(18,26,33,0.95);border-bottom:2px solid rgba(36,53,68,0.9);}
+        .oi-table thead th{padding:14px 16px;font-size:13px;letter-spacing:1.5px;color:rgba(178,235,242,1);text-transform:uppercase;font-weight:700;text-align:right;white-space:nowrap;}
+        .oi-table thead th:first-child{text-align:left;}
+        .oi-table thead th.oi-th-divider{border-left:1px solid rgba(30,45,56,1);}
 
-            if len(sup_c) >= 2:
-                s1 = round(float(np.percentile(sup_c, 75)) / 25) * 25
-                s2 = round(float(np.percentile(sup_c, 35)) / 25) * 25
-                if s1 >= current_price:
-                    s1 = round(float(np.percentile(sup_c, 50)) / 25) * 25
-                if s2 and s1 and s2 >= s1:
-                    s2 = round(float(np.percentile(sup_c, 20)) / 25) * 25
-            else:
-                print("  ⚠️  No support levels found — will show N/A")
+        /* ── FOCUS / DETAIL toggle ── */
+        .oi-view-btn{padding:5px 16px;font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:700;letter-spacing:1.5px;color:rgba(128,222,234,0.4);background:transparent;border:1px solid rgba(79,195,247,0.2);border-radius:20px;cursor:pointer;transition:all 0.2s ease;}
+        .oi-view-btn:hover{color:#4fc3f7;border-color:rgba(79,195,247,0.5);background:rgba(79,195,247,0.08);}
+        .oi-view-active{color:#00e5ff!important;border-color:rgba(79,195,247,0.6)!important;background:rgba(79,195,247,0.14)!important;box-shadow:0 0 10px rgba(79,195,247,0.12);}
+        /* FOCUS mode: hide col-detail columns (default) */
+        .col-detail{display:none;}
+        /* DETAIL mode: show col-detail columns */
+        .oi-detail-mode .col-detail{display:table-cell;}
 
-            print(f"  ✓ Final Levels | S2={s2} S1={s1} | Price={current_price:.0f} | R1={r1} R2={r2}")
+        /* ── Body rows ── */
+        .oi-table tbody tr{border-bottom:1px solid rgba(30,45,56,0.8);transition:background 0.15s ease;}
+        .oi-table tbody tr:last-child{border-bottom:none;}
+        .oi-table tbody tr:hover{background:rgba(18,26,33,0.9);}
+        .oi-table tbody tr.oi-live-row{background:linear-gradient(90deg,rgba(0,212,255,0.04) 0%,transparent 60%);border-bottom:1px solid rgba(0,212,255,0.18);}
+        .oi-table tbody td{padding:14px 16px;font-size:15px;text-align:right;color:#dce8f0;white-space:nowrap;}
+        .oi-table tbody td:first-child{text-align:left;}
+        .oi-table tbody td.oi-th-divider{border-left:1px solid rgba(30,45,56,0.8);}
 
-            # Assign to technical dict — None means N/A, no fallback invented
-            resistance        = r1
-            support           = s1
-            strong_resistance = r2
-            strong_support    = s2
-            # ── Previous candle OHLC for pivot point calculation ───────────────
-            prev_row   = df.iloc[-2] if len(df) >= 2 else latest
-            prev_high  = float(prev_row['High'])
-            prev_low   = float(prev_row['Low'])
-            prev_close = float(prev_row['Close'])
+        /* ── Time cell ── */
+        .oi-time-cell{display:flex;align-items:center;gap:10px;}
+        .oi-time-val{font-size:16px;font-weight:700;color:#fff;letter-spacing:0.5px;}
+        .oi-live-ind{display:inline-flex;align-items:center;gap:5px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.5);border-radius:20px;padding:2px 8px;font-size:9px;color:#00e676;letter-spacing:1px;font-weight:700;}
+        .oi-live-ind::before{content:'';display:inline-block;width:6px;height:6px;border-radius:50%;background:#00e676;box-shadow:0 0 6px #00e676;animation:sb-pulse 1.2s ease-in-out infinite;}
+        .oi-elapsed{display:inline-flex;align-items:center;gap:6px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.45);border-radius:20px;padding:3px 12px;font-size:13px;color:#00e676;letter-spacing:0.5px;font-weight:700;font-family:'JetBrains Mono',monospace;min-width:68px;}
+        .oi-elapsed::before{content:'';display:inline-block;width:7px;height:7px;border-radius:50%;background:#00e676;box-shadow:0 0 8px #00e676;animation:sb-pulse 1.2s ease-in-out infinite;}
+        .nlf-elapsed{display:inline-flex;align-items:center;gap:4px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.4);border-radius:12px;padding:2px 8px;font-size:11px;color:#00e676;letter-spacing:0.3px;font-weight:700;font-family:'JetBrains Mono',monospace;min-width:54px;}
+        .nlf-elapsed::before{content:'';display:inline-block;width:6px;height:6px;border-radius:50%;background:#00e676;box-shadow:0 0 5px #00e676;animation:sb-pulse 1.2s ease-in-out infinite;}
 
-            technical = {
-                'current_price':    current_price,
-                'sma_20':           latest['SMA_20'],
-                'sma_50':           latest['SMA_50'],
-                'sma_200':          latest['SMA_200'],
-                'rsi':              latest['RSI'],
-                'macd':             macd_val,
-                'signal':           signal_val,
-                'macd_prev':        macd_prev_val,
-                'signal_prev':      signal_prev_val,
-                'resistance':       resistance,
-                'support':          support,
-                'strong_resistance':strong_resistance,
-                'strong_support':   strong_support,
-                'prev_high':        prev_high,
-                'prev_low':         prev_low,
-                'prev_close':       prev_close,
-            }
-            print(f"✓ Technical | Price: {technical['current_price']:.2f} | RSI: {technical['rsi']:.1f}")
-            return technical
-        except Exception as e:
-            print(f"Technical error: {e}"); return None
+        /* ── OI value cells ── */
+        .oi-call-val{color:#00e676;font-weight:500;}
+        .oi-put-val{color:#c8dde8;}
+        .oi-diff-neg{color:#ff4757;font-weight:700;}
+        .oi-diff-pos{color:#00e676;font-weight:700;}
 
-    def calculate_smart_stop_loss(self, current_price, support, resistance, bias):
-        if bias == "BULLISH": return round(max(support - 30, current_price - 150), 0)
-        elif bias == "BEARISH": return round(min(resistance + 30, current_price + 150), 0)
-        return None
+        /* ── PCR with mini bar ── */
+        .oi-pcr-val{font-weight:700;font-size:14px;}
+        .oi-pcr-val.oi-pcr-bull,.oi-pcr-bull{color:#00e676 !important;}
+        .oi-pcr-val.oi-pcr-bear,.oi-pcr-bear{color:#ff4757 !important;}
+        .oi-pcr-val.oi-pcr-neu,.oi-pcr-neu{color:#ffd32a !important;}
+        .oi-pcr-cell{display:inline-flex;align-items:center;justify-content:flex-end;gap:6px;}
+        .oi-pcr-bar-wrap{width:32px;height:4px;background:rgba(36,53,68,0.9);border-radius:2px;overflow:hidden;display:inline-block;vertical-align:middle;}
+        .oi-pcr-bar{height:100%;border-radius:2px;}
+        .oi-pcr-bull-bar{background:rgba(0,230,118,0.85);}
+        .oi-pcr-bear-bar{background:rgba(255,71,87,0.85);}
+        .oi-pcr-neu-bar{background:rgba(255,211,42,0.75);}
 
-    def generate_analysis_data(self, technical, option_analysis):
-        if not technical:
-            self.log("⚠️  Technical data unavailable"); return
-        current    = technical['current_price']
-        support    = technical['support']
-        resistance = technical['resistance']
-        ist_now    = datetime.now(pytz.timezone('Asia/Kolkata'))
-        bullish_score = bearish_score = 0
-        for sma in ['sma_20','sma_50','sma_200']:
-            if current > technical[sma]: bullish_score += 1
-            else: bearish_score += 1
-        rsi = technical['rsi']
-        if   rsi > 70: bearish_score += 1
-        elif rsi < 30: bullish_score += 2
-        # ── MACD: histogram slope fires BEFORE full crossover ──────────────────
-        macd_hist      = technical['macd']      - technical['signal']
-        macd_hist_prev = technical['macd_prev'] - technical['signal_prev']
-        if technical['macd'] > technical['signal']:
-            bullish_score += 1          # full crossover — confirmed bull
-        elif macd_hist > macd_hist_prev:
-            bullish_score += 1          # histogram building — early bull momentum
-        else:
-            bearish_score += 1
-        if option_analysis:
-            pcr = option_analysis['pcr_oi']; max_pain = option_analysis['max_pain']
-            if   pcr > 1.1: bullish_score += 2
-            elif pcr < 0.9: bearish_score += 2
-            if   current > max_pain+100: bearish_score += 1
-            elif current < max_pain-100: bullish_score += 1
-        score_diff = bullish_score - bearish_score
-        print(f"  📊 Bullish: {bullish_score} | Bearish: {bearish_score} | Diff: {score_diff} | MACD hist: {macd_hist:.2f} prev: {macd_hist_prev:.2f}")
-        if   score_diff >= 3:  bias,bias_icon,bias_class="BULLISH","📈","bullish";    confidence="HIGH" if score_diff >= 4 else "MEDIUM"
-        elif score_diff == 2:  bias,bias_icon,bias_class="WATCH BULL","⚡","watchbull"; confidence="MEDIUM"
-        elif score_diff == -2: bias,bias_icon,bias_class="WATCH BEAR","⚠️","watchbear"; confidence="MEDIUM"
-        elif score_diff <= -3: bias,bias_icon,bias_class="BEARISH","📉","bearish";    confidence="HIGH" if score_diff <= -4 else "MEDIUM"
-        else:                  bias,bias_icon,bias_class="SIDEWAYS","↔️","sideways";   confidence="LOW"
-        if   rsi > 70: rsi_status,rsi_badge,rsi_icon="Overbought","bearish","🔴"
-        elif rsi < 30: rsi_status,rsi_badge,rsi_icon="Oversold","bullish","🟢"
-        else:          rsi_status,rsi_badge,rsi_icon="Neutral","neutral","🟡"
-        macd_bullish = technical['macd'] > technical['signal']
-        if option_analysis:
-            pcr = option_analysis['pcr_oi']
-            if   pcr > 1.1: pcr_status,pcr_badge,pcr_icon="Bullish","bullish","🟢"
-            elif pcr < 0.9: pcr_status,pcr_badge,pcr_icon="Bearish","bearish","🔴"
-            else:           pcr_status,pcr_badge,pcr_icon="Neutral","neutral","🟡"
-        else:
-            pcr_status,pcr_badge,pcr_icon="N/A","neutral","🟡"
-        if option_analysis:
-            max_ce_strike=option_analysis['max_ce_oi_strike']; max_pe_strike=option_analysis['max_pe_oi_strike']
-            atm_strike=option_analysis['atm_strike']
-        else:
-            atm_strike=int(current/50)*50; max_ce_strike=atm_strike+200; max_pe_strike=atm_strike-200
-        if bias == "BULLISH":
-            mid=((support+resistance)/2); entry_low=current-100 if current>mid else current-50
-            entry_high=current-50 if current>mid else current; target_1=resistance; target_2=max_ce_strike
-            stop_loss=self.calculate_smart_stop_loss(current,support,resistance,"BULLISH")
-        elif bias == "BEARISH":
-            mid=((support+resistance)/2); entry_low=current
-            entry_high=current+100 if current<mid else current+50; target_1=support; target_2=max_pe_strike
-            stop_loss=self.calculate_smart_stop_loss(current,support,resistance,"BEARISH")
-        else:
-            entry_low=support; entry_high=resistance; target_1=resistance; target_2=support; stop_loss=None
-        if stop_loss and bias != "SIDEWAYS":
-            risk_points=abs(current-stop_loss); reward_points=abs(target_1-current)
-            risk_reward_ratio=round(reward_points/risk_points,2) if risk_points>0 else 0
-        else:
-            risk_points=reward_points=risk_reward_ratio=0
-        rsi_pct=min(100,max(0,rsi))
-        def sma_bar(sma_val):
-            diff=(current-sma_val)/sma_val*100; return min(100,max(0,50+diff*10))
-        macd_val=technical['macd']; macd_pct=min(100,max(0,50+macd_val*2))
-        pcr_pct=min(100,max(0,(option_analysis['pcr_oi']/2*100))) if option_analysis else 50
-        if option_analysis:
-            rng=resistance-support if resistance!=support else 1
-            mp_pct=min(100,max(0,(option_analysis['max_pain']-support)/rng*100))
-            total_oi=option_analysis['total_ce_oi']+option_analysis['total_pe_oi']
-            ce_oi_pct=min(100,max(0,option_analysis['total_ce_oi']/total_oi*100)) if total_oi>0 else 50
-            pe_oi_pct=100-ce_oi_pct
-        else:
-            mp_pct=ce_oi_pct=pe_oi_pct=50
-        fii_dii_raw  = fetch_fii_dii_data()
-        fii_dii_summ = compute_fii_dii_summary(fii_dii_raw)
-        self.html_data = {
-            'timestamp': ist_now.strftime('%d-%b-%Y %H:%M IST'),
-            'current_price': current, 'expiry': option_analysis['expiry'] if option_analysis else 'N/A',
-            'atm_strike': atm_strike, 'bias': bias, 'bias_icon': bias_icon, 'bias_class': bias_class,
-            'confidence': confidence, 'bullish_score': bullish_score, 'bearish_score': bearish_score,
-            'rsi': rsi, 'rsi_pct': rsi_pct, 'rsi_status': rsi_status, 'rsi_badge': rsi_badge, 'rsi_icon': rsi_icon,
-            'sma_20': technical['sma_20'], 'sma_20_above': current>technical['sma_20'], 'sma_20_pct': sma_bar(technical['sma_20']),
-            'sma_50': technical['sma_50'], 'sma_50_above': current>technical['sma_50'], 'sma_50_pct': sma_bar(technical['sma_50']),
-            'sma_200': technical['sma_200'], 'sma_200_above': current>technical['sma_200'], 'sma_200_pct': sma_bar(technical['sma_200']),
-            'macd': technical['macd'], 'macd_signal': technical['signal'], 'macd_bullish': macd_bullish, 'macd_pct': macd_pct,
-            'pcr': option_analysis['pcr_oi'] if option_analysis else 0, 'pcr_pct': pcr_pct,
-            'pcr_status': pcr_status, 'pcr_badge': pcr_badge, 'pcr_icon': pcr_icon,
-            'max_pain': option_analysis['max_pain'] if option_analysis else 0, 'max_pain_pct': mp_pct,
-            'max_ce_oi': max_ce_strike, 'max_pe_oi': max_pe_strike,
-            'ce_oi_pct': ce_oi_pct, 'pe_oi_pct': pe_oi_pct,
-            'total_ce_oi_change': option_analysis['total_ce_oi_change'] if option_analysis else 0,
-            'total_pe_oi_change': option_analysis['total_pe_oi_change'] if option_analysis else 0,
-            'net_oi_change': option_analysis['net_oi_change'] if option_analysis else 0,
-            'oi_direction': option_analysis['oi_direction'] if option_analysis else 'N/A',
-            'oi_signal': option_analysis['oi_signal'] if option_analysis else 'N/A',
-            'oi_icon': option_analysis['oi_icon'] if option_analysis else '🟡',
-            'oi_class': option_analysis['oi_class'] if option_analysis else 'neutral',
-            'support': support, 'resistance': resistance,
-            'strong_support': technical['strong_support'], 'strong_resistance': technical['strong_resistance'],
-            'strategy_type': bias, 'entry_low': entry_low, 'entry_high': entry_high,
-            'target_1': target_1, 'target_2': target_2, 'stop_loss': stop_loss,
-            'risk_points': int(risk_points), 'reward_points': int(reward_points),
-            'risk_reward_ratio': risk_reward_ratio,
-            'has_option_data': option_analysis is not None,
-            'df': option_analysis['df'] if option_analysis else None,
-            'fii_dii_data': fii_dii_raw, 'fii_dii_summ': fii_dii_summ,
-            'prev_high':  technical.get('prev_high', 0),
-            'prev_low':   technical.get('prev_low', 0),
-            'prev_close': technical.get('prev_close', 0),
-        }
+        /* ── Signal badges — bigger, glowing ── */
+        .oi-signal-ssell{display:inline-block;padding:6px 16px;border-radius:7px;font-size:12px;font-weight:800;letter-spacing:1.2px;background:#ff3a4a;color:#fff;box-shadow:0 0 14px rgba(255,58,74,0.55);}
+        .oi-signal-sell{display:inline-block;padding:6px 16px;border-radius:7px;font-size:12px;font-weight:800;letter-spacing:1.2px;background:#ff3a4a;color:#fff;box-shadow:0 0 10px rgba(255,58,74,0.35);}
+        .oi-signal-sbuy{display:inline-block;padding:6px 16px;border-radius:7px;font-size:12px;font-weight:800;letter-spacing:1.2px;background:#00c853;color:#000;box-shadow:0 0 14px rgba(0,200,83,0.55);}
+        .oi-signal-buy{display:inline-block;padding:6px 16px;border-radius:7px;font-size:12px;font-weight:800;letter-spacing:1.2px;background:#00c853;color:#000;box-shadow:0 0 10px rgba(0,200,83,0.35);}
+        .oi-signal-neutral{display:inline-block;padding:6px 16px;border-radius:7px;font-size:12px;font-weight:800;letter-spacing:1.2px;background:rgba(245,158,11,0.15);color:#fde68a;border:1px solid rgba(245,158,11,0.3);}
 
-    def _bar_color_class(self, badge):
-        return {'bullish':'bar-teal','bearish':'bar-red','neutral':'bar-gold'}.get(badge,'bar-teal')
+        /* ── Spot price ── */
+        .oi-vwap-cell{color:#93c5fd;font-weight:600;}
+        .oi-fut-cell{color:#c4b5fd;}
+        .oi-spot-cell{color:#fff;font-weight:700;font-size:15px;}
 
-    def _stat_card(self, icon, label, value, badge_text, badge_class, bar_pct, bar_type, sub_text=""):
-        tag_map = {'bullish':('tag-bull','#00e5ff'),'bearish':('tag-bear','#ff5252'),'neutral':('tag-neu','#ffb74d')}
-        tag_cls,_ = tag_map.get(badge_class, tag_map['neutral'])
-        border_color = {'bullish':'rgba(0,229,255,0.35)','bearish':'rgba(255,82,82,0.35)'}.get(badge_class,'rgba(255,183,77,0.25)')
-        top_color = {'bullish':'#00e5ff','bearish':'#ff5252'}.get(badge_class,'#ffb74d')
+        /* ── Spot Δ — pill style ── */
+        .oi-sdelta{display:inline-flex;align-items:center;gap:4px;padding:4px 10px;border-radius:6px;font-size:13px;font-weight:700;font-family:'JetBrains Mono',monospace;white-space:nowrap;}
+        .oi-sdelta-up{background:rgba(0,230,118,0.12);color:#00e676;border:1px solid rgba(0,230,118,0.3);}
+        .oi-sdelta-dn{background:rgba(255,71,87,0.12);color:#ff4757;border:1px solid rgba(255,71,87,0.3);}
+        .oi-sdelta-fl{background:rgba(100,116,139,0.1);color:#64748b;border:1px solid rgba(100,116,139,0.2);}
 
-        # ── RSI: circular ring gauge ─────────────────────────────────────────
-        if label.startswith('RSI'):
-            try:    rsi_num = float(value)
-            except: rsi_num = 50.0
-            circumf = 138.2
-            offset  = circumf * (1 - rsi_num / 100)
-            ring_col = '#ff5252' if rsi_num > 70 else ('#00e676' if rsi_num < 30 else '#ffb74d')
-            extra_visual = f"""
-            <div style="display:flex;justify-content:center;margin:6px 0 8px;">
-              <div style="position:relative;width:56px;height:56px;">
-                <svg viewBox="0 0 56 56" style="width:100%;height:100%;">
-                  <circle cx="28" cy="28" r="22" fill="none" stroke="rgba(255,255,255,0.06)" stroke-width="7"/>
-                  <circle cx="28" cy="28" r="22" fill="none" stroke="{ring_col}" stroke-width="7"
-                    stroke-linecap="round" stroke-dasharray="{circumf:.1f}" stroke-dashoffset="{offset:.1f}"
-                    style="transform:rotate(-90deg);transform-origin:28px 28px;" opacity="0.85"/>
-                </svg>
-                <div style="position:absolute;inset:0;display:flex;align-items:center;justify-content:center;
-                  font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;color:{ring_col};">{rsi_num:.0f}</div>
-              </div>
-            </div>"""
-        # ── MACD: mini histogram bars ────────────────────────────────────────
-        elif label.startswith('MACD'):
-            bar_color = '#ff5252' if badge_class == 'bearish' else '#00e676'
-            heights = [30,45,55,68,78,88,95,100] if badge_class == 'bearish' else [100,90,75,60,48,35,22,12]
-            hist_bars = ''.join(
-                f'<div style="flex:1;height:{h}%;background:{bar_color};opacity:{0.4+i*0.075:.2f};'
-                f'border-radius:2px 2px 0 0;min-width:3px;"></div>'
-                for i,h in enumerate(heights)
-            )
-            extra_visual = f"""
-            <div style="display:flex;align-items:flex-end;gap:2px;height:36px;padding:0 2px;margin:6px 0 8px;">
-              {hist_bars}
-            </div>"""
-        # ── SMA: mini sparkline trend line ───────────────────────────────────
-        elif label.startswith('SMA'):
-            line_color = '#ff5252' if badge_class == 'bearish' else '#00e676'
-            pts = "0,28 12,24 22,20 30,22 40,26 50,18 60,14 70,10 80,12 90,8 100,6" if badge_class == 'bullish' else "0,8 12,10 22,14 30,12 40,9 50,18 60,22 70,26 80,24 90,28 100,30"
-            extra_visual = f"""
-            <div style="height:32px;margin:6px 0 8px;position:relative;">
-              <svg viewBox="0 0 100 32" preserveAspectRatio="none" style="width:100%;height:100%;overflow:visible;">
-                <polyline points="{pts}" fill="none" stroke="{line_color}" stroke-width="1.8"
-                  stroke-linejoin="round" opacity="0.7"/>
-              </svg>
-            </div>"""
-        else:
-            extra_visual = ''
+        /* ── Nifty Move % — rounded pill ── */
+        .oi-nifty-move{display:inline-flex;align-items:center;gap:4px;padding:5px 12px;border-radius:20px;font-size:13px;font-weight:700;font-family:'JetBrains Mono',monospace;white-space:nowrap;letter-spacing:0.3px;}
+        .oi-nifty-up-strong{background:rgba(0,230,118,0.18);color:#00e676;border:1px solid rgba(0,230,118,0.35);}
+        .oi-nifty-up-mid{background:rgba(0,200,83,0.12);color:#69f0ae;border:1px solid rgba(0,200,83,0.25);}
+        .oi-nifty-up-weak{background:rgba(105,240,174,0.07);color:#a7f3d0;border:1px solid rgba(105,240,174,0.18);}
+        .oi-nifty-dn-strong{background:rgba(255,71,87,0.18);color:#ff4757;border:1px solid rgba(255,71,87,0.35);}
+        .oi-nifty-dn-mid{background:rgba(255,71,87,0.12);color:#fca5a5;border:1px solid rgba(255,71,87,0.25);}
+        .oi-nifty-dn-weak{background:rgba(255,71,87,0.07);color:#fecaca;border:1px solid rgba(255,71,87,0.15);}
+        .oi-nifty-flat{background:rgba(120,144,156,0.1);color:#a8c0cc;border:1px solid rgba(120,144,156,0.2);}
 
-        bg_map = {'bullish':'linear-gradient(145deg,rgba(10,30,20,0.9),rgba(4,14,10,0.95))',
-                  'bearish':'linear-gradient(145deg,rgba(30,10,14,0.9),rgba(12,4,8,0.95))',
-                  'neutral':'linear-gradient(145deg,rgba(28,22,8,0.9),rgba(12,10,4,0.95))'}
-        card_bg = bg_map.get(badge_class, '#111827')
+        /* ── Signal Streak ── */
+        .oi-streak-int{display:inline-flex;align-items:center;gap:8px;border-radius:0;padding:6px 12px;white-space:nowrap;}
+        .oi-streak-int-num{font-family:'Oxanium',sans-serif;font-size:18px;font-weight:800;line-height:1;}
+        .oi-streak-int-lbl{font-size:13px;font-weight:700;letter-spacing:0.5px;text-transform:uppercase;line-height:1;}
 
-        return f"""
-            <div class="g-compact" style="border-color:{border_color};background:{card_bg};">
-                <div style="position:absolute;top:0;left:0;right:0;height:1px;
-                  background:linear-gradient(90deg,transparent,{top_color},transparent);"></div>
-                <div class="cc-top"><span class="cc-ico">{icon}</span><div class="cc-lbl">{label}</div>
-                  <span class="tag {tag_cls}">{badge_text}</span></div>
-                {extra_visual}
-                <div class="cc-val">{value}</div>
-                {f'<div class="cc-sub">{sub_text}</div>' if sub_text else ''}
-                <div class="cc-bar"><div class="cc-bar-fill {bar_type}" style="width:{bar_pct:.1f}%"></div></div>
-            </div>"""
+        /* ── Nearest Level badge ── */
+        .oi-nlevel-badge{display:inline-flex;align-items:center;gap:6px;background:rgba(10,26,37,0.9);border:1px solid rgba(36,53,68,1);border-radius:7px;padding:5px 12px;font-size:13px;font-weight:700;letter-spacing:0.3px;white-space:nowrap;}
+        .oi-nlevel-badge .oi-nlevel-label{font-size:10px;font-weight:700;padding:1px 5px;border-radius:3px;letter-spacing:0.5px;}
+        .oi-nlevel-res{color:#00d4ff;}
+        .oi-nlevel-res .oi-nlevel-label{background:rgba(0,153,204,0.9);color:#000;}
+        .oi-nlevel-sup{color:#00d4ff;}
+        .oi-nlevel-sup .oi-nlevel-label{background:rgba(0,153,204,0.9);color:#000;}
 
-    def _build_enhanced_oc_cards(self):
-        """Enhanced Option Chain cards: PCR needle meter, Max Pain zone bar, CE/PE OI battle bars."""
-        d = self.html_data
-        if not d['has_option_data']:
-            return '<div style="color:#80deea;padding:20px;">Option chain data unavailable</div>'
+        /* ── Distance ── */
+        .oi-dist-val{display:inline-block;font-size:13px;font-weight:600;font-family:'JetBrains Mono',monospace;}
+        .oi-dist-res{color:#ff4757;}
+        .oi-dist-sup{color:#ff4757;}
 
-        pcr     = d['pcr']
-        max_pain= d['max_pain']
-        max_ce  = d['max_ce_oi']
-        max_pe  = d['max_pe_oi']
-        spot    = d['current_price']
-        ce_pct  = d['ce_oi_pct']
-        pe_pct  = d['pe_oi_pct']
+        /* ── Misc ── */
+        .oi-vsig-sell{display:inline-block;padding:3px 9px;border-radius:5px;font-size:11px;font-weight:700;background:rgba(239,68,68,0.12);color:#fca5a5;border:1px solid rgba(239,68,68,0.25);}
+        .oi-vsig-buy{display:inline-block;padding:3px 9px;border-radius:5px;font-size:11px;font-weight:700;background:rgba(16,185,129,0.12);color:#6ee7b7;border:1px solid rgba(16,185,129,0.25);}
+        .oi-empty-state{text-align:center;padding:60px 20px;color:rgba(176,190,197,0.3);font-family:'JetBrains Mono',monospace;font-size:13px;}
+
+        .disclaimer{background:rgba(255,183,77,0.08);border:1px solid rgba(255,183,77,0.25);border-left:3px solid #ffb74d;border-radius:8px;padding:9px 16px;display:flex;align-items:center;gap:10px;flex-wrap:wrap;}
+        .disc-icon{font-size:13px;flex-shrink:0;line-height:1;}
+        .disc-label{font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:700;letter-spacing:1.5px;color:#ffb74d;text-transform:uppercase;flex-shrink:0;}
+        .disc-sep{color:rgba(255,183,77,0.3);font-size:11px;flex-shrink:0;}
+        .disc-text{font-size:12px;color:rgba(255,183,77,0.75);font-family:'Rajdhani',sans-serif;font-weight:500;white-space:nowrap;}
+        .disc-text strong{color:#ffb74d;font-weight:700;}
+        @media(max-width:700px){.disc-text{white-space:normal;}}
+        .footer{text-align:center;padding:24px;color:#8faabe;font-size:clamp(10px,1.3vw,12px);background:rgba(10,20,28,0.4);}
 
-        pcr_tag    = 'Bearish' if pcr < 0.9 else ('Bullish' if pcr > 1.1 else 'Neutral')
-        pcr_col    = '#ff5252' if pcr < 0.9 else ('#00e676' if pcr > 1.1 else '#ffb74d')
-        pcr_border = 'rgba(255,82,82,0.35)' if pcr < 0.9 else ('rgba(0,230,118,0.35)' if pcr > 1.1 else 'rgba(255,183,77,0.3)')
-        pcr_tag_cls= 'tag-bear' if pcr < 0.9 else ('tag-bull' if pcr > 1.1 else 'tag-neu')
-        pcr_needle_pct = round(min(97, max(3, pcr / 2.0 * 100)), 1)
+        /* ══ SIGNAL SUMMARY BAR ═══════════════════════════════════════════ */
+        .ssb-section{padding:0 clamp(12px,2.5vw,26px) 16px;border-bottom:none!important;}
+        .ssb-wrap{background:rgba(6,13,20,0.9);border:1px solid rgba(79,195,247,0.18);border-radius:14px;overflow:hidden;}
+        .ssb-header{display:flex;align-items:center;justify-content:space-between;padding:9px 16px;background:rgba(0,0,0,0.35);border-bottom:1px solid rgba(79,195,247,0.1);flex-wrap:wrap;gap:8px;}
+        .ssb-title{font-family:'Oxanium',sans-serif;font-size:12px;letter-spacing:2.5px;color:#4fc3f7;text-transform:uppercase;font-weight:700;}
+        .ssb-ts{font-size:12px;color:#80deea;letter-spacing:1px;font-family:'JetBrains Mono',monospace;font-weight:600;}
+        .ssb-grid{display:grid;grid-template-columns:repeat(5,1fr) 1.5fr;}
+        .ssb-cell{padding:14px 10px;border-right:1px solid rgba(79,195,247,0.08);display:flex;flex-direction:column;align-items:center;gap:6px;text-align:center;}
+        .ssb-cell:last-child{border-right:none;}
+        .ssb-cell-lbl{font-family:'JetBrains Mono',monospace;font-size:11px;letter-spacing:2px;color:#e0f7fa;text-transform:uppercase;font-weight:700;}
+        .ssb-badge{display:inline-flex;align-items:center;gap:4px;padding:5px 12px;border-radius:7px;font-family:'Oxanium',sans-serif;font-size:13px;font-weight:800;letter-spacing:0.5px;white-space:nowrap;}
+        .ssb-sub{font-family:'JetBrains Mono',monospace;font-size:11px;color:rgba(200,221,232,0.85);letter-spacing:0.3px;max-width:110px;line-height:1.5;text-align:center;}
+        .ssb-verdict{display:flex;flex-direction:column;align-items:center;gap:7px;padding:14px 12px;}
+        .ssb-verdict-lbl{font-family:'JetBrains Mono',monospace;font-size:10px;letter-spacing:2.5px;text-transform:uppercase;font-weight:700;color:#e0f7fa;}
+        .ssb-verdict-val{font-family:'Oxanium',sans-serif;font-size:clamp(13px,1.8vw,17px);font-weight:800;letter-spacing:1px;text-transform:uppercase;text-align:center;line-height:1.2;}
+        .ssb-score-dots{display:flex;gap:5px;}
+        .ssb-dot{width:10px;height:10px;border-radius:50%;flex-shrink:0;}
+        .ssb-bar-wrap{width:100%;display:flex;flex-direction:column;gap:4px;}
+        .ssb-bar-track{height:5px;background:rgba(0,0,0,0.5);border-radius:3px;overflow:hidden;width:100%;display:flex;}
+        .ssb-bar-lbl{display:flex;justify-content:space-between;font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;letter-spacing:0.5px;}
+        @media(max-width:900px){
+            .ssb-grid{grid-template-columns:repeat(3,1fr) !important;}
+            .ssb-cell:nth-child(3){border-right:none;}
+            .ssb-cell:nth-child(4),.ssb-cell:nth-child(5){border-top:1px solid rgba(79,195,247,0.08);}
+            .ssb-verdict{grid-column:1/-1;border-left:none !important;border-top:1px solid rgba(79,195,247,0.1);flex-direction:row;flex-wrap:wrap;justify-content:center;gap:10px;padding:12px;}
+        }
+        @media(max-width:600px){
+            .ssb-grid{grid-template-columns:repeat(2,1fr) !important;}
+            .ssb-cell:nth-child(2n){border-right:none;}
+            .ssb-cell{border-top:1px solid rgba(79,195,247,0.07);}
+            .ssb-cell:nth-child(1),.ssb-cell:nth-child(2){border-top:none;}
+            .ssb-verdict-val{font-size:13px;}
+        }
 
-        level_min = min(spot, max_pain) - 200
-        level_max = max(spot, max_pain) + 200
-        rng = level_max - level_min or 1
-        spot_pct  = round((spot - level_min) / rng * 100, 1)
-        pain_pct  = round((max_pain - level_min) / rng * 100, 1)
-        pain_diff = int(max_pain - spot)
-        pain_sign = '+' if pain_diff >= 0 else ''
-        pain_col  = '#00e676' if pain_diff > 0 else '#ff5252'
+        """ + get_heatmap_css() + """
+        """ + get_pretrade_checklist_css() + """
 
-        ce_oi_chg   = d.get('total_ce_oi_change', 0)
-        pe_oi_chg   = d.get('total_pe_oi_change', 0)
-        total_abs   = abs(ce_oi_chg) + abs(pe_oi_chg) or 1
-        ce_bar_pct  = round(abs(ce_oi_chg) / total_abs * 100, 1)
-        pe_bar_pct  = round(abs(pe_oi_chg) / total_abs * 100, 1)
-        ce_chg_col  = '#ff5252' if ce_oi_chg > 0 else '#00e676'
-        pe_chg_col  = '#00e676' if pe_oi_chg > 0 else '#ff5252'
 
-        return f"""
-        <!-- ── PCR Card ──────────────────────────────────────────────── -->
-        <div class="g-compact" style="border-color:{pcr_border};background:linear-gradient(145deg,rgba(12,4,8,0.95),rgba(8,4,6,0.98));position:relative;overflow:hidden;">
-          <div style="position:absolute;top:0;left:0;right:0;height:1px;
-            background:linear-gradient(90deg,transparent,{pcr_col},transparent);"></div>
-          <div class="cc-top">
-            <span class="cc-ico">&#128308;</span>
-            <div class="cc-lbl">PCR Ratio (OI)</div>
-            <span class="tag {pcr_tag_cls}">{pcr_tag}</span>
-          </div>
-          <div class="cc-val" style="color:{pcr_col};">{pcr:.3f}</div>
-          <div class="cc-sub">Put/Call OI Ratio</div>
-          <div style="position:relative;margin:8px 0 4px;">
-            <div style="height:8px;border-radius:4px;overflow:hidden;background:rgba(0,0,0,0.4);position:relative;">
-              <div style="position:absolute;inset:0;border-radius:4px;
-                background:linear-gradient(90deg,#ff3355 0%,#ff9900 35%,#ffcc00 50%,#88dd00 65%,#00e676 100%);opacity:0.75;"></div>
-              <div style="position:absolute;left:35%;top:0;bottom:0;width:1px;background:rgba(255,255,255,0.4);"></div>
-              <div style="position:absolute;left:60%;top:0;bottom:0;width:1px;background:rgba(255,255,255,0.4);"></div>
-              <div style="position:absolute;top:-3px;left:{pcr_needle_pct}%;
-                transform:translateX(-50%);width:3px;height:14px;
-                background:white;border-radius:1.5px;box-shadow:0 0 8px white;"></div>
-            </div>
-            <div style="display:flex;justify-content:space-between;margin-top:4px;
-              font-family:'JetBrains Mono',monospace;font-size:8px;">
-              <span style="color:#ff5252;">&#60;0.7 Bear</span>
-              <span style="color:rgba(180,210,230,0.35);">Neutral</span>
-              <span style="color:#00e676;">&#62;1.2 Bull</span>
-            </div>
-          </div>
-        </div>
+        /* ══ OI CHART ENHANCEMENTS ════════════════════════════ */
+        .oi-stat-strip{display:grid;grid-template-columns:repeat(4,1fr);gap:10px;margin-bottom:14px;}
+        .oi-stat-box{background:rgba(255,255,255,0.025);border:1px solid rgba(79,195,247,0.1);border-radius:10px;padding:10px 14px;text-align:center;}
+        .oi-stat-label{font-size:8px;letter-spacing:2px;color:rgba(128,222,234,0.9);text-transform:uppercase;font-weight:700;margin-bottom:4px;font-family:'JetBrains Mono',monospace;}
+        .oi-stat-val{font-family:'Oxanium',monospace;font-size:clamp(14px,2vw,18px);font-weight:700;line-height:1.2;color:#e0f7fa;}
+        .oi-stat-pos{color:#34d399!important;}
+        .oi-stat-neg{color:#f87171!important;}
+        .oi-stat-sub{font-family:'JetBrains Mono',monospace;font-size:9px;color:rgba(176,190,197,0.3);margin-top:3px;}
+        .oi-y-label{font-family:'JetBrains Mono',monospace;font-size:9px;text-align:right;padding-right:6px;line-height:1;color:rgba(128,222,234,0.25);}
+        .oi-x-label{font-family:'JetBrains Mono',monospace;font-size:9px;color:rgba(128,222,234,0.2);}
+        @media(max-width:600px){.oi-stat-strip{grid-template-columns:repeat(2,1fr);}}
+        @media(max-width:380px){.oi-stat-strip{grid-template-columns:1fr;}}
 
-        <!-- ── Max Pain Card ─────────────────────────────────────────── -->
-        <div class="g-compact" style="border-color:rgba(255,183,77,0.3);background:linear-gradient(145deg,rgba(28,22,8,0.9),rgba(12,10,4,0.95));position:relative;overflow:hidden;">
-          <div style="position:absolute;top:0;left:0;right:0;height:1px;
-            background:linear-gradient(90deg,transparent,#ffb74d,transparent);"></div>
-          <div class="cc-top">
-            <span class="cc-ico">&#127919;</span>
-            <div class="cc-lbl">Max Pain</div>
-            <span class="tag tag-neu">Expiry Magnet</span>
-          </div>
-          <div class="cc-val" style="color:#ffb74d;">&#8377;{max_pain:,}</div>
-          <div class="cc-sub">Price gravity level</div>
-          <div style="position:relative;height:20px;border-radius:6px;overflow:hidden;
-            background:linear-gradient(90deg,rgba(0,230,118,0.1),rgba(255,183,77,0.2),rgba(255,82,82,0.1));
-            margin:8px 0 4px;">
-            <div style="position:absolute;left:{pain_pct}%;top:50%;
-              transform:translate(-50%,-50%);width:3px;height:16px;
-              background:#ffb74d;box-shadow:0 0 8px #ffb74d;border-radius:1.5px;"></div>
-            <div style="position:absolute;left:{spot_pct}%;top:50%;
-              transform:translate(-50%,-50%);width:3px;height:16px;
-              background:#4fc3f7;box-shadow:0 0 8px #4fc3f7;border-radius:1.5px;"></div>
-          </div>
-          <div style="display:flex;justify-content:space-between;font-family:'JetBrains Mono',monospace;font-size:8px;">
-            <span style="color:#4fc3f7;">&#9632; Now &#8377;{spot:,.0f}</span>
-            <span style="color:{pain_col};">{pain_sign}{pain_diff:,} pts to pain</span>
-            <span style="color:#ffb74d;">&#9632; Pain &#8377;{max_pain:,}</span>
-          </div>
-        </div>
+        /* ══ NIFTY LIVE FEED — Side-by-Side Panel ════════════════════ */
+        .nlf-side-by-side{display:flex;gap:14px;margin-bottom:20px;align-items:stretch;}
+        .nlf-left{flex:1;min-width:0;display:flex;flex-direction:column;}
+        .nlf-left .oi-chart-wrap{flex:1;margin-bottom:0;}
+        .nlf-right{flex:1;min-width:0;display:flex;}
+        .nlf-panel{flex:1;background:rgba(6,13,20,0.85);border:1px solid rgba(79,195,247,0.18);border-radius:14px;padding:16px;display:flex;flex-direction:column;font-family:'JetBrains Mono',monospace;}
+        .nlf-header{display:flex;justify-content:space-between;align-items:flex-start;margin-bottom:12px;gap:8px;flex-wrap:wrap;}
+        .nlf-title-row{display:flex;align-items:center;gap:7px;}
+        .nlf-live-dot{width:8px;height:8px;border-radius:50%;background:#00e676;box-shadow:0 0 8px #00e676;animation:sb-pulse 1.5s ease-in-out infinite;flex-shrink:0;}
+        .nlf-title{font-family:'Oxanium',sans-serif;font-size:18px;font-weight:700;color:#e0f7fa;letter-spacing:1px;}
+        .nlf-meta{text-align:right;font-size:14px;color:rgba(200,221,232,0.7);line-height:1.6;}
+        .nlf-meta b{color:#fff;font-weight:700;}
+        .nlf-meta-spot{display:block;font-size:15px;}
+        .nlf-meta-item{font-size:14px;}
+        .nlf-meta-sep{color:rgba(128,222,234,0.3);margin:0 2px;}
+        .nlf-badges{display:flex;flex-wrap:wrap;gap:5px;margin-bottom:12px;}
+        .nlf-badge{display:inline-flex;align-items:center;gap:4px;padding:5px 12px;border-radius:5px;font-size:13px;font-weight:700;letter-spacing:0.5px;white-space:nowrap;}
+        .nlf-badge-buy{background:rgba(0,200,83,0.12);color:#00c853;border:1px solid rgba(0,200,83,0.4);}
+        .nlf-badge-sell{background:rgba(255,58,74,0.12);color:#ff3a4a;border:1px solid rgba(255,58,74,0.4);}
+        .nlf-badge-warn{background:rgba(255,183,77,0.1);color:#ffb74d;border:1px solid rgba(255,183,77,0.35);}
+        .nlf-badge-info{background:rgba(200,221,232,0.06);color:#c8dde8;border:1px solid rgba(200,221,232,0.2);}
+        .nlf-badge-danger{background:rgba(255,58,74,0.1);color:#ff6b6b;border:1px solid rgba(255,58,74,0.3);}
+        .nlf-thead{display:grid;grid-template-columns:2fr 2fr 2.5fr 2.5fr 1.5fr 3.5fr 2fr 2.5fr;gap:4px;font-size:11px;letter-spacing:1px;color:rgba(128,222,234,0.7);text-transform:uppercase;font-weight:700;padding:6px 0;border-bottom:1px solid rgba(79,195,247,0.12);}
+        .nlf-th-mom{text-align:center;}
+        .nlf-tbody{flex:1;display:flex;flex-direction:column;}
+        .nlf-row{display:grid;grid-template-columns:2fr 2fr 2.5fr 2.5fr 1.5fr 3.5fr 2fr 2.5fr;gap:4px;padding:8px 0;align-items:center;font-size:13px;color:#c8dde8;border-bottom:1px solid rgba(255,255,255,0.03);}
+        .nlf-row-live{background:rgba(0,200,83,0.04);border-left:2px solid rgba(0,230,118,0.5);padding-left:4px;}
+        .nlf-row-time{color:rgba(176,190,197,0.6);font-size:13px;display:inline-flex;align-items:center;gap:4px;}
+        .nlf-row-pcr{font-weight:700;font-size:12px;text-align:center;}
+        .nlf-row-delta{font-weight:700;font-size:12px;text-align:right;}
+        .nlf-row-vwap{text-align:center;font-size:12px;font-weight:700;}
+        .nlf-row-stk{text-align:center;color:#ffd32a;font-weight:700;font-size:13px;}
+        .nlf-row-level{text-align:center;font-size:11px;font-weight:700;overflow:hidden;text-overflow:ellipsis;}
+        .nlf-row-rsi{text-align:right;font-weight:700;font-size:12px;}
+        .nlf-row-conf{text-align:center;font-weight:800;font-size:11px;}
+        .nlf-footer{display:flex;justify-content:space-between;padding-top:8px;margin-top:auto;border-top:1px solid rgba(79,195,247,0.08);font-size:13px;}
+        .nlf-footer-left{color:rgba(176,190,197,0.45);}
+        .nlf-footer-right{font-weight:700;}
+        @media(max-width:1100px){
+            .nlf-side-by-side{flex-direction:column;}
+            .nlf-right{width:100%;}
+        }
+        @media(max-width:600px){
+            .nlf-thead,.nlf-row{grid-template-columns:2fr 2fr 2.5fr 2.5fr 1.5fr 3.5fr 2fr 2.5fr;gap:2px;font-size:11px;}
+            .nlf-row-level span{font-size:9px !important;}
+            .nlf-row-time{font-size:11px;}
+            .nlf-row-pcr,.nlf-row-delta,.nlf-row-vwap,.nlf-row-stk,.nlf-row-rsi,.nlf-row-conf{font-size:11px;}
+            .nlf-badge{font-size:11px;padding:3px 8px;}
+            .nlf-panel{padding:10px;}
+        }
+        @media(max-width:1024px){
+            .grid-5{grid-template-columns:repeat(3,minmax(0,1fr));}
+            .grid-4{grid-template-columns:repeat(2,minmax(0,1fr));}
+            .pf-grid{grid-template-columns:repeat(3,minmax(0,1fr));gap:10px;}
+            .nc-cards-grid{grid-template-columns:repeat(3,minmax(0,1fr));}
+            .nc-meter-track{width:140px;}
+            .oi-summary-strip{grid-template-columns:repeat(2,minmax(0,1fr));}
+        }
 
-        <!-- ── Max CE OI (Resistance Wall) ──────────────────────────── -->
-        <div class="g-compact" style="border-color:rgba(255,82,82,0.28);background:linear-gradient(145deg,rgba(30,10,14,0.9),rgba(12,4,8,0.95));position:relative;overflow:hidden;">
-          <div style="position:absolute;top:0;left:0;right:0;height:1px;
-            background:linear-gradient(90deg,transparent,#ff5252,transparent);"></div>
-          <div class="cc-top">
-            <span class="cc-ico">&#128308;</span>
-            <div class="cc-lbl">Max Call OI</div>
-            <span class="tag tag-bear">Resistance</span>
-          </div>
-          <div class="cc-val" style="color:#ff8899;">&#8377;{max_ce:,}</div>
-          <div class="cc-sub">CE wall</div>
-          <div style="margin-top:8px;">
-            <div style="font-family:'JetBrains Mono',monospace;font-size:8px;letter-spacing:1.5px;
-              color:rgba(120,160,180,0.4);text-transform:uppercase;margin-bottom:6px;">OI Change Today</div>
-            <div style="display:flex;flex-direction:column;gap:5px;">
-              <div style="display:flex;align-items:center;gap:7px;">
-                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:{ce_chg_col};width:22px;">CE</span>
-                <div style="flex:1;height:5px;background:rgba(0,0,0,0.4);border-radius:3px;overflow:hidden;">
-                  <div style="height:100%;width:{ce_bar_pct}%;border-radius:3px;background:linear-gradient(90deg,#ff5252,#ff6680);"></div>
-                </div>
-                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:{ce_chg_col};width:30px;text-align:right;">{ce_bar_pct:.0f}%</span>
-              </div>
-              <div style="display:flex;align-items:center;gap:7px;">
-                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:{pe_chg_col};width:22px;">PE</span>
-                <div style="flex:1;height:5px;background:rgba(0,0,0,0.4);border-radius:3px;overflow:hidden;">
-                  <div style="height:100%;width:{pe_bar_pct}%;border-radius:3px;background:linear-gradient(90deg,#00e676,#44ffaa);"></div>
-                </div>
-                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:{pe_chg_col};width:30px;text-align:right;">{pe_bar_pct:.0f}%</span>
-              </div>
-            </div>
-          </div>
-        </div>
+        /* ══ SIDEBAR NAV ══════════════════════════════════════════════ */
+        .page-body{display:flex;align-items:flex-start;position:relative;min-height:100vh;}
+        .page-content{flex:1;min-width:0;width:100%;}
+        .nav-sidebar{
+            width:190px;flex-shrink:0;
+            background:#07111a;
+            border-right:1px solid rgba(79,195,247,0.12);
+            position:sticky;top:var(--header-h,0px);
+            height:calc(100vh - var(--header-h,0px));
+            max-height:calc(100vh - var(--header-h,0px));
+            align-self:flex-start;
+            display:flex;flex-direction:column;
+            transition:width 0.22s ease;
+            z-index:100;overflow:hidden;
+        }
+        .nav-sidebar.collapsed{width:46px;}
+        .nsb-header{display:flex;align-items:center;justify-content:space-between;padding:12px 10px;border-bottom:1px solid rgba(79,195,247,0.1);flex-shrink:0;}
+        .nsb-logo{font-family:'Oxanium',sans-serif;font-size:11px;letter-spacing:3px;color:#4fc3f7;font-weight:700;white-space:nowrap;overflow:hidden;transition:opacity 0.2s;}
+        .nav-sidebar.collapsed .nsb-logo{opacity:0;pointer-events:none;}
+        .nsb-toggle{width:26px;height:26px;border-radius:6px;border:1px solid rgba(79,195,247,0.2);background:transparent;cursor:pointer;display:flex;align-items:center;justify-content:center;flex-shrink:0;}
+        .nsb-toggle:hover{background:rgba(79,195,247,0.1);}
+        .nsb-toggle svg{transition:transform 0.22s;}
+        .nav-sidebar.collapsed .nsb-toggle svg{transform:rotate(180deg);}
+        .nsb-nav{flex:1;overflow-y:auto;overflow-x:hidden;padding:8px 0;scrollbar-width:thin;scrollbar-color:rgba(79,195,247,0.15) transparent;}
+        .nsb-nav::-webkit-scrollbar{width:3px;}
+        .nsb-nav::-webkit-scrollbar-thumb{background:rgba(79,195,247,0.2);border-radius:2px;}
+        .nsb-group{font-size:9px;letter-spacing:2px;color:rgba(79,195,247,0.65);padding:10px 12px 4px;text-transform:uppercase;white-space:nowrap;overflow:hidden;transition:opacity 0.2s;font-weight:700;}
+        .nav-sidebar.collapsed .nsb-group{opacity:0;}
+        .nsb-item{display:flex;align-items:center;gap:9px;padding:8px 12px;cursor:pointer;border-left:2px solid transparent;transition:all 0.15s ease;position:relative;}
+        .nsb-item:hover{background:rgba(79,195,247,0.06);border-left-color:rgba(79,195,247,0.3);}
+        .nsb-item.active{background:rgba(79,195,247,0.1);border-left-color:#4fc3f7;}
+        .nsb-icon{width:18px;height:18px;flex-shrink:0;display:flex;align-items:center;justify-content:center;color:rgba(128,222,234,0.45);}
+        .nsb-item.active .nsb-icon{color:#4fc3f7;}
+        .nsb-icon svg{width:15px;height:15px;}
+        .nsb-label{font-family:'JetBrains Mono',monospace;font-size:10.5px;color:rgba(176,190,197,0.55);white-space:nowrap;overflow:hidden;transition:opacity 0.15s;letter-spacing:0.3px;}
+        .nsb-item.active .nsb-label{color:#e0f7fa;}
+        .nav-sidebar.collapsed .nsb-label{opacity:0;width:0;pointer-events:none;}
+        .nav-sidebar.collapsed .nsb-item{padding:8px 14px;}
+        .nsb-tip{display:none;position:absolute;left:48px;top:50%;transform:translateY(-50%);background:#0d1e2a;border:1px solid rgba(79,195,247,0.25);border-radius:6px;padding:4px 11px;font-family:'JetBrains Mono',monospace;font-size:10px;color:#80deea;white-space:nowrap;z-index:999;pointer-events:none;}
+        .nav-sidebar.collapsed .nsb-item:hover .nsb-tip{display:block;}
 
-        <!-- ── Max PE OI (Support Floor) ────────────────────────────── -->
-        <div class="g-compact" style="border-color:rgba(0,230,118,0.25);background:linear-gradient(145deg,rgba(10,30,20,0.9),rgba(4,14,10,0.95));position:relative;overflow:hidden;">
-          <div style="position:absolute;top:0;left:0;right:0;height:1px;
-            background:linear-gradient(90deg,transparent,#00e676,transparent);"></div>
-          <div class="cc-top">
-            <span class="cc-ico">&#128994;</span>
-            <div class="cc-lbl">Max Put OI</div>
-            <span class="tag tag-bull">Support</span>
-          </div>
-          <div class="cc-val" style="color:#44ffaa;">&#8377;{max_pe:,}</div>
-          <div class="cc-sub">PE floor</div>
-          <div style="margin-top:8px;">
-            <div style="font-family:'JetBrains Mono',monospace;font-size:8px;letter-spacing:1.5px;
-              color:rgba(120,160,180,0.4);text-transform:uppercase;margin-bottom:6px;">Total OI Ratio</div>
-            <div style="display:flex;flex-direction:column;gap:5px;">
-              <div style="display:flex;align-items:center;gap:7px;">
-                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:#ff8899;width:22px;">CE</span>
-                <div style="flex:1;height:5px;background:rgba(0,0,0,0.4);border-radius:3px;overflow:hidden;">
-                  <div style="height:100%;width:{ce_pct:.1f}%;border-radius:3px;background:linear-gradient(90deg,#ff5252,#ff6680);"></div>
-                </div>
-                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:#ff8899;width:30px;text-align:right;">{ce_pct:.0f}%</span>
-              </div>
-              <div style="display:flex;align-items:center;gap:7px;">
-                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:#44ffaa;width:22px;">PE</span>
-                <div style="flex:1;height:5px;background:rgba(0,0,0,0.4);border-radius:3px;overflow:hidden;">
-                  <div style="height:100%;width:{pe_pct:.1f}%;border-radius:3px;background:linear-gradient(90deg,#00e676,#44ffaa);"></div>
-                </div>
-                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:#44ffaa;width:30px;text-align:right;">{pe_pct:.0f}%</span>
-              </div>
-            </div>
-          </div>
-        </div>"""
+        /* ── Mobile nav bar + drawer ───────────────────────── */
+        .nsb-mob-bar{
+            display:none;align-items:center;gap:10px;
+            padding:10px 14px;
+            background:#07111a;
+            border-bottom:1px solid rgba(79,195,247,0.18);
+            position:sticky;top:0;z-index:90;
+            width:100%;
+        }
+        .nsb-mob-btn{
+            width:36px;height:36px;border-radius:8px;
+            border:1px solid rgba(79,195,247,0.3);
+            background:rgba(79,195,247,0.06);
+            cursor:pointer;display:flex;align-items:center;justify-content:center;
+            flex-shrink:0;
+        }
+        .nsb-mob-btn:active{background:rgba(79,195,247,0.15);}
+        .nsb-mob-title{
+            font-family:'JetBrains Mono',monospace;
+            font-size:12px;letter-spacing:1.5px;
+            color:rgba(79,195,247,0.8);
+            text-transform:uppercase;
+            flex:1;overflow:hidden;text-overflow:ellipsis;white-space:nowrap;
+        }
+        .nsb-drawer{
+            display:none;position:fixed;
+            top:0;left:0;width:100%;height:100%;
+            background:rgba(4,10,16,0.98);
+            z-index:200;flex-direction:column;
+        }
+        .nsb-drawer.open{display:flex;}
+        .nsb-drawer-head{
+            display:flex;align-items:center;justify-content:space-between;
+            padding:16px 18px;
+            border-bottom:1px solid rgba(79,195,247,0.15);
+            flex-shrink:0;
+        }
+        .nsb-drawer-title{
+            font-family:'JetBrains Mono',monospace;font-size:10px;
+            letter-spacing:3px;color:rgba(79,195,247,0.5);text-transform:uppercase;
+        }
+        .nsb-drawer-close{
+            width:36px;height:36px;border-radius:8px;
+            border:1px solid rgba(255,82,82,0.35);
+            background:rgba(255,82,82,0.06);
+            cursor:pointer;color:rgba(255,82,82,0.8);
+            font-size:16px;display:flex;align-items:center;justify-content:center;
+        }
+        .nsb-drawer-nav{flex:1;overflow-y:auto;padding:6px 0;}
+        .nsb-mob-item{
+            padding:15px 20px;
+            font-family:'JetBrains Mono',monospace;font-size:13px;
+            color:rgba(176,190,197,0.65);
+            cursor:pointer;border-left:3px solid transparent;
+            letter-spacing:0.5px;
+            transition:all 0.15s ease;
+        }
+        .nsb-mob-item:active,
+        .nsb-mob-item.active{
+            background:rgba(79,195,247,0.1);
+            border-left-color:#4fc3f7;color:#e0f7fa;
+        }
 
-    def _signal_summary_bar_html(self):
-        d = self.html_data
+        /* ══ MOBILE RESPONSIVE OVERRIDES ════════════════════════════ */
+        @media(max-width:768px){
+            /* Hide desktop sidebar, show mobile bar */
+            .nav-sidebar{display:none;}
+            .nsb-mob-bar{display:flex;}
+            .page-body{flex-direction:column;}
+            .page-content{width:100%;min-width:0;}
 
-        # ── 1. OI Signal ──────────────────────────────────────────────────
-        oi_cls = d.get('oi_class', 'neutral') if d.get('has_option_data') else 'neutral'
-        if   oi_cls == 'bullish':  oi_score=1;  oi_lbl='Bullish';  oi_sub='Put build dominant';       oi_col='#00e676'; oi_bg='rgba(0,230,118,0.12)';  oi_bdr='rgba(0,230,118,0.3)';  oi_arrow='&#9651;'
-        elif oi_cls == 'bearish':  oi_score=-1; oi_lbl='Bearish';  oi_sub='Call build dominant';      oi_col='#ff4757'; oi_bg='rgba(255,71,87,0.12)';  oi_bdr='rgba(255,71,87,0.3)';  oi_arrow='&#9661;'
-        else:                      oi_score=0;  oi_lbl='Neutral';  oi_sub='Both sides building';      oi_col='#ffb74d'; oi_bg='rgba(255,183,77,0.10)'; oi_bdr='rgba(255,183,77,0.25)'; oi_arrow='&#9711;'
+            /* Header — Option B mobile */
+            .hb-banner{padding:10px 12px;gap:8px;}
+            .hb-chips{display:none;}
+            .hb-title-main{font-size:13px;}
+            .hb-status{padding:5px 12px;gap:4px;flex-wrap:wrap;}
+            .hb-s-item{font-size:9px;}
+            .tab-btn{padding:9px 10px;font-size:9px;letter-spacing:0.8px;gap:5px;}
+            .tab-badge{font-size:8px;padding:2px 5px;}
 
-        # ── 2. FII/DII Signal ─────────────────────────────────────────────
-        fii_summ  = d.get('fii_dii_summ', {})
-        fii_badge = fii_summ.get('badge_cls', 'fii-neu')
-        fii_label = fii_summ.get('label', 'Neutral')
-        fii_avg   = fii_summ.get('fii_avg', 0)
-        dii_avg   = fii_summ.get('dii_avg', 0)
-        if   fii_badge in ('fii-bull',):  fii_score=1;  fii_col='#00e676'; fii_bg='rgba(0,230,118,0.12)';   fii_bdr='rgba(0,230,118,0.3)';   fii_arrow='&#9651;'
-        elif fii_badge in ('fii-cbull',): fii_score=1;  fii_col='#69f0ae'; fii_bg='rgba(105,240,174,0.10)'; fii_bdr='rgba(105,240,174,0.28)'; fii_arrow='&#9651;'
-        elif fii_badge in ('fii-bear',):  fii_score=-1; fii_col='#ff4757'; fii_bg='rgba(255,71,87,0.12)';   fii_bdr='rgba(255,71,87,0.3)';   fii_arrow='&#9661;'
-        else:                             fii_score=0;  fii_col='#ffb74d'; fii_bg='rgba(255,183,77,0.10)';  fii_bdr='rgba(255,183,77,0.25)'; fii_arrow='&#9711;'
-        fii_sub = f"FII {'+' if fii_avg>=0 else ''}{fii_avg:,.0f} / DII {'+' if dii_avg>=0 else ''}{dii_avg:,.0f}"
+            /* Sections */
+            .section{padding:12px 12px;}
+            .section-title{font-size:11px;letter-spacing:1px;margin-bottom:12px;padding-bottom:8px;gap:6px;}
 
-        # ── 3. Technical Signal ───────────────────────────────────────────
-        bias       = d.get('bias', 'SIDEWAYS')
-        bull_score = d.get('bullish_score', 0)
-        bear_score = d.get('bearish_score', 0)
-        score_diff = bull_score - bear_score
-        if   bias in ('BULLISH',):    tech_score=1;  tech_lbl='Bullish';    tech_col='#00e676'; tech_bg='rgba(0,230,118,0.12)';   tech_bdr='rgba(0,230,118,0.3)';   tech_arrow='&#9651;'
-        elif bias in ('WATCH BULL',): tech_score=1;  tech_lbl='Watch Bull'; tech_col='#b5ea3a'; tech_bg='rgba(181,234,58,0.10)';  tech_bdr='rgba(181,234,58,0.28)'; tech_arrow='&#9651;'
-        elif bias in ('BEARISH',):    tech_score=-1; tech_lbl='Bearish';    tech_col='#ff4757'; tech_bg='rgba(255,71,87,0.12)';   tech_bdr='rgba(255,71,87,0.3)';   tech_arrow='&#9661;'
-        elif bias in ('WATCH BEAR',): tech_score=-1; tech_lbl='Watch Bear'; tech_col='#ff9800'; tech_bg='rgba(255,152,0,0.10)';   tech_bdr='rgba(255,152,0,0.28)';  tech_arrow='&#9661;'
-        else:                         tech_score=0;  tech_lbl='Sideways';   tech_col='#ffb74d'; tech_bg='rgba(255,183,77,0.10)';  tech_bdr='rgba(255,183,77,0.25)'; tech_arrow='&#8596;'
-        tech_sub = f"Score {score_diff:+d} / {bull_score+bear_score} signals"
+            /* Grids → single or 2-col */
+            .grid-5,.grid-4{grid-template-columns:1fr 1fr!important;}
+            .snap-grid{grid-template-columns:1fr 1fr!important;gap:8px;}
+            .card-grid{gap:8px;}
 
-        # ── 4. Strategy Checklist Score ───────────────────────────────────
-        # Re-derive from existing html_data fields (same data checklist uses)
-        pcr_val  = d.get('pcr') if d.get('has_option_data') else None
-        rsi_val  = d.get('rsi')
-        macd_b   = d.get('macd_bullish')
-        sma20    = d.get('sma_20_above')
-        sma50    = d.get('sma_50_above')
-        sma200   = d.get('sma_200_above')
-        oi_dir   = d.get('oi_class') if d.get('has_option_data') else None
-        strat_sc = 0
-        if pcr_val is not None:
-            if   pcr_val > 1.5: strat_sc += 2
-            elif pcr_val > 1.1: strat_sc += 1
-            elif pcr_val < 0.5: strat_sc -= 2
-            elif pcr_val < 0.9: strat_sc -= 1
-        if rsi_val is not None:
-            if   rsi_val > 70:  strat_sc -= 1
-            elif rsi_val < 30:  strat_sc += 2
-            elif rsi_val >= 55: strat_sc += 1
-            elif rsi_val <= 45: strat_sc -= 1
-        if macd_b is not None: strat_sc += 1 if macd_b else -1
-        trend_pts = sum([1 if x else -1 for x in [sma20, sma50, sma200] if x is not None])
-        strat_sc += (1 if trend_pts > 0 else -1 if trend_pts < 0 else 0)
-        if oi_dir == 'bullish':  strat_sc += 1
-        elif oi_dir == 'bearish': strat_sc -= 1
-        if   strat_sc >= 3:  strat_score=1;  strat_lbl='Strong Bull'; strat_col='#00e676'; strat_bg='rgba(0,230,118,0.12)';  strat_bdr='rgba(0,230,118,0.3)';  strat_arrow='&#9651;'
-        elif strat_sc >= 1:  strat_score=1;  strat_lbl='Mild Bull';   strat_col='#69f0ae'; strat_bg='rgba(105,240,174,0.10)';strat_bdr='rgba(105,240,174,0.28)';strat_arrow='&#9651;'
-        elif strat_sc <= -3: strat_score=-1; strat_lbl='Strong Bear'; strat_col='#ff4757'; strat_bg='rgba(255,71,87,0.12)';  strat_bdr='rgba(255,71,87,0.3)';  strat_arrow='&#9661;'
-        elif strat_sc <= -1: strat_score=-1; strat_lbl='Mild Bear';   strat_col='#fca5a5'; strat_bg='rgba(252,165,165,0.10)';strat_bdr='rgba(252,165,165,0.25)';strat_arrow='&#9661;'
-        else:                strat_score=0;  strat_lbl='Neutral';     strat_col='#ffb74d'; strat_bg='rgba(255,183,77,0.10)'; strat_bdr='rgba(255,183,77,0.25)'; strat_arrow='&#9711;'
-        strat_sub = f"Score {strat_sc:+d} / 5 factors"
+            /* OI table: full horizontal scroll */
+            .oi-table-wrap{overflow-x:auto;-webkit-overflow-scrolling:touch;}
+            .oi-table{min-width:520px;}
+            .oi-table thead th,.oi-table tbody td{padding:7px 8px;font-size:10px;}
+            .oi-table-scroll-hint{display:flex;}
+            .oi-view-btn{padding:5px 10px;font-size:9px;}
 
-        # ── 5. PCR Signal ─────────────────────────────────────────────────
-        pcr_disp = d.get('pcr', 0) if d.get('has_option_data') else None
-        if pcr_disp is not None:
-            if   pcr_disp > 1.5: pcr_score=1;  pcr_lbl=f'{pcr_disp:.2f}'; pcr_sub='Strongly Bullish';  pcr_col='#00e676'; pcr_bg='rgba(0,230,118,0.12)';  pcr_bdr='rgba(0,230,118,0.3)'
-            elif pcr_disp > 1.1: pcr_score=1;  pcr_lbl=f'{pcr_disp:.2f}'; pcr_sub='Bullish (>1.1)';    pcr_col='#69f0ae'; pcr_bg='rgba(105,240,174,0.10)';pcr_bdr='rgba(105,240,174,0.28)'
-            elif pcr_disp < 0.5: pcr_score=-1; pcr_lbl=f'{pcr_disp:.2f}'; pcr_sub='Strongly Bearish';  pcr_col='#ff4757'; pcr_bg='rgba(255,71,87,0.12)';  pcr_bdr='rgba(255,71,87,0.3)'
-            elif pcr_disp < 0.9: pcr_score=-1; pcr_lbl=f'{pcr_disp:.2f}'; pcr_sub='Bearish (<0.9)';    pcr_col='#ff9999'; pcr_bg='rgba(255,71,87,0.08)';  pcr_bdr='rgba(255,71,87,0.2)'
-            else:                pcr_score=0;  pcr_lbl=f'{pcr_disp:.2f}'; pcr_sub='Neutral (0.9-1.1)'; pcr_col='#ffb74d'; pcr_bg='rgba(255,183,77,0.10)'; pcr_bdr='rgba(255,183,77,0.25)'
-        else:
-            pcr_score=0; pcr_lbl='N/A'; pcr_sub='No option data'; pcr_col='#8faabe'; pcr_bg='rgba(143,170,190,0.08)'; pcr_bdr='rgba(143,170,190,0.2)'
+            /* OI summary strip */
+            .oi-summary-strip{grid-template-columns:1fr 1fr;gap:8px;}
+            .oi-stat-strip{grid-template-columns:1fr 1fr;gap:8px;}
+            .oi-controls{flex-direction:column;gap:8px;align-items:flex-start;}
+            .oi-chart-wrap{padding:10px;}
 
-        # ── Overall Verdict ───────────────────────────────────────────────
-        scores     = [oi_score, fii_score, tech_score, strat_score, pcr_score]
-        bull_count = sum(1 for s in scores if s > 0)
-        bear_count = sum(1 for s in scores if s < 0)
-        neu_count  = sum(1 for s in scores if s == 0)
-        total      = len(scores)
-        bull_pct   = round(bull_count / total * 100)
-        bear_pct   = round(bear_count / total * 100)
+            /* NC / OI navy */
+            .nc-cards-grid{grid-template-columns:1fr!important;gap:8px;}
+            .nc-section-header{flex-direction:column;align-items:flex-start;}
+            .nc-meters-panel{width:100%;min-width:unset;}
+            .nc-meter-track{width:100%;max-width:100%;}
+            .nc-dir-name{font-size:18px;}
+            .nc-wrap{padding:0;}
 
-        if   bull_count >= 4: vrd_lbl='STRONGLY BULLISH'; vrd_col='#00e676'; vrd_bg='rgba(0,230,118,0.08)';  vrd_bdr='#00e676';  vrd_lbdr='rgba(0,230,118,0.6)'
-        elif bull_count == 3: vrd_lbl='BULLISH';          vrd_col='#00e676'; vrd_bg='rgba(0,230,118,0.06)';  vrd_bdr='#00e676';  vrd_lbdr='rgba(0,230,118,0.5)'
-        elif bull_count == 2 and bear_count == 0: vrd_lbl='CAUTIOUSLY BULLISH'; vrd_col='#69f0ae'; vrd_bg='rgba(105,240,174,0.06)'; vrd_bdr='#69f0ae'; vrd_lbdr='rgba(105,240,174,0.4)'
-        elif bear_count >= 4: vrd_lbl='STRONGLY BEARISH'; vrd_col='#ff4757'; vrd_bg='rgba(255,71,87,0.08)';  vrd_bdr='#ff4757';  vrd_lbdr='rgba(255,71,87,0.6)'
-        elif bear_count == 3: vrd_lbl='BEARISH';          vrd_col='#ff4757'; vrd_bg='rgba(255,71,87,0.06)';  vrd_bdr='#ff4757';  vrd_lbdr='rgba(255,71,87,0.5)'
-        elif bear_count == 2 and bull_count == 0: vrd_lbl='CAUTIOUSLY BEARISH'; vrd_col='#fca5a5'; vrd_bg='rgba(252,165,165,0.06)'; vrd_bdr='#fca5a5'; vrd_lbdr='rgba(252,165,165,0.4)'
-        else:                 vrd_lbl='NEUTRAL';          vrd_col='#ffb74d'; vrd_bg='rgba(255,183,77,0.06)'; vrd_bdr='#ffb74d';  vrd_lbdr='rgba(255,183,77,0.4)'
+            /* Key levels */
+            div[style*="grid-template-columns:1fr 1fr"]{grid-template-columns:1fr!important;}
 
-        # ── Dot indicators ────────────────────────────────────────────────
-        dot_scores = [
-            (oi_score,    'OI'),
-            (fii_score,   'FII/DII'),
-            (tech_score,  'Technical'),
-            (strat_score, 'Strategy'),
-            (pcr_score,   'PCR'),
-        ]
-        dots_html = ''
-        for sc, name in dot_scores:
-            if   sc > 0:  dc='#00e676'
-            elif sc < 0:  dc='#ff4757'
-            else:          dc='rgba(255,255,255,0.12)'
-            dots_html += f'<div class="ssb-dot" style="background:{dc};" title="{name}"></div>'
+            /* FII / DII */
+            .pf-grid{grid-template-columns:1fr 1fr!important;gap:8px;}
+            .pf-avg-strip{grid-template-columns:1fr;gap:0;padding:12px;}
+            .pf-avg-sep{display:none;}
+            .pf-avg-cell{display:flex;align-items:center;justify-content:space-between;padding:8px 0;border-bottom:1px solid rgba(79,195,247,0.07);}
+            .pf-avg-cell:last-child{border-bottom:none;}
+            .pf-date-range{display:none;}
 
-        # ── Build one cell ────────────────────────────────────────────────
-        def cell(lbl, badge_lbl, arrow, col, bg, bdr, sub):
-            return (
-                f'<div class="ssb-cell">'
-                f'<span class="ssb-cell-lbl">{lbl}</span>'
-                f'<span class="ssb-badge" style="color:{col};background:{bg};border:1px solid {bdr};">'
-                f'{arrow} {badge_lbl}</span>'
-                f'<span class="ssb-sub">{sub}</span>'
-                f'</div>'
-            )
+            /* Market direction */
+            .md-row-top,.md-row-bottom{flex-direction:column;align-items:flex-start;}
+            .md-direction{font-size:22px;}
 
-        ts = d.get('timestamp', '')
+            /* Strategy checklist */
+            .o5-grid{grid-template-columns:1fr!important;}
+            .o5-top-banner{flex-direction:column;align-items:flex-start;}
+            .strat-grid-legacy{grid-template-columns:1fr!important;}
+            .sc-compact-grid{grid-template-columns:1fr!important;}
+            .sc-dp-grid{grid-template-columns:1fr 1fr;}
+            .logic-grid{grid-template-columns:1fr;}
 
-        return f"""
-<div class="section ssb-section" id="sec-signals">
-  <div class="ssb-wrap">
-    <div class="ssb-header">
-      <span class="ssb-title">&#9889; SIGNAL SUMMARY</span>
-      <span class="ssb-ts">{ts}</span>
-    </div>
-    <div class="ssb-grid">
-      {cell('OI Signal',   oi_lbl,    oi_arrow,    oi_col,    oi_bg,    oi_bdr,    d.get('oi_signal','—') if d.get('has_option_data') else 'No data')}
-      {cell('FII / DII',   fii_label, fii_arrow,   fii_col,   fii_bg,   fii_bdr,   fii_sub)}
-      {cell('Technical',   tech_lbl,  tech_arrow,  tech_col,  tech_bg,  tech_bdr,  tech_sub)}
-      {cell('Strategy',    strat_lbl, strat_arrow, strat_col, strat_bg, strat_bdr, strat_sub)}
-      {cell('PCR',         pcr_lbl,   '',          pcr_col,   pcr_bg,   pcr_bdr,   pcr_sub)}
-      <div class="ssb-verdict" style="background:{vrd_bg};border-left:3px solid {vrd_lbdr};">
-        <span class="ssb-verdict-lbl" style="color:#80deea;">Overall Verdict</span>
-        <span class="ssb-verdict-val" style="color:{vrd_col};">{vrd_lbl}</span>
-        <div class="ssb-score-dots">{dots_html}</div>
-        <div class="ssb-bar-wrap">
-          <div class="ssb-bar-lbl">
-            <span style="color:rgba(0,230,118,0.6);">Bull {bull_count}</span>
-            <span style="color:rgba(255,183,77,0.5);">Neu {neu_count}</span>
-            <span style="color:rgba(255,71,87,0.6);">Bear {bear_count}</span>
-          </div>
-          <div class="ssb-bar-track">
-            <div style="height:100%;width:{bull_pct}%;background:#00e676;border-radius:2px;display:inline-block;"></div>
-            <div style="height:100%;width:{bear_pct}%;background:#ff4757;border-radius:2px;float:right;"></div>
-          </div>
-        </div>
-      </div>
-    </div>
-  </div>
-</div>
-"""
+            /* Pre-trade checklist */
+            .ptc-item{padding:10px 12px;gap:10px;}
+            .ptc-text{font-size:13px;}
+            .ptc-mindset-box{flex-direction:column;gap:10px;}
 
-    def _market_direction_widget_html(self):
-        d          = self.html_data
-        bias       = d['bias']
-        confidence = d['confidence']
-        bull_score = d['bullish_score']
-        bear_score = d['bearish_score']
+            /* Heatmap */
+            .hm-grid{grid-template-columns:repeat(5,minmax(0,1fr))!important;gap:4px;}
+            .hm-cell{min-height:56px;padding:6px 4px;}
+            .hm-cell-sym{font-size:9px;}
+            .hm-cell-price{font-size:7px;}
+            .hm-cell-chg{font-size:9px;}
+            .hm-breadth-strip{flex-direction:column;gap:12px;padding:14px;}
+            .hm-bs-donut-wrap{align-self:center;}
 
-        if bias == 'BULLISH':
-            dir_gradient  = 'linear-gradient(135deg,#00ff88,#00d4ff)'
-            needle_rotate = '-60'
-            widget_border = 'rgba(0,255,136,0.3)'
-            top_line      = 'rgba(0,255,136,0.8)'
-            pulse_color   = '#00ff88'
-            score_color   = '#00ff88'
-        elif bias == 'WATCH BULL':
-            dir_gradient  = 'linear-gradient(135deg,#b5ea3a,#00d4ff)'
-            needle_rotate = '-30'
-            widget_border = 'rgba(181,234,58,0.35)'
-            top_line      = 'rgba(181,234,58,0.8)'
-            pulse_color   = '#b5ea3a'
-            score_color   = '#b5ea3a'
-        elif bias == 'WATCH BEAR':
-            dir_gradient  = 'linear-gradient(135deg,#ff9800,#ff3355)'
-            needle_rotate = '30'
-            widget_border = 'rgba(255,152,0,0.35)'
-            top_line      = 'rgba(255,152,0,0.8)'
-            pulse_color   = '#ff9800'
-            score_color   = '#ff9800'
-        elif bias == 'BEARISH':
-            dir_gradient  = 'linear-gradient(135deg,#ff3355,#ff9900)'
-            needle_rotate = '60'
-            widget_border = 'rgba(255,51,85,0.3)'
-            top_line      = 'rgba(255,51,85,0.8)'
-            pulse_color   = '#ff3355'
-            score_color   = '#ff5252'
-        else:
-            dir_gradient  = 'linear-gradient(135deg,#ffcd3c,#f7931e)'
-            needle_rotate = '0'
-            widget_border = 'rgba(255,183,77,0.3)'
-            top_line      = 'rgba(255,183,77,0.8)'
-            pulse_color   = '#ffb74d'
-            score_color   = '#ffb74d'
+            /* Disclaimer */
+            .disc-text{white-space:normal;font-size:11px;}
 
-        total_score = bull_score - bear_score
-        score_sign  = '+' if total_score > 0 else ''
-        conf_cls    = ('md-pill-conf-high' if confidence == 'HIGH' else
-                       'md-pill-conf-med'  if confidence == 'MEDIUM' else 'md-pill-conf-low')
+            /* Footer */
+            .footer{padding:16px 12px;font-size:11px;}
+        }
 
-        # ── Signal breakdown rows ────────────────────────────────────────────
-        signals_meta = [
-            ('SMA 20',  d.get('sma_20_above'),  'sma'),
-            ('SMA 50',  d.get('sma_50_above'),  'sma'),
-            ('SMA 200', d.get('sma_200_above'), 'sma'),
-            ('RSI',     None,                   'rsi'),
-            ('MACD',    d.get('macd_bullish'),  'macd'),
-            ('PCR',     None,                   'pcr'),
-        ]
-        sig_rows_html = ''
-        for name, is_bull, kind in signals_meta:
-            if kind == 'rsi':
-                rsi = d.get('rsi', 50)
-                is_bull = rsi < 40; is_bear = rsi > 70
-                score_val = '+1' if is_bull else ('-1' if is_bear else '0')
-                bar_w = 45 if not is_bull and not is_bear else 80
-                bar_cls = 'bull' if is_bull else ('bear' if is_bear else 'neutral')
-                val_col = '#00ff88' if is_bull else ('#ff5252' if is_bear else '#ffb74d')
-            elif kind == 'pcr':
-                pcr = d.get('pcr', 1.0)
-                is_bull = pcr > 1.1; is_bear = pcr < 0.9
-                score_val = '+1' if is_bull else ('-1' if is_bear else '0')
-                bar_w = 45 if not is_bull and not is_bear else 85
-                bar_cls = 'bull' if is_bull else ('bear' if is_bear else 'neutral')
-                val_col = '#00ff88' if is_bull else ('#ff5252' if is_bear else '#ffb74d')
-            else:
-                score_val = '+1' if is_bull else '-1'
-                bar_w = 80; bar_cls = 'bull' if is_bull else 'bear'
-                val_col = '#00ff88' if is_bull else '#ff5252'
-            bar_color_css = (
-                'linear-gradient(90deg,#00ff88,#00d4ff)' if bar_cls == 'bull' else
-                'linear-gradient(90deg,#ff3355,#ff6680)' if bar_cls == 'bear' else
-                'linear-gradient(90deg,#ffb74d,#ffdd66)'
-            )
-            sig_rows_html += f"""
-            <div style="display:flex;align-items:center;gap:8px;">
-              <span style="font-size:9px;letter-spacing:1px;color:rgba(180,210,230,0.55);width:48px;text-align:right;flex-shrink:0;">{name}</span>
-              <div style="flex:1;height:5px;background:rgba(0,0,0,0.4);border-radius:3px;overflow:hidden;">
-                <div style="height:100%;width:{bar_w}%;border-radius:3px;background:{bar_color_css};"></div>
-              </div>
-              <span style="font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:700;color:{val_col};width:22px;flex-shrink:0;">{score_val}</span>
-            </div>"""
+        @media(max-width:480px){
+            .hb-title-main{font-size:12px;}
+            .hb-s-item{font-size:8px;}
+            .grid-5,.grid-4{grid-template-columns:1fr!important;}
+            .snap-grid{grid-template-columns:1fr!important;}
+            .pf-grid{grid-template-columns:1fr!important;}
+            .oi-summary-strip{grid-template-columns:1fr 1fr;}
+            .hm-grid{grid-template-columns:repeat(4,minmax(0,1fr))!important;}
+            .tab-btn{padding:9px 9px;font-size:9px;letter-spacing:0.5px;}
+        }
 
-        # ── SVG needle angle: bear_score−bull_score mapped to ±80deg ────────
-        max_s       = max(bull_score + bear_score, 1)
-        needle_deg  = round(max(-80, min(80, (bear_score - bull_score) / max_s * 80)))
+        @media(max-width:360px){
+            .hb-title-main{font-size:11px;}
+            .oi-summary-strip{grid-template-columns:1fr;}
+            .hm-grid{grid-template-columns:repeat(3,minmax(0,1fr))!important;}
+            .nsb-mob-title{font-size:11px;}
+        }""")
 
-        # ── Confidence dots ──────────────────────────────────────────────────
-        filled = 5 if confidence == 'HIGH' else 3 if confidence == 'MEDIUM' else 1
-        dots_html = (
-            ''.join(f'<div style="width:9px;height:9px;border-radius:50%;background:{pulse_color};box-shadow:0 0 6px {pulse_color};"></div>' for _ in range(filled)) +
-            ''.join(f'<div style="width:9px;height:9px;border-radius:50%;background:rgba(255,255,255,0.08);border:1px solid rgba(255,255,255,0.1);"></div>' for _ in range(5 - filled))
-        )
 
-        # ── Neutral S1/R1 panel (only shown when bias is NEUTRAL) ───────────
-        if bias not in ('BULLISH', 'BEARISH'):
-            cp        = float(d.get('current_price') or 0)
-            s1        = float(d['support'])    if d.get('support')    is not None else 0.0
-            r1        = float(d['resistance']) if d.get('resistance') is not None else 0.0
-            pts_to_s1 = round(cp - s1)   if s1 > 0 else None
-            pts_to_r1 = round(r1 - cp)   if r1 > 0 else None
-            # Proximity hint: which level is price closer to?
-            if pts_to_s1 is not None and pts_to_r1 is not None:
-                if pts_to_s1 < pts_to_r1:
-                    proximity_hint = '&#9660; Closer to S1 — watch for bounce or breakdown'
-                    hint_col = '#00e676'
-                elif pts_to_r1 < pts_to_s1:
-                    proximity_hint = '&#9650; Closer to R1 — watch for breakout or rejection'
-                    hint_col = '#ff4d6d'
-                else:
-                    proximity_hint = '&#8596; Midway between S1 and R1'
-                    hint_col = '#ffb74d'
-            else:
-                proximity_hint = ''
-                hint_col = '#ffb74d'
-            dist_s1_html = (f'<span style="font-size:9px;color:rgba(0,230,118,0.55);">{pts_to_s1} pts away</span>'
-                            if pts_to_s1 is not None else '')
-            dist_r1_html = (f'<span style="font-size:9px;color:rgba(255,77,109,0.55);">{pts_to_r1} pts away</span>'
-                            if pts_to_r1 is not None else '')
-            s1_display = f'&#8377;{s1:,.0f}' if s1 > 0 else 'N/A'
-            r1_display = f'&#8377;{r1:,.0f}' if r1 > 0 else 'N/A'
-            neutral_sr_html = f"""
-                <div style="margin-top:6px;width:100%;display:flex;align-items:center;gap:6px;justify-content:center;flex-wrap:wrap;">
-                  <div style="display:flex;align-items:center;gap:5px;padding:4px 10px;border-radius:6px;
-                    background:rgba(0,230,118,0.07);border:1px solid rgba(0,230,118,0.2);">
-                    <span style="font-size:8px;font-weight:700;color:rgba(0,230,118,0.6);letter-spacing:1px;">S1</span>
-                    <span style="font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;color:#00e676;">{s1_display}</span>
-                    {f'<span style="font-size:8px;color:rgba(0,230,118,0.45);">{pts_to_s1}pt</span>' if pts_to_s1 else ''}
-                  </div>
-                  <span style="font-size:9px;color:rgba(120,160,180,0.3);">·</span>
-                  <div style="display:flex;align-items:center;gap:5px;padding:4px 10px;border-radius:6px;
-                    background:rgba(255,77,109,0.07);border:1px solid rgba(255,77,109,0.2);">
-                    <span style="font-size:8px;font-weight:700;color:rgba(255,77,109,0.6);letter-spacing:1px;">R1</span>
-                    <span style="font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;color:#ff4d6d;">{r1_display}</span>
-                    {f'<span style="font-size:8px;color:rgba(255,77,109,0.45);">{pts_to_r1}pt</span>' if pts_to_r1 else ''}
-                  </div>
-                  <div style="width:100%;text-align:center;font-size:8px;font-family:'JetBrains Mono',monospace;
-                    color:{hint_col};opacity:0.75;margin-top:2px;">{proximity_hint}</div>
-                </div>"""
-        else:
-            neutral_sr_html = ''  # Not NEUTRAL — show nothing
+def build_static_assets(out_dir="."):
+    """Write the constant CSS/JS to content-hashed files under out_dir/assets/.
 
-        return f"""
-    <div class="section">
-        <div class="section-title"><span>&#129517;</span> MARKET DIRECTION (Algorithmic)</div>
+    Returns {'css': href, 'js': [hrefs]} relative to out_dir, or None if the files could not be
+    written (the page then inlines them). The name only changes when the code does, so browsers
+    keep their cached copy across every auto-refresh until the next deploy of new code."""
+    import hashlib
+    blobs = [('app', 'css', get_report_css()),
+             ('app', 'js',  get_report_javascript()),
+             ('heatmap', 'js', get_heatmap_javascript())]   # own file: a heatmap error can't stop the page script
+    try:
+        folder = os.path.join(out_dir, ASSETS_DIR)
+        os.makedirs(folder, exist_ok=True)
+        hrefs = {'css': None, 'js': []}
+        for stem, ext, text in blobs:
+            data = text.encode('utf-8')
+            name = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.{ext}"
+            path = os.path.join(folder, name)
+            if not os.path.exists(path):
+                tmp = path + '.tmp'
+                with open(tmp, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp, path)
+                for old in os.listdir(folder):   # superseded builds of the same asset
+                    if old != name and old.startswith(stem + '.') and old.endswith('.' + ext):
+                        os.remove(os.path.join(folder, old))
+                print(f"  📦 Wrote {ASSETS_DIR}/{name} ({len(data) / 1024:.0f} KB)")
+            href = f"{ASSETS_DIR}/{name}"
+            if ext == 'css':
+                hrefs['css'] = href
+            else:
+                hrefs['js'].append(href)
+        return hrefs
+    except OSError as e:
+        print(f"  ⚠️  Static assets not written ({e}) — inlining CSS/JS")
+        return None
 
-        <!-- Price Ticker Strip — compact -->
-        <div style="background:linear-gradient(135deg,rgba(8,24,44,0.95),rgba(4,14,26,0.98));
-          border:1px solid {widget_border};border-radius:14px;padding:8px 16px;
-          display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:10px;
-          margin-bottom:12px;position:relative;overflow:hidden;">
-          <div style="position:absolute;top:0;left:0;right:0;height:2px;
-            background:linear-gradient(90deg,transparent,{top_line},transparent);"></div>
-          <div>
-            <div style="font-family:'JetBrains Mono',monospace;font-size:7px;letter-spacing:2px;
-              color:rgba(120,160,180,0.45);text-transform:uppercase;margin-bottom:2px;">NIFTY 50 · SPOT PRICE</div>
-            <div style="display:flex;align-items:baseline;gap:10px;">
-              <span style="font-family:'Orbitron',monospace;font-size:clamp(18px,2.8vw,26px);font-weight:900;
-                color:{score_color};line-height:1;">&#8377;{d['current_price']:,.2f}</span>
-              <span style="font-family:'JetBrains Mono',monospace;font-size:11px;color:rgba(180,210,230,0.5);">
-                ATM &#8377;{d['atm_strike']:,} &nbsp;·&nbsp; {d.get('expiry','N/A')}</span>
-            </div>
-          </div>
-          <div style="display:flex;gap:16px;flex-wrap:wrap;">
-            {''.join([
-              f'<div style="text-align:center;">'
-              f'<div style="font-family:JetBrains Mono,monospace;font-size:7px;letter-spacing:1.5px;'
-              f'color:rgba(120,160,180,0.4);text-transform:uppercase;margin-bottom:2px;">{lbl}</div>'
-              f'<div style="font-family:Orbitron,monospace;font-size:12px;font-weight:700;color:{col};">{val}</div>'
-              f'</div>'
-              for lbl, val, col in [
-                ('PCR (OI)', f"{d.get('pcr',0):.3f}" if d.get('has_option_data') else 'N/A',
-                 '#ff5252' if d.get('pcr',1)<0.9 else '#00e676' if d.get('pcr',1)>1.1 else '#ffb74d'),
-                ('Max Pain', f"&#8377;{d.get('max_pain',0):,}" if d.get('has_option_data') else 'N/A', '#ffb74d'),
-                ('RSI (14)', f"{d.get('rsi',0):.1f}", '#ffb74d'),
-                ('MACD', 'Bullish' if d.get('macd_bullish') else 'Bearish',
-                 '#00e676' if d.get('macd_bullish') else '#ff5252'),
-              ]
-            ])}
-          </div>
-        </div>
+def get_report_javascript():
+    """Returns the main page script (DataHub, OI table, sidebar nav, tabs)."""
+    return """
+/* ══ DATA HUB — the page's only poller ══════════════════════════════════
+   Fetches latest_report.json every INTERVAL and owns the OI log (one full
+   oi_log.json load, then oi_log_delta.json whenever oi_seq moves). Renderers
+   subscribe with DataHub.on(topic, fn) and are only called on real changes:
+     'poll'   → every poll (countdown reset)
+     'report' → latest_report.json payload changed
+     'oi'     → OI snapshots (newest first) changed
+     'oi-error' → the OI log could not be loaded
+     'sections' → names of report sections the Hydrator just swapped in   */
+var DataHub = (function() {
+    var INTERVAL = 30000;
+    var subs = { poll: [], report: [], oi: [], 'oi-error': [], sections: [] };
+    var report = null, reportKey = null;
+    var oi = [], oiSeq = 0, oiLoading = false, timer = null;
+
+    function emit(topic, payload) {
+        subs[topic].forEach(function(fn) {
+            try { fn(payload); } catch (e) { console.warn('[DataHub] ' + topic + ' handler failed:', e); }
+        });
+    }
+    function on(topic, fn) {
+        subs[topic].push(fn);
+        if (topic === 'report' && report) fn(report);   // late subscribers get the cached payload
+        if (topic === 'oi' && oi.length) fn(oi);
+    }
+    function getJSON(url) {
+        return fetch(url + '?_t=' + Date.now(), {cache:'no-store'})
+            .then(function(r){ if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); });
+    }
+    function setOI(data) {
+        oi = data;
+        oiSeq = (data[0] && data[0].seq) || 0;
+        window._oiData = data;
+        emit('oi', data);
+    }
+    function loadOI() {
+        oiLoading = true;
+        return getJSON('oi_log.json')
+            .then(function(data) {
+                if (Array.isArray(data) && data.length > 0) { data[0]._isLive = true; setOI(data); }
+            })
+            .catch(function(e) { emit('oi-error', e); })
+            .then(function(){ oiLoading = false; });
+    }
+    /* Only snapshots newer than oiSeq; a gap or a new day falls back to a full load */
+    function syncOI(knownSeq) {
+        if (oiLoading) return;
+        if (typeof knownSeq === 'number' && knownSeq <= oiSeq) return;
+        if (!oi.length) { if (knownSeq) loadOI(); return; }
+        getJSON('oi_log_delta.json')
+            .then(function(delta) {
+                var fresh = (delta.entries || []).filter(function(e){ return (e.seq || 0) > oiSeq; });
+                if (!fresh.length) return;
+                var oldest  = fresh[fresh.length - 1];
+                var sameDay = (oldest.timestamp || '').split(' ')[0] === (oi[0].timestamp || '').split(' ')[0];
+                if (!oiSeq || oldest.seq !== oiSeq + 1 || !sameDay) { loadOI(); return; }
+                oi[0]._isLive = false;
+                fresh[0]._isLive = true;
+                setOI(fresh.concat(oi));
+            })
+            .catch(function(){});
+    }
+    function poll() {
+        emit('poll');
+        getJSON('latest_report.json')
+            .then(function(data) {
+                var key = JSON.stringify(data);
+                if (key !== reportKey) { reportKey = key; report = data; emit('report', data); }
+                syncOI(data.oi_seq);
+            })
+            .catch(function(err) {
+                // latest_report.json not found or server not running — silently ignore
+                console.warn('[DataHub] Could not fetch latest_report.json:', err);
+            });
+    }
+    function start() {
+        if (timer) return;
+        loadOI();
+        poll();
+        timer = setInterval(poll, INTERVAL);
+    }
+    return { on: on, emit: emit, start: start, poll: poll, loadOI: loadOI, getJSON: getJSON,
+             INTERVAL: INTERVAL, oi: function(){ return oi; } };
+})();
 
-        <!-- Main Direction Widget -->
-        <div class="md-widget" style="border-color:{widget_border};">
-            <div class="md-glow"></div>
-            <div class="md-row-top">
-                <div class="md-label">
-                  <div class="md-live-dot" style="background:{pulse_color};box-shadow:0 0 8px {pulse_color};"></div>
-                  MARKET DIRECTION &nbsp;·&nbsp; ALGORITHMIC
-                </div>
-                <div class="md-pills-top">
-                  <span class="md-pill md-pill-bull">BULL {bull_score}</span>
-                  <span class="md-pill md-pill-bear">BEAR {bear_score}</span>
-                  <span class="md-pill {conf_cls}">{confidence} CONFIDENCE</span>
-                </div>
-            </div>
+/* ══ HYDRATOR — in-place refresh from report_data.json ══════════════════
+   Server-rendered sections sit between <!--sec:name:digest--> and
+   <!--/sec:name--> comments. refresh() swaps only the sections whose digest
+   moved, using the HTML shipped in the payload. It rejects (→ full reload)
+   when the page shell or section layout changed, or a changed section's
+   HTML is missing, e.g. the tab slept through more than one run.         */
+var Hydrator = (function() {
+    function markers() {
+        var found = {}, node;
+        var walker = document.createTreeWalker(document.body, NodeFilter.SHOW_COMMENT, null);
+        while ((node = walker.nextNode())) {
+            var m = /^sec:([A-Za-z0-9_-]+):([0-9a-f]+)$/.exec(node.nodeValue);
+            if (m) found[m[1]] = { start: node, digest: m[2] };
+        }
+        return found;
+    }
+    function swap(mark, name, digest, html) {
+        var node = mark.start.nextSibling;
+        while (node && !(node.nodeType === 8 && node.nodeValue === '/sec:' + name)) {
+            var next = node.nextSibling;
+            node.parentNode.removeChild(node);
+            node = next;
+        }
+        if (!node) throw new Error('unterminated section ' + name);
+        var tpl = document.createElement('template');
+        tpl.innerHTML = html;
+        node.parentNode.insertBefore(tpl.content, node);
+        mark.start.nodeValue = 'sec:' + name + ':' + digest;
+    }
+    /* Section HTML carries @@name@@ marks for per-run stamps (see RENDER_STAMPS) */
+    function fill(html, stamps) {
+        Object.keys(stamps).forEach(function(name) { html = html.split('@@' + name + '@@').join(stamps[name]); });
+        return html;
+    }
+    function refresh() {
+        return DataHub.getJSON('report_data.json').then(function(payload) {
+            var shell = document.querySelector('meta[name="report-shell"]');
+            if (!shell || payload.shell !== shell.content) throw new Error('page shell changed');
+            var have = markers(), want = payload.sections || {}, html = payload.html || {};
+            if (Object.keys(have).sort().join() !== Object.keys(want).sort().join())
+                throw new Error('section layout changed');
+            var changed = Object.keys(want).filter(function(name) { return have[name].digest !== want[name]; });
+            changed.forEach(function(name) {
+                if (!(name in html)) throw new Error('section ' + name + ' not in payload');
+            });
+            var stamps = payload.stamps || {};
+            changed.forEach(function(name) { swap(have[name], name, want[name], fill(html[name], stamps)); });
+            if (payload.bias) window._CURRENT_BIAS = payload.bias;
+            // Stamps change every run without touching any section digest
+            Array.prototype.forEach.call(document.querySelectorAll('[data-stamp]'), function(el) {
+                var value = stamps[el.getAttribute('data-stamp')];
+                if (value) el.textContent = value;
+            });
+            if (changed.length) {
+                // Swapped tab panels come back without .active — re-apply the current tab
+                var btn = document.querySelector('.tab-btn.active');
+                if (typeof switchTab === 'function') switchTab(btn ? btn.getAttribute('data-tab') : 'main');
+                DataHub.emit('sections', changed);
+            }
+            return changed;
+        });
+    }
+    return { refresh: refresh };
+})();
 
-            <!-- Direction + Dial + Signals grid — compact -->
-            <div style="display:grid;grid-template-columns:1fr auto 1fr;gap:12px;align-items:center;margin-top:8px;">
+(function() {
+    var INTERVAL  = DataHub.INTERVAL;
+    var countdown = INTERVAL / 1000;
 
-              <!-- Left: Direction label + score + confidence dots -->
-              <div style="display:flex;flex-direction:column;gap:5px;">
-                <div class="md-direction" style="background:{dir_gradient};
-                  -webkit-background-clip:text;-webkit-text-fill-color:transparent;background-clip:text;">
-                  {bias}</div>
-                <div style="font-family:'JetBrains Mono',monospace;font-size:10px;color:rgba(180,210,230,0.4);">
-                  Score: <span style="color:{score_color};font-weight:700;">{score_sign}{total_score}</span>
-                  / {bull_score + bear_score} signals
-                </div>
-                <div style="display:flex;align-items:center;gap:5px;">
-                  <span style="font-family:'JetBrains Mono',monospace;font-size:7px;letter-spacing:2px;
-                    color:rgba(120,160,180,0.35);text-transform:uppercase;">Conf</span>
-                  {dots_html}
-                </div>
-              </div>
+    function istNow() { return new Date(new Date().toLocaleString('en-US',{timeZone:'Asia/Kolkata'})); }
+    function pad(n){ return String(n).padStart(2,'0'); }
 
-              <!-- Centre: SVG Sentiment Dial — smaller -->
-              <div style="display:flex;flex-direction:column;align-items:center;gap:2px;">
-                <div style="font-family:'JetBrains Mono',monospace;font-size:7px;letter-spacing:1.5px;
-                  color:rgba(120,160,180,0.35);text-transform:uppercase;">Sentiment</div>
-                <svg width="110" height="65" viewBox="0 0 160 95" style="overflow:visible;">
-                  <defs>
-                    <linearGradient id="gaugeGradMD" x1="0%" y1="0%" x2="100%" y2="0%">
-                      <stop offset="0%" stop-color="#00ff88"/>
-                      <stop offset="45%" stop-color="#ffaa00"/>
-                      <stop offset="100%" stop-color="#ff3355"/>
-                    </linearGradient>
-                  </defs>
-                  <path d="M 15 82 A 65 65 0 0 1 145 82" fill="none"
-                    stroke="rgba(255,255,255,0.06)" stroke-width="10" stroke-linecap="round"/>
-                  <path d="M 15 82 A 65 65 0 0 1 145 82" fill="none"
-                    stroke="url(#gaugeGradMD)" stroke-width="10" stroke-linecap="round" opacity="0.65"/>
-                  <g style="transform:rotate({needle_deg}deg);transform-origin:80px 82px;">
-                    <line x1="80" y1="82" x2="80" y2="28" stroke="{score_color}"
-                      stroke-width="2.5" stroke-linecap="round"/>
-                    <circle cx="80" cy="82" r="6" fill="{score_color}"
-                      stroke="rgba(2,12,20,0.9)" stroke-width="2"/>
-                    <circle cx="80" cy="82" r="2.5" fill="white"/>
-                  </g>
-                  <text x="10" y="96" fill="#00ff88" font-size="8"
-                    font-family="JetBrains Mono" font-weight="700">BULL</text>
-                  <text x="126" y="96" fill="#ff3355" font-size="8"
-                    font-family="JetBrains Mono" font-weight="700">BEAR</text>
-                </svg>
-                <div style="text-align:center;margin-top:-2px;">
-                  <div style="font-family:'Orbitron',monospace;font-size:18px;font-weight:900;
-                    color:{score_color};line-height:1;">{score_sign}{total_score}</div>
-                  <div style="font-family:'JetBrains Mono',monospace;font-size:7px;letter-spacing:1.5px;
-                    color:rgba(120,160,180,0.35);text-transform:uppercase;">Score</div>
-                </div>
-                {neutral_sr_html}
-              </div>
+    // ── Sidebar offset: measures sticky header height and sets CSS var ──────
+    function setSidebarOffset() {
+        var hdr = document.querySelector('.header');
+        if (hdr) {
+            var h = hdr.getBoundingClientRect().height;
+            document.documentElement.style.setProperty('--header-h', h + 'px');
+        }
+    }
+    setSidebarOffset();
+    window.addEventListener('resize', setSidebarOffset);
+    function fmtTime(d){ return pad(d.getHours())+':'+pad(d.getMinutes())+':'+pad(d.getSeconds()); }
+    function fmtDate(d){
+        var M=['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec'];
+        return pad(d.getDate())+'-'+M[d.getMonth()]+'-'+d.getFullYear();
+    }
+    function tick() {
+        var now = istNow();
+        var clockEl = document.getElementById('live-ist-clock');
+        if (clockEl) clockEl.textContent = fmtDate(now) + '  ' + fmtTime(now) + ' IST';
+        countdown--;
+        if (countdown < 0) countdown = INTERVAL / 1000;
+        var cdEl = document.getElementById('refresh-countdown');
+        if (cdEl) { var s=countdown%60; var m=Math.floor(countdown/60); cdEl.textContent=(m>0?m+'m ':'')+s+'s'; }
+    }
+    setInterval(tick, 1000);
+    tick();
 
-              <!-- Right: Signal breakdown bars — compact gaps -->
-              <div style="display:flex;flex-direction:column;gap:5px;">
-                <div style="font-family:'JetBrains Mono',monospace;font-size:7px;letter-spacing:1.5px;
-                  color:rgba(120,160,180,0.4);text-transform:uppercase;margin-bottom:2px;">
-                  Signal Breakdown</div>
-                {sig_rows_html}
-              </div>
-            </div>
-        </div>
+    // ── Option 2: JSON timestamp polling (DataHub 'report' events) ────────
+    // When the Python script has actually re-run (timestamp changed) the
+    // Hydrator swaps the changed sections in place; a full reload is only
+    // the fallback. Saves active tab before reload → restores it after.
+    var _lastKnownTimestamp = null;
 
-        <!-- Scoring logic — compact single line -->
-        <div style="margin-top:10px;padding:7px 14px;background:rgba(0,0,0,0.2);border:1px solid rgba(79,195,247,0.07);
-          border-radius:8px;display:flex;gap:16px;flex-wrap:wrap;align-items:center;">
-            <span style="font-family:'JetBrains Mono',monospace;font-size:8px;letter-spacing:1.5px;
-              color:rgba(79,195,247,0.5);text-transform:uppercase;font-weight:700;flex-shrink:0;">Scoring Logic</span>
-            <span style="font-size:9px;color:rgba(176,190,197,0.5);"><span style="color:#00ff88;font-weight:700;">BULLISH</span> &nbsp;Diff &ge; +3</span>
-            <span style="font-size:9px;color:rgba(176,190,197,0.5);"><span style="color:#ff5252;font-weight:700;">BEARISH</span> &nbsp;Diff &le; &minus;3</span>
-            <span style="font-size:9px;color:rgba(176,190,197,0.5);"><span style="color:#ffb74d;font-weight:700;">SIDEWAYS</span> &nbsp;&minus;2 to +2</span>
-            <span style="font-size:9px;color:rgba(176,190,197,0.5);"><span style="color:#4fc3f7;font-weight:700;">CONF</span> &nbsp;HIGH &ge; 4 gap &nbsp;&middot;&nbsp; OI: ATM &plusmn;10 only</span>
-        </div>
-    </div>
-"""
+    function getActiveTab() {
+        var active = document.querySelector('.tab-btn.active');
+        return active ? active.getAttribute('data-tab') : null;
+    }
 
-    def _fiidii_section_html(self):
-        data = self.html_data['fii_dii_data']
-        summ = self.html_data['fii_dii_summ']
-        badge_map = {
-            'fii-bull':  ('#00e676','rgba(0,230,118,0.12)','rgba(0,230,118,0.3)'),
-            'fii-cbull': ('#69f0ae','rgba(105,240,174,0.10)','rgba(105,240,174,0.28)'),
-            'fii-neu':   ('#ffd740','rgba(255,215,64,0.10)','rgba(255,215,64,0.28)'),
-            'fii-bear':  ('#ff5252','rgba(255,82,82,0.10)','rgba(255,82,82,0.28)'),
+    DataHub.on('poll', function() { countdown = INTERVAL / 1000; });
+    DataHub.on('report', function(data) {
+        var ts = data.timestamp || null;
+        if (_lastKnownTimestamp === null) {
+            // First load — just store the current timestamp, don't reload
+            _lastKnownTimestamp = ts;
+        } else if (ts && ts !== _lastKnownTimestamp) {
+            _lastKnownTimestamp = ts;
+            Hydrator.refresh()
+                .then(function(changed) {
+                    console.log('[AutoRefresh] New data (' + ts + ') — ' + changed.length + ' section(s) updated in place');
+                })
+                .catch(function(err) {
+                    console.log('[AutoRefresh] In-place refresh not possible (' + err.message + ') — reloading');
+                    reloadPage();
+                });
         }
-        s_color,s_bg,s_border = badge_map.get(summ['badge_cls'],badge_map['fii-neu'])
-        is_fallback = any(r.get('fallback') for r in data)
-        date_range  = f"{data[0]['date']} \u2013 {data[-1]['date']}" if data else ''
-        data_src_html = ('<span class="pf-live-badge pf-estimated">\u26a0 ESTIMATED</span>'
-                         if is_fallback else '<span class="pf-live-badge pf-live">\u25cf LIVE</span>')
-        max_abs = summ['max_abs'] or 1
-
-        # ── Avg values ────────────────────────────────────────────────────
-        fa=summ['fii_avg']; da=summ['dii_avg']; na=summ['net_avg']
-        fs='+' if fa>=0 else ''; ds='+' if da>=0 else ''; ns='+' if na>=0 else ''
-        fc='#00d4ff' if fa>=0 else '#ff4444'
-        dc='#ffb300' if da>=0 else '#ff4444'
-        nc='#c084fc' if na>=0 else '#f87171'
+    });
 
-        # ── FII bar width (capped at 100%) ────────────────────────────────
-        fii_bar_w = round(min(100, abs(fa) / max_abs * 100), 1)
-        dii_bar_w = round(min(100, abs(da) / max_abs * 100), 1)
-        fii_bar_col = '#ff4444' if fa < 0 else '#00d4ff'
-        dii_bar_col = '#ffb300' if da >= 0 else '#ff4444'
+    function reloadPage() {
+        // Save scroll position + active tab before reload
+        var activeTab = getActiveTab();
+        if (activeTab) sessionStorage.setItem('activeTab', activeTab);
+        var scrollY = window.scrollY || window.pageYOffset;
+        sessionStorage.setItem('scrollY', scrollY);
+        // Smooth fade-out before reload — no white flash
+        document.body.style.transition = 'opacity 0.25s ease';
+        document.body.style.opacity = '0';
+        setTimeout(function(){ location.reload(); }, 260);
+    }
+    DataHub.start();   // first poll captures the baseline timestamp
 
-        # ── Daily dot chips (10 days) ─────────────────────────────────────
-        dots_html = ''
-        for row in data:
-            net_v = row['fii'] + row['dii']
-            dot_col  = '#00e676' if net_v >= 0 else '#ff4757'
-            dot_bg   = 'rgba(0,230,118,0.15)' if net_v >= 0 else 'rgba(255,71,87,0.15)'
-            dot_bdr  = 'rgba(0,230,118,0.3)'  if net_v >= 0 else 'rgba(255,71,87,0.3)'
-            net_sign = '+' if net_v >= 0 else ''
-            net_fmt  = f"{net_v/1000:+.1f}k" if abs(net_v) >= 1000 else f"{net_sign}{net_v:.0f}"
-            dots_html += (
-                f'<div class="pf2-dot" style="border-color:{dot_bdr};background:{dot_bg};">'
-                f'<div class="pf2-dot-date">{row["date"].split(" ")[1]}</div>'
-                f'<div class="pf2-dot-net" style="color:{dot_col};">{net_fmt}</div>'
-                f'</div>'
-            )
+    // ── Restore tab + scroll position after reload ────────────────────────
+    (function restoreTabAfterReload() {
+        var savedTab = sessionStorage.getItem('activeTab');
+        var savedScroll = sessionStorage.getItem('scrollY');
 
-        verdict_badge = (f'<span class="pf-verdict-badge" style="color:{s_color};background:{s_bg};border:1px solid {s_border};">'
-                         f'{summ["emoji"]} {summ["label"]}</span>')
-        n_days = len(data)
+        if (savedTab) {
+            sessionStorage.removeItem('activeTab');
+            setTimeout(function() { switchTab(savedTab); }, 50);
+        }
+        if (savedScroll) {
+            sessionStorage.removeItem('scrollY');
+            // Restore scroll while page is still hidden (hidden by <head> script)
+            window.scrollTo(0, parseInt(savedScroll, 10));
+            // Wait for browser to apply scroll, then fade in
+            requestAnimationFrame(function() {
+                requestAnimationFrame(function() {
+                    document.documentElement.style.transition = 'opacity 0.3s ease';
+                    document.documentElement.style.opacity = '1';
+                    document.documentElement.style.overflow = '';
+                    document.body.style.opacity = '1';
+                });
+            });
+        }
+    })();
+})();
 
-        return f"""
-<div class="section">
-    <div class="section-title">
-        <span>&#127982;</span> FII / DII INSTITUTIONAL FLOW
-        {data_src_html}
-        <span class="pf-date-range">Last {n_days} Trading Days &nbsp;&middot;&nbsp; {date_range}</span>
-    </div>
+function switchTab(tab) {
+    document.querySelectorAll('.tab-panel').forEach(function(p){ p.classList.remove('active'); });
+    document.querySelectorAll('.tab-btn').forEach(function(b){ b.classList.remove('active'); });
+    var panel=document.getElementById('tab-'+tab);
+    var btn=document.querySelector('[data-tab="'+tab+'"]');
+    if(panel) panel.classList.add('active');
+    if(btn)   btn.classList.add('active');
+    if(tab==='oi-trend') loadOILog();
+    if(tab==='heatmap') { window.renderHeatmap && window.renderHeatmap(); }
+}
 
-    <!-- FII Flow Meter -->
-    <div class="pf2-meter-row">
-        <div class="pf2-meter-head">
-            <div class="pf2-meter-labels">
-                <span class="pf2-lbl">FII</span>
-                <span class="pf2-sublbl">{('Sellers' if fa < 0 else 'Buyers')}</span>
-            </div>
-            <span class="pf2-val" style="color:{fc};">{fs}{fa:,.0f} <span class="pf2-unit">Cr/day avg</span></span>
-        </div>
-        <div class="pf2-track">
-            <div class="pf2-fill" style="width:{fii_bar_w}%;background:{fii_bar_col};{'float:right;' if fa < 0 else ''}"></div>
-        </div>
-    </div>
+function filterStrats(type, btn) {
+    document.querySelectorAll('.filter-btn').forEach(function(b){ b.classList.remove('active'); });
+    btn.classList.add('active');
+    // Close all open panels first
+    document.querySelectorAll('.sc-dp').forEach(function(p){ p.classList.remove('sc-dp-open'); });
+    document.querySelectorAll('.sc-row').forEach(function(r){ r.classList.remove('sc-selected'); });
+    // Show/hide rows and their paired panels
+    document.querySelectorAll('.sc-row').forEach(function(r){
+        var show = (type === 'all' || r.dataset.type === type);
+        r.style.display = show ? '' : 'none';
+        var chev = r.querySelector('.sc-row-chevron');
+        if (chev) {
+            var pid = chev.id.replace('chev-', '');
+            var panel = document.getElementById(pid);
+            if (panel) panel.style.display = show ? '' : 'none';
+        }
+    });
+}
 
-    <!-- DII Flow Meter -->
-    <div class="pf2-meter-row">
-        <div class="pf2-meter-head">
-            <div class="pf2-meter-labels">
-                <span class="pf2-lbl">DII</span>
-                <span class="pf2-sublbl">{('Buyers' if da >= 0 else 'Sellers')}</span>
-            </div>
-            <span class="pf2-val" style="color:{dc};">{ds}{da:,.0f} <span class="pf2-unit">Cr/day avg</span></span>
-        </div>
-        <div class="pf2-track">
-            <div class="pf2-fill" style="width:{dii_bar_w}%;background:{dii_bar_col};"></div>
-        </div>
-    </div>
+/* ── Compact row toggle / close / load ─────────────────────── */
+function scToggle(row, panelId) {
+    var panel      = document.getElementById(panelId);
+    var wasOpen    = panel && panel.classList.contains('sc-dp-open');
+    var wasSelected = row.classList.contains('sc-selected');
+    // Close everything
+    document.querySelectorAll('.sc-dp').forEach(function(p){ p.classList.remove('sc-dp-open'); });
+    document.querySelectorAll('.sc-row').forEach(function(r){ r.classList.remove('sc-selected'); });
+    // If it wasn't already open, open it
+    if (!wasSelected || !wasOpen) {
+        row.classList.add('sc-selected');
+        if (panel) {
+            panel.classList.add('sc-dp-open');
+            setTimeout(function(){ panel.scrollIntoView({ behavior:'smooth', block:'nearest' }); }, 50);
+        }
+        selectStrat(row);
+    }
+}
 
-    <!-- Daily net dot chips -->
-    <div class="pf2-dots-wrap">{dots_html}</div>
+function scClose(panelId, evt) {
+    if (evt) evt.stopPropagation();
+    var panel = document.getElementById(panelId);
+    if (panel) panel.classList.remove('sc-dp-open');
+    document.querySelectorAll('.sc-row').forEach(function(r){ r.classList.remove('sc-selected'); });
+}
 
-    <!-- Avg strip -->
-    <div class="pf-avg-strip">
-        <div class="pf-avg-cell">
-            <div class="pf-avg-eyebrow">FII {n_days}D Avg</div>
-            <div class="pf-avg-val" style="color:{fc};">{fs}{fa:,.0f}</div>
-            <div class="pf-avg-unit">&#8377; Cr / day</div>
-        </div>
-        <div class="pf-avg-sep"></div>
-        <div class="pf-avg-cell">
-            <div class="pf-avg-eyebrow">DII {n_days}D Avg</div>
-            <div class="pf-avg-val" style="color:{dc};">{ds}{da:,.0f}</div>
-            <div class="pf-avg-unit">&#8377; Cr / day</div>
-        </div>
-        <div class="pf-avg-sep"></div>
-        <div class="pf-avg-cell">
-            <div class="pf-avg-eyebrow">Net Combined</div>
-            <div class="pf-avg-val" style="color:{nc};">{ns}{na:,.0f}</div>
-            <div class="pf-avg-unit">&#8377; Cr / day</div>
-        </div>
-    </div>
+function scLoadPlan(safeName, evt) {
+    if (evt) evt.stopPropagation();
+    // Decode HTML entities
+    var tmp = document.createElement('textarea');
+    tmp.innerHTML = safeName;
+    var stratName = tmp.value;
+    var mapEl = document.getElementById('stratDataMap');
+    var stratMap = {};
+    try { stratMap = JSON.parse(mapEl.textContent || mapEl.innerHTML); } catch(e){}
+    var info = stratMap[stratName] || {};
+    _applyTradePlan(stratName, info.strike || 'N/A', info.rank || 'PRIMARY', typeof info.rr === 'number' ? info.rr : 0);
+    // Button flash
+    if (evt && evt.target) {
+        var btn = evt.target, orig = btn.innerHTML;
+        btn.innerHTML = '&#10003; Loaded!';
+        btn.style.background = 'linear-gradient(135deg,#00e676,#00796b)';
+        setTimeout(function(){ btn.innerHTML = orig; btn.style.background = ''; }, 1500);
+    }
+    // Scroll to trade plan
+    var bannerEl = document.getElementById('tp-banner');
+    if (bannerEl) { var s = bannerEl.closest('.section'); if (s) s.scrollIntoView({ behavior:'smooth', block:'start' }); }
+}
 
-    <!-- Insight box -->
-    <div class="pf-insight-box" style="background:{s_bg};border:1px solid {s_border};">
-        <div class="pf-insight-header">
-            <span class="pf-insight-lbl" style="color:{s_color};">&#128202; {n_days}-DAY INSIGHT &amp; DIRECTION</span>
-            {verdict_badge}
-        </div>
-        <div class="pf-insight-text">{summ['insight']}</div>
-    </div>
-</div>
-"""
+function _applyTradePlan(stratName, strikeRec, rank, rr) {
+    var nameEl   = document.getElementById('tp-strat-name');
+    var strikeEl = document.getElementById('tp-strike-rec');
+    var rankEl   = document.getElementById('tp-rank-badge');
+    var bannerEl = document.getElementById('tp-banner');
+    if (nameEl)   nameEl.textContent = stratName;
+    if (strikeEl) strikeEl.innerHTML = '&#127919; ' + strikeRec;
+    if (rankEl)   { rankEl.textContent = rank; rankEl.className = 'tp-rank-badge tp-rank-' + rank.toLowerCase(); }
+    if (bannerEl) { bannerEl.classList.add('tp-banner-flash'); setTimeout(function(){ bannerEl.classList.remove('tp-banner-flash'); }, 600); }
+}
 
-    def _oi_navy_command_section(self, d):
-        oi_cls=d['oi_class']; direction=d['oi_direction']; signal=d['oi_signal']
-        ce_raw=d['total_ce_oi_change']; pe_raw=d['total_pe_oi_change']
-        bull_force=0; bear_force=0
-        if ce_raw < 0: bull_force += abs(ce_raw)
-        else:          bear_force += abs(ce_raw)
-        if pe_raw > 0: bull_force += abs(pe_raw)
-        else:          bear_force += abs(pe_raw)
-        total_force=bull_force+bear_force
-        bull_pct=round(bull_force/total_force*100) if total_force>0 else 50
-        bear_pct=100-bull_pct
-        if oi_cls=='bearish':
-            dir_bg='rgba(30,10,14,0.92)';dir_border='rgba(239,68,68,0.35)';dir_left_bar='linear-gradient(180deg,#ef4444,#b91c1c)';dir_name_col='#fb7185';dir_desc_col='rgba(251,113,133,0.5)'
-        elif oi_cls=='bullish':
-            dir_bg='rgba(10,30,20,0.92)';dir_border='rgba(16,185,129,0.35)';dir_left_bar='linear-gradient(180deg,#10b981,#047857)';dir_name_col='#34d399';dir_desc_col='rgba(52,211,153,0.5)'
-        else:
-            dir_bg='rgba(20,20,10,0.92)';dir_border='rgba(251,191,36,0.3)';dir_left_bar='linear-gradient(180deg,#f59e0b,#d97706)';dir_name_col='#fbbf24';dir_desc_col='rgba(251,191,36,0.5)'
-        ce_val=d['total_ce_oi_change']; pe_val=d['total_pe_oi_change']; net_val=d['net_oi_change']
-        ce_is_bear=ce_val>0; pe_is_bull=pe_val>0
-        ce_col='#fb7185' if ce_is_bear else '#34d399'; ce_dot_col='#ef4444' if ce_is_bear else '#10b981'
-        ce_lbl='Bearish Signal' if ce_is_bear else 'Bullish Signal'; ce_btn_col='#ef4444' if ce_is_bear else '#10b981'
-        ce_btn_bg='rgba(239,68,68,0.12)' if ce_is_bear else 'rgba(16,185,129,0.12)'; ce_btn_bdr='rgba(239,68,68,0.4)' if ce_is_bear else 'rgba(16,185,129,0.4)'
-        pe_col='#34d399' if pe_is_bull else '#fb7185'; pe_dot_col='#10b981' if pe_is_bull else '#ef4444'
-        pe_lbl='Bullish Signal' if pe_is_bull else 'Bearish Signal'; pe_btn_col='#10b981' if pe_is_bull else '#ef4444'
-        pe_btn_bg='rgba(16,185,129,0.12)' if pe_is_bull else 'rgba(239,68,68,0.12)'; pe_btn_bdr='rgba(16,185,129,0.4)' if pe_is_bull else 'rgba(239,68,68,0.4)'
-        if net_val > 0: net_col='#fb7185';net_dot_col='#ef4444';net_lbl='Bearish Net';net_btn_col='#ef4444';net_btn_bg='rgba(239,68,68,0.12)';net_btn_bdr='rgba(239,68,68,0.4)'
-        elif net_val < 0: net_col='#34d399';net_dot_col='#10b981';net_lbl='Bullish Net';net_btn_col='#10b981';net_btn_bg='rgba(16,185,129,0.12)';net_btn_bdr='rgba(16,185,129,0.4)'
-        else: net_col='#fbbf24';net_dot_col='#f59e0b';net_lbl='Balanced';net_btn_col='#f59e0b';net_btn_bg='rgba(245,158,11,0.12)';net_btn_bdr='rgba(245,158,11,0.4)'
-        def nc_card(label,idc,value,val_col,sub,btn_lbl,btn_col,btn_bg,btn_bdr,icon_char):
-            return (f'<div class="nc-card"><div class="nc-card-header">'
-                    f'<span class="nc-card-label">{label}</span><span style="font-size:18px;line-height:1;color:{idc};">{icon_char}</span></div>'
-                    f'<div class="nc-card-value" style="color:{val_col};">{value:+,}</div>'
-                    f'<div class="nc-card-sub">{sub}</div>'
-                    f'<div class="nc-card-btn" style="color:{btn_col};background:{btn_bg};border:1px solid {btn_bdr};">{btn_lbl}</div></div>')
-        cards_html = (
-            nc_card('CALL OI CHANGE',ce_dot_col,ce_val,ce_col,'CE open interest \u0394',ce_lbl,ce_btn_col,ce_btn_bg,ce_btn_bdr,'🔴' if ce_is_bear else '🟢') +
-            nc_card('PUT OI CHANGE',pe_dot_col,pe_val,pe_col,'PE open interest \u0394',pe_lbl,pe_btn_col,pe_btn_bg,pe_btn_bdr,'🟢' if pe_is_bull else '🔴') +
-            nc_card('NET OI CHANGE',net_dot_col,net_val,net_col,'CE \u0394 \u2212 PE \u0394',net_lbl,net_btn_col,net_btn_bg,net_btn_bdr,'\u2696\ufe0f')
-        )
-        dual_meters = (
-            f'<div class="nc-meters-panel">'
-            f'<div class="nc-meter-row"><div class="nc-meter-head-row"><span class="nc-meter-label">\U0001f7e2 Bull Strength</span><span class="nc-meter-pct" style="color:#34d399;">{bull_pct}%</span></div>'
-            f'<div class="nc-meter-track"><div class="nc-meter-fill" style="width:{bull_pct}%;background:linear-gradient(90deg,#10b981,#34d399);"></div>'
-            f'<div class="nc-meter-head" style="left:{bull_pct}%;background:#34d399;box-shadow:0 0 8px #34d399;"></div></div></div>'
-            f'<div class="nc-meter-row"><div class="nc-meter-head-row"><span class="nc-meter-label">\U0001f534 Bear Strength</span><span class="nc-meter-pct" style="color:#fb7185;">{bear_pct}%</span></div>'
-            f'<div class="nc-meter-track"><div class="nc-meter-fill" style="width:{bear_pct}%;background:linear-gradient(90deg,#ef4444,#f97316);"></div>'
-            f'<div class="nc-meter-head" style="left:{bear_pct}%;background:#fb7185;box-shadow:0 0 8px #fb7185;"></div></div></div></div>'
-        )
-        # ── Compact single-row OI widget (space-saving redesign) ──
-        # All values (ce_val, pe_val, net_val, direction, signal,
-        # bull_pct, bear_pct, dir_name_col, dir_desc_col) come from
-        # the logic above — nothing changed there.
-        return f"""
-<style>
-/* ── OI Navy Command — responsive ── */
-.nc-wrap {{
-    background:#090f1c;
-    border:1px solid rgba(0,200,255,0.1);
-    border-radius:12px;
-    overflow:hidden;
-    font-family:'JetBrains Mono',monospace;
-}}
-.nc-header {{
-    display:flex;align-items:center;justify-content:space-between;
-    padding:8px 14px;
-    background:rgba(0,0,0,0.35);
-    border-bottom:1px solid rgba(0,200,255,0.08);
-    flex-wrap:wrap;gap:6px;
-}}
-.nc-header-left {{display:flex;align-items:center;gap:8px;flex-wrap:wrap;}}
-.nc-header-title {{font-size:15px;font-weight:700;color:#e2eaf5;letter-spacing:.5px;}}
-.nc-header-sub {{font-size:12px;color:#a8c4d8;letter-spacing:1px;}}
-.nc-atm-badge {{
-    font-size:9px;letter-spacing:1.5px;white-space:nowrap;
-    background:rgba(0,212,255,0.08);border:1px solid rgba(0,212,255,0.2);
-    color:#00d4ff;padding:3px 10px;border-radius:5px;
-}}
-/* Desktop: single row — direction+bars merged | divider | CE | PE | Net */
-.nc-grid {{
-    display:grid;
-    grid-template-columns:2.2fr 1px minmax(0,1fr) minmax(0,1fr) minmax(0,1fr);
-    min-height:90px;
-}}
-.nc-divider {{background:rgba(0,200,255,0.08);}}
+function selectStrat(row) {
+    if (!row || !row.dataset) return;
+    var tmp = document.createElement('textarea');
+    tmp.innerHTML = row.dataset.strat || '';
+    var stratName = tmp.value;
+    var mapEl = document.getElementById('stratDataMap');
+    var stratMap = {};
+    try { stratMap = JSON.parse(mapEl.textContent || mapEl.innerHTML); } catch(e){}
+    var info = stratMap[stratName] || {};
+    _applyTradePlan(stratName, info.strike || 'N/A', info.rank || 'PRIMARY', typeof info.rr === 'number' ? info.rr : 0);
+}
 
-/* Direction+bars unified cell — left:text  right:bars */
-.nc-dir-cell {{
-    padding:14px 18px;
-    border-left:3px solid {dir_name_col};
-    display:flex;flex-direction:row;align-items:center;gap:0;
-}}
-.nc-dir-text {{
-    display:flex;flex-direction:column;justify-content:center;gap:3px;
-    flex:0 0 auto; min-width:140px;
-}}
-.nc-dir-label {{font-size:10px;letter-spacing:1.5px;color:{dir_desc_col};text-transform:uppercase;}}
-.nc-dir-name {{
-    font-family:'Orbitron',monospace;font-size:22px;font-weight:900;
-    color:{dir_name_col};text-shadow:0 0 18px {dir_name_col}77;line-height:1.2;
-}}
-.nc-dir-sig {{font-size:11px;color:{dir_desc_col};letter-spacing:.3px;margin-top:2px;}}
+var _oiInterval = 3;
+var _oiData     = [];
+var _oiRollups  = {};   // mins -> rows of oi_rollup_<mins>.json (bucketed server-side)
 
-/* Bars block — fills remaining space of direction cell */
-.nc-bars-block {{
-    flex:1;
-    display:flex;flex-direction:column;justify-content:center;gap:10px;
-    padding:0 18px 0 24px;
-    border-left:1px solid rgba(0,200,255,0.08);
-    margin-left:16px;
-}}
-.nc-bar-row {{display:flex;align-items:center;gap:10px;}}
-.nc-bar-lbl {{
-    font-size:11px;font-weight:700;letter-spacing:1px;
-    width:32px;flex-shrink:0;
-}}
-.nc-bar-track {{flex:1;height:6px;background:rgba(255,255,255,0.07);border-radius:99px;overflow:hidden;}}
-.nc-bar-pct {{
-    font-family:'Orbitron',monospace;font-size:15px;font-weight:900;
-    min-width:42px;text-align:right;flex-shrink:0;
-}}
-.nc-oi-cell {{
-    padding:14px 14px;
-    border-left:1px solid rgba(0,200,255,0.08);
-    display:flex;flex-direction:column;justify-content:center;gap:3px;
-}}
-.nc-oi-label {{font-size:10px;letter-spacing:1px;text-transform:uppercase;color:#a8c4d8;margin-bottom:2px;}}
-.nc-oi-value {{font-family:'Orbitron',monospace;font-size:20px;font-weight:900;line-height:1.15;}}
-.nc-oi-footer {{display:flex;align-items:center;justify-content:space-between;margin-top:4px;flex-wrap:wrap;gap:3px;}}
-.nc-oi-sub {{font-size:10px;color:#a8c4d8;}}
-.nc-oi-btn {{font-size:10px;padding:2px 7px;border-radius:3px;white-space:nowrap;}}
-.nc-legend {{
-    padding:8px 14px;
-    background:rgba(0,0,0,0.25);
-    border-top:1px solid rgba(0,200,255,0.06);
-    display:flex;flex-wrap:wrap;align-items:center;gap:5px 10px;
-    font-size:11px;color:#a8c4d8;
-}}
+function setOIInterval(mins, btn) {
+    _oiInterval = mins;
+    document.querySelectorAll('.oi-int-btn').forEach(function(b){ b.classList.remove('active'); });
+    btn.classList.add('active');
+    loadOIRollup(mins, function(){ renderOITable(_oiData); });
+}
 
-/* ── MOBILE: stack into 2 rows ── */
-@media (max-width:620px) {{
-    .nc-grid {{
-        display:grid;
-        grid-template-columns:1fr 1fr 1fr;
-        grid-template-rows:auto auto;
-    }}
-    .nc-divider {{ display:none; }}
+function loadOIRollup(mins, done) {
+    fetch('oi_rollup_' + mins + '.json?_t=' + Date.now(), {cache:'no-store'})
+        .then(function(r){ if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); })
+        .then(function(saved) {
+            var rows = saved && saved.rows;
+            if (Array.isArray(rows) && rows.length > 0) { rows[0]._isLive = true; _oiRollups[mins] = rows; }
+            else delete _oiRollups[mins];
+        })
+        .catch(function(){ delete _oiRollups[mins]; })
+        .then(function(){ if (done) done(); });
+}
 
-    /* Direction+bars cell: spans full row 1 */
-    .nc-dir-cell {{
-        grid-column:1 / 4;
-        grid-row:1;
-        border-left:3px solid {dir_name_col};
-        border-bottom:1px solid rgba(0,200,255,0.08);
-        padding:12px 14px;
-        flex-direction:row;
-        align-items:center;
-    }}
-    .nc-dir-text {{ min-width:110px; }}
-    .nc-dir-name {{ font-size:18px; }}
-    .nc-bars-block {{
-        padding:0 10px 0 16px;
-        margin-left:12px;
-    }}
-    .nc-bar-pct {{ font-size:13px; min-width:36px; }}
+/* Rows for the table/sparkline: server rollup when available, else bucket locally */
+function oiSeries(data, mins) {
+    if (_oiRollups[mins]) return _oiRollups[mins];
+    return filterByInterval(data, mins);
+}
 
-    /* CE / PE / Net — equal thirds in row 2 */
-    .nc-ce-cell {{
-        grid-column:1 / 2; grid-row:2;
-        border-top:2px solid {ce_col};
-        border-right:1px solid rgba(0,200,255,0.08);
-        padding:10px 10px;
-    }}
-    .nc-pe-cell {{
-        grid-column:2 / 3; grid-row:2;
-        border-top:2px solid {pe_col};
-        border-right:1px solid rgba(0,200,255,0.08);
-        padding:10px 10px;
-    }}
-    .nc-net-cell {{
-        grid-column:3 / 4; grid-row:2;
-        border-top:2px solid {net_col};
-        padding:10px 10px;
-    }}
+function fmtIN(n) {
+    var abs = Math.abs(n);
+    var sign = n < 0 ? '-' : '+';
+    if (abs >= 10000000) return sign + (abs/10000000).toFixed(2) + ' Cr';
+    if (abs >= 100000)   return sign + (abs/100000).toFixed(2)   + ' L';
+    if (abs === 0)       return '0';
+    return (n < 0 ? '-' : '+') + abs.toLocaleString('en-IN');
+}
 
-    .nc-oi-value {{ font-size:13px; }}
-    .nc-oi-footer {{ flex-direction:column; align-items:flex-start; gap:3px; }}
-    .nc-legend-verbose {{ display:none; }}
-}}
-</style>
+function signalHtml(sig) {
+    var s = (sig||'').toUpperCase().trim();
+    if (s === 'STRONG SELL') return '<span class="oi-signal-ssell">STRONG SELL</span>';
+    if (s === 'SELL')        return '<span class="oi-signal-sell">SELL</span>';
+    if (s === 'STRONG BUY')  return '<span class="oi-signal-sbuy">STRONG BUY</span>';
+    if (s === 'BUY')         return '<span class="oi-signal-buy">BUY</span>';
+    return '<span class="oi-signal-neutral">NEUTRAL</span>';
+}
 
-<div class="section">
-<div class="nc-wrap">
+function vsigHtml(sig) {
+    return (sig||'').toUpperCase() === 'BUY'
+        ? '<span class="oi-vsig-buy">BUY</span>'
+        : '<span class="oi-vsig-sell">SELL</span>';
+}
 
-  <!-- ── Header ── -->
-  <div class="nc-header">
-    <div class="nc-header-left">
-      <span style="font-size:13px;">&#128202;</span>
-      <span class="nc-header-title">Change in Open Interest</span>
-      <span class="nc-header-sub">Today's Direction Analysis</span>
-    </div>
-    <div class="nc-atm-badge">ATM &#177;10</div>
-  </div>
+function filterByInterval(data, mins) {
+    // Step 1: Restrict to today only (use date from most-recent entry's timestamp)
+    var todayData = data;
+    if (data && data.length > 0) {
+        var latestTs  = data[0].timestamp || '';
+        var todayDate = latestTs.split(' ')[0]; // "04-Mar-2026"
+        if (todayDate) {
+            todayData = data.filter(function(row) {
+                return (row.timestamp || '').startsWith(todayDate);
+            });
+        }
+    }
+    if (mins === 3) return todayData;
+    // Step 2: Group by date+hour:slot so same time on different days never merges
+    var grouped = {};
+    todayData.forEach(function(row) {
+        var ts      = row.timestamp || '';
+        var dateKey = ts.split(' ')[0] || 'unknown';
+        var parts   = (row.time||'00:00').split(':');
+        var h       = parseInt(parts[0]||0);
+        var m       = parseInt(parts[1]||0);
+        var slotMin = Math.floor(m / mins) * mins;
+        var key     = dateKey + '|' + String(h).padStart(2,'0') + ':' + String(slotMin).padStart(2,'0');
+        if (!grouped[key]) grouped[key] = [];
+        grouped[key].push(row);
+    });
+    var keys = Object.keys(grouped).sort().reverse();
+    return keys.map(function(key) {
+        var rows    = grouped[key];
+        // rows[0] = newest snapshot in this window (data is reverse-chronological)
+        var latest  = rows[0];
+        var displayTime = key.split('|')[1];
+        return {
+            time:          displayTime,
+            // FIX: OI values are cumulative snapshots (today vs yesterday), NOT deltas.
+            // Summing them across snapshots was wrong (5x inflation). Use latest snapshot.
+            call_oi_chg:   latest.call_oi_chg || 0,
+            put_oi_chg:    latest.put_oi_chg  || 0,
+            diff:          (latest.put_oi_chg||0) - (latest.call_oi_chg||0),
+            pcr:           latest.pcr,
+            opt_signal:    latest.opt_signal,
+            vwap:           latest.vwap,
+            spot_price:     latest.spot_price,
+            nifty_move_pct: latest.nifty_move_pct,
+            nearest_level:  latest.nearest_level,
+            nearest_label:  latest.nearest_label,
+            distance_pts:   latest.distance_pts,
+            vwap_signal:    latest.vwap_signal,
+            rsi_15m:        latest.rsi_15m,
+            ema_signal:     latest.ema_signal,
+            ema5:           latest.ema5,
+            ema13:          latest.ema13,
+            bias:           latest.bias,
+            support:        latest.support,
+            resistance:     latest.resistance,
+            strong_support:     latest.strong_support,
+            strong_resistance:  latest.strong_resistance,
+            timestamp:      latest.timestamp,
+            _isLive:       rows[0]._isLive,
+        };
+    });
+}
 
-  <!-- ── Grid: Direction | divider | Bars | divider | CE | PE | Net ── -->
-  <div class="nc-grid">
+/* ── FOCUS / DETAIL view toggle ───────────────────────────── */
+var _oiViewMode = 'focus';
+function setOIView(mode) {
+    _oiViewMode = mode;
+    try { history.replaceState(null, '', mode === 'detail' ? '#oi-detail' : ' '); } catch(e) {}
+    var tableWrap = document.querySelector('.oi-table-wrap');
+    if (!tableWrap) return;
+    if (mode === 'detail') {
+        tableWrap.classList.add('oi-detail-mode');
+    } else {
+        tableWrap.classList.remove('oi-detail-mode');
+    }
+    var btnFocus  = document.getElementById('btnFocus');
+    var btnDetail = document.getElementById('btnDetail');
+    if (btnFocus)  btnFocus.classList.toggle('oi-view-active',  mode === 'focus');
+    if (btnDetail) btnDetail.classList.toggle('oi-view-active', mode === 'detail');
+}
+/* Restore last chosen OI view mode (default: focus) */
+window.addEventListener('load', function(){ setOIView(location.hash === '#oi-detail' ? 'detail' : 'focus'); });
 
-    <!-- Direction + Bars — unified cell -->
-    <div class="nc-dir-cell" style="background:linear-gradient(135deg,{dir_bg},{dir_bg.replace('0.92','0.03')});">
+/* ══ ELAPSED TIMER SYSTEM — replaces static LIVE badge ══════════════════ */
+var _elapsedTimerRef = null;   // Date.now() when current live entry was first seen
+var _elapsedTimerKey = '';     // time string of the current live entry (e.g. "09:20")
+var _elapsedTimerInterval = null;
 
-      <!-- Left: text -->
-      <div class="nc-dir-text">
-        <div class="nc-dir-label">Market Direction</div>
-        <div class="nc-dir-name">{direction}</div>
-        <div class="nc-dir-sig">{signal}</div>
-      </div>
+function _startElapsedTimer(entryTime) {
+    // If the live entry changed, reset the reference
+    if (entryTime !== _elapsedTimerKey) {
+        _elapsedTimerKey = entryTime;
+        _elapsedTimerRef = Date.now();
+    }
+    // Clear any previous interval
+    if (_elapsedTimerInterval) clearInterval(_elapsedTimerInterval);
+    // Tick every second
+    _elapsedTimerInterval = setInterval(_updateElapsedDisplays, 1000);
+    _updateElapsedDisplays();
+}
 
-      <!-- Right: bars -->
-      <div class="nc-bars-block">
-        <div class="nc-bar-row">
-          <div class="nc-bar-lbl" style="color:#00ff88;">&#9679; Bull</div>
-          <div class="nc-bar-track">
-            <div style="height:100%;width:{bull_pct}%;background:linear-gradient(90deg,#00c96b,#00ff88);border-radius:99px;box-shadow:0 0 6px rgba(0,255,136,0.5);"></div>
-          </div>
-          <div class="nc-bar-pct" style="color:#00ff88;">{bull_pct}%</div>
-        </div>
-        <div class="nc-bar-row">
-          <div class="nc-bar-lbl" style="color:#ff3b5c;">&#9679; Bear</div>
-          <div class="nc-bar-track">
-            <div style="height:100%;width:{bear_pct}%;background:linear-gradient(90deg,#c9003a,#ff3b5c);border-radius:99px;box-shadow:0 0 6px rgba(255,59,92,0.5);"></div>
-          </div>
-          <div class="nc-bar-pct" style="color:#ff3b5c;">{bear_pct}%</div>
-        </div>
-      </div>
+function _fmtElapsed(ms) {
+    var totalSec = Math.floor(ms / 1000);
+    var m = Math.floor(totalSec / 60);
+    var s = totalSec % 60;
+    return m + 'm:' + (s < 10 ? '0' : '') + s + 's';
+}
 
-    </div>
+function _updateElapsedDisplays() {
+    if (!_elapsedTimerRef) return;
+    var elapsed = Date.now() - _elapsedTimerRef;
+    var txt = _fmtElapsed(elapsed);
+    // Update all elapsed badges in OI table
+    var oiBadges = document.querySelectorAll('.oi-elapsed');
+    oiBadges.forEach(function(el){ el.textContent = txt; });
+    // Update all elapsed badges in NLF panel
+    var nlfBadges = document.querySelectorAll('.nlf-elapsed');
+    nlfBadges.forEach(function(el){ el.textContent = txt; });
+}
 
-    <!-- Divider -->
-    <div class="nc-divider"></div>
+function renderOITable(data) {
+    var tbody = document.getElementById('oiTableBody');
+    if (!tbody) return;
+    if (!data || data.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="15" class="oi-empty-state">&#128218; No data yet.</td></tr>';
+        return;
+    }
+    var filtered = oiSeries(data, _oiInterval);
+    var latest = filtered[0];
 
-    <!-- Call OI -->
-    <div class="nc-oi-cell nc-ce-cell" style="border-top:2px solid {ce_col};">
-      <div class="nc-oi-label">Call OI &#916;</div>
-      <div class="nc-oi-value" style="color:{ce_col};">{ce_val:+,}</div>
-      <div class="nc-oi-footer">
-        <div class="nc-oi-sub">CE open interest</div>
-        <div class="nc-oi-btn" style="background:{ce_btn_bg};border:1px solid {ce_btn_bdr};color:{ce_btn_col};">{ce_lbl}</div>
-      </div>
-    </div>
+    // ── Update summary cards (text only, no DOM rebuild) ──
+    if (latest) {
+        var el;
+        el = document.getElementById('oiLatestPCR'); if (el) el.textContent = latest.pcr || '—';
+        el = document.getElementById('oiLatestDiff');
+        if (el) { el.textContent = fmtIN(latest.diff || 0); el.className = 'oi-sum-val ' + ((latest.diff||0) >= 0 ? 'oi-diff-pos' : 'oi-diff-neg'); }
+        el = document.getElementById('oiLatestSpot'); if (el) el.textContent = '₹' + ((latest.spot_price||0).toLocaleString('en-IN'));
+        el = document.getElementById('oiLatestSignal'); if (el) el.innerHTML = signalHtml(latest.opt_signal);
+    }
+    var ce = document.getElementById('oiChartEntries');
+    if (ce) ce.textContent = filtered.length + ' candles';
 
-    <!-- Put OI -->
-    <div class="nc-oi-cell nc-pe-cell" style="border-top:2px solid {pe_col};">
-      <div class="nc-oi-label">Put OI &#916;</div>
-      <div class="nc-oi-value" style="color:{pe_col};">{pe_val:+,}</div>
-      <div class="nc-oi-footer">
-        <div class="nc-oi-sub">PE open interest</div>
-        <div class="nc-oi-btn" style="background:{pe_btn_bg};border:1px solid {pe_btn_bdr};color:{pe_btn_col};">{pe_lbl}</div>
-      </div>
-    </div>
+    // ── Redraw sparkline (canvas, no flicker) ──
+    drawSparkline(filtered);
 
-    <!-- Net OI -->
-    <div class="nc-oi-cell nc-net-cell" style="border-top:2px solid {net_col};">
-      <div class="nc-oi-label">Net OI &#916;</div>
-      <div class="nc-oi-value" style="color:{net_col};">{net_val:+,}</div>
-      <div class="nc-oi-footer">
-        <div class="nc-oi-sub">PE &#916; &#8722; CE &#916;</div>
-        <div class="nc-oi-btn" style="background:{net_btn_bg};border:1px solid {net_btn_bdr};color:{net_btn_col};">&#9878; {net_lbl}</div>
-      </div>
-    </div>
+    // ── Table rebuild: full rebuild on interval change, smart append on same interval ──
+    var existingRows = tbody.querySelectorAll('tr[data-time]');
+    var existingTimes = {};
+    existingRows.forEach(function(r){ existingTimes[r.getAttribute('data-time')] = r; });
 
-  </div>
+    // Detect if the current table rows match the filtered set — if not, full rebuild
+    var filteredTimes = filtered.map(function(r){ return r.time || ''; });
+    var existingTimesList = Object.keys(existingTimes);
+    var needsFullRebuild = (existingTimesList.length > 0) && (
+        existingTimesList.length !== filteredTimes.length ||
+        filteredTimes.some(function(t){ return !existingTimes[t]; }) ||
+        existingTimesList.some(function(t){ return filteredTimes.indexOf(t) < 0; })
+    );
+    if (needsFullRebuild) {
+        tbody.innerHTML = '';
+        existingTimes = {};
+    }
 
-  <!-- ── Legend ── -->
-  <div class="nc-legend">
-    <span>&#128214;</span>
-    <span style="background:rgba(255,255,255,0.1);border:1px solid rgba(255,255,255,0.25);border-radius:4px;padding:2px 8px;color:#dde8f0;">Call OI +</span>
-    <span class="nc-legend-verbose">Writers selling calls</span>
-    <span style="background:rgba(255,59,92,0.18);border:1px solid rgba(255,59,92,0.35);border-radius:4px;padding:2px 8px;color:#ff6b85;">Bearish</span>
-    <span style="color:rgba(255,255,255,0.3);" class="nc-legend-verbose">|</span>
-    <span style="background:rgba(255,255,255,0.1);border:1px solid rgba(255,255,255,0.25);border-radius:4px;padding:2px 8px;color:#dde8f0;" class="nc-legend-verbose">Call OI &#8722;</span>
-    <span class="nc-legend-verbose">Unwinding</span>
-    <span style="background:rgba(0,255,136,0.15);border:1px solid rgba(0,255,136,0.35);border-radius:4px;padding:2px 8px;color:#00ff88;" class="nc-legend-verbose">Bullish</span>
-    <span style="color:rgba(255,255,255,0.3);" class="nc-legend-verbose">|</span>
-    <span style="background:rgba(255,255,255,0.1);border:1px solid rgba(255,255,255,0.25);border-radius:4px;padding:2px 8px;color:#dde8f0;">Put OI +</span>
-    <span class="nc-legend-verbose">Writers selling puts</span>
-    <span style="background:rgba(0,255,136,0.15);border:1px solid rgba(0,255,136,0.35);border-radius:4px;padding:2px 8px;color:#00ff88;">Bullish</span>
-    <span style="color:rgba(255,255,255,0.3);" class="nc-legend-verbose">|</span>
-    <span style="background:rgba(255,255,255,0.1);border:1px solid rgba(255,255,255,0.25);border-radius:4px;padding:2px 8px;color:#dde8f0;">Net OI</span>
-    <span style="background:rgba(0,255,136,0.15);border:1px solid rgba(0,255,136,0.35);border-radius:4px;padding:2px 8px;color:#00ff88;">+ = Bullish</span>
-    <span style="background:rgba(255,59,92,0.18);border:1px solid rgba(255,59,92,0.35);border-radius:4px;padding:2px 8px;color:#ff6b85;">&#8722; = Bearish</span>
-    <span style="color:rgba(255,255,255,0.3);" class="nc-legend-verbose">|</span>
-    <span style="background:rgba(255,255,255,0.1);border:1px solid rgba(255,255,255,0.25);border-radius:4px;padding:2px 8px;color:#dde8f0;" class="nc-legend-verbose">Bull % + Bear %</span>
-    <span class="nc-legend-verbose">= 100% &middot; relative dominance</span>
-  </div>
+    // Remove elapsed badge from previous live row
+    var prevLive = tbody.querySelector('.oi-live-row');
+    if (prevLive) {
+        prevLive.classList.remove('oi-live-row');
+        var liveInd = prevLive.querySelector('.oi-live-ind');
+        if (liveInd) liveInd.remove();
+        var elapsedInd = prevLive.querySelector('.oi-elapsed');
+        if (elapsedInd) elapsedInd.remove();
+        var td = prevLive.querySelector('td:first-child');
+        if (td) { var div = td.querySelector('.oi-time-cell'); if (div) td.textContent = div.textContent.replace('LIVE','').trim(); }
+    }
+
+    // Build new rows for times not yet in table, prepend them
+    var newRowsHtml = '';
+    filtered.forEach(function(row, idx) {
+        var t = row.time || '';
+        if (!existingTimes[t]) {
+            var isLive  = (idx === 0);
+            var diffCls = (row.diff||0) >= 0 ? 'oi-diff-pos' : 'oi-diff-neg';
+            var timeCell = isLive
+                ? '<div class="oi-time-cell"><span class="oi-time-val">' + t + '</span>&nbsp;<span class="oi-elapsed"></span></div>'
+                : '<div class="oi-time-cell"><span class="oi-time-val">' + t + '</span></div>';
+            var isBuy = (row.opt_signal||'').toUpperCase().indexOf('BUY') >= 0;
+            var isSell = (row.opt_signal||'').toUpperCase().indexOf('SELL') >= 0;
+            var nlabel = row.nearest_label || (isBuy ? 'R1' : isSell ? 'S1' : '—');
+            var nval   = row.nearest_level ? '₹' + row.nearest_level.toLocaleString('en-IN') : '—';
+            var isNeutral = !isBuy && !isSell;
+            var nlevelHtml, distHtml;
+            if (row.nearest_level) {
+                nlevelHtml = '<span class="oi-nlevel-badge ' + (isBuy ? 'oi-nlevel-res' : 'oi-nlevel-sup') + '">'
+                  + '<span class="oi-nlevel-label">' + nlabel + '</span>'
+                  + nval + '</span>';
+                distHtml = '<span class="oi-dist-val ' + (isBuy ? 'oi-dist-res' : 'oi-dist-sup') + '">'
+                  + (isBuy ? '+' : '-') + Math.abs(row.distance_pts) + ' pts'
+                  + (row.nearest_label === 'S2' || row.nearest_label === 'R2'
+                      ? ' <span style="font-size:8px;opacity:0.6;">(to ' + (row.nearest_label||'') + ')</span>'
+                      : '')
+                  + '</span>';
+            } else if (isNeutral) {
+                // FIX v11: NEUTRAL OI signal → use ONLY spot price momentum.
+                // Technical bias (SMA/RSI/MACD) is ignored here because it can lag.
+                // Simple rule: price rising → WATCH BULL, price falling → WATCH BEAR.
+                var wbHtml, wdHtml;
+                var curSpot  = row.spot_price || 0;
+                var oldestRow = null;
+                for (var mi = 3; mi >= 1; mi--) {
+                    if (filtered[idx + mi] && filtered[idx + mi].spot_price) {
+                        oldestRow = filtered[idx + mi]; break;
+                    }
+                }
+                var momDelta = oldestRow ? (curSpot - oldestRow.spot_price) : 0;
+
+                if (momDelta > 15) {
+                    // Price rising → WATCH BULL with R1 target
+                    var wbR1 = row.resistance || row.nearest_level;
+                    var wbRDist = (wbR1 && curSpot) ? Math.round(wbR1 - curSpot) : null;
+                    wbHtml = '<div style="display:flex;flex-direction:column;align-items:center;gap:3px;">'
+                        + '<span style="display:inline-flex;align-items:center;gap:4px;padding:3px 10px;border-radius:6px;'
+                        + 'font-size:10px;font-weight:800;background:rgba(181,234,58,0.12);color:#b5ea3a;'
+                        + 'border:1px solid rgba(181,234,58,0.3);">⚡ WATCH BULL</span>'
+                        + (wbR1 ? '<span style="font-size:11px;font-family:monospace;font-weight:700;"><span style="color:#00e676;font-weight:800;">R1</span> <span style="color:#00e676;">₹' + Number(wbR1).toLocaleString('en-IN') + '</span></span>' : '<span style="font-size:8px;color:rgba(181,234,58,0.5);font-family:monospace;">spot momentum</span>')
+                        + '</div>';
+                    wdHtml = (wbRDist !== null && wbRDist > 0)
+                        ? '<span style="font-size:13px;color:#00e676;font-family:monospace;font-weight:700;">▲ +' + wbRDist + ' pts</span>'
+                        : '<span style="font-size:9px;color:rgba(181,234,58,0.6);font-family:monospace;font-weight:600;">▲ +' + Math.abs(momDelta).toFixed(1) + ' pts drift</span>';
+                } else if (momDelta < -15) {
+                    // Price falling → WATCH BEAR with S1 target
+                    var wbS1 = row.support || row.nearest_level;
+                    var wbSDist = (wbS1 && curSpot) ? Math.round(curSpot - wbS1) : null;
+                    wbHtml = '<div style="display:flex;flex-direction:column;align-items:center;gap:3px;">'
+                        + '<span style="display:inline-flex;align-items:center;gap:4px;padding:3px 10px;border-radius:6px;'
+                        + 'font-size:10px;font-weight:800;background:rgba(255,152,0,0.12);color:#ff9800;'
+                        + 'border:1px solid rgba(255,152,0,0.3);">⚠ WATCH BEAR</span>'
+                        + (wbS1 ? '<span style="font-size:11px;font-family:monospace;font-weight:700;"><span style="color:#ff4757;font-weight:800;">S1</span> <span style="color:#ff4757;">₹' + Number(wbS1).toLocaleString('en-IN') + '</span></span>' : '<span style="font-size:8px;color:rgba(255,152,0,0.5);font-family:monospace;">spot momentum</span>')
+                        + '</div>';
+                    wdHtml = (wbSDist !== null && wbSDist > 0)
+                        ? '<span style="font-size:13px;color:#ff4757;font-family:monospace;font-weight:700;">▼ -' + wbSDist + ' pts</span>'
+                        : '<span style="font-size:9px;color:rgba(255,152,0,0.6);font-family:monospace;font-weight:600;">▼ -' + Math.abs(momDelta).toFixed(1) + ' pts drift</span>';
+                } else {
+                    // Truly flat — price barely moving
+                    wbHtml = '<span style="display:inline-flex;align-items:center;gap:4px;padding:3px 10px;border-radius:6px;'
+                        + 'font-size:10px;font-weight:700;background:rgba(176,190,197,0.06);color:#78909c;'
+                        + 'border:1px solid rgba(176,190,197,0.15);">→ Flat</span>';
+                    wdHtml = '<span style="font-size:9px;color:rgba(176,190,197,0.35);font-family:monospace;">'
+                        + (oldestRow ? '±' + Math.abs(momDelta).toFixed(1) + ' pts' : 'no data') + '</span>';
+                }
+                nlevelHtml = wbHtml;
+                distHtml   = wdHtml;
+            } else {
+                nlevelHtml = '<span style="color:rgba(176,190,197,0.3);">—</span>';
+                distHtml   = '<span style="color:rgba(176,190,197,0.3);">—</span>';
+            }
+
+            // ── Spot Δ ──
+            var prevRow = filtered[idx + 1];
+            var spotDelta = (prevRow && prevRow.spot_price && row.spot_price)
+                ? Math.round((row.spot_price - prevRow.spot_price) * 10) / 10
+                : null;
+            var spotDeltaHtml;
+            if (spotDelta === null) {
+                spotDeltaHtml = '<span style="color:rgba(176,190,197,0.2);">—</span>';
+            } else if (Math.abs(spotDelta) < 0.5) {
+                spotDeltaHtml = '<span class="oi-sdelta oi-sdelta-fl">→ 0.0</span>';
+            } else if (spotDelta > 0) {
+                spotDeltaHtml = '<span class="oi-sdelta oi-sdelta-up">▲ +' + spotDelta.toFixed(1) + '</span>';
+            } else {
+                spotDeltaHtml = '<span class="oi-sdelta oi-sdelta-dn">▼ ' + spotDelta.toFixed(1) + '</span>';
+            }
+
+            // ── Nifty Move % ──
+            var nmp = row.nifty_move_pct;
+            var niftyMovePctHtml;
+            if (nmp === null || nmp === undefined) {
+                niftyMovePctHtml = '<span style="color:rgba(176,190,197,0.2);">—</span>';
+            } else {
+                var sign  = nmp >= 0 ? '+' : '';
+                var arrow, cls;
+                if (Math.abs(nmp) < 0.1) {
+                    arrow = '→'; cls = 'oi-nifty-flat';
+                } else if (nmp >= 1.0) {
+                    arrow = '▲'; cls = 'oi-nifty-up-strong';
+                } else if (nmp >= 0.5) {
+                    arrow = '▲'; cls = 'oi-nifty-up-mid';
+                } else if (nmp > 0) {
+                    arrow = '▲'; cls = 'oi-nifty-up-weak';
+                } else if (nmp <= -1.0) {
+                    arrow = '▼'; cls = 'oi-nifty-dn-strong';
+                } else if (nmp <= -0.5) {
+                    arrow = '▼'; cls = 'oi-nifty-dn-mid';
+                } else {
+                    arrow = '▼'; cls = 'oi-nifty-dn-weak';
+                }
+                // Diff vs previous candle
+                var nmpPrev = (filtered[idx + 1] && filtered[idx + 1].nifty_move_pct != null) ? filtered[idx + 1].nifty_move_pct : null;
+                var nmpDiffHtml = '';
+                if (nmpPrev !== null) {
+                    var nmpDiff = Math.round((nmp - nmpPrev) * 100) / 100;
+                    if (Math.abs(nmpDiff) < 0.005) {
+                        nmpDiffHtml = '<div style="font-size:10px;color:rgba(176,190,197,0.4);font-family:monospace;margin-top:2px;">= 0.00</div>';
+                    } else {
+                        var ndArrow = nmpDiff > 0 ? '▲' : '▼';
+                        var ndColor = nmpDiff > 0 ? '#00e676' : '#ff4757';
+                        var ndSign  = nmpDiff > 0 ? '+' : '';
+                        nmpDiffHtml = '<div style="font-size:10px;color:' + ndColor + ';font-family:monospace;font-weight:600;margin-top:2px;">'
+                            + ndArrow + ' ' + ndSign + nmpDiff.toFixed(2) + '</div>';
+                    }
+                }
+                niftyMovePctHtml = '<div style="display:flex;flex-direction:column;align-items:center;">'
+                    + '<span class="oi-nifty-move ' + cls + '">'
+                    + arrow + ' ' + sign + nmp.toFixed(2) + '%</span>'
+                    + nmpDiffHtml + '</div>';
+            }
+
+            // ── Signal Streak — Intensity Badge ──
+            var streakCount = 1;
+            var curSig = (row.opt_signal || '').toUpperCase();
+            for (var si = idx + 1; si < filtered.length; si++) {
+                if ((filtered[si].opt_signal || '').toUpperCase() === curSig) streakCount++;
+                else break;
+            }
+            // Intensity: opacity scales with streak count (min 0.06, max 0.30)
+            var intensity = Math.min(0.30, 0.06 + streakCount * 0.04);
+            var sColor, sBorder, sLabel;
+            if (isBuy)       { sColor = '0,200,83';  sBorder = '#00c853'; sLabel = 'BUY'; }
+            else if (isSell) { sColor = '255,58,74';  sBorder = '#ff3a4a'; sLabel = 'SELL'; }
+            else             { sColor = '255,183,77'; sBorder = 'rgba(255,183,77,0.5)'; sLabel = streakCount === 1 ? 'NEW' : 'HOLD'; }
+            // Dim the border for low streaks, full for high
+            var borderOpacity = Math.min(1, 0.4 + streakCount * 0.12);
+            var streakHtml = '<div class="oi-streak-int" style="background:rgba(' + sColor + ',' + intensity + ');border-left:3px solid rgba(' + sColor + ',' + borderOpacity + ');">'
+                + '<span class="oi-streak-int-num" style="color:rgba(' + sColor + ',' + Math.min(1, 0.5 + streakCount * 0.1) + ');">' + streakCount + '</span>'
+                + '<span class="oi-streak-int-lbl" style="color:rgba(' + sColor + ',' + Math.min(0.85, 0.3 + streakCount * 0.1) + ');">' + sLabel + '</span>'
+                + '</div>';
+
+            newRowsHtml += '<tr class="' + (isLive ? 'oi-live-row' : '') + '" data-time="' + t + '">'
+                + '<td>' + timeCell + '</td>'
+                + '<td class="col-detail oi-call-val">' + fmtIN(row.call_oi_chg||0) + '</td>'
+                + '<td class="col-detail oi-put-val">'  + fmtIN(row.put_oi_chg||0)  + '</td>'
+                + '<td class="col-detail ' + diffCls + '">' + fmtIN(row.diff||0) + '</td>'
+                + (function(){
+                    var pcrV = parseFloat(row.pcr) || 0;
+                    var pcrCls = pcrV >= 1.1 ? 'oi-pcr-bull' : pcrV <= 0.9 ? 'oi-pcr-bear' : 'oi-pcr-neu';
+                    var barW = Math.min(100, Math.round((pcrV / 2) * 100));
+                    return '<td class="oi-pcr-val ' + pcrCls + '"><span class="oi-pcr-cell">'
+                        + (row.pcr || '—')
+                        + '<span class="oi-pcr-bar-wrap"><span class="oi-pcr-bar ' + pcrCls + '-bar" style="width:' + barW + '%"></span></span>'
+                        + '</span></td>';
+                })()
+                + '<td>' + signalHtml(row.opt_signal) + '</td>'
+                + '<td class="oi-spot-cell">'+ (row.spot_price ? row.spot_price.toFixed(2) : '—') + '</td>'
+                + '<td>' + spotDeltaHtml + '</td>'
+                + '<td>' + niftyMovePctHtml + '</td>'
+                + '<td>' + streakHtml + '</td>'
+                + '<td>' + nlevelHtml + '</td>'
+                + '<td>' + distHtml + '</td>'
+                + (function(){
+                    var rsi = row.rsi_15m;
+                    if (rsi == null) return '<td><span style="color:rgba(176,190,197,0.25);">—</span></td>';
+                    var rsiCol, rsiBg, rsiBdr, rsiLbl;
+                    if (rsi >= 70) {
+                        rsiCol='#ff4757'; rsiBg='rgba(255,71,87,0.12)'; rsiBdr='rgba(255,71,87,0.3)'; rsiLbl='OB';
+                    } else if (rsi <= 30) {
+                        rsiCol='#00e676'; rsiBg='rgba(0,230,118,0.12)'; rsiBdr='rgba(0,230,118,0.3)'; rsiLbl='OS';
+                    } else if (rsi >= 55) {
+                        rsiCol='#69f0ae'; rsiBg='rgba(105,240,174,0.08)'; rsiBdr='rgba(105,240,174,0.25)'; rsiLbl='';
+                    } else if (rsi <= 45) {
+                        rsiCol='#fca5a5'; rsiBg='rgba(252,165,165,0.08)'; rsiBdr='rgba(252,165,165,0.25)'; rsiLbl='';
+                    } else {
+                        rsiCol='#ffb74d'; rsiBg='rgba(255,183,77,0.08)'; rsiBdr='rgba(255,183,77,0.2)'; rsiLbl='';
+                    }
+                    var rsiBadge = rsiLbl
+                        ? '<span style="font-size:8px;font-weight:700;letter-spacing:1px;padding:1px 5px;border-radius:3px;background:'+rsiBg+';color:'+rsiCol+';border:1px solid '+rsiBdr+';">'+rsiLbl+'</span>'
+                        : '<span style="font-size:8px;color:rgba(128,222,234,0.3);">neutral</span>';
+                    return '<td><div style="display:flex;flex-direction:column;align-items:center;gap:3px;">'
+                        + '<span style="font-family:monospace;font-size:12px;font-weight:700;color:'+rsiCol+';">'+rsi.toFixed(1)+'</span>'
+                        + rsiBadge
+                        + '</div></td>';
+                })()
+                + (function(){
+                    var emaSig = row.ema_signal;
+                    var e5  = row.ema5;
+                    var e13 = row.ema13;
+                    if (!emaSig || e5 == null || e13 == null) return '<td><span style="color:rgba(176,190,197,0.25);">—</span></td>';
+                    var emaIsBuy = emaSig === 'BUY';
+                    var eCol = emaIsBuy ? '#00e676' : '#ff4757';
+                    var eBg  = emaIsBuy ? 'rgba(0,230,118,0.12)' : 'rgba(255,71,87,0.12)';
+                    var eBdr = emaIsBuy ? 'rgba(0,230,118,0.3)'  : 'rgba(255,71,87,0.3)';
+                    var eArr = emaIsBuy ? '▲' : '▼';
+                    var eGap = Math.abs(e5 - e13).toFixed(1);
+                    return '<td><div style="display:flex;flex-direction:column;align-items:center;gap:3px;">'
+                        + '<span style="display:inline-flex;align-items:center;gap:4px;padding:2px 9px;border-radius:6px;font-size:11px;font-weight:700;background:'+eBg+';color:'+eCol+';border:1px solid '+eBdr+';">'
+                        + eArr + ' ' + emaSig + '</span>'
+                        + '<span style="font-size:10px;color:' + (emaIsBuy ? 'rgba(105,240,174,0.7)' : 'rgba(252,165,165,0.7)') + ';font-family:monospace;font-weight:600;">gap '+eGap+'</span>'
+                        + '</div></td>';
+                })()
+                + (function(){
+                    var vwapVal = row.vwap;
+                    if (vwapVal == null || vwapVal === 0) {
+                        return '<td class="col-detail"><span style="color:rgba(176,190,197,0.3);">—</span></td>';
+                    }
+                    var spot = row.spot_price || 0;
+                    var aboveVwap = spot >= vwapVal;
+                    var vwapCls = aboveVwap ? 'oi-vwap-bull' : 'oi-vwap-bear';
+                    var vwapArrow = aboveVwap ? '▲' : '▼';
+                    var vwapColor = aboveVwap ? '#4ade80' : '#f87171';
+                    return '<td class="col-detail oi-vwap-cell"><span style="color:' + vwapColor + ';font-weight:700;">'
+                        + vwapArrow + ' ₹' + vwapVal.toLocaleString('en-IN', {minimumFractionDigits:2, maximumFractionDigits:2})
+                        + '</span><br><span style="font-size:8px;color:rgba(147,197,253,0.5);letter-spacing:0.5px;">'
+                        + (aboveVwap ? 'Above' : 'Below') + '</span></td>';
+                })()
+                + (function(){
+                    // ══ CONFLUENCE SCORE ══════════════════════════════════════
+                    // Counts how many of 5 independent signals agree on direction.
+                    // Only shows strong BUY/SELL when 3+ signals align.
+                    var cBuy = 0, cSell = 0, cTotal = 0;
+
+                    // 1. PCR: >1.0 = buy bias, <0.9 = sell bias
+                    var pcrV = parseFloat(row.pcr) || 0;
+                    if (pcrV > 0) { cTotal++;
+                        if (pcrV > 1.0) cBuy++; else if (pcrV < 0.9) cSell++;
+                    }
+
+                    // 2. OI Signal
+                    var oiSig = (row.opt_signal || '').toUpperCase();
+                    if (oiSig.indexOf('BUY') >= 0) { cTotal++; cBuy++; }
+                    else if (oiSig.indexOf('SELL') >= 0) { cTotal++; cSell++; }
+                    else if (oiSig === 'NEUTRAL') { cTotal++; }
+
+                    // 3. VWAP: spot above = buy, below = sell
+                    var cVwap = row.vwap;
+                    var cSpot = row.spot_price || 0;
+                    if (cVwap && cVwap > 0 && cSpot > 0) { cTotal++;
+                        if (cSpot >= cVwap) cBuy++; else cSell++;
+                    }
+
+                    // 4. RSI: >55 = buy momentum, <45 = sell momentum
+                    var cRsi = row.rsi_15m;
+                    if (cRsi != null) { cTotal++;
+                        if (cRsi >= 55) cBuy++; else if (cRsi <= 45) cSell++;
+                    }
+
+                    // 5. EMA 5/13: BUY or SELL
+                    var cEma = row.ema_signal;
+                    if (cEma === 'BUY') { cTotal++; cBuy++; }
+                    else if (cEma === 'SELL') { cTotal++; cSell++; }
+
+                    // Determine confluence verdict
+                    var cMax = Math.max(cBuy, cSell);
+                    var cDir = cBuy > cSell ? 'BUY' : (cSell > cBuy ? 'SELL' : 'MIXED');
+                    var cScore = cBuy > cSell ? cBuy : cSell;
+                    var cLabel, cColor, cBg, cBdr, cIcon, cStrength;
+
+                    // Time-of-day penalty: 9:15-9:30 and 15:15-15:30 are noisy
+                    var cTimeParts = (row.time || '00:00').split(':');
+                    var cHour = parseInt(cTimeParts[0] || 0);
+                    var cMin  = parseInt(cTimeParts[1] || 0);
+                    var cTimeMinutes = cHour * 60 + cMin;
+                    var cIsNoisy = (cTimeMinutes >= 555 && cTimeMinutes <= 560)    // 9:15-9:20
+                                || (cTimeMinutes >= 925 && cTimeMinutes <= 930);   // 15:25-15:30
+
+                    if (cTotal === 0) {
+                        cLabel = '—'; cColor = 'rgba(176,190,197,0.3)'; cBg = 'transparent'; cBdr = 'transparent'; cIcon = ''; cStrength = '';
+                    } else {
+                        // ── FIX v8: Add intraday spot momentum as 6th signal ──
+                        // If price has risen > 30 pts in the last 3 rows, count as a bullish signal.
+                        // If price has fallen > 30 pts in the last 3 rows, count as a bearish signal.
+                        // This prevents STRONG SELL when price is actively bouncing.
+                        var cMomRef = null;
+                        for (var cmi = 2; cmi <= 3; cmi++) {
+                            if (filtered[idx + cmi] && filtered[idx + cmi].spot_price) {
+                                cMomRef = filtered[idx + cmi].spot_price; break;
+                            }
+                        }
+                        if (cMomRef && row.spot_price) {
+                            cTotal++;
+                            var cMomDelta = row.spot_price - cMomRef;
+                            if (cMomDelta > 30)        cBuy++;    // rising >30 pts = bullish momentum
+                            else if (cMomDelta < -30)  cSell++;   // falling >30 pts = bearish momentum
+                            // flat (-30 to +30): neither — momentum is not contributing
+                        }
+
+                        var cScore = cBuy > cSell ? cBuy : cSell;
+                        var cDir = cBuy > cSell ? 'BUY' : (cSell > cBuy ? 'SELL' : 'MIXED');
+
+                        if (cScore >= 4) {
+                            cStrength = 'STRONG';
+                            if (cDir === 'BUY') {
+                                cLabel = cScore + '/' + cTotal; cColor = '#00e676'; cBg = 'rgba(0,230,118,0.18)'; cBdr = 'rgba(0,230,118,0.45)'; cIcon = '▲';
+                            } else if (cDir === 'SELL') {
+                                cLabel = cScore + '/' + cTotal; cColor = '#ff4757'; cBg = 'rgba(255,71,87,0.18)'; cBdr = 'rgba(255,71,87,0.45)'; cIcon = '▼';
+                            } else {
+                                cStrength = 'MIXED'; cLabel = cScore + '/' + cTotal; cColor = '#ffb74d'; cBg = 'rgba(255,183,77,0.10)'; cBdr = 'rgba(255,183,77,0.3)'; cIcon = '~';
+                            }
+                        } else if (cScore >= 3) {
+                            cStrength = cDir;
+                            if (cDir === 'BUY') {
+                                cLabel = cScore + '/' + cTotal; cColor = '#69f0ae'; cBg = 'rgba(105,240,174,0.12)'; cBdr = 'rgba(105,240,174,0.3)'; cIcon = '▲';
+                            } else if (cDir === 'SELL') {
+                                cLabel = cScore + '/' + cTotal; cColor = '#fca5a5'; cBg = 'rgba(252,165,165,0.12)'; cBdr = 'rgba(252,165,165,0.3)'; cIcon = '▼';
+                            } else {
+                                cStrength = 'MIXED'; cLabel = cScore + '/' + cTotal; cColor = '#ffb74d'; cBg = 'rgba(255,183,77,0.08)'; cBdr = 'rgba(255,183,77,0.2)'; cIcon = '~';
+                            }
+                        } else {
+                            cStrength = 'WEAK';
+                            cLabel = cScore + '/' + cTotal; cColor = '#ffb74d'; cBg = 'rgba(255,183,77,0.08)'; cBdr = 'rgba(255,183,77,0.2)'; cIcon = '~';
+                        }
+                    }
+
+                    // Time-of-day noise warning overrides strength display
+                    var cTimeWarn = cIsNoisy
+                        ? '<div style="font-size:10px;color:#ff9800;letter-spacing:1px;margin-top:3px;font-weight:700;background:rgba(255,152,0,0.12);border:1px solid rgba(255,152,0,0.3);border-radius:4px;padding:2px 6px;">⚠ NOISY</div>'
+                        : '';
 
-</div>
-</div>
-"""
+                    return '<td><div style="display:flex;flex-direction:column;align-items:center;gap:2px;">'
+                        + '<span style="display:inline-flex;align-items:center;gap:4px;padding:4px 10px;border-radius:6px;'
+                        + 'font-size:12px;font-weight:800;background:' + cBg + ';color:' + cColor + ';border:1px solid ' + cBdr + ';">'
+                        + cIcon + ' ' + cLabel + '</span>'
+                        + '<span style="font-size:10px;font-weight:700;color:' + cColor + ';letter-spacing:0.5px;">' + cStrength + '</span>'
+                        + cTimeWarn
+                        + '</div></td>';
+                })()
+                + '</tr>';
+        } else if (idx === 0) {
+            // Mark existing top row as LIVE with elapsed timer
+            var r = existingTimes[t];
+            r.classList.add('oi-live-row');
+            var td = r.querySelector('td:first-child');
+            if (td && !td.querySelector('.oi-elapsed')) {
+                td.innerHTML = '<div class="oi-time-cell"><span class="oi-time-val">' + t + '</span>&nbsp;<span class="oi-elapsed"></span></div>';
+            }
+        }
+    });
 
-    def _top10_oi_widget_html(self, d):
-        """
-        TOP 10 OPEN INTEREST widget — same format as Neon Ledger image.
-        Shows Top 5 CE (calls) and Top 5 PE (puts) by Open Interest.
-        Reads from d['df'] — zero logic changes anywhere.
-        """
-        _df = d.get('df', None)
-        atm = d.get('atm_strike', 0)
-        spot = d.get('current_price', 0)
+    if (newRowsHtml) {
+        // ── Bulletproof no-scroll-jump insert ───────────────────────────
+        // overflow-anchor:none on tbody stops Chrome's scroll anchoring from
+        // auto-adjusting when rows are prepended (the main cause of jumps).
+        // We also manually save + restore window.scrollY with double-rAF to
+        // cover Firefox and Safari which don't support overflow-anchor.
+        var winSy   = window.scrollY || window.pageYOffset;
+        var docEl   = document.documentElement;
+        var bodyEl  = document.body;
+        // Disable CSS scroll-behavior so our scrollTo is truly instant
+        var prevDocSB  = docEl.style.scrollBehavior;
+        var prevBodySB = bodyEl.style.scrollBehavior;
+        docEl.style.scrollBehavior  = 'auto';
+        bodyEl.style.scrollBehavior = 'auto';
+        // Disable browser scroll anchoring on the table body
+        tbody.style.overflowAnchor = 'none';
 
-        if _df is None or _df.empty:
-            return ''
+        tbody.insertAdjacentHTML('afterbegin', newRowsHtml);
 
-        # ── Top 5 CE by OI (resistance side — above ATM) ──
-        ce_top5 = _df.nlargest(5, 'CE_OI')[['Strike','CE_OI','CE_OI_Change','CE_LTP','CE_Vol']].reset_index(drop=True)
-        # ── Top 5 PE by OI (support side — below ATM) ──
-        pe_top5 = _df.nlargest(5, 'PE_OI')[['Strike','PE_OI','PE_OI_Change','PE_LTP','PE_Vol']].reset_index(drop=True)
+        // Double-rAF: frame 1 = layout/reflow, frame 2 = paint → scroll after both
+        requestAnimationFrame(function() {
+            requestAnimationFrame(function() {
+                window.scrollTo(0, winSy);
+                // Restore everything
+                tbody.style.overflowAnchor = '';
+                docEl.style.scrollBehavior  = prevDocSB;
+                bodyEl.style.scrollBehavior = prevBodySB;
+            });
+        });
+    }
 
-        # Max OI for bar width scaling
-        ce_max_oi = ce_top5['CE_OI'].max() or 1
-        pe_max_oi = pe_top5['PE_OI'].max() or 1
+    // Remove empty state row if present
+    var emptyRow = tbody.querySelector('.oi-empty-state');
+    if (emptyRow) emptyRow.closest('tr').remove();
 
-        def strike_type(strike, atm_s):
-            if strike == atm_s:   return 'ATM', '#00d4ff', 'rgba(0,212,255,0.12)', 'rgba(0,212,255,0.4)'
-            elif strike > atm_s:  return 'OTM', '#546e7a', 'rgba(84,110,122,0.1)', 'rgba(84,110,122,0.3)'
-            else:                 return 'ITM', '#ffb74d', 'rgba(255,183,77,0.12)', 'rgba(255,183,77,0.35)'
+    // ── Start elapsed timer for latest entry ──
+    if (filtered.length > 0 && filtered[0].time) {
+        _startElapsedTimer(filtered[0].time);
+    }
 
-        def fmt_oi(v):
-            if v >= 1_000_000: return f"{v/1_000_000:.1f}M"
-            if v >= 1_000:     return f"{v/1_000:.1f}K"
-            return str(v)
+    // ── Render NIFTY Live Feed panel ──
+    renderNiftyLiveFeed(filtered);
+}
 
-        def fmt_vol(v):
-            if v >= 1_000_000: return f"{v/1_000_000:.1f}M"
-            if v >= 1_000:     return f"{v/1_000:.1f}K"
-            return str(int(v))
+/* ══ NIFTY LIVE FEED — Compact side panel ══════════════════════════════════ */
+function renderNiftyLiveFeed(filtered) {
+    var body = document.getElementById('nlfBody');
+    if (!body || !filtered || filtered.length === 0) return;
 
-        def chg_color(v):
-            return '#00e676' if v > 0 else ('#ff5252' if v < 0 else '#546e7a')
+    var latest = filtered[0];
+    var maxEntries = 7;
+    var entries = filtered.slice(0, maxEntries);
 
-        def chg_fmt(v):
-            return f"+{int(v):,}" if v > 0 else f"{int(v):,}"
+    // ── Header: Spot, R1, PCR ──
+    var elSpot = document.getElementById('nlfSpot');
+    if (elSpot) elSpot.textContent = latest.spot_price ? latest.spot_price.toLocaleString('en-IN', {minimumFractionDigits:2, maximumFractionDigits:2}) : '—';
+    var elPCR = document.getElementById('nlfPCR');
+    if (elPCR) elPCR.textContent = latest.pcr || '—';
+    var elR1 = document.getElementById('nlfR1');
+    if (elR1) {
+        var nlabel = latest.nearest_label || 'R1';
+        var nval = latest.nearest_level ? '₹' + latest.nearest_level.toLocaleString('en-IN') : '—';
+        elR1.innerHTML = nlabel + ' <b>' + nval + '</b>';
+    }
 
-        # ── Build CE rows ──
-        ce_rows = ''
-        for i, row in ce_top5.iterrows():
-            strike   = int(row['Strike'])
-            oi_val   = int(row['CE_OI'])
-            oi_chg   = row['CE_OI_Change']
-            ltp      = row['CE_LTP']
-            vol      = row['CE_Vol']
-            bar_w    = round(oi_val / ce_max_oi * 100)
-            stype, sc, sbg, sbdr = strike_type(strike, atm)
-            rank_bg  = 'rgba(255,51,85,0.2)' if i == 0 else 'rgba(255,255,255,0.05)'
-            ce_rows += f"""
-                <tr style="border-bottom:1px solid rgba(255,255,255,0.04);">
-                  <td style="padding:9px 10px;text-align:center;">
-                    <span style="display:inline-flex;align-items:center;justify-content:center;width:22px;height:22px;border-radius:5px;background:{rank_bg};font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;color:#ff3355;">{i+1}</span>
-                  </td>
-                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;font-weight:700;color:#e2eaf5;">&#8377;{strike:,}</td>
-                  <td style="padding:9px 10px;">
-                    <span style="font-size:9px;padding:2px 7px;border-radius:4px;font-family:'JetBrains Mono',monospace;font-weight:700;
-                                 color:{sc};background:{sbg};border:1px solid {sbdr};">{stype}</span>
-                  </td>
-                  <td style="padding:9px 14px 9px 10px;min-width:130px;">
-                    <div style="font-family:'JetBrains Mono',monospace;font-size:13px;font-weight:700;color:#ff3355;margin-bottom:4px;">{fmt_oi(oi_val)}</div>
-                    <div style="height:3px;background:rgba(255,255,255,0.06);border-radius:99px;overflow:hidden;">
-                      <div style="height:100%;width:{bar_w}%;background:linear-gradient(90deg,#ff3355,#ff6b6b);border-radius:99px;"></div>
-                    </div>
-                  </td>
-                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;color:{chg_color(oi_chg)};">{chg_fmt(oi_chg)}</td>
-                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;color:#c8d8e0;">&#8377;{ltp:.2f}</td>
-                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;color:#8faabe;">{fmt_vol(vol)}</td>
-                </tr>"""
+    // ── Signal Badges ──
+    var badges = document.getElementById('nlfBadges');
+    if (badges) {
+        var bHtml = '';
+        var sig = (latest.opt_signal || '').toUpperCase();
+        var isBuy = sig.indexOf('BUY') >= 0;
+        var isSell = sig.indexOf('SELL') >= 0;
+        if (isBuy) bHtml += '<span class="nlf-badge nlf-badge-buy">Signal ▲ BUY</span>';
+        else if (isSell) bHtml += '<span class="nlf-badge nlf-badge-sell">Signal ▼ SELL</span>';
+        else bHtml += '<span class="nlf-badge nlf-badge-info">Signal → Neutral</span>';
 
-        # ── Build PE rows ──
-        pe_rows = ''
-        for i, row in pe_top5.iterrows():
-            strike   = int(row['Strike'])
-            oi_val   = int(row['PE_OI'])
-            oi_chg   = row['PE_OI_Change']
-            ltp      = row['PE_LTP']
-            vol      = row['PE_Vol']
-            bar_w    = round(oi_val / pe_max_oi * 100)
-            stype, sc, sbg, sbdr = strike_type(strike, atm)
-            rank_bg  = 'rgba(0,230,118,0.18)' if i == 0 else 'rgba(255,255,255,0.05)'
-            pe_rows += f"""
-                <tr style="border-bottom:1px solid rgba(255,255,255,0.04);">
-                  <td style="padding:9px 10px;text-align:center;">
-                    <span style="display:inline-flex;align-items:center;justify-content:center;width:22px;height:22px;border-radius:5px;background:{rank_bg};font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;color:#00e676;">{i+1}</span>
-                  </td>
-                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;font-weight:700;color:#e2eaf5;">&#8377;{strike:,}</td>
-                  <td style="padding:9px 10px;">
-                    <span style="font-size:9px;padding:2px 7px;border-radius:4px;font-family:'JetBrains Mono',monospace;font-weight:700;
-                                 color:{sc};background:{sbg};border:1px solid {sbdr};">{stype}</span>
-                  </td>
-                  <td style="padding:9px 14px 9px 10px;min-width:130px;">
-                    <div style="font-family:'JetBrains Mono',monospace;font-size:13px;font-weight:700;color:#00e676;margin-bottom:4px;">{fmt_oi(oi_val)}</div>
-                    <div style="height:3px;background:rgba(255,255,255,0.06);border-radius:99px;overflow:hidden;">
-                      <div style="height:100%;width:{bar_w}%;background:linear-gradient(90deg,#00e676,#69f0ae);border-radius:99px;"></div>
-                    </div>
-                  </td>
-                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;color:{chg_color(oi_chg)};">{chg_fmt(oi_chg)}</td>
-                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;color:#c8d8e0;">&#8377;{ltp:.2f}</td>
-                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;color:#8faabe;">{fmt_vol(vol)}</td>
-                </tr>"""
+        var emaSig = latest.ema_signal;
+        if (emaSig === 'BUY') bHtml += '<span class="nlf-badge nlf-badge-buy">EMA 5/13 ▲ BUY</span>';
+        else if (emaSig === 'SELL') bHtml += '<span class="nlf-badge nlf-badge-sell">EMA 5/13 ▼ SELL</span>';
 
-        th_style = "padding:8px 10px;font-family:'JetBrains Mono',monospace;font-size:9px;letter-spacing:1.5px;text-transform:uppercase;color:#8faabe;font-weight:600;border-bottom:1px solid rgba(255,255,255,0.06);"
+        // Streak
+        var streakCount = 1;
+        for (var si = 1; si < filtered.length; si++) {
+            if ((filtered[si].opt_signal || '').toUpperCase() === sig) streakCount++;
+            else break;
+        }
+        bHtml += '<span class="nlf-badge nlf-badge-warn">Streak *' + streakCount + '</span>';
 
-        return f"""
-<style>
-.top10-oi-widget {{ background:#060d18;border:1px solid rgba(0,200,255,0.1);border-radius:14px;overflow:hidden;margin-bottom:4px;font-family:'JetBrains Mono',monospace; }}
-.top10-oi-header {{ display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:8px;padding:11px 18px;background:rgba(0,0,0,0.3);border-bottom:1px solid rgba(0,200,255,0.08); }}
-.top10-oi-header-left {{ display:flex;align-items:center;gap:10px; }}
-.top10-oi-header-right {{ display:flex;align-items:center;gap:8px;flex-wrap:wrap; }}
-.top10-oi-grid {{ display:grid;grid-template-columns:1fr 1fr;gap:0; }}
-.top10-oi-table {{ width:100%;border-collapse:collapse;overflow-x:auto;display:block; }}
-.top10-oi-sub-header {{ display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:4px;padding:8px 12px; }}
-@media(max-width:900px) {{
-  .top10-oi-grid {{ grid-template-columns:1fr !important; }}
-  .top10-oi-ce-panel {{ border-right:none !important;border-bottom:1px solid rgba(255,255,255,0.06); }}
-  .top10-oi-header {{ padding:8px 12px; }}
-  .top10-oi-sub-header span:last-child {{ display:none; }}
-}}
-@media(max-width:600px) {{
-  .top10-oi-table th:nth-child(3),
-  .top10-oi-table td:nth-child(3),
-  .top10-oi-table th:nth-child(6),
-  .top10-oi-table td:nth-child(6) {{ display:none; }}
-}}
-</style>
-<div class="top10-oi-widget">
+        // RSI
+        var rsi = latest.rsi_15m;
+        if (rsi != null) {
+            var rsiCls = rsi >= 70 ? 'nlf-badge-danger' : rsi <= 30 ? 'nlf-badge-buy' : 'nlf-badge-info';
+            bHtml += '<span class="nlf-badge ' + rsiCls + '">RSI 15m ' + rsi.toFixed(1) + '</span>';
+        }
+
+        // VWAP
+        var vwapVal = latest.vwap;
+        var spot = latest.spot_price || 0;
+        if (vwapVal && vwapVal > 0) {
+            var aboveVwap = spot >= vwapVal;
+            bHtml += '<span class="nlf-badge ' + (aboveVwap ? 'nlf-badge-buy' : 'nlf-badge-danger') + '">VWAP ' + (aboveVwap ? 'Above' : 'Below') + '</span>';
+        }
+
+        // Distance
+        if (latest.distance_pts != null && latest.nearest_level) {
+            bHtml += '<span class="nlf-badge nlf-badge-info">Dist ' + (latest.distance_pts >= 0 ? '+' : '') + Math.round(latest.distance_pts) + ' pts</span>';
+        }
+
+        // Confluence badge for NLF
+        var nlfCBuy = 0, nlfCSell = 0, nlfCT = 0;
+        var nlfPcr = parseFloat(latest.pcr) || 0;
+        if (nlfPcr > 0) { nlfCT++; if (nlfPcr > 1.0) nlfCBuy++; else if (nlfPcr < 0.9) nlfCSell++; }
+        var nlfOi = (latest.opt_signal || '').toUpperCase();
+        if (nlfOi.indexOf('BUY') >= 0) { nlfCT++; nlfCBuy++; } else if (nlfOi.indexOf('SELL') >= 0) { nlfCT++; nlfCSell++; } else { nlfCT++; }
+        if (latest.vwap && latest.vwap > 0 && spot > 0) { nlfCT++; if (spot >= latest.vwap) nlfCBuy++; else nlfCSell++; }
+        if (rsi != null) { nlfCT++; if (rsi >= 55) nlfCBuy++; else if (rsi <= 45) nlfCSell++; }
+        if (latest.ema_signal === 'BUY') { nlfCT++; nlfCBuy++; } else if (latest.ema_signal === 'SELL') { nlfCT++; nlfCSell++; }
+        var nlfCMax = Math.max(nlfCBuy, nlfCSell);
+        var nlfCDir = nlfCBuy > nlfCSell ? 'BUY' : (nlfCSell > nlfCBuy ? 'SELL' : 'MIXED');
+        var nlfCCls = nlfCMax >= 4 ? (nlfCDir === 'BUY' ? 'nlf-badge-buy' : 'nlf-badge-sell') : nlfCMax >= 3 ? (nlfCDir === 'BUY' ? 'nlf-badge-buy' : 'nlf-badge-danger') : 'nlf-badge-warn';
+        bHtml += '<span class="nlf-badge ' + nlfCCls + '">⚡ ' + nlfCMax + '/' + nlfCT + ' ' + (nlfCMax >= 3 ? nlfCDir : 'WEAK') + '</span>';
+
+        badges.innerHTML = bHtml;
+    }
 
-  <!-- ── Widget Header ── -->
-  <div class="top10-oi-header">
-    <div class="top10-oi-header-left">
-      <div style="width:32px;height:32px;background:rgba(255,255,255,0.05);border:1px solid rgba(255,255,255,0.1);border-radius:8px;display:flex;align-items:center;justify-content:center;font-size:14px;flex-shrink:0;">&#9651;</div>
-      <div>
-        <div style="font-size:12px;font-weight:700;color:#e2eaf5;letter-spacing:1px;">TOP 10 OPEN INTEREST</div>
-        <div style="font-size:9px;color:#8faabe;letter-spacing:1px;margin-top:1px;">NIFTY &middot; &plusmn;10 STRIKES FROM ATM &middot; HIGHEST OI IN WINDOW</div>
-      </div>
-    </div>
-    <div class="top10-oi-header-right">
-      <div style="font-size:10px;padding:4px 12px;border-radius:6px;background:rgba(255,51,85,0.12);border:1px solid rgba(255,51,85,0.3);color:#ff3355;font-weight:700;">5 CE</div>
-      <div style="font-size:10px;padding:4px 14px;border-radius:6px;background:rgba(0,212,255,0.1);border:1px solid rgba(0,212,255,0.3);color:#00d4ff;font-weight:700;">ATM &#8377;{atm:,}</div>
-      <div style="font-size:10px;padding:4px 12px;border-radius:6px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.3);color:#00e676;font-weight:700;">5 PE</div>
-      <div style="width:8px;height:8px;border-radius:50%;background:#00e676;box-shadow:0 0 6px #00e676;flex-shrink:0;"></div>
-    </div>
-  </div>
+    // ── Table rows ──
+    var html = '';
+    entries.forEach(function(row, idx) {
+        var isLive = (idx === 0);
+        var t = row.time || '';
 
-  <!-- ── Two-column table layout ── -->
-  <div class="top10-oi-grid">
+        // Spot
+        var spotStr = row.spot_price ? row.spot_price.toLocaleString('en-IN', {minimumFractionDigits:2, maximumFractionDigits:2}) : '';
+        if (isLive) spotStr = '';
 
-    <!-- LEFT: CE Table -->
-    <div class="top10-oi-ce-panel" style="border-right:1px solid rgba(255,255,255,0.05);">
-      <div class="top10-oi-sub-header" style="background:rgba(255,51,85,0.04);border-bottom:1px solid rgba(255,51,85,0.12);">
-        <div style="display:flex;align-items:center;gap:6px;">
-          <div style="width:7px;height:7px;border-radius:50%;background:#ff3355;box-shadow:0 0 5px #ff3355;flex-shrink:0;"></div>
-          <span style="font-size:11px;font-weight:700;color:#ff3355;letter-spacing:1px;">TOP 5 CALL OPTIONS (CE)</span>
-        </div>
-        <span style="font-size:9px;color:#8faabe;letter-spacing:1px;">10 STRIKES ABOVE ATM</span>
-      </div>
-      <table class="top10-oi-table">
-        <thead>
-          <tr style="background:rgba(0,0,0,0.2);">
-            <th style="{th_style}text-align:center;">#</th>
-            <th style="{th_style}">Strike</th>
-            <th style="{th_style}">Type</th>
-            <th style="{th_style}">Open Interest</th>
-            <th style="{th_style}">Chg OI</th>
-            <th style="{th_style}">LTP</th>
-            <th style="{th_style}">Volume</th>
-          </tr>
-        </thead>
-        <tbody>{ce_rows}</tbody>
-      </table>
-    </div>
+        // Delta
+        var prevRow = entries[idx + 1];
+        var spotDelta = (prevRow && prevRow.spot_price && row.spot_price)
+            ? Math.round((row.spot_price - prevRow.spot_price) * 10) / 10
+            : null;
+        var dHtml;
+        if (spotDelta === null) {
+            dHtml = '<span style="color:rgba(176,190,197,0.25);">—</span>';
+        } else if (spotDelta >= 0) {
+            dHtml = '<span style="color:#00e676;">▲+' + spotDelta.toFixed(1) + '</span>';
+        } else {
+            dHtml = '<span style="color:#ff4757;">▼' + spotDelta.toFixed(1) + '</span>';
+        }
 
-    <!-- RIGHT: PE Table -->
-    <div>
-      <div class="top10-oi-sub-header" style="background:rgba(0,230,118,0.04);border-bottom:1px solid rgba(0,230,118,0.12);">
-        <div style="display:flex;align-items:center;gap:6px;">
-          <div style="width:7px;height:7px;border-radius:50%;background:#00e676;box-shadow:0 0 5px #00e676;flex-shrink:0;"></div>
-          <span style="font-size:11px;font-weight:700;color:#00e676;letter-spacing:1px;">TOP 5 PUT OPTIONS (PE)</span>
-        </div>
-        <span style="font-size:9px;color:#8faabe;letter-spacing:1px;">10 STRIKES BELOW ATM</span>
-      </div>
-      <table class="top10-oi-table">
-        <thead>
-          <tr style="background:rgba(0,0,0,0.2);">
-            <th style="{th_style}text-align:center;">#</th>
-            <th style="{th_style}">Strike</th>
-            <th style="{th_style}">Type</th>
-            <th style="{th_style}">Open Interest</th>
-            <th style="{th_style}">Chg OI</th>
-            <th style="{th_style}">LTP</th>
-            <th style="{th_style}">Volume</th>
-          </tr>
-        </thead>
-        <tbody>{pe_rows}</tbody>
-      </table>
-    </div>
+        // Nifty Move %
+        var nmp = row.nifty_move_pct;
+        var nmpHtml, nmpColor;
+        if (nmp == null) {
+            nmpHtml = '—'; nmpColor = 'rgba(176,190,197,0.25)';
+        } else {
+            nmpColor = nmp >= 0 ? '#00e676' : '#ff4757';
+            nmpHtml = '<span style="color:' + nmpColor + ';">' + (nmp >= 0 ? '+' : '') + nmp.toFixed(2) + '%</span>';
+        }
 
-  </div>
+        // VWAP gap (spot vs VWAP distance in points)
+        var vwapVal = row.vwap;
+        var spotVal = row.spot_price || 0;
+        var vwapHtml;
+        if (vwapVal && vwapVal > 0 && spotVal > 0) {
+            var vwapGap = Math.round(spotVal - vwapVal);
+            var aboveVwap = vwapGap >= 0;
+            var vwapColor = aboveVwap ? '#00e676' : '#ff4757';
+            var vwapArrow = aboveVwap ? '▲' : '▼';
+            vwapHtml = '<span style="color:' + vwapColor + ';font-size:12px;">' + vwapArrow + Math.abs(vwapGap) + '</span>';
+        } else {
+            vwapHtml = '<span style="color:rgba(176,190,197,0.25);">—</span>';
+        }
 
-  <!-- ── Footer ── -->
-  <div style="display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:6px;padding:7px 18px;background:rgba(0,0,0,0.25);border-top:1px solid rgba(0,200,255,0.06);">
-    <span style="font-size:9px;color:#8899aa;letter-spacing:1.5px;text-transform:uppercase;">Neon Ledger &middot; Top OI &middot; &plusmn;10 ATM Strikes Window</span>
-    <div style="display:flex;align-items:center;gap:5px;">
-      <div style="width:6px;height:6px;border-radius:50%;background:#00e676;box-shadow:0 0 5px #00e676;"></div>
-      <span style="font-size:9px;color:#00e676;letter-spacing:1px;">LIVE</span>
-    </div>
-  </div>
+        // Net OI diff (CE change - PE change)
+        var diff = row.diff;
+        var netOiHtml;
+        if (diff == null) {
+            netOiHtml = '<span style="color:rgba(176,190,197,0.25);">—</span>';
+        } else {
+            var absDiff = Math.abs(diff);
+            var diffSign = diff >= 0 ? '+' : '-';
+            var diffColor = diff >= 0 ? '#00e676' : '#ff4757';
+            var diffStr;
+            if (absDiff >= 10000000) diffStr = diffSign + (absDiff/10000000).toFixed(1) + 'Cr';
+            else if (absDiff >= 100000) diffStr = diffSign + (absDiff/100000).toFixed(1) + 'L';
+            else if (absDiff >= 1000) diffStr = diffSign + (absDiff/1000).toFixed(1) + 'K';
+            else diffStr = (diff >= 0 ? '+' : '') + diff;
+            netOiHtml = '<span style="color:' + diffColor + ';">' + diffStr + '</span>';
+        }
 
-</div>
-"""
+        // Streak
+        // Streak — count from full filtered data, not just visible entries
+        var sCount = 1;
+        var curSig = (row.opt_signal || '').toUpperCase();
+        for (var si = idx + 1; si < filtered.length; si++) {
+            if ((filtered[si].opt_signal || '').toUpperCase() === curSig) sCount++;
+            else break;
+        }
 
-    def _option_chain_pivot_section_html(self, d):
-        """
-        Renders TWO sub-panels:
-          1. Option Chain Analysis  — PCR, OI sentiment, Max Pain, Call/Put buildup, OI walls
-          2. Pivot Points (Traditional) — auto-calc from prev H/L/C stored in html_data
-        Placed between KEY LEVELS and FII/DII sections in the main tab.
-        """
-        # ── Option Chain panel values ─────────────────────────────────────────
-        pcr        = d.get('pcr', 0)
-        pcr_str    = f"{pcr:.2f}" if pcr else "N/A"
-        max_pain   = d.get('max_pain', 0)
-        ce_chg     = d.get('total_ce_oi_change', 0)
-        pe_chg     = d.get('total_pe_oi_change', 0)
-        oi_dir     = d.get('oi_direction', 'N/A')
-        oi_class   = d.get('oi_class', 'neutral')
-        max_ce     = d.get('max_ce_oi', 0)
-        max_pe     = d.get('max_pe_oi', 0)
+        // RSI
+        var rsiVal = row.rsi_15m;
+        var rsiHtml, rsiColor;
+        if (rsiVal == null) {
+            rsiHtml = '—'; rsiColor = 'rgba(176,190,197,0.25)';
+        } else {
+            rsiColor = rsiVal >= 70 ? '#ff4757' : rsiVal >= 55 ? '#69f0ae' : rsiVal <= 30 ? '#00e676' : rsiVal <= 45 ? '#fca5a5' : '#ffb74d';
+            rsiHtml = rsiVal.toFixed(1);
+        }
 
-        def _oi_color(cls):
-            return {'bullish':'#26c6da','bearish':'#f44336','neutral':'#ffb74d'}.get(cls,'#ffb74d')
+        // PCR
+        var pcrV = parseFloat(row.pcr) || 0;
+        var pcrColor = pcrV >= 1.1 ? '#00e676' : pcrV <= 0.9 ? '#ff4757' : '#ffb74d';
+        var pcrHtml = row.pcr ? '<span style="color:' + pcrColor + ';">' + row.pcr + '</span>' : '<span style="color:rgba(176,190,197,0.25);">—</span>';
 
-        oi_col = _oi_color(oi_class)
+        // Nearest Level
+        var isBuy = (row.opt_signal||'').toUpperCase().indexOf('BUY') >= 0;
+        var isSell = (row.opt_signal||'').toUpperCase().indexOf('SELL') >= 0;
+        var nlabel = row.nearest_label || (isBuy ? 'R1' : isSell ? 'S1' : '—');
+        var nval = row.nearest_level ? '₹' + Number(row.nearest_level).toLocaleString('en-IN') : '';
+        var levelHtml;
+        if (row.nearest_level) {
+            var lColor = isBuy ? '#00e676' : '#ff4757';
+            levelHtml = '<span style="color:' + lColor + ';font-size:11px;"><span style="font-size:9px;font-weight:800;opacity:0.7;">' + nlabel + '</span> ' + nval + '</span>';
+        } else {
+            levelHtml = '<span style="color:rgba(176,190,197,0.25);">—</span>';
+        }
 
-        # OI sentiment label
-        if oi_class == 'bullish':
-            sent_icon = '&#9650;'; sent_lbl = 'BULLISH'; sent_col = '#26c6da'
-        elif oi_class == 'bearish':
-            sent_icon = '&#9660;'; sent_lbl = 'BEARISH'; sent_col = '#f44336'
-        else:
-            sent_icon = '&#8596;'; sent_lbl = 'NEUTRAL'; sent_col = '#ffb74d'
+        // Confluence
+        var cBuy = 0, cSell = 0, cTotal = 0;
+        if (pcrV > 0) { cTotal++; if (pcrV > 1.0) cBuy++; else if (pcrV < 0.9) cSell++; }
+        var oiSig = (row.opt_signal||'').toUpperCase();
+        if (oiSig.indexOf('BUY') >= 0) { cTotal++; cBuy++; } else if (oiSig.indexOf('SELL') >= 0) { cTotal++; cSell++; } else if (oiSig === 'NEUTRAL') { cTotal++; }
+        var cVwap = row.vwap; var cSpot = row.spot_price || 0;
+        if (cVwap && cVwap > 0 && cSpot > 0) { cTotal++; if (cSpot >= cVwap) cBuy++; else cSell++; }
+        var cRsi = row.rsi_15m;
+        if (cRsi != null) { cTotal++; if (cRsi >= 55) cBuy++; else if (cRsi <= 45) cSell++; }
+        var cEma = row.ema_signal;
+        if (cEma === 'BUY') { cTotal++; cBuy++; } else if (cEma === 'SELL') { cTotal++; cSell++; }
+        var cMax = Math.max(cBuy, cSell);
+        var cDir = cBuy > cSell ? 'BUY' : (cSell > cBuy ? 'SELL' : 'MIXED');
+        var confColor, confLabel;
+        if (cTotal === 0) { confColor = 'rgba(176,190,197,0.3)'; confLabel = '—'; }
+        else if (cMax >= 4 && cDir === 'BUY') { confColor = '#00e676'; confLabel = '▲ ' + cMax + '/' + cTotal; }
+        else if (cMax >= 4 && cDir === 'SELL') { confColor = '#ff4757'; confLabel = '▼ ' + cMax + '/' + cTotal; }
+        else if (cMax >= 3 && cDir === 'BUY') { confColor = '#69f0ae'; confLabel = '▲ ' + cMax + '/' + cTotal; }
+        else if (cMax >= 3 && cDir === 'SELL') { confColor = '#fca5a5'; confLabel = '▼ ' + cMax + '/' + cTotal; }
+        else { confColor = '#ffb74d'; confLabel = '~ ' + cMax + '/' + cTotal; }
+        var confStrength = cMax >= 4 ? 'STRONG' : cMax >= 3 ? cDir : 'WEAK';
+        var confHtml = '<span style="color:' + confColor + ';font-size:12px;">' + confLabel + '</span>';
 
-        # CE / PE bar widths (proportional, max bar = 100%)
-        max_abs = max(abs(ce_chg), abs(pe_chg), 1)
-        ce_w    = round(abs(ce_chg) / max_abs * 100)
-        pe_w    = round(abs(pe_chg) / max_abs * 100)
-        ce_k    = f"{ce_chg/1000:+.0f}K" if ce_chg else "0"
-        pe_k    = f"{pe_chg/1000:+.0f}K" if pe_chg else "0"
-        ce_col  = '#f44336' if ce_chg >= 0 else '#26c6da'   # call build = bearish
-        pe_col  = '#26c6da' if pe_chg >= 0 else '#f44336'   # put build  = bullish
+        html += '<div class="nlf-row' + (isLive ? ' nlf-row-live' : '') + '">'
+            + '<span class="nlf-row-time">' + t + '</span>'
+            + '<span class="nlf-row-pcr">' + pcrHtml + '</span>'
+            + '<span class="nlf-row-delta">' + dHtml + '</span>'
+            + '<span class="nlf-row-vwap">' + vwapHtml + '</span>'
+            + '<span class="nlf-row-stk">*' + sCount + '</span>'
+            + '<span class="nlf-row-level">' + levelHtml + '</span>'
+            + '<span class="nlf-row-rsi" style="color:' + rsiColor + ';">' + rsiHtml + '</span>'
+            + '<span class="nlf-row-conf">' + confHtml + '</span>'
+            + '</div>';
+    });
+    body.innerHTML = html;
+
+    // ── Footer ──
+    var footer = document.getElementById('nlfFooter');
+    if (footer) {
+        var nmp0 = latest.nifty_move_pct;
+        var nmpFmt = (nmp0 != null) ? ((nmp0 >= 0 ? '+' : '') + nmp0.toFixed(2) + '% from prev close') : '';
+        var nmpFootColor = (nmp0 != null && nmp0 >= 0) ? '#00e676' : '#ff4757';
+        footer.innerHTML = '<span class="nlf-footer-left">' + filtered.length + ' candles &middot; signals active</span>'
+            + '<span class="nlf-footer-right" style="color:' + nmpFootColor + ';">▲ ' + nmpFmt + '</span>';
+    }
+}
+function fmtOI(n) {
+    var abs = Math.abs(n);
+    var sign = n >= 0 ? '+' : '-';
+    if (abs >= 10000000) return sign + (abs/10000000).toFixed(2) + ' Cr';
+    if (abs >= 100000)   return sign + (abs/100000).toFixed(2) + ' L';
+    if (n === 0) return '0';
+    return (n >= 0 ? '+' : '') + n.toLocaleString('en-IN');
+}
 
-        # Max CE / PE OI wall bars (proportional to each other)
-        wall_max = max(max_ce, max_pe, 1)
-        ce_wall_w = round(max_ce / wall_max * 100)
-        pe_wall_w = round(max_pe / wall_max * 100)
+function drawSparkline(data) {
+    var canvas = document.getElementById('oiSparklineCanvas');
+    if (!canvas || !canvas.getContext) return;
+    var dpr = window.devicePixelRatio || 1;
 
-        # ── R2 / S2: 2nd highest CE OI strike (resistance) and PE OI strike (support) ──
-        # Derived purely from the existing df — zero logic changes elsewhere
-        _df = d.get('df', None)
-        if _df is not None and not _df.empty and len(_df) >= 2:
-            _ce_sorted = _df.nlargest(2, 'CE_OI')
-            _pe_sorted = _df.nlargest(2, 'PE_OI')
-            max_ce_r2  = int(_ce_sorted.iloc[1]['Strike']) if len(_ce_sorted) > 1 else max_ce
-            max_pe_s2  = int(_pe_sorted.iloc[1]['Strike']) if len(_pe_sorted) > 1 else max_pe
-            max_ce_r2_val = int(_ce_sorted.iloc[1]['CE_OI']) if len(_ce_sorted) > 1 else 0
-            max_pe_s2_val = int(_pe_sorted.iloc[1]['PE_OI']) if len(_pe_sorted) > 1 else 0
-        else:
-            max_ce_r2 = max_ce; max_pe_s2 = max_pe
-            max_ce_r2_val = 0;  max_pe_s2_val = 0
+    var reversed = data.slice().reverse();
+    var diffs = reversed.map(function(r){ return r.diff || 0; });
+    if (diffs.length < 2) return;
 
-        # Bar widths for R2/S2 (relative to R1/S1 = 100%)
-        ce_wall_r2_w = round(max_ce_r2_val / max(_df['CE_OI'].max(), 1) * 100) if _df is not None and not _df.empty else 60
-        pe_wall_s2_w = round(max_pe_s2_val / max(_df['PE_OI'].max(), 1) * 100) if _df is not None and not _df.empty else 60
+    /* ── Stat boxes ── */
+    var latest = diffs[diffs.length - 1];
+    var high   = Math.max.apply(null, diffs);
+    var low    = Math.min.apply(null, diffs);
+    var isBull = latest >= 0;
+    var el;
+    el = document.getElementById('oiStatLatest');
+    if (el) { el.textContent = fmtOI(latest); el.style.color = isBull ? '#34d399' : '#f87171'; }
+    el = document.getElementById('oiStatHigh');   if (el) el.textContent = fmtOI(high);
+    el = document.getElementById('oiStatLow');    if (el) el.textContent = fmtOI(low);
+    el = document.getElementById('oiStatSignal');
+    if (el) { el.textContent = isBull ? 'BUY' : 'SELL'; el.style.color = isBull ? '#34d399' : '#f87171'; }
+    el = document.getElementById('oiStatSignalSub');
+    if (el) el.textContent = isBull ? 'Bias improving' : 'Bias declining';
 
-        pcr_badge_col = '#26c6da' if pcr > 1.0 else ('#f44336' if pcr < 0.8 else '#ffb74d')
+    /* ── Signal history bar ── */
+    var bar = document.getElementById('oiSignalBar');
+    if (bar) {
+        bar.innerHTML = '';
+        var absMax = Math.max(Math.abs(high), Math.abs(low)) || 1;
+        reversed.forEach(function(r) {
+            var seg = document.createElement('div');
+            seg.style.flex = '1';
+            seg.style.height = '100%';
+            seg.style.borderRadius = '1px';
+            seg.style.background = (r.diff || 0) >= 0 ? '#10b981' : '#ef4444';
+            seg.style.opacity = Math.abs(r.diff || 0) / absMax * 0.75 + 0.25;
+            bar.appendChild(seg);
+        });
+    }
 
-        oc_panel = "" if not d['has_option_data'] else f"""
-        <!-- ── Option Chain Analysis Sub-Panel · Sample 1 Command Terminal ── -->
-        <div style="background:#080f18;border:1px solid rgba(0,200,255,0.15);border-radius:6px;flex:1;min-width:280px;overflow:hidden;">
+    /* ── Canvas sizing ── */
+    var wrap = canvas.parentElement;
+    var W = wrap ? wrap.clientWidth : 600;
+    var H = 300;
+    canvas.width  = W * dpr;
+    canvas.height = H * dpr;
+    canvas.style.width  = W + 'px';
+    canvas.style.height = H + 'px';
+    var ctx = canvas.getContext('2d');
+    ctx.scale(dpr, dpr);
+    ctx.clearRect(0, 0, W, H);
 
-            <!-- header bar -->
-            <div style="display:flex;align-items:center;justify-content:space-between;padding:10px 16px;background:rgba(0,0,0,0.5);border-bottom:1px solid rgba(0,200,255,0.1);">
-                <span style="font-family:'Space Mono',monospace;font-size:10px;letter-spacing:3px;color:#00c8ff;text-transform:uppercase;">&#11043; Option Chain Analysis</span>
-                <span style="font-family:'Space Mono',monospace;font-size:8px;padding:2px 8px;border-radius:2px;background:rgba(0,200,255,0.08);border:1px solid rgba(0,200,255,0.2);color:rgba(0,200,255,0.7);letter-spacing:1px;">NIFTY &middot; LIVE</span>
-            </div>
+    var padT = 16, padB = 20, padL = 4, padR = 16;
+    var cW = W - padL - padR;
+    var cH = H - padT - padB;
+    var n  = diffs.length;
 
-            <div style="padding:16px;">
+    var minV  = Math.min.apply(null, diffs.concat([0]));
+    var maxV  = Math.max.apply(null, diffs.concat([0]));
+    var range = (maxV - minV) || 1;
 
-                <!-- PCR / Sentiment / MaxPain stats row -->
-                <div style="display:grid;grid-template-columns:1fr 1fr 1fr;gap:1px;background:rgba(0,200,255,0.06);border-radius:4px;overflow:hidden;margin-bottom:14px;">
-                    <div style="background:rgba(0,8,16,0.9);padding:14px 16px;">
-                        <div style="font-family:'Space Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(0,200,255,0.6);text-transform:uppercase;margin-bottom:8px;">Put / Call</div>
-                        <div style="font-family:'Orbitron',monospace;font-size:28px;font-weight:700;line-height:1;color:{pcr_badge_col};text-shadow:0 0 16px {pcr_badge_col}99;">{pcr_str}</div>
-                        <div style="font-family:'Space Mono',monospace;font-size:9px;color:rgba(200,216,224,0.6);margin-top:6px;">PCR RATIO</div>
-                    </div>
-                    <div style="background:rgba(0,8,16,0.9);padding:14px 16px;">
-                        <div style="font-family:'Space Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(0,200,255,0.6);text-transform:uppercase;margin-bottom:8px;">OI Sentiment</div>
-                        <div style="font-family:'Orbitron',monospace;font-size:22px;font-weight:700;line-height:1;color:{sent_col};text-shadow:0 0 16px {sent_col}99;">{sent_icon} {sent_lbl}</div>
-                        <div style="font-family:'Space Mono',monospace;font-size:9px;color:rgba(200,216,224,0.6);margin-top:6px;">{oi_dir}</div>
-                    </div>
-                    <div style="background:rgba(0,8,16,0.9);padding:14px 16px;">
-                        <div style="font-family:'Space Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(0,200,255,0.6);text-transform:uppercase;margin-bottom:8px;">Max Pain</div>
-                        <div style="font-family:'Orbitron',monospace;font-size:22px;font-weight:700;line-height:1;color:#ffd700;text-shadow:0 0 16px rgba(255,215,0,0.5);">&#8377;{max_pain:,}</div>
-                        <div style="font-family:'Space Mono',monospace;font-size:9px;color:rgba(200,216,224,0.6);margin-top:6px;">Expiry magnet</div>
-                    </div>
-                </div>
+    function toX(i) { return padL + (i / (n - 1)) * cW; }
+    function toY(v) { return padT + (1 - (v - minV) / range) * cH; }
+    var zeroY = toY(0);
 
-                <!-- OI Direction bars -->
-                <div style="margin-bottom:14px;">
-                    <div style="font-family:'Space Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(0,200,255,0.6);text-transform:uppercase;margin-bottom:10px;display:flex;align-items:center;gap:8px;">
-                        OI DIRECTION <span style="flex:1;height:1px;background:rgba(0,200,255,0.12);display:inline-block;"></span>
-                    </div>
-                    <div style="display:flex;align-items:center;gap:10px;margin-bottom:10px;">
-                        <div style="font-family:'Space Mono',monospace;font-size:11px;font-weight:700;color:#ff4d6d;width:26px;flex-shrink:0;">CE</div>
-                        <div style="flex:1;height:7px;background:rgba(255,255,255,0.06);position:relative;overflow:hidden;">
-                            <div style="height:100%;width:{ce_w}%;background:linear-gradient(90deg,rgba(255,77,109,0.4),#ff4d6d);position:relative;">
-                                <span style="position:absolute;right:0;top:0;bottom:0;width:2px;background:#ff4d6d;filter:brightness(2);box-shadow:0 0 8px #ff4d6d;"></span>
-                            </div>
-                        </div>
-                        <div style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#ff6b85;width:64px;text-align:right;flex-shrink:0;">{ce_k}</div>
-                    </div>
-                    <div style="display:flex;align-items:center;gap:10px;">
-                        <div style="font-family:'Space Mono',monospace;font-size:11px;font-weight:700;color:#00e676;width:26px;flex-shrink:0;">PE</div>
-                        <div style="flex:1;height:7px;background:rgba(255,255,255,0.06);position:relative;overflow:hidden;">
-                            <div style="height:100%;width:{pe_w}%;background:linear-gradient(90deg,rgba(0,230,118,0.4),#00e676);position:relative;">
-                                <span style="position:absolute;right:0;top:0;bottom:0;width:2px;background:#00e676;filter:brightness(2);box-shadow:0 0 8px #00e676;"></span>
-                            </div>
-                        </div>
-                        <div style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#00e676;width:64px;text-align:right;flex-shrink:0;">{pe_k}</div>
-                    </div>
-                </div>
+    /* ── Grid lines (5 levels) ── */
+    var gridCount = 5;
+    for (var g = 0; g <= gridCount; g++) {
+        var gv = minV + (range / gridCount) * g;
+        var gy = toY(gv);
+        ctx.beginPath();
+        ctx.strokeStyle = (Math.abs(gv) < range * 0.02)
+            ? 'rgba(79,195,247,0.3)' : 'rgba(79,195,247,0.07)';
+        ctx.lineWidth = (Math.abs(gv) < range * 0.02) ? 1 : 0.5;
+        if (Math.abs(gv) < range * 0.02) ctx.setLineDash([6, 4]);
+        else ctx.setLineDash([]);
+        ctx.moveTo(padL, gy); ctx.lineTo(W - padR, gy);
+        ctx.stroke();
+    }
+    ctx.setLineDash([]);
 
-                <!-- OI Resistance Walls -->
-                <div style="margin-bottom:12px;">
-                    <div style="font-family:'Space Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(0,200,255,0.6);text-transform:uppercase;margin-bottom:10px;display:flex;align-items:center;gap:8px;">
-                        OI RESISTANCE WALLS <span style="flex:1;height:1px;background:rgba(0,200,255,0.12);display:inline-block;"></span>
-                    </div>
-                    <div style="display:flex;align-items:center;gap:10px;padding:8px 0;border-bottom:1px solid rgba(0,200,255,0.06);">
-                        <span style="font-family:'Space Mono',monospace;font-size:10px;font-weight:700;padding:3px 8px;border-radius:2px;background:rgba(255,77,109,0.15);color:#ff4d6d;border:1px solid rgba(255,77,109,0.35);width:32px;text-align:center;flex-shrink:0;">R1</span>
-                        <div style="flex:1;height:6px;background:rgba(255,255,255,0.04);">
-                            <div style="height:100%;width:{ce_wall_w}%;background:linear-gradient(90deg,rgba(255,77,109,0.3),#ff4d6d);box-shadow:0 0 6px rgba(255,77,109,0.3);"></div>
-                        </div>
-                        <span style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#ff6b85;flex-shrink:0;min-width:80px;text-align:right;">&#8377;{max_ce:,}</span>
-                    </div>
-                    <div style="display:flex;align-items:center;gap:10px;padding:8px 0;">
-                        <span style="font-family:'Space Mono',monospace;font-size:10px;font-weight:700;padding:3px 8px;border-radius:2px;background:rgba(255,77,109,0.08);color:rgba(255,100,130,0.85);border:1px solid rgba(255,77,109,0.2);width:32px;text-align:center;flex-shrink:0;">R2</span>
-                        <div style="flex:1;height:6px;background:rgba(255,255,255,0.04);">
-                            <div style="height:100%;width:{ce_wall_r2_w}%;background:linear-gradient(90deg,rgba(255,77,109,0.15),rgba(255,77,109,0.7));"></div>
-                        </div>
-                        <span style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:rgba(255,143,163,0.85);flex-shrink:0;min-width:80px;text-align:right;">&#8377;{max_ce_r2:,}</span>
-                    </div>
-                </div>
+    /* ── Colored fill segments ── */
+    for (var i = 0; i < n - 1; i++) {
+        var x0 = toX(i),   y0 = toY(diffs[i]);
+        var x1 = toX(i+1), y1 = toY(diffs[i+1]);
+        var pos0 = diffs[i]   >= 0;
+        var pos1 = diffs[i+1] >= 0;
+        if (pos0 === pos1) {
+            ctx.beginPath();
+            ctx.moveTo(x0, zeroY); ctx.lineTo(x0, y0);
+            ctx.lineTo(x1, y1);   ctx.lineTo(x1, zeroY);
+            ctx.closePath();
+            ctx.fillStyle = pos0 ? 'rgba(16,185,129,0.25)' : 'rgba(239,68,68,0.25)';
+            ctx.fill();
+        } else {
+            var ratio = Math.abs(diffs[i]) / (Math.abs(diffs[i]) + Math.abs(diffs[i+1]));
+            var xMid  = x0 + ratio * (x1 - x0);
+            ctx.beginPath();
+            ctx.moveTo(x0, zeroY); ctx.lineTo(x0, y0); ctx.lineTo(xMid, zeroY);
+            ctx.closePath();
+            ctx.fillStyle = pos0 ? 'rgba(16,185,129,0.25)' : 'rgba(239,68,68,0.25)';
+            ctx.fill();
+            ctx.beginPath();
+            ctx.moveTo(xMid, zeroY); ctx.lineTo(x1, y1); ctx.lineTo(x1, zeroY);
+            ctx.closePath();
+            ctx.fillStyle = pos1 ? 'rgba(16,185,129,0.25)' : 'rgba(239,68,68,0.25)';
+            ctx.fill();
+        }
+    }
 
-                <!-- OI Support Floors -->
-                <div>
-                    <div style="font-family:'Space Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(0,200,255,0.6);text-transform:uppercase;margin-bottom:10px;display:flex;align-items:center;gap:8px;">
-                        OI SUPPORT FLOORS <span style="flex:1;height:1px;background:rgba(0,200,255,0.12);display:inline-block;"></span>
-                    </div>
-                    <div style="display:flex;align-items:center;gap:10px;padding:8px 0;border-bottom:1px solid rgba(0,200,255,0.06);">
-                        <span style="font-family:'Space Mono',monospace;font-size:10px;font-weight:700;padding:3px 8px;border-radius:2px;background:rgba(0,230,118,0.15);color:#00e676;border:1px solid rgba(0,230,118,0.35);width:32px;text-align:center;flex-shrink:0;">S1</span>
-                        <div style="flex:1;height:6px;background:rgba(255,255,255,0.04);">
-                            <div style="height:100%;width:{pe_wall_w}%;background:linear-gradient(90deg,rgba(0,230,118,0.3),#00e676);box-shadow:0 0 6px rgba(0,230,118,0.3);"></div>
-                        </div>
-                        <span style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#00e676;flex-shrink:0;min-width:80px;text-align:right;">&#8377;{max_pe:,}</span>
-                    </div>
-                    <div style="display:flex;align-items:center;gap:10px;padding:8px 0;">
-                        <span style="font-family:'Space Mono',monospace;font-size:10px;font-weight:700;padding:3px 8px;border-radius:2px;background:rgba(0,230,118,0.08);color:rgba(0,200,100,0.85);border:1px solid rgba(0,230,118,0.2);width:32px;text-align:center;flex-shrink:0;">S2</span>
-                        <div style="flex:1;height:6px;background:rgba(255,255,255,0.04);">
-                            <div style="height:100%;width:{pe_wall_s2_w}%;background:linear-gradient(90deg,rgba(0,230,118,0.15),rgba(0,230,118,0.7));"></div>
-                        </div>
-                        <span style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:rgba(105,240,174,0.85);flex-shrink:0;min-width:80px;text-align:right;">&#8377;{max_pe_s2:,}</span>
-                    </div>
-                </div>
+    /* ── Stroke line ── */
+    for (var i = 0; i < n - 1; i++) {
+        var bothPos = diffs[i] >= 0 && diffs[i+1] >= 0;
+        var bothNeg = diffs[i] <  0 && diffs[i+1] <  0;
+        ctx.beginPath();
+        ctx.strokeStyle = bothPos ? '#34d399' : bothNeg ? '#f87171' : '#fbbf24';
+        ctx.lineWidth = 2; ctx.lineJoin = 'round';
+        ctx.moveTo(toX(i),   toY(diffs[i]));
+        ctx.lineTo(toX(i+1), toY(diffs[i+1]));
+        ctx.stroke();
+    }
 
-            </div>
-        </div>"""
+    /* ── Glowing endpoint ── */
+    var lx = toX(n-1), ly = toY(diffs[n-1]);
+    var dotCol = diffs[n-1] >= 0 ? '#34d399' : '#f87171';
+    ctx.beginPath(); ctx.arc(lx, ly, 9, 0, Math.PI*2);
+    ctx.fillStyle = dotCol + '22'; ctx.fill();
+    ctx.beginPath(); ctx.arc(lx, ly, 5, 0, Math.PI*2);
+    ctx.fillStyle = dotCol; ctx.fill();
 
-        # ── Pivot Points (Traditional) calculation ────────────────────────────
-        ph = d.get('prev_high', 0)
-        pl = d.get('prev_low', 0)
-        pc = d.get('prev_close', 0)
-        cp = d.get('current_price', 0)
+    /* ── Y-axis labels ── */
+    var yEl = document.getElementById('oiYLabels');
+    if (yEl) {
+        yEl.innerHTML = '';
+        for (var g = gridCount; g >= 0; g--) {
+            var gv  = minV + (range / gridCount) * g;
+            var lbl = document.createElement('div');
+            lbl.className   = 'oi-y-label';
+            lbl.style.color = gv >= 0 ? 'rgba(52,211,153,0.4)' : 'rgba(248,113,113,0.4)';
+            lbl.textContent = fmtOI(Math.round(gv));
+            yEl.appendChild(lbl);
+        }
+    }
+
+    /* ── X-axis time labels ── */
+    var xEl = document.getElementById('oiXLabels');
+    if (xEl) {
+        xEl.innerHTML = '';
+        var xStep = Math.max(1, Math.floor(n / 6));
+        reversed.forEach(function(r, i) {
+            if (i % xStep === 0 || i === n - 1) {
+                var sp = document.createElement('span');
+                sp.className   = 'oi-x-label';
+                sp.textContent = r.time || '';
+                xEl.appendChild(sp);
+            }
+        });
+    }
 
-        if ph and pl and pc:
-            pp = round((ph + pl + pc) / 3, 2)
-            r1p = round(2 * pp - pl, 2)
-            r2p = round(pp + (ph - pl), 2)
-            r3p = round(ph + 2 * (pp - pl), 2)
-            s1p = round(2 * pp - ph, 2)
-            s2p = round(pp - (ph - pl), 2)
-            s3p = round(pl - 2 * (ph - pp), 2)
-        else:
-            pp = r1p = r2p = r3p = s1p = s2p = s3p = 0
+    /* ── Tooltip + Crosshair ── */
+    var tooltip   = document.getElementById('oiChartTooltip');
+    var crosshair = document.getElementById('oiCrosshair');
 
-        # ── Dynamic NEAREST R: lowest R level strictly ABOVE LTP ─────────────
-        r_levels = [('R1', r1p), ('R2', r2p), ('R3', r3p)]
-        above_r  = [(lbl, val) for lbl, val in r_levels if val > cp]
-        nearest_r_lbl = above_r[0][0] if above_r else 'R3'
-        nearest_r_val = dict(r_levels)[nearest_r_lbl]
+    canvas.onmousemove = function(e) {
+        if (!tooltip || !crosshair) return;
+        var rect = canvas.getBoundingClientRect();
+        var mx   = e.clientX - rect.left;
+        var idx  = Math.round((mx - padL) / cW * (n - 1));
+        if (idx < 0 || idx >= n) {
+            tooltip.style.display = 'none';
+            crosshair.style.display = 'none';
+            return;
+        }
+        var row = reversed[idx];
+        var dv  = row.diff || 0;
+        var dc  = dv >= 0 ? '#34d399' : '#f87171';
 
-        # ── Dynamic NEAREST S: highest level strictly BELOW LTP ──────────────
-        s_candidates = [('R1', r1p), ('PP', pp), ('S1', s1p), ('S2', s2p), ('S3', s3p)]
-        below_s  = [(lbl, val) for lbl, val in s_candidates if val < cp]
-        nearest_s_lbl = below_s[0][0] if below_s else 'S1'
-        nearest_s_val = dict(s_candidates)[nearest_s_lbl]
+        crosshair.style.display = 'block';
+        crosshair.style.left    = toX(idx) + 'px';
 
-        # Position of LTP on the bar — uses NEAREST S and NEAREST R (not hardcoded S1/R1)
-        if nearest_r_val and nearest_s_val and nearest_r_val != nearest_s_val:
-            ltp_pct = round(max(3, min(97, (cp - nearest_s_val) / (nearest_r_val - nearest_s_val) * 100)), 1)
-        else:
-            ltp_pct = 50
-        pp_dist = round(cp - pp, 2) if pp else 0
-        # pp_dist = LTP minus PP  →  positive means LTP is ABOVE PP
-        pp_dist_sign = '+' if pp_dist >= 0 else ''
-        pp_dist_lbl  = f"{pp_dist_sign}{pp_dist:.2f} from PP"
+        var ttTime = document.getElementById('oiTTTime');
+        var ttDiff = document.getElementById('oiTTDiff');
+        var ttCE   = document.getElementById('oiTTCE');
+        var ttPE   = document.getElementById('oiTTPE');
+        var ttSig  = document.getElementById('oiTTSignal');
+        if (ttTime) ttTime.textContent = (row.time || '') + ' IST';
+        if (ttDiff) { ttDiff.textContent = fmtOI(dv); ttDiff.style.color = dc; }
+        if (ttCE)   ttCE.textContent   = fmtOI(row.call_oi_chg || 0);
+        if (ttPE)   ttPE.textContent   = fmtOI(row.put_oi_chg  || 0);
+        if (ttSig)  { ttSig.textContent = dv >= 0 ? 'BUY' : 'SELL'; ttSig.style.color = dc; }
 
-        # ── Zone detection (which pivot band does LTP sit in) ─────────────────
-        if pp and r3p and r2p and r1p and s1p and s2p and s3p:
-            if   cp >= r3p: zone_lbl = "Above R3";          zone_col = "#ff1744"; zone_dot = "#ff1744"
-            elif cp >= r2p: zone_lbl = "Between R2 and R3"; zone_col = "#ff4d6d"; zone_dot = "#ff4d6d"
-            elif cp >= r1p: zone_lbl = "Between R1 and R2"; zone_col = "#ff6b85"; zone_dot = "#ff6b85"
-            elif cp >= s1p: zone_lbl = "Between S1 and R1"; zone_col = "#4fc3f7"; zone_dot = "#26c6da"
-            elif cp >= s2p: zone_lbl = "Between S2 and S1"; zone_col = "#26c6da"; zone_dot = "#26c6da"
-            elif cp >= s3p: zone_lbl = "Between S3 and S2"; zone_col = "#00bcd4"; zone_dot = "#00bcd4"
-            else:           zone_lbl = "Below S3";          zone_col = "#00e676"; zone_dot = "#00e676"
-        else:
-            zone_lbl = "N/A"; zone_col = "#8faabe"; zone_dot = "#8faabe"
+        var wrapW = wrap ? wrap.clientWidth : W;
+        var tx    = toX(idx) + 14;
+        if (tx + 175 > wrapW) tx = toX(idx) - 189;
+        tooltip.style.left    = tx + 'px';
+        tooltip.style.top     = '10px';
+        tooltip.style.display = 'block';
+    };
 
-        pp_above_below = "above PP" if pp_dist >= 0 else "below PP"
+    canvas.onmouseleave = function() {
+        if (tooltip)   tooltip.style.display   = 'none';
+        if (crosshair) crosshair.style.display = 'none';
+    };
+}
 
-        pv_panel = f"""
-        <!-- ── Pivot Points Widget · Neon Runway · Phantom Slate Edition ── -->
-        <div style="background:#060d15;border:1px solid rgba(0,200,255,0.18);border-radius:6px;flex:1;min-width:320px;overflow:hidden;font-family:'Space Mono',monospace;">
+function _oiFetched() {
+    var now = new Date(new Date().toLocaleString('en-US',{timeZone:'Asia/Kolkata'}));
+    var el  = document.getElementById('oiLastFetch');
+    if (el) el.textContent = 'Last fetch: ' + String(now.getHours()).padStart(2,'0') + ':' + String(now.getMinutes()).padStart(2,'0') + ':' + String(now.getSeconds()).padStart(2,'0') + ' IST';
+}
 
-            <!-- ── TOP BANNER ─────────────────────────────────────────────── -->
-            <div style="background:rgba(0,25,45,0.95);border-bottom:1px solid rgba(0,200,255,0.2);padding:9px 18px;display:flex;align-items:center;justify-content:center;gap:10px;">
-                <span style="color:rgba(0,200,255,0.5);font-size:9px;">&#9658;</span>
-                <span style="font-size:9px;letter-spacing:3px;color:#00c8ff;font-weight:700;text-transform:uppercase;">PIVOT POINTS (TRADITIONAL - DAILY)</span>
-                <span style="color:rgba(0,200,255,0.5);font-size:9px;">&#9658;</span>
-            </div>
+/* OI tab: renders from the DataHub cache (the hub does the fetching) */
+function loadOILog() {
+    if (_oiData.length) renderOITable(_oiData);
+    else DataHub.loadOI();
+}
 
-            <div style="padding:16px 18px;">
+DataHub.on('oi', function(data) {
+    _oiData = data;
+    loadOIRollup(_oiInterval, function(){ renderOITable(data); });
+    _oiFetched();
+});
+DataHub.on('oi-error', function() {
+    if (_oiData.length) return;
+    var tbody = document.getElementById('oiTableBody');
+    if (tbody) tbody.innerHTML = '<tr><td colspan="15" class="oi-empty-state">&#9888; Could not load oi_log.json</td></tr>';
+});
 
-                <!-- ── TITLE ROW ───────────────────────────────────────────── -->
-                <div style="display:flex;align-items:center;justify-content:space-between;margin-bottom:3px;">
-                    <div style="display:flex;align-items:center;gap:8px;">
-                        <span style="font-size:14px;">&#128205;</span>
-                        <span style="font-size:12px;font-weight:700;color:#e2eaf5;letter-spacing:1.5px;">PIVOT POINTS</span>
-                    </div>
-                    <span style="font-size:8px;font-weight:700;padding:3px 10px;border-radius:3px;background:rgba(0,200,255,0.12);border:1px solid rgba(0,200,255,0.35);color:#00c8ff;letter-spacing:2px;">DAILY</span>
-                </div>
-                <div style="font-size:9px;color:rgba(200,216,224,0.75);letter-spacing:1px;margin-bottom:16px;">Traditional Method &middot; Daily Candle &middot; Auto-calculated</div>
+window.addEventListener('load', function(){
+    if (window.location.hash === '#oi-trend') { switchTab('oi-trend'); }
+    // Auto-select first strategy row so Trade Plan is pre-filled
+    var firstRow = document.querySelector('.sc-row');
+    if (firstRow) { selectStrat(firstRow); }
+});
+/* Strategy tab swapped in place → pre-fill the Trade Plan again */
+DataHub.on('sections', function(names) {
+    if (names.indexOf('checklist_tab') < 0) return;
+    var firstRow = document.querySelector('.sc-row');
+    if (firstRow) { selectStrat(firstRow); }
+});
 
-                <!-- ── PROGRESS BAR (S1 ─── LTP ──→ R1) ──────────────────── -->
-                <div style="position:relative;height:8px;background:linear-gradient(90deg,#00e676 0%,#00c8a0 30%,#4fc3f7 55%,#ff6b85 80%,#f44336 100%);border-radius:4px;margin-bottom:10px;box-shadow:0 0 8px rgba(0,200,255,0.2);">
-                    <div style="position:absolute;left:{ltp_pct}%;top:50%;transform:translate(-50%,-50%);width:16px;height:16px;border-radius:50%;background:#0a1929;border:2.5px solid #00c8ff;box-shadow:0 0 12px rgba(0,200,255,0.9);z-index:5;"></div>
-                </div>
-                <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:8px;">
-                    <!-- NEAREST SUPPORT (left) -->
-                    <div style="text-align:left;">
-                        <div style="font-size:8px;font-weight:700;color:#26c6da;letter-spacing:1px;margin-bottom:2px;">&#9660; NEAREST SUPPORT</div>
-                        <div style="font-family:'Orbitron',monospace;font-size:13px;font-weight:800;color:#00e676;">&#8377;{nearest_s_val:,.2f} <span style="font-size:9px;font-weight:700;padding:1px 6px;border-radius:2px;background:rgba(0,230,118,0.15);border:1px solid rgba(0,230,118,0.4);color:#00e676;">{nearest_s_lbl}</span></div>
-                    </div>
-                    <!-- LTP centre -->
-                    <div style="text-align:center;">
-                        <div style="font-size:8px;font-weight:700;color:rgba(200,216,224,0.6);letter-spacing:1px;margin-bottom:2px;">CURRENT</div>
-                        <div style="font-size:14px;font-weight:800;color:#e2eaf5;">&#9650; &#8377;{cp:,.2f} <span style="background:rgba(0,200,255,0.18);border:1px solid rgba(0,200,255,0.45);border-radius:2px;padding:2px 7px;color:#00c8ff;font-size:10px;font-weight:700;letter-spacing:1px;">LTP</span></div>
-                    </div>
-                    <!-- NEAREST RESISTANCE (right) -->
-                    <div style="text-align:right;">
-                        <div style="font-size:8px;font-weight:700;color:#f44336;letter-spacing:1px;margin-bottom:2px;">NEAREST RESISTANCE &#9650;</div>
-                        <div style="font-family:'Orbitron',monospace;font-size:13px;font-weight:800;color:#ff6b85;"><span style="font-size:9px;font-weight:700;padding:1px 6px;border-radius:2px;background:rgba(255,77,109,0.15);border:1px solid rgba(255,77,109,0.4);color:#ff4d6d;">{nearest_r_lbl}</span> &#8377;{nearest_r_val:,.2f}</div>
-                    </div>
-                </div>
+window.addEventListener('resize', function(){
+    if (_oiData.length > 0) drawSparkline(oiSeries(_oiData, _oiInterval));
+});
 
-                <!-- ── ZONE LABEL + PP DISTANCE ───────────────────────────── -->
-                <div style="display:flex;justify-content:space-between;align-items:center;background:rgba(0,200,255,0.04);border:1px solid rgba(0,200,255,0.1);border-radius:3px;padding:7px 12px;margin-bottom:14px;">
-                    <span style="font-size:9px;color:{zone_col};display:flex;align-items:center;gap:6px;font-weight:700;">
-                        <span style="width:7px;height:7px;border-radius:50%;background:{zone_dot};display:inline-block;flex-shrink:0;box-shadow:0 0 6px {zone_dot};"></span>
-                        {zone_lbl}
-                    </span>
-                    <span style="font-size:9px;font-weight:600;color:rgba(200,216,224,0.85);">{'+' if pp_dist >= 0 else ''}{pp_dist:.2f} {pp_above_below}</span>
-                </div>
+/* ══ SIDEBAR NAV JS ══════════════════════════════════════════════ */
+var _nsbCollapsed = false;
+var _nsbActiveId  = 'signals';
+var _currentTab   = 'main';   /* ← tracks active tab so navSidebarTo works correctly */
 
-                <!-- ── PREV HIGH / LOW / CLOSE ─────────────────────────────── -->
-                <div style="display:grid;grid-template-columns:1fr 1fr 1fr;gap:1px;background:rgba(0,200,255,0.08);border-radius:4px;overflow:hidden;margin-bottom:14px;">
-                    <div style="background:#07111c;padding:10px 12px;">
-                        <div style="font-size:9px;letter-spacing:1.5px;font-weight:600;color:rgba(252,165,165,0.9);margin-bottom:5px;display:flex;align-items:center;gap:4px;">
-                            <span style="color:#fca5a5;">&#9650;</span> PREV HIGH
-                        </div>
-                        <div style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#fca5a5;">&#8377;{ph:,.2f}</div>
-                    </div>
-                    <div style="background:#07111c;padding:10px 12px;border-left:1px solid rgba(0,200,255,0.07);border-right:1px solid rgba(0,200,255,0.07);">
-                        <div style="font-size:9px;letter-spacing:1.5px;font-weight:600;color:rgba(134,239,172,0.9);margin-bottom:5px;display:flex;align-items:center;gap:4px;">
-                            <span style="color:#86efac;">&#9660;</span> PREV LOW
-                        </div>
-                        <div style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#86efac;">&#8377;{pl:,.2f}</div>
-                    </div>
-                    <div style="background:#07111c;padding:10px 12px;">
-                        <div style="font-size:9px;letter-spacing:1.5px;font-weight:600;color:rgba(200,216,224,0.85);margin-bottom:5px;display:flex;align-items:center;gap:4px;">
-                            <span style="color:#94a3b8;">&#9679;</span> PREV CLOSE
-                        </div>
-                        <div style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#c9d1d9;">&#8377;{pc:,.2f}</div>
-                    </div>
-                </div>
+/* Patch switchTab to keep _currentTab in sync */
+var _origSwitchTab = switchTab;
+switchTab = function(tab) {
+    _origSwitchTab(tab);
+    _currentTab = tab;
+};
 
-                <!-- ── MAIN 3-COLUMN GRID: R Levels | Pivot Centre | S Levels ── -->
-                <div style="display:grid;grid-template-columns:1fr 130px 1fr;gap:1px;background:rgba(0,200,255,0.08);border-radius:4px;overflow:hidden;">
+function _scrollToSec(secId) {
+    var target = document.getElementById('sec-' + secId);
+    if (!target) {
+        window.scrollTo({ top: 0, behavior: 'smooth' });
+        return;
+    }
+    /* Get height of sticky bars so we don't hide section title behind them */
+    var offset = 0;
+    var mobBar = document.getElementById('nsbMobBar');
+    if (mobBar && mobBar.offsetParent !== null) {
+        offset += mobBar.offsetHeight;
+    }
+    var header = document.querySelector('.header');
+    /* Header is NOT sticky, so no need to add it */
+    var rect   = target.getBoundingClientRect();
+    var absTop = rect.top + window.pageYOffset - offset - 8;
+    window.scrollTo({ top: absTop, behavior: 'smooth' });
+}
 
-                    <!-- LEFT: Resistance R3 / R2 / R1 — NEAREST R is dynamic -->
-                    <div style="background:#07111c;padding:12px 14px;">
-                        <!-- R3 -->
-                        <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;border-bottom:1px solid rgba(255,77,109,0.07);{'background:rgba(255,77,109,0.06);border-radius:2px;' if nearest_r_lbl=='R3' else ''}">
-                            <div style="display:flex;align-items:center;gap:5px;flex-wrap:wrap;">
-                                <span style="font-size:9px;font-weight:700;padding:2px 7px;border-radius:2px;background:rgba(255,77,109,{'0.18' if nearest_r_lbl=='R3' else '0.05'});color:{'#ff4d6d' if nearest_r_lbl=='R3' else 'rgba(255,100,130,0.5)'};border:1px solid rgba(255,77,109,{'0.4' if nearest_r_lbl=='R3' else '0.12'});">R3</span>
-                                {'<span style="font-size:7px;font-weight:700;padding:1px 5px;border-radius:2px;background:rgba(255,77,109,0.1);border:1px solid rgba(255,77,109,0.28);color:#ff6b85;letter-spacing:0.5px;">NEAREST R</span>' if nearest_r_lbl=='R3' else ''}
-                            </div>
-                            <div style="display:flex;align-items:center;gap:4px;">
-                                <span style="font-family:'Orbitron',monospace;font-size:{'14' if nearest_r_lbl=='R3' else '12'}px;font-weight:700;color:{'#ff6b85' if nearest_r_lbl=='R3' else 'rgba(255,143,163,0.5)'};">&#8377;{r3p:,.2f}</span>
-                                {'<span style="color:#ff6b85;font-size:11px;">&#9650;</span>' if nearest_r_lbl=='R3' else ''}
-                            </div>
-                        </div>
-                        <!-- R2 -->
-                        <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;border-bottom:1px solid rgba(255,77,109,0.1);{'background:rgba(255,77,109,0.06);border-radius:2px;' if nearest_r_lbl=='R2' else ''}">
-                            <div style="display:flex;align-items:center;gap:5px;flex-wrap:wrap;">
-                                <span style="font-size:9px;font-weight:700;padding:2px 7px;border-radius:2px;background:rgba(255,77,109,{'0.18' if nearest_r_lbl=='R2' else '0.08'});color:{'#ff4d6d' if nearest_r_lbl=='R2' else 'rgba(255,100,130,0.8)'};border:1px solid rgba(255,77,109,{'0.4' if nearest_r_lbl=='R2' else '0.18'});">R2</span>
-                                {'<span style="font-size:7px;font-weight:700;padding:1px 5px;border-radius:2px;background:rgba(255,77,109,0.1);border:1px solid rgba(255,77,109,0.28);color:#ff6b85;letter-spacing:0.5px;">NEAREST R</span>' if nearest_r_lbl=='R2' else ''}
-                            </div>
-                            <div style="display:flex;align-items:center;gap:4px;">
-                                <span style="font-family:'Orbitron',monospace;font-size:{'14' if nearest_r_lbl=='R2' else '13'}px;font-weight:700;color:{'#ff6b85' if nearest_r_lbl=='R2' else 'rgba(255,143,163,0.85)'};">&#8377;{r2p:,.2f}</span>
-                                {'<span style="color:#ff6b85;font-size:11px;">&#9650;</span>' if nearest_r_lbl=='R2' else ''}
-                            </div>
-                        </div>
-                        <!-- R1 -->
-                        <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;{'background:rgba(255,77,109,0.04);border-radius:2px;margin-top:1px;' if nearest_r_lbl=='R1' else 'margin-top:1px;'}">
-                            <div style="display:flex;align-items:center;gap:5px;flex-wrap:wrap;">
-                                <span style="font-size:9px;font-weight:700;padding:2px 7px;border-radius:2px;background:rgba(255,77,109,{'0.18' if nearest_r_lbl=='R1' else '0.06'});color:{'#ff4d6d' if nearest_r_lbl=='R1' else 'rgba(255,100,130,0.45)'};border:1px solid rgba(255,77,109,{'0.4' if nearest_r_lbl=='R1' else '0.15'});">R1</span>
-                                {'<span style="font-size:7px;font-weight:700;padding:1px 5px;border-radius:2px;background:rgba(255,77,109,0.1);border:1px solid rgba(255,77,109,0.28);color:#ff6b85;letter-spacing:0.5px;">NEAREST R</span>' if nearest_r_lbl=='R1' else ''}
-                            </div>
-                            <div style="display:flex;align-items:center;gap:4px;">
-                                <span style="font-family:'Orbitron',monospace;font-size:{'14' if nearest_r_lbl=='R1' else '12'}px;font-weight:700;color:{'#ff6b85' if nearest_r_lbl=='R1' else 'rgba(255,143,163,0.38)'};">&#8377;{r1p:,.2f}</span>
-                                {'<span style="color:#ff6b85;font-size:11px;">&#9650;</span>' if nearest_r_lbl=='R1' else ''}
-                            </div>
-                        </div>
-                    </div>
+function toggleNavSidebar() {
+    _nsbCollapsed = !_nsbCollapsed;
+    var sb = document.getElementById('navSidebar');
+    if (sb) sb.classList.toggle('collapsed', _nsbCollapsed);
+}
 
-                    <!-- CENTRE: Pivot Point + NEAREST R + LTP -->
-                    <div style="background:#040c14;padding:10px 8px;display:flex;flex-direction:column;align-items:center;justify-content:space-between;gap:6px;border-left:1px solid rgba(79,195,247,0.14);border-right:1px solid rgba(79,195,247,0.14);">
+function navSidebarTo(secId, tabId) {
+    /* 1. Switch tab if needed */
+    if (tabId !== _currentTab) {
+        switchTab(tabId);
+    }
+    /* 2. Set active sidebar item */
+    document.querySelectorAll('.nsb-item').forEach(function(el){ el.classList.remove('active'); });
+    var activeEl = document.getElementById('nsi-' + secId);
+    if (activeEl) activeEl.classList.add('active');
+    _nsbActiveId = secId;
+    /* 3. Scroll after tab paint — 150ms is reliable across browsers */
+    setTimeout(function(){ _scrollToSec(secId); }, 150);
+}
 
-                        <!-- Pivot Point block -->
-                        <div style="text-align:center;width:100%;">
-                            <div style="font-size:8px;letter-spacing:2px;font-weight:700;color:#4fc3f7;text-transform:uppercase;margin-bottom:4px;">PIVOT POINT</div>
-                            <div style="font-family:'Orbitron',monospace;font-size:15px;font-weight:900;color:#4fc3f7;text-shadow:0 0 12px rgba(79,195,247,0.6);line-height:1;">&#8377;{pp:,.2f}</div>
-                            <div style="font-size:9px;font-weight:700;color:{'#00e676' if pp_dist >= 0 else '#f44336'};margin-top:4px;">LTP {pp_dist_sign}{pp_dist:.2f} pts {'above' if pp_dist >= 0 else 'below'} PP</div>
-                        </div>
+function openNsbDrawer()  { document.getElementById('nsbDrawer').classList.add('open'); }
+function closeNsbDrawer() { document.getElementById('nsbDrawer').classList.remove('open'); }
 
-                        <!-- NEAREST R block — highlighted in red -->
-                        <div style="width:100%;background:rgba(255,77,109,0.1);border:1px solid rgba(255,77,109,0.38);border-radius:3px;padding:7px 8px;text-align:center;">
-                            <div style="font-size:8px;letter-spacing:1.5px;font-weight:700;color:#ff6b85;margin-bottom:4px;">&#9650; NEXT RES ({nearest_r_lbl})</div>
-                            <div style="font-family:'Orbitron',monospace;font-size:13px;font-weight:800;color:#ff4d6d;text-shadow:0 0 10px rgba(255,77,109,0.5);line-height:1;">&#8377;{dict(r_levels)[nearest_r_lbl]:,.2f}</div>
-                            <div style="font-size:9px;font-weight:700;color:#fca5a5;margin-top:4px;">+{round(dict(r_levels)[nearest_r_lbl]-cp,2):,.2f} pts away</div>
-                        </div>
+function mobNavTo(secId, tabId, label) {
+    /* Update mobile drawer active state */
+    document.querySelectorAll('.nsb-mob-item').forEach(function(el){ el.classList.remove('active'); });
+    var el = document.getElementById('nsmd-' + secId);
+    if (el) el.classList.add('active');
+    /* Update mobile title bar */
+    var titleEl = document.getElementById('nsbMobTitle');
+    if (titleEl) titleEl.innerHTML = label;
+    /* Close drawer first, then switch + scroll */
+    closeNsbDrawer();
+    /* Sync desktop sidebar active state */
+    document.querySelectorAll('.nsb-item').forEach(function(el){ el.classList.remove('active'); });
+    var deskEl = document.getElementById('nsi-' + secId);
+    if (deskEl) deskEl.classList.add('active');
+    _nsbActiveId = secId;
+    /* Switch tab if needed */
+    if (tabId !== _currentTab) { switchTab(tabId); }
+    /* Scroll after drawer close animation + tab paint */
+    setTimeout(function(){ _scrollToSec(secId); }, 200);
+}
+"""
 
-                        <!-- LTP chip -->
-                        <div style="background:rgba(79,195,247,0.12);border:1px solid rgba(79,195,247,0.35);border-radius:3px;padding:6px 8px;text-align:center;width:100%;">
-                            <div style="font-size:8px;letter-spacing:2px;font-weight:700;color:#00c8ff;margin-bottom:3px;">LTP</div>
-                            <div style="font-family:'Orbitron',monospace;font-size:13px;font-weight:700;color:#80deea;">&#8377;{cp:,.2f}</div>
-                        </div>
 
-                    </div>
+# ═══════════════════════════════════════════════════════════════════════════════
+#  OPTION CHAIN — columnar model of the full chain
+# ═══════════════════════════════════════════════════════════════════════════════
 
-                    <!-- RIGHT: Support S1 / S2 / S3 — NEAREST S is dynamic -->
-                    <div style="background:#07111c;padding:12px 14px;">
-                        <!-- S1 -->
-                        <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;{'background:rgba(0,230,118,0.04);border-radius:2px;' if nearest_s_lbl=='S1' else ''}margin-bottom:1px;">
-                            <div style="display:flex;align-items:center;gap:4px;">
-                                {'<span style="color:#26c6da;font-size:11px;">&#9660;</span>' if nearest_s_lbl=='S1' else ''}
-                                {'<span style="font-size:7px;font-weight:700;padding:1px 5px;border-radius:2px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.28);color:#00e676;letter-spacing:0.5px;">NEAREST S</span>' if nearest_s_lbl=='S1' else ''}
-                            </div>
-                            <div style="display:flex;align-items:center;gap:4px;">
-                                <span style="font-size:9px;font-weight:700;padding:2px 7px;border-radius:2px;background:rgba(0,230,118,{'0.18' if nearest_s_lbl=='S1' else '0.06'});color:{'#00e676' if nearest_s_lbl=='S1' else 'rgba(0,200,100,0.5)'};border:1px solid rgba(0,230,118,{'0.4' if nearest_s_lbl=='S1' else '0.15'});">S1</span>
-                                <span style="font-family:'Orbitron',monospace;font-size:{'14' if nearest_s_lbl=='S1' else '12'}px;font-weight:700;color:{'#00e676' if nearest_s_lbl=='S1' else 'rgba(105,240,174,0.45)'};">&#8377;{s1p:,.2f}</span>
-                            </div>
-                        </div>
-                        <!-- S2 -->
-                        <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;border-bottom:1px solid rgba(0,230,118,0.1);border-top:1px solid rgba(0,230,118,0.07);{'background:rgba(0,230,118,0.04);border-radius:2px;' if nearest_s_lbl=='S2' else ''}">
-                            <div style="display:flex;align-items:center;gap:4px;">
-                                {'<span style="color:#26c6da;font-size:11px;">&#9660;</span>' if nearest_s_lbl=='S2' else ''}
-                                {'<span style="font-size:7px;font-weight:700;padding:1px 5px;border-radius:2px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.28);color:#00e676;letter-spacing:0.5px;">NEAREST S</span>' if nearest_s_lbl=='S2' else ''}
-                            </div>
-                            <div style="display:flex;align-items:center;gap:4px;">
-                                <span style="font-size:9px;font-weight:700;padding:2px 7px;border-radius:2px;background:rgba(0,230,118,{'0.18' if nearest_s_lbl=='S2' else '0.08'});color:{'#00e676' if nearest_s_lbl=='S2' else 'rgba(0,200,100,0.8)'};border:1px solid rgba(0,230,118,{'0.4' if nearest_s_lbl=='S2' else '0.18'});">S2</span>
-                                <span style="font-family:'Orbitron',monospace;font-size:{'14' if nearest_s_lbl=='S2' else '13'}px;font-weight:700;color:{'#00e676' if nearest_s_lbl=='S2' else 'rgba(105,240,174,0.85)'};">&#8377;{s2p:,.2f}</span>
-                            </div>
-                        </div>
-                        <!-- S3 -->
-                        <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;{'background:rgba(0,230,118,0.04);border-radius:2px;' if nearest_s_lbl=='S3' else ''}">
-                            <div style="display:flex;align-items:center;gap:4px;">
-                                {'<span style="color:#26c6da;font-size:11px;">&#9660;</span>' if nearest_s_lbl=='S3' else ''}
-                                {'<span style="font-size:7px;font-weight:700;padding:1px 5px;border-radius:2px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.28);color:#00e676;letter-spacing:0.5px;">NEAREST S</span>' if nearest_s_lbl=='S3' else ''}
-                            </div>
-                            <div style="display:flex;align-items:center;gap:4px;">
-                                <span style="font-size:9px;font-weight:700;padding:2px 7px;border-radius:2px;background:rgba(0,230,118,{'0.18' if nearest_s_lbl=='S3' else '0.05'});color:{'#00e676' if nearest_s_lbl=='S3' else 'rgba(0,230,118,0.5)'};border:1px solid rgba(0,230,118,{'0.4' if nearest_s_lbl=='S3' else '0.12'});">S3</span>
-                                <span style="font-family:'Orbitron',monospace;font-size:{'14' if nearest_s_lbl=='S3' else '12'}px;font-weight:700;color:{'#00e676' if nearest_s_lbl=='S3' else 'rgba(105,240,174,0.45)'};">&#8377;{s3p:,.2f}</span>
-                            </div>
-                        </div>
-                    </div>
+ATM_WINDOW = 10    # strikes either side of ATM shown in the report
 
-                </div>
-            </div>
+class OptionChain:
+    """
+    The whole chain for one expiry, one NumPy array per field, sorted by strike.
+    window(n) returns ATM±n as another OptionChain whose arrays are slices
+    (views) of these, so the full chain and the report window share memory.
+    """
+    # field -> (side, key in NSE records.data, dtype)
+    FIELDS = {
+        'ce_ltp':    ('CE', 'lastPrice',            np.float64),
+        'ce_oi':     ('CE', 'openInterest',         np.int64),
+        'ce_oi_chg': ('CE', 'changeinOpenInterest', np.int64),
+        'ce_vol':    ('CE', 'totalTradedVolume',    np.int64),
+        'ce_iv':     ('CE', 'impliedVolatility',    np.float64),
+        'pe_ltp':    ('PE', 'lastPrice',            np.float64),
+        'pe_oi':     ('PE', 'openInterest',         np.int64),
+        'pe_oi_chg': ('PE', 'changeinOpenInterest', np.int64),
+        'pe_vol':    ('PE', 'totalTradedVolume',    np.int64),
+        'pe_iv':     ('PE', 'impliedVolatility',    np.float64),
+    }
+    # Column names of the legacy per-strike DataFrame used by the report sections
+    FRAME_COLUMNS = {
+        'strike': 'Strike', 'ce_ltp': 'CE_LTP', 'ce_oi': 'CE_OI', 'ce_vol': 'CE_Vol',
+        'pe_ltp': 'PE_LTP', 'pe_oi': 'PE_OI', 'pe_vol': 'PE_Vol',
+        'ce_oi_chg': 'CE_OI_Change', 'pe_oi_chg': 'PE_OI_Change',
+        'ce_iv': 'CE_IV', 'pe_iv': 'PE_IV',
+    }
 
-            <!-- ── FOOTER BAR ──────────────────────────────────────────────── -->
-            <div style="background:rgba(0,0,0,0.45);border-top:1px solid rgba(0,200,255,0.1);padding:8px 18px;display:flex;justify-content:space-between;align-items:center;">
-                <span style="font-size:9px;font-weight:600;color:rgba(200,216,224,0.65);letter-spacing:1px;">Traditional &middot; Daily Candle</span>
-                <span style="font-size:9px;color:rgba(79,195,247,0.6);font-weight:700;letter-spacing:1px;">LTP &#8377;{cp:,.2f}</span>
-            </div>
+    def __init__(self, expiry, underlying, columns, atm_idx):
+        self.expiry     = expiry
+        self.underlying = underlying
+        self.columns    = columns          # name -> np.ndarray, all the same length
+        self.atm_idx    = atm_idx
+        self.strike     = columns['strike']
+
+    def __len__(self):
+        return len(self.strike)
+
+    def __getattr__(self, name):
+        columns = self.__dict__.get('columns', {})
+        if name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    @property
+    def atm_strike(self):
+        return int(self.strike[self.atm_idx]) if len(self) else 0
+
+    @classmethod
+    def from_records(cls, records, expiry, underlying):
+        """Parses NSE records.data straight into columns — no per-strike dicts."""
+        n = len(records)
+        strike  = np.zeros(n, dtype=np.int64)
+        columns = {name: np.zeros(n, dtype=dt) for name, (_, _, dt) in cls.FIELDS.items()}
+        fields  = [(columns[name], side, key) for name, (side, key, _) in cls.FIELDS.items()]
+        for i, item in enumerate(records):
+            strike[i] = item.get('strikePrice') or 0
+            legs = {'CE': item.get('CE') or {}, 'PE': item.get('PE') or {}}
+            for arr, side, key in fields:
+                arr[i] = legs[side].get(key) or 0
+        return cls._build(expiry, underlying, strike, columns)
+
+    @classmethod
+    def from_frame(cls, df, expiry, underlying):
+        """Builds a chain from a legacy per-strike DataFrame (missing columns → 0)."""
+        strike  = df['Strike'].to_numpy(dtype=np.int64)
+        columns = {name: (df[col].to_numpy(dtype=cls.FIELDS[name][2]) if col in df
+                          else np.zeros(len(df), dtype=cls.FIELDS[name][2]))
+                   for name, col in cls.FRAME_COLUMNS.items() if name != 'strike'}
+        return cls._build(expiry, underlying, strike, columns)
+
+    @classmethod
+    def _build(cls, expiry, underlying, strike, columns):
+        order = np.argsort(strike, kind='stable')
+        columns = {name: arr[order] for name, arr in columns.items()}
+        columns['strike'] = strike = strike[order]
+        atm_idx = 0
+        if len(strike):
+            hits = np.flatnonzero(strike == round(underlying / 50) * 50)
+            atm_idx = int(hits[0]) if hits.size else int(np.argmin(np.abs(strike - underlying)))
+        return cls(expiry, underlying, columns, atm_idx)
+
+    def window(self, n=ATM_WINDOW):
+        """ATM±n strikes as a zero-copy view of this chain."""
+        lo = max(0, self.atm_idx - n)
+        hi = min(len(self), self.atm_idx + n + 1)
+        return OptionChain(self.expiry, self.underlying,
+                           {name: arr[lo:hi] for name, arr in self.columns.items()},
+                           self.atm_idx - lo)
+
+    def to_frame(self):
+        """Legacy per-strike DataFrame (Expiry, Strike, CE_LTP, CE_OI, ...)."""
+        df = pd.DataFrame({col: self.columns[name] for name, col in self.FRAME_COLUMNS.items()})
+        df.insert(0, 'Expiry', self.expiry)
+        return df
+
+    def metrics(self):
+        """PCR, OI totals/changes, OI walls and max pain over every strike in this chain."""
+        if not len(self):
+            return {'strikes': 0}
+        total_ce_oi,  total_pe_oi  = int(self.ce_oi.sum()),  int(self.pe_oi.sum())
+        total_ce_vol, total_pe_vol = int(self.ce_vol.sum()), int(self.pe_vol.sum())
+        ce_wall, pe_wall = int(np.argmax(self.ce_oi)), int(np.argmax(self.pe_oi))
+        max_pain, max_pain_curve = compute_max_pain(self.strike, self.ce_oi, self.pe_oi)
+        return {
+            'strikes':            len(self),
+            'strike_range':       (int(self.strike[0]), int(self.strike[-1])),
+            'total_ce_oi':        total_ce_oi,
+            'total_pe_oi':        total_pe_oi,
+            'pcr_oi':             total_pe_oi  / total_ce_oi  if total_ce_oi  > 0 else 0,
+            'pcr_volume':         total_pe_vol / total_ce_vol if total_ce_vol > 0 else 0,
+            'total_ce_oi_change': int(self.ce_oi_chg.sum()),
+            'total_pe_oi_change': int(self.pe_oi_chg.sum()),
+            'max_ce_oi_strike':   int(self.strike[ce_wall]), 'max_ce_oi_value': int(self.ce_oi[ce_wall]),
+            'max_pe_oi_strike':   int(self.strike[pe_wall]), 'max_pe_oi_value': int(self.pe_oi[pe_wall]),
+            'max_pain':           max_pain,
+            'max_pain_curve':     max_pain_curve,
+        }
 
-        </div>"""
 
-        return f"""
-    <div class="section">
-        <div class="section-title"><span>&#128204;</span> OPTION CHAIN &amp; PIVOT POINTS</div>
-        <div style="display:flex;gap:2px;flex-wrap:wrap;background:rgba(0,200,255,0.06);border:1px solid rgba(0,200,255,0.15);border-radius:6px;overflow:hidden;">
-            {oc_panel if d['has_option_data'] else '<div style="color:#8faabe;font-size:13px;padding:16px;">Option data unavailable</div>'}
-            {pv_panel}
-        </div>
-    </div>
-"""
+# Near week only by default. NIFTY_MULTI_EXPIRY=1 (or --multi-expiry) also fetches
+# the next MULTI_EXPIRY_WEEKLIES weeklies and the nearest monthly, concurrently.
+MULTI_EXPIRY          = os.environ.get("NIFTY_MULTI_EXPIRY", "").strip().lower() in ("1", "true", "yes", "on")
+MULTI_EXPIRY_WEEKLIES = 2      # next N weekly expiries fetched together (≤1 → near week only)
+MULTI_EXPIRY_MONTHLY  = True   # also fetch the nearest monthly expiry
+MULTI_EXPIRY_WORKERS  = 4
+CHAIN_ATTEMPTS        = 2      # tries per expiry
+CHAIN_HTTP_TIMEOUT    = 30     # seconds per try
+CHAIN_RETRY_SLEEP     = 2
 
-    def _key_levels_visual_section(self, d, _pct_cp, _pts_to_res, _pts_to_sup, _mp_node):
-        mp_row = f'<tr><td style="color:#ffb74d;">&#127919; Max Pain</td><td style="color:#ffb74d;">&#8377;{d["max_pain"]:,}</td></tr>' if d['has_option_data'] else ''
-        return f"""
-    <div class="section">
-        <div class="section-title"><span>&#128202;</span> KEY LEVELS</div>
+def option_chain_timeout(multi=None):
+    """
+    Worst-case seconds for fetch_nse_option_chain_silent(): the expiry list
+    (2 tries × 20 s), the expiry fetches (in rounds of MULTI_EXPIRY_WORKERS),
+    then up to two single-expiry fallbacks — each expiry CHAIN_ATTEMPTS tries.
+    """
+    multi    = MULTI_EXPIRY if multi is None else multi
+    expiries = MULTI_EXPIRY_WEEKLIES + MULTI_EXPIRY_MONTHLY if multi else 1
+    rounds   = -(-expiries // MULTI_EXPIRY_WORKERS)
+    per_try  = CHAIN_HTTP_TIMEOUT + CHAIN_RETRY_SLEEP
+    return 2 * (20 + CHAIN_RETRY_SLEEP) + (rounds + 2) * CHAIN_ATTEMPTS * per_try
 
-        <!-- Desktop/Tablet: visual bar (hidden on mobile <520px) -->
-        <div class="kl-bar-section">
-            <div style="display:flex;justify-content:space-between;margin-bottom:8px;">
-                <span style="font-size:11px;color:#26c6da;font-weight:700;letter-spacing:1px;">&#9668; SUPPORT ZONE</span>
-                <span style="font-size:11px;color:#f44336;font-weight:700;letter-spacing:1px;">RESISTANCE ZONE &#9658;</span>
-            </div>
-            <div style="position:relative;height:62px;">
-                <div class="rl-node-a" style="left:3%;"><div class="rl-lbl" style="color:#26c6da;">Strong<br>Support</div><div class="rl-val" style="color:#26c6da;">&#8377;{d['strong_support']:,.0f}</div><div class="rl-dot" style="background:#26c6da;margin:6px auto 0;"></div></div>
-                <div class="rl-node-a" style="left:22%;"><div class="rl-lbl" style="color:#00bcd4;">Support</div><div class="rl-val" style="color:#00bcd4;">&#8377;{d['support']:,.0f}</div><div class="rl-dot" style="background:#00bcd4;box-shadow:0 0 8px #00bcd4;margin:6px auto 0;"></div></div>
-                <div style="position:absolute;left:{_pct_cp}%;transform:translateX(-50%);bottom:4px;background:#4fc3f7;color:#000;font-size:11px;font-weight:700;padding:4px 13px;border-radius:6px;white-space:nowrap;z-index:10;box-shadow:0 0 16px rgba(79,195,247,0.7);">&#9660; NOW &nbsp;&#8377;{d['current_price']:,.0f}</div>
-                <div class="rl-node-a" style="left:75%;"><div class="rl-lbl" style="color:#ff7043;">Resistance</div><div class="rl-val" style="color:#ff7043;">&#8377;{d['resistance']:,.0f}</div><div class="rl-dot" style="background:#ff7043;box-shadow:0 0 8px #ff7043;margin:6px auto 0;"></div></div>
-                <div class="rl-node-a" style="left:95%;"><div class="rl-lbl" style="color:#f44336;">Strong<br>Resistance</div><div class="rl-val" style="color:#f44336;">&#8377;{d['strong_resistance']:,.0f}</div><div class="rl-dot" style="background:#f44336;margin:6px auto 0;"></div></div>
-            </div>
-            <div style="position:relative;height:8px;border-radius:4px;background:linear-gradient(90deg,#26c6da 0%,#00bcd4 20%,#4fc3f7 40%,#ffb74d 58%,#ff7043 76%,#f44336 100%);box-shadow:0 2px 14px rgba(0,0,0,0.5);">
-                <div style="position:absolute;left:{_pct_cp}%;top:50%;transform:translate(-50%,-50%);width:4px;height:22px;background:#fff;border-radius:2px;box-shadow:0 0 16px rgba(255,255,255,1);z-index:10;"></div>
-            </div>
-            <div style="position:relative;height:58px;">{_mp_node}</div>
-        </div>
+def select_expiries(expiries, weeklies=MULTI_EXPIRY_WEEKLIES, include_monthly=MULTI_EXPIRY_MONTHLY):
+    """
+    Picks the next `weeklies` expiries plus the nearest monthly one (the last
+    expiry of its calendar month) from NSE's ascending expiryDates list.
+    """
+    wanted = list(expiries[:max(1, weeklies)])
+    if include_monthly and weeklies > 1:
+        try:
+            dates = [datetime.strptime(e, '%d-%b-%Y') for e in expiries]
+            for i, d in enumerate(dates):
+                if i + 1 == len(dates) or (dates[i + 1].year, dates[i + 1].month) != (d.year, d.month):
+                    if expiries[i] not in wanted:
+                        wanted.append(expiries[i])
+                    break
+        except ValueError as e:
+            print(f"  ⚠️  Could not identify monthly expiry: {e}")
+    return wanted
+
+def compare_expiries(expiry_chains):
+    """Whole-chain PCR / OI / max pain per expiry, for near vs next week comparisons."""
+    rows = []
+    for expiry, oc in expiry_chains.items():
+        chain = oc.get('chain')
+        if chain is None or not len(chain):
+            continue
+        m = chain.metrics()
+        rows.append({
+            'expiry': expiry, 'strikes': m['strikes'], 'pcr_oi': round(m['pcr_oi'], 3),
+            'total_ce_oi': m['total_ce_oi'], 'total_pe_oi': m['total_pe_oi'],
+            'total_ce_oi_change': m['total_ce_oi_change'], 'total_pe_oi_change': m['total_pe_oi_change'],
+            'max_pain': m['max_pain'],
+            'max_ce_oi_strike': m['max_ce_oi_strike'], 'max_pe_oi_strike': m['max_pe_oi_strike'],
+        })
+    if len(rows) > 1:
+        print("  📊 Expiry comparison (full chain):")
+        for r in rows:
+            print(f"     {r['expiry']:>12} | PCR {r['pcr_oi']:.3f} | CE Δ {r['total_ce_oi_change']:+,} | "
+                  f"PE Δ {r['total_pe_oi_change']:+,} | Max Pain {r['max_pain']}")
+    return rows
 
-        <!-- Mobile: compact table (shown only on <520px) -->
-        <table class="kl-mobile-table">
-            <tr><td style="color:#26c6da;">&#9660; Strong Support</td><td style="color:#26c6da;">&#8377;{d['strong_support']:,.0f}</td></tr>
-            <tr><td style="color:#00bcd4;">&#9660; Support (S1)</td><td style="color:#00bcd4;">&#8377;{d['support']:,.0f}</td></tr>
-            <tr><td style="color:#4fc3f7;font-weight:700;">&#9654; NOW</td><td style="color:#4fc3f7;font-weight:700;">&#8377;{d['current_price']:,.0f}</td></tr>
-            {mp_row}
-            <tr><td style="color:#ff7043;">&#9650; Resistance (R1)</td><td style="color:#ff7043;">&#8377;{d['resistance']:,.0f}</td></tr>
-            <tr><td style="color:#f44336;">&#9650; Strong Resistance</td><td style="color:#f44336;">&#8377;{d['strong_resistance']:,.0f}</td></tr>
-        </table>
 
-        <div style="display:grid;grid-template-columns:1fr 1fr;gap:10px;margin-top:12px;">
-            <div style="background:rgba(244,67,54,0.08);border:1px solid rgba(244,67,54,0.25);border-radius:8px;padding:10px 16px;display:flex;justify-content:space-between;align-items:center;flex-wrap:wrap;gap:4px;">
-                <span style="font-size:12px;color:#c8d8e0;">&#128205; To Resistance</span>
-                <span style="font-size:15px;font-weight:700;color:#f44336;">+{_pts_to_res:,} pts</span>
-            </div>
-            <div style="background:rgba(0,188,212,0.08);border:1px solid rgba(0,188,212,0.25);border-radius:8px;padding:10px 16px;display:flex;justify-content:space-between;align-items:center;flex-wrap:wrap;gap:4px;">
-                <span style="font-size:12px;color:#c8d8e0;">&#128205; To Support</span>
-                <span style="font-size:15px;font-weight:700;color:#00bcd4;">\u2212{_pts_to_sup:,} pts</span>
-            </div>
-        </div>
-    </div>
-"""
+# ═══════════════════════════════════════════════════════════════════════════════
+#  MAX PAIN ENGINE — vectorised payout curve
+# ═══════════════════════════════════════════════════════════════════════════════
 
-    def generate_html_email(self, vol_support=None, vol_resistance=None, global_bias=None, vol_view="normal"):
-        d=self.html_data
-        # ── Header derived values ─────────────────────────────────────────
-        # Expiry countdown
-        try:
-            from datetime import datetime as _dt
-            expiry_dt = _dt.strptime(d.get('expiry',''), '%d-%b-%Y')
-            days_left = (expiry_dt.date() - _dt.now().date()).days
-            expiry_days_str = f"{days_left}d left" if days_left >= 0 else "Expired"
-            expiry_days_col = '#00e676' if days_left > 3 else ('#ff9800' if days_left > 0 else '#ff4757')
-        except Exception:
-            expiry_days_str = '—'; expiry_days_col = '#ffb74d'
-        # VIX
-        vix_val   = d.get('vix_val')
-        vix_trend = d.get('vix_trend','')
-        vix_str   = f"{vix_val:.1f}" if vix_val else 'N/A'
-        vix_arrow = ' ▲' if vix_trend == 'rising' else (' ▼' if vix_trend == 'falling' else '')
-        vix_col   = '#ff9800' if vix_val and vix_val > 16 else ('#00e676' if vix_val and vix_val < 13 else '#ffb74d')
-        # FII/DII net
-        fii_summ  = d.get('fii_dii_summ', {})
-        fii_avg   = fii_summ.get('fii_avg', 0)
-        dii_avg   = fii_summ.get('dii_avg', 0)
-        fii_col   = '#ff4757' if fii_avg < 0 else '#00e676'
-        dii_col   = '#00e676' if dii_avg >= 0 else '#ff4757'
-        fii_hdr   = f"{'+'if fii_avg>=0 else ''}{fii_avg:,.0f}Cr"
-        dii_hdr   = f"{'+'if dii_avg>=0 else ''}{dii_avg:,.0f}Cr"
-        # Global bias
-        gb_str  = (global_bias or 'N/A').upper()
-        gb_col  = '#00e676' if gb_str=='BULLISH' else ('#ff4757' if gb_str=='BEARISH' else '#ffb74d')
-        # Spot + PCR colours
-        pcr_v   = d.get('pcr', 1.0) if d.get('has_option_data') else 1.0
-        pcr_col = '#00e676' if pcr_v > 1.1 else ('#ff4757' if pcr_v < 0.9 else '#ffb74d')
-        sma20_bar ='bar-teal' if d['sma_20_above']  else 'bar-red'
-        sma50_bar ='bar-teal' if d['sma_50_above']  else 'bar-red'
-        sma200_bar='bar-teal' if d['sma_200_above'] else 'bar-red'
-        macd_bar  ='bar-teal' if d['macd_bullish']  else 'bar-red'
-        sma20_badge ='bullish' if d['sma_20_above']  else 'bearish'
-        sma50_badge ='bullish' if d['sma_50_above']  else 'bearish'
-        sma200_badge='bullish' if d['sma_200_above'] else 'bearish'
-        macd_badge  ='bullish' if d['macd_bullish']  else 'bearish'
-        sma20_lbl ='Above'  if d['sma_20_above']  else 'Below'
-        sma50_lbl ='Above'  if d['sma_50_above']  else 'Below'
-        sma200_lbl='Above'  if d['sma_200_above'] else 'Below'
-        macd_lbl  ='Bullish' if d['macd_bullish']  else 'Bearish'
-        sma20_ico ='\u2705' if d['sma_20_above']  else '\u274c'
-        sma50_ico ='\u2705' if d['sma_50_above']  else '\u274c'
-        sma200_ico='\u2705' if d['sma_200_above'] else '\u274c'
-        macd_ico  ='\U0001f7e2' if d['macd_bullish'] else '\U0001f534'
-        # ── Technical Indicators: Option A pill strip ────────────────────
-        def _pill(lbl, val, badge, badge_cls):
-            if   badge_cls == 'bullish': col='#00e676'; bg='rgba(0,230,118,0.08)';  bdr='rgba(0,230,118,0.25)';  bdg_bg='rgba(0,230,118,0.14)';  bdg_col='#00e676'
-            elif badge_cls == 'bearish': col='#ff4757'; bg='rgba(255,71,87,0.08)';  bdr='rgba(255,71,87,0.25)';  bdg_bg='rgba(255,71,87,0.14)';  bdg_col='#ff4757'
-            else:                        col='#ffb74d'; bg='rgba(255,183,77,0.07)'; bdr='rgba(255,183,77,0.22)'; bdg_bg='rgba(255,183,77,0.14)'; bdg_col='#ffb74d'
-            return (
-                f'<div style="display:flex;align-items:center;gap:7px;padding:6px 13px;border-radius:20px;'
-                f'border:1px solid {bdr};background:{bg};white-space:nowrap;">'
-                f'<span style="font-size:9px;letter-spacing:1.5px;color:rgba(128,222,234,0.6);text-transform:uppercase;">{lbl}</span>'
-                f'<span style="font-family:JetBrains Mono,monospace;font-size:13px;font-weight:700;color:{col};">{val}</span>'
-                f'<span style="font-size:8px;font-weight:700;padding:1px 7px;border-radius:8px;letter-spacing:0.5px;'
-                f'background:{bdg_bg};color:{bdg_col};">{badge}</span>'
-                f'</div>'
-            )
-        rsi_val   = d['rsi'];      rsi_badge_cls = 'bullish' if rsi_val < 30 else ('bearish' if rsi_val > 70 else 'neutral')
-        rsi_badge = d['rsi_status']
-        tech_pills = (
-            _pill('RSI 14',    f"{d['rsi']:.1f}",          rsi_badge,   rsi_badge_cls) +
-            _pill('SMA 20',    f"\u20b9{d['sma_20']:,.0f}", sma20_lbl,   sma20_badge) +
-            _pill('SMA 50',    f"\u20b9{d['sma_50']:,.0f}", sma50_lbl,   sma50_badge) +
-            _pill('SMA 200',   f"\u20b9{d['sma_200']:,.0f}",sma200_lbl,  sma200_badge) +
-            _pill('MACD',      f"{d['macd']:.0f}",          macd_lbl,    macd_badge)
-        )
-        if d.get('has_option_data'):
-            pcr_v = d.get('pcr', 1.0)
-            pcr_badge_cls = 'bullish' if pcr_v > 1.1 else ('bearish' if pcr_v < 0.9 else 'neutral')
-            pcr_lbl = 'Bullish' if pcr_v > 1.1 else ('Bearish' if pcr_v < 0.9 else 'Neutral')
-            tech_pills += _pill('PCR', f"{pcr_v:.3f}", pcr_lbl, pcr_badge_cls)
-        tech_cards = tech_pills  # kept same variable name so injection point unchanged
-        oc_cards = self._build_enhanced_oc_cards()
-        _cp  = d['current_price']
-        _ss  = d['strong_support']    if d.get('strong_support')    is not None else (_cp - 300)
-        _sr  = d['strong_resistance'] if d.get('strong_resistance') is not None else (_cp + 300)
-        _rng = (_sr - _ss) if _sr != _ss else 1
-        def _pct_real(val): return round(max(3,min(97,(val-_ss)/_rng*100)),2)
-        _pct_cp     = _pct_real(_cp)
-        _pts_to_res = int(d['resistance'] - _cp) if d.get('resistance') is not None else 0
-        _pts_to_sup = int(_cp - d['support'])     if d.get('support')    is not None else 0
-        _mp_node=""
-        if d['has_option_data']:
-            _mp_node=(f'<div class="rl-node-b" style="left:43%;">'
-                      f'<div class="rl-dot" style="background:#ffb74d;box-shadow:0 0 8px #ffb74d;margin:0 auto 5px;"></div>'
-                      f'<div class="rl-lbl" style="color:#ffb74d;">Max Pain</div>'
-                      f'<div class="rl-val" style="color:#ffb74d;">\u20b9{d["max_pain"]:,}</div></div>')
+def compute_max_pain(strikes, ce_oi, pe_oi):
+    """
+    Max pain over any number of strikes in O(n log n).
+
+    For each candidate expiry price K (every listed strike) the total intrinsic
+    payout to option holders is
+        CE(K) = Σ max(0, K - s) · CE_OI(s) = K · ΣCE_OI(s≤K) − Σ s·CE_OI(s≤K)
+        PE(K) = Σ max(0, s - K) · PE_OI(s) = Σ s·PE_OI(s>K) − K · ΣPE_OI(s>K)
+    so after one sort, prefix sums of OI and OI×strike give the whole curve in
+    a single pass. Max pain is the strike with the minimum total payout
+    (option writers lose the least); ties resolve to the lowest strike.
+
+    Returns (max_pain_strike, curve) where curve is a DataFrame of
+    Strike / CE_Payout / PE_Payout / Total_Payout sorted by strike.
+    """
+    strikes = np.asarray(strikes, dtype=np.float64)
+    ce_oi   = np.nan_to_num(np.asarray(ce_oi, dtype=np.float64))
+    pe_oi   = np.nan_to_num(np.asarray(pe_oi, dtype=np.float64))
+    if strikes.size == 0:
+        return 0, pd.DataFrame(columns=['Strike', 'CE_Payout', 'PE_Payout', 'Total_Payout'])
 
-        checklist_tab_html = build_strategy_checklist_html(
-            d, vol_support=vol_support, vol_resistance=vol_resistance,
-            global_bias=global_bias, vol_view=vol_view,
-            vix_val=d.get('vix_val'), vix_trend=d.get('vix_trend')
-        )
-        intraday_oi_tab_html = build_intraday_oi_tab_html()
-        pretrade_tab_html = build_pretrade_checklist_tab_html()
+    order   = np.argsort(strikes, kind='stable')
+    k, ce, pe = strikes[order], ce_oi[order], pe_oi[order]
 
-        # ── Weekly Outlook tab HTML ───────────────────────────────────
-        weekly_outlook_data = compute_weekly_outlook(d, vix_val=d.get('vix_val'))
-        weekly_outlook_tab_html = build_weekly_outlook_tab_html(weekly_outlook_data)
+    ce_cum, ce_cum_k = np.cumsum(ce), np.cumsum(ce * k)
+    pe_cum, pe_cum_k = np.cumsum(pe), np.cumsum(pe * k)
+    ce_payout = k * ce_cum - ce_cum_k
+    pe_payout = (pe_cum_k[-1] - pe_cum_k) - k * (pe_cum[-1] - pe_cum)
+    total     = ce_payout + pe_payout
 
-        # ── Heatmap tab HTML ─────────────────────────────────────────
-        heatmap_tab_html = build_heatmap_tab_html(
-            self.heatmap_data,
-            self.heatmap_timestamp,
-            self.heatmap_advance,
-            self.heatmap_decline,
-            self.heatmap_neutral,
-        )
+    curve = pd.DataFrame({'Strike': k, 'CE_Payout': ce_payout,
+                          'PE_Payout': pe_payout, 'Total_Payout': total})
+    return int(k[int(np.argmin(total))]), curve
 
-        # ── Heatmap-specific CSS ─────────────────────────────────────
-        heatmap_css = get_heatmap_css()
-        pretrade_css = get_pretrade_checklist_css()
 
-        # ── Heatmap JavaScript ───────────────────────────────────────
-        heatmap_js = get_heatmap_javascript()
+# ═══════════════════════════════════════════════════════════════════════════════
+#  FETCH STAGE — independent data sources fetched concurrently
+# ═══════════════════════════════════════════════════════════════════════════════
 
-        # ── Main JavaScript (all tabs + OI trend logic) ──────────────
-        all_js = """
-<script>
-(function() {
-    var INTERVAL  = 30000;
-    var countdown = INTERVAL / 1000;
+FETCH_WORKERS  = 8
+FETCH_TIMEOUTS = {          # seconds per source, measured from when it starts
+    # option_chain: option_chain_timeout(), sized from the expiries fetched
+    'technical':     60,
+    'fii_dii':       45,
+    'heatmap':       60,
+    'vix':           20,
+    'global_bias':   30,
+    'volume_levels': 40,
+}
 
-    function istNow() { return new Date(new Date().toLocaleString('en-US',{timeZone:'Asia/Kolkata'})); }
-    function pad(n){ return String(n).padStart(2,'0'); }
+class FetchTask:
+    def __init__(self, name, fn, needs=(), default=None, timeout=None):
+        self.name    = name
+        self.fn      = fn
+        self.needs   = tuple(needs)
+        self.default = default
+        self.timeout = timeout or FETCH_TIMEOUTS.get(name, 60)
 
-    // ── Sidebar offset: measures sticky header height and sets CSS var ──────
-    function setSidebarOffset() {
-        var hdr = document.querySelector('.header');
-        if (hdr) {
-            var h = hdr.getBoundingClientRect().height;
-            document.documentElement.style.setProperty('--header-h', h + 'px');
-        }
-    }
-    setSidebarOffset();
-    window.addEventListener('resize', setSidebarOffset);
-    function fmtTime(d){ return pad(d.getHours())+':'+pad(d.getMinutes())+':'+pad(d.getSeconds()); }
-    function fmtDate(d){
-        var M=['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec'];
-        return pad(d.getDate())+'-'+M[d.getMonth()]+'-'+d.getFullYear();
-    }
-    function tick() {
-        var now = istNow();
-        var clockEl = document.getElementById('live-ist-clock');
-        if (clockEl) clockEl.textContent = fmtDate(now) + '  ' + fmtTime(now) + ' IST';
-        countdown--;
-        if (countdown < 0) countdown = INTERVAL / 1000;
-        var cdEl = document.getElementById('refresh-countdown');
-        if (cdEl) { var s=countdown%60; var m=Math.floor(countdown/60); cdEl.textContent=(m>0?m+'m ':'')+s+'s'; }
-    }
-    setInterval(tick, 1000);
-    tick();
 
-    // ── Option 2: JSON timestamp polling ──────────────────────────────────
-    // Polls latest_report.json every 30s. Only reloads the page when the
-    // Python script has actually re-run and the timestamp changed.
-    // Saves active tab before reload → restores it after → no tab jump.
-    var _lastKnownTimestamp = null;
+def run_fetch_stage(tasks, max_workers=FETCH_WORKERS, stale=None):
+    """
+    Runs FetchTasks on a thread pool. A task starts as soon as every task named
+    in its `needs` has resolved and receives their results as positional args.
+    A task that raises or outlives its timeout resolves to its `default`, and
+    its dependants still run with that value. Returns {name: result}.
+    Timed-out workers cannot be killed: `stale` (name -> future, kept by the
+    caller across runs) records them, and a task whose previous worker is
+    still running is skipped with its default instead of being started twice.
+    """
+    print(f"\n⚡ Fetch stage: {len(tasks)} sources, up to {max_workers} in parallel")
+    stage_start = time.time()
+    stale    = {} if stale is None else stale
+    pending  = {t.name: t for t in tasks}
+    running  = {}     # future -> task
+    started  = {}     # task name -> start time
+    results  = {}
+    for name, fut in list(stale.items()):
+        if fut.done():
+            del stale[name]
+        elif name in pending:
+            print(f"  ⏳ {name}: previous run's worker still busy — using fallback")
+            results[name] = pending.pop(name).default
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+    try:
+        while pending or running:
+            for name, task in list(pending.items()):
+                if all(dep in results for dep in task.needs):
+                    started[name] = time.time()
+                    running[pool.submit(task.fn, *[results[d] for d in task.needs])] = task
+                    del pending[name]
+            if not running:
+                for name, task in pending.items():
+                    print(f"  ⚠️  {name}: unresolved dependencies {task.needs} — using fallback")
+                    results[name] = task.default
+                break
+            next_deadline = min(started[t.name] + t.timeout for t in running.values())
+            done, _ = wait(running, timeout=max(0.0, next_deadline - time.time()),
+                           return_when=FIRST_COMPLETED)
+            for fut in done:
+                task = running.pop(fut)
+                took = time.time() - started[task.name]
+                try:
+                    results[task.name] = fut.result()
+                    print(f"  ⏱️  {task.name} done in {took:.1f}s")
+                except Exception as e:
+                    print(f"  ⚠️  {task.name} failed after {took:.1f}s: {e} — using fallback")
+                    results[task.name] = task.default
+            now = time.time()
+            for fut, task in list(running.items()):
+                if now - started[task.name] >= task.timeout:
+                    # The worker thread cannot be killed; its late result is ignored.
+                    if not fut.cancel():
+                        stale[task.name] = fut
+                    del running[fut]
+                    print(f"  ⏰ {task.name} timed out after {task.timeout}s — using fallback")
+                    results[task.name] = task.default
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    print(f"  ✅ Fetch stage finished in {time.time() - stage_start:.1f}s")
+    return results
 
-    function getActiveTab() {
-        var active = document.querySelector('.tab-btn.active');
-        return active ? active.getAttribute('data-tab') : null;
-    }
 
-    function pollForUpdate() {
-        fetch('latest_report.json?_=' + Date.now())   // cache-bust
-            .then(function(r) { return r.json(); })
-            .then(function(data) {
-                var ts = data.timestamp || null;
-                if (_lastKnownTimestamp === null) {
-                    // First load — just store the current timestamp, don't reload
-                    _lastKnownTimestamp = ts;
-                } else if (ts && ts !== _lastKnownTimestamp) {
-                    // Save scroll position + active tab before reload
-                    var activeTab = getActiveTab();
-                    if (activeTab) sessionStorage.setItem('activeTab', activeTab);
-                    var scrollY = window.scrollY || window.pageYOffset;
-                    sessionStorage.setItem('scrollY', scrollY);
-                    console.log('[AutoRefresh] New data (' + ts + ') — fading out then reloading…');
-                    // Smooth fade-out before reload — no white flash
-                    document.body.style.transition = 'opacity 0.25s ease';
-                    document.body.style.opacity = '0';
-                    setTimeout(function(){ location.reload(); }, 260);
-                }
-                // else: same timestamp → do nothing
-            })
-            .catch(function(err) {
-                // latest_report.json not found or server not running — silently ignore
-                console.warn('[AutoRefresh] Could not fetch latest_report.json:', err);
-            });
-        countdown = INTERVAL / 1000;
-    }
-    setInterval(pollForUpdate, INTERVAL);
-    pollForUpdate();   // run once immediately on page load to capture baseline timestamp
+class NiftyHTMLAnalyzer:
+    def __init__(self, nse=None, candles=None, sections=None):
+        self.yf_symbol  = "^NSEI"
+        self.nse_symbol = "NIFTY"
+        self.nse        = nse or NSESession()
+        self.candles    = candles or CandleStore()
+        self.sections   = sections or SectionCache()
+        self.daily_history = None   # 1y daily frame with indicator columns, from get_technical_data
+        self.report_lines = []
+        self.html_data    = {}
+        self.heatmap_data = []
+        self.heatmap_timestamp = "N/A"
+        self.heatmap_advance = 0
+        self.heatmap_decline = 0
+        self.heatmap_neutral = 0
+        self.vol_support     = None
+        self.vol_resistance  = None
+        self.global_bias     = None
+        self.expiry_chains   = {}    # expiry -> chain data, when several expiries are fetched
+        self.expiry_comparison = []
+        self.oi_history = None   # SnapshotHistory for the run; flushed once by main()
+        self.stale_fetches = {}  # source -> timed-out fetch future still running (see run_fetch_stage)
+        self._render_cache = {}             # profile -> (input digest, parts) — see render_parts()
+        self.fragments     = {}             # section name -> (digest, html) of the last web render
+        self.weekly_outlook = None
+        self.render_ms     = None
 
-    // ── Restore tab + scroll position after reload ────────────────────────
-    (function restoreTabAfterReload() {
-        var savedTab = sessionStorage.getItem('activeTab');
-        var savedScroll = sessionStorage.getItem('scrollY');
+    def log(self, message):
+        print(message)
+        self.report_lines.append(message)
 
-        if (savedTab) {
-            sessionStorage.removeItem('activeTab');
-            setTimeout(function() { switchTab(savedTab); }, 50);
-        }
-        if (savedScroll) {
-            sessionStorage.removeItem('scrollY');
-            // Restore scroll while page is still hidden (hidden by <head> script)
-            window.scrollTo(0, parseInt(savedScroll, 10));
-            // Wait for browser to apply scroll, then fade in
-            requestAnimationFrame(function() {
-                requestAnimationFrame(function() {
-                    document.documentElement.style.transition = 'opacity 0.3s ease';
-                    document.documentElement.style.opacity = '1';
-                    document.documentElement.style.overflow = '';
-                    document.body.style.opacity = '1';
-                });
-            });
-        }
-    })();
-})();
+    def get_upcoming_expiry_tuesday(self):
+        ist_tz      = pytz.timezone('Asia/Kolkata')
+        now_ist     = datetime.now(ist_tz)
+        today_ist   = now_ist.date()
+        weekday     = today_ist.weekday()
+        past_cutoff = (now_ist.hour, now_ist.minute) >= (16, 0)
+        if weekday == 1 and not past_cutoff:
+            days_ahead = 0
+        elif weekday == 1 and past_cutoff:
+            days_ahead = 7
+        elif weekday < 1:
+            days_ahead = 1 - weekday
+        else:
+            days_ahead = 8 - weekday
+        raw_tuesday = today_ist + timedelta(days=days_ahead)
+        candidate = raw_tuesday
+        for _ in range(6):
+            cstr       = candidate.strftime('%d-%b-%Y')
+            is_weekend = candidate.weekday() >= 5
+            if cstr not in NSE_FO_HOLIDAYS and not is_weekend:
+                break
+            candidate -= timedelta(days=1)
+        expiry_str = candidate.strftime('%d-%b-%Y')
+        holiday_shifted = (candidate != raw_tuesday)
+        shift_note = f" ⚠️ HOLIDAY SHIFT from {raw_tuesday.strftime('%d-%b-%Y')}" if holiday_shifted else ""
+        print(f"  📅 Now (IST): {now_ist.strftime('%A %d-%b-%Y %H:%M')} | "
+              f"Raw Tue: {raw_tuesday.strftime('%d-%b-%Y')} | "
+              f"Adjusted expiry: {expiry_str}{shift_note} | "
+              f"Past 4PM: {past_cutoff}")
+        return expiry_str
 
-function switchTab(tab) {
-    document.querySelectorAll('.tab-panel').forEach(function(p){ p.classList.remove('active'); });
-    document.querySelectorAll('.tab-btn').forEach(function(b){ b.classList.remove('active'); });
-    var panel=document.getElementById('tab-'+tab);
-    var btn=document.querySelector('[data-tab="'+tab+'"]');
-    if(panel) panel.classList.add('active');
-    if(btn)   btn.classList.add('active');
-    if(tab==='oi-trend') loadOILog();
-    if(tab==='heatmap') { window.renderHeatmap && window.renderHeatmap(); }
-}
+    def fetch_available_expiries(self):
+        expiries = self.fetch_expiry_list()
+        return expiries[0] if expiries else None
 
-function filterStrats(type, btn) {
-    document.querySelectorAll('.filter-btn').forEach(function(b){ b.classList.remove('active'); });
-    btn.classList.add('active');
-    // Close all open panels first
-    document.querySelectorAll('.sc-dp').forEach(function(p){ p.classList.remove('sc-dp-open'); });
-    document.querySelectorAll('.sc-row').forEach(function(r){ r.classList.remove('sc-selected'); });
-    // Show/hide rows and their paired panels
-    document.querySelectorAll('.sc-row').forEach(function(r){
-        var show = (type === 'all' || r.dataset.type === type);
-        r.style.display = show ? '' : 'none';
-        var chev = r.querySelector('.sc-row-chevron');
-        if (chev) {
-            var pid = chev.id.replace('chev-', '');
-            var panel = document.getElementById(pid);
-            if (panel) panel.style.display = show ? '' : 'none';
+    def fetch_expiry_list(self):
+        cached = self._load_cached_expiries()
+        if cached:
+            print(f"  📅 NSE expiries (cached today): {cached[:5]}")
+            return cached
+        for _ in range(2):
+            try:
+                url  = f"{NSE_BASE_URL}/api/option-chain-v3?type=Indices&symbol={self.nse_symbol}"
+                resp = self.nse.get(url, timeout=20)
+                if resp.status_code != 200:
+                    # 401/403 already re-warmed in NSESession.get — other errors just retry
+                    print(f"  ⚠️  Expiry list HTTP {resp.status_code}")
+                    time.sleep(2); continue
+                expiries = resp.json().get('records', {}).get('expiryDates', [])
+                if expiries:
+                    print(f"  📅 NSE available expiries: {expiries[:5]}")
+                    self._save_cached_expiries(expiries)
+                    return expiries
+                # Empty records on cached cookies usually means they went stale
+                if not self.nse.rewarm():
+                    break
+            except Exception as e:
+                print(f"  ⚠️  Could not fetch expiry list: {e}")
+                break
+        return []
+
+    def _load_cached_expiries(self):
+        # The expiry list only rolls over on expiry day, so a list saved earlier
+        # today is reused as long as its nearest expiry is still in the future.
+        try:
+            if not os.path.exists(NSE_EXPIRY_CACHE):
+                return None
+            with open(NSE_EXPIRY_CACHE, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            today = datetime.now(pytz.timezone('Asia/Kolkata')).date()
+            expiries = saved.get('expiries', [])
+            if saved.get('symbol') != self.nse_symbol or saved.get('date') != today.isoformat() or not expiries:
+                return None
+            if datetime.strptime(expiries[0], '%d-%b-%Y').date() <= today:
+                return None
+            return expiries
+        except Exception:
+            return None
+
+    def _save_cached_expiries(self, expiries):
+        try:
+            os.makedirs(STATE_DIR, exist_ok=True)
+            today = datetime.now(pytz.timezone('Asia/Kolkata')).date()
+            with open(NSE_EXPIRY_CACHE, "w", encoding="utf-8") as f:
+                json.dump({'symbol': self.nse_symbol, 'date': today.isoformat(), 'expiries': expiries}, f)
+        except Exception as e:
+            print(f"  ⚠️  Could not cache expiry list: {e}")
+
+    def fetch_nse_option_chain_silent(self):
+        """
+        Returns (near-expiry chain data or None, {expiry: chain data}). Runs in
+        a fetch-stage worker, so it sets nothing on self — the stage collector
+        assigns the results for the current run.
+        """
+        expiries    = self.fetch_expiry_list()
+        real_expiry = expiries[0] if expiries else None
+        chains      = {}
+        if real_expiry:
+            wanted = (select_expiries(expiries, MULTI_EXPIRY_WEEKLIES, MULTI_EXPIRY_MONTHLY)
+                      if MULTI_EXPIRY else [real_expiry])
+            if len(wanted) > 1:
+                # Near week comes back with the others, in about one fetch's latency
+                chains = self.fetch_nse_option_chains(wanted)
+                result = chains.get(real_expiry)
+            else:
+                print(f"  🗓️  Fetching option chain for NSE live expiry: {real_expiry}")
+                result = self._fetch_chain_for_expiry(real_expiry)
+            if result:
+                return result, chains
+            print(f"  ⚠️  Chain data empty for live expiry {real_expiry}. Trying fallback...")
+        computed_expiry = self.get_upcoming_expiry_tuesday()
+        if computed_expiry != real_expiry:
+            print(f"  🔄 Fallback computed expiry: {computed_expiry}")
+            result = self._fetch_chain_for_expiry(computed_expiry)
+            if result:
+                return result, chains
+        if real_expiry and real_expiry != computed_expiry:
+            print(f"  🔄 Last attempt with real_expiry: {real_expiry}")
+            result = self._fetch_chain_for_expiry(real_expiry)
+            if result:
+                return result, chains
+        print("  ❌ Option chain fetch failed after all attempts.")
+        return None, chains
+
+    def fetch_nse_option_chains(self, expiries, max_workers=MULTI_EXPIRY_WORKERS, attempts=CHAIN_ATTEMPTS):
+        """Fetches several expiries concurrently over the shared NSE session.
+        Returns {expiry: chain data} for every expiry that succeeded, in input order."""
+        self.nse.warm_up()   # once, before the workers start
+        print(f"  🗓️  Fetching {len(expiries)} expiries concurrently: {', '.join(expiries)}")
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="expiry") as pool:
+            results = list(pool.map(lambda e: self._fetch_chain_for_expiry(e, attempts=attempts), expiries))
+        chains = {e: r for e, r in zip(expiries, results) if r}
+        print(f"  ✅ Expiries fetched: {len(chains)}/{len(expiries)}")
+        return chains
+
+    def _fetch_chain_for_expiry(self, expiry, attempts=CHAIN_ATTEMPTS):
+        api_url = (f"{NSE_BASE_URL}/api/option-chain-v3"
+                   f"?type=Indices&symbol={self.nse_symbol}&expiry={expiry}")
+        for attempt in range(1, attempts + 1):
+            try:
+                print(f"    Attempt {attempt}: expiry={expiry}")
+                resp = self.nse.get(api_url, timeout=CHAIN_HTTP_TIMEOUT)
+                print(f"    HTTP {resp.status_code}")
+                if resp.status_code != 200:
+                    time.sleep(CHAIN_RETRY_SLEEP); continue
+                json_data  = resp.json()
+                data       = json_data.get('records', {}).get('data', [])
+                if not data:
+                    if self.nse.rewarm():
+                        continue
+                    print(f"    ⚠️  Empty data for expiry={expiry}"); return None
+                underlying = json_data.get('records', {}).get('underlyingValue', 0)
+                chain  = OptionChain.from_records(data, expiry, underlying)
+                window = chain.window(ATM_WINDOW)
+                df     = window.to_frame()
+                print(f"    ✅ Strikes: {len(chain)} → ATM±{ATM_WINDOW} window: {len(window)}")
+                return {'expiry': expiry, 'df': df, 'chain': chain, 'window': window,
+                        'underlying': underlying, 'atm_strike': chain.atm_strike}
+            except Exception as e:
+                print(f"    ❌ Attempt {attempt} error: {e}"); time.sleep(CHAIN_RETRY_SLEEP)
+        return None
+
+    def analyze_option_chain_data(self, oc_data):
+        if not oc_data: return None
+        df     = oc_data['df']
+        window = oc_data.get('window')
+        if window is None:
+            window = OptionChain.from_frame(df, oc_data['expiry'], oc_data['underlying'])
+        chain  = oc_data.get('chain')
+        if chain is None:
+            chain = window
+        wm     = window.metrics()
+        total_ce_oi, total_pe_oi = wm['total_ce_oi'], wm['total_pe_oi']
+        pcr_oi,  pcr_vol  = wm['pcr_oi'], wm['pcr_volume']
+        total_ce_oi_change = wm['total_ce_oi_change']
+        total_pe_oi_change = wm['total_pe_oi_change']
+        net_oi_change = total_ce_oi_change - total_pe_oi_change
+        if   total_ce_oi_change > 0 and total_pe_oi_change < 0:
+            oi_direction,oi_signal,oi_icon,oi_class="Strong Bearish","Call Build-up + Put Unwinding","🔴","bearish"
+        elif total_ce_oi_change < 0 and total_pe_oi_change > 0:
+            oi_direction,oi_signal,oi_icon,oi_class="Strong Bullish","Put Build-up + Call Unwinding","🟢","bullish"
+        elif total_ce_oi_change > 0 and total_pe_oi_change > 0:
+            if   total_pe_oi_change > total_ce_oi_change * 1.5:
+                oi_direction,oi_signal,oi_icon,oi_class="Bullish","Put Build-up Dominant","🟢","bullish"
+            elif total_ce_oi_change > total_pe_oi_change * 1.5:
+                oi_direction,oi_signal,oi_icon,oi_class="Bearish","Call Build-up Dominant","🔴","bearish"
+            else:
+                oi_direction,oi_signal,oi_icon,oi_class="Neutral (High Vol)","Both Calls & Puts Building","🟡","neutral"
+        elif total_ce_oi_change < 0 and total_pe_oi_change < 0:
+            oi_direction,oi_signal,oi_icon,oi_class="Neutral (Unwinding)","Both Calls & Puts Unwinding","🟡","neutral"
+        else:
+            if   net_oi_change > 0: oi_direction,oi_signal,oi_icon,oi_class="Moderately Bearish","Net Call Accumulation","🔴","bearish"
+            elif net_oi_change < 0: oi_direction,oi_signal,oi_icon,oi_class="Moderately Bullish","Net Put Accumulation","🟢","bullish"
+            else:                   oi_direction,oi_signal,oi_icon,oi_class="Neutral","Balanced OI Changes","🟡","neutral"
+
+        # ── Whole-chain view: same metrics over every listed strike ─────────
+        full = chain.metrics() if chain is not window else wm
+        if chain is not window:
+            print(f"  🔭 Full chain ({full['strikes']} strikes): PCR {full['pcr_oi']:.3f} | "
+                  f"Max Pain {full['max_pain']} | CE wall {full['max_ce_oi_strike']} | "
+                  f"PE wall {full['max_pe_oi_strike']}  (window PCR {pcr_oi:.3f}, Max Pain {wm['max_pain']})")
+
+        df['Total_OI'] = df['CE_OI'] + df['PE_OI']
+        return {
+            'expiry': oc_data['expiry'], 'underlying_value': oc_data['underlying'],
+            'atm_strike': oc_data['atm_strike'],
+            'pcr_oi': round(pcr_oi,3), 'pcr_volume': round(pcr_vol,3),
+            'total_ce_oi': int(total_ce_oi), 'total_pe_oi': int(total_pe_oi),
+            'max_ce_oi_strike': wm['max_ce_oi_strike'], 'max_ce_oi_value': wm['max_ce_oi_value'],
+            'max_pe_oi_strike': wm['max_pe_oi_strike'], 'max_pe_oi_value': wm['max_pe_oi_value'],
+            'max_pain': wm['max_pain'], 'max_pain_curve': wm['max_pain_curve'],
+            'full_chain': full, 'chain': chain,
+            'total_ce_oi_change': total_ce_oi_change, 'total_pe_oi_change': total_pe_oi_change,
+            'net_oi_change': net_oi_change,
+            'oi_direction': oi_direction, 'oi_signal': oi_signal,
+            'oi_icon': oi_icon, 'oi_class': oi_class, 'df': df,
         }
-    });
-}
 
-/* ── Compact row toggle / close / load ─────────────────────── */
-function scToggle(row, panelId) {
-    var panel      = document.getElementById(panelId);
-    var wasOpen    = panel && panel.classList.contains('sc-dp-open');
-    var wasSelected = row.classList.contains('sc-selected');
-    // Close everything
-    document.querySelectorAll('.sc-dp').forEach(function(p){ p.classList.remove('sc-dp-open'); });
-    document.querySelectorAll('.sc-row').forEach(function(r){ r.classList.remove('sc-selected'); });
-    // If it wasn't already open, open it
-    if (!wasSelected || !wasOpen) {
-        row.classList.add('sc-selected');
-        if (panel) {
-            panel.classList.add('sc-dp-open');
-            setTimeout(function(){ panel.scrollIntoView({ behavior:'smooth', block:'nearest' }); }, 50);
-        }
-        selectStrat(row);
-    }
-}
+    def get_technical_data(self):
+        """
+        Returns (technical dict, daily frame with indicator columns), or
+        (None, None). Runs in a fetch-stage worker, so it sets nothing on self.
+        """
+        try:
+            print("Calculating technical indicators...")
+            df = self.candles.candles(self.yf_symbol, "1d", days=365)
+            if df.empty: print("Warning: Failed to fetch historical data"); return None, None
+            df['SMA_20']  = df['Close'].rolling(20).mean()
+            df['SMA_50']  = df['Close'].rolling(50).mean()
+            df['SMA_200'] = df['Close'].rolling(200).mean()
+            delta = df['Close'].diff()
+            gain  = delta.where(delta > 0, 0).rolling(14).mean()
+            loss  = (-delta.where(delta < 0, 0)).rolling(14).mean()
+            df['RSI']    = 100 - (100 / (1 + gain / loss))
+            df['EMA_12'] = df['Close'].ewm(span=12, adjust=False).mean()
+            df['EMA_26'] = df['Close'].ewm(span=26, adjust=False).mean()
+            df['MACD']   = df['EMA_12'] - df['EMA_26']
+            df['Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
+            df['ATR_14'] = atr_series(df, 14)
+
+            # ── Use last non-NaN row for MACD/Signal (handles mid-session NaN) ──
+            df_clean = df.dropna(subset=['MACD', 'Signal'])
+            latest = df.iloc[-1]
+            macd_val   = float(df_clean['MACD'].iloc[-1])   if not df_clean.empty else float('nan')
+            signal_val = float(df_clean['Signal'].iloc[-1]) if not df_clean.empty else float('nan')
+            # Previous row for histogram slope (early crossover detection)
+            macd_prev_val   = float(df_clean['MACD'].iloc[-2])   if len(df_clean) >= 2 else macd_val
+            signal_prev_val = float(df_clean['Signal'].iloc[-2]) if len(df_clean) >= 2 else signal_val
+            current_price = latest['Close']
+            print("  Fetching 1H candles for Key Levels (tiered lookback: 6M → 1Y → wide window)...")
+
+            s1 = s2 = r1 = r2 = None
 
-function scClose(panelId, evt) {
-    if (evt) evt.stopPropagation();
-    var panel = document.getElementById(panelId);
-    if (panel) panel.classList.remove('sc-dp-open');
-    document.querySelectorAll('.sc-row').forEach(function(r){ r.classList.remove('sc-selected'); });
-}
+            def _find_levels(highs, lows, price, window):
+                res_c = [h for h in highs if price < h <= price + window]
+                sup_c = [l for l in lows  if price - window <= l < price]
+                return res_c, sup_c
 
-function scLoadPlan(safeName, evt) {
-    if (evt) evt.stopPropagation();
-    // Decode HTML entities
-    var tmp = document.createElement('textarea');
-    tmp.innerHTML = safeName;
-    var stratName = tmp.value;
-    var mapEl = document.getElementById('stratDataMap');
-    var stratMap = {};
-    try { stratMap = JSON.parse(mapEl.textContent || mapEl.innerHTML); } catch(e){}
-    var info = stratMap[stratName] || {};
-    _applyTradePlan(stratName, info.strike || 'N/A', info.rank || 'PRIMARY', typeof info.rr === 'number' ? info.rr : 0);
-    // Button flash
-    if (evt && evt.target) {
-        var btn = evt.target, orig = btn.innerHTML;
-        btn.innerHTML = '&#10003; Loaded!';
-        btn.style.background = 'linear-gradient(135deg,#00e676,#00796b)';
-        setTimeout(function(){ btn.innerHTML = orig; btn.style.background = ''; }, 1500);
-    }
-    // Scroll to trade plan
-    var bannerEl = document.getElementById('tp-banner');
-    if (bannerEl) { var s = bannerEl.closest('.section'); if (s) s.scrollIntoView({ behavior:'smooth', block:'start' }); }
-}
+            # Step 1: 6 months of 1H data
+            try:
+                df_6m = self.candles.candles(self.yf_symbol, "1h", days=180)
+                if not df_6m.empty:
+                    highs_6m = sorted(df_6m['High'].values)
+                    lows_6m  = sorted(df_6m['Low'].values)
+                    res_c, sup_c = _find_levels(highs_6m, lows_6m, current_price, 300)
+                    print(f"  6M 1H: {len(df_6m)} candles | res_c={len(res_c)} sup_c={len(sup_c)}")
+                else:
+                    res_c, sup_c = [], []
+            except Exception as e:
+                print(f"  ⚠️  6M 1H fetch failed: {e}")
+                res_c, sup_c = [], []
 
-function _applyTradePlan(stratName, strikeRec, rank, rr) {
-    var nameEl   = document.getElementById('tp-strat-name');
-    var strikeEl = document.getElementById('tp-strike-rec');
-    var rankEl   = document.getElementById('tp-rank-badge');
-    var bannerEl = document.getElementById('tp-banner');
-    if (nameEl)   nameEl.textContent = stratName;
-    if (strikeEl) strikeEl.innerHTML = '&#127919; ' + strikeRec;
-    if (rankEl)   { rankEl.textContent = rank; rankEl.className = 'tp-rank-badge tp-rank-' + rank.toLowerCase(); }
-    if (bannerEl) { bannerEl.classList.add('tp-banner-flash'); setTimeout(function(){ bannerEl.classList.remove('tp-banner-flash'); }, 600); }
-}
+            # Step 2: expand to 1 year if not enough
+            if len(res_c) < 2 or len(sup_c) < 2:
+                print("  🔄 6M insufficient — expanding to 1 year")
+                try:
+                    df_1yr = self.candles.candles(self.yf_symbol, "1h", days=365)
+                    if not df_1yr.empty:
+                        highs_1yr = sorted(df_1yr['High'].values)
+                        lows_1yr  = sorted(df_1yr['Low'].values)
+                        res_c, sup_c = _find_levels(highs_1yr, lows_1yr, current_price, 300)
+                        print(f"  1Y 1H: {len(df_1yr)} candles | res_c={len(res_c)} sup_c={len(sup_c)}")
+                    else:
+                        res_c, sup_c = [], []
+                except Exception as e:
+                    print(f"  ⚠️  1Y 1H fetch failed: {e}")
+                    res_c, sup_c = [], []
 
-function selectStrat(row) {
-    if (!row || !row.dataset) return;
-    var tmp = document.createElement('textarea');
-    tmp.innerHTML = row.dataset.strat || '';
-    var stratName = tmp.value;
-    var mapEl = document.getElementById('stratDataMap');
-    var stratMap = {};
-    try { stratMap = JSON.parse(mapEl.textContent || mapEl.innerHTML); } catch(e){}
-    var info = stratMap[stratName] || {};
-    _applyTradePlan(stratName, info.strike || 'N/A', info.rank || 'PRIMARY', typeof info.rr === 'number' ? info.rr : 0);
-}
+            # Step 3: widen window to ±500 on same 1Y data
+            if len(res_c) < 2 or len(sup_c) < 2:
+                print("  🔄 Widening window to ±500 on 1Y data")
+                try:
+                    res_c, sup_c = _find_levels(highs_1yr, lows_1yr, current_price, 500)
+                    print(f"  Wide window | res_c={len(res_c)} sup_c={len(sup_c)}")
+                except Exception:
+                    res_c, sup_c = [], []
 
-var _oiInterval = 3;
-var _oiData     = [];
+            # Calculate levels — no hardcoding, N/A if genuinely nothing found
+            if len(res_c) >= 2:
+                r1 = round(float(np.percentile(res_c, 25)) / 25) * 25
+                r2 = round(float(np.percentile(res_c, 65)) / 25) * 25
+                if r1 <= current_price:
+                    r1 = round(float(np.percentile(res_c, 50)) / 25) * 25
+                if r2 and r1 and r2 <= r1:
+                    r2 = round(float(np.percentile(res_c, 80)) / 25) * 25
+            else:
+                print("  ⚠️  No resistance levels found — will show N/A")
 
-function setOIInterval(mins, btn) {
-    _oiInterval = mins;
-    document.querySelectorAll('.oi-int-btn').forEach(function(b){ b.classList.remove('active'); });
-    btn.classList.add('active');
-    renderOITable(_oiData);
-}
+            if len(sup_c) >= 2:
+                s1 = round(float(np.percentile(sup_c, 75)) / 25) * 25
+                s2 = round(float(np.percentile(sup_c, 35)) / 25) * 25
+                if s1 >= current_price:
+                    s1 = round(float(np.percentile(sup_c, 50)) / 25) * 25
+                if s2 and s1 and s2 >= s1:
+                    s2 = round(float(np.percentile(sup_c, 20)) / 25) * 25
+            else:
+                print("  ⚠️  No support levels found — will show N/A")
 
-function fmtIN(n) {
-    var abs = Math.abs(n);
-    var sign = n < 0 ? '-' : '+';
-    if (abs >= 10000000) return sign + (abs/10000000).toFixed(2) + ' Cr';
-    if (abs >= 100000)   return sign + (abs/100000).toFixed(2)   + ' L';
-    if (abs === 0)       return '0';
-    return (n < 0 ? '-' : '+') + abs.toLocaleString('en-IN');
-}
+            print(f"  ✓ Final Levels | S2={s2} S1={s1} | Price={current_price:.0f} | R1={r1} R2={r2}")
 
-function signalHtml(sig) {
-    var s = (sig||'').toUpperCase().trim();
-    if (s === 'STRONG SELL') return '<span class="oi-signal-ssell">STRONG SELL</span>';
-    if (s === 'SELL')        return '<span class="oi-signal-sell">SELL</span>';
-    if (s === 'STRONG BUY')  return '<span class="oi-signal-sbuy">STRONG BUY</span>';
-    if (s === 'BUY')         return '<span class="oi-signal-buy">BUY</span>';
-    return '<span class="oi-signal-neutral">NEUTRAL</span>';
-}
+            # Assign to technical dict — None means N/A, no fallback invented
+            resistance        = r1
+            support           = s1
+            strong_resistance = r2
+            strong_support    = s2
+            # ── Previous candle OHLC for pivot point calculation ───────────────
+            prev_row   = df.iloc[-2] if len(df) >= 2 else latest
+            prev_high  = float(prev_row['High'])
+            prev_low   = float(prev_row['Low'])
+            prev_close = float(prev_row['Close'])
 
-function vsigHtml(sig) {
-    return (sig||'').toUpperCase() === 'BUY'
-        ? '<span class="oi-vsig-buy">BUY</span>'
-        : '<span class="oi-vsig-sell">SELL</span>';
-}
+            technical = {
+                'current_price':    current_price,
+                'sma_20':           latest['SMA_20'],
+                'sma_50':           latest['SMA_50'],
+                'sma_200':          latest['SMA_200'],
+                'rsi':              latest['RSI'],
+                'macd':             macd_val,
+                'signal':           signal_val,
+                'macd_prev':        macd_prev_val,
+                'signal_prev':      signal_prev_val,
+                'resistance':       resistance,
+                'support':          support,
+                'strong_resistance':strong_resistance,
+                'strong_support':   strong_support,
+                'prev_high':        prev_high,
+                'prev_low':         prev_low,
+                'prev_close':       prev_close,
+            }
+            print(f"✓ Technical | Price: {technical['current_price']:.2f} | RSI: {technical['rsi']:.1f}")
+            return technical, df   # the frame is reused by compute_weekly_outlook — no second fetch
+        except Exception as e:
+            print(f"Technical error: {e}"); return None, None
 
-function filterByInterval(data, mins) {
-    // Step 1: Restrict to today only (use date from most-recent entry's timestamp)
-    var todayData = data;
-    if (data && data.length > 0) {
-        var latestTs  = data[0].timestamp || '';
-        var todayDate = latestTs.split(' ')[0]; // "04-Mar-2026"
-        if (todayDate) {
-            todayData = data.filter(function(row) {
-                return (row.timestamp || '').startsWith(todayDate);
-            });
-        }
-    }
-    if (mins === 3) return todayData;
-    // Step 2: Group by date+hour:slot so same time on different days never merges
-    var grouped = {};
-    todayData.forEach(function(row) {
-        var ts      = row.timestamp || '';
-        var dateKey = ts.split(' ')[0] || 'unknown';
-        var parts   = (row.time||'00:00').split(':');
-        var h       = parseInt(parts[0]||0);
-        var m       = parseInt(parts[1]||0);
-        var slotMin = Math.floor(m / mins) * mins;
-        var key     = dateKey + '|' + String(h).padStart(2,'0') + ':' + String(slotMin).padStart(2,'0');
-        if (!grouped[key]) grouped[key] = [];
-        grouped[key].push(row);
-    });
-    var keys = Object.keys(grouped).sort().reverse();
-    return keys.map(function(key) {
-        var rows    = grouped[key];
-        // rows[0] = newest snapshot in this window (data is reverse-chronological)
-        var latest  = rows[0];
-        var displayTime = key.split('|')[1];
-        return {
-            time:          displayTime,
-            // FIX: OI values are cumulative snapshots (today vs yesterday), NOT deltas.
-            // Summing them across snapshots was wrong (5x inflation). Use latest snapshot.
-            call_oi_chg:   latest.call_oi_chg || 0,
-            put_oi_chg:    latest.put_oi_chg  || 0,
-            diff:          (latest.put_oi_chg||0) - (latest.call_oi_chg||0),
-            pcr:           latest.pcr,
-            opt_signal:    latest.opt_signal,
-            vwap:           latest.vwap,
-            spot_price:     latest.spot_price,
-            nifty_move_pct: latest.nifty_move_pct,
-            nearest_level:  latest.nearest_level,
-            nearest_label:  latest.nearest_label,
-            distance_pts:   latest.distance_pts,
-            vwap_signal:    latest.vwap_signal,
-            rsi_15m:        latest.rsi_15m,
-            ema_signal:     latest.ema_signal,
-            ema5:           latest.ema5,
-            ema13:          latest.ema13,
-            bias:           latest.bias,
-            support:        latest.support,
-            resistance:     latest.resistance,
-            strong_support:     latest.strong_support,
-            strong_resistance:  latest.strong_resistance,
-            timestamp:      latest.timestamp,
-            _isLive:       rows[0]._isLive,
-        };
-    });
-}
+    def calculate_smart_stop_loss(self, current_price, support, resistance, bias):
+        if bias == "BULLISH": return round(max(support - 30, current_price - 150), 0)
+        elif bias == "BEARISH": return round(min(resistance + 30, current_price + 150), 0)
+        return None
 
-/* ── FOCUS / DETAIL view toggle ───────────────────────────── */
-var _oiViewMode = 'focus';
-function setOIView(mode) {
-    _oiViewMode = mode;
-    try { history.replaceState(null, '', mode === 'detail' ? '#oi-detail' : ' '); } catch(e) {}
-    var tableWrap = document.querySelector('.oi-table-wrap');
-    if (!tableWrap) return;
-    if (mode === 'detail') {
-        tableWrap.classList.add('oi-detail-mode');
-    } else {
-        tableWrap.classList.remove('oi-detail-mode');
-    }
-    var btnFocus  = document.getElementById('btnFocus');
-    var btnDetail = document.getElementById('btnDetail');
-    if (btnFocus)  btnFocus.classList.toggle('oi-view-active',  mode === 'focus');
-    if (btnDetail) btnDetail.classList.toggle('oi-view-active', mode === 'detail');
-}
-/* Restore last chosen OI view mode (default: focus) */
-window.addEventListener('load', function(){ setOIView(location.hash === '#oi-detail' ? 'detail' : 'focus'); });
+    def generate_analysis_data(self, technical, option_analysis, fii_dii_raw=None):
+        if not technical:
+            self.log("⚠️  Technical data unavailable"); return
+        current    = technical['current_price']
+        support    = technical['support']
+        resistance = technical['resistance']
+        ist_now    = datetime.now(pytz.timezone('Asia/Kolkata'))
+        bullish_score = bearish_score = 0
+        for sma in ['sma_20','sma_50','sma_200']:
+            if current > technical[sma]: bullish_score += 1
+            else: bearish_score += 1
+        rsi = technical['rsi']
+        if   rsi > 70: bearish_score += 1
+        elif rsi < 30: bullish_score += 2
+        # ── MACD: histogram slope fires BEFORE full crossover ──────────────────
+        macd_hist      = technical['macd']      - technical['signal']
+        macd_hist_prev = technical['macd_prev'] - technical['signal_prev']
+        if technical['macd'] > technical['signal']:
+            bullish_score += 1          # full crossover — confirmed bull
+        elif macd_hist > macd_hist_prev:
+            bullish_score += 1          # histogram building — early bull momentum
+        else:
+            bearish_score += 1
+        if option_analysis:
+            pcr = option_analysis['pcr_oi']; max_pain = option_analysis['max_pain']
+            if   pcr > 1.1: bullish_score += 2
+            elif pcr < 0.9: bearish_score += 2
+            if   current > max_pain+100: bearish_score += 1
+            elif current < max_pain-100: bullish_score += 1
+        score_diff = bullish_score - bearish_score
+        print(f"  📊 Bullish: {bullish_score} | Bearish: {bearish_score} | Diff: {score_diff} | MACD hist: {macd_hist:.2f} prev: {macd_hist_prev:.2f}")
+        if   score_diff >= 3:  bias,bias_icon,bias_class="BULLISH","📈","bullish";    confidence="HIGH" if score_diff >= 4 else "MEDIUM"
+        elif score_diff == 2:  bias,bias_icon,bias_class="WATCH BULL","⚡","watchbull"; confidence="MEDIUM"
+        elif score_diff == -2: bias,bias_icon,bias_class="WATCH BEAR","⚠️","watchbear"; confidence="MEDIUM"
+        elif score_diff <= -3: bias,bias_icon,bias_class="BEARISH","📉","bearish";    confidence="HIGH" if score_diff <= -4 else "MEDIUM"
+        else:                  bias,bias_icon,bias_class="SIDEWAYS","↔️","sideways";   confidence="LOW"
+        if   rsi > 70: rsi_status,rsi_badge,rsi_icon="Overbought","bearish","🔴"
+        elif rsi < 30: rsi_status,rsi_badge,rsi_icon="Oversold","bullish","🟢"
+        else:          rsi_status,rsi_badge,rsi_icon="Neutral","neutral","🟡"
+        macd_bullish = technical['macd'] > technical['signal']
+        if option_analysis:
+            pcr = option_analysis['pcr_oi']
+            if   pcr > 1.1: pcr_status,pcr_badge,pcr_icon="Bullish","bullish","🟢"
+            elif pcr < 0.9: pcr_status,pcr_badge,pcr_icon="Bearish","bearish","🔴"
+            else:           pcr_status,pcr_badge,pcr_icon="Neutral","neutral","🟡"
+        else:
+            pcr_status,pcr_badge,pcr_icon="N/A","neutral","🟡"
+        if option_analysis:
+            max_ce_strike=option_analysis['max_ce_oi_strike']; max_pe_strike=option_analysis['max_pe_oi_strike']
+            atm_strike=option_analysis['atm_strike']
+        else:
+            atm_strike=int(current/50)*50; max_ce_strike=atm_strike+200; max_pe_strike=atm_strike-200
+        if bias == "BULLISH":
+            mid=((support+resistance)/2); entry_low=current-100 if current>mid else current-50
+            entry_high=current-50 if current>mid else current; target_1=resistance; target_2=max_ce_strike
+            stop_loss=self.calculate_smart_stop_loss(current,support,resistance,"BULLISH")
+        elif bias == "BEARISH":
+            mid=((support+resistance)/2); entry_low=current
+            entry_high=current+100 if current<mid else current+50; target_1=support; target_2=max_pe_strike
+            stop_loss=self.calculate_smart_stop_loss(current,support,resistance,"BEARISH")
+        else:
+            entry_low=support; entry_high=resistance; target_1=resistance; target_2=support; stop_loss=None
+        if stop_loss and bias != "SIDEWAYS":
+            risk_points=abs(current-stop_loss); reward_points=abs(target_1-current)
+            risk_reward_ratio=round(reward_points/risk_points,2) if risk_points>0 else 0
+        else:
+            risk_points=reward_points=risk_reward_ratio=0
+        rsi_pct=min(100,max(0,rsi))
+        def sma_bar(sma_val):
+            diff=(current-sma_val)/sma_val*100; return min(100,max(0,50+diff*10))
+        macd_val=technical['macd']; macd_pct=min(100,max(0,50+macd_val*2))
+        pcr_pct=min(100,max(0,(option_analysis['pcr_oi']/2*100))) if option_analysis else 50
+        if option_analysis:
+            rng=resistance-support if resistance!=support else 1
+            mp_pct=min(100,max(0,(option_analysis['max_pain']-support)/rng*100))
+            total_oi=option_analysis['total_ce_oi']+option_analysis['total_pe_oi']
+            ce_oi_pct=min(100,max(0,option_analysis['total_ce_oi']/total_oi*100)) if total_oi>0 else 50
+            pe_oi_pct=100-ce_oi_pct
+        else:
+            mp_pct=ce_oi_pct=pe_oi_pct=50
+        fii_dii_raw  = fii_dii_raw or fetch_fii_dii_data(self.nse)
+        fii_dii_summ = compute_fii_dii_summary(fii_dii_raw)
+        self.html_data = {
+            'timestamp': ist_now.strftime('%d-%b-%Y %H:%M IST'),
+            'current_price': current, 'expiry': option_analysis['expiry'] if option_analysis else 'N/A',
+            'atm_strike': atm_strike, 'bias': bias, 'bias_icon': bias_icon, 'bias_class': bias_class,
+            'confidence': confidence, 'bullish_score': bullish_score, 'bearish_score': bearish_score,
+            'rsi': rsi, 'rsi_pct': rsi_pct, 'rsi_status': rsi_status, 'rsi_badge': rsi_badge, 'rsi_icon': rsi_icon,
+            'sma_20': technical['sma_20'], 'sma_20_above': current>technical['sma_20'], 'sma_20_pct': sma_bar(technical['sma_20']),
+            'sma_50': technical['sma_50'], 'sma_50_above': current>technical['sma_50'], 'sma_50_pct': sma_bar(technical['sma_50']),
+            'sma_200': technical['sma_200'], 'sma_200_above': current>technical['sma_200'], 'sma_200_pct': sma_bar(technical['sma_200']),
+            'macd': technical['macd'], 'macd_signal': technical['signal'], 'macd_bullish': macd_bullish, 'macd_pct': macd_pct,
+            'pcr': option_analysis['pcr_oi'] if option_analysis else 0, 'pcr_pct': pcr_pct,
+            'pcr_status': pcr_status, 'pcr_badge': pcr_badge, 'pcr_icon': pcr_icon,
+            'max_pain': option_analysis['max_pain'] if option_analysis else 0, 'max_pain_pct': mp_pct,
+            'max_ce_oi': max_ce_strike, 'max_pe_oi': max_pe_strike,
+            'ce_oi_pct': ce_oi_pct, 'pe_oi_pct': pe_oi_pct,
+            'total_ce_oi_change': option_analysis['total_ce_oi_change'] if option_analysis else 0,
+            'total_pe_oi_change': option_analysis['total_pe_oi_change'] if option_analysis else 0,
+            'net_oi_change': option_analysis['net_oi_change'] if option_analysis else 0,
+            'oi_direction': option_analysis['oi_direction'] if option_analysis else 'N/A',
+            'oi_signal': option_analysis['oi_signal'] if option_analysis else 'N/A',
+            'oi_icon': option_analysis['oi_icon'] if option_analysis else '🟡',
+            'oi_class': option_analysis['oi_class'] if option_analysis else 'neutral',
+            'support': support, 'resistance': resistance,
+            'strong_support': technical['strong_support'], 'strong_resistance': technical['strong_resistance'],
+            'strategy_type': bias, 'entry_low': entry_low, 'entry_high': entry_high,
+            'target_1': target_1, 'target_2': target_2, 'stop_loss': stop_loss,
+            'risk_points': int(risk_points), 'reward_points': int(reward_points),
+            'risk_reward_ratio': risk_reward_ratio,
+            'has_option_data': option_analysis is not None,
+            'df': option_analysis['df'] if option_analysis else None,
+            # Whole-chain metrics next to the ATM-window ones above (no max-pain curve)
+            'full_chain': ({k: v for k, v in option_analysis['full_chain'].items() if k != 'max_pain_curve'}
+                           if option_analysis else None),
+            'fii_dii_data': fii_dii_raw, 'fii_dii_summ': fii_dii_summ,
+            'prev_high':  technical.get('prev_high', 0),
+            'prev_low':   technical.get('prev_low', 0),
+            'prev_close': technical.get('prev_close', 0),
+        }
 
-/* ══ ELAPSED TIMER SYSTEM — replaces static LIVE badge ══════════════════ */
-var _elapsedTimerRef = null;   // Date.now() when current live entry was first seen
-var _elapsedTimerKey = '';     // time string of the current live entry (e.g. "09:20")
-var _elapsedTimerInterval = null;
+    def _full_chain_html(self, d):
+        """One-line whole-chain PCR / max pain / OI walls, when the chain is wider than the ATM window."""
+        fc = d.get('full_chain')
+        df = d.get('df')
+        if not fc or not fc.get('strikes') or df is None or fc['strikes'] <= len(df):
+            return ""
+        lo, hi = fc['strike_range']
+        return (f'<div style="margin-top:10px;padding:8px 12px;border-radius:8px;background:rgba(79,195,247,0.06);'
+                f'border:1px solid rgba(79,195,247,0.18);font-size:12px;color:#b0bec5;">'
+                f'&#128301; <strong style="color:#80deea;">Full chain</strong> ({fc["strikes"]} strikes, {lo:,}–{hi:,}) · '
+                f'PCR <strong style="color:#e0f7fa;">{fc["pcr_oi"]:.2f}</strong> · '
+                f'Max Pain <strong style="color:#e0f7fa;">{fc["max_pain"]:,}</strong> · '
+                f'CE wall <strong style="color:#ff8a80;">{fc["max_ce_oi_strike"]:,}</strong> · '
+                f'PE wall <strong style="color:#69f0ae;">{fc["max_pe_oi_strike"]:,}</strong></div>')
 
-function _startElapsedTimer(entryTime) {
-    // If the live entry changed, reset the reference
-    if (entryTime !== _elapsedTimerKey) {
-        _elapsedTimerKey = entryTime;
-        _elapsedTimerRef = Date.now();
-    }
-    // Clear any previous interval
-    if (_elapsedTimerInterval) clearInterval(_elapsedTimerInterval);
-    // Tick every second
-    _elapsedTimerInterval = setInterval(_updateElapsedDisplays, 1000);
-    _updateElapsedDisplays();
-}
+    def _bar_color_class(self, badge):
+        return {'bullish':'bar-teal','bearish':'bar-red','neutral':'bar-gold'}.get(badge,'bar-teal')
 
-function _fmtElapsed(ms) {
-    var totalSec = Math.floor(ms / 1000);
-    var m = Math.floor(totalSec / 60);
-    var s = totalSec % 60;
-    return m + 'm:' + (s < 10 ? '0' : '') + s + 's';
-}
+    def _stat_card(self, icon, label, value, badge_text, badge_class, bar_pct, bar_type, sub_text=""):
+        tag_map = {'bullish':('tag-bull','#00e5ff'),'bearish':('tag-bear','#ff5252'),'neutral':('tag-neu','#ffb74d')}
+        tag_cls,_ = tag_map.get(badge_class, tag_map['neutral'])
+        border_color = {'bullish':'rgba(0,229,255,0.35)','bearish':'rgba(255,82,82,0.35)'}.get(badge_class,'rgba(255,183,77,0.25)')
+        top_color = {'bullish':'#00e5ff','bearish':'#ff5252'}.get(badge_class,'#ffb74d')
 
-function _updateElapsedDisplays() {
-    if (!_elapsedTimerRef) return;
-    var elapsed = Date.now() - _elapsedTimerRef;
-    var txt = _fmtElapsed(elapsed);
-    // Update all elapsed badges in OI table
-    var oiBadges = document.querySelectorAll('.oi-elapsed');
-    oiBadges.forEach(function(el){ el.textContent = txt; });
-    // Update all elapsed badges in NLF panel
-    var nlfBadges = document.querySelectorAll('.nlf-elapsed');
-    nlfBadges.forEach(function(el){ el.textContent = txt; });
-}
+        # ── RSI: circular ring gauge ─────────────────────────────────────────
+        if label.startswith('RSI'):
+            try:    rsi_num = float(value)
+            except: rsi_num = 50.0
+            circumf = 138.2
+            offset  = circumf * (1 - rsi_num / 100)
+            ring_col = '#ff5252' if rsi_num > 70 else ('#00e676' if rsi_num < 30 else '#ffb74d')
+            extra_visual = f"""
+            <div style="display:flex;justify-content:center;margin:6px 0 8px;">
+              <div style="position:relative;width:56px;height:56px;">
+                <svg viewBox="0 0 56 56" style="width:100%;height:100%;">
+                  <circle cx="28" cy="28" r="22" fill="none" stroke="rgba(255,255,255,0.06)" stroke-width="7"/>
+                  <circle cx="28" cy="28" r="22" fill="none" stroke="{ring_col}" stroke-width="7"
+                    stroke-linecap="round" stroke-dasharray="{circumf:.1f}" stroke-dashoffset="{offset:.1f}"
+                    style="transform:rotate(-90deg);transform-origin:28px 28px;" opacity="0.85"/>
+                </svg>
+                <div style="position:absolute;inset:0;display:flex;align-items:center;justify-content:center;
+                  font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;color:{ring_col};">{rsi_num:.0f}</div>
+              </div>
+            </div>"""
+        # ── MACD: mini histogram bars ────────────────────────────────────────
+        elif label.startswith('MACD'):
+            bar_color = '#ff5252' if badge_class == 'bearish' else '#00e676'
+            heights = [30,45,55,68,78,88,95,100] if badge_class == 'bearish' else [100,90,75,60,48,35,22,12]
+            hist_bars = ''.join(
+                f'<div style="flex:1;height:{h}%;background:{bar_color};opacity:{0.4+i*0.075:.2f};'
+                f'border-radius:2px 2px 0 0;min-width:3px;"></div>'
+                for i,h in enumerate(heights)
+            )
+            extra_visual = f"""
+            <div style="display:flex;align-items:flex-end;gap:2px;height:36px;padding:0 2px;margin:6px 0 8px;">
+              {hist_bars}
+            </div>"""
+        # ── SMA: mini sparkline trend line ───────────────────────────────────
+        elif label.startswith('SMA'):
+            line_color = '#ff5252' if badge_class == 'bearish' else '#00e676'
+            pts = "0,28 12,24 22,20 30,22 40,26 50,18 60,14 70,10 80,12 90,8 100,6" if badge_class == 'bullish' else "0,8 12,10 22,14 30,12 40,9 50,18 60,22 70,26 80,24 90,28 100,30"
+            extra_visual = f"""
+            <div style="height:32px;margin:6px 0 8px;position:relative;">
+              <svg viewBox="0 0 100 32" preserveAspectRatio="none" style="width:100%;height:100%;overflow:visible;">
+                <polyline points="{pts}" fill="none" stroke="{line_color}" stroke-width="1.8"
+                  stroke-linejoin="round" opacity="0.7"/>
+              </svg>
+            </div>"""
+        else:
+            extra_visual = ''
 
-function renderOITable(data) {
-    var tbody = document.getElementById('oiTableBody');
-    if (!tbody) return;
-    if (!data || data.length === 0) {
-        tbody.innerHTML = '<tr><td colspan="15" class="oi-empty-state">&#128218; No data yet.</td></tr>';
-        return;
-    }
-    var filtered = filterByInterval(data, _oiInterval);
-    var latest = filtered[0];
+        bg_map = {'bullish':'linear-gradient(145deg,rgba(10,30,20,0.9),rgba(4,14,10,0.95))',
+                  'bearish':'linear-gradient(145deg,rgba(30,10,14,0.9),rgba(12,4,8,0.95))',
+                  'neutral':'linear-gradient(145deg,rgba(28,22,8,0.9),rgba(12,10,4,0.95))'}
+        card_bg = bg_map.get(badge_class, '#111827')
 
-    // ── Update summary cards (text only, no DOM rebuild) ──
-    if (latest) {
-        var el;
-        el = document.getElementById('oiLatestPCR'); if (el) el.textContent = latest.pcr || '—';
-        el = document.getElementById('oiLatestDiff');
-        if (el) { el.textContent = fmtIN(latest.diff || 0); el.className = 'oi-sum-val ' + ((latest.diff||0) >= 0 ? 'oi-diff-pos' : 'oi-diff-neg'); }
-        el = document.getElementById('oiLatestSpot'); if (el) el.textContent = '₹' + ((latest.spot_price||0).toLocaleString('en-IN'));
-        el = document.getElementById('oiLatestSignal'); if (el) el.innerHTML = signalHtml(latest.opt_signal);
-    }
-    var ce = document.getElementById('oiChartEntries');
-    if (ce) ce.textContent = filtered.length + ' candles';
+        return f"""
+            <div class="g-compact" style="border-color:{border_color};background:{card_bg};">
+                <div style="position:absolute;top:0;left:0;right:0;height:1px;
+                  background:linear-gradient(90deg,transparent,{top_color},transparent);"></div>
+                <div class="cc-top"><span class="cc-ico">{icon}</span><div class="cc-lbl">{label}</div>
+                  <span class="tag {tag_cls}">{badge_text}</span></div>
+                {extra_visual}
+                <div class="cc-val">{value}</div>
+                {f'<div class="cc-sub">{sub_text}</div>' if sub_text else ''}
+                <div class="cc-bar"><div class="cc-bar-fill {bar_type}" style="width:{bar_pct:.1f}%"></div></div>
+            </div>"""
 
-    // ── Redraw sparkline (canvas, no flicker) ──
-    drawSparkline(filtered);
+    def _build_enhanced_oc_cards(self):
+        """Enhanced Option Chain cards: PCR needle meter, Max Pain zone bar, CE/PE OI battle bars."""
+        d = self.html_data
+        if not d['has_option_data']:
+            return '<div style="color:#80deea;padding:20px;">Option chain data unavailable</div>'
 
-    // ── Table rebuild: full rebuild on interval change, smart append on same interval ──
-    var existingRows = tbody.querySelectorAll('tr[data-time]');
-    var existingTimes = {};
-    existingRows.forEach(function(r){ existingTimes[r.getAttribute('data-time')] = r; });
+        pcr     = d['pcr']
+        max_pain= d['max_pain']
+        max_ce  = d['max_ce_oi']
+        max_pe  = d['max_pe_oi']
+        spot    = d['current_price']
+        ce_pct  = d['ce_oi_pct']
+        pe_pct  = d['pe_oi_pct']
 
-    // Detect if the current table rows match the filtered set — if not, full rebuild
-    var filteredTimes = filtered.map(function(r){ return r.time || ''; });
-    var existingTimesList = Object.keys(existingTimes);
-    var needsFullRebuild = (existingTimesList.length > 0) && (
-        existingTimesList.length !== filteredTimes.length ||
-        filteredTimes.some(function(t){ return !existingTimes[t]; }) ||
-        existingTimesList.some(function(t){ return filteredTimes.indexOf(t) < 0; })
-    );
-    if (needsFullRebuild) {
-        tbody.innerHTML = '';
-        existingTimes = {};
-    }
+        pcr_tag    = 'Bearish' if pcr < 0.9 else ('Bullish' if pcr > 1.1 else 'Neutral')
+        pcr_col    = '#ff5252' if pcr < 0.9 else ('#00e676' if pcr > 1.1 else '#ffb74d')
+        pcr_border = 'rgba(255,82,82,0.35)' if pcr < 0.9 else ('rgba(0,230,118,0.35)' if pcr > 1.1 else 'rgba(255,183,77,0.3)')
+        pcr_tag_cls= 'tag-bear' if pcr < 0.9 else ('tag-bull' if pcr > 1.1 else 'tag-neu')
+        pcr_needle_pct = round(min(97, max(3, pcr / 2.0 * 100)), 1)
 
-    // Remove elapsed badge from previous live row
-    var prevLive = tbody.querySelector('.oi-live-row');
-    if (prevLive) {
-        prevLive.classList.remove('oi-live-row');
-        var liveInd = prevLive.querySelector('.oi-live-ind');
-        if (liveInd) liveInd.remove();
-        var elapsedInd = prevLive.querySelector('.oi-elapsed');
-        if (elapsedInd) elapsedInd.remove();
-        var td = prevLive.querySelector('td:first-child');
-        if (td) { var div = td.querySelector('.oi-time-cell'); if (div) td.textContent = div.textContent.replace('LIVE','').trim(); }
-    }
+        level_min = min(spot, max_pain) - 200
+        level_max = max(spot, max_pain) + 200
+        rng = level_max - level_min or 1
+        spot_pct  = round((spot - level_min) / rng * 100, 1)
+        pain_pct  = round((max_pain - level_min) / rng * 100, 1)
+        pain_diff = int(max_pain - spot)
+        pain_sign = '+' if pain_diff >= 0 else ''
+        pain_col  = '#00e676' if pain_diff > 0 else '#ff5252'
 
-    // Build new rows for times not yet in table, prepend them
-    var newRowsHtml = '';
-    filtered.forEach(function(row, idx) {
-        var t = row.time || '';
-        if (!existingTimes[t]) {
-            var isLive  = (idx === 0);
-            var diffCls = (row.diff||0) >= 0 ? 'oi-diff-pos' : 'oi-diff-neg';
-            var timeCell = isLive
-                ? '<div class="oi-time-cell"><span class="oi-time-val">' + t + '</span>&nbsp;<span class="oi-elapsed"></span></div>'
-                : '<div class="oi-time-cell"><span class="oi-time-val">' + t + '</span></div>';
-            var isBuy = (row.opt_signal||'').toUpperCase().indexOf('BUY') >= 0;
-            var isSell = (row.opt_signal||'').toUpperCase().indexOf('SELL') >= 0;
-            var nlabel = row.nearest_label || (isBuy ? 'R1' : isSell ? 'S1' : '—');
-            var nval   = row.nearest_level ? '₹' + row.nearest_level.toLocaleString('en-IN') : '—';
-            var isNeutral = !isBuy && !isSell;
-            var nlevelHtml, distHtml;
-            if (row.nearest_level) {
-                nlevelHtml = '<span class="oi-nlevel-badge ' + (isBuy ? 'oi-nlevel-res' : 'oi-nlevel-sup') + '">'
-                  + '<span class="oi-nlevel-label">' + nlabel + '</span>'
-                  + nval + '</span>';
-                distHtml = '<span class="oi-dist-val ' + (isBuy ? 'oi-dist-res' : 'oi-dist-sup') + '">'
-                  + (isBuy ? '+' : '-') + Math.abs(row.distance_pts) + ' pts'
-                  + (row.nearest_label === 'S2' || row.nearest_label === 'R2'
-                      ? ' <span style="font-size:8px;opacity:0.6;">(to ' + (row.nearest_label||'') + ')</span>'
-                      : '')
-                  + '</span>';
-            } else if (isNeutral) {
-                // FIX v11: NEUTRAL OI signal → use ONLY spot price momentum.
-                // Technical bias (SMA/RSI/MACD) is ignored here because it can lag.
-                // Simple rule: price rising → WATCH BULL, price falling → WATCH BEAR.
-                var wbHtml, wdHtml;
-                var curSpot  = row.spot_price || 0;
-                var oldestRow = null;
-                for (var mi = 3; mi >= 1; mi--) {
-                    if (filtered[idx + mi] && filtered[idx + mi].spot_price) {
-                        oldestRow = filtered[idx + mi]; break;
-                    }
-                }
-                var momDelta = oldestRow ? (curSpot - oldestRow.spot_price) : 0;
+        ce_oi_chg   = d.get('total_ce_oi_change', 0)
+        pe_oi_chg   = d.get('total_pe_oi_change', 0)
+        total_abs   = abs(ce_oi_chg) + abs(pe_oi_chg) or 1
+        ce_bar_pct  = round(abs(ce_oi_chg) / total_abs * 100, 1)
+        pe_bar_pct  = round(abs(pe_oi_chg) / total_abs * 100, 1)
+        ce_chg_col  = '#ff5252' if ce_oi_chg > 0 else '#00e676'
+        pe_chg_col  = '#00e676' if pe_oi_chg > 0 else '#ff5252'
 
-                if (momDelta > 15) {
-                    // Price rising → WATCH BULL with R1 target
-                    var wbR1 = row.resistance || row.nearest_level;
-                    var wbRDist = (wbR1 && curSpot) ? Math.round(wbR1 - curSpot) : null;
-                    wbHtml = '<div style="display:flex;flex-direction:column;align-items:center;gap:3px;">'
-                        + '<span style="display:inline-flex;align-items:center;gap:4px;padding:3px 10px;border-radius:6px;'
-                        + 'font-size:10px;font-weight:800;background:rgba(181,234,58,0.12);color:#b5ea3a;'
-                        + 'border:1px solid rgba(181,234,58,0.3);">⚡ WATCH BULL</span>'
-                        + (wbR1 ? '<span style="font-size:11px;font-family:monospace;font-weight:700;"><span style="color:#00e676;font-weight:800;">R1</span> <span style="color:#00e676;">₹' + Number(wbR1).toLocaleString('en-IN') + '</span></span>' : '<span style="font-size:8px;color:rgba(181,234,58,0.5);font-family:monospace;">spot momentum</span>')
-                        + '</div>';
-                    wdHtml = (wbRDist !== null && wbRDist > 0)
-                        ? '<span style="font-size:13px;color:#00e676;font-family:monospace;font-weight:700;">▲ +' + wbRDist + ' pts</span>'
-                        : '<span style="font-size:9px;color:rgba(181,234,58,0.6);font-family:monospace;font-weight:600;">▲ +' + Math.abs(momDelta).toFixed(1) + ' pts drift</span>';
-                } else if (momDelta < -15) {
-                    // Price falling → WATCH BEAR with S1 target
-                    var wbS1 = row.support || row.nearest_level;
-                    var wbSDist = (wbS1 && curSpot) ? Math.round(curSpot - wbS1) : null;
-                    wbHtml = '<div style="display:flex;flex-direction:column;align-items:center;gap:3px;">'
-                        + '<span style="display:inline-flex;align-items:center;gap:4px;padding:3px 10px;border-radius:6px;'
-                        + 'font-size:10px;font-weight:800;background:rgba(255,152,0,0.12);color:#ff9800;'
-                        + 'border:1px solid rgba(255,152,0,0.3);">⚠ WATCH BEAR</span>'
-                        + (wbS1 ? '<span style="font-size:11px;font-family:monospace;font-weight:700;"><span style="color:#ff4757;font-weight:800;">S1</span> <span style="color:#ff4757;">₹' + Number(wbS1).toLocaleString('en-IN') + '</span></span>' : '<span style="font-size:8px;color:rgba(255,152,0,0.5);font-family:monospace;">spot momentum</span>')
-                        + '</div>';
-                    wdHtml = (wbSDist !== null && wbSDist > 0)
-                        ? '<span style="font-size:13px;color:#ff4757;font-family:monospace;font-weight:700;">▼ -' + wbSDist + ' pts</span>'
-                        : '<span style="font-size:9px;color:rgba(255,152,0,0.6);font-family:monospace;font-weight:600;">▼ -' + Math.abs(momDelta).toFixed(1) + ' pts drift</span>';
-                } else {
-                    // Truly flat — price barely moving
-                    wbHtml = '<span style="display:inline-flex;align-items:center;gap:4px;padding:3px 10px;border-radius:6px;'
-                        + 'font-size:10px;font-weight:700;background:rgba(176,190,197,0.06);color:#78909c;'
-                        + 'border:1px solid rgba(176,190,197,0.15);">→ Flat</span>';
-                    wdHtml = '<span style="font-size:9px;color:rgba(176,190,197,0.35);font-family:monospace;">'
-                        + (oldestRow ? '±' + Math.abs(momDelta).toFixed(1) + ' pts' : 'no data') + '</span>';
-                }
-                nlevelHtml = wbHtml;
-                distHtml   = wdHtml;
-            } else {
-                nlevelHtml = '<span style="color:rgba(176,190,197,0.3);">—</span>';
-                distHtml   = '<span style="color:rgba(176,190,197,0.3);">—</span>';
-            }
+        return f"""
+        <!-- ── PCR Card ──────────────────────────────────────────────── -->
+        <div class="g-compact" style="border-color:{pcr_border};background:linear-gradient(145deg,rgba(12,4,8,0.95),rgba(8,4,6,0.98));position:relative;overflow:hidden;">
+          <div style="position:absolute;top:0;left:0;right:0;height:1px;
+            background:linear-gradient(90deg,transparent,{pcr_col},transparent);"></div>
+          <div class="cc-top">
+            <span class="cc-ico">&#128308;</span>
+            <div class="cc-lbl">PCR Ratio (OI)</div>
+            <span class="tag {pcr_tag_cls}">{pcr_tag}</span>
+          </div>
+          <div class="cc-val" style="color:{pcr_col};">{pcr:.3f}</div>
+          <div class="cc-sub">Put/Call OI Ratio</div>
+          <div style="position:relative;margin:8px 0 4px;">
+            <div style="height:8px;border-radius:4px;overflow:hidden;background:rgba(0,0,0,0.4);position:relative;">
+              <div style="position:absolute;inset:0;border-radius:4px;
+                background:linear-gradient(90deg,#ff3355 0%,#ff9900 35%,#ffcc00 50%,#88dd00 65%,#00e676 100%);opacity:0.75;"></div>
+              <div style="position:absolute;left:35%;top:0;bottom:0;width:1px;background:rgba(255,255,255,0.4);"></div>
+              <div style="position:absolute;left:60%;top:0;bottom:0;width:1px;background:rgba(255,255,255,0.4);"></div>
+              <div style="position:absolute;top:-3px;left:{pcr_needle_pct}%;
+                transform:translateX(-50%);width:3px;height:14px;
+                background:white;border-radius:1.5px;box-shadow:0 0 8px white;"></div>
+            </div>
+            <div style="display:flex;justify-content:space-between;margin-top:4px;
+              font-family:'JetBrains Mono',monospace;font-size:8px;">
+              <span style="color:#ff5252;">&#60;0.7 Bear</span>
+              <span style="color:rgba(180,210,230,0.35);">Neutral</span>
+              <span style="color:#00e676;">&#62;1.2 Bull</span>
+            </div>
+          </div>
+        </div>
 
-            // ── Spot Δ ──
-            var prevRow = filtered[idx + 1];
-            var spotDelta = (prevRow && prevRow.spot_price && row.spot_price)
-                ? Math.round((row.spot_price - prevRow.spot_price) * 10) / 10
-                : null;
-            var spotDeltaHtml;
-            if (spotDelta === null) {
-                spotDeltaHtml = '<span style="color:rgba(176,190,197,0.2);">—</span>';
-            } else if (Math.abs(spotDelta) < 0.5) {
-                spotDeltaHtml = '<span class="oi-sdelta oi-sdelta-fl">→ 0.0</span>';
-            } else if (spotDelta > 0) {
-                spotDeltaHtml = '<span class="oi-sdelta oi-sdelta-up">▲ +' + spotDelta.toFixed(1) + '</span>';
-            } else {
-                spotDeltaHtml = '<span class="oi-sdelta oi-sdelta-dn">▼ ' + spotDelta.toFixed(1) + '</span>';
-            }
+        <!-- ── Max Pain Card ─────────────────────────────────────────── -->
+        <div class="g-compact" style="border-color:rgba(255,183,77,0.3);background:linear-gradient(145deg,rgba(28,22,8,0.9),rgba(12,10,4,0.95));position:relative;overflow:hidden;">
+          <div style="position:absolute;top:0;left:0;right:0;height:1px;
+            background:linear-gradient(90deg,transparent,#ffb74d,transparent);"></div>
+          <div class="cc-top">
+            <span class="cc-ico">&#127919;</span>
+            <div class="cc-lbl">Max Pain</div>
+            <span class="tag tag-neu">Expiry Magnet</span>
+          </div>
+          <div class="cc-val" style="color:#ffb74d;">&#8377;{max_pain:,}</div>
+          <div class="cc-sub">Price gravity level</div>
+          <div style="position:relative;height:20px;border-radius:6px;overflow:hidden;
+            background:linear-gradient(90deg,rgba(0,230,118,0.1),rgba(255,183,77,0.2),rgba(255,82,82,0.1));
+            margin:8px 0 4px;">
+            <div style="position:absolute;left:{pain_pct}%;top:50%;
+              transform:translate(-50%,-50%);width:3px;height:16px;
+              background:#ffb74d;box-shadow:0 0 8px #ffb74d;border-radius:1.5px;"></div>
+            <div style="position:absolute;left:{spot_pct}%;top:50%;
+              transform:translate(-50%,-50%);width:3px;height:16px;
+              background:#4fc3f7;box-shadow:0 0 8px #4fc3f7;border-radius:1.5px;"></div>
+          </div>
+          <div style="display:flex;justify-content:space-between;font-family:'JetBrains Mono',monospace;font-size:8px;">
+            <span style="color:#4fc3f7;">&#9632; Now &#8377;{spot:,.0f}</span>
+            <span style="color:{pain_col};">{pain_sign}{pain_diff:,} pts to pain</span>
+            <span style="color:#ffb74d;">&#9632; Pain &#8377;{max_pain:,}</span>
+          </div>
+        </div>
 
-            // ── Nifty Move % ──
-            var nmp = row.nifty_move_pct;
-            var niftyMovePctHtml;
-            if (nmp === null || nmp === undefined) {
-                niftyMovePctHtml = '<span style="color:rgba(176,190,197,0.2);">—</span>';
-            } else {
-                var sign  = nmp >= 0 ? '+' : '';
-                var arrow, cls;
-                if (Math.abs(nmp) < 0.1) {
-                    arrow = '→'; cls = 'oi-nifty-flat';
-                } else if (nmp >= 1.0) {
-                    arrow = '▲'; cls = 'oi-nifty-up-strong';
-                } else if (nmp >= 0.5) {
-                    arrow = '▲'; cls = 'oi-nifty-up-mid';
-                } else if (nmp > 0) {
-                    arrow = '▲'; cls = 'oi-nifty-up-weak';
-                } else if (nmp <= -1.0) {
-                    arrow = '▼'; cls = 'oi-nifty-dn-strong';
-                } else if (nmp <= -0.5) {
-                    arrow = '▼'; cls = 'oi-nifty-dn-mid';
-                } else {
-                    arrow = '▼'; cls = 'oi-nifty-dn-weak';
-                }
-                // Diff vs previous candle
-                var nmpPrev = (filtered[idx + 1] && filtered[idx + 1].nifty_move_pct != null) ? filtered[idx + 1].nifty_move_pct : null;
-                var nmpDiffHtml = '';
-                if (nmpPrev !== null) {
-                    var nmpDiff = Math.round((nmp - nmpPrev) * 100) / 100;
-                    if (Math.abs(nmpDiff) < 0.005) {
-                        nmpDiffHtml = '<div style="font-size:10px;color:rgba(176,190,197,0.4);font-family:monospace;margin-top:2px;">= 0.00</div>';
-                    } else {
-                        var ndArrow = nmpDiff > 0 ? '▲' : '▼';
-                        var ndColor = nmpDiff > 0 ? '#00e676' : '#ff4757';
-                        var ndSign  = nmpDiff > 0 ? '+' : '';
-                        nmpDiffHtml = '<div style="font-size:10px;color:' + ndColor + ';font-family:monospace;font-weight:600;margin-top:2px;">'
-                            + ndArrow + ' ' + ndSign + nmpDiff.toFixed(2) + '</div>';
-                    }
-                }
-                niftyMovePctHtml = '<div style="display:flex;flex-direction:column;align-items:center;">'
-                    + '<span class="oi-nifty-move ' + cls + '">'
-                    + arrow + ' ' + sign + nmp.toFixed(2) + '%</span>'
-                    + nmpDiffHtml + '</div>';
-            }
+        <!-- ── Max CE OI (Resistance Wall) ──────────────────────────── -->
+        <div class="g-compact" style="border-color:rgba(255,82,82,0.28);background:linear-gradient(145deg,rgba(30,10,14,0.9),rgba(12,4,8,0.95));position:relative;overflow:hidden;">
+          <div style="position:absolute;top:0;left:0;right:0;height:1px;
+            background:linear-gradient(90deg,transparent,#ff5252,transparent);"></div>
+          <div class="cc-top">
+            <span class="cc-ico">&#128308;</span>
+            <div class="cc-lbl">Max Call OI</div>
+            <span class="tag tag-bear">Resistance</span>
+          </div>
+          <div class="cc-val" style="color:#ff8899;">&#8377;{max_ce:,}</div>
+          <div class="cc-sub">CE wall</div>
+          <div style="margin-top:8px;">
+            <div style="font-family:'JetBrains Mono',monospace;font-size:8px;letter-spacing:1.5px;
+              color:rgba(120,160,180,0.4);text-transform:uppercase;margin-bottom:6px;">OI Change Today</div>
+            <div style="display:flex;flex-direction:column;gap:5px;">
+              <div style="display:flex;align-items:center;gap:7px;">
+                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:{ce_chg_col};width:22px;">CE</span>
+                <div style="flex:1;height:5px;background:rgba(0,0,0,0.4);border-radius:3px;overflow:hidden;">
+                  <div style="height:100%;width:{ce_bar_pct}%;border-radius:3px;background:linear-gradient(90deg,#ff5252,#ff6680);"></div>
+                </div>
+                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:{ce_chg_col};width:30px;text-align:right;">{ce_bar_pct:.0f}%</span>
+              </div>
+              <div style="display:flex;align-items:center;gap:7px;">
+                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:{pe_chg_col};width:22px;">PE</span>
+                <div style="flex:1;height:5px;background:rgba(0,0,0,0.4);border-radius:3px;overflow:hidden;">
+                  <div style="height:100%;width:{pe_bar_pct}%;border-radius:3px;background:linear-gradient(90deg,#00e676,#44ffaa);"></div>
+                </div>
+                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:{pe_chg_col};width:30px;text-align:right;">{pe_bar_pct:.0f}%</span>
+              </div>
+            </div>
+          </div>
+        </div>
 
-            // ── Signal Streak — Intensity Badge ──
-            var streakCount = 1;
-            var curSig = (row.opt_signal || '').toUpperCase();
-            for (var si = idx + 1; si < filtered.length; si++) {
-                if ((filtered[si].opt_signal || '').toUpperCase() === curSig) streakCount++;
-                else break;
-            }
-            // Intensity: opacity scales with streak count (min 0.06, max 0.30)
-            var intensity = Math.min(0.30, 0.06 + streakCount * 0.04);
-            var sColor, sBorder, sLabel;
-            if (isBuy)       { sColor = '0,200,83';  sBorder = '#00c853'; sLabel = 'BUY'; }
-            else if (isSell) { sColor = '255,58,74';  sBorder = '#ff3a4a'; sLabel = 'SELL'; }
-            else             { sColor = '255,183,77'; sBorder = 'rgba(255,183,77,0.5)'; sLabel = streakCount === 1 ? 'NEW' : 'HOLD'; }
-            // Dim the border for low streaks, full for high
-            var borderOpacity = Math.min(1, 0.4 + streakCount * 0.12);
-            var streakHtml = '<div class="oi-streak-int" style="background:rgba(' + sColor + ',' + intensity + ');border-left:3px solid rgba(' + sColor + ',' + borderOpacity + ');">'
-                + '<span class="oi-streak-int-num" style="color:rgba(' + sColor + ',' + Math.min(1, 0.5 + streakCount * 0.1) + ');">' + streakCount + '</span>'
-                + '<span class="oi-streak-int-lbl" style="color:rgba(' + sColor + ',' + Math.min(0.85, 0.3 + streakCount * 0.1) + ');">' + sLabel + '</span>'
-                + '</div>';
+        <!-- ── Max PE OI (Support Floor) ────────────────────────────── -->
+        <div class="g-compact" style="border-color:rgba(0,230,118,0.25);background:linear-gradient(145deg,rgba(10,30,20,0.9),rgba(4,14,10,0.95));position:relative;overflow:hidden;">
+          <div style="position:absolute;top:0;left:0;right:0;height:1px;
+            background:linear-gradient(90deg,transparent,#00e676,transparent);"></div>
+          <div class="cc-top">
+            <span class="cc-ico">&#128994;</span>
+            <div class="cc-lbl">Max Put OI</div>
+            <span class="tag tag-bull">Support</span>
+          </div>
+          <div class="cc-val" style="color:#44ffaa;">&#8377;{max_pe:,}</div>
+          <div class="cc-sub">PE floor</div>
+          <div style="margin-top:8px;">
+            <div style="font-family:'JetBrains Mono',monospace;font-size:8px;letter-spacing:1.5px;
+              color:rgba(120,160,180,0.4);text-transform:uppercase;margin-bottom:6px;">Total OI Ratio</div>
+            <div style="display:flex;flex-direction:column;gap:5px;">
+              <div style="display:flex;align-items:center;gap:7px;">
+                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:#ff8899;width:22px;">CE</span>
+                <div style="flex:1;height:5px;background:rgba(0,0,0,0.4);border-radius:3px;overflow:hidden;">
+                  <div style="height:100%;width:{ce_pct:.1f}%;border-radius:3px;background:linear-gradient(90deg,#ff5252,#ff6680);"></div>
+                </div>
+                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:#ff8899;width:30px;text-align:right;">{ce_pct:.0f}%</span>
+              </div>
+              <div style="display:flex;align-items:center;gap:7px;">
+                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:#44ffaa;width:22px;">PE</span>
+                <div style="flex:1;height:5px;background:rgba(0,0,0,0.4);border-radius:3px;overflow:hidden;">
+                  <div style="height:100%;width:{pe_pct:.1f}%;border-radius:3px;background:linear-gradient(90deg,#00e676,#44ffaa);"></div>
+                </div>
+                <span style="font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;color:#44ffaa;width:30px;text-align:right;">{pe_pct:.0f}%</span>
+              </div>
+            </div>
+          </div>
+        </div>"""
 
-            newRowsHtml += '<tr class="' + (isLive ? 'oi-live-row' : '') + '" data-time="' + t + '">'
-                + '<td>' + timeCell + '</td>'
-                + '<td class="col-detail oi-call-val">' + fmtIN(row.call_oi_chg||0) + '</td>'
-                + '<td class="col-detail oi-put-val">'  + fmtIN(row.put_oi_chg||0)  + '</td>'
-                + '<td class="col-detail ' + diffCls + '">' + fmtIN(row.diff||0) + '</td>'
-                + (function(){
-                    var pcrV = parseFloat(row.pcr) || 0;
-                    var pcrCls = pcrV >= 1.1 ? 'oi-pcr-bull' : pcrV <= 0.9 ? 'oi-pcr-bear' : 'oi-pcr-neu';
-                    var barW = Math.min(100, Math.round((pcrV / 2) * 100));
-                    return '<td class="oi-pcr-val ' + pcrCls + '"><span class="oi-pcr-cell">'
-                        + (row.pcr || '—')
-                        + '<span class="oi-pcr-bar-wrap"><span class="oi-pcr-bar ' + pcrCls + '-bar" style="width:' + barW + '%"></span></span>'
-                        + '</span></td>';
-                })()
-                + '<td>' + signalHtml(row.opt_signal) + '</td>'
-                + '<td class="oi-spot-cell">'+ (row.spot_price ? row.spot_price.toFixed(2) : '—') + '</td>'
-                + '<td>' + spotDeltaHtml + '</td>'
-                + '<td>' + niftyMovePctHtml + '</td>'
-                + '<td>' + streakHtml + '</td>'
-                + '<td>' + nlevelHtml + '</td>'
-                + '<td>' + distHtml + '</td>'
-                + (function(){
-                    var rsi = row.rsi_15m;
-                    if (rsi == null) return '<td><span style="color:rgba(176,190,197,0.25);">—</span></td>';
-                    var rsiCol, rsiBg, rsiBdr, rsiLbl;
-                    if (rsi >= 70) {
-                        rsiCol='#ff4757'; rsiBg='rgba(255,71,87,0.12)'; rsiBdr='rgba(255,71,87,0.3)'; rsiLbl='OB';
-                    } else if (rsi <= 30) {
-                        rsiCol='#00e676'; rsiBg='rgba(0,230,118,0.12)'; rsiBdr='rgba(0,230,118,0.3)'; rsiLbl='OS';
-                    } else if (rsi >= 55) {
-                        rsiCol='#69f0ae'; rsiBg='rgba(105,240,174,0.08)'; rsiBdr='rgba(105,240,174,0.25)'; rsiLbl='';
-                    } else if (rsi <= 45) {
-                        rsiCol='#fca5a5'; rsiBg='rgba(252,165,165,0.08)'; rsiBdr='rgba(252,165,165,0.25)'; rsiLbl='';
-                    } else {
-                        rsiCol='#ffb74d'; rsiBg='rgba(255,183,77,0.08)'; rsiBdr='rgba(255,183,77,0.2)'; rsiLbl='';
-                    }
-                    var rsiBadge = rsiLbl
-                        ? '<span style="font-size:8px;font-weight:700;letter-spacing:1px;padding:1px 5px;border-radius:3px;background:'+rsiBg+';color:'+rsiCol+';border:1px solid '+rsiBdr+';">'+rsiLbl+'</span>'
-                        : '<span style="font-size:8px;color:rgba(128,222,234,0.3);">neutral</span>';
-                    return '<td><div style="display:flex;flex-direction:column;align-items:center;gap:3px;">'
-                        + '<span style="font-family:monospace;font-size:12px;font-weight:700;color:'+rsiCol+';">'+rsi.toFixed(1)+'</span>'
-                        + rsiBadge
-                        + '</div></td>';
-                })()
-                + (function(){
-                    var emaSig = row.ema_signal;
-                    var e5  = row.ema5;
-                    var e13 = row.ema13;
-                    if (!emaSig || e5 == null || e13 == null) return '<td><span style="color:rgba(176,190,197,0.25);">—</span></td>';
-                    var emaIsBuy = emaSig === 'BUY';
-                    var eCol = emaIsBuy ? '#00e676' : '#ff4757';
-                    var eBg  = emaIsBuy ? 'rgba(0,230,118,0.12)' : 'rgba(255,71,87,0.12)';
-                    var eBdr = emaIsBuy ? 'rgba(0,230,118,0.3)'  : 'rgba(255,71,87,0.3)';
-                    var eArr = emaIsBuy ? '▲' : '▼';
-                    var eGap = Math.abs(e5 - e13).toFixed(1);
-                    return '<td><div style="display:flex;flex-direction:column;align-items:center;gap:3px;">'
-                        + '<span style="display:inline-flex;align-items:center;gap:4px;padding:2px 9px;border-radius:6px;font-size:11px;font-weight:700;background:'+eBg+';color:'+eCol+';border:1px solid '+eBdr+';">'
-                        + eArr + ' ' + emaSig + '</span>'
-                        + '<span style="font-size:10px;color:' + (emaIsBuy ? 'rgba(105,240,174,0.7)' : 'rgba(252,165,165,0.7)') + ';font-family:monospace;font-weight:600;">gap '+eGap+'</span>'
-                        + '</div></td>';
-                })()
-                + (function(){
-                    var vwapVal = row.vwap;
-                    if (vwapVal == null || vwapVal === 0) {
-                        return '<td class="col-detail"><span style="color:rgba(176,190,197,0.3);">—</span></td>';
-                    }
-                    var spot = row.spot_price || 0;
-                    var aboveVwap = spot >= vwapVal;
-                    var vwapCls = aboveVwap ? 'oi-vwap-bull' : 'oi-vwap-bear';
-                    var vwapArrow = aboveVwap ? '▲' : '▼';
-                    var vwapColor = aboveVwap ? '#4ade80' : '#f87171';
-                    return '<td class="col-detail oi-vwap-cell"><span style="color:' + vwapColor + ';font-weight:700;">'
-                        + vwapArrow + ' ₹' + vwapVal.toLocaleString('en-IN', {minimumFractionDigits:2, maximumFractionDigits:2})
-                        + '</span><br><span style="font-size:8px;color:rgba(147,197,253,0.5);letter-spacing:0.5px;">'
-                        + (aboveVwap ? 'Above' : 'Below') + '</span></td>';
-                })()
-                + (function(){
-                    // ══ CONFLUENCE SCORE ══════════════════════════════════════
-                    // Counts how many of 5 independent signals agree on direction.
-                    // Only shows strong BUY/SELL when 3+ signals align.
-                    var cBuy = 0, cSell = 0, cTotal = 0;
+    def _signal_summary_bar_html(self):
+        d = self.html_data
 
-                    // 1. PCR: >1.0 = buy bias, <0.9 = sell bias
-                    var pcrV = parseFloat(row.pcr) || 0;
-                    if (pcrV > 0) { cTotal++;
-                        if (pcrV > 1.0) cBuy++; else if (pcrV < 0.9) cSell++;
-                    }
+        # ── 1. OI Signal ──────────────────────────────────────────────────
+        oi_cls = d.get('oi_class', 'neutral') if d.get('has_option_data') else 'neutral'
+        if   oi_cls == 'bullish':  oi_score=1;  oi_lbl='Bullish';  oi_sub='Put build dominant';       oi_col='#00e676'; oi_bg='rgba(0,230,118,0.12)';  oi_bdr='rgba(0,230,118,0.3)';  oi_arrow='&#9651;'
+        elif oi_cls == 'bearish':  oi_score=-1; oi_lbl='Bearish';  oi_sub='Call build dominant';      oi_col='#ff4757'; oi_bg='rgba(255,71,87,0.12)';  oi_bdr='rgba(255,71,87,0.3)';  oi_arrow='&#9661;'
+        else:                      oi_score=0;  oi_lbl='Neutral';  oi_sub='Both sides building';      oi_col='#ffb74d'; oi_bg='rgba(255,183,77,0.10)'; oi_bdr='rgba(255,183,77,0.25)'; oi_arrow='&#9711;'
 
-                    // 2. OI Signal
-                    var oiSig = (row.opt_signal || '').toUpperCase();
-                    if (oiSig.indexOf('BUY') >= 0) { cTotal++; cBuy++; }
-                    else if (oiSig.indexOf('SELL') >= 0) { cTotal++; cSell++; }
-                    else if (oiSig === 'NEUTRAL') { cTotal++; }
+        # ── 2. FII/DII Signal ─────────────────────────────────────────────
+        fii_summ  = d.get('fii_dii_summ', {})
+        fii_badge = fii_summ.get('badge_cls', 'fii-neu')
+        fii_label = fii_summ.get('label', 'Neutral')
+        fii_avg   = fii_summ.get('fii_avg', 0)
+        dii_avg   = fii_summ.get('dii_avg', 0)
+        if   fii_badge in ('fii-bull',):  fii_score=1;  fii_col='#00e676'; fii_bg='rgba(0,230,118,0.12)';   fii_bdr='rgba(0,230,118,0.3)';   fii_arrow='&#9651;'
+        elif fii_badge in ('fii-cbull',): fii_score=1;  fii_col='#69f0ae'; fii_bg='rgba(105,240,174,0.10)'; fii_bdr='rgba(105,240,174,0.28)'; fii_arrow='&#9651;'
+        elif fii_badge in ('fii-bear',):  fii_score=-1; fii_col='#ff4757'; fii_bg='rgba(255,71,87,0.12)';   fii_bdr='rgba(255,71,87,0.3)';   fii_arrow='&#9661;'
+        else:                             fii_score=0;  fii_col='#ffb74d'; fii_bg='rgba(255,183,77,0.10)';  fii_bdr='rgba(255,183,77,0.25)'; fii_arrow='&#9711;'
+        fii_sub = f"FII {'+' if fii_avg>=0 else ''}{fii_avg:,.0f} / DII {'+' if dii_avg>=0 else ''}{dii_avg:,.0f}"
 
-                    // 3. VWAP: spot above = buy, below = sell
-                    var cVwap = row.vwap;
-                    var cSpot = row.spot_price || 0;
-                    if (cVwap && cVwap > 0 && cSpot > 0) { cTotal++;
-                        if (cSpot >= cVwap) cBuy++; else cSell++;
-                    }
+        # ── 3. Technical Signal ───────────────────────────────────────────
+        bias       = d.get('bias', 'SIDEWAYS')
+        bull_score = d.get('bullish_score', 0)
+        bear_score = d.get('bearish_score', 0)
+        score_diff = bull_score - bear_score
+        if   bias in ('BULLISH',):    tech_score=1;  tech_lbl='Bullish';    tech_col='#00e676'; tech_bg='rgba(0,230,118,0.12)';   tech_bdr='rgba(0,230,118,0.3)';   tech_arrow='&#9651;'
+        elif bias in ('WATCH BULL',): tech_score=1;  tech_lbl='Watch Bull'; tech_col='#b5ea3a'; tech_bg='rgba(181,234,58,0.10)';  tech_bdr='rgba(181,234,58,0.28)'; tech_arrow='&#9651;'
+        elif bias in ('BEARISH',):    tech_score=-1; tech_lbl='Bearish';    tech_col='#ff4757'; tech_bg='rgba(255,71,87,0.12)';   tech_bdr='rgba(255,71,87,0.3)';   tech_arrow='&#9661;'
+        elif bias in ('WATCH BEAR',): tech_score=-1; tech_lbl='Watch Bear'; tech_col='#ff9800'; tech_bg='rgba(255,152,0,0.10)';   tech_bdr='rgba(255,152,0,0.28)';  tech_arrow='&#9661;'
+        else:                         tech_score=0;  tech_lbl='Sideways';   tech_col='#ffb74d'; tech_bg='rgba(255,183,77,0.10)';  tech_bdr='rgba(255,183,77,0.25)'; tech_arrow='&#8596;'
+        tech_sub = f"Score {score_diff:+d} / {bull_score+bear_score} signals"
 
-                    // 4. RSI: >55 = buy momentum, <45 = sell momentum
-                    var cRsi = row.rsi_15m;
-                    if (cRsi != null) { cTotal++;
-                        if (cRsi >= 55) cBuy++; else if (cRsi <= 45) cSell++;
-                    }
+        # ── 4. Strategy Checklist Score ───────────────────────────────────
+        # Re-derive from existing html_data fields (same data checklist uses)
+        pcr_val  = d.get('pcr') if d.get('has_option_data') else None
+        rsi_val  = d.get('rsi')
+        macd_b   = d.get('macd_bullish')
+        sma20    = d.get('sma_20_above')
+        sma50    = d.get('sma_50_above')
+        sma200   = d.get('sma_200_above')
+        oi_dir   = d.get('oi_class') if d.get('has_option_data') else None
+        strat_sc = 0
+        if pcr_val is not None:
+            if   pcr_val > 1.5: strat_sc += 2
+            elif pcr_val > 1.1: strat_sc += 1
+            elif pcr_val < 0.5: strat_sc -= 2
+            elif pcr_val < 0.9: strat_sc -= 1
+        if rsi_val is not None:
+            if   rsi_val > 70:  strat_sc -= 1
+            elif rsi_val < 30:  strat_sc += 2
+            elif rsi_val >= 55: strat_sc += 1
+            elif rsi_val <= 45: strat_sc -= 1
+        if macd_b is not None: strat_sc += 1 if macd_b else -1
+        trend_pts = sum([1 if x else -1 for x in [sma20, sma50, sma200] if x is not None])
+        strat_sc += (1 if trend_pts > 0 else -1 if trend_pts < 0 else 0)
+        if oi_dir == 'bullish':  strat_sc += 1
+        elif oi_dir == 'bearish': strat_sc -= 1
+        if   strat_sc >= 3:  strat_score=1;  strat_lbl='Strong Bull'; strat_col='#00e676'; strat_bg='rgba(0,230,118,0.12)';  strat_bdr='rgba(0,230,118,0.3)';  strat_arrow='&#9651;'
+        elif strat_sc >= 1:  strat_score=1;  strat_lbl='Mild Bull';   strat_col='#69f0ae'; strat_bg='rgba(105,240,174,0.10)';strat_bdr='rgba(105,240,174,0.28)';strat_arrow='&#9651;'
+        elif strat_sc <= -3: strat_score=-1; strat_lbl='Strong Bear'; strat_col='#ff4757'; strat_bg='rgba(255,71,87,0.12)';  strat_bdr='rgba(255,71,87,0.3)';  strat_arrow='&#9661;'
+        elif strat_sc <= -1: strat_score=-1; strat_lbl='Mild Bear';   strat_col='#fca5a5'; strat_bg='rgba(252,165,165,0.10)';strat_bdr='rgba(252,165,165,0.25)';strat_arrow='&#9661;'
+        else:                strat_score=0;  strat_lbl='Neutral';     strat_col='#ffb74d'; strat_bg='rgba(255,183,77,0.10)'; strat_bdr='rgba(255,183,77,0.25)'; strat_arrow='&#9711;'
+        strat_sub = f"Score {strat_sc:+d} / 5 factors"
 
-                    // 5. EMA 5/13: BUY or SELL
-                    var cEma = row.ema_signal;
-                    if (cEma === 'BUY') { cTotal++; cBuy++; }
-                    else if (cEma === 'SELL') { cTotal++; cSell++; }
+        # ── 5. PCR Signal ─────────────────────────────────────────────────
+        pcr_disp = d.get('pcr', 0) if d.get('has_option_data') else None
+        if pcr_disp is not None:
+            if   pcr_disp > 1.5: pcr_score=1;  pcr_lbl=f'{pcr_disp:.2f}'; pcr_sub='Strongly Bullish';  pcr_col='#00e676'; pcr_bg='rgba(0,230,118,0.12)';  pcr_bdr='rgba(0,230,118,0.3)'
+            elif pcr_disp > 1.1: pcr_score=1;  pcr_lbl=f'{pcr_disp:.2f}'; pcr_sub='Bullish (>1.1)';    pcr_col='#69f0ae'; pcr_bg='rgba(105,240,174,0.10)';pcr_bdr='rgba(105,240,174,0.28)'
+            elif pcr_disp < 0.5: pcr_score=-1; pcr_lbl=f'{pcr_disp:.2f}'; pcr_sub='Strongly Bearish';  pcr_col='#ff4757'; pcr_bg='rgba(255,71,87,0.12)';  pcr_bdr='rgba(255,71,87,0.3)'
+            elif pcr_disp < 0.9: pcr_score=-1; pcr_lbl=f'{pcr_disp:.2f}'; pcr_sub='Bearish (<0.9)';    pcr_col='#ff9999'; pcr_bg='rgba(255,71,87,0.08)';  pcr_bdr='rgba(255,71,87,0.2)'
+            else:                pcr_score=0;  pcr_lbl=f'{pcr_disp:.2f}'; pcr_sub='Neutral (0.9-1.1)'; pcr_col='#ffb74d'; pcr_bg='rgba(255,183,77,0.10)'; pcr_bdr='rgba(255,183,77,0.25)'
+        else:
+            pcr_score=0; pcr_lbl='N/A'; pcr_sub='No option data'; pcr_col='#8faabe'; pcr_bg='rgba(143,170,190,0.08)'; pcr_bdr='rgba(143,170,190,0.2)'
 
-                    // Determine confluence verdict
-                    var cMax = Math.max(cBuy, cSell);
-                    var cDir = cBuy > cSell ? 'BUY' : (cSell > cBuy ? 'SELL' : 'MIXED');
-                    var cScore = cBuy > cSell ? cBuy : cSell;
-                    var cLabel, cColor, cBg, cBdr, cIcon, cStrength;
+        # ── Overall Verdict ───────────────────────────────────────────────
+        scores     = [oi_score, fii_score, tech_score, strat_score, pcr_score]
+        bull_count = sum(1 for s in scores if s > 0)
+        bear_count = sum(1 for s in scores if s < 0)
+        neu_count  = sum(1 for s in scores if s == 0)
+        total      = len(scores)
+        bull_pct   = round(bull_count / total * 100)
+        bear_pct   = round(bear_count / total * 100)
 
-                    // Time-of-day penalty: 9:15-9:30 and 15:15-15:30 are noisy
-                    var cTimeParts = (row.time || '00:00').split(':');
-                    var cHour = parseInt(cTimeParts[0] || 0);
-                    var cMin  = parseInt(cTimeParts[1] || 0);
-                    var cTimeMinutes = cHour * 60 + cMin;
-                    var cIsNoisy = (cTimeMinutes >= 555 && cTimeMinutes <= 560)    // 9:15-9:20
-                                || (cTimeMinutes >= 925 && cTimeMinutes <= 930);   // 15:25-15:30
+        if   bull_count >= 4: vrd_lbl='STRONGLY BULLISH'; vrd_col='#00e676'; vrd_bg='rgba(0,230,118,0.08)';  vrd_bdr='#00e676';  vrd_lbdr='rgba(0,230,118,0.6)'
+        elif bull_count == 3: vrd_lbl='BULLISH';          vrd_col='#00e676'; vrd_bg='rgba(0,230,118,0.06)';  vrd_bdr='#00e676';  vrd_lbdr='rgba(0,230,118,0.5)'
+        elif bull_count == 2 and bear_count == 0: vrd_lbl='CAUTIOUSLY BULLISH'; vrd_col='#69f0ae'; vrd_bg='rgba(105,240,174,0.06)'; vrd_bdr='#69f0ae'; vrd_lbdr='rgba(105,240,174,0.4)'
+        elif bear_count >= 4: vrd_lbl='STRONGLY BEARISH'; vrd_col='#ff4757'; vrd_bg='rgba(255,71,87,0.08)';  vrd_bdr='#ff4757';  vrd_lbdr='rgba(255,71,87,0.6)'
+        elif bear_count == 3: vrd_lbl='BEARISH';          vrd_col='#ff4757'; vrd_bg='rgba(255,71,87,0.06)';  vrd_bdr='#ff4757';  vrd_lbdr='rgba(255,71,87,0.5)'
+        elif bear_count == 2 and bull_count == 0: vrd_lbl='CAUTIOUSLY BEARISH'; vrd_col='#fca5a5'; vrd_bg='rgba(252,165,165,0.06)'; vrd_bdr='#fca5a5'; vrd_lbdr='rgba(252,165,165,0.4)'
+        else:                 vrd_lbl='NEUTRAL';          vrd_col='#ffb74d'; vrd_bg='rgba(255,183,77,0.06)'; vrd_bdr='#ffb74d';  vrd_lbdr='rgba(255,183,77,0.4)'
 
-                    if (cTotal === 0) {
-                        cLabel = '—'; cColor = 'rgba(176,190,197,0.3)'; cBg = 'transparent'; cBdr = 'transparent'; cIcon = ''; cStrength = '';
-                    } else {
-                        // ── FIX v8: Add intraday spot momentum as 6th signal ──
-                        // If price has risen > 30 pts in the last 3 rows, count as a bullish signal.
-                        // If price has fallen > 30 pts in the last 3 rows, count as a bearish signal.
-                        // This prevents STRONG SELL when price is actively bouncing.
-                        var cMomRef = null;
-                        for (var cmi = 2; cmi <= 3; cmi++) {
-                            if (filtered[idx + cmi] && filtered[idx + cmi].spot_price) {
-                                cMomRef = filtered[idx + cmi].spot_price; break;
-                            }
-                        }
-                        if (cMomRef && row.spot_price) {
-                            cTotal++;
-                            var cMomDelta = row.spot_price - cMomRef;
-                            if (cMomDelta > 30)        cBuy++;    // rising >30 pts = bullish momentum
-                            else if (cMomDelta < -30)  cSell++;   // falling >30 pts = bearish momentum
-                            // flat (-30 to +30): neither — momentum is not contributing
-                        }
+        # ── Dot indicators ────────────────────────────────────────────────
+        dot_scores = [
+            (oi_score,    'OI'),
+            (fii_score,   'FII/DII'),
+            (tech_score,  'Technical'),
+            (strat_score, 'Strategy'),
+            (pcr_score,   'PCR'),
+        ]
+        dots_html = ''
+        for sc, name in dot_scores:
+            if   sc > 0:  dc='#00e676'
+            elif sc < 0:  dc='#ff4757'
+            else:          dc='rgba(255,255,255,0.12)'
+            dots_html += f'<div class="ssb-dot" style="background:{dc};" title="{name}"></div>'
 
-                        var cScore = cBuy > cSell ? cBuy : cSell;
-                        var cDir = cBuy > cSell ? 'BUY' : (cSell > cBuy ? 'SELL' : 'MIXED');
+        # ── Build one cell ────────────────────────────────────────────────
+        def cell(lbl, badge_lbl, arrow, col, bg, bdr, sub):
+            return (
+                f'<div class="ssb-cell">'
+                f'<span class="ssb-cell-lbl">{lbl}</span>'
+                f'<span class="ssb-badge" style="color:{col};background:{bg};border:1px solid {bdr};">'
+                f'{arrow} {badge_lbl}</span>'
+                f'<span class="ssb-sub">{sub}</span>'
+                f'</div>'
+            )
 
-                        if (cScore >= 4) {
-                            cStrength = 'STRONG';
-                            if (cDir === 'BUY') {
-                                cLabel = cScore + '/' + cTotal; cColor = '#00e676'; cBg = 'rgba(0,230,118,0.18)'; cBdr = 'rgba(0,230,118,0.45)'; cIcon = '▲';
-                            } else if (cDir === 'SELL') {
-                                cLabel = cScore + '/' + cTotal; cColor = '#ff4757'; cBg = 'rgba(255,71,87,0.18)'; cBdr = 'rgba(255,71,87,0.45)'; cIcon = '▼';
-                            } else {
-                                cStrength = 'MIXED'; cLabel = cScore + '/' + cTotal; cColor = '#ffb74d'; cBg = 'rgba(255,183,77,0.10)'; cBdr = 'rgba(255,183,77,0.3)'; cIcon = '~';
-                            }
-                        } else if (cScore >= 3) {
-                            cStrength = cDir;
-                            if (cDir === 'BUY') {
-                                cLabel = cScore + '/' + cTotal; cColor = '#69f0ae'; cBg = 'rgba(105,240,174,0.12)'; cBdr = 'rgba(105,240,174,0.3)'; cIcon = '▲';
-                            } else if (cDir === 'SELL') {
-                                cLabel = cScore + '/' + cTotal; cColor = '#fca5a5'; cBg = 'rgba(252,165,165,0.12)'; cBdr = 'rgba(252,165,165,0.3)'; cIcon = '▼';
-                            } else {
-                                cStrength = 'MIXED'; cLabel = cScore + '/' + cTotal; cColor = '#ffb74d'; cBg = 'rgba(255,183,77,0.08)'; cBdr = 'rgba(255,183,77,0.2)'; cIcon = '~';
-                            }
-                        } else {
-                            cStrength = 'WEAK';
-                            cLabel = cScore + '/' + cTotal; cColor = '#ffb74d'; cBg = 'rgba(255,183,77,0.08)'; cBdr = 'rgba(255,183,77,0.2)'; cIcon = '~';
-                        }
-                    }
+        ts = d.get('timestamp', '')
 
-                    // Time-of-day noise warning overrides strength display
-                    var cTimeWarn = cIsNoisy
-                        ? '<div style="font-size:10px;color:#ff9800;letter-spacing:1px;margin-top:3px;font-weight:700;background:rgba(255,152,0,0.12);border:1px solid rgba(255,152,0,0.3);border-radius:4px;padding:2px 6px;">⚠ NOISY</div>'
-                        : '';
+        return f"""
+<div class="section ssb-section" id="sec-signals">
+  <div class="ssb-wrap">
+    <div class="ssb-header">
+      <span class="ssb-title">&#9889; SIGNAL SUMMARY</span>
+      <span class="ssb-ts" data-stamp="report-ts">{ts}</span>
+    </div>
+    <div class="ssb-grid">
+      {cell('OI Signal',   oi_lbl,    oi_arrow,    oi_col,    oi_bg,    oi_bdr,    d.get('oi_signal','—') if d.get('has_option_data') else 'No data')}
+      {cell('FII / DII',   fii_label, fii_arrow,   fii_col,   fii_bg,   fii_bdr,   fii_sub)}
+      {cell('Technical',   tech_lbl,  tech_arrow,  tech_col,  tech_bg,  tech_bdr,  tech_sub)}
+      {cell('Strategy',    strat_lbl, strat_arrow, strat_col, strat_bg, strat_bdr, strat_sub)}
+      {cell('PCR',         pcr_lbl,   '',          pcr_col,   pcr_bg,   pcr_bdr,   pcr_sub)}
+      <div class="ssb-verdict" style="background:{vrd_bg};border-left:3px solid {vrd_lbdr};">
+        <span class="ssb-verdict-lbl" style="color:#80deea;">Overall Verdict</span>
+        <span class="ssb-verdict-val" style="color:{vrd_col};">{vrd_lbl}</span>
+        <div class="ssb-score-dots">{dots_html}</div>
+        <div class="ssb-bar-wrap">
+          <div class="ssb-bar-lbl">
+            <span style="color:rgba(0,230,118,0.6);">Bull {bull_count}</span>
+            <span style="color:rgba(255,183,77,0.5);">Neu {neu_count}</span>
+            <span style="color:rgba(255,71,87,0.6);">Bear {bear_count}</span>
+          </div>
+          <div class="ssb-bar-track">
+            <div style="height:100%;width:{bull_pct}%;background:#00e676;border-radius:2px;display:inline-block;"></div>
+            <div style="height:100%;width:{bear_pct}%;background:#ff4757;border-radius:2px;float:right;"></div>
+          </div>
+        </div>
+      </div>
+    </div>
+  </div>
+</div>
+"""
 
-                    return '<td><div style="display:flex;flex-direction:column;align-items:center;gap:2px;">'
-                        + '<span style="display:inline-flex;align-items:center;gap:4px;padding:4px 10px;border-radius:6px;'
-                        + 'font-size:12px;font-weight:800;background:' + cBg + ';color:' + cColor + ';border:1px solid ' + cBdr + ';">'
-                        + cIcon + ' ' + cLabel + '</span>'
-                        + '<span style="font-size:10px;font-weight:700;color:' + cColor + ';letter-spacing:0.5px;">' + cStrength + '</span>'
-                        + cTimeWarn
-                        + '</div></td>';
-                })()
-                + '</tr>';
-        } else if (idx === 0) {
-            // Mark existing top row as LIVE with elapsed timer
-            var r = existingTimes[t];
-            r.classList.add('oi-live-row');
-            var td = r.querySelector('td:first-child');
-            if (td && !td.querySelector('.oi-elapsed')) {
-                td.innerHTML = '<div class="oi-time-cell"><span class="oi-time-val">' + t + '</span>&nbsp;<span class="oi-elapsed"></span></div>';
-            }
-        }
-    });
+    def _market_direction_widget_html(self):
+        d          = self.html_data
+        bias       = d['bias']
+        confidence = d['confidence']
+        bull_score = d['bullish_score']
+        bear_score = d['bearish_score']
 
-    if (newRowsHtml) {
-        // ── Bulletproof no-scroll-jump insert ───────────────────────────
-        // overflow-anchor:none on tbody stops Chrome's scroll anchoring from
-        // auto-adjusting when rows are prepended (the main cause of jumps).
-        // We also manually save + restore window.scrollY with double-rAF to
-        // cover Firefox and Safari which don't support overflow-anchor.
-        var winSy   = window.scrollY || window.pageYOffset;
-        var docEl   = document.documentElement;
-        var bodyEl  = document.body;
-        // Disable CSS scroll-behavior so our scrollTo is truly instant
-        var prevDocSB  = docEl.style.scrollBehavior;
-        var prevBodySB = bodyEl.style.scrollBehavior;
-        docEl.style.scrollBehavior  = 'auto';
-        bodyEl.style.scrollBehavior = 'auto';
-        // Disable browser scroll anchoring on the table body
-        tbody.style.overflowAnchor = 'none';
+        if bias == 'BULLISH':
+            dir_gradient  = 'linear-gradient(135deg,#00ff88,#00d4ff)'
+            needle_rotate = '-60'
+            widget_border = 'rgba(0,255,136,0.3)'
+            top_line      = 'rgba(0,255,136,0.8)'
+            pulse_color   = '#00ff88'
+            score_color   = '#00ff88'
+        elif bias == 'WATCH BULL':
+            dir_gradient  = 'linear-gradient(135deg,#b5ea3a,#00d4ff)'
+            needle_rotate = '-30'
+            widget_border = 'rgba(181,234,58,0.35)'
+            top_line      = 'rgba(181,234,58,0.8)'
+            pulse_color   = '#b5ea3a'
+            score_color   = '#b5ea3a'
+        elif bias == 'WATCH BEAR':
+            dir_gradient  = 'linear-gradient(135deg,#ff9800,#ff3355)'
+            needle_rotate = '30'
+            widget_border = 'rgba(255,152,0,0.35)'
+            top_line      = 'rgba(255,152,0,0.8)'
+            pulse_color   = '#ff9800'
+            score_color   = '#ff9800'
+        elif bias == 'BEARISH':
+            dir_gradient  = 'linear-gradient(135deg,#ff3355,#ff9900)'
+            needle_rotate = '60'
+            widget_border = 'rgba(255,51,85,0.3)'
+            top_line      = 'rgba(255,51,85,0.8)'
+            pulse_color   = '#ff3355'
+            score_color   = '#ff5252'
+        else:
+            dir_gradient  = 'linear-gradient(135deg,#ffcd3c,#f7931e)'
+            needle_rotate = '0'
+            widget_border = 'rgba(255,183,77,0.3)'
+            top_line      = 'rgba(255,183,77,0.8)'
+            pulse_color   = '#ffb74d'
+            score_color   = '#ffb74d'
 
-        tbody.insertAdjacentHTML('afterbegin', newRowsHtml);
+        total_score = bull_score - bear_score
+        score_sign  = '+' if total_score > 0 else ''
+        conf_cls    = ('md-pill-conf-high' if confidence == 'HIGH' else
+                       'md-pill-conf-med'  if confidence == 'MEDIUM' else 'md-pill-conf-low')
+
+        # ── Signal breakdown rows ────────────────────────────────────────────
+        signals_meta = [
+            ('SMA 20',  d.get('sma_20_above'),  'sma'),
+            ('SMA 50',  d.get('sma_50_above'),  'sma'),
+            ('SMA 200', d.get('sma_200_above'), 'sma'),
+            ('RSI',     None,                   'rsi'),
+            ('MACD',    d.get('macd_bullish'),  'macd'),
+            ('PCR',     None,                   'pcr'),
+        ]
+        sig_rows_html = ''
+        for name, is_bull, kind in signals_meta:
+            if kind == 'rsi':
+                rsi = d.get('rsi', 50)
+                is_bull = rsi < 40; is_bear = rsi > 70
+                score_val = '+1' if is_bull else ('-1' if is_bear else '0')
+                bar_w = 45 if not is_bull and not is_bear else 80
+                bar_cls = 'bull' if is_bull else ('bear' if is_bear else 'neutral')
+                val_col = '#00ff88' if is_bull else ('#ff5252' if is_bear else '#ffb74d')
+            elif kind == 'pcr':
+                pcr = d.get('pcr', 1.0)
+                is_bull = pcr > 1.1; is_bear = pcr < 0.9
+                score_val = '+1' if is_bull else ('-1' if is_bear else '0')
+                bar_w = 45 if not is_bull and not is_bear else 85
+                bar_cls = 'bull' if is_bull else ('bear' if is_bear else 'neutral')
+                val_col = '#00ff88' if is_bull else ('#ff5252' if is_bear else '#ffb74d')
+            else:
+                score_val = '+1' if is_bull else '-1'
+                bar_w = 80; bar_cls = 'bull' if is_bull else 'bear'
+                val_col = '#00ff88' if is_bull else '#ff5252'
+            bar_color_css = (
+                'linear-gradient(90deg,#00ff88,#00d4ff)' if bar_cls == 'bull' else
+                'linear-gradient(90deg,#ff3355,#ff6680)' if bar_cls == 'bear' else
+                'linear-gradient(90deg,#ffb74d,#ffdd66)'
+            )
+            sig_rows_html += f"""
+            <div style="display:flex;align-items:center;gap:8px;">
+              <span style="font-size:9px;letter-spacing:1px;color:rgba(180,210,230,0.55);width:48px;text-align:right;flex-shrink:0;">{name}</span>
+              <div style="flex:1;height:5px;background:rgba(0,0,0,0.4);border-radius:3px;overflow:hidden;">
+                <div style="height:100%;width:{bar_w}%;border-radius:3px;background:{bar_color_css};"></div>
+              </div>
+              <span style="font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:700;color:{val_col};width:22px;flex-shrink:0;">{score_val}</span>
+            </div>"""
 
-        // Double-rAF: frame 1 = layout/reflow, frame 2 = paint → scroll after both
-        requestAnimationFrame(function() {
-            requestAnimationFrame(function() {
-                window.scrollTo(0, winSy);
-                // Restore everything
-                tbody.style.overflowAnchor = '';
-                docEl.style.scrollBehavior  = prevDocSB;
-                bodyEl.style.scrollBehavior = prevBodySB;
-            });
-        });
-    }
+        # ── SVG needle angle: bear_score−bull_score mapped to ±80deg ────────
+        max_s       = max(bull_score + bear_score, 1)
+        needle_deg  = round(max(-80, min(80, (bear_score - bull_score) / max_s * 80)))
 
-    // Remove empty state row if present
-    var emptyRow = tbody.querySelector('.oi-empty-state');
-    if (emptyRow) emptyRow.closest('tr').remove();
+        # ── Confidence dots ──────────────────────────────────────────────────
+        filled = 5 if confidence == 'HIGH' else 3 if confidence == 'MEDIUM' else 1
+        dots_html = (
+            ''.join(f'<div style="width:9px;height:9px;border-radius:50%;background:{pulse_color};box-shadow:0 0 6px {pulse_color};"></div>' for _ in range(filled)) +
+            ''.join(f'<div style="width:9px;height:9px;border-radius:50%;background:rgba(255,255,255,0.08);border:1px solid rgba(255,255,255,0.1);"></div>' for _ in range(5 - filled))
+        )
 
-    // ── Start elapsed timer for latest entry ──
-    if (filtered.length > 0 && filtered[0].time) {
-        _startElapsedTimer(filtered[0].time);
-    }
+        # ── Neutral S1/R1 panel (only shown when bias is NEUTRAL) ───────────
+        if bias not in ('BULLISH', 'BEARISH'):
+            cp        = float(d.get('current_price') or 0)
+            s1        = float(d['support'])    if d.get('support')    is not None else 0.0
+            r1        = float(d['resistance']) if d.get('resistance') is not None else 0.0
+            pts_to_s1 = round(cp - s1)   if s1 > 0 else None
+            pts_to_r1 = round(r1 - cp)   if r1 > 0 else None
+            # Proximity hint: which level is price closer to?
+            if pts_to_s1 is not None and pts_to_r1 is not None:
+                if pts_to_s1 < pts_to_r1:
+                    proximity_hint = '&#9660; Closer to S1 — watch for bounce or breakdown'
+                    hint_col = '#00e676'
+                elif pts_to_r1 < pts_to_s1:
+                    proximity_hint = '&#9650; Closer to R1 — watch for breakout or rejection'
+                    hint_col = '#ff4d6d'
+                else:
+                    proximity_hint = '&#8596; Midway between S1 and R1'
+                    hint_col = '#ffb74d'
+            else:
+                proximity_hint = ''
+                hint_col = '#ffb74d'
+            dist_s1_html = (f'<span style="font-size:9px;color:rgba(0,230,118,0.55);">{pts_to_s1} pts away</span>'
+                            if pts_to_s1 is not None else '')
+            dist_r1_html = (f'<span style="font-size:9px;color:rgba(255,77,109,0.55);">{pts_to_r1} pts away</span>'
+                            if pts_to_r1 is not None else '')
+            s1_display = f'&#8377;{s1:,.0f}' if s1 > 0 else 'N/A'
+            r1_display = f'&#8377;{r1:,.0f}' if r1 > 0 else 'N/A'
+            neutral_sr_html = f"""
+                <div style="margin-top:6px;width:100%;display:flex;align-items:center;gap:6px;justify-content:center;flex-wrap:wrap;">
+                  <div style="display:flex;align-items:center;gap:5px;padding:4px 10px;border-radius:6px;
+                    background:rgba(0,230,118,0.07);border:1px solid rgba(0,230,118,0.2);">
+                    <span style="font-size:8px;font-weight:700;color:rgba(0,230,118,0.6);letter-spacing:1px;">S1</span>
+                    <span style="font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;color:#00e676;">{s1_display}</span>
+                    {f'<span style="font-size:8px;color:rgba(0,230,118,0.45);">{pts_to_s1}pt</span>' if pts_to_s1 else ''}
+                  </div>
+                  <span style="font-size:9px;color:rgba(120,160,180,0.3);">·</span>
+                  <div style="display:flex;align-items:center;gap:5px;padding:4px 10px;border-radius:6px;
+                    background:rgba(255,77,109,0.07);border:1px solid rgba(255,77,109,0.2);">
+                    <span style="font-size:8px;font-weight:700;color:rgba(255,77,109,0.6);letter-spacing:1px;">R1</span>
+                    <span style="font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;color:#ff4d6d;">{r1_display}</span>
+                    {f'<span style="font-size:8px;color:rgba(255,77,109,0.45);">{pts_to_r1}pt</span>' if pts_to_r1 else ''}
+                  </div>
+                  <div style="width:100%;text-align:center;font-size:8px;font-family:'JetBrains Mono',monospace;
+                    color:{hint_col};opacity:0.75;margin-top:2px;">{proximity_hint}</div>
+                </div>"""
+        else:
+            neutral_sr_html = ''  # Not NEUTRAL — show nothing
 
-    // ── Render NIFTY Live Feed panel ──
-    renderNiftyLiveFeed(filtered);
-}
+        return f"""
+    <div class="section">
+        <div class="section-title"><span>&#129517;</span> MARKET DIRECTION (Algorithmic)</div>
 
-/* ══ NIFTY LIVE FEED — Compact side panel ══════════════════════════════════ */
-function renderNiftyLiveFeed(filtered) {
-    var body = document.getElementById('nlfBody');
-    if (!body || !filtered || filtered.length === 0) return;
+        <!-- Price Ticker Strip — compact -->
+        <div style="background:linear-gradient(135deg,rgba(8,24,44,0.95),rgba(4,14,26,0.98));
+          border:1px solid {widget_border};border-radius:14px;padding:8px 16px;
+          display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:10px;
+          margin-bottom:12px;position:relative;overflow:hidden;">
+          <div style="position:absolute;top:0;left:0;right:0;height:2px;
+            background:linear-gradient(90deg,transparent,{top_line},transparent);"></div>
+          <div>
+            <div style="font-family:'JetBrains Mono',monospace;font-size:7px;letter-spacing:2px;
+              color:rgba(120,160,180,0.45);text-transform:uppercase;margin-bottom:2px;">NIFTY 50 · SPOT PRICE</div>
+            <div style="display:flex;align-items:baseline;gap:10px;">
+              <span style="font-family:'Orbitron',monospace;font-size:clamp(18px,2.8vw,26px);font-weight:900;
+                color:{score_color};line-height:1;">&#8377;{d['current_price']:,.2f}</span>
+              <span style="font-family:'JetBrains Mono',monospace;font-size:11px;color:rgba(180,210,230,0.5);">
+                ATM &#8377;{d['atm_strike']:,} &nbsp;·&nbsp; {d.get('expiry','N/A')}</span>
+            </div>
+          </div>
+          <div style="display:flex;gap:16px;flex-wrap:wrap;">
+            {''.join([
+              f'<div style="text-align:center;">'
+              f'<div style="font-family:JetBrains Mono,monospace;font-size:7px;letter-spacing:1.5px;'
+              f'color:rgba(120,160,180,0.4);text-transform:uppercase;margin-bottom:2px;">{lbl}</div>'
+              f'<div style="font-family:Orbitron,monospace;font-size:12px;font-weight:700;color:{col};">{val}</div>'
+              f'</div>'
+              for lbl, val, col in [
+                ('PCR (OI)', f"{d.get('pcr',0):.3f}" if d.get('has_option_data') else 'N/A',
+                 '#ff5252' if d.get('pcr',1)<0.9 else '#00e676' if d.get('pcr',1)>1.1 else '#ffb74d'),
+                ('Max Pain', f"&#8377;{d.get('max_pain',0):,}" if d.get('has_option_data') else 'N/A', '#ffb74d'),
+                ('RSI (14)', f"{d.get('rsi',0):.1f}", '#ffb74d'),
+                ('MACD', 'Bullish' if d.get('macd_bullish') else 'Bearish',
+                 '#00e676' if d.get('macd_bullish') else '#ff5252'),
+              ]
+            ])}
+          </div>
+        </div>
 
-    var latest = filtered[0];
-    var maxEntries = 7;
-    var entries = filtered.slice(0, maxEntries);
+        <!-- Main Direction Widget -->
+        <div class="md-widget" style="border-color:{widget_border};">
+            <div class="md-glow"></div>
+            <div class="md-row-top">
+                <div class="md-label">
+                  <div class="md-live-dot" style="background:{pulse_color};box-shadow:0 0 8px {pulse_color};"></div>
+                  MARKET DIRECTION &nbsp;·&nbsp; ALGORITHMIC
+                </div>
+                <div class="md-pills-top">
+                  <span class="md-pill md-pill-bull">BULL {bull_score}</span>
+                  <span class="md-pill md-pill-bear">BEAR {bear_score}</span>
+                  <span class="md-pill {conf_cls}">{confidence} CONFIDENCE</span>
+                </div>
+            </div>
 
-    // ── Header: Spot, R1, PCR ──
-    var elSpot = document.getElementById('nlfSpot');
-    if (elSpot) elSpot.textContent = latest.spot_price ? latest.spot_price.toLocaleString('en-IN', {minimumFractionDigits:2, maximumFractionDigits:2}) : '—';
-    var elPCR = document.getElementById('nlfPCR');
-    if (elPCR) elPCR.textContent = latest.pcr || '—';
-    var elR1 = document.getElementById('nlfR1');
-    if (elR1) {
-        var nlabel = latest.nearest_label || 'R1';
-        var nval = latest.nearest_level ? '₹' + latest.nearest_level.toLocaleString('en-IN') : '—';
-        elR1.innerHTML = nlabel + ' <b>' + nval + '</b>';
-    }
+            <!-- Direction + Dial + Signals grid — compact -->
+            <div style="display:grid;grid-template-columns:1fr auto 1fr;gap:12px;align-items:center;margin-top:8px;">
 
-    // ── Signal Badges ──
-    var badges = document.getElementById('nlfBadges');
-    if (badges) {
-        var bHtml = '';
-        var sig = (latest.opt_signal || '').toUpperCase();
-        var isBuy = sig.indexOf('BUY') >= 0;
-        var isSell = sig.indexOf('SELL') >= 0;
-        if (isBuy) bHtml += '<span class="nlf-badge nlf-badge-buy">Signal ▲ BUY</span>';
-        else if (isSell) bHtml += '<span class="nlf-badge nlf-badge-sell">Signal ▼ SELL</span>';
-        else bHtml += '<span class="nlf-badge nlf-badge-info">Signal → Neutral</span>';
+              <!-- Left: Direction label + score + confidence dots -->
+              <div style="display:flex;flex-direction:column;gap:5px;">
+                <div class="md-direction" style="background:{dir_gradient};
+                  -webkit-background-clip:text;-webkit-text-fill-color:transparent;background-clip:text;">
+                  {bias}</div>
+                <div style="font-family:'JetBrains Mono',monospace;font-size:10px;color:rgba(180,210,230,0.4);">
+                  Score: <span style="color:{score_color};font-weight:700;">{score_sign}{total_score}</span>
+                  / {bull_score + bear_score} signals
+                </div>
+                <div style="display:flex;align-items:center;gap:5px;">
+                  <span style="font-family:'JetBrains Mono',monospace;font-size:7px;letter-spacing:2px;
+                    color:rgba(120,160,180,0.35);text-transform:uppercase;">Conf</span>
+                  {dots_html}
+                </div>
+              </div>
 
-        var emaSig = latest.ema_signal;
-        if (emaSig === 'BUY') bHtml += '<span class="nlf-badge nlf-badge-buy">EMA 5/13 ▲ BUY</span>';
-        else if (emaSig === 'SELL') bHtml += '<span class="nlf-badge nlf-badge-sell">EMA 5/13 ▼ SELL</span>';
+              <!-- Centre: SVG Sentiment Dial — smaller -->
+              <div style="display:flex;flex-direction:column;align-items:center;gap:2px;">
+                <div style="font-family:'JetBrains Mono',monospace;font-size:7px;letter-spacing:1.5px;
+                  color:rgba(120,160,180,0.35);text-transform:uppercase;">Sentiment</div>
+                <svg width="110" height="65" viewBox="0 0 160 95" style="overflow:visible;">
+                  <defs>
+                    <linearGradient id="gaugeGradMD" x1="0%" y1="0%" x2="100%" y2="0%">
+                      <stop offset="0%" stop-color="#00ff88"/>
+                      <stop offset="45%" stop-color="#ffaa00"/>
+                      <stop offset="100%" stop-color="#ff3355"/>
+                    </linearGradient>
+                  </defs>
+                  <path d="M 15 82 A 65 65 0 0 1 145 82" fill="none"
+                    stroke="rgba(255,255,255,0.06)" stroke-width="10" stroke-linecap="round"/>
+                  <path d="M 15 82 A 65 65 0 0 1 145 82" fill="none"
+                    stroke="url(#gaugeGradMD)" stroke-width="10" stroke-linecap="round" opacity="0.65"/>
+                  <g style="transform:rotate({needle_deg}deg);transform-origin:80px 82px;">
+                    <line x1="80" y1="82" x2="80" y2="28" stroke="{score_color}"
+                      stroke-width="2.5" stroke-linecap="round"/>
+                    <circle cx="80" cy="82" r="6" fill="{score_color}"
+                      stroke="rgba(2,12,20,0.9)" stroke-width="2"/>
+                    <circle cx="80" cy="82" r="2.5" fill="white"/>
+                  </g>
+                  <text x="10" y="96" fill="#00ff88" font-size="8"
+                    font-family="JetBrains Mono" font-weight="700">BULL</text>
+                  <text x="126" y="96" fill="#ff3355" font-size="8"
+                    font-family="JetBrains Mono" font-weight="700">BEAR</text>
+                </svg>
+                <div style="text-align:center;margin-top:-2px;">
+                  <div style="font-family:'Orbitron',monospace;font-size:18px;font-weight:900;
+                    color:{score_color};line-height:1;">{score_sign}{total_score}</div>
+                  <div style="font-family:'JetBrains Mono',monospace;font-size:7px;letter-spacing:1.5px;
+                    color:rgba(120,160,180,0.35);text-transform:uppercase;">Score</div>
+                </div>
+                {neutral_sr_html}
+              </div>
 
-        // Streak
-        var streakCount = 1;
-        for (var si = 1; si < filtered.length; si++) {
-            if ((filtered[si].opt_signal || '').toUpperCase() === sig) streakCount++;
-            else break;
-        }
-        bHtml += '<span class="nlf-badge nlf-badge-warn">Streak *' + streakCount + '</span>';
+              <!-- Right: Signal breakdown bars — compact gaps -->
+              <div style="display:flex;flex-direction:column;gap:5px;">
+                <div style="font-family:'JetBrains Mono',monospace;font-size:7px;letter-spacing:1.5px;
+                  color:rgba(120,160,180,0.4);text-transform:uppercase;margin-bottom:2px;">
+                  Signal Breakdown</div>
+                {sig_rows_html}
+              </div>
+            </div>
+        </div>
 
-        // RSI
-        var rsi = latest.rsi_15m;
-        if (rsi != null) {
-            var rsiCls = rsi >= 70 ? 'nlf-badge-danger' : rsi <= 30 ? 'nlf-badge-buy' : 'nlf-badge-info';
-            bHtml += '<span class="nlf-badge ' + rsiCls + '">RSI 15m ' + rsi.toFixed(1) + '</span>';
-        }
+        <!-- Scoring logic — compact single line -->
+        <div style="margin-top:10px;padding:7px 14px;background:rgba(0,0,0,0.2);border:1px solid rgba(79,195,247,0.07);
+          border-radius:8px;display:flex;gap:16px;flex-wrap:wrap;align-items:center;">
+            <span style="font-family:'JetBrains Mono',monospace;font-size:8px;letter-spacing:1.5px;
+              color:rgba(79,195,247,0.5);text-transform:uppercase;font-weight:700;flex-shrink:0;">Scoring Logic</span>
+            <span style="font-size:9px;color:rgba(176,190,197,0.5);"><span style="color:#00ff88;font-weight:700;">BULLISH</span> &nbsp;Diff &ge; +3</span>
+            <span style="font-size:9px;color:rgba(176,190,197,0.5);"><span style="color:#ff5252;font-weight:700;">BEARISH</span> &nbsp;Diff &le; &minus;3</span>
+            <span style="font-size:9px;color:rgba(176,190,197,0.5);"><span style="color:#ffb74d;font-weight:700;">SIDEWAYS</span> &nbsp;&minus;2 to +2</span>
+            <span style="font-size:9px;color:rgba(176,190,197,0.5);"><span style="color:#4fc3f7;font-weight:700;">CONF</span> &nbsp;HIGH &ge; 4 gap &nbsp;&middot;&nbsp; OI: ATM &plusmn;10 only</span>
+        </div>
+    </div>
+"""
 
-        // VWAP
-        var vwapVal = latest.vwap;
-        var spot = latest.spot_price || 0;
-        if (vwapVal && vwapVal > 0) {
-            var aboveVwap = spot >= vwapVal;
-            bHtml += '<span class="nlf-badge ' + (aboveVwap ? 'nlf-badge-buy' : 'nlf-badge-danger') + '">VWAP ' + (aboveVwap ? 'Above' : 'Below') + '</span>';
+    def _fiidii_section_html(self):
+        data = self.html_data['fii_dii_data']
+        summ = self.html_data['fii_dii_summ']
+        badge_map = {
+            'fii-bull':  ('#00e676','rgba(0,230,118,0.12)','rgba(0,230,118,0.3)'),
+            'fii-cbull': ('#69f0ae','rgba(105,240,174,0.10)','rgba(105,240,174,0.28)'),
+            'fii-neu':   ('#ffd740','rgba(255,215,64,0.10)','rgba(255,215,64,0.28)'),
+            'fii-bear':  ('#ff5252','rgba(255,82,82,0.10)','rgba(255,82,82,0.28)'),
         }
+        s_color,s_bg,s_border = badge_map.get(summ['badge_cls'],badge_map['fii-neu'])
+        is_fallback = any(r.get('fallback') for r in data)
+        date_range  = f"{data[0]['date']} \u2013 {data[-1]['date']}" if data else ''
+        data_src_html = ('<span class="pf-live-badge pf-estimated">\u26a0 ESTIMATED</span>'
+                         if is_fallback else '<span class="pf-live-badge pf-live">\u25cf LIVE</span>')
+        max_abs = summ['max_abs'] or 1
 
-        // Distance
-        if (latest.distance_pts != null && latest.nearest_level) {
-            bHtml += '<span class="nlf-badge nlf-badge-info">Dist ' + (latest.distance_pts >= 0 ? '+' : '') + Math.round(latest.distance_pts) + ' pts</span>';
-        }
+        # ── Avg values ────────────────────────────────────────────────────
+        fa=summ['fii_avg']; da=summ['dii_avg']; na=summ['net_avg']
+        fs='+' if fa>=0 else ''; ds='+' if da>=0 else ''; ns='+' if na>=0 else ''
+        fc='#00d4ff' if fa>=0 else '#ff4444'
+        dc='#ffb300' if da>=0 else '#ff4444'
+        nc='#c084fc' if na>=0 else '#f87171'
 
-        // Confluence badge for NLF
-        var nlfCBuy = 0, nlfCSell = 0, nlfCT = 0;
-        var nlfPcr = parseFloat(latest.pcr) || 0;
-        if (nlfPcr > 0) { nlfCT++; if (nlfPcr > 1.0) nlfCBuy++; else if (nlfPcr < 0.9) nlfCSell++; }
-        var nlfOi = (latest.opt_signal || '').toUpperCase();
-        if (nlfOi.indexOf('BUY') >= 0) { nlfCT++; nlfCBuy++; } else if (nlfOi.indexOf('SELL') >= 0) { nlfCT++; nlfCSell++; } else { nlfCT++; }
-        if (latest.vwap && latest.vwap > 0 && spot > 0) { nlfCT++; if (spot >= latest.vwap) nlfCBuy++; else nlfCSell++; }
-        if (rsi != null) { nlfCT++; if (rsi >= 55) nlfCBuy++; else if (rsi <= 45) nlfCSell++; }
-        if (latest.ema_signal === 'BUY') { nlfCT++; nlfCBuy++; } else if (latest.ema_signal === 'SELL') { nlfCT++; nlfCSell++; }
-        var nlfCMax = Math.max(nlfCBuy, nlfCSell);
-        var nlfCDir = nlfCBuy > nlfCSell ? 'BUY' : (nlfCSell > nlfCBuy ? 'SELL' : 'MIXED');
-        var nlfCCls = nlfCMax >= 4 ? (nlfCDir === 'BUY' ? 'nlf-badge-buy' : 'nlf-badge-sell') : nlfCMax >= 3 ? (nlfCDir === 'BUY' ? 'nlf-badge-buy' : 'nlf-badge-danger') : 'nlf-badge-warn';
-        bHtml += '<span class="nlf-badge ' + nlfCCls + '">⚡ ' + nlfCMax + '/' + nlfCT + ' ' + (nlfCMax >= 3 ? nlfCDir : 'WEAK') + '</span>';
+        # ── FII bar width (capped at 100%) ────────────────────────────────
+        fii_bar_w = round(min(100, abs(fa) / max_abs * 100), 1)
+        dii_bar_w = round(min(100, abs(da) / max_abs * 100), 1)
+        fii_bar_col = '#ff4444' if fa < 0 else '#00d4ff'
+        dii_bar_col = '#ffb300' if da >= 0 else '#ff4444'
 
-        badges.innerHTML = bHtml;
-    }
+        # ── Daily dot chips (10 days) ─────────────────────────────────────
+        dots_html = ''
+        for row in data:
+            net_v = row['fii'] + row['dii']
+            dot_col  = '#00e676' if net_v >= 0 else '#ff4757'
+            dot_bg   = 'rgba(0,230,118,0.15)' if net_v >= 0 else 'rgba(255,71,87,0.15)'
+            dot_bdr  = 'rgba(0,230,118,0.3)'  if net_v >= 0 else 'rgba(255,71,87,0.3)'
+            net_sign = '+' if net_v >= 0 else ''
+            net_fmt  = f"{net_v/1000:+.1f}k" if abs(net_v) >= 1000 else f"{net_sign}{net_v:.0f}"
+            dots_html += (
+                f'<div class="pf2-dot" style="border-color:{dot_bdr};background:{dot_bg};">'
+                f'<div class="pf2-dot-date">{row["date"].split(" ")[1]}</div>'
+                f'<div class="pf2-dot-net" style="color:{dot_col};">{net_fmt}</div>'
+                f'</div>'
+            )
 
-    // ── Table rows ──
-    var html = '';
-    entries.forEach(function(row, idx) {
-        var isLive = (idx === 0);
-        var t = row.time || '';
+        verdict_badge = (f'<span class="pf-verdict-badge" style="color:{s_color};background:{s_bg};border:1px solid {s_border};">'
+                         f'{summ["emoji"]} {summ["label"]}</span>')
+        n_days = len(data)
 
-        // Spot
-        var spotStr = row.spot_price ? row.spot_price.toLocaleString('en-IN', {minimumFractionDigits:2, maximumFractionDigits:2}) : '';
-        if (isLive) spotStr = '';
+        return f"""
+<div class="section">
+    <div class="section-title">
+        <span>&#127982;</span> FII / DII INSTITUTIONAL FLOW
+        {data_src_html}
+        <span class="pf-date-range">Last {n_days} Trading Days &nbsp;&middot;&nbsp; {date_range}</span>
+    </div>
 
-        // Delta
-        var prevRow = entries[idx + 1];
-        var spotDelta = (prevRow && prevRow.spot_price && row.spot_price)
-            ? Math.round((row.spot_price - prevRow.spot_price) * 10) / 10
-            : null;
-        var dHtml;
-        if (spotDelta === null) {
-            dHtml = '<span style="color:rgba(176,190,197,0.25);">—</span>';
-        } else if (spotDelta >= 0) {
-            dHtml = '<span style="color:#00e676;">▲+' + spotDelta.toFixed(1) + '</span>';
-        } else {
-            dHtml = '<span style="color:#ff4757;">▼' + spotDelta.toFixed(1) + '</span>';
-        }
+    <!-- FII Flow Meter -->
+    <div class="pf2-meter-row">
+        <div class="pf2-meter-head">
+            <div class="pf2-meter-labels">
+                <span class="pf2-lbl">FII</span>
+                <span class="pf2-sublbl">{('Sellers' if fa < 0 else 'Buyers')}</span>
+            </div>
+            <span class="pf2-val" style="color:{fc};">{fs}{fa:,.0f} <span class="pf2-unit">Cr/day avg</span></span>
+        </div>
+        <div class="pf2-track">
+            <div class="pf2-fill" style="width:{fii_bar_w}%;background:{fii_bar_col};{'float:right;' if fa < 0 else ''}"></div>
+        </div>
+    </div>
 
-        // Nifty Move %
-        var nmp = row.nifty_move_pct;
-        var nmpHtml, nmpColor;
-        if (nmp == null) {
-            nmpHtml = '—'; nmpColor = 'rgba(176,190,197,0.25)';
-        } else {
-            nmpColor = nmp >= 0 ? '#00e676' : '#ff4757';
-            nmpHtml = '<span style="color:' + nmpColor + ';">' + (nmp >= 0 ? '+' : '') + nmp.toFixed(2) + '%</span>';
-        }
+    <!-- DII Flow Meter -->
+    <div class="pf2-meter-row">
+        <div class="pf2-meter-head">
+            <div class="pf2-meter-labels">
+                <span class="pf2-lbl">DII</span>
+                <span class="pf2-sublbl">{('Buyers' if da >= 0 else 'Sellers')}</span>
+            </div>
+            <span class="pf2-val" style="color:{dc};">{ds}{da:,.0f} <span class="pf2-unit">Cr/day avg</span></span>
+        </div>
+        <div class="pf2-track">
+            <div class="pf2-fill" style="width:{dii_bar_w}%;background:{dii_bar_col};"></div>
+        </div>
+    </div>
 
-        // VWAP gap (spot vs VWAP distance in points)
-        var vwapVal = row.vwap;
-        var spotVal = row.spot_price || 0;
-        var vwapHtml;
-        if (vwapVal && vwapVal > 0 && spotVal > 0) {
-            var vwapGap = Math.round(spotVal - vwapVal);
-            var aboveVwap = vwapGap >= 0;
-            var vwapColor = aboveVwap ? '#00e676' : '#ff4757';
-            var vwapArrow = aboveVwap ? '▲' : '▼';
-            vwapHtml = '<span style="color:' + vwapColor + ';font-size:12px;">' + vwapArrow + Math.abs(vwapGap) + '</span>';
-        } else {
-            vwapHtml = '<span style="color:rgba(176,190,197,0.25);">—</span>';
-        }
+    <!-- Daily net dot chips -->
+    <div class="pf2-dots-wrap">{dots_html}</div>
 
-        // Net OI diff (CE change - PE change)
-        var diff = row.diff;
-        var netOiHtml;
-        if (diff == null) {
-            netOiHtml = '<span style="color:rgba(176,190,197,0.25);">—</span>';
-        } else {
-            var absDiff = Math.abs(diff);
-            var diffSign = diff >= 0 ? '+' : '-';
-            var diffColor = diff >= 0 ? '#00e676' : '#ff4757';
-            var diffStr;
-            if (absDiff >= 10000000) diffStr = diffSign + (absDiff/10000000).toFixed(1) + 'Cr';
-            else if (absDiff >= 100000) diffStr = diffSign + (absDiff/100000).toFixed(1) + 'L';
-            else if (absDiff >= 1000) diffStr = diffSign + (absDiff/1000).toFixed(1) + 'K';
-            else diffStr = (diff >= 0 ? '+' : '') + diff;
-            netOiHtml = '<span style="color:' + diffColor + ';">' + diffStr + '</span>';
-        }
+    <!-- Avg strip -->
+    <div class="pf-avg-strip">
+        <div class="pf-avg-cell">
+            <div class="pf-avg-eyebrow">FII {n_days}D Avg</div>
+            <div class="pf-avg-val" style="color:{fc};">{fs}{fa:,.0f}</div>
+            <div class="pf-avg-unit">&#8377; Cr / day</div>
+        </div>
+        <div class="pf-avg-sep"></div>
+        <div class="pf-avg-cell">
+            <div class="pf-avg-eyebrow">DII {n_days}D Avg</div>
+            <div class="pf-avg-val" style="color:{dc};">{ds}{da:,.0f}</div>
+            <div class="pf-avg-unit">&#8377; Cr / day</div>
+        </div>
+        <div class="pf-avg-sep"></div>
+        <div class="pf-avg-cell">
+            <div class="pf-avg-eyebrow">Net Combined</div>
+            <div class="pf-avg-val" style="color:{nc};">{ns}{na:,.0f}</div>
+            <div class="pf-avg-unit">&#8377; Cr / day</div>
+        </div>
+    </div>
 
-        // Streak
-        // Streak — count from full filtered data, not just visible entries
-        var sCount = 1;
-        var curSig = (row.opt_signal || '').toUpperCase();
-        for (var si = idx + 1; si < filtered.length; si++) {
-            if ((filtered[si].opt_signal || '').toUpperCase() === curSig) sCount++;
-            else break;
-        }
+    <!-- Insight box -->
+    <div class="pf-insight-box" style="background:{s_bg};border:1px solid {s_border};">
+        <div class="pf-insight-header">
+            <span class="pf-insight-lbl" style="color:{s_color};">&#128202; {n_days}-DAY INSIGHT &amp; DIRECTION</span>
+            {verdict_badge}
+        </div>
+        <div class="pf-insight-text">{summ['insight']}</div>
+    </div>
+</div>
+"""
 
-        // RSI
-        var rsiVal = row.rsi_15m;
-        var rsiHtml, rsiColor;
-        if (rsiVal == null) {
-            rsiHtml = '—'; rsiColor = 'rgba(176,190,197,0.25)';
-        } else {
-            rsiColor = rsiVal >= 70 ? '#ff4757' : rsiVal >= 55 ? '#69f0ae' : rsiVal <= 30 ? '#00e676' : rsiVal <= 45 ? '#fca5a5' : '#ffb74d';
-            rsiHtml = rsiVal.toFixed(1);
-        }
+    def _oi_navy_command_section(self, d):
+        oi_cls=d['oi_class']; direction=d['oi_direction']; signal=d['oi_signal']
+        ce_raw=d['total_ce_oi_change']; pe_raw=d['total_pe_oi_change']
+        bull_force=0; bear_force=0
+        if ce_raw < 0: bull_force += abs(ce_raw)
+        else:          bear_force += abs(ce_raw)
+        if pe_raw > 0: bull_force += abs(pe_raw)
+        else:          bear_force += abs(pe_raw)
+        total_force=bull_force+bear_force
+        bull_pct=round(bull_force/total_force*100) if total_force>0 else 50
+        bear_pct=100-bull_pct
+        if oi_cls=='bearish':
+            dir_bg='rgba(30,10,14,0.92)';dir_border='rgba(239,68,68,0.35)';dir_left_bar='linear-gradient(180deg,#ef4444,#b91c1c)';dir_name_col='#fb7185';dir_desc_col='rgba(251,113,133,0.5)'
+        elif oi_cls=='bullish':
+            dir_bg='rgba(10,30,20,0.92)';dir_border='rgba(16,185,129,0.35)';dir_left_bar='linear-gradient(180deg,#10b981,#047857)';dir_name_col='#34d399';dir_desc_col='rgba(52,211,153,0.5)'
+        else:
+            dir_bg='rgba(20,20,10,0.92)';dir_border='rgba(251,191,36,0.3)';dir_left_bar='linear-gradient(180deg,#f59e0b,#d97706)';dir_name_col='#fbbf24';dir_desc_col='rgba(251,191,36,0.5)'
+        ce_val=d['total_ce_oi_change']; pe_val=d['total_pe_oi_change']; net_val=d['net_oi_change']
+        ce_is_bear=ce_val>0; pe_is_bull=pe_val>0
+        ce_col='#fb7185' if ce_is_bear else '#34d399'; ce_dot_col='#ef4444' if ce_is_bear else '#10b981'
+        ce_lbl='Bearish Signal' if ce_is_bear else 'Bullish Signal'; ce_btn_col='#ef4444' if ce_is_bear else '#10b981'
+        ce_btn_bg='rgba(239,68,68,0.12)' if ce_is_bear else 'rgba(16,185,129,0.12)'; ce_btn_bdr='rgba(239,68,68,0.4)' if ce_is_bear else 'rgba(16,185,129,0.4)'
+        pe_col='#34d399' if pe_is_bull else '#fb7185'; pe_dot_col='#10b981' if pe_is_bull else '#ef4444'
+        pe_lbl='Bullish Signal' if pe_is_bull else 'Bearish Signal'; pe_btn_col='#10b981' if pe_is_bull else '#ef4444'
+        pe_btn_bg='rgba(16,185,129,0.12)' if pe_is_bull else 'rgba(239,68,68,0.12)'; pe_btn_bdr='rgba(16,185,129,0.4)' if pe_is_bull else 'rgba(239,68,68,0.4)'
+        if net_val > 0: net_col='#fb7185';net_dot_col='#ef4444';net_lbl='Bearish Net';net_btn_col='#ef4444';net_btn_bg='rgba(239,68,68,0.12)';net_btn_bdr='rgba(239,68,68,0.4)'
+        elif net_val < 0: net_col='#34d399';net_dot_col='#10b981';net_lbl='Bullish Net';net_btn_col='#10b981';net_btn_bg='rgba(16,185,129,0.12)';net_btn_bdr='rgba(16,185,129,0.4)'
+        else: net_col='#fbbf24';net_dot_col='#f59e0b';net_lbl='Balanced';net_btn_col='#f59e0b';net_btn_bg='rgba(245,158,11,0.12)';net_btn_bdr='rgba(245,158,11,0.4)'
+        def nc_card(label,idc,value,val_col,sub,btn_lbl,btn_col,btn_bg,btn_bdr,icon_char):
+            return (f'<div class="nc-card"><div class="nc-card-header">'
+                    f'<span class="nc-card-label">{label}</span><span style="font-size:18px;line-height:1;color:{idc};">{icon_char}</span></div>'
+                    f'<div class="nc-card-value" style="color:{val_col};">{value:+,}</div>'
+                    f'<div class="nc-card-sub">{sub}</div>'
+                    f'<div class="nc-card-btn" style="color:{btn_col};background:{btn_bg};border:1px solid {btn_bdr};">{btn_lbl}</div></div>')
+        cards_html = (
+            nc_card('CALL OI CHANGE',ce_dot_col,ce_val,ce_col,'CE open interest \u0394',ce_lbl,ce_btn_col,ce_btn_bg,ce_btn_bdr,'🔴' if ce_is_bear else '🟢') +
+            nc_card('PUT OI CHANGE',pe_dot_col,pe_val,pe_col,'PE open interest \u0394',pe_lbl,pe_btn_col,pe_btn_bg,pe_btn_bdr,'🟢' if pe_is_bull else '🔴') +
+            nc_card('NET OI CHANGE',net_dot_col,net_val,net_col,'CE \u0394 \u2212 PE \u0394',net_lbl,net_btn_col,net_btn_bg,net_btn_bdr,'\u2696\ufe0f')
+        )
+        dual_meters = (
+            f'<div class="nc-meters-panel">'
+            f'<div class="nc-meter-row"><div class="nc-meter-head-row"><span class="nc-meter-label">\U0001f7e2 Bull Strength</span><span class="nc-meter-pct" style="color:#34d399;">{bull_pct}%</span></div>'
+            f'<div class="nc-meter-track"><div class="nc-meter-fill" style="width:{bull_pct}%;background:linear-gradient(90deg,#10b981,#34d399);"></div>'
+            f'<div class="nc-meter-head" style="left:{bull_pct}%;background:#34d399;box-shadow:0 0 8px #34d399;"></div></div></div>'
+            f'<div class="nc-meter-row"><div class="nc-meter-head-row"><span class="nc-meter-label">\U0001f534 Bear Strength</span><span class="nc-meter-pct" style="color:#fb7185;">{bear_pct}%</span></div>'
+            f'<div class="nc-meter-track"><div class="nc-meter-fill" style="width:{bear_pct}%;background:linear-gradient(90deg,#ef4444,#f97316);"></div>'
+            f'<div class="nc-meter-head" style="left:{bear_pct}%;background:#fb7185;box-shadow:0 0 8px #fb7185;"></div></div></div></div>'
+        )
+        # ── Compact single-row OI widget (space-saving redesign) ──
+        # All values (ce_val, pe_val, net_val, direction, signal,
+        # bull_pct, bear_pct, dir_name_col, dir_desc_col) come from
+        # the logic above — nothing changed there.
+        return f"""
+<style>
+/* ── OI Navy Command — responsive ── */
+.nc-wrap {{
+    background:#090f1c;
+    border:1px solid rgba(0,200,255,0.1);
+    border-radius:12px;
+    overflow:hidden;
+    font-family:'JetBrains Mono',monospace;
+}}
+.nc-header {{
+    display:flex;align-items:center;justify-content:space-between;
+    padding:8px 14px;
+    background:rgba(0,0,0,0.35);
+    border-bottom:1px solid rgba(0,200,255,0.08);
+    flex-wrap:wrap;gap:6px;
+}}
+.nc-header-left {{display:flex;align-items:center;gap:8px;flex-wrap:wrap;}}
+.nc-header-title {{font-size:15px;font-weight:700;color:#e2eaf5;letter-spacing:.5px;}}
+.nc-header-sub {{font-size:12px;color:#a8c4d8;letter-spacing:1px;}}
+.nc-atm-badge {{
+    font-size:9px;letter-spacing:1.5px;white-space:nowrap;
+    background:rgba(0,212,255,0.08);border:1px solid rgba(0,212,255,0.2);
+    color:#00d4ff;padding:3px 10px;border-radius:5px;
+}}
+/* Desktop: single row — direction+bars merged | divider | CE | PE | Net */
+.nc-grid {{
+    display:grid;
+    grid-template-columns:2.2fr 1px minmax(0,1fr) minmax(0,1fr) minmax(0,1fr);
+    min-height:90px;
+}}
+.nc-divider {{background:rgba(0,200,255,0.08);}}
 
-        // PCR
-        var pcrV = parseFloat(row.pcr) || 0;
-        var pcrColor = pcrV >= 1.1 ? '#00e676' : pcrV <= 0.9 ? '#ff4757' : '#ffb74d';
-        var pcrHtml = row.pcr ? '<span style="color:' + pcrColor + ';">' + row.pcr + '</span>' : '<span style="color:rgba(176,190,197,0.25);">—</span>';
+/* Direction+bars unified cell — left:text  right:bars */
+.nc-dir-cell {{
+    padding:14px 18px;
+    border-left:3px solid {dir_name_col};
+    display:flex;flex-direction:row;align-items:center;gap:0;
+}}
+.nc-dir-text {{
+    display:flex;flex-direction:column;justify-content:center;gap:3px;
+    flex:0 0 auto; min-width:140px;
+}}
+.nc-dir-label {{font-size:10px;letter-spacing:1.5px;color:{dir_desc_col};text-transform:uppercase;}}
+.nc-dir-name {{
+    font-family:'Orbitron',monospace;font-size:22px;font-weight:900;
+    color:{dir_name_col};text-shadow:0 0 18px {dir_name_col}77;line-height:1.2;
+}}
+.nc-dir-sig {{font-size:11px;color:{dir_desc_col};letter-spacing:.3px;margin-top:2px;}}
 
-        // Nearest Level
-        var isBuy = (row.opt_signal||'').toUpperCase().indexOf('BUY') >= 0;
-        var isSell = (row.opt_signal||'').toUpperCase().indexOf('SELL') >= 0;
-        var nlabel = row.nearest_label || (isBuy ? 'R1' : isSell ? 'S1' : '—');
-        var nval = row.nearest_level ? '₹' + Number(row.nearest_level).toLocaleString('en-IN') : '';
-        var levelHtml;
-        if (row.nearest_level) {
-            var lColor = isBuy ? '#00e676' : '#ff4757';
-            levelHtml = '<span style="color:' + lColor + ';font-size:11px;"><span style="font-size:9px;font-weight:800;opacity:0.7;">' + nlabel + '</span> ' + nval + '</span>';
-        } else {
-            levelHtml = '<span style="color:rgba(176,190,197,0.25);">—</span>';
-        }
+/* Bars block — fills remaining space of direction cell */
+.nc-bars-block {{
+    flex:1;
+    display:flex;flex-direction:column;justify-content:center;gap:10px;
+    padding:0 18px 0 24px;
+    border-left:1px solid rgba(0,200,255,0.08);
+    margin-left:16px;
+}}
+.nc-bar-row {{display:flex;align-items:center;gap:10px;}}
+.nc-bar-lbl {{
+    font-size:11px;font-weight:700;letter-spacing:1px;
+    width:32px;flex-shrink:0;
+}}
+.nc-bar-track {{flex:1;height:6px;background:rgba(255,255,255,0.07);border-radius:99px;overflow:hidden;}}
+.nc-bar-pct {{
+    font-family:'Orbitron',monospace;font-size:15px;font-weight:900;
+    min-width:42px;text-align:right;flex-shrink:0;
+}}
+.nc-oi-cell {{
+    padding:14px 14px;
+    border-left:1px solid rgba(0,200,255,0.08);
+    display:flex;flex-direction:column;justify-content:center;gap:3px;
+}}
+.nc-oi-label {{font-size:10px;letter-spacing:1px;text-transform:uppercase;color:#a8c4d8;margin-bottom:2px;}}
+.nc-oi-value {{font-family:'Orbitron',monospace;font-size:20px;font-weight:900;line-height:1.15;}}
+.nc-oi-footer {{display:flex;align-items:center;justify-content:space-between;margin-top:4px;flex-wrap:wrap;gap:3px;}}
+.nc-oi-sub {{font-size:10px;color:#a8c4d8;}}
+.nc-oi-btn {{font-size:10px;padding:2px 7px;border-radius:3px;white-space:nowrap;}}
+.nc-legend {{
+    padding:8px 14px;
+    background:rgba(0,0,0,0.25);
+    border-top:1px solid rgba(0,200,255,0.06);
+    display:flex;flex-wrap:wrap;align-items:center;gap:5px 10px;
+    font-size:11px;color:#a8c4d8;
+}}
 
-        // Confluence
-        var cBuy = 0, cSell = 0, cTotal = 0;
-        if (pcrV > 0) { cTotal++; if (pcrV > 1.0) cBuy++; else if (pcrV < 0.9) cSell++; }
-        var oiSig = (row.opt_signal||'').toUpperCase();
-        if (oiSig.indexOf('BUY') >= 0) { cTotal++; cBuy++; } else if (oiSig.indexOf('SELL') >= 0) { cTotal++; cSell++; } else if (oiSig === 'NEUTRAL') { cTotal++; }
-        var cVwap = row.vwap; var cSpot = row.spot_price || 0;
-        if (cVwap && cVwap > 0 && cSpot > 0) { cTotal++; if (cSpot >= cVwap) cBuy++; else cSell++; }
-        var cRsi = row.rsi_15m;
-        if (cRsi != null) { cTotal++; if (cRsi >= 55) cBuy++; else if (cRsi <= 45) cSell++; }
-        var cEma = row.ema_signal;
-        if (cEma === 'BUY') { cTotal++; cBuy++; } else if (cEma === 'SELL') { cTotal++; cSell++; }
-        var cMax = Math.max(cBuy, cSell);
-        var cDir = cBuy > cSell ? 'BUY' : (cSell > cBuy ? 'SELL' : 'MIXED');
-        var confColor, confLabel;
-        if (cTotal === 0) { confColor = 'rgba(176,190,197,0.3)'; confLabel = '—'; }
-        else if (cMax >= 4 && cDir === 'BUY') { confColor = '#00e676'; confLabel = '▲ ' + cMax + '/' + cTotal; }
-        else if (cMax >= 4 && cDir === 'SELL') { confColor = '#ff4757'; confLabel = '▼ ' + cMax + '/' + cTotal; }
-        else if (cMax >= 3 && cDir === 'BUY') { confColor = '#69f0ae'; confLabel = '▲ ' + cMax + '/' + cTotal; }
-        else if (cMax >= 3 && cDir === 'SELL') { confColor = '#fca5a5'; confLabel = '▼ ' + cMax + '/' + cTotal; }
-        else { confColor = '#ffb74d'; confLabel = '~ ' + cMax + '/' + cTotal; }
-        var confStrength = cMax >= 4 ? 'STRONG' : cMax >= 3 ? cDir : 'WEAK';
-        var confHtml = '<span style="color:' + confColor + ';font-size:12px;">' + confLabel + '</span>';
+/* ── MOBILE: stack into 2 rows ── */
+@media (max-width:620px) {{
+    .nc-grid {{
+        display:grid;
+        grid-template-columns:1fr 1fr 1fr;
+        grid-template-rows:auto auto;
+    }}
+    .nc-divider {{ display:none; }}
 
-        html += '<div class="nlf-row' + (isLive ? ' nlf-row-live' : '') + '">'
-            + '<span class="nlf-row-time">' + t + '</span>'
-            + '<span class="nlf-row-pcr">' + pcrHtml + '</span>'
-            + '<span class="nlf-row-delta">' + dHtml + '</span>'
-            + '<span class="nlf-row-vwap">' + vwapHtml + '</span>'
-            + '<span class="nlf-row-stk">*' + sCount + '</span>'
-            + '<span class="nlf-row-level">' + levelHtml + '</span>'
-            + '<span class="nlf-row-rsi" style="color:' + rsiColor + ';">' + rsiHtml + '</span>'
-            + '<span class="nlf-row-conf">' + confHtml + '</span>'
-            + '</div>';
-    });
-    body.innerHTML = html;
+    /* Direction+bars cell: spans full row 1 */
+    .nc-dir-cell {{
+        grid-column:1 / 4;
+        grid-row:1;
+        border-left:3px solid {dir_name_col};
+        border-bottom:1px solid rgba(0,200,255,0.08);
+        padding:12px 14px;
+        flex-direction:row;
+        align-items:center;
+    }}
+    .nc-dir-text {{ min-width:110px; }}
+    .nc-dir-name {{ font-size:18px; }}
+    .nc-bars-block {{
+        padding:0 10px 0 16px;
+        margin-left:12px;
+    }}
+    .nc-bar-pct {{ font-size:13px; min-width:36px; }}
 
-    // ── Footer ──
-    var footer = document.getElementById('nlfFooter');
-    if (footer) {
-        var nmp0 = latest.nifty_move_pct;
-        var nmpFmt = (nmp0 != null) ? ((nmp0 >= 0 ? '+' : '') + nmp0.toFixed(2) + '% from prev close') : '';
-        var nmpFootColor = (nmp0 != null && nmp0 >= 0) ? '#00e676' : '#ff4757';
-        footer.innerHTML = '<span class="nlf-footer-left">' + filtered.length + ' candles &middot; signals active</span>'
-            + '<span class="nlf-footer-right" style="color:' + nmpFootColor + ';">▲ ' + nmpFmt + '</span>';
-    }
-}
-function fmtOI(n) {
-    var abs = Math.abs(n);
-    var sign = n >= 0 ? '+' : '-';
-    if (abs >= 10000000) return sign + (abs/10000000).toFixed(2) + ' Cr';
-    if (abs >= 100000)   return sign + (abs/100000).toFixed(2) + ' L';
-    if (n === 0) return '0';
-    return (n >= 0 ? '+' : '') + n.toLocaleString('en-IN');
-}
+    /* CE / PE / Net — equal thirds in row 2 */
+    .nc-ce-cell {{
+        grid-column:1 / 2; grid-row:2;
+        border-top:2px solid {ce_col};
+        border-right:1px solid rgba(0,200,255,0.08);
+        padding:10px 10px;
+    }}
+    .nc-pe-cell {{
+        grid-column:2 / 3; grid-row:2;
+        border-top:2px solid {pe_col};
+        border-right:1px solid rgba(0,200,255,0.08);
+        padding:10px 10px;
+    }}
+    .nc-net-cell {{
+        grid-column:3 / 4; grid-row:2;
+        border-top:2px solid {net_col};
+        padding:10px 10px;
+    }}
 
-function drawSparkline(data) {
-    var canvas = document.getElementById('oiSparklineCanvas');
-    if (!canvas || !canvas.getContext) return;
-    var dpr = window.devicePixelRatio || 1;
+    .nc-oi-value {{ font-size:13px; }}
+    .nc-oi-footer {{ flex-direction:column; align-items:flex-start; gap:3px; }}
+    .nc-legend-verbose {{ display:none; }}
+}}
+</style>
 
-    var reversed = data.slice().reverse();
-    var diffs = reversed.map(function(r){ return r.diff || 0; });
-    if (diffs.length < 2) return;
+<div class="section">
+<div class="nc-wrap">
 
-    /* ── Stat boxes ── */
-    var latest = diffs[diffs.length - 1];
-    var high   = Math.max.apply(null, diffs);
-    var low    = Math.min.apply(null, diffs);
-    var isBull = latest >= 0;
-    var el;
-    el = document.getElementById('oiStatLatest');
-    if (el) { el.textContent = fmtOI(latest); el.style.color = isBull ? '#34d399' : '#f87171'; }
-    el = document.getElementById('oiStatHigh');   if (el) el.textContent = fmtOI(high);
-    el = document.getElementById('oiStatLow');    if (el) el.textContent = fmtOI(low);
-    el = document.getElementById('oiStatSignal');
-    if (el) { el.textContent = isBull ? 'BUY' : 'SELL'; el.style.color = isBull ? '#34d399' : '#f87171'; }
-    el = document.getElementById('oiStatSignalSub');
-    if (el) el.textContent = isBull ? 'Bias improving' : 'Bias declining';
+  <!-- ── Header ── -->
+  <div class="nc-header">
+    <div class="nc-header-left">
+      <span style="font-size:13px;">&#128202;</span>
+      <span class="nc-header-title">Change in Open Interest</span>
+      <span class="nc-header-sub">Today's Direction Analysis</span>
+    </div>
+    <div class="nc-atm-badge">ATM &#177;10</div>
+  </div>
 
-    /* ── Signal history bar ── */
-    var bar = document.getElementById('oiSignalBar');
-    if (bar) {
-        bar.innerHTML = '';
-        var absMax = Math.max(Math.abs(high), Math.abs(low)) || 1;
-        reversed.forEach(function(r) {
-            var seg = document.createElement('div');
-            seg.style.flex = '1';
-            seg.style.height = '100%';
-            seg.style.borderRadius = '1px';
-            seg.style.background = (r.diff || 0) >= 0 ? '#10b981' : '#ef4444';
-            seg.style.opacity = Math.abs(r.diff || 0) / absMax * 0.75 + 0.25;
-            bar.appendChild(seg);
-        });
-    }
+  <!-- ── Grid: Direction | divider | Bars | divider | CE | PE | Net ── -->
+  <div class="nc-grid">
 
-    /* ── Canvas sizing ── */
-    var wrap = canvas.parentElement;
-    var W = wrap ? wrap.clientWidth : 600;
-    var H = 300;
-    canvas.width  = W * dpr;
-    canvas.height = H * dpr;
-    canvas.style.width  = W + 'px';
-    canvas.style.height = H + 'px';
-    var ctx = canvas.getContext('2d');
-    ctx.scale(dpr, dpr);
-    ctx.clearRect(0, 0, W, H);
+    <!-- Direction + Bars — unified cell -->
+    <div class="nc-dir-cell" style="background:linear-gradient(135deg,{dir_bg},{dir_bg.replace('0.92','0.03')});">
 
-    var padT = 16, padB = 20, padL = 4, padR = 16;
-    var cW = W - padL - padR;
-    var cH = H - padT - padB;
-    var n  = diffs.length;
+      <!-- Left: text -->
+      <div class="nc-dir-text">
+        <div class="nc-dir-label">Market Direction</div>
+        <div class="nc-dir-name">{direction}</div>
+        <div class="nc-dir-sig">{signal}</div>
+      </div>
 
-    var minV  = Math.min.apply(null, diffs.concat([0]));
-    var maxV  = Math.max.apply(null, diffs.concat([0]));
-    var range = (maxV - minV) || 1;
+      <!-- Right: bars -->
+      <div class="nc-bars-block">
+        <div class="nc-bar-row">
+          <div class="nc-bar-lbl" style="color:#00ff88;">&#9679; Bull</div>
+          <div class="nc-bar-track">
+            <div style="height:100%;width:{bull_pct}%;background:linear-gradient(90deg,#00c96b,#00ff88);border-radius:99px;box-shadow:0 0 6px rgba(0,255,136,0.5);"></div>
+          </div>
+          <div class="nc-bar-pct" style="color:#00ff88;">{bull_pct}%</div>
+        </div>
+        <div class="nc-bar-row">
+          <div class="nc-bar-lbl" style="color:#ff3b5c;">&#9679; Bear</div>
+          <div class="nc-bar-track">
+            <div style="height:100%;width:{bear_pct}%;background:linear-gradient(90deg,#c9003a,#ff3b5c);border-radius:99px;box-shadow:0 0 6px rgba(255,59,92,0.5);"></div>
+          </div>
+          <div class="nc-bar-pct" style="color:#ff3b5c;">{bear_pct}%</div>
+        </div>
+      </div>
 
-    function toX(i) { return padL + (i / (n - 1)) * cW; }
-    function toY(v) { return padT + (1 - (v - minV) / range) * cH; }
-    var zeroY = toY(0);
+    </div>
 
-    /* ── Grid lines (5 levels) ── */
-    var gridCount = 5;
-    for (var g = 0; g <= gridCount; g++) {
-        var gv = minV + (range / gridCount) * g;
-        var gy = toY(gv);
-        ctx.beginPath();
-        ctx.strokeStyle = (Math.abs(gv) < range * 0.02)
-            ? 'rgba(79,195,247,0.3)' : 'rgba(79,195,247,0.07)';
-        ctx.lineWidth = (Math.abs(gv) < range * 0.02) ? 1 : 0.5;
-        if (Math.abs(gv) < range * 0.02) ctx.setLineDash([6, 4]);
-        else ctx.setLineDash([]);
-        ctx.moveTo(padL, gy); ctx.lineTo(W - padR, gy);
-        ctx.stroke();
-    }
-    ctx.setLineDash([]);
+    <!-- Divider -->
+    <div class="nc-divider"></div>
 
-    /* ── Colored fill segments ── */
-    for (var i = 0; i < n - 1; i++) {
-        var x0 = toX(i),   y0 = toY(diffs[i]);
-        var x1 = toX(i+1), y1 = toY(diffs[i+1]);
-        var pos0 = diffs[i]   >= 0;
-        var pos1 = diffs[i+1] >= 0;
-        if (pos0 === pos1) {
-            ctx.beginPath();
-            ctx.moveTo(x0, zeroY); ctx.lineTo(x0, y0);
-            ctx.lineTo(x1, y1);   ctx.lineTo(x1, zeroY);
-            ctx.closePath();
-            ctx.fillStyle = pos0 ? 'rgba(16,185,129,0.25)' : 'rgba(239,68,68,0.25)';
-            ctx.fill();
-        } else {
-            var ratio = Math.abs(diffs[i]) / (Math.abs(diffs[i]) + Math.abs(diffs[i+1]));
-            var xMid  = x0 + ratio * (x1 - x0);
-            ctx.beginPath();
-            ctx.moveTo(x0, zeroY); ctx.lineTo(x0, y0); ctx.lineTo(xMid, zeroY);
-            ctx.closePath();
-            ctx.fillStyle = pos0 ? 'rgba(16,185,129,0.25)' : 'rgba(239,68,68,0.25)';
-            ctx.fill();
-            ctx.beginPath();
-            ctx.moveTo(xMid, zeroY); ctx.lineTo(x1, y1); ctx.lineTo(x1, zeroY);
-            ctx.closePath();
-            ctx.fillStyle = pos1 ? 'rgba(16,185,129,0.25)' : 'rgba(239,68,68,0.25)';
-            ctx.fill();
-        }
-    }
+    <!-- Call OI -->
+    <div class="nc-oi-cell nc-ce-cell" style="border-top:2px solid {ce_col};">
+      <div class="nc-oi-label">Call OI &#916;</div>
+      <div class="nc-oi-value" style="color:{ce_col};">{ce_val:+,}</div>
+      <div class="nc-oi-footer">
+        <div class="nc-oi-sub">CE open interest</div>
+        <div class="nc-oi-btn" style="background:{ce_btn_bg};border:1px solid {ce_btn_bdr};color:{ce_btn_col};">{ce_lbl}</div>
+      </div>
+    </div>
 
-    /* ── Stroke line ── */
-    for (var i = 0; i < n - 1; i++) {
-        var bothPos = diffs[i] >= 0 && diffs[i+1] >= 0;
-        var bothNeg = diffs[i] <  0 && diffs[i+1] <  0;
-        ctx.beginPath();
-        ctx.strokeStyle = bothPos ? '#34d399' : bothNeg ? '#f87171' : '#fbbf24';
-        ctx.lineWidth = 2; ctx.lineJoin = 'round';
-        ctx.moveTo(toX(i),   toY(diffs[i]));
-        ctx.lineTo(toX(i+1), toY(diffs[i+1]));
-        ctx.stroke();
-    }
+    <!-- Put OI -->
+    <div class="nc-oi-cell nc-pe-cell" style="border-top:2px solid {pe_col};">
+      <div class="nc-oi-label">Put OI &#916;</div>
+      <div class="nc-oi-value" style="color:{pe_col};">{pe_val:+,}</div>
+      <div class="nc-oi-footer">
+        <div class="nc-oi-sub">PE open interest</div>
+        <div class="nc-oi-btn" style="background:{pe_btn_bg};border:1px solid {pe_btn_bdr};color:{pe_btn_col};">{pe_lbl}</div>
+      </div>
+    </div>
 
-    /* ── Glowing endpoint ── */
-    var lx = toX(n-1), ly = toY(diffs[n-1]);
-    var dotCol = diffs[n-1] >= 0 ? '#34d399' : '#f87171';
-    ctx.beginPath(); ctx.arc(lx, ly, 9, 0, Math.PI*2);
-    ctx.fillStyle = dotCol + '22'; ctx.fill();
-    ctx.beginPath(); ctx.arc(lx, ly, 5, 0, Math.PI*2);
-    ctx.fillStyle = dotCol; ctx.fill();
+    <!-- Net OI -->
+    <div class="nc-oi-cell nc-net-cell" style="border-top:2px solid {net_col};">
+      <div class="nc-oi-label">Net OI &#916;</div>
+      <div class="nc-oi-value" style="color:{net_col};">{net_val:+,}</div>
+      <div class="nc-oi-footer">
+        <div class="nc-oi-sub">PE &#916; &#8722; CE &#916;</div>
+        <div class="nc-oi-btn" style="background:{net_btn_bg};border:1px solid {net_btn_bdr};color:{net_btn_col};">&#9878; {net_lbl}</div>
+      </div>
+    </div>
 
-    /* ── Y-axis labels ── */
-    var yEl = document.getElementById('oiYLabels');
-    if (yEl) {
-        yEl.innerHTML = '';
-        for (var g = gridCount; g >= 0; g--) {
-            var gv  = minV + (range / gridCount) * g;
-            var lbl = document.createElement('div');
-            lbl.className   = 'oi-y-label';
-            lbl.style.color = gv >= 0 ? 'rgba(52,211,153,0.4)' : 'rgba(248,113,113,0.4)';
-            lbl.textContent = fmtOI(Math.round(gv));
-            yEl.appendChild(lbl);
-        }
-    }
+  </div>
 
-    /* ── X-axis time labels ── */
-    var xEl = document.getElementById('oiXLabels');
-    if (xEl) {
-        xEl.innerHTML = '';
-        var xStep = Math.max(1, Math.floor(n / 6));
-        reversed.forEach(function(r, i) {
-            if (i % xStep === 0 || i === n - 1) {
-                var sp = document.createElement('span');
-                sp.className   = 'oi-x-label';
-                sp.textContent = r.time || '';
-                xEl.appendChild(sp);
-            }
-        });
-    }
+  <!-- ── Legend ── -->
+  <div class="nc-legend">
+    <span>&#128214;</span>
+    <span style="background:rgba(255,255,255,0.1);border:1px solid rgba(255,255,255,0.25);border-radius:4px;padding:2px 8px;color:#dde8f0;">Call OI +</span>
+    <span class="nc-legend-verbose">Writers selling calls</span>
+    <span style="background:rgba(255,59,92,0.18);border:1px solid rgba(255,59,92,0.35);border-radius:4px;padding:2px 8px;color:#ff6b85;">Bearish</span>
+    <span style="color:rgba(255,255,255,0.3);" class="nc-legend-verbose">|</span>
+    <span style="background:rgba(255,255,255,0.1);border:1px solid rgba(255,255,255,0.25);border-radius:4px;padding:2px 8px;color:#dde8f0;" class="nc-legend-verbose">Call OI &#8722;</span>
+    <span class="nc-legend-verbose">Unwinding</span>
+    <span style="background:rgba(0,255,136,0.15);border:1px solid rgba(0,255,136,0.35);border-radius:4px;padding:2px 8px;color:#00ff88;" class="nc-legend-verbose">Bullish</span>
+    <span style="color:rgba(255,255,255,0.3);" class="nc-legend-verbose">|</span>
+    <span style="background:rgba(255,255,255,0.1);border:1px solid rgba(255,255,255,0.25);border-radius:4px;padding:2px 8px;color:#dde8f0;">Put OI +</span>
+    <span class="nc-legend-verbose">Writers selling puts</span>
+    <span style="background:rgba(0,255,136,0.15);border:1px solid rgba(0,255,136,0.35);border-radius:4px;padding:2px 8px;color:#00ff88;">Bullish</span>
+    <span style="color:rgba(255,255,255,0.3);" class="nc-legend-verbose">|</span>
+    <span style="background:rgba(255,255,255,0.1);border:1px solid rgba(255,255,255,0.25);border-radius:4px;padding:2px 8px;color:#dde8f0;">Net OI</span>
+    <span style="background:rgba(0,255,136,0.15);border:1px solid rgba(0,255,136,0.35);border-radius:4px;padding:2px 8px;color:#00ff88;">+ = Bullish</span>
+    <span style="background:rgba(255,59,92,0.18);border:1px solid rgba(255,59,92,0.35);border-radius:4px;padding:2px 8px;color:#ff6b85;">&#8722; = Bearish</span>
+    <span style="color:rgba(255,255,255,0.3);" class="nc-legend-verbose">|</span>
+    <span style="background:rgba(255,255,255,0.1);border:1px solid rgba(255,255,255,0.25);border-radius:4px;padding:2px 8px;color:#dde8f0;" class="nc-legend-verbose">Bull % + Bear %</span>
+    <span class="nc-legend-verbose">= 100% &middot; relative dominance</span>
+  </div>
 
-    /* ── Tooltip + Crosshair ── */
-    var tooltip   = document.getElementById('oiChartTooltip');
-    var crosshair = document.getElementById('oiCrosshair');
+</div>
+</div>
+"""
 
-    canvas.onmousemove = function(e) {
-        if (!tooltip || !crosshair) return;
-        var rect = canvas.getBoundingClientRect();
-        var mx   = e.clientX - rect.left;
-        var idx  = Math.round((mx - padL) / cW * (n - 1));
-        if (idx < 0 || idx >= n) {
-            tooltip.style.display = 'none';
-            crosshair.style.display = 'none';
-            return;
-        }
-        var row = reversed[idx];
-        var dv  = row.diff || 0;
-        var dc  = dv >= 0 ? '#34d399' : '#f87171';
+    def _top10_oi_widget_html(self, d):
+        """
+        TOP 10 OPEN INTEREST widget — same format as Neon Ledger image.
+        Shows Top 5 CE (calls) and Top 5 PE (puts) by Open Interest.
+        Reads from d['df'] — zero logic changes anywhere.
+        """
+        _df = d.get('df', None)
+        atm = d.get('atm_strike', 0)
+        spot = d.get('current_price', 0)
 
-        crosshair.style.display = 'block';
-        crosshair.style.left    = toX(idx) + 'px';
+        if _df is None or _df.empty:
+            return ''
 
-        var ttTime = document.getElementById('oiTTTime');
-        var ttDiff = document.getElementById('oiTTDiff');
-        var ttCE   = document.getElementById('oiTTCE');
-        var ttPE   = document.getElementById('oiTTPE');
-        var ttSig  = document.getElementById('oiTTSignal');
-        if (ttTime) ttTime.textContent = (row.time || '') + ' IST';
-        if (ttDiff) { ttDiff.textContent = fmtOI(dv); ttDiff.style.color = dc; }
-        if (ttCE)   ttCE.textContent   = fmtOI(row.call_oi_chg || 0);
-        if (ttPE)   ttPE.textContent   = fmtOI(row.put_oi_chg  || 0);
-        if (ttSig)  { ttSig.textContent = dv >= 0 ? 'BUY' : 'SELL'; ttSig.style.color = dc; }
+        # ── Top 5 CE by OI (resistance side — above ATM) ──
+        ce_top5 = _df.nlargest(5, 'CE_OI')[['Strike','CE_OI','CE_OI_Change','CE_LTP','CE_Vol']].reset_index(drop=True)
+        # ── Top 5 PE by OI (support side — below ATM) ──
+        pe_top5 = _df.nlargest(5, 'PE_OI')[['Strike','PE_OI','PE_OI_Change','PE_LTP','PE_Vol']].reset_index(drop=True)
 
-        var wrapW = wrap ? wrap.clientWidth : W;
-        var tx    = toX(idx) + 14;
-        if (tx + 175 > wrapW) tx = toX(idx) - 189;
-        tooltip.style.left    = tx + 'px';
-        tooltip.style.top     = '10px';
-        tooltip.style.display = 'block';
-    };
+        # Max OI for bar width scaling
+        ce_max_oi = ce_top5['CE_OI'].max() or 1
+        pe_max_oi = pe_top5['PE_OI'].max() or 1
 
-    canvas.onmouseleave = function() {
-        if (tooltip)   tooltip.style.display   = 'none';
-        if (crosshair) crosshair.style.display = 'none';
-    };
-}
+        def strike_type(strike, atm_s):
+            if strike == atm_s:   return 'ATM', '#00d4ff', 'rgba(0,212,255,0.12)', 'rgba(0,212,255,0.4)'
+            elif strike > atm_s:  return 'OTM', '#546e7a', 'rgba(84,110,122,0.1)', 'rgba(84,110,122,0.3)'
+            else:                 return 'ITM', '#ffb74d', 'rgba(255,183,77,0.12)', 'rgba(255,183,77,0.35)'
 
-function loadOILog() {
-    var url = 'oi_log.json?_t=' + Date.now();
-    fetch(url, {cache:'no-store'})
-        .then(function(r){ if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); })
-        .then(function(data) {
-            if (Array.isArray(data) && data.length > 0) {
-                data[0]._isLive = true;
-                _oiData = data;
-                window._oiData = data;
-                renderOITable(data);
-                var now = new Date(new Date().toLocaleString('en-US',{timeZone:'Asia/Kolkata'}));
-                var el  = document.getElementById('oiLastFetch');
-                if (el) el.textContent = 'Last fetch: ' + String(now.getHours()).padStart(2,'0') + ':' + String(now.getMinutes()).padStart(2,'0') + ':' + String(now.getSeconds()).padStart(2,'0') + ' IST';
-            }
-        })
-        .catch(function(e) {
-            var tbody = document.getElementById('oiTableBody');
-            if (tbody) tbody.innerHTML = '<tr><td colspan="15" class="oi-empty-state">&#9888; Could not load oi_log.json</td></tr>';
-        });
-}
+        def fmt_oi(v):
+            if v >= 1_000_000: return f"{v/1_000_000:.1f}M"
+            if v >= 1_000:     return f"{v/1_000:.1f}K"
+            return str(v)
+
+        def fmt_vol(v):
+            if v >= 1_000_000: return f"{v/1_000_000:.1f}M"
+            if v >= 1_000:     return f"{v/1_000:.1f}K"
+            return str(int(v))
 
-window.addEventListener('load', function(){
-    if (window.location.hash === '#oi-trend') { switchTab('oi-trend'); }
-    else { loadOILog(); }
-    // Auto-select first strategy row so Trade Plan is pre-filled
-    var firstRow = document.querySelector('.sc-row');
-    if (firstRow) { selectStrat(firstRow); }
-});
+        def chg_color(v):
+            return '#00e676' if v > 0 else ('#ff5252' if v < 0 else '#546e7a')
 
-window.addEventListener('resize', function(){
-    if (_oiData.length > 0) drawSparkline(filterByInterval(_oiData, _oiInterval));
-});
+        def chg_fmt(v):
+            return f"+{int(v):,}" if v > 0 else f"{int(v):,}"
 
-/* ══ SIDEBAR NAV JS ══════════════════════════════════════════════ */
-var _nsbCollapsed = false;
-var _nsbActiveId  = 'signals';
-var _currentTab   = 'main';   /* ← tracks active tab so navSidebarTo works correctly */
+        # ── Build CE rows ──
+        ce_rows = ''
+        for i, row in ce_top5.iterrows():
+            strike   = int(row['Strike'])
+            oi_val   = int(row['CE_OI'])
+            oi_chg   = row['CE_OI_Change']
+            ltp      = row['CE_LTP']
+            vol      = row['CE_Vol']
+            bar_w    = round(oi_val / ce_max_oi * 100)
+            stype, sc, sbg, sbdr = strike_type(strike, atm)
+            rank_bg  = 'rgba(255,51,85,0.2)' if i == 0 else 'rgba(255,255,255,0.05)'
+            ce_rows += f"""
+                <tr style="border-bottom:1px solid rgba(255,255,255,0.04);">
+                  <td style="padding:9px 10px;text-align:center;">
+                    <span style="display:inline-flex;align-items:center;justify-content:center;width:22px;height:22px;border-radius:5px;background:{rank_bg};font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;color:#ff3355;">{i+1}</span>
+                  </td>
+                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;font-weight:700;color:#e2eaf5;">&#8377;{strike:,}</td>
+                  <td style="padding:9px 10px;">
+                    <span style="font-size:9px;padding:2px 7px;border-radius:4px;font-family:'JetBrains Mono',monospace;font-weight:700;
+                                 color:{sc};background:{sbg};border:1px solid {sbdr};">{stype}</span>
+                  </td>
+                  <td style="padding:9px 14px 9px 10px;min-width:130px;">
+                    <div style="font-family:'JetBrains Mono',monospace;font-size:13px;font-weight:700;color:#ff3355;margin-bottom:4px;">{fmt_oi(oi_val)}</div>
+                    <div style="height:3px;background:rgba(255,255,255,0.06);border-radius:99px;overflow:hidden;">
+                      <div style="height:100%;width:{bar_w}%;background:linear-gradient(90deg,#ff3355,#ff6b6b);border-radius:99px;"></div>
+                    </div>
+                  </td>
+                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;color:{chg_color(oi_chg)};">{chg_fmt(oi_chg)}</td>
+                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;color:#c8d8e0;">&#8377;{ltp:.2f}</td>
+                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;color:#8faabe;">{fmt_vol(vol)}</td>
+                </tr>"""
 
-/* Patch switchTab to keep _currentTab in sync */
-var _origSwitchTab = switchTab;
-switchTab = function(tab) {
-    _origSwitchTab(tab);
-    _currentTab = tab;
-};
+        # ── Build PE rows ──
+        pe_rows = ''
+        for i, row in pe_top5.iterrows():
+            strike   = int(row['Strike'])
+            oi_val   = int(row['PE_OI'])
+            oi_chg   = row['PE_OI_Change']
+            ltp      = row['PE_LTP']
+            vol      = row['PE_Vol']
+            bar_w    = round(oi_val / pe_max_oi * 100)
+            stype, sc, sbg, sbdr = strike_type(strike, atm)
+            rank_bg  = 'rgba(0,230,118,0.18)' if i == 0 else 'rgba(255,255,255,0.05)'
+            pe_rows += f"""
+                <tr style="border-bottom:1px solid rgba(255,255,255,0.04);">
+                  <td style="padding:9px 10px;text-align:center;">
+                    <span style="display:inline-flex;align-items:center;justify-content:center;width:22px;height:22px;border-radius:5px;background:{rank_bg};font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;color:#00e676;">{i+1}</span>
+                  </td>
+                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;font-weight:700;color:#e2eaf5;">&#8377;{strike:,}</td>
+                  <td style="padding:9px 10px;">
+                    <span style="font-size:9px;padding:2px 7px;border-radius:4px;font-family:'JetBrains Mono',monospace;font-weight:700;
+                                 color:{sc};background:{sbg};border:1px solid {sbdr};">{stype}</span>
+                  </td>
+                  <td style="padding:9px 14px 9px 10px;min-width:130px;">
+                    <div style="font-family:'JetBrains Mono',monospace;font-size:13px;font-weight:700;color:#00e676;margin-bottom:4px;">{fmt_oi(oi_val)}</div>
+                    <div style="height:3px;background:rgba(255,255,255,0.06);border-radius:99px;overflow:hidden;">
+                      <div style="height:100%;width:{bar_w}%;background:linear-gradient(90deg,#00e676,#69f0ae);border-radius:99px;"></div>
+                    </div>
+                  </td>
+                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;color:{chg_color(oi_chg)};">{chg_fmt(oi_chg)}</td>
+                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;color:#c8d8e0;">&#8377;{ltp:.2f}</td>
+                  <td style="padding:9px 10px;font-family:'JetBrains Mono',monospace;font-size:12px;color:#8faabe;">{fmt_vol(vol)}</td>
+                </tr>"""
 
-function _scrollToSec(secId) {
-    var target = document.getElementById('sec-' + secId);
-    if (!target) {
-        window.scrollTo({ top: 0, behavior: 'smooth' });
-        return;
-    }
-    /* Get height of sticky bars so we don't hide section title behind them */
-    var offset = 0;
-    var mobBar = document.getElementById('nsbMobBar');
-    if (mobBar && mobBar.offsetParent !== null) {
-        offset += mobBar.offsetHeight;
-    }
-    var header = document.querySelector('.header');
-    /* Header is NOT sticky, so no need to add it */
-    var rect   = target.getBoundingClientRect();
-    var absTop = rect.top + window.pageYOffset - offset - 8;
-    window.scrollTo({ top: absTop, behavior: 'smooth' });
-}
+        th_style = "padding:8px 10px;font-family:'JetBrains Mono',monospace;font-size:9px;letter-spacing:1.5px;text-transform:uppercase;color:#8faabe;font-weight:600;border-bottom:1px solid rgba(255,255,255,0.06);"
 
-function toggleNavSidebar() {
-    _nsbCollapsed = !_nsbCollapsed;
-    var sb = document.getElementById('navSidebar');
-    if (sb) sb.classList.toggle('collapsed', _nsbCollapsed);
-}
+        return f"""
+<style>
+.top10-oi-widget {{ background:#060d18;border:1px solid rgba(0,200,255,0.1);border-radius:14px;overflow:hidden;margin-bottom:4px;font-family:'JetBrains Mono',monospace; }}
+.top10-oi-header {{ display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:8px;padding:11px 18px;background:rgba(0,0,0,0.3);border-bottom:1px solid rgba(0,200,255,0.08); }}
+.top10-oi-header-left {{ display:flex;align-items:center;gap:10px; }}
+.top10-oi-header-right {{ display:flex;align-items:center;gap:8px;flex-wrap:wrap; }}
+.top10-oi-grid {{ display:grid;grid-template-columns:1fr 1fr;gap:0; }}
+.top10-oi-table {{ width:100%;border-collapse:collapse;overflow-x:auto;display:block; }}
+.top10-oi-sub-header {{ display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:4px;padding:8px 12px; }}
+@media(max-width:900px) {{
+  .top10-oi-grid {{ grid-template-columns:1fr !important; }}
+  .top10-oi-ce-panel {{ border-right:none !important;border-bottom:1px solid rgba(255,255,255,0.06); }}
+  .top10-oi-header {{ padding:8px 12px; }}
+  .top10-oi-sub-header span:last-child {{ display:none; }}
+}}
+@media(max-width:600px) {{
+  .top10-oi-table th:nth-child(3),
+  .top10-oi-table td:nth-child(3),
+  .top10-oi-table th:nth-child(6),
+  .top10-oi-table td:nth-child(6) {{ display:none; }}
+}}
+</style>
+<div class="top10-oi-widget">
 
-function navSidebarTo(secId, tabId) {
-    /* 1. Switch tab if needed */
-    if (tabId !== _currentTab) {
-        switchTab(tabId);
-    }
-    /* 2. Set active sidebar item */
-    document.querySelectorAll('.nsb-item').forEach(function(el){ el.classList.remove('active'); });
-    var activeEl = document.getElementById('nsi-' + secId);
-    if (activeEl) activeEl.classList.add('active');
-    _nsbActiveId = secId;
-    /* 3. Scroll after tab paint — 150ms is reliable across browsers */
-    setTimeout(function(){ _scrollToSec(secId); }, 150);
-}
+  <!-- ── Widget Header ── -->
+  <div class="top10-oi-header">
+    <div class="top10-oi-header-left">
+      <div style="width:32px;height:32px;background:rgba(255,255,255,0.05);border:1px solid rgba(255,255,255,0.1);border-radius:8px;display:flex;align-items:center;justify-content:center;font-size:14px;flex-shrink:0;">&#9651;</div>
+      <div>
+        <div style="font-size:12px;font-weight:700;color:#e2eaf5;letter-spacing:1px;">TOP 10 OPEN INTEREST</div>
+        <div style="font-size:9px;color:#8faabe;letter-spacing:1px;margin-top:1px;">NIFTY &middot; &plusmn;10 STRIKES FROM ATM &middot; HIGHEST OI IN WINDOW</div>
+      </div>
+    </div>
+    <div class="top10-oi-header-right">
+      <div style="font-size:10px;padding:4px 12px;border-radius:6px;background:rgba(255,51,85,0.12);border:1px solid rgba(255,51,85,0.3);color:#ff3355;font-weight:700;">5 CE</div>
+      <div style="font-size:10px;padding:4px 14px;border-radius:6px;background:rgba(0,212,255,0.1);border:1px solid rgba(0,212,255,0.3);color:#00d4ff;font-weight:700;">ATM &#8377;{atm:,}</div>
+      <div style="font-size:10px;padding:4px 12px;border-radius:6px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.3);color:#00e676;font-weight:700;">5 PE</div>
+      <div style="width:8px;height:8px;border-radius:50%;background:#00e676;box-shadow:0 0 6px #00e676;flex-shrink:0;"></div>
+    </div>
+  </div>
 
-function openNsbDrawer()  { document.getElementById('nsbDrawer').classList.add('open'); }
-function closeNsbDrawer() { document.getElementById('nsbDrawer').classList.remove('open'); }
+  <!-- ── Two-column table layout ── -->
+  <div class="top10-oi-grid">
 
-function mobNavTo(secId, tabId, label) {
-    /* Update mobile drawer active state */
-    document.querySelectorAll('.nsb-mob-item').forEach(function(el){ el.classList.remove('active'); });
-    var el = document.getElementById('nsmd-' + secId);
-    if (el) el.classList.add('active');
-    /* Update mobile title bar */
-    var titleEl = document.getElementById('nsbMobTitle');
-    if (titleEl) titleEl.innerHTML = label;
-    /* Close drawer first, then switch + scroll */
-    closeNsbDrawer();
-    /* Sync desktop sidebar active state */
-    document.querySelectorAll('.nsb-item').forEach(function(el){ el.classList.remove('active'); });
-    var deskEl = document.getElementById('nsi-' + secId);
-    if (deskEl) deskEl.classList.add('active');
-    _nsbActiveId = secId;
-    /* Switch tab if needed */
-    if (tabId !== _currentTab) { switchTab(tabId); }
-    /* Scroll after drawer close animation + tab paint */
-    setTimeout(function(){ _scrollToSec(secId); }, 200);
-}
-</script>
-"""
+    <!-- LEFT: CE Table -->
+    <div class="top10-oi-ce-panel" style="border-right:1px solid rgba(255,255,255,0.05);">
+      <div class="top10-oi-sub-header" style="background:rgba(255,51,85,0.04);border-bottom:1px solid rgba(255,51,85,0.12);">
+        <div style="display:flex;align-items:center;gap:6px;">
+          <div style="width:7px;height:7px;border-radius:50%;background:#ff3355;box-shadow:0 0 5px #ff3355;flex-shrink:0;"></div>
+          <span style="font-size:11px;font-weight:700;color:#ff3355;letter-spacing:1px;">TOP 5 CALL OPTIONS (CE)</span>
+        </div>
+        <span style="font-size:9px;color:#8faabe;letter-spacing:1px;">10 STRIKES ABOVE ATM</span>
+      </div>
+      <table class="top10-oi-table">
+        <thead>
+          <tr style="background:rgba(0,0,0,0.2);">
+            <th style="{th_style}text-align:center;">#</th>
+            <th style="{th_style}">Strike</th>
+            <th style="{th_style}">Type</th>
+            <th style="{th_style}">Open Interest</th>
+            <th style="{th_style}">Chg OI</th>
+            <th style="{th_style}">LTP</th>
+            <th style="{th_style}">Volume</th>
+          </tr>
+        </thead>
+        <tbody>{ce_rows}</tbody>
+      </table>
+    </div>
 
-        html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Nifty 50 OI Analysis</title>
-    <link href="https://fonts.googleapis.com/css2?family=Oxanium:wght@400;600;700;800&family=Rajdhani:wght@400;500;600;700&family=JetBrains+Mono:wght@400;600;700&family=Outfit:wght@300;400;500;600;700&family=Space+Mono:wght@400;700&family=Orbitron:wght@700;900&display=swap" rel="stylesheet">
-    <style>
-        *{{margin:0;padding:0;box-sizing:border-box;}}
-        html{{scroll-behavior:smooth;background:#04080f;}}
-        body{{font-family:'Rajdhani',sans-serif;background:linear-gradient(135deg,#0f2027 0%,#203a43 50%,#2c5364 100%);min-height:100vh;padding:0;color:#c8d8e0;overflow-x:hidden;-webkit-text-size-adjust:100%;animation:pageIn 0.35s ease forwards;}}
-        @keyframes pageIn{{from{{opacity:0;}}to{{opacity:1;}}}}
-
-        .tab-nav{{display:flex;gap:0;border-bottom:2px solid rgba(79,195,247,0.2);overflow-x:auto;scrollbar-width:none;background:linear-gradient(135deg,#0f2027,#203a43);}}
-        .tab-nav::-webkit-scrollbar{{display:none;}}
-        .tab-btn{{display:flex;align-items:center;gap:8px;padding:13px clamp(14px,2.5vw,28px);font-family:'Oxanium',sans-serif;font-size:clamp(10px,1.4vw,13px);font-weight:700;letter-spacing:1.5px;text-transform:uppercase;color:rgba(176,190,197,0.5);cursor:pointer;border:none;background:transparent;border-bottom:3px solid transparent;white-space:nowrap;transition:all 0.25s ease;position:relative;bottom:-2px;}}
-        .tab-btn:hover{{color:#4fc3f7;background:rgba(79,195,247,0.05);}}
-        .tab-btn.active{{color:#4fc3f7;border-bottom-color:#4fc3f7;background:rgba(79,195,247,0.08);}}
-        .tab-dot{{width:7px;height:7px;border-radius:50%;background:rgba(79,195,247,0.3);flex-shrink:0;transition:all 0.25s ease;}}
-        .tab-btn.active .tab-dot{{background:#4fc3f7;box-shadow:0 0 8px #4fc3f7;}}
-        .tab-badge{{font-size:9px;padding:2px 7px;border-radius:10px;background:rgba(79,195,247,0.12);border:1px solid rgba(79,195,247,0.25);color:#4fc3f7;}}
-        .new-badge .tab-badge{{background:rgba(0,230,118,0.12);border-color:rgba(0,230,118,0.3);color:#00e676;}}
-        .tab-panel{{display:none;}}
-        .tab-panel.active{{display:block;}}
-
-        .container{{max-width:100%;width:100%;margin:0;background:rgba(15,32,39,0.85);backdrop-filter:blur(20px);border-radius:0;overflow:visible;box-shadow:0 20px 60px rgba(0,0,0,0.5);border:none;min-width:0;}}
+    <!-- RIGHT: PE Table -->
+    <div>
+      <div class="top10-oi-sub-header" style="background:rgba(0,230,118,0.04);border-bottom:1px solid rgba(0,230,118,0.12);">
+        <div style="display:flex;align-items:center;gap:6px;">
+          <div style="width:7px;height:7px;border-radius:50%;background:#00e676;box-shadow:0 0 5px #00e676;flex-shrink:0;"></div>
+          <span style="font-size:11px;font-weight:700;color:#00e676;letter-spacing:1px;">TOP 5 PUT OPTIONS (PE)</span>
+        </div>
+        <span style="font-size:9px;color:#8faabe;letter-spacing:1px;">10 STRIKES BELOW ATM</span>
+      </div>
+      <table class="top10-oi-table">
+        <thead>
+          <tr style="background:rgba(0,0,0,0.2);">
+            <th style="{th_style}text-align:center;">#</th>
+            <th style="{th_style}">Strike</th>
+            <th style="{th_style}">Type</th>
+            <th style="{th_style}">Open Interest</th>
+            <th style="{th_style}">Chg OI</th>
+            <th style="{th_style}">LTP</th>
+            <th style="{th_style}">Volume</th>
+          </tr>
+        </thead>
+        <tbody>{pe_rows}</tbody>
+      </table>
+    </div>
 
-        /* ══ OPTION B HEADER ══════════════════════════════════════════ */
-        .header{{background:linear-gradient(180deg,#061828 0%,#04111f 100%);border-bottom:2px solid rgba(79,195,247,0.2);padding:0;position:sticky;top:0;z-index:150;overflow:hidden;}}
-        .header::before{{content:'';position:absolute;inset:0;background:radial-gradient(circle at 30% 50%,rgba(79,195,247,0.05) 0%,transparent 60%);pointer-events:none;}}
+  </div>
 
-        /* Banner row */
-        .hb-banner{{display:flex;align-items:center;justify-content:space-between;padding:14px 22px;border-bottom:1px solid rgba(79,195,247,0.12);flex-wrap:wrap;gap:12px;position:relative;z-index:1;}}
-        .hb-left{{display:flex;align-items:center;gap:14px;}}
-        .hb-nse-badge{{padding:5px 14px;border-radius:6px;font-family:'Oxanium',sans-serif;font-size:13px;font-weight:900;letter-spacing:2px;color:#000;background:linear-gradient(135deg,#4fc3f7,#00e5ff);flex-shrink:0;}}
-        .hb-title-main{{font-family:'Oxanium',sans-serif;font-size:clamp(18px,2.5vw,26px);font-weight:900;color:#ffffff;letter-spacing:0.5px;}}
-        .hb-title-sub{{font-size:11px;letter-spacing:2px;color:#4fc3f7;text-transform:uppercase;margin-top:4px;font-weight:700;}}
-        .hb-chips{{display:flex;gap:8px;flex-wrap:wrap;}}
-        .hb-chip{{text-align:center;padding:7px 16px;border-radius:9px;background:rgba(0,0,0,0.4);border:1px solid rgba(79,195,247,0.22);flex-shrink:0;}}
-        .hb-chip-lbl{{font-family:'JetBrains Mono',monospace;font-size:10px;letter-spacing:1.5px;color:#80deea;text-transform:uppercase;margin-bottom:4px;font-weight:700;}}
-        .hb-chip-val{{font-family:'Oxanium',sans-serif;font-size:17px;font-weight:800;line-height:1;}}
+  <!-- ── Footer ── -->
+  <div style="display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:6px;padding:7px 18px;background:rgba(0,0,0,0.25);border-top:1px solid rgba(0,200,255,0.06);">
+    <span style="font-size:9px;color:#8899aa;letter-spacing:1.5px;text-transform:uppercase;">Neon Ledger &middot; Top OI &middot; &plusmn;10 ATM Strikes Window</span>
+    <div style="display:flex;align-items:center;gap:5px;">
+      <div style="width:6px;height:6px;border-radius:50%;background:#00e676;box-shadow:0 0 5px #00e676;"></div>
+      <span style="font-size:9px;color:#00e676;letter-spacing:1px;">LIVE</span>
+    </div>
+  </div>
 
-        /* Status row */
-        .hb-status{{display:flex;align-items:center;justify-content:space-between;padding:9px 22px;background:rgba(0,0,0,0.3);flex-wrap:wrap;gap:8px;position:relative;z-index:1;border-bottom:1px solid rgba(79,195,247,0.08);}}
-        .hb-s-item{{display:flex;align-items:center;gap:6px;font-family:'JetBrains Mono',monospace;font-size:12px;color:#c8dde8;white-space:nowrap;font-weight:600;}}
-        .hb-s-dot{{width:8px;height:8px;border-radius:50%;flex-shrink:0;animation:sb-pulse 2s ease-in-out infinite;}}
-        .hb-s-val{{font-weight:700;color:#ffffff;margin-left:3px;font-size:13px;}}
+</div>
+"""
 
-        /* Tabs */
-        .tab-nav{{display:flex;gap:0;border-bottom:none;overflow-x:auto;scrollbar-width:none;background:rgba(0,0,0,0.2);position:relative;z-index:1;}}
-        .tab-nav::-webkit-scrollbar{{display:none;}}
-        .tab-btn{{display:flex;align-items:center;gap:8px;padding:13px clamp(14px,2vw,24px);font-family:'Oxanium',sans-serif;font-size:clamp(11px,1.4vw,13px);font-weight:700;letter-spacing:1.5px;text-transform:uppercase;color:rgba(200,221,232,0.65);cursor:pointer;border:none;background:transparent;border-bottom:2px solid transparent;white-space:nowrap;transition:all 0.2s ease;position:relative;bottom:-1px;}}
-        .tab-btn:hover{{color:#4fc3f7;background:rgba(79,195,247,0.05);}}
-        .tab-btn.active{{color:#4fc3f7;border-bottom-color:#4fc3f7;background:rgba(79,195,247,0.07);}}
-        .tab-dot{{width:6px;height:6px;border-radius:50%;background:rgba(79,195,247,0.3);flex-shrink:0;transition:all 0.25s ease;}}
-        .tab-btn.active .tab-dot{{background:#4fc3f7;box-shadow:0 0 8px #4fc3f7;}}
-        .tab-badge{{font-size:8px;padding:2px 6px;border-radius:8px;background:rgba(79,195,247,0.12);border:1px solid rgba(79,195,247,0.25);color:#4fc3f7;}}
-        .new-badge .tab-badge{{background:rgba(192,132,252,0.12);border-color:rgba(192,132,252,0.3);color:#c084fc;}}
-        .tab-panel{{display:none;}}
-        .tab-panel.active{{display:block;}}
+    def _option_chain_pivot_section_html(self, d):
+        """
+        Renders TWO sub-panels:
+          1. Option Chain Analysis  — PCR, OI sentiment, Max Pain, Call/Put buildup, OI walls
+          2. Pivot Points (Traditional) — auto-calc from prev H/L/C stored in html_data
+        Placed between KEY LEVELS and FII/DII sections in the main tab.
+        """
+        # ── Option Chain panel values ─────────────────────────────────────────
+        pcr        = d.get('pcr', 0)
+        pcr_str    = f"{pcr:.2f}" if pcr else "N/A"
+        max_pain   = d.get('max_pain', 0)
+        ce_chg     = d.get('total_ce_oi_change', 0)
+        pe_chg     = d.get('total_pe_oi_change', 0)
+        oi_dir     = d.get('oi_direction', 'N/A')
+        oi_class   = d.get('oi_class', 'neutral')
+        max_ce     = d.get('max_ce_oi', 0)
+        max_pe     = d.get('max_pe_oi', 0)
 
-        /* Status bar dots kept for JS compatibility */
-        .sb-dot-gen{{background:#00e676;box-shadow:0 0 8px #00e676;}}
-        .sb-dot-clock{{background:#4fc3f7;box-shadow:0 0 8px #4fc3f7;}}
-        .sb-dot-cd{{background:#b388ff;box-shadow:0 0 8px #b388ff;}}
-        @keyframes sb-pulse{{50%{{opacity:0.25;}}}}
+        def _oi_color(cls):
+            return {'bullish':'#26c6da','bearish':'#f44336','neutral':'#ffb74d'}.get(cls,'#ffb74d')
 
-        /* Responsive header */
-        @media(max-width:900px){{
-            .hb-chips .hb-chip:nth-child(n+4){{display:none;}}
-        }}
-        @media(max-width:600px){{
-            .hb-banner{{padding:10px 12px;gap:8px;}}
-            .hb-chips{{display:none;}}
-            .hb-title-main{{font-size:13px;}}
-            .hb-status{{padding:6px 12px;gap:4px;}}
-            .hb-s-item{{font-size:9px;}}
-            .tab-btn{{padding:9px 10px;font-size:9px;letter-spacing:0.8px;}}
-        }}
+        oi_col = _oi_color(oi_class)
 
-        .section{{padding:clamp(14px,2.5vw,28px) clamp(12px,2.5vw,26px);border-bottom:1px solid rgba(79,195,247,0.08);}}
-        .section:last-child{{border-bottom:none;}}
-        .section-title{{font-family:'Oxanium',sans-serif;font-size:clamp(10px,1.5vw,13px);font-weight:700;letter-spacing:clamp(1px,0.3vw,2.5px);color:#4fc3f7;text-transform:uppercase;display:flex;align-items:center;gap:10px;margin-bottom:clamp(12px,2vw,20px);padding-bottom:12px;border-bottom:1px solid rgba(79,195,247,0.18);flex-wrap:wrap;}}
-        .section-title span{{font-size:clamp(14px,2vw,18px);}}
+        # OI sentiment label
+        if oi_class == 'bullish':
+            sent_icon = '&#9650;'; sent_lbl = 'BULLISH'; sent_col = '#26c6da'
+        elif oi_class == 'bearish':
+            sent_icon = '&#9660;'; sent_lbl = 'BEARISH'; sent_col = '#f44336'
+        else:
+            sent_icon = '&#8596;'; sent_lbl = 'NEUTRAL'; sent_col = '#ffb74d'
 
+        # CE / PE bar widths (proportional, max bar = 100%)
+        max_abs = max(abs(ce_chg), abs(pe_chg), 1)
+        ce_w    = round(abs(ce_chg) / max_abs * 100)
+        pe_w    = round(abs(pe_chg) / max_abs * 100)
+        ce_k    = f"{ce_chg/1000:+.0f}K" if ce_chg else "0"
+        pe_k    = f"{pe_chg/1000:+.0f}K" if pe_chg else "0"
+        ce_col  = '#f44336' if ce_chg >= 0 else '#26c6da'   # call build = bearish
+        pe_col  = '#26c6da' if pe_chg >= 0 else '#f44336'   # put build  = bullish
 
-        /* ── COMPACT STAT CARDS ─────────────────────────────────── */
-        .g-compact{{background:#111827;border:1px solid #1e2a3a;border-radius:8px;padding:8px 10px;position:relative;overflow:hidden;transition:transform .2s,border-color .2s;}}
-        .g-compact:hover{{transform:translateY(-2px);border-color:rgba(79,195,247,0.4)!important;}}
-        /* ── ENHANCED STAT CARDS ──────────────────────────────────── */
-        .g-compact{{transition:transform .25s ease,border-color .25s ease,box-shadow .25s ease;}}
-        .g-compact:hover{{transform:translateY(-4px)!important;box-shadow:0 16px 40px rgba(0,0,0,0.45)!important;}}
-        .cc-top{{display:flex;align-items:center;gap:6px;margin-bottom:4px;}}
-        .cc-ico{{font-size:13px;line-height:1;flex-shrink:0;}}
-        .cc-lbl{{font-size:8px;letter-spacing:.1em;text-transform:uppercase;color:#8896b3;font-weight:600;flex:1;}}
-        .cc-val{{font-family:'JetBrains Mono',monospace;font-size:19px;font-weight:700;line-height:1;color:#e2e8f8;margin-bottom:4px;letter-spacing:-.02em;overflow:hidden;text-overflow:ellipsis;white-space:nowrap;}}
-        .cc-sub{{font-size:8px;color:#4a5578;margin-bottom:3px;font-family:'JetBrains Mono',monospace;}}
-        .cc-bar{{height:2px;background:#1e2a3a;border-radius:1px;overflow:hidden;}}
-        .cc-bar-fill{{height:100%;border-radius:1px;}}
-        .cc-bar-fill.bar-teal{{background:linear-gradient(90deg,#00bcd4,#4fc3f7);}}
-        .cc-bar-fill.bar-red{{background:linear-gradient(90deg,#f44336,#ff5722);}}
-        .cc-bar-fill.bar-gold{{background:linear-gradient(90deg,#ffb74d,#ffd54f);}}
-        .g-compact .tag{{font-size:8px;padding:1px 6px;border-radius:3px;white-space:nowrap;flex-shrink:0;}}
-        .g{{background:rgba(255,255,255,0.04);backdrop-filter:blur(20px);-webkit-backdrop-filter:blur(20px);border:1px solid rgba(79,195,247,0.18);border-radius:16px;position:relative;overflow:hidden;transition:all 0.35s cubic-bezier(0.4,0,0.2,1);min-width:0;}}
-        .g::before{{content:'';position:absolute;top:0;left:0;right:0;height:1px;background:linear-gradient(90deg,transparent,rgba(255,255,255,0.25),transparent);z-index:1;}}
-        .g::after{{content:'';position:absolute;top:-60%;left:-30%;width:50%;height:200%;background:linear-gradient(105deg,transparent,rgba(255,255,255,0.04),transparent);transform:skewX(-15deg);transition:left 0.6s ease;z-index:0;}}
-        .g:hover::after{{left:130%;}}
-        .g:hover{{background:rgba(79,195,247,0.09);border-color:rgba(79,195,247,0.45);box-shadow:0 12px 40px rgba(0,0,0,0.35),inset 0 1px 0 rgba(255,255,255,0.1);transform:translateY(-4px);}}
-        .g-hi{{background:rgba(79,195,247,0.09);border-color:rgba(79,195,247,0.35);}}
-        .g-red{{background:rgba(244,67,54,0.06);border-color:rgba(244,67,54,0.25);}}
-        .g-red:hover{{background:rgba(244,67,54,0.1);border-color:rgba(244,67,54,0.45);}}
-        .card-grid{{display:grid;gap:6px;}}
-        .grid-5{{grid-template-columns:repeat(5,minmax(0,1fr));}}
-        .grid-4{{grid-template-columns:repeat(4,minmax(0,1fr));}}
-        .g .card-top-row{{display:flex;align-items:center;gap:10px;margin-bottom:10px;position:relative;z-index:2;padding:14px 16px 0;}}
-        .card-ico{{font-size:clamp(16px,2vw,22px);line-height:1;flex-shrink:0;}}
-        .lbl{{font-size:clamp(8px,1vw,9px);letter-spacing:2.5px;color:rgba(128,222,234,0.65);text-transform:uppercase;font-weight:600;line-height:1.3;word-break:break-word;}}
-        .val{{font-family:'Oxanium',sans-serif;font-size:clamp(16px,2.5vw,24px);font-weight:700;color:#fff;display:block;margin-bottom:10px;position:relative;z-index:2;padding:0 16px;word-break:break-word;overflow:hidden;text-overflow:ellipsis;}}
-        .bar-wrap{{height:5px;background:rgba(0,0,0,0.35);border-radius:3px;margin:0 16px 12px;overflow:hidden;position:relative;z-index:2;}}
-        .bar-fill{{height:100%;border-radius:3px;transition:width 1.2s cubic-bezier(0.4,0,0.2,1);}}
-        .bar-teal{{background:linear-gradient(90deg,#00bcd4,#4fc3f7);box-shadow:0 0 8px rgba(79,195,247,0.6);}}
-        .bar-red{{background:linear-gradient(90deg,#f44336,#ff5722);box-shadow:0 0 8px rgba(244,67,54,0.5);}}
-        .bar-gold{{background:linear-gradient(90deg,#ffb74d,#ffd54f);box-shadow:0 0 8px rgba(255,183,77,0.5);}}
-        .card-foot{{display:flex;justify-content:space-between;align-items:center;padding:0 16px 14px;position:relative;z-index:2;flex-wrap:wrap;gap:4px;}}
-        .sub{{font-size:10px;color:#8fa8b8;font-family:'JetBrains Mono',monospace;}}
-        .tag{{display:inline-flex;align-items:center;padding:3px 11px;border-radius:20px;font-size:clamp(9px,1.2vw,11px);font-weight:700;letter-spacing:0.5px;font-family:'Rajdhani',sans-serif;white-space:nowrap;}}
-        .tag-neu{{background:rgba(255,183,77,0.15);color:#ffb74d;border:1px solid rgba(255,183,77,0.35);}}
-        .tag-bull{{background:rgba(0,229,255,0.12);color:#00e5ff;border:1px solid rgba(0,229,255,0.35);}}
-        .tag-bear{{background:rgba(255,82,82,0.12);color:#ff5252;border:1px solid rgba(255,82,82,0.35);}}
-
-        .snap-grid{{display:grid;grid-template-columns:repeat(3,minmax(0,1fr));gap:14px;}}
-        .snap-card{{padding:18px 16px;}}
-        .snap-card .card-top-row{{margin-bottom:8px;padding:0;}}
-        .snap-card .val{{font-size:clamp(18px,3vw,26px);padding:0;margin-bottom:0;}}
-
-        .md-widget{{position:relative;overflow:hidden;background:linear-gradient(135deg,rgba(255,255,255,0.07),rgba(255,255,255,0.02));border:1px solid rgba(255,255,255,0.1);border-radius:16px;padding:10px 16px;backdrop-filter:blur(20px);display:flex;flex-direction:column;gap:4px;}}
-        .md-glow{{position:absolute;top:-80%;left:-80%;width:260%;height:260%;background:conic-gradient(from 180deg,#ff6b35 0deg,#ffcd3c 120deg,#4ecdc4 240deg,#ff6b35 360deg);opacity:0.05;animation:md-rotate 8s linear infinite;border-radius:50%;pointer-events:none;}}
-        @keyframes md-rotate{{to{{transform:rotate(360deg);}}}}
-        .md-row-top{{display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:8px;position:relative;z-index:1;}}
-        .md-label{{display:flex;align-items:center;gap:7px;font-family:'Space Mono',monospace;font-size:clamp(7px,1vw,8px);letter-spacing:3px;color:rgba(255,255,255,0.3);text-transform:uppercase;}}
-        .md-live-dot{{width:6px;height:6px;border-radius:50%;background:#4ecdc4;box-shadow:0 0 8px #4ecdc4;animation:md-pulse 2s ease-in-out infinite;flex-shrink:0;}}
-        @keyframes md-pulse{{50%{{opacity:0.25;}}}}
-        .md-pills-top{{display:flex;gap:8px;flex-wrap:wrap;}}
-        .md-pill{{font-family:'Space Mono',monospace;font-size:clamp(8px,1.2vw,10px);font-weight:700;padding:4px clamp(8px,1.5vw,14px);border-radius:20px;letter-spacing:1px;white-space:nowrap;}}
-        .md-pill-bull{{background:rgba(78,205,196,0.12);border:1px solid rgba(78,205,196,0.4);color:#4ecdc4;}}
-        .md-pill-bear{{background:rgba(255,100,100,0.12);border:1px solid rgba(255,100,100,0.4);color:#ff6b6b;}}
-        .md-pill-conf-high{{background:rgba(78,205,196,0.12);border:1px solid rgba(78,205,196,0.35);color:#4ecdc4;}}
-        .md-pill-conf-med{{background:rgba(255,205,60,0.12);border:1px solid rgba(255,205,60,0.35);color:#ffcd3c;}}
-        .md-pill-conf-low{{background:rgba(255,107,107,0.12);border:1px solid rgba(255,107,107,0.35);color:#ff6b6b;}}
-        .md-row-bottom{{display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:8px;position:relative;z-index:1;}}
-        .md-direction{{font-family:'Orbitron',monospace;font-weight:900;font-size:clamp(16px,2.8vw,22px);letter-spacing:clamp(0.5px,0.2vw,1.5px);line-height:1;}}
-
-        .logic-box{{background:rgba(79,195,247,0.04);border:1px solid rgba(79,195,247,0.14);border-left:3px solid #4fc3f7;border-radius:10px;padding:10px 16px;margin-top:12px;}}
-        .logic-box-head{{font-family:'Oxanium',sans-serif;font-size:10px;font-weight:700;color:#4fc3f7;letter-spacing:2px;margin-bottom:7px;}}
-        .logic-grid{{display:grid;grid-template-columns:1fr 1fr;gap:5px 20px;}}
-        .logic-item{{display:flex;align-items:center;gap:7px;font-size:clamp(10px,1.3vw,11px);color:rgba(176,190,197,0.6);flex-wrap:wrap;}}
-        .logic-item .lv{{font-family:'JetBrains Mono',monospace;font-size:10px;color:rgba(176,190,197,0.4);}}
-        .lc-bull{{display:inline-flex;align-items:center;font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:600;padding:2px 8px;border-radius:4px;white-space:nowrap;background:rgba(0,230,118,0.1);color:#00e676;border:1px solid rgba(0,230,118,0.28);}}
-        .lc-bear{{display:inline-flex;align-items:center;font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:600;padding:2px 8px;border-radius:4px;white-space:nowrap;background:rgba(255,82,82,0.1);color:#ff5252;border:1px solid rgba(255,82,82,0.28);}}
-        .lc-side{{display:inline-flex;align-items:center;font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:600;padding:2px 8px;border-radius:4px;white-space:nowrap;background:rgba(255,183,77,0.1);color:#ffb74d;border:1px solid rgba(255,183,77,0.28);}}
-        .lc-info{{display:inline-flex;align-items:center;font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:600;padding:2px 8px;border-radius:4px;white-space:nowrap;background:rgba(79,195,247,0.08);color:#4fc3f7;border:1px solid rgba(79,195,247,0.22);}}
-
-        .rl-node-a{{position:absolute;bottom:0;transform:translateX(-50%);text-align:center;}}
-        .rl-node-b{{position:absolute;top:0;transform:translateX(-50%);text-align:center;}}
-        .rl-dot{{width:12px;height:12px;border-radius:50%;border:2px solid rgba(10,20,35,0.9);}}
-        .rl-lbl{{font-size:clamp(7px,1vw,10px);font-weight:700;text-transform:uppercase;letter-spacing:0.4px;line-height:1.3;white-space:nowrap;color:#c8d8e0;}}
-        .rl-val{{font-size:clamp(9px,1.3vw,13px);font-weight:700;color:#fff;white-space:nowrap;margin-top:2px;}}
-        /* Mobile key levels: hide absolute labels, show compact table instead */
-        .kl-mobile-table{{display:none;width:100%;border-collapse:collapse;font-family:'JetBrains Mono',monospace;font-size:11px;margin-top:10px;}}
-        .kl-mobile-table td{{padding:6px 10px;border-bottom:1px solid rgba(79,195,247,0.08);}}
-        .kl-mobile-table td:last-child{{text-align:right;font-weight:700;}}
-        .kl-bar-section{{display:block;}}
-        @media(max-width:520px){{
-            .kl-bar-section{{display:none;}}
-            .kl-mobile-table{{display:table;}}
-        }}
+        # Max CE / PE OI wall bars (proportional to each other)
+        wall_max = max(max_ce, max_pe, 1)
+        ce_wall_w = round(max_ce / wall_max * 100)
+        pe_wall_w = round(max_pe / wall_max * 100)
 
-        .pf-live-badge{{display:inline-block;padding:2px 10px;border-radius:10px;font-size:10px;font-weight:700;letter-spacing:1px;}}
-        .pf-live{{background:rgba(0,230,118,0.1);color:#00e676;border:1px solid rgba(0,230,118,0.3);}}
-        .pf-estimated{{background:rgba(255,138,101,0.1);color:#ff8a65;border:1px solid rgba(255,138,101,0.3);}}
-        .pf-date-range{{font-size:11px;color:#80deea;font-weight:400;letter-spacing:1px;}}
+        # ── R2 / S2: 2nd highest CE OI strike (resistance) and PE OI strike (support) ──
+        # Derived purely from the existing df — zero logic changes elsewhere
+        _df = d.get('df', None)
+        if _df is not None and not _df.empty and len(_df) >= 2:
+            _ce_sorted = _df.nlargest(2, 'CE_OI')
+            _pe_sorted = _df.nlargest(2, 'PE_OI')
+            max_ce_r2  = int(_ce_sorted.iloc[1]['Strike']) if len(_ce_sorted) > 1 else max_ce
+            max_pe_s2  = int(_pe_sorted.iloc[1]['Strike']) if len(_pe_sorted) > 1 else max_pe
+            max_ce_r2_val = int(_ce_sorted.iloc[1]['CE_OI']) if len(_ce_sorted) > 1 else 0
+            max_pe_s2_val = int(_pe_sorted.iloc[1]['PE_OI']) if len(_pe_sorted) > 1 else 0
+        else:
+            max_ce_r2 = max_ce; max_pe_s2 = max_pe
+            max_ce_r2_val = 0;  max_pe_s2_val = 0
 
-        /* ── Option 2: Horizontal Flow Meters ── */
-        .pf2-meter-row{{margin-bottom:16px;}}
-        .pf2-meter-head{{display:flex;align-items:center;justify-content:space-between;margin-bottom:8px;flex-wrap:wrap;gap:6px;}}
-        .pf2-meter-labels{{display:flex;align-items:baseline;gap:10px;}}
-        .pf2-lbl{{font-family:'Oxanium',sans-serif;font-size:18px;font-weight:800;color:#e0f7fa;letter-spacing:1px;}}
-        .pf2-sublbl{{font-size:11px;letter-spacing:1.5px;color:rgba(128,222,234,0.6);text-transform:uppercase;font-weight:600;}}
-        .pf2-val{{font-family:'JetBrains Mono',monospace;font-size:clamp(16px,2.5vw,22px);font-weight:700;letter-spacing:-0.5px;}}
-        .pf2-unit{{font-size:10px;color:rgba(128,222,234,0.4);font-weight:400;letter-spacing:1px;}}
-        .pf2-track{{height:10px;background:rgba(0,0,0,0.4);border-radius:5px;overflow:hidden;}}
-        .pf2-fill{{height:100%;border-radius:5px;transition:width 1s ease;}}
+        # Bar widths for R2/S2 (relative to R1/S1 = 100%)
+        ce_wall_r2_w = round(max_ce_r2_val / max(_df['CE_OI'].max(), 1) * 100) if _df is not None and not _df.empty else 60
+        pe_wall_s2_w = round(max_pe_s2_val / max(_df['PE_OI'].max(), 1) * 100) if _df is not None and not _df.empty else 60
 
-        /* Daily net dot chips */
-        .pf2-dots-wrap{{display:grid;grid-template-columns:repeat(10,minmax(0,1fr));gap:6px;margin:16px 0;}}
-        .pf2-dot{{border:1px solid;border-radius:8px;padding:6px 4px;text-align:center;}}
-        .pf2-dot-date{{font-size:9px;letter-spacing:0.5px;color:rgba(128,222,234,0.45);margin-bottom:4px;font-family:'JetBrains Mono',monospace;}}
-        .pf2-dot-net{{font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;}}
-
-        .pf-avg-strip{{display:grid;grid-template-columns:1fr auto 1fr auto 1fr;align-items:center;background:rgba(6,13,20,0.75);border:1px solid rgba(79,195,247,0.1);border-radius:14px;padding:18px 24px;margin-bottom:16px;}}
-        .pf-avg-cell{{text-align:center;min-width:0;}}
-        .pf-avg-eyebrow{{font-size:10px;letter-spacing:2px;color:rgba(79,195,247,0.7);text-transform:uppercase;margin-bottom:6px;font-weight:700;}}
-        .pf-avg-val{{font-family:'Oxanium',sans-serif;font-size:clamp(20px,3vw,28px);font-weight:800;line-height:1;letter-spacing:-0.5px;word-break:break-word;}}
-        .pf-avg-unit{{font-size:9px;color:#8899aa;margin-top:3px;letter-spacing:1px;}}
-        .pf-avg-sep{{width:1px;height:48px;background:rgba(79,195,247,0.2);margin:0 16px;flex-shrink:0;}}
-        .pf-insight-box{{border-radius:12px;padding:16px 18px;}}
-        .pf-insight-header{{display:flex;align-items:center;gap:10px;margin-bottom:10px;flex-wrap:wrap;}}
-        .pf-insight-lbl{{font-size:10px;letter-spacing:2px;font-weight:700;text-transform:uppercase;}}
-        .pf-verdict-badge{{display:inline-block;padding:3px 14px;border-radius:20px;font-size:clamp(10px,1.5vw,11px);font-weight:800;letter-spacing:1px;white-space:nowrap;}}
-        .pf-insight-text{{font-size:clamp(12px,1.5vw,13px);color:#cfd8dc;line-height:1.85;font-weight:500;}}
+        pcr_badge_col = '#26c6da' if pcr > 1.0 else ('#f44336' if pcr < 0.8 else '#ffb74d')
 
-        @media(max-width:768px){{
-            .pf2-dots-wrap{{grid-template-columns:repeat(5,minmax(0,1fr));}}
-            .pf2-lbl{{font-size:16px;}}
-            .pf2-val{{font-size:15px;}}
-            .pf-avg-strip{{grid-template-columns:1fr;gap:0;padding:14px;}}
-            .pf-avg-sep{{display:none;}}
-            .pf-avg-cell{{display:flex;align-items:center;justify-content:space-between;padding:8px 0;border-bottom:1px solid rgba(79,195,247,0.07);}}
-            .pf-avg-cell:last-child{{border-bottom:none;}}
-            .pf-avg-eyebrow{{margin-bottom:0;}}
-        }}
-        @media(max-width:480px){{
-            .pf2-dots-wrap{{grid-template-columns:repeat(5,minmax(0,1fr));gap:4px;}}
-            .pf2-dot{{padding:5px 2px;}}
-            .pf2-dot-net{{font-size:10px;}}
-        }}
+        oc_panel = "" if not d['has_option_data'] else f"""
+        <!-- ── Option Chain Analysis Sub-Panel · Sample 1 Command Terminal ── -->
+        <div style="background:#080f18;border:1px solid rgba(0,200,255,0.15);border-radius:6px;flex:1;min-width:280px;overflow:hidden;">
 
-        .nc-section-header{{display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:10px;margin-bottom:18px;padding-bottom:14px;border-bottom:1px solid rgba(79,195,247,0.14);}}
-        .nc-header-left{{display:flex;align-items:center;gap:14px;}}
-        .nc-header-icon{{width:44px;height:44px;border-radius:10px;background:linear-gradient(135deg,#1e3a5f,#1a3052);border:1px solid rgba(79,195,247,0.3);display:flex;align-items:center;justify-content:center;font-size:20px;flex-shrink:0;box-shadow:0 4px 14px rgba(79,195,247,0.15);}}
-        .nc-header-title{{font-family:'Outfit',sans-serif;font-size:clamp(15px,2vw,19px);font-weight:700;color:#e2eaf5;letter-spacing:0.3px;}}
-        .nc-header-sub{{font-family:'Outfit',sans-serif;font-size:13px;font-weight:500;color:#a8c4d8;margin-top:2px;letter-spacing:0.5px;}}
-        .nc-atm-badge{{background:#1f2a42;color:#60a5fa;font-family:'Outfit',sans-serif;font-size:12px;font-weight:700;padding:6px 16px;border-radius:20px;letter-spacing:1.5px;border:1px solid rgba(96,165,250,0.25);box-shadow:0 2px 10px rgba(96,165,250,0.1);white-space:nowrap;}}
-        .nc-dir-box{{border-radius:14px;padding:clamp(14px,2vw,20px) clamp(14px,2vw,22px);margin-bottom:18px;box-shadow:0 4px 24px rgba(0,0,0,0.3);}}
-        .nc-dir-bar{{width:4px;border-radius:2px;flex-shrink:0;min-height:60px;}}
-        .nc-dir-tag{{font-family:'Outfit',sans-serif;font-size:11px;font-weight:700;letter-spacing:2px;color:#a8c4d8;text-transform:uppercase;margin-bottom:6px;}}
-        .nc-dir-name{{font-family:'Outfit',sans-serif;font-size:clamp(18px,3vw,28px);font-weight:700;line-height:1;margin-bottom:6px;letter-spacing:-0.5px;}}
-        .nc-dir-signal{{font-family:'Outfit',sans-serif;font-size:clamp(10px,1.3vw,12px);font-weight:400;}}
-        .nc-meters-panel{{display:flex;flex-direction:column;gap:14px;min-width:180px;justify-content:center;}}
-        .nc-meter-row{{display:flex;flex-direction:column;gap:5px;}}
-        .nc-meter-head-row{{display:flex;justify-content:space-between;align-items:center;}}
-        .nc-meter-label{{font-family:'Outfit',sans-serif;font-size:9px;font-weight:700;letter-spacing:2px;color:rgba(148,163,184,0.45);text-transform:uppercase;}}
-        .nc-meter-track{{position:relative;height:8px;background:rgba(0,0,0,0.4);border-radius:4px;overflow:visible;width:clamp(120px,20vw,200px);}}
-        .nc-meter-fill{{height:100%;border-radius:4px;}}
-        .nc-meter-head{{position:absolute;top:50%;transform:translate(-50%,-50%);width:14px;height:14px;border-radius:50%;border:2px solid rgba(10,18,30,0.85);}}
-        .nc-meter-pct{{font-family:'Oxanium',sans-serif;font-size:clamp(12px,1.8vw,15px);font-weight:700;letter-spacing:0.5px;}}
-        .nc-cards-grid{{display:grid;grid-template-columns:repeat(3,minmax(0,1fr));gap:14px;}}
-        .nc-card{{background:rgba(20,28,45,0.85);border:1px solid rgba(79,195,247,0.12);border-radius:14px;padding:clamp(12px,2vw,18px) clamp(12px,2vw,18px) 14px;transition:all 0.3s ease;position:relative;overflow:hidden;min-width:0;}}
-        .nc-card::before{{content:'';position:absolute;top:0;left:0;right:0;height:1px;background:linear-gradient(90deg,transparent,rgba(255,255,255,0.1),transparent);}}
-        .nc-card:hover{{border-color:rgba(79,195,247,0.3);background:rgba(25,35,55,0.9);transform:translateY(-3px);box-shadow:0 10px 30px rgba(0,0,0,0.3);}}
-        .nc-card-header{{display:flex;align-items:center;justify-content:space-between;margin-bottom:12px;flex-wrap:wrap;gap:4px;}}
-        .nc-card-label{{font-family:'Outfit',sans-serif;font-size:clamp(8px,1.2vw,10px);font-weight:700;letter-spacing:2px;color:rgba(148,163,184,0.6);text-transform:uppercase;}}
-        .nc-card-value{{font-family:'Oxanium',sans-serif;font-size:clamp(20px,3.5vw,30px);font-weight:700;line-height:1;margin-bottom:6px;letter-spacing:-0.5px;word-break:break-word;}}
-        .nc-card-sub{{font-family:'JetBrains Mono',monospace;font-size:10px;color:rgba(100,116,139,0.7);margin-bottom:14px;}}
-        .nc-card-btn{{display:block;width:100%;padding:9px 14px;border-radius:7px;text-align:center;font-family:'Outfit',sans-serif;font-size:clamp(11px,1.5vw,13px);font-weight:700;letter-spacing:0.5px;cursor:default;}}
-
-        .annot-badge{{font-size:9px;padding:2px 10px;border-radius:8px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.25);color:#00e676;font-family:'JetBrains Mono',monospace;letter-spacing:1px;font-weight:700;white-space:nowrap;}}
-        .na-inline{{color:rgba(176,190,197,0.3);font-family:'JetBrains Mono',monospace;font-size:13px;}}
-        .o5-wrap{{border-radius:16px;overflow:hidden;border:1px solid rgba(239,68,68,0.2);background:rgba(6,10,18,0.97);margin-bottom:0;}}
-        .o5-top-banner{{background:linear-gradient(90deg,rgba(239,68,68,0.12),rgba(185,28,28,0.06),transparent);border-bottom:1px solid rgba(239,68,68,0.12);padding:16px 22px;display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:14px;}}
-        .o5-banner-left{{display:flex;align-items:center;gap:16px;flex-wrap:wrap;}}
-        .o5-score-circle{{width:62px;height:62px;border-radius:50%;background:rgba(239,68,68,0.08);border:2px solid;display:flex;flex-direction:column;align-items:center;justify-content:center;flex-shrink:0;}}
-        .o5-score-num{{font-family:'Orbitron',monospace;font-size:22px;font-weight:900;line-height:1;}}
-        .o5-score-lbl{{font-family:'JetBrains Mono',monospace;font-size:9px;letter-spacing:1.5px;text-transform:uppercase;opacity:0.75;margin-top:2px;}}
-        .o5-verdict{{font-family:'Orbitron',monospace;font-size:clamp(17px,2.4vw,24px);font-weight:900;letter-spacing:2px;}}
-        .o5-sub{{font-size:12px;color:rgba(148,163,184,0.75);margin-top:4px;line-height:1.5;max-width:520px;}}
-        .o5-pills{{display:flex;gap:8px;flex-wrap:wrap;}}
-        .o5-grid{{display:grid;grid-template-columns:repeat(4,minmax(0,1fr));gap:1px;background:rgba(255,255,255,0.04);}}
-        .o5-tile{{padding:16px 16px 18px;position:relative;overflow:hidden;transition:filter 0.2s;}}
-        .o5-tile:hover{{filter:brightness(1.2);}}
-        .o5-bear{{background:rgba(14,4,6,0.97);}}
-        .o5-bull{{background:rgba(4,14,10,0.97);}}
-        .o5-neu{{background:rgba(14,12,4,0.97);}}
-        .o5-na{{background:rgba(8,10,14,0.97);}}
-        .o5-tile-bar{{position:absolute;bottom:0;left:0;right:0;height:2px;}}
-        .o5-tile-top{{display:flex;align-items:flex-start;justify-content:space-between;gap:8px;margin-bottom:10px;}}
-        .o5-tile-label{{font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:700;letter-spacing:1.5px;text-transform:uppercase;line-height:1.5;flex:1;}}
-        .o5-bear .o5-tile-label{{color:rgba(248,113,113,0.85);}}
-        .o5-bull .o5-tile-label{{color:rgba(52,211,153,0.85);}}
-        .o5-neu  .o5-tile-label{{color:rgba(251,191,36,0.85);}}
-        .o5-na   .o5-tile-label{{color:rgba(148,163,184,0.65);}}
-        .o5-chip{{font-family:'Orbitron',monospace;font-size:12px;font-weight:900;min-width:30px;height:28px;border-radius:6px;display:flex;align-items:center;justify-content:center;flex-shrink:0;padding:0 8px;}}
-        .o5-chip-bear{{background:rgba(239,68,68,0.2);color:#f87171;border:1px solid rgba(239,68,68,0.5);}}
-        .o5-chip-bull{{background:rgba(16,185,129,0.2);color:#34d399;border:1px solid rgba(16,185,129,0.5);}}
-        .o5-chip-neu{{background:rgba(245,158,11,0.2);color:#fbbf24;border:1px solid rgba(245,158,11,0.5);}}
-        .o5-chip-na{{background:rgba(100,116,139,0.15);color:rgba(148,163,184,0.7);border:1px solid rgba(100,116,139,0.3);font-size:10px;}}
-        .o5-val{{font-family:'Oxanium',sans-serif;font-size:clamp(15px,2vw,20px);font-weight:700;line-height:1;margin-bottom:6px;}}
-        .o5-msg{{font-size:11px;color:rgba(148,163,184,0.75);line-height:1.4;font-family:'JetBrains Mono',monospace;}}
-        .auto-badge{{font-size:8px;padding:1px 6px;border-radius:4px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.25);color:#00e676;font-weight:700;letter-spacing:0.5px;}}
-        .manual-badge{{font-size:8px;padding:1px 6px;border-radius:4px;background:rgba(79,195,247,0.08);border:1px solid rgba(79,195,247,0.2);color:#4fc3f7;font-weight:700;letter-spacing:0.5px;}}
-        .sc-pill{{font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:700;padding:4px 12px;border-radius:20px;letter-spacing:1px;}}
-        .sc-pill-bull{{background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.3);color:#00e676;}}
-        .sc-pill-bear{{background:rgba(255,82,82,0.1);border:1px solid rgba(255,82,82,0.3);color:#ff5252;}}
-        .sc-pill-neu{{background:rgba(255,183,77,0.1);border:1px solid rgba(255,183,77,0.3);color:#ffb74d;}}
-        .sc-pill-na{{background:rgba(176,190,197,0.06);border:1px solid rgba(176,190,197,0.15);color:rgba(176,190,197,0.4);}}
-        /* ══ COMPACT STRATEGY WIDGET ══════════════════════════════════════ */
-        .sc-summary-strip{{display:flex;align-items:center;gap:12px;background:rgba(6,13,20,0.8);border:1px solid rgba(79,195,247,0.12);border-radius:10px;padding:10px 16px;margin-bottom:10px;flex-wrap:wrap;}}
-        .sc-ss-item{{display:flex;align-items:center;gap:6px;}}
-        .sc-ss-dot{{width:7px;height:7px;border-radius:50%;flex-shrink:0;}}
-        .sc-ss-lbl{{font-family:'JetBrains Mono',monospace;font-size:11px;letter-spacing:1px;color:rgba(128,222,234,0.7);}}
-        .sc-ss-val{{font-family:'JetBrains Mono',monospace;font-size:13px;font-weight:700;}}
-        .sc-ss-sep{{width:1px;height:18px;background:rgba(79,195,247,0.12);}}
-        /* 2-column compact grid */
-        .sc-compact-grid{{display:grid;grid-template-columns:1fr 1fr;gap:6px;}}
-        /* row card */
-        .sc-row{{display:grid;grid-template-columns:3px 26px 1fr auto 18px;align-items:center;gap:0;background:rgba(10,18,32,0.9);border:1px solid rgba(79,195,247,0.1);border-radius:10px;cursor:pointer;transition:all 0.18s ease;overflow:hidden;min-height:50px;}}
-        .sc-row:hover{{background:rgba(16,28,48,0.95);border-color:rgba(79,195,247,0.3);box-shadow:0 4px 18px rgba(0,0,0,0.4);}}
-        .sc-row.sc-selected{{border-color:#00e5ff;background:rgba(0,229,255,0.06);box-shadow:0 0 0 1px #00e5ff44,0 6px 20px rgba(0,229,255,0.12);}}
-        .sc-row-bar{{width:3px;height:100%;border-radius:10px 0 0 10px;align-self:stretch;min-height:50px;}}
-        .sc-row-num{{font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:700;color:rgba(176,190,197,0.45);text-align:center;padding:0 4px;}}
-        .sc-row-body{{padding:10px 10px 10px 6px;min-width:0;}}
-        .sc-row-name{{font-family:'Oxanium',sans-serif;font-size:14px;font-weight:700;color:#e0f7fa;line-height:1.2;white-space:nowrap;overflow:hidden;text-overflow:ellipsis;margin-bottom:3px;}}
-        .sc-row-strike{{font-family:'JetBrains Mono',monospace;font-size:10px;color:rgba(128,222,234,0.75);white-space:nowrap;overflow:hidden;text-overflow:ellipsis;}}
-        .sc-row-strike span{{color:#4fc3f7;}}
-        .sc-row-meta{{display:flex;flex-direction:column;align-items:flex-end;gap:4px;padding:10px 8px 10px 6px;flex-shrink:0;}}
-        .sc-row-tag{{font-size:10px;font-weight:700;letter-spacing:0.5px;padding:3px 8px;border-radius:8px;white-space:nowrap;}}
-        .sc-rb{{font-family:'JetBrains Mono',monospace;font-size:9px;font-weight:700;letter-spacing:0.5px;padding:2px 7px;border-radius:4px;white-space:nowrap;}}
-        .sc-rb-primary{{background:rgba(0,229,255,0.12);border:1px solid rgba(0,229,255,0.4);color:#00e5ff;}}
-        .sc-rb-secondary{{background:rgba(255,183,77,0.12);border:1px solid rgba(255,183,77,0.4);color:#ffb74d;}}
-        .sc-rb-advanced{{background:rgba(124,77,255,0.1);border:1px solid rgba(124,77,255,0.35);color:#b39dff;}}
-        .sc-row-rr{{font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;}}
-        .sc-row-chevron{{font-size:16px;color:rgba(79,195,247,0.3);padding-right:8px;transition:transform 0.2s ease;line-height:1;user-select:none;}}
-        .sc-row.sc-selected .sc-row-chevron{{transform:rotate(90deg);color:#00e5ff;}}
-        /* expand detail panel — spans both columns */
-        .sc-dp{{grid-column:1/-1;display:none;background:rgba(4,10,20,0.97);border:1px solid rgba(79,195,247,0.18);border-radius:12px;padding:14px 16px;position:relative;overflow:hidden;animation:scSlide 0.18s ease;}}
-        .sc-dp::before{{content:'';position:absolute;top:0;left:0;right:0;height:1px;background:linear-gradient(90deg,transparent,#4fc3f7,transparent);}}
-        .sc-dp.sc-dp-open{{display:block;}}
-        @keyframes scSlide{{from{{opacity:0;transform:translateY(-5px);}}to{{opacity:1;transform:translateY(0);}}}}
-        .sc-dp-grid{{display:grid;grid-template-columns:1fr 1fr 1fr;gap:10px;margin-bottom:10px;}}
-        .sc-dp-box{{background:rgba(255,255,255,0.025);border:1px solid rgba(79,195,247,0.1);border-radius:8px;padding:9px 11px;}}
-        .sc-dp-lbl{{font-family:'JetBrains Mono',monospace;font-size:7.5px;letter-spacing:2px;color:rgba(128,222,234,0.35);text-transform:uppercase;margin-bottom:3px;}}
-        .sc-dp-val{{font-family:'Oxanium',sans-serif;font-size:15px;font-weight:700;line-height:1.2;}}
-        .sc-dp-sub{{font-family:'JetBrains Mono',monospace;font-size:9px;color:rgba(176,190,197,0.35);margin-top:2px;}}
-        .sc-dp-rr-track{{height:3px;background:rgba(0,0,0,0.4);border-radius:2px;overflow:hidden;margin-top:5px;}}
-        .sc-dp-rr-fill{{height:100%;border-radius:2px;}}
-        .sc-dp-strike-box{{background:rgba(0,0,0,0.3);border-left:3px solid rgba(79,195,247,0.4);border-radius:0 7px 7px 0;padding:7px 11px;font-family:'JetBrains Mono',monospace;font-size:10px;color:rgba(176,190,197,0.75);line-height:1.65;margin-bottom:10px;word-break:break-word;}}
-        .sc-dp-strike-lbl{{color:#80deea;font-weight:700;}}
-        .sc-dp-actions{{display:flex;gap:8px;justify-content:flex-end;}}
-        .sc-dp-btn{{font-family:'Oxanium',sans-serif;font-size:10px;font-weight:700;letter-spacing:1px;padding:6px 14px;border-radius:6px;cursor:pointer;border:none;transition:all 0.15s ease;}}
-        .sc-dp-btn-load{{background:linear-gradient(135deg,#00bcd4,#006064);color:#fff;}}
-        .sc-dp-btn-load:hover{{filter:brightness(1.2);}}
-        .sc-dp-btn-close{{background:transparent;border:1px solid rgba(79,195,247,0.2);color:rgba(176,190,197,0.5);}}
-        .sc-dp-btn-close:hover{{border-color:rgba(79,195,247,0.4);color:#4fc3f7;}}
-        /* tag colours (reused) */
-        .strat-tag-bull{{background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.25);color:#00e676;}}
-        .strat-tag-bear{{background:rgba(255,82,82,0.1);border:1px solid rgba(255,82,82,0.25);color:#ff5252;}}
-        .strat-tag-neu{{background:rgba(255,183,77,0.1);border:1px solid rgba(255,183,77,0.25);color:#ffb74d;}}
-        .strat-tag-vol{{background:rgba(124,77,255,0.1);border:1px solid rgba(124,77,255,0.25);color:#b388ff;}}
-        .strat-tag-misc{{background:rgba(79,195,247,0.1);border:1px solid rgba(79,195,247,0.25);color:#4fc3f7;}}
-        /* trade plan badges */
-        .tp-rank-badge{{display:inline-block;font-family:'JetBrains Mono',monospace;font-size:8px;font-weight:700;letter-spacing:1.5px;padding:2px 8px;border-radius:20px;margin-left:8px;vertical-align:middle;}}
-        .tp-rank-primary{{background:rgba(0,230,118,0.15);border:1px solid rgba(0,230,118,0.4);color:#00e676;}}
-        .tp-rank-secondary{{background:rgba(255,183,77,0.15);border:1px solid rgba(255,183,77,0.4);color:#ffb74d;}}
-        .tp-rank-advanced{{background:rgba(179,136,255,0.15);border:1px solid rgba(179,136,255,0.4);color:#b388ff;}}
-        @keyframes tpFlash{{0%{{box-shadow:0 0 0 0 rgba(0,229,255,0.6);}}50%{{box-shadow:0 0 0 8px rgba(0,229,255,0);}}100%{{box-shadow:none;}}}}
-        .tp-banner-flash{{animation:tpFlash 0.6s ease-out;}}
+            <!-- header bar -->
+            <div style="display:flex;align-items:center;justify-content:space-between;padding:10px 16px;background:rgba(0,0,0,0.5);border-bottom:1px solid rgba(0,200,255,0.1);">
+                <span style="font-family:'Space Mono',monospace;font-size:10px;letter-spacing:3px;color:#00c8ff;text-transform:uppercase;">&#11043; Option Chain Analysis</span>
+                <span style="font-family:'Space Mono',monospace;font-size:8px;padding:2px 8px;border-radius:2px;background:rgba(0,200,255,0.08);border:1px solid rgba(0,200,255,0.2);color:rgba(0,200,255,0.7);letter-spacing:1px;">NIFTY &middot; LIVE</span>
+            </div>
 
-        /* ── TRADE PLAN ─────────────────────────────────────────────── */
-        .tp-wrap{{display:flex;flex-direction:column;gap:16px;}}
-        .tp-banner{{display:flex;justify-content:space-between;align-items:flex-start;background:rgba(79,195,247,0.06);border:1px solid rgba(79,195,247,0.2);border-radius:14px;padding:18px 22px;gap:16px;}}
-        .tp-banner-left{{flex:1;}}
-        .tp-banner-label{{font-family:'JetBrains Mono',monospace;font-size:9px;color:rgba(128,222,234,0.4);letter-spacing:2px;margin-bottom:6px;}}
-        .tp-banner-strat{{font-family:'Oxanium',sans-serif;font-size:clamp(15px,2vw,20px);font-weight:800;color:#80deea;margin-bottom:6px;}}
-        .tp-banner-strike{{font-family:'JetBrains Mono',monospace;font-size:11px;color:rgba(176,190,197,0.7);}}
-        .tp-banner-right{{text-align:right;}}
-        .tp-banner-exp{{font-family:'Oxanium',sans-serif;font-size:16px;font-weight:700;color:#ffb74d;margin-top:6px;}}
-        .tp-exits{{display:grid;grid-template-columns:repeat(3,1fr);gap:12px;}}
-        .tp-exit{{border-radius:14px;padding:18px;display:flex;flex-direction:column;gap:6px;position:relative;overflow:hidden;}}
-        .tp-exit::before{{content:'';position:absolute;top:0;left:0;right:0;height:3px;border-radius:14px 14px 0 0;}}
-        .tp-exit-profit{{background:rgba(0,230,118,0.05);border:1px solid rgba(0,230,118,0.2);}}
-        .tp-exit-profit::before{{background:linear-gradient(90deg,#00e676,#00bfa5);}}
-        .tp-exit-loss{{background:rgba(255,82,82,0.05);border:1px solid rgba(255,82,82,0.2);}}
-        .tp-exit-loss::before{{background:linear-gradient(90deg,#ff5252,#b71c1c);}}
-        .tp-exit-time{{background:rgba(255,183,77,0.05);border:1px solid rgba(255,183,77,0.2);}}
-        .tp-exit-time::before{{background:linear-gradient(90deg,#ffb74d,#f57c00);}}
-        .tp-exit-icon{{font-size:20px;}}
-        .tp-exit-title{{font-family:'JetBrains Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(176,190,197,0.4);margin-bottom:2px;}}
-        .tp-exit-val{{font-family:'Oxanium',sans-serif;font-size:clamp(14px,1.8vw,18px);font-weight:800;color:#e0f7fa;}}
-        .tp-exit-val2{{font-family:'Oxanium',sans-serif;font-size:13px;font-weight:700;color:rgba(224,247,250,0.6);margin-top:4px;}}
-        .tp-exit-sub{{font-family:'JetBrains Mono',monospace;font-size:9px;color:rgba(176,190,197,0.4);}}
-        .tp-exit-rule{{margin-top:8px;font-size:10px;color:rgba(176,190,197,0.55);line-height:1.5;border-top:1px solid rgba(255,255,255,0.05);padding-top:8px;}}
-        .filter-btn{{padding:6px 14px;border-radius:20px;font-size:10px;font-weight:700;letter-spacing:1px;cursor:pointer;border:1px solid rgba(79,195,247,0.2);background:transparent;color:rgba(176,190,197,0.5);transition:all 0.2s ease;font-family:'Oxanium',sans-serif;}}
-        .filter-btn.active,.filter-btn:hover{{background:rgba(79,195,247,0.1);border-color:rgba(79,195,247,0.4);color:#4fc3f7;}}
-
-        .oi-controls{{display:flex;align-items:center;justify-content:space-between;flex-wrap:wrap;gap:12px;margin-bottom:20px;}}
-        .oi-interval-btns{{display:flex;gap:0;border:1px solid rgba(79,195,247,0.25);border-radius:10px;overflow:hidden;}}
-        .oi-int-btn{{padding:9px 24px;font-family:'Oxanium',sans-serif;font-size:12px;font-weight:700;letter-spacing:2px;color:rgba(176,190,197,0.5);background:transparent;border:none;cursor:pointer;transition:all 0.2s ease;border-right:1px solid rgba(79,195,247,0.15);}}
-        .oi-int-btn:last-child{{border-right:none;}}
-        .oi-int-btn:hover{{background:rgba(79,195,247,0.12);color:#4fc3f7;}}
-        .oi-int-btn.active{{background:rgba(79,195,247,0.22);color:#00e5ff;box-shadow:inset 0 0 12px rgba(79,195,247,0.1);}}
-        .oi-live-badge{{display:flex;align-items:center;gap:7px;font-family:'JetBrains Mono',monospace;font-size:10px;letter-spacing:2px;color:rgba(0,230,118,0.7);background:rgba(0,230,118,0.08);border:1px solid rgba(0,230,118,0.25);padding:6px 14px;border-radius:8px;}}
-        .oi-live-dot{{width:7px;height:7px;border-radius:50%;background:#00e676;box-shadow:0 0 8px #00e676;animation:sb-pulse 1.5s ease-in-out infinite;}}
-        .oi-summary-strip{{display:grid;grid-template-columns:repeat(4,minmax(0,1fr));gap:12px;margin-bottom:20px;}}
-        .oi-sum-card{{background:rgba(255,255,255,0.03);border:1px solid rgba(79,195,247,0.14);border-radius:12px;padding:14px 16px;text-align:center;}}
-        .oi-sum-label{{font-size:9px;letter-spacing:2px;color:rgba(128,222,234,0.9);text-transform:uppercase;font-weight:700;margin-bottom:6px;}}
-        .oi-sum-val{{font-family:'Oxanium',sans-serif;font-size:clamp(16px,2.5vw,22px);font-weight:700;line-height:1;}}
-        .oi-chart-wrap{{background:rgba(6,13,20,0.7);border:1px solid rgba(79,195,247,0.14);border-radius:14px;padding:16px;margin-bottom:20px;}}
-        .oi-chart-label{{font-size:9px;letter-spacing:2px;color:rgba(128,222,234,0.9);text-transform:uppercase;font-weight:700;}}
-        /* ══ OPTION FLOW TABLE — POLISHED UI ════════════════════════════════ */
-        .oi-table-wrap{{background:rgba(6,13,20,0.85);border:1px solid rgba(79,195,247,0.18);border-radius:16px;overflow-x:auto;overflow-y:hidden;-webkit-overflow-scrolling:touch;box-shadow:0 4px 40px rgba(0,0,0,0.5);overflow-anchor:none;}}
-        .oi-table{{width:100%;min-width:1260px;border-collapse:collapse;font-family:'JetBrains Mono',monospace;overflow-anchor:none;}}
-        .oi-table-scroll-hint{{display:none;align-items:center;gap:6px;font-family:'JetBrains Mono',monospace;font-size:9px;letter-spacing:1.5px;color:rgba(79,195,247,0.4);padding:6px 14px 0;text-transform:uppercase;}}
+            <div style="padding:16px;">
 
-        /* ── Header ── */
-        .oi-table thead tr{{background:rgba(18,26,33,0.95);border-bottom:2px solid rgba(36,53,68,0.9);}}
-        .oi-table thead th{{padding:14px 16px;font-size:13px;letter-spacing:1.5px;color:rgba(178,235,242,1);text-transform:uppercase;font-weight:700;text-align:right;white-space:nowrap;}}
-        .oi-table thead th:first-child{{text-align:left;}}
-        .oi-table thead th.oi-th-divider{{border-left:1px solid rgba(30,45,56,1);}}
+                <!-- PCR / Sentiment / MaxPain stats row -->
+                <div style="display:grid;grid-template-columns:1fr 1fr 1fr;gap:1px;background:rgba(0,200,255,0.06);border-radius:4px;overflow:hidden;margin-bottom:14px;">
+                    <div style="background:rgba(0,8,16,0.9);padding:14px 16px;">
+                        <div style="font-family:'Space Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(0,200,255,0.6);text-transform:uppercase;margin-bottom:8px;">Put / Call</div>
+                        <div style="font-family:'Orbitron',monospace;font-size:28px;font-weight:700;line-height:1;color:{pcr_badge_col};text-shadow:0 0 16px {pcr_badge_col}99;">{pcr_str}</div>
+                        <div style="font-family:'Space Mono',monospace;font-size:9px;color:rgba(200,216,224,0.6);margin-top:6px;">PCR RATIO</div>
+                    </div>
+                    <div style="background:rgba(0,8,16,0.9);padding:14px 16px;">
+                        <div style="font-family:'Space Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(0,200,255,0.6);text-transform:uppercase;margin-bottom:8px;">OI Sentiment</div>
+                        <div style="font-family:'Orbitron',monospace;font-size:22px;font-weight:700;line-height:1;color:{sent_col};text-shadow:0 0 16px {sent_col}99;">{sent_icon} {sent_lbl}</div>
+                        <div style="font-family:'Space Mono',monospace;font-size:9px;color:rgba(200,216,224,0.6);margin-top:6px;">{oi_dir}</div>
+                    </div>
+                    <div style="background:rgba(0,8,16,0.9);padding:14px 16px;">
+                        <div style="font-family:'Space Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(0,200,255,0.6);text-transform:uppercase;margin-bottom:8px;">Max Pain</div>
+                        <div style="font-family:'Orbitron',monospace;font-size:22px;font-weight:700;line-height:1;color:#ffd700;text-shadow:0 0 16px rgba(255,215,0,0.5);">&#8377;{max_pain:,}</div>
+                        <div style="font-family:'Space Mono',monospace;font-size:9px;color:rgba(200,216,224,0.6);margin-top:6px;">Expiry magnet</div>
+                    </div>
+                </div>
 
-        /* ── FOCUS / DETAIL toggle ── */
-        .oi-view-btn{{padding:5px 16px;font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:700;letter-spacing:1.5px;color:rgba(128,222,234,0.4);background:transparent;border:1px solid rgba(79,195,247,0.2);border-radius:20px;cursor:pointer;transition:all 0.2s ease;}}
-        .oi-view-btn:hover{{color:#4fc3f7;border-color:rgba(79,195,247,0.5);background:rgba(79,195,247,0.08);}}
-        .oi-view-active{{color:#00e5ff!important;border-color:rgba(79,195,247,0.6)!important;background:rgba(79,195,247,0.14)!important;box-shadow:0 0 10px rgba(79,195,247,0.12);}}
-        /* FOCUS mode: hide col-detail columns (default) */
-        .col-detail{{display:none;}}
-        /* DETAIL mode: show col-detail columns */
-        .oi-detail-mode .col-detail{{display:table-cell;}}
+                <!-- OI Direction bars -->
+                <div style="margin-bottom:14px;">
+                    <div style="font-family:'Space Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(0,200,255,0.6);text-transform:uppercase;margin-bottom:10px;display:flex;align-items:center;gap:8px;">
+                        OI DIRECTION <span style="flex:1;height:1px;background:rgba(0,200,255,0.12);display:inline-block;"></span>
+                    </div>
+                    <div style="display:flex;align-items:center;gap:10px;margin-bottom:10px;">
+                        <div style="font-family:'Space Mono',monospace;font-size:11px;font-weight:700;color:#ff4d6d;width:26px;flex-shrink:0;">CE</div>
+                        <div style="flex:1;height:7px;background:rgba(255,255,255,0.06);position:relative;overflow:hidden;">
+                            <div style="height:100%;width:{ce_w}%;background:linear-gradient(90deg,rgba(255,77,109,0.4),#ff4d6d);position:relative;">
+                                <span style="position:absolute;right:0;top:0;bottom:0;width:2px;background:#ff4d6d;filter:brightness(2);box-shadow:0 0 8px #ff4d6d;"></span>
+                            </div>
+                        </div>
+                        <div style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#ff6b85;width:64px;text-align:right;flex-shrink:0;">{ce_k}</div>
+                    </div>
+                    <div style="display:flex;align-items:center;gap:10px;">
+                        <div style="font-family:'Space Mono',monospace;font-size:11px;font-weight:700;color:#00e676;width:26px;flex-shrink:0;">PE</div>
+                        <div style="flex:1;height:7px;background:rgba(255,255,255,0.06);position:relative;overflow:hidden;">
+                            <div style="height:100%;width:{pe_w}%;background:linear-gradient(90deg,rgba(0,230,118,0.4),#00e676);position:relative;">
+                                <span style="position:absolute;right:0;top:0;bottom:0;width:2px;background:#00e676;filter:brightness(2);box-shadow:0 0 8px #00e676;"></span>
+                            </div>
+                        </div>
+                        <div style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#00e676;width:64px;text-align:right;flex-shrink:0;">{pe_k}</div>
+                    </div>
+                </div>
 
-        /* ── Body rows ── */
-        .oi-table tbody tr{{border-bottom:1px solid rgba(30,45,56,0.8);transition:background 0.15s ease;}}
-        .oi-table tbody tr:last-child{{border-bottom:none;}}
-        .oi-table tbody tr:hover{{background:rgba(18,26,33,0.9);}}
-        .oi-table tbody tr.oi-live-row{{background:linear-gradient(90deg,rgba(0,212,255,0.04) 0%,transparent 60%);border-bottom:1px solid rgba(0,212,255,0.18);}}
-        .oi-table tbody td{{padding:14px 16px;font-size:15px;text-align:right;color:#dce8f0;white-space:nowrap;}}
-        .oi-table tbody td:first-child{{text-align:left;}}
-        .oi-table tbody td.oi-th-divider{{border-left:1px solid rgba(30,45,56,0.8);}}
+                <!-- OI Resistance Walls -->
+                <div style="margin-bottom:12px;">
+                    <div style="font-family:'Space Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(0,200,255,0.6);text-transform:uppercase;margin-bottom:10px;display:flex;align-items:center;gap:8px;">
+                        OI RESISTANCE WALLS <span style="flex:1;height:1px;background:rgba(0,200,255,0.12);display:inline-block;"></span>
+                    </div>
+                    <div style="display:flex;align-items:center;gap:10px;padding:8px 0;border-bottom:1px solid rgba(0,200,255,0.06);">
+                        <span style="font-family:'Space Mono',monospace;font-size:10px;font-weight:700;padding:3px 8px;border-radius:2px;background:rgba(255,77,109,0.15);color:#ff4d6d;border:1px solid rgba(255,77,109,0.35);width:32px;text-align:center;flex-shrink:0;">R1</span>
+                        <div style="flex:1;height:6px;background:rgba(255,255,255,0.04);">
+                            <div style="height:100%;width:{ce_wall_w}%;background:linear-gradient(90deg,rgba(255,77,109,0.3),#ff4d6d);box-shadow:0 0 6px rgba(255,77,109,0.3);"></div>
+                        </div>
+                        <span style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#ff6b85;flex-shrink:0;min-width:80px;text-align:right;">&#8377;{max_ce:,}</span>
+                    </div>
+                    <div style="display:flex;align-items:center;gap:10px;padding:8px 0;">
+                        <span style="font-family:'Space Mono',monospace;font-size:10px;font-weight:700;padding:3px 8px;border-radius:2px;background:rgba(255,77,109,0.08);color:rgba(255,100,130,0.85);border:1px solid rgba(255,77,109,0.2);width:32px;text-align:center;flex-shrink:0;">R2</span>
+                        <div style="flex:1;height:6px;background:rgba(255,255,255,0.04);">
+                            <div style="height:100%;width:{ce_wall_r2_w}%;background:linear-gradient(90deg,rgba(255,77,109,0.15),rgba(255,77,109,0.7));"></div>
+                        </div>
+                        <span style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:rgba(255,143,163,0.85);flex-shrink:0;min-width:80px;text-align:right;">&#8377;{max_ce_r2:,}</span>
+                    </div>
+                </div>
 
-        /* ── Time cell ── */
-        .oi-time-cell{{display:flex;align-items:center;gap:10px;}}
-        .oi-time-val{{font-size:16px;font-weight:700;color:#fff;letter-spacing:0.5px;}}
-        .oi-live-ind{{display:inline-flex;align-items:center;gap:5px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.5);border-radius:20px;padding:2px 8px;font-size:9px;color:#00e676;letter-spacing:1px;font-weight:700;}}
-        .oi-live-ind::before{{content:'';display:inline-block;width:6px;height:6px;border-radius:50%;background:#00e676;box-shadow:0 0 6px #00e676;animation:sb-pulse 1.2s ease-in-out infinite;}}
-        .oi-elapsed{{display:inline-flex;align-items:center;gap:6px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.45);border-radius:20px;padding:3px 12px;font-size:13px;color:#00e676;letter-spacing:0.5px;font-weight:700;font-family:'JetBrains Mono',monospace;min-width:68px;}}
-        .oi-elapsed::before{{content:'';display:inline-block;width:7px;height:7px;border-radius:50%;background:#00e676;box-shadow:0 0 8px #00e676;animation:sb-pulse 1.2s ease-in-out infinite;}}
-        .nlf-elapsed{{display:inline-flex;align-items:center;gap:4px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.4);border-radius:12px;padding:2px 8px;font-size:11px;color:#00e676;letter-spacing:0.3px;font-weight:700;font-family:'JetBrains Mono',monospace;min-width:54px;}}
-        .nlf-elapsed::before{{content:'';display:inline-block;width:6px;height:6px;border-radius:50%;background:#00e676;box-shadow:0 0 5px #00e676;animation:sb-pulse 1.2s ease-in-out infinite;}}
+                <!-- OI Support Floors -->
+                <div>
+                    <div style="font-family:'Space Mono',monospace;font-size:9px;letter-spacing:2px;color:rgba(0,200,255,0.6);text-transform:uppercase;margin-bottom:10px;display:flex;align-items:center;gap:8px;">
+                        OI SUPPORT FLOORS <span style="flex:1;height:1px;background:rgba(0,200,255,0.12);display:inline-block;"></span>
+                    </div>
+                    <div style="display:flex;align-items:center;gap:10px;padding:8px 0;border-bottom:1px solid rgba(0,200,255,0.06);">
+                        <span style="font-family:'Space Mono',monospace;font-size:10px;font-weight:700;padding:3px 8px;border-radius:2px;background:rgba(0,230,118,0.15);color:#00e676;border:1px solid rgba(0,230,118,0.35);width:32px;text-align:center;flex-shrink:0;">S1</span>
+                        <div style="flex:1;height:6px;background:rgba(255,255,255,0.04);">
+                            <div style="height:100%;width:{pe_wall_w}%;background:linear-gradient(90deg,rgba(0,230,118,0.3),#00e676);box-shadow:0 0 6px rgba(0,230,118,0.3);"></div>
+                        </div>
+                        <span style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#00e676;flex-shrink:0;min-width:80px;text-align:right;">&#8377;{max_pe:,}</span>
+                    </div>
+                    <div style="display:flex;align-items:center;gap:10px;padding:8px 0;">
+                        <span style="font-family:'Space Mono',monospace;font-size:10px;font-weight:700;padding:3px 8px;border-radius:2px;background:rgba(0,230,118,0.08);color:rgba(0,200,100,0.85);border:1px solid rgba(0,230,118,0.2);width:32px;text-align:center;flex-shrink:0;">S2</span>
+                        <div style="flex:1;height:6px;background:rgba(255,255,255,0.04);">
+                            <div style="height:100%;width:{pe_wall_s2_w}%;background:linear-gradient(90deg,rgba(0,230,118,0.15),rgba(0,230,118,0.7));"></div>
+                        </div>
+                        <span style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:rgba(105,240,174,0.85);flex-shrink:0;min-width:80px;text-align:right;">&#8377;{max_pe_s2:,}</span>
+                    </div>
+                </div>
 
-        /* ── OI value cells ── */
-        .oi-call-val{{color:#00e676;font-weight:500;}}
-        .oi-put-val{{color:#c8dde8;}}
-        .oi-diff-neg{{color:#ff4757;font-weight:700;}}
-        .oi-diff-pos{{color:#00e676;font-weight:700;}}
+            </div>
+        </div>"""
 
-        /* ── PCR with mini bar ── */
-        .oi-pcr-val{{font-weight:700;font-size:14px;}}
-        .oi-pcr-val.oi-pcr-bull,.oi-pcr-bull{{color:#00e676 !important;}}
-        .oi-pcr-val.oi-pcr-bear,.oi-pcr-bear{{color:#ff4757 !important;}}
-        .oi-pcr-val.oi-pcr-neu,.oi-pcr-neu{{color:#ffd32a !important;}}
-        .oi-pcr-cell{{display:inline-flex;align-items:center;justify-content:flex-end;gap:6px;}}
-        .oi-pcr-bar-wrap{{width:32px;height:4px;background:rgba(36,53,68,0.9);border-radius:2px;overflow:hidden;display:inline-block;vertical-align:middle;}}
-        .oi-pcr-bar{{height:100%;border-radius:2px;}}
-        .oi-pcr-bull-bar{{background:rgba(0,230,118,0.85);}}
-        .oi-pcr-bear-bar{{background:rgba(255,71,87,0.85);}}
-        .oi-pcr-neu-bar{{background:rgba(255,211,42,0.75);}}
+        # ── Pivot Points (Traditional) calculation ────────────────────────────
+        ph = d.get('prev_high', 0)
+        pl = d.get('prev_low', 0)
+        pc = d.get('prev_close', 0)
+        cp = d.get('current_price', 0)
 
-        /* ── Signal badges — bigger, glowing ── */
-        .oi-signal-ssell{{display:inline-block;padding:6px 16px;border-radius:7px;font-size:12px;font-weight:800;letter-spacing:1.2px;background:#ff3a4a;color:#fff;box-shadow:0 0 14px rgba(255,58,74,0.55);}}
-        .oi-signal-sell{{display:inline-block;padding:6px 16px;border-radius:7px;font-size:12px;font-weight:800;letter-spacing:1.2px;background:#ff3a4a;color:#fff;box-shadow:0 0 10px rgba(255,58,74,0.35);}}
-        .oi-signal-sbuy{{display:inline-block;padding:6px 16px;border-radius:7px;font-size:12px;font-weight:800;letter-spacing:1.2px;background:#00c853;color:#000;box-shadow:0 0 14px rgba(0,200,83,0.55);}}
-        .oi-signal-buy{{display:inline-block;padding:6px 16px;border-radius:7px;font-size:12px;font-weight:800;letter-spacing:1.2px;background:#00c853;color:#000;box-shadow:0 0 10px rgba(0,200,83,0.35);}}
-        .oi-signal-neutral{{display:inline-block;padding:6px 16px;border-radius:7px;font-size:12px;font-weight:800;letter-spacing:1.2px;background:rgba(245,158,11,0.15);color:#fde68a;border:1px solid rgba(245,158,11,0.3);}}
+        if ph and pl and pc:
+            pp = round((ph + pl + pc) / 3, 2)
+            r1p = round(2 * pp - pl, 2)
+            r2p = round(pp + (ph - pl), 2)
+            r3p = round(ph + 2 * (pp - pl), 2)
+            s1p = round(2 * pp - ph, 2)
+            s2p = round(pp - (ph - pl), 2)
+            s3p = round(pl - 2 * (ph - pp), 2)
+        else:
+            pp = r1p = r2p = r3p = s1p = s2p = s3p = 0
 
-        /* ── Spot price ── */
-        .oi-vwap-cell{{color:#93c5fd;font-weight:600;}}
-        .oi-fut-cell{{color:#c4b5fd;}}
-        .oi-spot-cell{{color:#fff;font-weight:700;font-size:15px;}}
+        # ── Dynamic NEAREST R: lowest R level strictly ABOVE LTP ─────────────
+        r_levels = [('R1', r1p), ('R2', r2p), ('R3', r3p)]
+        above_r  = [(lbl, val) for lbl, val in r_levels if val > cp]
+        nearest_r_lbl = above_r[0][0] if above_r else 'R3'
+        nearest_r_val = dict(r_levels)[nearest_r_lbl]
 
-        /* ── Spot Δ — pill style ── */
-        .oi-sdelta{{display:inline-flex;align-items:center;gap:4px;padding:4px 10px;border-radius:6px;font-size:13px;font-weight:700;font-family:'JetBrains Mono',monospace;white-space:nowrap;}}
-        .oi-sdelta-up{{background:rgba(0,230,118,0.12);color:#00e676;border:1px solid rgba(0,230,118,0.3);}}
-        .oi-sdelta-dn{{background:rgba(255,71,87,0.12);color:#ff4757;border:1px solid rgba(255,71,87,0.3);}}
-        .oi-sdelta-fl{{background:rgba(100,116,139,0.1);color:#64748b;border:1px solid rgba(100,116,139,0.2);}}
+        # ── Dynamic NEAREST S: highest level strictly BELOW LTP ──────────────
+        s_candidates = [('R1', r1p), ('PP', pp), ('S1', s1p), ('S2', s2p), ('S3', s3p)]
+        below_s  = [(lbl, val) for lbl, val in s_candidates if val < cp]
+        nearest_s_lbl = below_s[0][0] if below_s else 'S1'
+        nearest_s_val = dict(s_candidates)[nearest_s_lbl]
 
-        /* ── Nifty Move % — rounded pill ── */
-        .oi-nifty-move{{display:inline-flex;align-items:center;gap:4px;padding:5px 12px;border-radius:20px;font-size:13px;font-weight:700;font-family:'JetBrains Mono',monospace;white-space:nowrap;letter-spacing:0.3px;}}
-        .oi-nifty-up-strong{{background:rgba(0,230,118,0.18);color:#00e676;border:1px solid rgba(0,230,118,0.35);}}
-        .oi-nifty-up-mid{{background:rgba(0,200,83,0.12);color:#69f0ae;border:1px solid rgba(0,200,83,0.25);}}
-        .oi-nifty-up-weak{{background:rgba(105,240,174,0.07);color:#a7f3d0;border:1px solid rgba(105,240,174,0.18);}}
-        .oi-nifty-dn-strong{{background:rgba(255,71,87,0.18);color:#ff4757;border:1px solid rgba(255,71,87,0.35);}}
-        .oi-nifty-dn-mid{{background:rgba(255,71,87,0.12);color:#fca5a5;border:1px solid rgba(255,71,87,0.25);}}
-        .oi-nifty-dn-weak{{background:rgba(255,71,87,0.07);color:#fecaca;border:1px solid rgba(255,71,87,0.15);}}
-        .oi-nifty-flat{{background:rgba(120,144,156,0.1);color:#a8c0cc;border:1px solid rgba(120,144,156,0.2);}}
+        # Position of LTP on the bar — uses NEAREST S and NEAREST R (not hardcoded S1/R1)
+        if nearest_r_val and nearest_s_val and nearest_r_val != nearest_s_val:
+            ltp_pct = round(max(3, min(97, (cp - nearest_s_val) / (nearest_r_val - nearest_s_val) * 100)), 1)
+        else:
+            ltp_pct = 50
+        pp_dist = round(cp - pp, 2) if pp else 0
+        # pp_dist = LTP minus PP  →  positive means LTP is ABOVE PP
+        pp_dist_sign = '+' if pp_dist >= 0 else ''
+        pp_dist_lbl  = f"{pp_dist_sign}{pp_dist:.2f} from PP"
 
-        /* ── Signal Streak ── */
-        .oi-streak-int{{display:inline-flex;align-items:center;gap:8px;border-radius:0;padding:6px 12px;white-space:nowrap;}}
-        .oi-streak-int-num{{font-family:'Oxanium',sans-serif;font-size:18px;font-weight:800;line-height:1;}}
-        .oi-streak-int-lbl{{font-size:13px;font-weight:700;letter-spacing:0.5px;text-transform:uppercase;line-height:1;}}
+        # ── Zone detection (which pivot band does LTP sit in) ─────────────────
+        if pp and r3p and r2p and r1p and s1p and s2p and s3p:
+            if   cp >= r3p: zone_lbl = "Above R3";          zone_col = "#ff1744"; zone_dot = "#ff1744"
+            elif cp >= r2p: zone_lbl = "Between R2 and R3"; zone_col = "#ff4d6d"; zone_dot = "#ff4d6d"
+            elif cp >= r1p: zone_lbl = "Between R1 and R2"; zone_col = "#ff6b85"; zone_dot = "#ff6b85"
+            elif cp >= s1p: zone_lbl = "Between S1 and R1"; zone_col = "#4fc3f7"; zone_dot = "#26c6da"
+            elif cp >= s2p: zone_lbl = "Between S2 and S1"; zone_col = "#26c6da"; zone_dot = "#26c6da"
+            elif cp >= s3p: zone_lbl = "Between S3 and S2"; zone_col = "#00bcd4"; zone_dot = "#00bcd4"
+            else:           zone_lbl = "Below S3";          zone_col = "#00e676"; zone_dot = "#00e676"
+        else:
+            zone_lbl = "N/A"; zone_col = "#8faabe"; zone_dot = "#8faabe"
 
-        /* ── Nearest Level badge ── */
-        .oi-nlevel-badge{{display:inline-flex;align-items:center;gap:6px;background:rgba(10,26,37,0.9);border:1px solid rgba(36,53,68,1);border-radius:7px;padding:5px 12px;font-size:13px;font-weight:700;letter-spacing:0.3px;white-space:nowrap;}}
-        .oi-nlevel-badge .oi-nlevel-label{{font-size:10px;font-weight:700;padding:1px 5px;border-radius:3px;letter-spacing:0.5px;}}
-        .oi-nlevel-res{{color:#00d4ff;}}
-        .oi-nlevel-res .oi-nlevel-label{{background:rgba(0,153,204,0.9);color:#000;}}
-        .oi-nlevel-sup{{color:#00d4ff;}}
-        .oi-nlevel-sup .oi-nlevel-label{{background:rgba(0,153,204,0.9);color:#000;}}
+        pp_above_below = "above PP" if pp_dist >= 0 else "below PP"
 
-        /* ── Distance ── */
-        .oi-dist-val{{display:inline-block;font-size:13px;font-weight:600;font-family:'JetBrains Mono',monospace;}}
-        .oi-dist-res{{color:#ff4757;}}
-        .oi-dist-sup{{color:#ff4757;}}
+        pv_panel = f"""
+        <!-- ── Pivot Points Widget · Neon Runway · Phantom Slate Edition ── -->
+        <div style="background:#060d15;border:1px solid rgba(0,200,255,0.18);border-radius:6px;flex:1;min-width:320px;overflow:hidden;font-family:'Space Mono',monospace;">
 
-        /* ── Misc ── */
-        .oi-vsig-sell{{display:inline-block;padding:3px 9px;border-radius:5px;font-size:11px;font-weight:700;background:rgba(239,68,68,0.12);color:#fca5a5;border:1px solid rgba(239,68,68,0.25);}}
-        .oi-vsig-buy{{display:inline-block;padding:3px 9px;border-radius:5px;font-size:11px;font-weight:700;background:rgba(16,185,129,0.12);color:#6ee7b7;border:1px solid rgba(16,185,129,0.25);}}
-        .oi-empty-state{{text-align:center;padding:60px 20px;color:rgba(176,190,197,0.3);font-family:'JetBrains Mono',monospace;font-size:13px;}}
-
-        .disclaimer{{background:rgba(255,183,77,0.08);border:1px solid rgba(255,183,77,0.25);border-left:3px solid #ffb74d;border-radius:8px;padding:9px 16px;display:flex;align-items:center;gap:10px;flex-wrap:wrap;}}
-        .disc-icon{{font-size:13px;flex-shrink:0;line-height:1;}}
-        .disc-label{{font-family:'JetBrains Mono',monospace;font-size:10px;font-weight:700;letter-spacing:1.5px;color:#ffb74d;text-transform:uppercase;flex-shrink:0;}}
-        .disc-sep{{color:rgba(255,183,77,0.3);font-size:11px;flex-shrink:0;}}
-        .disc-text{{font-size:12px;color:rgba(255,183,77,0.75);font-family:'Rajdhani',sans-serif;font-weight:500;white-space:nowrap;}}
-        .disc-text strong{{color:#ffb74d;font-weight:700;}}
-        @media(max-width:700px){{.disc-text{{white-space:normal;}}}}
-        .footer{{text-align:center;padding:24px;color:#8faabe;font-size:clamp(10px,1.3vw,12px);background:rgba(10,20,28,0.4);}}
+            <!-- ── TOP BANNER ─────────────────────────────────────────────── -->
+            <div style="background:rgba(0,25,45,0.95);border-bottom:1px solid rgba(0,200,255,0.2);padding:9px 18px;display:flex;align-items:center;justify-content:center;gap:10px;">
+                <span style="color:rgba(0,200,255,0.5);font-size:9px;">&#9658;</span>
+                <span style="font-size:9px;letter-spacing:3px;color:#00c8ff;font-weight:700;text-transform:uppercase;">PIVOT POINTS (TRADITIONAL - DAILY)</span>
+                <span style="color:rgba(0,200,255,0.5);font-size:9px;">&#9658;</span>
+            </div>
 
-        /* ══ SIGNAL SUMMARY BAR ═══════════════════════════════════════════ */
-        .ssb-section{{padding:0 clamp(12px,2.5vw,26px) 16px;border-bottom:none!important;}}
-        .ssb-wrap{{background:rgba(6,13,20,0.9);border:1px solid rgba(79,195,247,0.18);border-radius:14px;overflow:hidden;}}
-        .ssb-header{{display:flex;align-items:center;justify-content:space-between;padding:9px 16px;background:rgba(0,0,0,0.35);border-bottom:1px solid rgba(79,195,247,0.1);flex-wrap:wrap;gap:8px;}}
-        .ssb-title{{font-family:'Oxanium',sans-serif;font-size:12px;letter-spacing:2.5px;color:#4fc3f7;text-transform:uppercase;font-weight:700;}}
-        .ssb-ts{{font-size:12px;color:#80deea;letter-spacing:1px;font-family:'JetBrains Mono',monospace;font-weight:600;}}
-        .ssb-grid{{display:grid;grid-template-columns:repeat(5,1fr) 1.5fr;}}
-        .ssb-cell{{padding:14px 10px;border-right:1px solid rgba(79,195,247,0.08);display:flex;flex-direction:column;align-items:center;gap:6px;text-align:center;}}
-        .ssb-cell:last-child{{border-right:none;}}
-        .ssb-cell-lbl{{font-family:'JetBrains Mono',monospace;font-size:11px;letter-spacing:2px;color:#e0f7fa;text-transform:uppercase;font-weight:700;}}
-        .ssb-badge{{display:inline-flex;align-items:center;gap:4px;padding:5px 12px;border-radius:7px;font-family:'Oxanium',sans-serif;font-size:13px;font-weight:800;letter-spacing:0.5px;white-space:nowrap;}}
-        .ssb-sub{{font-family:'JetBrains Mono',monospace;font-size:11px;color:rgba(200,221,232,0.85);letter-spacing:0.3px;max-width:110px;line-height:1.5;text-align:center;}}
-        .ssb-verdict{{display:flex;flex-direction:column;align-items:center;gap:7px;padding:14px 12px;}}
-        .ssb-verdict-lbl{{font-family:'JetBrains Mono',monospace;font-size:10px;letter-spacing:2.5px;text-transform:uppercase;font-weight:700;color:#e0f7fa;}}
-        .ssb-verdict-val{{font-family:'Oxanium',sans-serif;font-size:clamp(13px,1.8vw,17px);font-weight:800;letter-spacing:1px;text-transform:uppercase;text-align:center;line-height:1.2;}}
-        .ssb-score-dots{{display:flex;gap:5px;}}
-        .ssb-dot{{width:10px;height:10px;border-radius:50%;flex-shrink:0;}}
-        .ssb-bar-wrap{{width:100%;display:flex;flex-direction:column;gap:4px;}}
-        .ssb-bar-track{{height:5px;background:rgba(0,0,0,0.5);border-radius:3px;overflow:hidden;width:100%;display:flex;}}
-        .ssb-bar-lbl{{display:flex;justify-content:space-between;font-family:'JetBrains Mono',monospace;font-size:11px;font-weight:700;letter-spacing:0.5px;}}
-        @media(max-width:900px){{
-            .ssb-grid{{grid-template-columns:repeat(3,1fr) !important;}}
-            .ssb-cell:nth-child(3){{border-right:none;}}
-            .ssb-cell:nth-child(4),.ssb-cell:nth-child(5){{border-top:1px solid rgba(79,195,247,0.08);}}
-            .ssb-verdict{{grid-column:1/-1;border-left:none !important;border-top:1px solid rgba(79,195,247,0.1);flex-direction:row;flex-wrap:wrap;justify-content:center;gap:10px;padding:12px;}}
-        }}
-        @media(max-width:600px){{
-            .ssb-grid{{grid-template-columns:repeat(2,1fr) !important;}}
-            .ssb-cell:nth-child(2n){{border-right:none;}}
-            .ssb-cell{{border-top:1px solid rgba(79,195,247,0.07);}}
-            .ssb-cell:nth-child(1),.ssb-cell:nth-child(2){{border-top:none;}}
-            .ssb-verdict-val{{font-size:13px;}}
-        }}
+            <div style="padding:16px 18px;">
 
-        {heatmap_css}
-        {pretrade_css}
+                <!-- ── TITLE ROW ───────────────────────────────────────────── -->
+                <div style="display:flex;align-items:center;justify-content:space-between;margin-bottom:3px;">
+                    <div style="display:flex;align-items:center;gap:8px;">
+                        <span style="font-size:14px;">&#128205;</span>
+                        <span style="font-size:12px;font-weight:700;color:#e2eaf5;letter-spacing:1.5px;">PIVOT POINTS</span>
+                    </div>
+                    <span style="font-size:8px;font-weight:700;padding:3px 10px;border-radius:3px;background:rgba(0,200,255,0.12);border:1px solid rgba(0,200,255,0.35);color:#00c8ff;letter-spacing:2px;">DAILY</span>
+                </div>
+                <div style="font-size:9px;color:rgba(200,216,224,0.75);letter-spacing:1px;margin-bottom:16px;">Traditional Method &middot; Daily Candle &middot; Auto-calculated</div>
 
+                <!-- ── PROGRESS BAR (S1 ─── LTP ──→ R1) ──────────────────── -->
+                <div style="position:relative;height:8px;background:linear-gradient(90deg,#00e676 0%,#00c8a0 30%,#4fc3f7 55%,#ff6b85 80%,#f44336 100%);border-radius:4px;margin-bottom:10px;box-shadow:0 0 8px rgba(0,200,255,0.2);">
+                    <div style="position:absolute;left:{ltp_pct}%;top:50%;transform:translate(-50%,-50%);width:16px;height:16px;border-radius:50%;background:#0a1929;border:2.5px solid #00c8ff;box-shadow:0 0 12px rgba(0,200,255,0.9);z-index:5;"></div>
+                </div>
+                <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:8px;">
+                    <!-- NEAREST SUPPORT (left) -->
+                    <div style="text-align:left;">
+                        <div style="font-size:8px;font-weight:700;color:#26c6da;letter-spacing:1px;margin-bottom:2px;">&#9660; NEAREST SUPPORT</div>
+                        <div style="font-family:'Orbitron',monospace;font-size:13px;font-weight:800;color:#00e676;">&#8377;{nearest_s_val:,.2f} <span style="font-size:9px;font-weight:700;padding:1px 6px;border-radius:2px;background:rgba(0,230,118,0.15);border:1px solid rgba(0,230,118,0.4);color:#00e676;">{nearest_s_lbl}</span></div>
+                    </div>
+                    <!-- LTP centre -->
+                    <div style="text-align:center;">
+                        <div style="font-size:8px;font-weight:700;color:rgba(200,216,224,0.6);letter-spacing:1px;margin-bottom:2px;">CURRENT</div>
+                        <div style="font-size:14px;font-weight:800;color:#e2eaf5;">&#9650; &#8377;{cp:,.2f} <span style="background:rgba(0,200,255,0.18);border:1px solid rgba(0,200,255,0.45);border-radius:2px;padding:2px 7px;color:#00c8ff;font-size:10px;font-weight:700;letter-spacing:1px;">LTP</span></div>
+                    </div>
+                    <!-- NEAREST RESISTANCE (right) -->
+                    <div style="text-align:right;">
+                        <div style="font-size:8px;font-weight:700;color:#f44336;letter-spacing:1px;margin-bottom:2px;">NEAREST RESISTANCE &#9650;</div>
+                        <div style="font-family:'Orbitron',monospace;font-size:13px;font-weight:800;color:#ff6b85;"><span style="font-size:9px;font-weight:700;padding:1px 6px;border-radius:2px;background:rgba(255,77,109,0.15);border:1px solid rgba(255,77,109,0.4);color:#ff4d6d;">{nearest_r_lbl}</span> &#8377;{nearest_r_val:,.2f}</div>
+                    </div>
+                </div>
 
-        /* ══ OI CHART ENHANCEMENTS ════════════════════════════ */
-        .oi-stat-strip{{display:grid;grid-template-columns:repeat(4,1fr);gap:10px;margin-bottom:14px;}}
-        .oi-stat-box{{background:rgba(255,255,255,0.025);border:1px solid rgba(79,195,247,0.1);border-radius:10px;padding:10px 14px;text-align:center;}}
-        .oi-stat-label{{font-size:8px;letter-spacing:2px;color:rgba(128,222,234,0.9);text-transform:uppercase;font-weight:700;margin-bottom:4px;font-family:'JetBrains Mono',monospace;}}
-        .oi-stat-val{{font-family:'Oxanium',monospace;font-size:clamp(14px,2vw,18px);font-weight:700;line-height:1.2;color:#e0f7fa;}}
-        .oi-stat-pos{{color:#34d399!important;}}
-        .oi-stat-neg{{color:#f87171!important;}}
-        .oi-stat-sub{{font-family:'JetBrains Mono',monospace;font-size:9px;color:rgba(176,190,197,0.3);margin-top:3px;}}
-        .oi-y-label{{font-family:'JetBrains Mono',monospace;font-size:9px;text-align:right;padding-right:6px;line-height:1;color:rgba(128,222,234,0.25);}}
-        .oi-x-label{{font-family:'JetBrains Mono',monospace;font-size:9px;color:rgba(128,222,234,0.2);}}
-        @media(max-width:600px){{.oi-stat-strip{{grid-template-columns:repeat(2,1fr);}}}}
-        @media(max-width:380px){{.oi-stat-strip{{grid-template-columns:1fr;}}}}
+                <!-- ── ZONE LABEL + PP DISTANCE ───────────────────────────── -->
+                <div style="display:flex;justify-content:space-between;align-items:center;background:rgba(0,200,255,0.04);border:1px solid rgba(0,200,255,0.1);border-radius:3px;padding:7px 12px;margin-bottom:14px;">
+                    <span style="font-size:9px;color:{zone_col};display:flex;align-items:center;gap:6px;font-weight:700;">
+                        <span style="width:7px;height:7px;border-radius:50%;background:{zone_dot};display:inline-block;flex-shrink:0;box-shadow:0 0 6px {zone_dot};"></span>
+                        {zone_lbl}
+                    </span>
+                    <span style="font-size:9px;font-weight:600;color:rgba(200,216,224,0.85);">{'+' if pp_dist >= 0 else ''}{pp_dist:.2f} {pp_above_below}</span>
+                </div>
 
-        /* ══ NIFTY LIVE FEED — Side-by-Side Panel ════════════════════ */
-        .nlf-side-by-side{{display:flex;gap:14px;margin-bottom:20px;align-items:stretch;}}
-        .nlf-left{{flex:1;min-width:0;display:flex;flex-direction:column;}}
-        .nlf-left .oi-chart-wrap{{flex:1;margin-bottom:0;}}
-        .nlf-right{{flex:1;min-width:0;display:flex;}}
-        .nlf-panel{{flex:1;background:rgba(6,13,20,0.85);border:1px solid rgba(79,195,247,0.18);border-radius:14px;padding:16px;display:flex;flex-direction:column;font-family:'JetBrains Mono',monospace;}}
-        .nlf-header{{display:flex;justify-content:space-between;align-items:flex-start;margin-bottom:12px;gap:8px;flex-wrap:wrap;}}
-        .nlf-title-row{{display:flex;align-items:center;gap:7px;}}
-        .nlf-live-dot{{width:8px;height:8px;border-radius:50%;background:#00e676;box-shadow:0 0 8px #00e676;animation:sb-pulse 1.5s ease-in-out infinite;flex-shrink:0;}}
-        .nlf-title{{font-family:'Oxanium',sans-serif;font-size:18px;font-weight:700;color:#e0f7fa;letter-spacing:1px;}}
-        .nlf-meta{{text-align:right;font-size:14px;color:rgba(200,221,232,0.7);line-height:1.6;}}
-        .nlf-meta b{{color:#fff;font-weight:700;}}
-        .nlf-meta-spot{{display:block;font-size:15px;}}
-        .nlf-meta-item{{font-size:14px;}}
-        .nlf-meta-sep{{color:rgba(128,222,234,0.3);margin:0 2px;}}
-        .nlf-badges{{display:flex;flex-wrap:wrap;gap:5px;margin-bottom:12px;}}
-        .nlf-badge{{display:inline-flex;align-items:center;gap:4px;padding:5px 12px;border-radius:5px;font-size:13px;font-weight:700;letter-spacing:0.5px;white-space:nowrap;}}
-        .nlf-badge-buy{{background:rgba(0,200,83,0.12);color:#00c853;border:1px solid rgba(0,200,83,0.4);}}
-        .nlf-badge-sell{{background:rgba(255,58,74,0.12);color:#ff3a4a;border:1px solid rgba(255,58,74,0.4);}}
-        .nlf-badge-warn{{background:rgba(255,183,77,0.1);color:#ffb74d;border:1px solid rgba(255,183,77,0.35);}}
-        .nlf-badge-info{{background:rgba(200,221,232,0.06);color:#c8dde8;border:1px solid rgba(200,221,232,0.2);}}
-        .nlf-badge-danger{{background:rgba(255,58,74,0.1);color:#ff6b6b;border:1px solid rgba(255,58,74,0.3);}}
-        .nlf-thead{{display:grid;grid-template-columns:2fr 2fr 2.5fr 2.5fr 1.5fr 3.5fr 2fr 2.5fr;gap:4px;font-size:11px;letter-spacing:1px;color:rgba(128,222,234,0.7);text-transform:uppercase;font-weight:700;padding:6px 0;border-bottom:1px solid rgba(79,195,247,0.12);}}
-        .nlf-th-mom{{text-align:center;}}
-        .nlf-tbody{{flex:1;display:flex;flex-direction:column;}}
-        .nlf-row{{display:grid;grid-template-columns:2fr 2fr 2.5fr 2.5fr 1.5fr 3.5fr 2fr 2.5fr;gap:4px;padding:8px 0;align-items:center;font-size:13px;color:#c8dde8;border-bottom:1px solid rgba(255,255,255,0.03);}}
-        .nlf-row-live{{background:rgba(0,200,83,0.04);border-left:2px solid rgba(0,230,118,0.5);padding-left:4px;}}
-        .nlf-row-time{{color:rgba(176,190,197,0.6);font-size:13px;display:inline-flex;align-items:center;gap:4px;}}
-        .nlf-row-pcr{{font-weight:700;font-size:12px;text-align:center;}}
-        .nlf-row-delta{{font-weight:700;font-size:12px;text-align:right;}}
-        .nlf-row-vwap{{text-align:center;font-size:12px;font-weight:700;}}
-        .nlf-row-stk{{text-align:center;color:#ffd32a;font-weight:700;font-size:13px;}}
-        .nlf-row-level{{text-align:center;font-size:11px;font-weight:700;overflow:hidden;text-overflow:ellipsis;}}
-        .nlf-row-rsi{{text-align:right;font-weight:700;font-size:12px;}}
-        .nlf-row-conf{{text-align:center;font-weight:800;font-size:11px;}}
-        .nlf-footer{{display:flex;justify-content:space-between;padding-top:8px;margin-top:auto;border-top:1px solid rgba(79,195,247,0.08);font-size:13px;}}
-        .nlf-footer-left{{color:rgba(176,190,197,0.45);}}
-        .nlf-footer-right{{font-weight:700;}}
-        @media(max-width:1100px){{
-            .nlf-side-by-side{{flex-direction:column;}}
-            .nlf-right{{width:100%;}}
-        }}
-        @media(max-width:600px){{
-            .nlf-thead,.nlf-row{{grid-template-columns:2fr 2fr 2.5fr 2.5fr 1.5fr 3.5fr 2fr 2.5fr;gap:2px;font-size:11px;}}
-            .nlf-row-level span{{font-size:9px !important;}}
-            .nlf-row-time{{font-size:11px;}}
-            .nlf-row-pcr,.nlf-row-delta,.nlf-row-vwap,.nlf-row-stk,.nlf-row-rsi,.nlf-row-conf{{font-size:11px;}}
-            .nlf-badge{{font-size:11px;padding:3px 8px;}}
-            .nlf-panel{{padding:10px;}}
-        }}
-        @media(max-width:1024px){{
-            .grid-5{{grid-template-columns:repeat(3,minmax(0,1fr));}}
-            .grid-4{{grid-template-columns:repeat(2,minmax(0,1fr));}}
-            .pf-grid{{grid-template-columns:repeat(3,minmax(0,1fr));gap:10px;}}
-            .nc-cards-grid{{grid-template-columns:repeat(3,minmax(0,1fr));}}
-            .nc-meter-track{{width:140px;}}
-            .oi-summary-strip{{grid-template-columns:repeat(2,minmax(0,1fr));}}
-        }}
+                <!-- ── PREV HIGH / LOW / CLOSE ─────────────────────────────── -->
+                <div style="display:grid;grid-template-columns:1fr 1fr 1fr;gap:1px;background:rgba(0,200,255,0.08);border-radius:4px;overflow:hidden;margin-bottom:14px;">
+                    <div style="background:#07111c;padding:10px 12px;">
+                        <div style="font-size:9px;letter-spacing:1.5px;font-weight:600;color:rgba(252,165,165,0.9);margin-bottom:5px;display:flex;align-items:center;gap:4px;">
+                            <span style="color:#fca5a5;">&#9650;</span> PREV HIGH
+                        </div>
+                        <div style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#fca5a5;">&#8377;{ph:,.2f}</div>
+                    </div>
+                    <div style="background:#07111c;padding:10px 12px;border-left:1px solid rgba(0,200,255,0.07);border-right:1px solid rgba(0,200,255,0.07);">
+                        <div style="font-size:9px;letter-spacing:1.5px;font-weight:600;color:rgba(134,239,172,0.9);margin-bottom:5px;display:flex;align-items:center;gap:4px;">
+                            <span style="color:#86efac;">&#9660;</span> PREV LOW
+                        </div>
+                        <div style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#86efac;">&#8377;{pl:,.2f}</div>
+                    </div>
+                    <div style="background:#07111c;padding:10px 12px;">
+                        <div style="font-size:9px;letter-spacing:1.5px;font-weight:600;color:rgba(200,216,224,0.85);margin-bottom:5px;display:flex;align-items:center;gap:4px;">
+                            <span style="color:#94a3b8;">&#9679;</span> PREV CLOSE
+                        </div>
+                        <div style="font-family:'Orbitron',monospace;font-size:14px;font-weight:700;color:#c9d1d9;">&#8377;{pc:,.2f}</div>
+                    </div>
+                </div>
 
-        /* ══ SIDEBAR NAV ══════════════════════════════════════════════ */
-        .page-body{{display:flex;align-items:flex-start;position:relative;min-height:100vh;}}
-        .page-content{{flex:1;min-width:0;width:100%;}}
-        .nav-sidebar{{
-            width:190px;flex-shrink:0;
-            background:#07111a;
-            border-right:1px solid rgba(79,195,247,0.12);
-            position:sticky;top:var(--header-h,0px);
-            height:calc(100vh - var(--header-h,0px));
-            max-height:calc(100vh - var(--header-h,0px));
-            align-self:flex-start;
-            display:flex;flex-direction:column;
-            transition:width 0.22s ease;
-            z-index:100;overflow:hidden;
-        }}
-        .nav-sidebar.collapsed{{width:46px;}}
-        .nsb-header{{display:flex;align-items:center;justify-content:space-between;padding:12px 10px;border-bottom:1px solid rgba(79,195,247,0.1);flex-shrink:0;}}
-        .nsb-logo{{font-family:'Oxanium',sans-serif;font-size:11px;letter-spacing:3px;color:#4fc3f7;font-weight:700;white-space:nowrap;overflow:hidden;transition:opacity 0.2s;}}
-        .nav-sidebar.collapsed .nsb-logo{{opacity:0;pointer-events:none;}}
-        .nsb-toggle{{width:26px;height:26px;border-radius:6px;border:1px solid rgba(79,195,247,0.2);background:transparent;cursor:pointer;display:flex;align-items:center;justify-content:center;flex-shrink:0;}}
-        .nsb-toggle:hover{{background:rgba(79,195,247,0.1);}}
-        .nsb-toggle svg{{transition:transform 0.22s;}}
-        .nav-sidebar.collapsed .nsb-toggle svg{{transform:rotate(180deg);}}
-        .nsb-nav{{flex:1;overflow-y:auto;overflow-x:hidden;padding:8px 0;scrollbar-width:thin;scrollbar-color:rgba(79,195,247,0.15) transparent;}}
-        .nsb-nav::-webkit-scrollbar{{width:3px;}}
-        .nsb-nav::-webkit-scrollbar-thumb{{background:rgba(79,195,247,0.2);border-radius:2px;}}
-        .nsb-group{{font-size:9px;letter-spacing:2px;color:rgba(79,195,247,0.65);padding:10px 12px 4px;text-transform:uppercase;white-space:nowrap;overflow:hidden;transition:opacity 0.2s;font-weight:700;}}
-        .nav-sidebar.collapsed .nsb-group{{opacity:0;}}
-        .nsb-item{{display:flex;align-items:center;gap:9px;padding:8px 12px;cursor:pointer;border-left:2px solid transparent;transition:all 0.15s ease;position:relative;}}
-        .nsb-item:hover{{background:rgba(79,195,247,0.06);border-left-color:rgba(79,195,247,0.3);}}
-        .nsb-item.active{{background:rgba(79,195,247,0.1);border-left-color:#4fc3f7;}}
-        .nsb-icon{{width:18px;height:18px;flex-shrink:0;display:flex;align-items:center;justify-content:center;color:rgba(128,222,234,0.45);}}
-        .nsb-item.active .nsb-icon{{color:#4fc3f7;}}
-        .nsb-icon svg{{width:15px;height:15px;}}
-        .nsb-label{{font-family:'JetBrains Mono',monospace;font-size:10.5px;color:rgba(176,190,197,0.55);white-space:nowrap;overflow:hidden;transition:opacity 0.15s;letter-spacing:0.3px;}}
-        .nsb-item.active .nsb-label{{color:#e0f7fa;}}
-        .nav-sidebar.collapsed .nsb-label{{opacity:0;width:0;pointer-events:none;}}
-        .nav-sidebar.collapsed .nsb-item{{padding:8px 14px;}}
-        .nsb-tip{{display:none;position:absolute;left:48px;top:50%;transform:translateY(-50%);background:#0d1e2a;border:1px solid rgba(79,195,247,0.25);border-radius:6px;padding:4px 11px;font-family:'JetBrains Mono',monospace;font-size:10px;color:#80deea;white-space:nowrap;z-index:999;pointer-events:none;}}
-        .nav-sidebar.collapsed .nsb-item:hover .nsb-tip{{display:block;}}
+                <!-- ── MAIN 3-COLUMN GRID: R Levels | Pivot Centre | S Levels ── -->
+                <div style="display:grid;grid-template-columns:1fr 130px 1fr;gap:1px;background:rgba(0,200,255,0.08);border-radius:4px;overflow:hidden;">
 
-        /* ── Mobile nav bar + drawer ───────────────────────── */
-        .nsb-mob-bar{{
-            display:none;align-items:center;gap:10px;
-            padding:10px 14px;
-            background:#07111a;
-            border-bottom:1px solid rgba(79,195,247,0.18);
-            position:sticky;top:0;z-index:90;
-            width:100%;
-        }}
-        .nsb-mob-btn{{
-            width:36px;height:36px;border-radius:8px;
-            border:1px solid rgba(79,195,247,0.3);
-            background:rgba(79,195,247,0.06);
-            cursor:pointer;display:flex;align-items:center;justify-content:center;
-            flex-shrink:0;
-        }}
-        .nsb-mob-btn:active{{background:rgba(79,195,247,0.15);}}
-        .nsb-mob-title{{
-            font-family:'JetBrains Mono',monospace;
-            font-size:12px;letter-spacing:1.5px;
-            color:rgba(79,195,247,0.8);
-            text-transform:uppercase;
-            flex:1;overflow:hidden;text-overflow:ellipsis;white-space:nowrap;
-        }}
-        .nsb-drawer{{
-            display:none;position:fixed;
-            top:0;left:0;width:100%;height:100%;
-            background:rgba(4,10,16,0.98);
-            z-index:200;flex-direction:column;
-        }}
-        .nsb-drawer.open{{display:flex;}}
-        .nsb-drawer-head{{
-            display:flex;align-items:center;justify-content:space-between;
-            padding:16px 18px;
-            border-bottom:1px solid rgba(79,195,247,0.15);
-            flex-shrink:0;
-        }}
-        .nsb-drawer-title{{
-            font-family:'JetBrains Mono',monospace;font-size:10px;
-            letter-spacing:3px;color:rgba(79,195,247,0.5);text-transform:uppercase;
-        }}
-        .nsb-drawer-close{{
-            width:36px;height:36px;border-radius:8px;
-            border:1px solid rgba(255,82,82,0.35);
-            background:rgba(255,82,82,0.06);
-            cursor:pointer;color:rgba(255,82,82,0.8);
-            font-size:16px;display:flex;align-items:center;justify-content:center;
-        }}
-        .nsb-drawer-nav{{flex:1;overflow-y:auto;padding:6px 0;}}
-        .nsb-mob-item{{
-            padding:15px 20px;
-            font-family:'JetBrains Mono',monospace;font-size:13px;
-            color:rgba(176,190,197,0.65);
-            cursor:pointer;border-left:3px solid transparent;
-            letter-spacing:0.5px;
-            transition:all 0.15s ease;
-        }}
-        .nsb-mob-item:active,
-        .nsb-mob-item.active{{
-            background:rgba(79,195,247,0.1);
-            border-left-color:#4fc3f7;color:#e0f7fa;
-        }}
+                    <!-- LEFT: Resistance R3 / R2 / R1 — NEAREST R is dynamic -->
+                    <div style="background:#07111c;padding:12px 14px;">
+                        <!-- R3 -->
+                        <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;border-bottom:1px solid rgba(255,77,109,0.07);{'background:rgba(255,77,109,0.06);border-radius:2px;' if nearest_r_lbl=='R3' else ''}">
+                            <div style="display:flex;align-items:center;gap:5px;flex-wrap:wrap;">
+                                <span style="font-size:9px;font-weight:700;padding:2px 7px;border-radius:2px;background:rgba(255,77,109,{'0.18' if nearest_r_lbl=='R3' else '0.05'});color:{'#ff4d6d' if nearest_r_lbl=='R3' else 'rgba(255,100,130,0.5)'};border:1px solid rgba(255,77,109,{'0.4' if nearest_r_lbl=='R3' else '0.12'});">R3</span>
+                                {'<span style="font-size:7px;font-weight:700;padding:1px 5px;border-radius:2px;background:rgba(255,77,109,0.1);border:1px solid rgba(255,77,109,0.28);color:#ff6b85;letter-spacing:0.5px;">NEAREST R</span>' if nearest_r_lbl=='R3' else ''}
+                            </div>
+                            <div style="display:flex;align-items:center;gap:4px;">
+                                <span style="font-family:'Orbitron',monospace;font-size:{'14' if nearest_r_lbl=='R3' else '12'}px;font-weight:700;color:{'#ff6b85' if nearest_r_lbl=='R3' else 'rgba(255,143,163,0.5)'};">&#8377;{r3p:,.2f}</span>
+                                {'<span style="color:#ff6b85;font-size:11px;">&#9650;</span>' if nearest_r_lbl=='R3' else ''}
+                            </div>
+                        </div>
+                        <!-- R2 -->
+                        <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;border-bottom:1px solid rgba(255,77,109,0.1);{'background:rgba(255,77,109,0.06);border-radius:2px;' if nearest_r_lbl=='R2' else ''}">
+                            <div style="display:flex;align-items:center;gap:5px;flex-wrap:wrap;">
+                                <span style="font-size:9px;font-weight:700;padding:2px 7px;border-radius:2px;background:rgba(255,77,109,{'0.18' if nearest_r_lbl=='R2' else '0.08'});color:{'#ff4d6d' if nearest_r_lbl=='R2' else 'rgba(255,100,130,0.8)'};border:1px solid rgba(255,77,109,{'0.4' if nearest_r_lbl=='R2' else '0.18'});">R2</span>
+                                {'<span style="font-size:7px;font-weight:700;padding:1px 5px;border-radius:2px;background:rgba(255,77,109,0.1);border:1px solid rgba(255,77,109,0.28);color:#ff6b85;letter-spacing:0.5px;">NEAREST R</span>' if nearest_r_lbl=='R2' else ''}
+                            </div>
+                            <div style="display:flex;align-items:center;gap:4px;">
+                                <span style="font-family:'Orbitron',monospace;font-size:{'14' if nearest_r_lbl=='R2' else '13'}px;font-weight:700;color:{'#ff6b85' if nearest_r_lbl=='R2' else 'rgba(255,143,163,0.85)'};">&#8377;{r2p:,.2f}</span>
+                                {'<span style="color:#ff6b85;font-size:11px;">&#9650;</span>' if nearest_r_lbl=='R2' else ''}
+                            </div>
+                        </div>
+                        <!-- R1 -->
+                        <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;{'background:rgba(255,77,109,0.04);border-radius:2px;margin-top:1px;' if nearest_r_lbl=='R1' else 'margin-top:1px;'}">
+                            <div style="display:flex;align-items:center;gap:5px;flex-wrap:wrap;">
+                                <span style="font-size:9px;font-weight:700;padding:2px 7px;border-radius:2px;background:rgba(255,77,109,{'0.18' if nearest_r_lbl=='R1' else '0.06'});color:{'#ff4d6d' if nearest_r_lbl=='R1' else 'rgba(255,100,130,0.45)'};border:1px solid rgba(255,77,109,{'0.4' if nearest_r_lbl=='R1' else '0.15'});">R1</span>
+                                {'<span style="font-size:7px;font-weight:700;padding:1px 5px;border-radius:2px;background:rgba(255,77,109,0.1);border:1px solid rgba(255,77,109,0.28);color:#ff6b85;letter-spacing:0.5px;">NEAREST R</span>' if nearest_r_lbl=='R1' else ''}
+                            </div>
+                            <div style="display:flex;align-items:center;gap:4px;">
+                                <span style="font-family:'Orbitron',monospace;font-size:{'14' if nearest_r_lbl=='R1' else '12'}px;font-weight:700;color:{'#ff6b85' if nearest_r_lbl=='R1' else 'rgba(255,143,163,0.38)'};">&#8377;{r1p:,.2f}</span>
+                                {'<span style="color:#ff6b85;font-size:11px;">&#9650;</span>' if nearest_r_lbl=='R1' else ''}
+                            </div>
+                        </div>
+                    </div>
 
-        /* ══ MOBILE RESPONSIVE OVERRIDES ════════════════════════════ */
-        @media(max-width:768px){{
-            /* Hide desktop sidebar, show mobile bar */
-            .nav-sidebar{{display:none;}}
-            .nsb-mob-bar{{display:flex;}}
-            .page-body{{flex-direction:column;}}
-            .page-content{{width:100%;min-width:0;}}
+                    <!-- CENTRE: Pivot Point + NEAREST R + LTP -->
+                    <div style="background:#040c14;padding:10px 8px;display:flex;flex-direction:column;align-items:center;justify-content:space-between;gap:6px;border-left:1px solid rgba(79,195,247,0.14);border-right:1px solid rgba(79,195,247,0.14);">
 
-            /* Header — Option B mobile */
-            .hb-banner{{padding:10px 12px;gap:8px;}}
-            .hb-chips{{display:none;}}
-            .hb-title-main{{font-size:13px;}}
-            .hb-status{{padding:5px 12px;gap:4px;flex-wrap:wrap;}}
-            .hb-s-item{{font-size:9px;}}
-            .tab-btn{{padding:9px 10px;font-size:9px;letter-spacing:0.8px;gap:5px;}}
-            .tab-badge{{font-size:8px;padding:2px 5px;}}
+                        <!-- Pivot Point block -->
+                        <div style="text-align:center;width:100%;">
+                            <div style="font-size:8px;letter-spacing:2px;font-weight:700;color:#4fc3f7;text-transform:uppercase;margin-bottom:4px;">PIVOT POINT</div>
+                            <div style="font-family:'Orbitron',monospace;font-size:15px;font-weight:900;color:#4fc3f7;text-shadow:0 0 12px rgba(79,195,247,0.6);line-height:1;">&#8377;{pp:,.2f}</div>
+                            <div style="font-size:9px;font-weight:700;color:{'#00e676' if pp_dist >= 0 else '#f44336'};margin-top:4px;">LTP {pp_dist_sign}{pp_dist:.2f} pts {'above' if pp_dist >= 0 else 'below'} PP</div>
+                        </div>
 
-            /* Sections */
-            .section{{padding:12px 12px;}}
-            .section-title{{font-size:11px;letter-spacing:1px;margin-bottom:12px;padding-bottom:8px;gap:6px;}}
+                        <!-- NEAREST R block — highlighted in red -->
+                        <div style="width:100%;background:rgba(255,77,109,0.1);border:1px solid rgba(255,77,109,0.38);border-radius:3px;padding:7px 8px;text-align:center;">
+                            <div style="font-size:8px;letter-spacing:1.5px;font-weight:700;color:#ff6b85;margin-bottom:4px;">&#9650; NEXT RES ({nearest_r_lbl})</div>
+                            <div style="font-family:'Orbitron',monospace;font-size:13px;font-weight:800;color:#ff4d6d;text-shadow:0 0 10px rgba(255,77,109,0.5);line-height:1;">&#8377;{dict(r_levels)[nearest_r_lbl]:,.2f}</div>
+                            <div style="font-size:9px;font-weight:700;color:#fca5a5;margin-top:4px;">+{round(dict(r_levels)[nearest_r_lbl]-cp,2):,.2f} pts away</div>
+                        </div>
 
-            /* Grids → single or 2-col */
-            .grid-5,.grid-4{{grid-template-columns:1fr 1fr!important;}}
-            .snap-grid{{grid-template-columns:1fr 1fr!important;gap:8px;}}
-            .card-grid{{gap:8px;}}
+                        <!-- LTP chip -->
+                        <div style="background:rgba(79,195,247,0.12);border:1px solid rgba(79,195,247,0.35);border-radius:3px;padding:6px 8px;text-align:center;width:100%;">
+                            <div style="font-size:8px;letter-spacing:2px;font-weight:700;color:#00c8ff;margin-bottom:3px;">LTP</div>
+                            <div style="font-family:'Orbitron',monospace;font-size:13px;font-weight:700;color:#80deea;">&#8377;{cp:,.2f}</div>
+                        </div>
 
-            /* OI table: full horizontal scroll */
-            .oi-table-wrap{{overflow-x:auto;-webkit-overflow-scrolling:touch;}}
-            .oi-table{{min-width:520px;}}
-            .oi-table thead th,.oi-table tbody td{{padding:7px 8px;font-size:10px;}}
-            .oi-table-scroll-hint{{display:flex;}}
-            .oi-view-btn{{padding:5px 10px;font-size:9px;}}
+                    </div>
 
-            /* OI summary strip */
-            .oi-summary-strip{{grid-template-columns:1fr 1fr;gap:8px;}}
-            .oi-stat-strip{{grid-template-columns:1fr 1fr;gap:8px;}}
-            .oi-controls{{flex-direction:column;gap:8px;align-items:flex-start;}}
-            .oi-chart-wrap{{padding:10px;}}
+                    <!-- RIGHT: Support S1 / S2 / S3 — NEAREST S is dynamic -->
+                    <div style="background:#07111c;padding:12px 14px;">
+                        <!-- S1 -->
+                        <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;{'background:rgba(0,230,118,0.04);border-radius:2px;' if nearest_s_lbl=='S1' else ''}margin-bottom:1px;">
+                            <div style="display:flex;align-items:center;gap:4px;">
+                                {'<span style="color:#26c6da;font-size:11px;">&#9660;</span>' if nearest_s_lbl=='S1' else ''}
+                                {'<span style="font-size:7px;font-weight:700;padding:1px 5px;border-radius:2px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.28);color:#00e676;letter-spacing:0.5px;">NEAREST S</span>' if nearest_s_lbl=='S1' else ''}
+                            </div>
+                            <div style="display:flex;align-items:center;gap:4px;">
+                                <span style="font-size:9px;font-weight:700;padding:2px 7px;border-radius:2px;background:rgba(0,230,118,{'0.18' if nearest_s_lbl=='S1' else '0.06'});color:{'#00e676' if nearest_s_lbl=='S1' else 'rgba(0,200,100,0.5)'};border:1px solid rgba(0,230,118,{'0.4' if nearest_s_lbl=='S1' else '0.15'});">S1</span>
+                                <span style="font-family:'Orbitron',monospace;font-size:{'14' if nearest_s_lbl=='S1' else '12'}px;font-weight:700;color:{'#00e676' if nearest_s_lbl=='S1' else 'rgba(105,240,174,0.45)'};">&#8377;{s1p:,.2f}</span>
+                            </div>
+                        </div>
+                        <!-- S2 -->
+                        <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;border-bottom:1px solid rgba(0,230,118,0.1);border-top:1px solid rgba(0,230,118,0.07);{'background:rgba(0,230,118,0.04);border-radius:2px;' if nearest_s_lbl=='S2' else ''}">
+                            <div style="display:flex;align-items:center;gap:4px;">
+                                {'<span style="color:#26c6da;font-size:11px;">&#9660;</span>' if nearest_s_lbl=='S2' else ''}
+                                {'<span style="font-size:7px;font-weight:700;padding:1px 5px;border-radius:2px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.28);color:#00e676;letter-spacing:0.5px;">NEAREST S</span>' if nearest_s_lbl=='S2' else ''}
+                            </div>
+                            <div style="display:flex;align-items:center;gap:4px;">
+                                <span style="font-size:9px;font-weight:700;padding:2px 7px;border-radius:2px;background:rgba(0,230,118,{'0.18' if nearest_s_lbl=='S2' else '0.08'});color:{'#00e676' if nearest_s_lbl=='S2' else 'rgba(0,200,100,0.8)'};border:1px solid rgba(0,230,118,{'0.4' if nearest_s_lbl=='S2' else '0.18'});">S2</span>
+                                <span style="font-family:'Orbitron',monospace;font-size:{'14' if nearest_s_lbl=='S2' else '13'}px;font-weight:700;color:{'#00e676' if nearest_s_lbl=='S2' else 'rgba(105,240,174,0.85)'};">&#8377;{s2p:,.2f}</span>
+                            </div>
+                        </div>
+                        <!-- S3 -->
+                        <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;{'background:rgba(0,230,118,0.04);border-radius:2px;' if nearest_s_lbl=='S3' else ''}">
+                            <div style="display:flex;align-items:center;gap:4px;">
+                                {'<span style="color:#26c6da;font-size:11px;">&#9660;</span>' if nearest_s_lbl=='S3' else ''}
+                                {'<span style="font-size:7px;font-weight:700;padding:1px 5px;border-radius:2px;background:rgba(0,230,118,0.1);border:1px solid rgba(0,230,118,0.28);color:#00e676;letter-spacing:0.5px;">NEAREST S</span>' if nearest_s_lbl=='S3' else ''}
+                            </div>
+                            <div style="display:flex;align-items:center;gap:4px;">
+                                <span style="font-size:9px;font-weight:700;padding:2px 7px;border-radius:2px;background:rgba(0,230,118,{'0.18' if nearest_s_lbl=='S3' else '0.05'});color:{'#00e676' if nearest_s_lbl=='S3' else 'rgba(0,230,118,0.5)'};border:1px solid rgba(0,230,118,{'0.4' if nearest_s_lbl=='S3' else '0.12'});">S3</span>
+                                <span style="font-family:'Orbitron',monospace;font-size:{'14' if nearest_s_lbl=='S3' else '12'}px;font-weight:700;color:{'#00e676' if nearest_s_lbl=='S3' else 'rgba(105,240,174,0.45)'};">&#8377;{s3p:,.2f}</span>
+                            </div>
+                        </div>
+                    </div>
 
-            /* NC / OI navy */
-            .nc-cards-grid{{grid-template-columns:1fr!important;gap:8px;}}
-            .nc-section-header{{flex-direction:column;align-items:flex-start;}}
-            .nc-meters-panel{{width:100%;min-width:unset;}}
-            .nc-meter-track{{width:100%;max-width:100%;}}
-            .nc-dir-name{{font-size:18px;}}
-            .nc-wrap{{padding:0;}}
+                </div>
+            </div>
 
-            /* Key levels */
-            div[style*="grid-template-columns:1fr 1fr"]{{grid-template-columns:1fr!important;}}
+            <!-- ── FOOTER BAR ──────────────────────────────────────────────── -->
+            <div style="background:rgba(0,0,0,0.45);border-top:1px solid rgba(0,200,255,0.1);padding:8px 18px;display:flex;justify-content:space-between;align-items:center;">
+                <span style="font-size:9px;font-weight:600;color:rgba(200,216,224,0.65);letter-spacing:1px;">Traditional &middot; Daily Candle</span>
+                <span style="font-size:9px;color:rgba(79,195,247,0.6);font-weight:700;letter-spacing:1px;">LTP &#8377;{cp:,.2f}</span>
+            </div>
 
-            /* FII / DII */
-            .pf-grid{{grid-template-columns:1fr 1fr!important;gap:8px;}}
-            .pf-avg-strip{{grid-template-columns:1fr;gap:0;padding:12px;}}
-            .pf-avg-sep{{display:none;}}
-            .pf-avg-cell{{display:flex;align-items:center;justify-content:space-between;padding:8px 0;border-bottom:1px solid rgba(79,195,247,0.07);}}
-            .pf-avg-cell:last-child{{border-bottom:none;}}
-            .pf-date-range{{display:none;}}
+        </div>"""
 
-            /* Market direction */
-            .md-row-top,.md-row-bottom{{flex-direction:column;align-items:flex-start;}}
-            .md-direction{{font-size:22px;}}
+        return f"""
+    <div class="section">
+        <div class="section-title"><span>&#128204;</span> OPTION CHAIN &amp; PIVOT POINTS</div>
+        <div style="display:flex;gap:2px;flex-wrap:wrap;background:rgba(0,200,255,0.06);border:1px solid rgba(0,200,255,0.15);border-radius:6px;overflow:hidden;">
+            {oc_panel if d['has_option_data'] else '<div style="color:#8faabe;font-size:13px;padding:16px;">Option data unavailable</div>'}
+            {pv_panel}
+        </div>
+    </div>
+"""
 
-            /* Strategy checklist */
-            .o5-grid{{grid-template-columns:1fr!important;}}
-            .o5-top-banner{{flex-direction:column;align-items:flex-start;}}
-            .strat-grid-legacy{{grid-template-columns:1fr!important;}}
-            .sc-compact-grid{{grid-template-columns:1fr!important;}}
-            .sc-dp-grid{{grid-template-columns:1fr 1fr;}}
-            .logic-grid{{grid-template-columns:1fr;}}
+    def _key_levels_visual_section(self, d, _pct_cp, _pts_to_res, _pts_to_sup, _mp_node):
+        mp_row = f'<tr><td style="color:#ffb74d;">&#127919; Max Pain</td><td style="color:#ffb74d;">&#8377;{d["max_pain"]:,}</td></tr>' if d['has_option_data'] else ''
+        return f"""
+    <div class="section">
+        <div class="section-title"><span>&#128202;</span> KEY LEVELS</div>
 
-            /* Pre-trade checklist */
-            .ptc-item{{padding:10px 12px;gap:10px;}}
-            .ptc-text{{font-size:13px;}}
-            .ptc-mindset-box{{flex-direction:column;gap:10px;}}
+        <!-- Desktop/Tablet: visual bar (hidden on mobile <520px) -->
+        <div class="kl-bar-section">
+            <div style="display:flex;justify-content:space-between;margin-bottom:8px;">
+                <span style="font-size:11px;color:#26c6da;font-weight:700;letter-spacing:1px;">&#9668; SUPPORT ZONE</span>
+                <span style="font-size:11px;color:#f44336;font-weight:700;letter-spacing:1px;">RESISTANCE ZONE &#9658;</span>
+            </div>
+            <div style="position:relative;height:62px;">
+                <div class="rl-node-a" style="left:3%;"><div class="rl-lbl" style="color:#26c6da;">Strong<br>Support</div><div class="rl-val" style="color:#26c6da;">&#8377;{d['strong_support']:,.0f}</div><div class="rl-dot" style="background:#26c6da;margin:6px auto 0;"></div></div>
+                <div class="rl-node-a" style="left:22%;"><div class="rl-lbl" style="color:#00bcd4;">Support</div><div class="rl-val" style="color:#00bcd4;">&#8377;{d['support']:,.0f}</div><div class="rl-dot" style="background:#00bcd4;box-shadow:0 0 8px #00bcd4;margin:6px auto 0;"></div></div>
+                <div style="position:absolute;left:{_pct_cp}%;transform:translateX(-50%);bottom:4px;background:#4fc3f7;color:#000;font-size:11px;font-weight:700;padding:4px 13px;border-radius:6px;white-space:nowrap;z-index:10;box-shadow:0 0 16px rgba(79,195,247,0.7);">&#9660; NOW &nbsp;&#8377;{d['current_price']:,.0f}</div>
+                <div class="rl-node-a" style="left:75%;"><div class="rl-lbl" style="color:#ff7043;">Resistance</div><div class="rl-val" style="color:#ff7043;">&#8377;{d['resistance']:,.0f}</div><div class="rl-dot" style="background:#ff7043;box-shadow:0 0 8px #ff7043;margin:6px auto 0;"></div></div>
+                <div class="rl-node-a" style="left:95%;"><div class="rl-lbl" style="color:#f44336;">Strong<br>Resistance</div><div class="rl-val" style="color:#f44336;">&#8377;{d['strong_resistance']:,.0f}</div><div class="rl-dot" style="background:#f44336;margin:6px auto 0;"></div></div>
+            </div>
+            <div style="position:relative;height:8px;border-radius:4px;background:linear-gradient(90deg,#26c6da 0%,#00bcd4 20%,#4fc3f7 40%,#ffb74d 58%,#ff7043 76%,#f44336 100%);box-shadow:0 2px 14px rgba(0,0,0,0.5);">
+                <div style="position:absolute;left:{_pct_cp}%;top:50%;transform:translate(-50%,-50%);width:4px;height:22px;background:#fff;border-radius:2px;box-shadow:0 0 16px rgba(255,255,255,1);z-index:10;"></div>
+            </div>
+            <div style="position:relative;height:58px;">{_mp_node}</div>
+        </div>
 
-            /* Heatmap */
-            .hm-grid{{grid-template-columns:repeat(5,minmax(0,1fr))!important;gap:4px;}}
-            .hm-cell{{min-height:56px;padding:6px 4px;}}
-            .hm-cell-sym{{font-size:9px;}}
-            .hm-cell-price{{font-size:7px;}}
-            .hm-cell-chg{{font-size:9px;}}
-            .hm-breadth-strip{{flex-direction:column;gap:12px;padding:14px;}}
-            .hm-bs-donut-wrap{{align-self:center;}}
+        <!-- Mobile: compact table (shown only on <520px) -->
+        <table class="kl-mobile-table">
+            <tr><td style="color:#26c6da;">&#9660; Strong Support</td><td style="color:#26c6da;">&#8377;{d['strong_support']:,.0f}</td></tr>
+            <tr><td style="color:#00bcd4;">&#9660; Support (S1)</td><td style="color:#00bcd4;">&#8377;{d['support']:,.0f}</td></tr>
+            <tr><td style="color:#4fc3f7;font-weight:700;">&#9654; NOW</td><td style="color:#4fc3f7;font-weight:700;">&#8377;{d['current_price']:,.0f}</td></tr>
+            {mp_row}
+            <tr><td style="color:#ff7043;">&#9650; Resistance (R1)</td><td style="color:#ff7043;">&#8377;{d['resistance']:,.0f}</td></tr>
+            <tr><td style="color:#f44336;">&#9650; Strong Resistance</td><td style="color:#f44336;">&#8377;{d['strong_resistance']:,.0f}</td></tr>
+        </table>
 
-            /* Disclaimer */
-            .disc-text{{white-space:normal;font-size:11px;}}
+        <div style="display:grid;grid-template-columns:1fr 1fr;gap:10px;margin-top:12px;">
+            <div style="background:rgba(244,67,54,0.08);border:1px solid rgba(244,67,54,0.25);border-radius:8px;padding:10px 16px;display:flex;justify-content:space-between;align-items:center;flex-wrap:wrap;gap:4px;">
+                <span style="font-size:12px;color:#c8d8e0;">&#128205; To Resistance</span>
+                <span style="font-size:15px;font-weight:700;color:#f44336;">+{_pts_to_res:,} pts</span>
+            </div>
+            <div style="background:rgba(0,188,212,0.08);border:1px solid rgba(0,188,212,0.25);border-radius:8px;padding:10px 16px;display:flex;justify-content:space-between;align-items:center;flex-wrap:wrap;gap:4px;">
+                <span style="font-size:12px;color:#c8d8e0;">&#128205; To Support</span>
+                <span style="font-size:15px;font-weight:700;color:#00bcd4;">\u2212{_pts_to_sup:,} pts</span>
+            </div>
+        </div>
+    </div>
+"""
 
-            /* Footer */
-            .footer{{padding:16px 12px;font-size:11px;}}
-        }}
+    def generate_html_email(self, vol_support=None, vol_resistance=None, global_bias=None, vol_view="normal",
+                            profile="web", assets=None):
+        """The whole report as one string (''.join of iter_html_parts)."""
+        return ''.join(self.iter_html_parts(vol_support, vol_resistance, global_bias, vol_view, profile, assets))
 
-        @media(max-width:480px){{
-            .hb-title-main{{font-size:12px;}}
-            .hb-s-item{{font-size:8px;}}
-            .grid-5,.grid-4{{grid-template-columns:1fr!important;}}
-            .snap-grid{{grid-template-columns:1fr!important;}}
-            .pf-grid{{grid-template-columns:1fr!important;}}
-            .oi-summary-strip{{grid-template-columns:1fr 1fr;}}
-            .hm-grid{{grid-template-columns:repeat(4,minmax(0,1fr))!important;}}
-            .tab-btn{{padding:9px 9px;font-size:9px;letter-spacing:0.5px;}}
-        }}
+    def iter_html_parts(self, vol_support=None, vol_resistance=None, global_bias=None, vol_view="normal",
+                        profile="web", assets=None):
+        """Yields the report in order, section by section: the full interactive page (profile="web")
+        or the static summary for mail clients (profile="email").
 
-        @media(max-width:360px){{
-            .hb-title-main{{font-size:11px;}}
-            .oi-summary-strip{{grid-template-columns:1fr;}}
-            .hm-grid{{grid-template-columns:repeat(3,minmax(0,1fr))!important;}}
-            .nsb-mob-title{{font-size:11px;}}
-        }}
-    </style>
-    <script>
-    // Instant-hide: if we're restoring from auto-refresh, hide body BEFORE it renders
-    // This prevents the flash/jump to top that occurs when JS runs after first paint
-    try {{
-        if (sessionStorage.getItem('scrollY')) {{
-            document.documentElement.style.opacity = '0';
-            document.documentElement.style.overflow = 'hidden';
-        }}
-    }} catch(e) {{}}
-    </script>
-</head>
-<body>
-<div class="container">
-    <div class="header">
+        assets — hrefs from build_static_assets(); the web page links them instead of inlining CSS/JS."""
+        d=self.html_data
+        # ── Header derived values ─────────────────────────────────────────
+        # Expiry countdown
+        try:
+            from datetime import datetime as _dt
+            expiry_dt = _dt.strptime(d.get('expiry',''), '%d-%b-%Y')
+            days_left = (expiry_dt.date() - _dt.now().date()).days
+            expiry_days_str = f"{days_left}d left" if days_left >= 0 else "Expired"
+            expiry_days_col = '#00e676' if days_left > 3 else ('#ff9800' if days_left > 0 else '#ff4757')
+        except Exception:
+            expiry_days_str = '—'; expiry_days_col = '#ffb74d'
+        # VIX
+        vix_val   = d.get('vix_val')
+        vix_trend = d.get('vix_trend','')
+        vix_str   = f"{vix_val:.1f}" if vix_val else 'N/A'
+        vix_arrow = ' ▲' if vix_trend == 'rising' else (' ▼' if vix_trend == 'falling' else '')
+        vix_col   = '#ff9800' if vix_val and vix_val > 16 else ('#00e676' if vix_val and vix_val < 13 else '#ffb74d')
+        # FII/DII net
+        fii_summ  = d.get('fii_dii_summ', {})
+        fii_avg   = fii_summ.get('fii_avg', 0)
+        dii_avg   = fii_summ.get('dii_avg', 0)
+        fii_col   = '#ff4757' if fii_avg < 0 else '#00e676'
+        dii_col   = '#00e676' if dii_avg >= 0 else '#ff4757'
+        fii_hdr   = f"{'+'if fii_avg>=0 else ''}{fii_avg:,.0f}Cr"
+        dii_hdr   = f"{'+'if dii_avg>=0 else ''}{dii_avg:,.0f}Cr"
+        # Global bias
+        gb_str  = (global_bias or 'N/A').upper()
+        gb_col  = '#00e676' if gb_str=='BULLISH' else ('#ff4757' if gb_str=='BEARISH' else '#ffb74d')
+        # Spot + PCR colours
+        pcr_v   = d.get('pcr', 1.0) if d.get('has_option_data') else 1.0
+        pcr_col = '#00e676' if pcr_v > 1.1 else ('#ff4757' if pcr_v < 0.9 else '#ffb74d')
+        sma20_bar ='bar-teal' if d['sma_20_above']  else 'bar-red'
+        sma50_bar ='bar-teal' if d['sma_50_above']  else 'bar-red'
+        sma200_bar='bar-teal' if d['sma_200_above'] else 'bar-red'
+        macd_bar  ='bar-teal' if d['macd_bullish']  else 'bar-red'
+        sma20_badge ='bullish' if d['sma_20_above']  else 'bearish'
+        sma50_badge ='bullish' if d['sma_50_above']  else 'bearish'
+        sma200_badge='bullish' if d['sma_200_above'] else 'bearish'
+        macd_badge  ='bullish' if d['macd_bullish']  else 'bearish'
+        sma20_lbl ='Above'  if d['sma_20_above']  else 'Below'
+        sma50_lbl ='Above'  if d['sma_50_above']  else 'Below'
+        sma200_lbl='Above'  if d['sma_200_above'] else 'Below'
+        macd_lbl  ='Bullish' if d['macd_bullish']  else 'Bearish'
+        sma20_ico ='\u2705' if d['sma_20_above']  else '\u274c'
+        sma50_ico ='\u2705' if d['sma_50_above']  else '\u274c'
+        sma200_ico='\u2705' if d['sma_200_above'] else '\u274c'
+        macd_ico  ='\U0001f7e2' if d['macd_bullish'] else '\U0001f534'
+        # ── Technical Indicators: Option A pill strip ────────────────────
+        def _pill(lbl, val, badge, badge_cls):
+            if   badge_cls == 'bullish': col='#00e676'; bg='rgba(0,230,118,0.08)';  bdr='rgba(0,230,118,0.25)';  bdg_bg='rgba(0,230,118,0.14)';  bdg_col='#00e676'
+            elif badge_cls == 'bearish': col='#ff4757'; bg='rgba(255,71,87,0.08)';  bdr='rgba(255,71,87,0.25)';  bdg_bg='rgba(255,71,87,0.14)';  bdg_col='#ff4757'
+            else:                        col='#ffb74d'; bg='rgba(255,183,77,0.07)'; bdr='rgba(255,183,77,0.22)'; bdg_bg='rgba(255,183,77,0.14)'; bdg_col='#ffb74d'
+            return (
+                f'<div style="display:flex;align-items:center;gap:7px;padding:6px 13px;border-radius:20px;'
+                f'border:1px solid {bdr};background:{bg};white-space:nowrap;">'
+                f'<span style="font-size:9px;letter-spacing:1.5px;color:rgba(128,222,234,0.6);text-transform:uppercase;">{lbl}</span>'
+                f'<span style="font-family:JetBrains Mono,monospace;font-size:13px;font-weight:700;color:{col};">{val}</span>'
+                f'<span style="font-size:8px;font-weight:700;padding:1px 7px;border-radius:8px;letter-spacing:0.5px;'
+                f'background:{bdg_bg};color:{bdg_col};">{badge}</span>'
+                f'</div>'
+            )
+        rsi_val   = d['rsi'];      rsi_badge_cls = 'bullish' if rsi_val < 30 else ('bearish' if rsi_val > 70 else 'neutral')
+        rsi_badge = d['rsi_status']
+        tech_pills = (
+            _pill('RSI 14',    f"{d['rsi']:.1f}",          rsi_badge,   rsi_badge_cls) +
+            _pill('SMA 20',    f"\u20b9{d['sma_20']:,.0f}", sma20_lbl,   sma20_badge) +
+            _pill('SMA 50',    f"\u20b9{d['sma_50']:,.0f}", sma50_lbl,   sma50_badge) +
+            _pill('SMA 200',   f"\u20b9{d['sma_200']:,.0f}",sma200_lbl,  sma200_badge) +
+            _pill('MACD',      f"{d['macd']:.0f}",          macd_lbl,    macd_badge)
+        )
+        if d.get('has_option_data'):
+            pcr_v = d.get('pcr', 1.0)
+            pcr_badge_cls = 'bullish' if pcr_v > 1.1 else ('bearish' if pcr_v < 0.9 else 'neutral')
+            pcr_lbl = 'Bullish' if pcr_v > 1.1 else ('Bearish' if pcr_v < 0.9 else 'Neutral')
+            tech_pills += _pill('PCR', f"{pcr_v:.3f}", pcr_lbl, pcr_badge_cls)
+        tech_cards = tech_pills  # kept same variable name so injection point unchanged
+        oc_cards = self._build_enhanced_oc_cards()
+        _cp  = d['current_price']
+        _ss  = d['strong_support']    if d.get('strong_support')    is not None else (_cp - 300)
+        _sr  = d['strong_resistance'] if d.get('strong_resistance') is not None else (_cp + 300)
+        _rng = (_sr - _ss) if _sr != _ss else 1
+        def _pct_real(val): return round(max(3,min(97,(val-_ss)/_rng*100)),2)
+        _pct_cp     = _pct_real(_cp)
+        _pts_to_res = int(d['resistance'] - _cp) if d.get('resistance') is not None else 0
+        _pts_to_sup = int(_cp - d['support'])     if d.get('support')    is not None else 0
+        _mp_node=""
+        if d['has_option_data']:
+            _mp_node=(f'<div class="rl-node-b" style="left:43%;">'
+                      f'<div class="rl-dot" style="background:#ffb74d;box-shadow:0 0 8px #ffb74d;margin:0 auto 5px;"></div>'
+                      f'<div class="rl-lbl" style="color:#ffb74d;">Max Pain</div>'
+                      f'<div class="rl-val" style="color:#ffb74d;">\u20b9{d["max_pain"]:,}</div></div>')
 
-        <!-- Banner row: brand + live market chips -->
-        <div class="hb-banner">
+        # ── Banner row (shared by the web page and the email profile) ──
+        banner_html = f"""        <div class="hb-banner">
             <div class="hb-left">
                 <span class="hb-nse-badge">NSE</span>
                 <div>
@@ -7980,13 +9533,75 @@ function mobNavTo(secId, tabId, label) {
                     <div class="hb-chip-val" style="color:{expiry_days_col};">{expiry_days_str}</div>
                 </div>
             </div>
-        </div>
+        </div>"""
+
+        # ── Static summary sections (web main tab + email profile) ──
+        sec = self.sections
+        summary_parts = [('signal_bar', sec.render('signal_bar', d, self._signal_summary_bar_html))]
+        if d['has_option_data']:
+            summary_parts.append(('oi_navy', '<div id="sec-oi">' + sec.render('oi_navy', d, lambda: self._oi_navy_command_section(d)) + '</div>'))
+        summary_parts.append(('keylevels', '<div id="sec-keylevels">' + self._key_levels_visual_section(d,_pct_cp,_pts_to_res,_pts_to_sup,_mp_node) + '</div>'))
+        summary_parts.append(('oc_pivot', sec.render('oc_pivot', d, lambda: self._option_chain_pivot_section_html(d))))
+        summary_parts.append(('fiidii', '<div id="sec-fiidii">' + sec.render('fiidii', d, self._fiidii_section_html) + '</div>'))
+
+        if profile == "email":
+            yield self._email_report_html(d, banner_html, ''.join(h for _, h in summary_parts), gb_str, gb_col,
+                                          fii_hdr, fii_col, dii_hdr, dii_col)
+            return
+
+        # ── Web page: hydratable sections are wrapped by _fragment() ──
+        self.fragments = {}
+        status_html = f"""<div class="hb-s-item">
+                &#127760; Global <span class="hb-s-val" style="color:{gb_col};">{gb_str}</span>
+            </div>
+            <div class="hb-s-item">
+                &#127982; FII <span class="hb-s-val" style="color:{fii_col};">{fii_hdr}</span>
+            </div>
+            <div class="hb-s-item">
+                &#127982; DII <span class="hb-s-val" style="color:{dii_col};">{dii_hdr}</span>
+            </div>"""
+
+        # ── Static CSS/JS: hashed asset files when built, else inline ──
+        if assets:
+            style_html   = f'<link rel="stylesheet" href="{assets["css"]}">'
+            scripts_html = ''.join(f'\n<script src="{src}"></script>\n' for src in assets['js'])
+        else:
+            style_html   = f"<style>\n{get_report_css()}\n    </style>"
+            scripts_html = ("\n<script>" + get_report_javascript() + "</script>\n"
+                            + f"\n<script>\n{get_heatmap_javascript()}\n</script>\n")
+
+        yield f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <meta name="report-shell" content="{self.sections.version}">
+    <title>Nifty 50 OI Analysis</title>
+    <link href="https://fonts.googleapis.com/css2?family=Oxanium:wght@400;600;700;800&family=Rajdhani:wght@400;500;600;700&family=JetBrains+Mono:wght@400;600;700&family=Outfit:wght@300;400;500;600;700&family=Space+Mono:wght@400;700&family=Orbitron:wght@700;900&display=swap" rel="stylesheet">
+    {style_html}
+    <script>
+    // Instant-hide: if we're restoring from auto-refresh, hide body BEFORE it renders
+    // This prevents the flash/jump to top that occurs when JS runs after first paint
+    try {{
+        if (sessionStorage.getItem('scrollY')) {{
+            document.documentElement.style.opacity = '0';
+            document.documentElement.style.overflow = 'hidden';
+        }}
+    }} catch(e) {{}}
+    </script>
+</head>
+<body>
+<div class="container">
+    <div class="header">
+
+        <!-- Banner row: brand + live market chips -->
+{self._fragment('banner', banner_html)}
 
         <!-- Status row: generated, clock, refresh, global bias, FII/DII -->
         <div class="hb-status">
             <div class="hb-s-item">
                 <div class="hb-s-dot" style="background:#00e676;box-shadow:0 0 6px #00e676;"></div>
-                Generated <span class="hb-s-val" id="hb-gen">{d['timestamp']}</span>
+                Generated <span class="hb-s-val" id="hb-gen" data-stamp="report-ts">{d['timestamp']}</span>
             </div>
             <div class="hb-s-item">
                 <div class="hb-s-dot" style="background:#4fc3f7;box-shadow:0 0 6px #4fc3f7;"></div>
@@ -7996,15 +9611,7 @@ function mobNavTo(secId, tabId, label) {
                 <div class="hb-s-dot" style="background:#b388ff;box-shadow:0 0 6px #b388ff;"></div>
                 Next Refresh <span class="hb-s-val" style="color:#b388ff;" id="refresh-countdown">30s</span>
             </div>
-            <div class="hb-s-item">
-                &#127760; Global <span class="hb-s-val" style="color:{gb_col};">{gb_str}</span>
-            </div>
-            <div class="hb-s-item">
-                &#127982; FII <span class="hb-s-val" style="color:{fii_col};">{fii_hdr}</span>
-            </div>
-            <div class="hb-s-item">
-                &#127982; DII <span class="hb-s-val" style="color:{dii_col};">{dii_hdr}</span>
-            </div>
+            {self._fragment('status', status_html)}
         </div>
 
         <!-- Tabs -->
@@ -8119,41 +9726,58 @@ function mobNavTo(secId, tabId, label) {
     <!-- TAB 1: MAIN ANALYSIS -->
     <div class="tab-panel active" id="tab-main">
 """
-        html += self._signal_summary_bar_html()
-        if d['has_option_data']:
-            html += '<div id="sec-oi">' + self._oi_navy_command_section(d) + '</div>'
-        html += '<div id="sec-keylevels">' + self._key_levels_visual_section(d,_pct_cp,_pts_to_res,_pts_to_sup,_mp_node) + '</div>'
-        html += self._option_chain_pivot_section_html(d)
-        html += '<div id="sec-fiidii">' + self._fiidii_section_html() + '</div>'
-        html += '<div id="sec-direction">' + self._market_direction_widget_html() + '</div>'
-        html += f"""
+        yield ''.join(self._fragment(name, part) for name, part in summary_parts)
+        yield self._fragment('direction', '<div id="sec-direction">' + sec.render('direction', d, self._market_direction_widget_html) + '</div>')
+        yield self._fragment('technical', f"""
         <div class="section" id="sec-technical">
             <div class="section-title"><span>&#128269;</span> TECHNICAL INDICATORS</div>
             <div style="display:flex;align-items:center;flex-wrap:wrap;gap:7px;padding:4px 0;">
                 {tech_cards}
             </div>
         </div>
-"""
+""")
         if d['has_option_data']:
-            html += f"""
+            yield self._fragment('optchain', f"""
         <div class="section" id="sec-optchain">
             <div class="section-title"><span>&#127919;</span> OPTION CHAIN ANALYSIS <span style="font-size:11px;color:#80deea;font-weight:400;letter-spacing:1px;">(ATM \u00b110 Strikes Only)</span></div>
-            {self._top10_oi_widget_html(d)}
+            {sec.render('top10_oi', d, lambda: self._top10_oi_widget_html(d))}
             <div class="card-grid grid-4">{oc_cards}</div>
+            {self._full_chain_html(d)}
         </div>
-"""
-        html += """
+""")
+        yield """
         <div class="section">
             <div class="disclaimer"><span class="disc-icon">⚠️</span><span class="disc-label">Disclaimer</span><span class="disc-sep">|</span><span class="disc-text">For <strong>EDUCATIONAL purposes only</strong> \u2014 NOT financial advice.</span><span class="disc-sep">|</span><span class="disc-text">Always use stop losses &amp; consult a SEBI registered advisor.</span><span class="disc-sep">|</span><span class="disc-text">Past performance does not guarantee future results.</span></div>
         </div>
     </div><!-- /tab-main -->
 """
-        html += heatmap_tab_html
-        html += intraday_oi_tab_html
-        html += weekly_outlook_tab_html
-        html += checklist_tab_html
-        html += pretrade_tab_html
-        html += """
+        # ── Secondary tabs: each built only when the stream reaches it ──
+        # Heatmap tab
+        heatmap_args = (
+            self.heatmap_data,
+            self.heatmap_timestamp,
+            self.heatmap_advance,
+            self.heatmap_decline,
+            self.heatmap_neutral,
+        )
+        yield self._fragment('heatmap_tab', sec.render('heatmap_tab', d, lambda: build_heatmap_tab_html(*heatmap_args),
+                                                       *heatmap_args))
+        yield self._fragment('oi_trend_tab', sec.render('oi_trend_tab', d, build_intraday_oi_tab_html))
+
+        # Weekly Outlook tab
+        weekly_outlook_data = compute_weekly_outlook(d, vix_val=d.get('vix_val'), candles=self.candles,
+                                                     history=self.daily_history)
+        self.weekly_outlook = weekly_outlook_data
+        yield self._fragment('weekly_tab', sec.render('weekly_tab', d, lambda: build_weekly_outlook_tab_html(weekly_outlook_data),
+                                                      weekly_outlook_data))
+
+        yield self._fragment('checklist_tab', build_strategy_checklist_html(
+            d, vol_support=vol_support, vol_resistance=vol_resistance,
+            global_bias=global_bias, vol_view=vol_view,
+            vix_val=d.get('vix_val'), vix_trend=d.get('vix_trend')
+        ))
+        yield self._fragment('pretrade_tab', sec.render('pretrade_tab', d, build_pretrade_checklist_tab_html))
+        yield """
     <div class="footer">
         <p>Automated Nifty 50 · Option Chain + Technical + Heatmap + Intraday OI Trend + Weekly Outlook + Strategy Checklist</p>
         <p style="margin-top:6px;">&#169; 2026 · Deep Ocean Theme · Navy Command OI · Pulse Flow FII/DII · IST Timestamps · For Educational Purposes Only</p>
@@ -8187,21 +9811,163 @@ function mobNavTo(secId, tabId, label) {
 """
         # Inject current bias as JS variable so renderOITable can read it
         bias_val = d.get('bias', 'SIDEWAYS')
-        html += f'\n<script>\nvar _CURRENT_BIAS = "{bias_val}";\n</script>\n'
-        html += all_js
-        html += f"\n<script>\n{heatmap_js}\n</script>\n"
-        html += "\n</body></html>"
-        return html
+        yield f'\n<script>\nvar _CURRENT_BIAS = "{bias_val}";\n</script>\n'
+        yield scripts_html
+        yield "\n</body></html>"
+
+    def _fragment(self, name, html):
+        """Marks a hydratable web section with <!--sec:name:digest--> comments and records it."""
+        import hashlib
+        digest = hashlib.sha1(html.encode('utf-8')).hexdigest()[:12]
+        self.fragments[name] = (digest, html)
+        return f"<!--sec:{name}:{digest}-->{html}<!--/sec:{name}-->"
+
+    def save_report_data(self, out_dir='.'):
+        """
+        Writes the per-run payload an open page hydrates from: every section's
+        digest, the HTML of the sections that changed since the previous run,
+        the per-run stamps and the bias. index.html itself is still rewritten
+        every run — it is the cold-load document — but open pages never
+        re-fetch it.
+        """
+        filename = os.path.join(out_dir, REPORT_DATA_FILE)
+        try:
+            try:
+                with open(REPORT_DIGESTS, encoding='utf-8') as f:
+                    previous = json.load(f)
+            except (OSError, ValueError):
+                previous = {}
+            digests = {name: dg for name, (dg, _) in self.fragments.items()}
+            changed = {name: html for name, (dg, html) in self.fragments.items() if previous.get(name) != dg}
+            OISnapshotLog._write_json(filename, {
+                'timestamp': self.html_data.get('timestamp'),
+                'stamps':    self.stamps(),
+                'shell':     self.sections.version,
+                'bias':      self.html_data.get('bias'),
+                'sections':  digests,
+                'html':      changed,
+            })
+            os.makedirs(os.path.dirname(REPORT_DIGESTS) or ".", exist_ok=True)
+            OISnapshotLog._write_json(REPORT_DIGESTS, digests)
+            size = os.path.getsize(filename)
+            print(f"   ✅ Saved {filename} ({size / 1024:.1f} KB, {len(changed)} of {len(digests)} sections changed)")
+            return True
+        except Exception as e:
+            print(f"   ⚠️  {filename} not written ({e}) — open pages will reload instead")
+            return False
+
+    def _email_report_html(self, d, banner_html, summary_html, gb_str, gb_col, fii_hdr, fii_col, dii_hdr, dii_col):
+        """Email profile: banner + static summary sections, only the CSS they use, no scripts or tabs."""
+        body = f"""<div class="container">
+    <div class="header">
+{banner_html}
+        <div class="hb-status">
+            <div class="hb-s-item">Generated <span class="hb-s-val">{d['timestamp']}</span></div>
+            <div class="hb-s-item">&#127760; Global <span class="hb-s-val" style="color:{gb_col};">{gb_str}</span></div>
+            <div class="hb-s-item">&#127982; FII <span class="hb-s-val" style="color:{fii_col};">{fii_hdr}</span></div>
+            <div class="hb-s-item">&#127982; DII <span class="hb-s-val" style="color:{dii_col};">{dii_hdr}</span></div>
+        </div>
+    </div>
+{summary_html}
+    <div class="footer">
+        <p>Email summary · Heatmap, Intraday OI, Weekly Outlook &amp; Strategy tabs are in the full report · For Educational Purposes Only</p>
+    </div>
+</div>"""
+        # A few sections carry scoped <style> blocks — mail clients only honour <head> styles
+        scoped = re.findall(r'<style[^>]*>(.*?)</style>', body, flags=re.S)
+        body   = re.sub(r'<style[^>]*>.*?</style>', '', body, flags=re.S)
+        body   = re.sub(r'<script\b.*?</script>', '', body, flags=re.S)
+        css    = '\n'.join([get_email_css(body)] + [blk.strip() for blk in scoped])
+        return f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Nifty 50 OI Analysis</title>
+    <style>
+{css}
+    </style>
+</head>
+<body>
+{body}
+</body></html>"""
+
+    def _render_key(self, *args):
+        """Digest of everything iter_html_parts() reads (called with the stamps set to their marks)."""
+        import hashlib, pickle
+        inputs = (self.sections.version, self.html_data, self.daily_history, self.heatmap_data,
+                  self.heatmap_timestamp, self.heatmap_advance, self.heatmap_decline, self.heatmap_neutral, args)
+        return hashlib.sha1(pickle.dumps(inputs, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+    def stamps(self):
+        """This run's RENDER_STAMPS values."""
+        return {'report-ts': self.html_data.get('timestamp', ''), 'heatmap-ts': self.heatmap_timestamp}
+
+    def _set_stamps(self, stamps):
+        self.html_data['timestamp'], self.heatmap_timestamp = stamps['report-ts'], stamps['heatmap-ts']
+
+    def render_parts(self, vol_support=None, vol_resistance=None, global_bias=None, vol_view="normal",
+                     profile="web", assets=None, sink=None):
+        """
+        iter_html_parts() memoised per profile on its inputs, returned as the
+        list of parts (never one big string). With a file-like `sink`, each
+        part is written as soon as it is produced — or replayed from the cache.
+        The run's timestamps are rendered as stamp marks and filled in after
+        the cache lookup, so only a change in the data itself re-renders.
+        """
+        args   = (vol_support, vol_resistance, global_bias, vol_view, profile, assets)
+        stamps = self.stamps()
+        self._set_stamps({name: _stamp_mark(name) for name in RENDER_STAMPS})
+        try:
+            try:
+                key = self._render_key(*args)
+            except Exception as e:
+                print(f"  ⚠️  Render cache key failed ({e}) — rendering uncached")
+                key = None
+            cached_key, cached_parts = self._render_cache.get(profile, (None, None))
+            if key is not None and key == cached_key:
+                print(f"  ♻️  {profile.title()} report unchanged since last render — reusing it")
+                parts = [_fill_stamps(p, stamps) for p in cached_parts]
+                if sink is not None:
+                    sink.writelines(parts)
+                return parts
+            t0     = time.perf_counter()
+            marked = []
+            for part in self.iter_html_parts(*args):
+                marked.append(part)
+                if sink is not None:
+                    sink.write(_fill_stamps(part, stamps))
+        finally:
+            self._set_stamps(stamps)
+        parts = [_fill_stamps(p, stamps) for p in marked]
+        ms    = round((time.perf_counter() - t0) * 1000, 1)
+        if profile == "web":
+            self.render_ms = ms
+        size = sum(len(p) for p in parts)
+        print(f"  🖨️  {profile.title()} report rendered in {ms:.0f} ms ({size / 1024:.0f} KB, {len(parts)} parts)")
+        print(self.sections.report())
+        self._render_cache[profile] = (key, marked)
+        return parts
+
+    def render_report(self, vol_support=None, vol_resistance=None, global_bias=None, vol_view="normal",
+                      profile="web", assets=None):
+        """render_parts() joined — for consumers that need one string (the MIME body)."""
+        return ''.join(self.render_parts(vol_support, vol_resistance, global_bias, vol_view, profile, assets))
 
     def save_html_to_file(self, filename='index.html', vol_support=None, vol_resistance=None, global_bias=None, vol_view="normal"):
         try:
             print(f"\n📄 Saving HTML to {filename}...")
-            with open(filename,'w',encoding='utf-8') as f:
-                f.write(self.generate_html_email(
+            out_dir = os.path.dirname(filename) or '.'
+            assets  = build_static_assets(out_dir)
+            tmp = f"{filename}.tmp"   # streamed section by section; replaced only once complete
+            with open(tmp,'w',encoding='utf-8') as f:
+                self.render_parts(
                     vol_support=vol_support, vol_resistance=vol_resistance,
-                    global_bias=global_bias, vol_view=vol_view
-                ))
+                    global_bias=global_bias, vol_view=vol_view, assets=assets, sink=f
+                )
+            os.replace(tmp, filename)
             print(f"   ✅ Saved {filename}")
+            self.save_report_data(out_dir)
             metadata = {
                 'timestamp':         self.html_data['timestamp'],
                 'current_price':     float(self.html_data['current_price']),
@@ -8213,6 +9979,8 @@ function mobNavTo(secId, tabId, label) {
                 'risk_reward_ratio': self.html_data.get('risk_reward_ratio', 0),
                 'heatmap_advance':   self.heatmap_advance,
                 'heatmap_decline':   self.heatmap_decline,
+                'oi_seq':            self.oi_history.last_seq if self.oi_history else None,
+                'render_ms':         self.render_ms,
             }
             with open('latest_report.json','w') as f:
                 json.dump(metadata, f, indent=2)
@@ -8231,7 +9999,7 @@ function mobNavTo(secId, tabId, label) {
             msg=MIMEMultipart('alternative')
             msg['From']=gmail_user; msg['To']=f"{recipient1}, {recipient2}"
             msg['Subject']=f"📊 Nifty 50 OI & Technical Report — {ist_now.strftime('%d-%b-%Y %H:%M IST')}"
-            msg.attach(MIMEText(self.generate_html_email(vol_support,vol_resistance,global_bias,vol_view),'html'))
+            msg.attach(MIMEText(self.render_report(vol_support,vol_resistance,global_bias,vol_view,profile=EMAIL_PROFILE),'html'))
             with smtplib.SMTP_SSL('smtp.gmail.com',465) as server:
                 server.login(gmail_user,gmail_password); server.send_message(msg)
             print("   ✅ Email sent!"); return True
@@ -8244,23 +10012,45 @@ function mobNavTo(secId, tabId, label) {
         print("Nifty 50 Open Interest (OI) Analysis & Daily Sentiment Report")
         print(f"Generated: {ist_now.strftime('%d-%b-%Y %H:%M IST')}")
         print("="*70)
-        oc_data=self.fetch_nse_option_chain_silent()
+        # Per-run results start empty; a daemon reuses the analyzer across cycles
+        self.html_data, self.expiry_chains, self.daily_history = {}, {}, None
+        if self.oi_history is None or self.oi_history.day != ist_now.date():
+            self.oi_history = SnapshotHistory(day=ist_now.date())
+        # ── Fetch stage: every independent source runs concurrently ──────
+        # Only volume-at-levels waits (it needs the technical S/R levels).
+        # fetch_heatmap_data is the only yf.download() caller in the stage —
+        # yf.download keeps module-level state and is not safe to run twice at once.
+        fetched = run_fetch_stage([
+            FetchTask('option_chain',  self.fetch_nse_option_chain_silent, default=(None, {}),
+                      timeout=option_chain_timeout()),
+            FetchTask('technical',     self.get_technical_data, default=(None, None)),
+            FetchTask('fii_dii',       lambda: fetch_fii_dii_data(self.nse), default=_fii_dii_placeholder()),
+            FetchTask('heatmap',       lambda: fetch_heatmap_data(self.nse), default=([], "N/A", 0, 0, 0)),
+            FetchTask('vix',           fetch_india_vix, default=(None, None)),
+            FetchTask('global_bias',   fetch_global_bias),
+            FetchTask('volume_levels', lambda technical: fetch_volume_at_levels(technical[0] or {}),
+                      needs=('technical',), default=(None, None)),
+        ], stale=self.stale_fetches)
+        # Workers only return values: a timed-out one still running can't touch this run's state
+        oc_data,   self.expiry_chains = fetched['option_chain']
+        technical, self.daily_history = fetched['technical']
+        self.vol_support, self.vol_resistance = fetched['volume_levels']
+        self.global_bias = fetched['global_bias']
+
         option_analysis=self.analyze_option_chain_data(oc_data) if oc_data else None
         if option_analysis:
             print(f"✅ Option data | Expiry: {option_analysis['expiry']} | Spot: {option_analysis['underlying_value']}")
         else:
             print("⚠️  No option data — technical-only mode")
-        print("\nFetching technical data...")
-        technical=self.get_technical_data()
-        self.generate_analysis_data(technical, option_analysis)
+        self.generate_analysis_data(technical, option_analysis, fii_dii_raw=fetched['fii_dii'])
+        self.expiry_comparison = compare_expiries(self.expiry_chains)
+        self.html_data['expiry_comparison'] = self.expiry_comparison
 
-        # ── Fetch Nifty 50 Heatmap data ────────────────────────────────
-        print("\n🌡️  Fetching Nifty 50 heatmap data...")
         (self.heatmap_data,
          self.heatmap_timestamp,
          self.heatmap_advance,
          self.heatmap_decline,
-         self.heatmap_neutral) = fetch_heatmap_data()
+         self.heatmap_neutral) = fetched['heatmap']
 
         # ── Log OI snapshot for Intraday OI Trend tab ─────────────────
         print("\n📊 Logging OI snapshot to oi_log.json...")
@@ -8271,39 +10061,55 @@ function mobNavTo(secId, tabId, label) {
             "strong_resistance": self.html_data.get("strong_resistance"),
         }
         log_oi_snapshot(option_analysis, technical, key_levels=key_levels,
-                        bias=self.html_data.get('bias', 'SIDEWAYS'))
+                        bias=self.html_data.get('bias', 'SIDEWAYS'), nse=self.nse,
+                        history=self.oi_history)
 
-        # Fetch India VIX and store in html_data
-        vix_val, vix_trend = fetch_india_vix()
+        vix_val, vix_trend = fetched['vix']
         self.html_data['vix_val']   = vix_val
         self.html_data['vix_trend'] = vix_trend
-        
+
         return option_analysis
 
 
+def run_report(analyzer, email=True):
+    """One fetch → analyse → save (→ email) pass over `analyzer`. Returns True if index.html was saved."""
+    analyzer.generate_full_report()
+
+    # ── Volume at support/resistance + global bias come from the fetch stage ──
+    vol_support, vol_resistance = analyzer.vol_support, analyzer.vol_resistance
+    global_bias = analyzer.global_bias
+    vol_view    = "normal"
+    # ──────────────────────────────────────────────────────────
+
+    # OI log first, so the published oi_seq and oi_log files agree
+    analyzer.oi_history.flush()
+
+    print("\n" + "=" * 70)
+    save_ok = analyzer.save_html_to_file(
+        'index.html',
+        vol_support=vol_support, vol_resistance=vol_resistance,
+        global_bias=global_bias, vol_view=vol_view
+    )
+    if not email:
+        return save_ok
+    if save_ok and DATA_PROVIDER.replaying:
+        print("\n📭 Replay mode — email skipped")
+    elif save_ok:
+        analyzer.send_html_email_report(vol_support, vol_resistance, global_bias, vol_view)
+    else:
+        print("\n⚠️  Skipping email due to save failure")
+    return save_ok
+
+
 def main():
+    t_start  = time.perf_counter()
+    analyzer = None
     try:
         print("\n🚀 Starting Nifty 50 Analysis...\n")
+        if DATA_PROVIDER.mode != "live":
+            print(f"  🎞️  Data mode: {DATA_PROVIDER.mode} ({DATA_PROVIDER.fixtures_dir})\n")
         analyzer = NiftyHTMLAnalyzer()
-        analyzer.generate_full_report()
-
-        # ── AUTO-calculate volume at support/resistance ────────────
-        print("\n📦 Auto-calculating volume at key levels...")
-        vol_support, vol_resistance = fetch_volume_at_levels(analyzer.html_data)
-        global_bias = fetch_global_bias()
-        vol_view    = "normal"
-        # ──────────────────────────────────────────────────────────
-
-        print("\n" + "=" * 70)
-        save_ok = analyzer.save_html_to_file(
-            'index.html',
-            vol_support=vol_support, vol_resistance=vol_resistance,
-            global_bias=global_bias, vol_view=vol_view
-        )
-        if save_ok:
-            analyzer.send_html_email_report(vol_support, vol_resistance, global_bias, vol_view)
-        else:
-            print("\n⚠️  Skipping email due to save failure")
+        run_report(analyzer)
         print("\n✅ Done! Open index.html in your browser.")
         print("\n💡 AUTO-REFRESH (Option 2) is active.")
         print("   ➤ Serve the folder with:  python -m http.server 8000")
@@ -8312,7 +10118,101 @@ def main():
     except Exception as e:
         print(f"\n❌ Critical Error: {e}")
         import traceback; traceback.print_exc()
+    finally:
+        if analyzer is not None and analyzer.oi_history is not None:
+            analyzer.oi_history.flush()
+        print(f"⏱️  Total run time: {time.perf_counter() - t_start:.2f}s")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  DAEMON MODE — in-process market-hours scheduler (python nifty50_option_analysis.py --daemon)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DAEMON_INTERVAL_MIN = int(os.environ.get("NIFTY_DAEMON_INTERVAL", "3"))   # one cycle ≈ one 3 Min OI row
+MARKET_OPEN_IST     = (9, 0)      # same session window as log_oi_snapshot()
+MARKET_CLOSE_IST    = (15, 30)
+
+
+def next_boundary(now, minutes):
+    """First wall-clock multiple of `minutes` after `now` (09:03, 09:06, … for 3)."""
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    step     = minutes * 60
+    elapsed  = (now - midnight).total_seconds()
+    return midnight + timedelta(seconds=(elapsed // step + 1) * step)
+
+
+def run_daemon(interval=DAEMON_INTERVAL_MIN):
+    """
+    Stays resident for today's session and runs the report on every
+    `interval`-minute wall-clock boundary between MARKET_OPEN_IST and
+    MARKET_CLOSE_IST, then exits. One analyzer lives across cycles, so the NSE
+    session and cookies, candle store, section/render caches and the snapshot
+    ring stay warm. Emails only on the first cycle, as the daily cron run did.
+    A cycle that overruns skips the boundaries it missed.
+    """
+    ist      = pytz.timezone('Asia/Kolkata')
+    now      = datetime.now(ist)
+    open_at  = now.replace(hour=MARKET_OPEN_IST[0],  minute=MARKET_OPEN_IST[1],  second=0, microsecond=0)
+    close_at = now.replace(hour=MARKET_CLOSE_IST[0], minute=MARKET_CLOSE_IST[1], second=0, microsecond=0)
+    if now.weekday() >= 5 or now > close_at:
+        print(f"\n📴 Market closed ({now.strftime('%a %H:%M IST')}) — daemon not started")
+        return 0
+    print(f"\n🛰️  Daemon mode: every {interval} min, {open_at:%H:%M}–{close_at:%H:%M} IST")
+    if DATA_PROVIDER.mode != "live":
+        print(f"  🎞️  Data mode: {DATA_PROVIDER.mode} ({DATA_PROVIDER.fixtures_dir})")
+    analyzer = NiftyHTMLAnalyzer()
+    next_run = max(now, open_at)
+    cycles = failures = 0
+    try:
+        while next_run <= close_at:
+            sleep_s = (next_run - datetime.now(ist)).total_seconds()
+            if sleep_s > 0:
+                print(f"\n💤 Next cycle at {next_run:%H:%M:%S} IST ({sleep_s:.0f}s)")
+                time.sleep(sleep_s)
+            cycles += 1
+            t0 = time.perf_counter()
+            try:
+                if not run_report(analyzer, email=cycles == 1):
+                    failures += 1
+            except Exception as e:
+                failures += 1
+                print(f"\n❌ Cycle {cycles} failed: {e}")
+                import traceback; traceback.print_exc()
+            finally:
+                if analyzer.oi_history is not None:
+                    analyzer.oi_history.flush()
+            print(f"⏱️  Cycle {cycles} took {time.perf_counter() - t0:.2f}s")
+            next_run = next_boundary(datetime.now(ist), interval)
+    except KeyboardInterrupt:
+        print("\n🛑 Daemon interrupted")
+    finally:
+        if analyzer.oi_history is not None:
+            analyzer.oi_history.flush()
+    print(f"\n🏁 Daemon done — {cycles} cycle(s), {failures} failed")
+    return 1 if cycles and failures == cycles else 0
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Nifty 50 option chain + technical report")
+    parser.add_argument("--bench", action="store_true",
+                        help="time the render pipeline on synthetic fixtures instead of running (bench.py)")
+    parser.add_argument("--bench-repeat", type=int, metavar="N",
+                        help="timed runs per benchmark case (default bench.BENCH_REPEAT)")
+    parser.add_argument("--bench-baseline", metavar="JSON",
+                        help="write this baseline on first use; afterwards exit 1 on regressions against it")
+    parser.add_argument("--multi-expiry", action="store_true",
+                        help="also fetch the next weekly and nearest monthly chains ($NIFTY_MULTI_EXPIRY=1)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="stay resident 09:00–15:30 IST and re-run on wall-clock boundaries")
+    parser.add_argument("--interval", type=int, default=DAEMON_INTERVAL_MIN, metavar="MIN",
+                        help=f"daemon cycle length in minutes (default {DAEMON_INTERVAL_MIN}, $NIFTY_DAEMON_INTERVAL)")
+    args = parser.parse_args()
+    if args.multi_expiry:
+        MULTI_EXPIRY = True
+    if args.bench:
+        import bench
+        raise SystemExit(bench.run_benchmarks(args.bench_repeat or bench.BENCH_REPEAT, args.bench_baseline))
+    if args.daemon:
+        raise SystemExit(run_daemon(max(1, args.interval)))
     main()
@@ -0,0 +1,45 @@
+import json
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nifty50_option_analysis import OIRollups   # noqa: E402
+
+DAY   = date(2026, 10, 16)
+SNAPS = [{'time': f"09:{m:02d}", 'seq': i + 1, 'timestamp': f"16-Oct-2026 09:{m:02d}",
+          'call_oi_chg': i, 'put_oi_chg': 2 * i} for i, m in enumerate(range(15, 45, 3))]
+
+
+def _rollups(tmp_path):
+    return OIRollups(path_fmt=str(tmp_path / "oi_rollup_{mins}.json"))
+
+
+def _saved(tmp_path, mins):
+    with open(tmp_path / f"oi_rollup_{mins}.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_incremental_updates_match_a_rebuild(tmp_path):
+    rollups = _rollups(tmp_path)
+    for n, snap in enumerate(SNAPS, 1):
+        rollups.update([snap], DAY, lambda: SNAPS[:n], count=n)
+    incremental = {mins: _saved(tmp_path, mins) for mins in rollups.minutes}
+    for mins in rollups.minutes:
+        os.remove(tmp_path / f"oi_rollup_{mins}.json")
+    rollups.update([], DAY, lambda: SNAPS, count=len(SNAPS))
+    for mins in rollups.minutes:
+        assert _saved(tmp_path, mins) == incremental[mins]
+    assert [r['time'] for r in incremental[3]['rows']] == [s['time'] for s in reversed(SNAPS)]
+    assert incremental[15]['count'] == len(SNAPS)
+
+
+def test_rollup_that_missed_a_flush_is_rebuilt(tmp_path):
+    rollups = _rollups(tmp_path)
+    rollups.update(SNAPS[:4], DAY, lambda: SNAPS[:4], count=4)
+    # snapshots 5-6 reached the segment but not the rollups (killed mid-flush)
+    rollups.update(SNAPS[6:7], DAY, lambda: SNAPS[:7], count=7)
+    saved = _saved(tmp_path, 3)
+    assert saved['count'] == 7
+    assert [r['seq'] for r in saved['rows']] == [7, 6, 5, 4, 3, 2, 1]
@@ -0,0 +1,58 @@
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nifty50_option_analysis import OISnapshotLog   # noqa: E402
+
+DAY = date(2026, 10, 16)
+PAD = "x" * 300        # real snapshots are a few hundred bytes; tail() reads 8 KB at a time
+
+
+def _log(tmp_path):
+    return OISnapshotLog(root=str(tmp_path / "oi_log"), export_path=str(tmp_path / "oi_log.json"))
+
+
+def test_append_writes_no_blank_lines(tmp_path):
+    log = _log(tmp_path)
+    for i in range(40):
+        log.append({'time': f"09:{i:02d}", 'seq': i + 1}, DAY)
+    with open(log.segment_path(DAY), "rb") as f:
+        lines = f.read().split(b"\n")
+    assert lines[-1] == b""
+    assert all(line.strip() for line in lines[:-1])
+    assert len(lines) - 1 == 40
+
+
+def test_tail_returns_k_records_newest_first(tmp_path):
+    log = _log(tmp_path)
+    for i in range(40):
+        log.append({'time': f"09:{i:02d}", 'seq': i + 1, 'pad': PAD}, DAY)
+    rows = log.tail(DAY, 32)
+    assert len(rows) == 32
+    assert [r['seq'] for r in rows] == list(range(40, 8, -1))
+
+
+def test_append_repairs_torn_line(tmp_path):
+    log = _log(tmp_path)
+    log.append({'time': "09:00", 'seq': 1}, DAY)
+    with open(log.segment_path(DAY), "ab") as f:
+        f.write(b'{"time": "09:0')                 # killed mid-write
+    for i in range(2, 6):
+        log.append({'time': f"09:{i:02d}", 'seq': i}, DAY)
+    assert [r['seq'] for r in log.tail(DAY, 5)] == [5, 4, 3, 2, 1]
+    assert [r['seq'] for r in log.read_day(DAY)] == [1, 2, 3, 4, 5]
+
+
+def test_append_many_updates_index_once_per_batch(tmp_path):
+    log = _log(tmp_path)
+    log.append({'time': "09:00", 'seq': 1}, DAY)
+    writes = []
+    write_json = log._write_json
+    log._write_json = lambda path, obj: (writes.append(path), write_json(path, obj))
+    assert log.append_many([{'time': f"09:0{i}", 'seq': i} for i in range(2, 6)], DAY) == 5
+    assert writes == [log.index_path]
+    seg = log.load_index()[DAY.isoformat()]
+    assert (seg['count'], seg['first'], seg['last'], seg['last_seq']) == (5, "09:00", "09:05", 5)
+    assert [r['seq'] for r in log.read_day(DAY)] == [1, 2, 3, 4, 5]